@@ -0,0 +1,79 @@
+"""Add hourly/daily AI usage rollups and a BRIN index on ai_usage_logs
+
+Revision ID: ai_usage_rollups_021
+Revises: add_manager_role_020
+Create Date: 2026-10-19
+
+Cost and monitoring dashboards read ai_usage_hourly / ai_usage_daily
+(maintained by the cost_tracker.compact_usage beat task) plus the raw tail
+after the watermark in ai_usage_rollup_state.
+
+ai_usage_logs is append-only in created_at order, so a BRIN index gives
+cheap range scans for compaction and retention pruning without the size of
+a B-tree.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'ai_usage_rollups_021'
+down_revision: str = 'add_manager_role_020'
+branch_labels = None
+depends_on = None
+
+
+def _create_rollup_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('module', sa.String(length=50), nullable=False),
+        sa.Column('calls', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('successes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('input_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('output_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('total_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('cost_cents', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('latency_ms_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('latency_ms_min', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latency_ms_max', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('bucket_start', 'user_id', 'provider', 'model', 'module', name=f'uq_{name}_key'),
+    )
+    op.create_index(f'ix_{name}_bucket_start', name, ['bucket_start'])
+    op.create_index(f'ix_{name}_user_id', name, ['user_id'])
+    # Dashboard reads: one user's buckets over a time range
+    op.create_index(f'ix_{name}_user_bucket', name, ['user_id', 'bucket_start'])
+
+
+def upgrade() -> None:
+    _create_rollup_table('ai_usage_hourly')
+    _create_rollup_table('ai_usage_daily')
+
+    op.create_table(
+        'ai_usage_rollup_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('rolled_until', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_index(
+        'ix_ai_usage_logs_created_brin',
+        'ai_usage_logs',
+        ['created_at'],
+        postgresql_using='brin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_usage_logs_created_brin', table_name='ai_usage_logs')
+    op.drop_table('ai_usage_rollup_state')
+    for name in ('ai_usage_daily', 'ai_usage_hourly'):
+        op.drop_index(f'ix_{name}_user_bucket', table_name=name)
+        op.drop_index(f'ix_{name}_user_id', table_name=name)
+        op.drop_index(f'ix_{name}_bucket_start', table_name=name)
+        op.drop_table(name)
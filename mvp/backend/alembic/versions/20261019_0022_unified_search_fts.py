@@ -0,0 +1,58 @@
+"""Add full-text (tsvector) and trigram GIN indexes for unified search
+
+Revision ID: unified_search_fts_022
+Revises: ai_usage_rollups_021
+Create Date: 2026-10-19
+
+The unified search PostgreSQL fallback matches each source column with
+``to_tsvector('simple', coalesce(col, '')) @@ websearch_to_tsquery(...)``
+OR ``col ILIKE '%q%'``.  Both predicates are backed by GIN indexes so
+neither side falls back to a sequential scan:
+
+- expression GIN on the tsvector (word / phrase matches)
+- pg_trgm GIN (substring matches with a leading wildcard)
+
+Indexes are built CONCURRENTLY outside the migration transaction so large
+tables stay writable during the upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'unified_search_fts_022'
+down_revision: Union[str, None] = 'ai_usage_rollups_021'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) pairs searched by UnifiedSearchService
+_COLUMNS = [
+    ('transcriptions', 'text'),
+    ('document_chunks', 'content'),
+    ('generated_contents', 'content'),
+    ('generated_contents', 'title'),
+    ('messages', 'content'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for table, column in _COLUMNS:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{column}_fts "
+                f"ON {table} USING gin (to_tsvector('simple'::regconfig, coalesce({column}, '')))"
+            )
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in _COLUMNS:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}_trgm")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}_fts")
+    # Don't drop the extension as other things might use it
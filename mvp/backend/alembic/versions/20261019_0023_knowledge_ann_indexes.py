@@ -0,0 +1,45 @@
+"""Manage the knowledge base pgvector ANN index
+
+Revision ID: knowledge_ann_023
+Revises: unified_search_fts_022
+Create Date: 2026-10-19
+
+- Renames ix_document_chunks_embedding_hnsw to the method-neutral
+  ix_document_chunks_embedding_ann (the index can now be rebuilt as HNSW or
+  IVFFlat from the admin endpoint) and creates it if it is missing.
+- Adds a partial btree on user_id for embedded chunks: it backs the
+  exact-search path for small tenants and the per-tenant chunk counts used
+  to pick a search strategy.
+
+Per-tenant partial HNSW indexes are created at runtime
+(knowledge.sync_tenant_vector_indexes), not here.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'knowledge_ann_023'
+down_revision: Union[str, None] = 'unified_search_fts_022'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER INDEX IF EXISTS ix_document_chunks_embedding_hnsw RENAME TO ix_document_chunks_embedding_ann")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_embedding_ann "
+            "ON document_chunks USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_user_embedded "
+            "ON document_chunks (user_id) WHERE embedding IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_user_embedded")
+    op.execute("ALTER INDEX IF EXISTS ix_document_chunks_embedding_ann RENAME TO ix_document_chunks_embedding_hnsw")
@@ -0,0 +1,74 @@
+"""Add crawl_jobs and crawl_frontier for site-wide frontier crawls
+
+Revision ID: crawl_frontier_024
+Revises: knowledge_ann_023
+Create Date: 2026-10-19
+
+crawl_frontier holds one row per normalized URL of a job (unique on
+job_id + url_hash).  Workers claim pending rows in priority order with
+FOR UPDATE SKIP LOCKED through ix_crawl_frontier_claim.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'crawl_frontier_024'
+down_revision: Union[str, None] = 'knowledge_ann_023'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'crawl_jobs',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('seed_url', sa.String(2000), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('max_pages', sa.Integer(), nullable=False, server_default='1000'),
+        sa.Column('max_depth', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('config_json', sa.Text(), nullable=False, server_default='{}'),
+        sa.Column('pages_crawled', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pages_failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pages_skipped', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pages_duplicate', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('chunks_indexed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error', sa.String(2000), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_crawl_jobs_user_id', 'crawl_jobs', ['user_id'])
+    op.create_index('ix_crawl_jobs_status', 'crawl_jobs', ['status'])
+
+    op.create_table(
+        'crawl_frontier',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('job_id', sa.Uuid(), nullable=False),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('url_hash', sa.BigInteger(), nullable=False),
+        sa.Column('host', sa.String(255), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('priority', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('simhash', sa.BigInteger(), nullable=True),
+        sa.Column('error', sa.String(500), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['job_id'], ['crawl_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id', 'url_hash', name='uq_crawl_frontier_job_url'),
+    )
+    op.create_index('ix_crawl_frontier_claim', 'crawl_frontier', ['job_id', 'status', 'priority'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_crawl_frontier_claim', table_name='crawl_frontier')
+    op.drop_table('crawl_frontier')
+    op.drop_index('ix_crawl_jobs_status', table_name='crawl_jobs')
+    op.drop_index('ix_crawl_jobs_user_id', table_name='crawl_jobs')
+    op.drop_table('crawl_jobs')
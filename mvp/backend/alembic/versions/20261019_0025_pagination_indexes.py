@@ -0,0 +1,51 @@
+"""Add composite indexes for keyset-paginated listings
+
+Revision ID: pagination_indexes_025
+Revises: crawl_frontier_024
+Create Date: 2026-10-19
+
+core.pagination pages with a row-value comparison,
+``(created_at, id) < (:created_at, :id)``, after the listing's filters.
+Each index below holds the equality filter followed by the sort columns,
+so a deep page is an index range scan.  Marketplace browse is public, so
+its indexes are partial on published, non-deleted listings, one per sort.
+
+Indexes are built CONCURRENTLY outside the migration transaction so large
+tables stay writable during the upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'pagination_indexes_025'
+down_revision: Union[str, None] = 'crawl_frontier_024'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns, partial predicate)
+_INDEXES = [
+    ('ix_transcriptions_user_created', 'transcriptions', 'user_id, created_at, id', None),
+    ('ix_conversations_user_updated', 'conversations', 'user_id, updated_at, id', None),
+    ('ix_pdf_documents_user_created', 'pdf_documents', 'user_id, created_at, id', 'NOT is_deleted'),
+    ('ix_workflow_runs_workflow_created', 'workflow_runs', 'workflow_id, created_at, id', None),
+] + [
+    (f'ix_marketplace_listings_browse_{column}', 'marketplace_listings', f'{column}, id',
+     'is_published AND NOT is_deleted')
+    for column in ('created_at', 'installs_count', 'rating', 'price')
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in _INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"
+                + (f" WHERE {where}" if where else "")
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,301 @@
+"""
+Hedged AI requests for interactive paths.
+
+If the primary provider has not answered within the AI_HEDGE_PERCENTILE of
+its recent latency (time to first token when streaming, full response
+otherwise), a backup request goes to the router's next-best provider in
+the same cost tier.  Whichever answers first is used and the other one is
+cancelled; both calls are recorded in cost_tracker, the loser with
+success=False.
+
+Hedging is opt-in per tenant (AI_HEDGING_TENANTS).  Each tenant's hedges
+are capped at AI_HEDGE_MAX_EXTRA_PERCENT of its hedge-eligible requests
+over a rolling window, which bounds the extra spend.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from uuid import UUID
+
+import structlog
+
+from app.ai_assistant import rate_limits
+from app.ai_assistant.router import _percentile, get_router
+from app.config import settings
+from app.core.multi_tenant import TenantContext
+from app.metrics import ai_hedged_requests_total
+
+logger = structlog.get_logger(__name__)
+
+_DONE = object()
+
+# provider -> (monotonic time, seconds to first token) of recent streams
+_first_token: dict[str, deque] = {}
+# tenant -> [monotonic time, hedged] per hedge-eligible request
+_requests: dict[str, deque] = {}
+
+
+def enabled_for(tenant_id: Optional[Any] = None) -> bool:
+    """Whether the tenant (default: the request's TenantContext) opted in."""
+    allowed = {t.strip() for t in settings.AI_HEDGING_TENANTS.split(",") if t.strip()}
+    if "*" in allowed:
+        return True
+    tenant = str(tenant_id) if tenant_id else TenantContext.get()
+    return tenant is not None and tenant in allowed
+
+
+# ---------------------------------------------------------------------------
+# Delay and budget
+# ---------------------------------------------------------------------------
+
+def _trim(entries: deque, window: float, now: float) -> deque:
+    while entries and entries[0][0] < now - window:
+        entries.popleft()
+    return entries
+
+
+def record_first_token(provider: str, seconds: float) -> None:
+    samples = _first_token.setdefault(provider, deque(maxlen=settings.AI_ROUTER_MAX_SAMPLES))
+    samples.append((time.monotonic(), seconds))
+
+
+def hedge_delay(provider: str, streaming: bool) -> float:
+    """Seconds to wait on the primary before hedging."""
+    now = time.monotonic()
+    value = None
+    if streaming:
+        samples = _trim(_first_token.get(provider, deque()), settings.AI_ROUTER_WINDOW_SECONDS, now)
+        if len(samples) >= settings.AI_ROUTER_MIN_SAMPLES:
+            value = _percentile(sorted(s[1] for s in samples), settings.AI_HEDGE_PERCENTILE)
+    else:
+        health = get_router().health(provider)
+        value = health.latency_percentile(settings.AI_HEDGE_PERCENTILE, now) if health else None
+    if value is None:
+        value = settings.AI_HEDGE_DEFAULT_DELAY_MS / 1000
+    return max(value, settings.AI_HEDGE_MIN_DELAY_MS / 1000)
+
+
+def _admit(tenant: str) -> list:
+    now = time.monotonic()
+    entries = _trim(_requests.setdefault(tenant, deque()), settings.AI_HEDGE_BUDGET_WINDOW_SECONDS, now)
+    entry = [now, False]
+    entries.append(entry)
+    return entry
+
+
+def _has_budget(tenant: str) -> bool:
+    entries = _trim(_requests.get(tenant, deque()), settings.AI_HEDGE_BUDGET_WINDOW_SECONDS, time.monotonic())
+    hedged = sum(1 for entry in entries if entry[1])
+    return hedged + 1 <= settings.AI_HEDGE_MAX_EXTRA_PERCENT / 100 * len(entries)
+
+
+def _backup_for(primary: str) -> Optional[str]:
+    router = get_router()
+    health = router.health(primary)
+    tier = health.cost_tier if health else "free"
+    return next((name for name in router.rank(tier) if name != primary), None)
+
+
+def _start_backup(
+    primary: str, tenant: str, entry: list, start: Callable[[str], Any],
+) -> tuple[Optional[str], Any, str]:
+    """Start the backup if one exists and the tenant has budget; returns (name, backup, outcome)."""
+    name = _backup_for(primary)
+    if name is None:
+        return None, None, "no_backup"
+    if not _has_budget(tenant):
+        return None, None, "budget_exhausted"
+    try:
+        backup = start(name)
+    except Exception as e:
+        logger.warning("ai_hedge_backup_unavailable", provider=name, error=str(e)[:200])
+        return None, None, "no_backup"
+    entry[1] = True
+    logger.info("ai_hedge_fired", primary=primary, backup=name)
+    return name, backup, "hedged"
+
+
+# ---------------------------------------------------------------------------
+# Non-streaming
+# ---------------------------------------------------------------------------
+
+async def _observed(call: Callable[[str], Awaitable[dict]], name: str) -> dict:
+    start = time.monotonic()
+    try:
+        result = await call(name)
+    except Exception as e:
+        get_router().observe(name, time.monotonic() - start, e)
+        raise
+    get_router().observe(name, time.monotonic() - start)
+    return result
+
+
+async def hedged_complete(
+    call: Callable[[str], Awaitable[dict]],
+    primary: str,
+    tenant_id: Optional[Any] = None,
+) -> dict:
+    """
+    Run ``call(provider)`` on ``primary``, hedging to a backup when it is slow.
+
+    ``call`` records its own cost_tracker row, including when cancelled.
+    """
+    tenant = str(tenant_id or TenantContext.get() or "default")
+    entry = _admit(tenant)
+    tasks = {asyncio.ensure_future(_observed(call, primary)): primary}
+    outcome = "not_needed"
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay(primary, streaming=False))
+        if not done:
+            name, backup, outcome = _start_backup(
+                primary, tenant, entry, lambda name: asyncio.ensure_future(_observed(call, name)),
+            )
+            if backup is not None:
+                tasks[backup] = name
+        errors = []
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks.pop(task)
+                if task.exception() is None:
+                    if outcome == "hedged":
+                        outcome = "primary_won" if name == primary else "backup_won"
+                    return task.result()
+                errors.append(task.exception())
+        outcome = "failed"
+        raise errors[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        ai_hedged_requests_total.labels(outcome=outcome).inc()
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+class _Stream:
+    """One provider's stream, pumped into a queue so two can be raced."""
+
+    def __init__(self, name: str, prompt: str, max_wait: Optional[float] = None):
+        from app.ai_assistant.service import AIAssistantService
+
+        self.name = name
+        self.provider = AIAssistantService.get_provider(name)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.output: list[str] = []
+        self.error: Optional[Exception] = None
+        self.started = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.task = asyncio.ensure_future(self._pump(prompt, max_wait))
+
+    async def _pump(self, prompt: str, max_wait: Optional[float]) -> None:
+        try:
+            async for chunk in rate_limits.stream(
+                self.name, rate_limits.estimate_tokens(prompt), self.provider.stream_chat(prompt), max_wait,
+            ):
+                if self.first_token_at is None:
+                    self.first_token_at = time.monotonic()
+                self.output.append(chunk)
+                self.queue.put_nowait(chunk)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.put_nowait(_DONE)
+
+
+async def hedged_stream(
+    prompt: str,
+    primary: str,
+    *,
+    user_id: Optional[UUID],
+    module: str,
+    action: str,
+    tenant_id: Optional[Any] = None,
+) -> AsyncIterator[tuple[str, str]]:
+    """
+    Stream ``prompt`` from ``primary``, hedging on time to first token.
+
+    Yields (provider, chunk); every chunk comes from the winning provider.
+    """
+    tenant = str(tenant_id or TenantContext.get() or "default")
+    entry = _admit(tenant)
+    contenders = [_Stream(primary, prompt)]
+    winner: Optional[_Stream] = None
+    outcome = "not_needed"
+    try:
+        getters = {asyncio.ensure_future(contenders[0].queue.get()): contenders[0]}
+        done, _ = await asyncio.wait(getters, timeout=hedge_delay(primary, streaming=True))
+        if not done:
+            # A backup without rate-limit budget right now is not worth waiting for
+            _, backup, outcome = _start_backup(primary, tenant, entry, lambda name: _Stream(name, prompt, 0.0))
+            if backup is not None:
+                contenders.append(backup)
+                getters[asyncio.ensure_future(backup.queue.get())] = backup
+
+        item = _DONE
+        while getters and winner is None:
+            done, _ = await asyncio.wait(getters, return_when=asyncio.FIRST_COMPLETED)
+            for getter in done:
+                contender = getters.pop(getter)
+                if getter.result() is _DONE and contender.error is not None:
+                    continue  # failed before answering; the other may still win
+                winner, item = contender, getter.result()
+                break
+        for getter in getters:
+            getter.cancel()
+        if winner is None:
+            outcome = "failed"
+            raise contenders[0].error
+        if outcome == "hedged":
+            outcome = "primary_won" if winner is contenders[0] else "backup_won"
+        for contender in contenders:
+            if contender is not winner:
+                contender.task.cancel()
+
+        while item is not _DONE:
+            yield winner.name, item
+            item = await winner.queue.get()
+        if winner.error is not None:
+            raise winner.error
+    finally:
+        for contender in contenders:
+            contender.task.cancel()
+        await asyncio.gather(*(c.task for c in contenders), return_exceptions=True)
+        ai_hedged_requests_total.labels(outcome=outcome).inc()
+        for contender in contenders:
+            await _record(contender, contender is winner, prompt, user_id, module, action)
+
+
+async def _record(
+    contender: _Stream, won: bool, prompt: str,
+    user_id: Optional[UUID], module: str, action: str,
+) -> None:
+    elapsed = time.monotonic() - contender.started
+    if contender.error is not None:
+        get_router().observe(contender.name, elapsed, contender.error)
+    elif won and contender.first_token_at is not None:
+        record_first_token(contender.name, contender.first_token_at - contender.started)
+
+    output = "".join(contender.output)
+    error = str(contender.error)[:500] if contender.error else (None if won else "hedge_cancelled")
+    try:
+        from app.modules.cost_tracker.tracker import track_ai_usage
+        await track_ai_usage(
+            user_id=user_id,
+            provider=contender.name,
+            model=contender.provider.model_name,
+            module=module,
+            action=action,
+            input_tokens=max(len(prompt) // 4, 1),
+            output_tokens=max(len(output) // 4, 1) if output else 0,
+            latency_ms=int(elapsed * 1000),
+            success=error is None,
+            error=error,
+        )
+    except Exception as e:
+        logger.warning("hedge_record_failed", provider=contender.name, error=str(e))
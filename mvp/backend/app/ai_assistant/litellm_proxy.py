@@ -11,12 +11,14 @@ Falls back gracefully to direct providers if litellm is not installed.
 The existing GeminiProvider/ClaudeProvider/GroqProvider are PRESERVED as fallback.
 """
 
+import asyncio
 import time
 from typing import Optional
 from uuid import UUID
 
 import structlog
 
+from app.ai_assistant import rate_limits
 from app.ai_assistant.retry import with_retries
 
 logger = structlog.get_logger()
@@ -68,10 +70,10 @@ async def complete(
 
     model = MODEL_MAP.get(provider_name, MODEL_MAP["gemini"])
 
-    start_time = time.monotonic()
-    try:
-        response = await with_retries(
-            lambda: litellm.acompletion(
+    async def attempt():
+        # Each retry spends rate-limit budget like any other request
+        async with rate_limits.slot(provider_name, rate_limits.estimate_tokens(text)):
+            return await litellm.acompletion(
                 model=model,
                 messages=[{"role": "user", "content": text}],
                 timeout=60,
@@ -80,9 +82,11 @@ async def complete(
                     "module": module,
                     "task": task,
                 },
-            ),
-            provider=provider_name,
-        )
+            )
+
+    start_time = time.monotonic()
+    try:
+        response = await with_retries(attempt, provider=provider_name)
 
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
         content = response.choices[0].message.content or ""
@@ -139,6 +143,18 @@ async def complete(
         )
 
         raise TimeoutError("AI provider timed out after 60s")
+    except rate_limits.ProviderRateLimited:
+        # Out of budget: the direct provider shares the same key and limits
+        raise
+    except asyncio.CancelledError:
+        # Hedged request lost the race: still record the spend
+        await _track_cost(
+            user_id=user_id, provider=provider_name, model=model,
+            module=module, task=task, input_tokens=0, output_tokens=0,
+            latency_ms=int((time.monotonic() - start_time) * 1000),
+            success=False, error="cancelled",
+        )
+        raise
     except Exception as e:
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
         logger.warning("litellm_failed_fallback", provider=provider_name, error=str(e))
@@ -159,25 +175,25 @@ async def complete_with_routing(
     module: str = "general",
     task: str = "general",
     prefer_free: bool = True,
+    cost_tier: Optional[str] = None,
 ) -> dict:
-    """Intelligent routing: tries cheapest provider first, falls back on error.
+    """Intelligent routing: fastest healthy provider in the cost tier, falls back on error.
 
-    Order: groq (free/fast) -> gemini (free) -> claude (paid, best quality)
+    The provider router (ai_assistant.router) ranks providers by rolling
+    latency and error rate and skips those with an open circuit or inside a
+    429 Retry-After window; pricier tiers are tried last.
     """
-    order = ["groq", "gemini", "claude"] if prefer_free else ["gemini", "claude", "groq"]
+    from app.ai_assistant.router import get_router
 
-    last_error = None
-    for provider in order:
-        try:
-            result = await complete(text, provider, user_id, module, task)
-            if result.get("processed_text"):
-                return result
-        except Exception as e:
-            last_error = e
-            logger.debug("routing_provider_failed", provider=provider, error=str(e))
-            continue
+    async def attempt(provider: str) -> dict:
+        result = await complete(text, provider, user_id, module, task)
+        if not result.get("processed_text"):
+            raise RuntimeError(f"{provider} returned an empty completion")
+        return result
 
-    raise last_error or RuntimeError("All providers failed")
+    tier = cost_tier or ("free" if prefer_free else "high")
+    _, result = await get_router().call(attempt, cost_tier=tier, escalate=True)
+    return result
 
 
 def get_model_costs() -> dict:
@@ -226,7 +242,8 @@ async def _fallback_direct(
     prompt = f"Task: {task}\n\n{text}"
 
     start_time = time.monotonic()
-    result = await provider.complete(prompt)
+    async with rate_limits.slot(provider_name, rate_limits.estimate_tokens(prompt)):
+        result = await provider.complete(prompt)
     elapsed_ms = int((time.monotonic() - start_time) * 1000)
 
     est_input = max(len(prompt) // 4, 1)
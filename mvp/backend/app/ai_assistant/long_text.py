@@ -0,0 +1,223 @@
+"""
+Map-reduce processing for texts longer than one prompt.
+
+``split_text`` cuts a text into contiguous chunks of at most
+AI_LONG_TEXT_CHUNK_TOKENS, preferring paragraph breaks, then sentence ends,
+then whitespace.  ``map_prompts`` runs one prompt per chunk concurrently
+(AI_LONG_TEXT_MAX_PARALLEL; provider rate limits and in-flight caps still
+apply inside AIAssistantService) and caches each result in Redis by a
+hash of provider, task and prompt, so re-running over an unchanged
+transcript or document only pays for the final call.
+
+``map_reduce`` builds on both: a text that fits in one chunk gets a single
+call, as before.  A longer one is condensed chunk by chunk into notes, the
+notes are merged in batches until they fit one prompt, and the caller's
+instruction runs once over the merged notes.
+"""
+
+import asyncio
+import hashlib
+import re
+from typing import Optional
+from uuid import UUID
+
+import structlog
+
+from app.cache import cache_get, cache_set
+from app.config import settings
+from app.metrics import ai_long_text_calls_total
+
+logger = structlog.get_logger(__name__)
+
+_CHARS_PER_TOKEN = 4
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"[.!?…][\"')\]]*\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+_MAP_INSTRUCTION = (
+    "The following is one part of a longer {label}. Write condensed notes on this part "
+    "only, keeping every distinct topic, fact, name, number, decision and action item "
+    "so the notes can later be combined with those of the other parts. "
+    "The combined notes will be used for this task: {instruction}"
+)
+_REDUCE_INSTRUCTION = (
+    "The following are notes on consecutive parts of a longer {label}, in order. "
+    "Merge them into one set of condensed notes, keeping every distinct topic, fact, "
+    "name, number, decision and action item and dropping repetition. "
+    "The merged notes will be used for this task: {instruction}"
+)
+_FINAL_PREAMBLE = (
+    "The {label} was too long to read at once; below are notes on all of its parts, in order."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Prompt tokens for ``text`` (~4 chars each, as in rate_limits)."""
+    return len(text) // _CHARS_PER_TOKEN
+
+
+def _last_boundary(window: str, minimum: int) -> Optional[int]:
+    """End index of the last paragraph, sentence or word break past ``minimum``."""
+    for pattern in (_PARAGRAPH, _SENTENCE, _WHITESPACE):
+        ends = [m.end() for m in pattern.finditer(window) if m.end() > minimum]
+        if ends:
+            return ends[-1]
+    return None
+
+
+def split_text(text: str, max_tokens: Optional[int] = None) -> list[str]:
+    """
+    Split ``text`` into chunks of at most ``max_tokens`` at semantic boundaries.
+
+    Chunks are contiguous slices: ``"".join(split_text(t)) == t``.
+    """
+    budget = max(1, max_tokens or settings.AI_LONG_TEXT_CHUNK_TOKENS) * _CHARS_PER_TOKEN
+    chunks = []
+    pos = 0
+    while len(text) - pos > budget:
+        window = text[pos:pos + budget]
+        # A boundary in the first half would leave chunks too small to be worth a call
+        cut = _last_boundary(window, budget // 2) or budget
+        chunks.append(text[pos:pos + cut])
+        pos += cut
+    if pos < len(text) or not chunks:
+        chunks.append(text[pos:])
+    return chunks
+
+
+def _cache_key(prompt: str, task: str, provider_name: str) -> str:
+    digest = hashlib.sha256(f"{provider_name}\0{task}\0{prompt}".encode()).hexdigest()
+    return f"long_text:{digest}"
+
+
+async def _complete(
+    prompt: str,
+    stage: str,
+    *,
+    task: str,
+    provider_name: str,
+    user_id: Optional[UUID],
+    module: str,
+    cache: bool,
+) -> dict:
+    key = _cache_key(prompt, task, provider_name)
+    if cache:
+        cached = await cache_get(key)
+        if cached is not None:
+            ai_long_text_calls_total.labels(stage=stage, cached="true").inc()
+            return cached
+
+    from app.ai_assistant.service import AIAssistantService
+
+    result = await AIAssistantService.process_text_with_provider(
+        text=prompt,
+        task=task,
+        provider_name=provider_name,
+        user_id=user_id,
+        module=module,
+    )
+    ai_long_text_calls_total.labels(stage=stage, cached="false").inc()
+    output = {
+        "processed_text": result.get("processed_text", ""),
+        "provider": result.get("provider", provider_name),
+        "model": result.get("model"),
+    }
+    if cache and output["processed_text"]:
+        await cache_set(key, output, ttl_seconds=settings.AI_LONG_TEXT_CACHE_TTL_SECONDS)
+    return output
+
+
+async def _run_all(prompts: list[str], stage: str, cache: bool = True, **kwargs) -> list[dict]:
+    semaphore = asyncio.Semaphore(max(1, settings.AI_LONG_TEXT_MAX_PARALLEL))
+
+    async def run(prompt: str) -> dict:
+        async with semaphore:
+            return await _complete(prompt, stage, cache=cache, **kwargs)
+
+    tasks = [asyncio.ensure_future(run(prompt)) for prompt in prompts]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        # One failed chunk fails the whole run; stop paying for the others
+        for task in tasks:
+            task.cancel()
+
+
+async def map_prompts(
+    prompts: list[str],
+    *,
+    task: str = "general",
+    provider_name: str = "gemini",
+    user_id: Optional[UUID] = None,
+    module: str = "general",
+    cache: bool = True,
+) -> list[str]:
+    """Run one prompt per chunk concurrently; returns outputs in prompt order."""
+    results = await _run_all(
+        prompts, "map", cache, task=task, provider_name=provider_name, user_id=user_id, module=module,
+    )
+    return [r["processed_text"] for r in results]
+
+
+def _batches(notes: list[str], budget: int) -> list[list[str]]:
+    batches: list[list[str]] = []
+    size = 0
+    for note in notes:
+        tokens = estimate_tokens(note) + 1
+        if batches and size + tokens <= budget:
+            batches[-1].append(note)
+            size += tokens
+        else:
+            batches.append([note])
+            size = tokens
+    return batches
+
+
+async def map_reduce(
+    text: str,
+    instruction: str,
+    *,
+    label: str = "text",
+    task: str = "summarize",
+    provider_name: str = "gemini",
+    user_id: Optional[UUID] = None,
+    module: str = "general",
+    max_tokens: Optional[int] = None,
+) -> dict:
+    """
+    Apply ``instruction`` to the whole of ``text``, however long.
+
+    Returns ``{"processed_text", "provider", "model", "chunks"}``; errors
+    from any call propagate to the caller.
+    """
+    budget = max_tokens or settings.AI_LONG_TEXT_CHUNK_TOKENS
+    kwargs = {"task": task, "provider_name": provider_name, "user_id": user_id, "module": module}
+    chunks = split_text(text, budget)
+    heading = label[:1].upper() + label[1:]
+
+    if len(chunks) == 1:
+        result = await _complete(f"{instruction}\n\n{heading}:\n{text}", "single", cache=False, **kwargs)
+        return {**result, "chunks": 1}
+
+    map_instruction = _MAP_INSTRUCTION.format(label=label, instruction=instruction)
+    results = await _run_all(
+        [f"{map_instruction}\n\n{heading} (part):\n{chunk}" for chunk in chunks], "map", **kwargs,
+    )
+    notes = [r["processed_text"] for r in results]
+
+    reduce_instruction = _REDUCE_INSTRUCTION.format(label=label, instruction=instruction)
+    while sum(estimate_tokens(n) + 1 for n in notes) > budget:
+        batches = _batches(notes, budget)
+        if len(batches) == len(notes):
+            break  # every note alone fills the budget; merging cannot shrink them
+        results = await _run_all(
+            [f"{reduce_instruction}\n\n" + "\n\n".join(batch) for batch in batches], "reduce", **kwargs,
+        )
+        notes = [r["processed_text"] for r in results]
+
+    logger.info("long_text_map_reduce", module=module, task=task, chunks=len(chunks), chars=len(text))
+    preamble = _FINAL_PREAMBLE.format(label=label)
+    final = await _complete(
+        f"{instruction}\n\n{preamble}\n\n" + "\n\n".join(notes), "final", cache=False, **kwargs,
+    )
+    return {**final, "chunks": len(chunks)}
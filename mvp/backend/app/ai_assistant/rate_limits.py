@@ -0,0 +1,339 @@
+"""
+Client-side rate limiting per AI provider and API key.
+
+Each provider has two token buckets per API key, one for requests/minute and
+one for tokens/minute (AI_PROVIDER_RATE_LIMITS).  Buckets live in Redis and
+are refilled and debited atomically by a Lua script, so every API and
+Celery worker shares them.  Without Redis each process keeps its own
+buckets.
+
+Callers wrap a provider call in ``slot()``.  It waits until both buckets
+can cover the request, up to AI_RATE_LIMIT_MAX_WAIT_SECONDS.  While the
+provider router can fail over (retry.failover_mode) it does not wait at
+all.  If the wait would be too long it raises ProviderRateLimited, a 429
+with a retry-after, so the router skips the provider until it refills.
+
+The same limits cap in-flight calls per provider and process (Little's
+law: requests per second x recent p95 latency, recomputed every
+_LIMIT_REFRESH_SECONDS).  Streams go through ``stream()``, which gives the
+in-flight slot back once the provider starts answering, so a slow reader
+does not hold it.  This replaces the old fixed global semaphore for
+anonymous calls.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import structlog
+
+from app.ai_assistant.retry import failover_available
+from app.config import settings
+from app.metrics import ai_rate_limit_wait_seconds, ai_rate_limited_total
+
+logger = structlog.get_logger(__name__)
+
+_KEY_PREFIX = "saas_ia:ai_rl"
+
+# KEYS: requests bucket, tokens bucket.  ARGV: requests/min, tokens/min, tokens.
+# Returns 0 once both buckets are debited, else milliseconds until they can be.
+_ACQUIRE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local wait = 0
+local state = {}
+for i, key in ipairs(KEYS) do
+  local rate = tonumber(ARGV[i])
+  if rate > 0 then
+    local cost = 1
+    if i == 2 then cost = math.min(tonumber(ARGV[3]), rate) end
+    local data = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(data[1]) or rate
+    local ts = tonumber(data[2]) or now
+    level = math.min(rate, level + (now - ts) * rate / 60000)
+    state[#state + 1] = {key, level, cost}
+    if level < cost then
+      wait = math.max(wait, math.ceil((cost - level) * 60000 / rate))
+    end
+  end
+end
+if wait > 0 then return wait end
+for _, s in ipairs(state) do
+  redis.call('HSET', s[1], 'level', tostring(s[2] - s[3]), 'ts', tostring(now))
+  redis.call('PEXPIRE', s[1], 120000)
+end
+return 0
+"""
+
+
+class ProviderRateLimited(Exception):
+    """A provider's client-side budget cannot cover the call in time (HTTP 429 semantics)."""
+
+    status_code = 429
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} rate limit reached (client-side), retry in {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def _parse_limits(raw: str) -> dict[str, tuple[int, int]]:
+    limits = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        rpm, _, tpm = value.partition(":")
+        try:
+            limits[name.strip()] = (int(rpm or 0), int(tpm or 0))
+        except ValueError:
+            logger.warning("ai_rate_limit_bad_setting", item=item)
+    return limits
+
+
+def limits_for(provider: str) -> tuple[int, int]:
+    """(requests/minute, tokens/minute) for a provider; 0 means unlimited."""
+    return _parse_limits(settings.AI_PROVIDER_RATE_LIMITS).get(provider, (0, 0))
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Prompt tokens (~4 chars each) plus the expected completion."""
+    return max(len(prompt) // 4, 1) + settings.AI_RATE_LIMIT_OUTPUT_TOKENS
+
+
+def _api_key_id(provider: str) -> str:
+    api_key = {
+        "groq": settings.GROQ_API_KEY,
+        "gemini": settings.GEMINI_API_KEY,
+        "claude": settings.CLAUDE_API_KEY,
+    }.get(provider) or ""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12] if api_key else "default"
+
+
+# ---------------------------------------------------------------------------
+# Buckets
+# ---------------------------------------------------------------------------
+
+_script = None
+_script_client = None
+# key -> (level, last refill monotonic), used when Redis is unavailable
+_local_buckets: dict[str, tuple[float, float]] = {}
+
+
+def _take_local(keys: list[str], rates: tuple[int, int], tokens: int) -> float:
+    now = time.monotonic()
+    wait = 0.0
+    state = []
+    for key, rate, cost in zip(keys, rates, (1, tokens)):
+        if rate <= 0:
+            continue
+        cost = min(cost, rate)
+        level, updated = _local_buckets.get(key, (float(rate), now))
+        level = min(float(rate), level + (now - updated) * rate / 60)
+        state.append((key, level, cost))
+        if level < cost:
+            wait = max(wait, (cost - level) * 60 / rate)
+    if wait > 0:
+        return wait
+    for key, level, cost in state:
+        _local_buckets[key] = (level - cost, now)
+    return 0.0
+
+
+async def _take(provider: str, tokens: int) -> float:
+    """Debit both buckets if they can cover the call; else seconds to wait."""
+    global _script, _script_client
+    rates = limits_for(provider)
+    base = f"{_KEY_PREFIX}:{provider}:{_api_key_id(provider)}"
+    keys = [f"{base}:req", f"{base}:tok"]
+
+    from app.cache import _get_redis
+
+    client = await _get_redis()
+    if client is not None:
+        try:
+            if _script is None or _script_client is not client:
+                _script = client.register_script(_ACQUIRE_LUA)
+                _script_client = client
+            wait_ms = await _script(keys=keys, args=[rates[0], rates[1], tokens])
+            return int(wait_ms) / 1000
+        except Exception as e:
+            logger.debug("ai_rate_limit_redis_error", provider=provider, error=str(e))
+    return _take_local(keys, rates, tokens)
+
+
+async def acquire(provider: str, tokens: int, max_wait: Optional[float] = None) -> None:
+    """
+    Wait until ``provider`` can take a call of ``tokens`` tokens.
+
+    Raises ProviderRateLimited when that would take longer than ``max_wait``
+    (default AI_RATE_LIMIT_MAX_WAIT_SECONDS, 0 while the router can fail over).
+    """
+    rpm, tpm = limits_for(provider)
+    if rpm <= 0 and tpm <= 0:
+        return
+    if max_wait is None:
+        max_wait = 0.0 if failover_available() else settings.AI_RATE_LIMIT_MAX_WAIT_SECONDS
+
+    start = time.monotonic()
+    deadline = start + max_wait
+    while True:
+        wait = await _take(provider, tokens)
+        if wait <= 0:
+            ai_rate_limit_wait_seconds.labels(provider=provider).observe(time.monotonic() - start)
+            return
+        if time.monotonic() + wait > deadline:
+            ai_rate_limited_total.labels(provider=provider).inc()
+            logger.info("ai_rate_limited", provider=provider, retry_after=round(wait, 2))
+            raise ProviderRateLimited(provider, wait)
+        # Jitter so waiting callers do not retry in lockstep
+        await asyncio.sleep(wait * random.uniform(1.0, 1.25))
+
+
+# ---------------------------------------------------------------------------
+# In-flight cap
+# ---------------------------------------------------------------------------
+
+_LIMIT_REFRESH_SECONDS = 30.0
+
+
+class _Limiter:
+    """Counting semaphore whose limit can change while callers wait."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.updated_at = time.monotonic()
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def locked(self) -> bool:
+        return self.in_flight >= self.limit
+
+    async def acquire(self) -> None:
+        while self.locked():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # pass the wake-up on
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                raise
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self.limit = limit
+        self.updated_at = time.monotonic()
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+_in_flight: dict[str, _Limiter] = {}
+_in_flight_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def concurrency_limit(provider: str) -> Optional[int]:
+    """In-flight calls the request budget sustains: rpm / 60 x p95 latency."""
+    rpm, _ = limits_for(provider)
+    if rpm <= 0:
+        return None
+    from app.ai_assistant.router import get_router
+
+    health = get_router().health(provider)
+    latency = (health.latency_percentile(0.95) or health.prior_latency) if health else 2.0
+    return max(2, math.ceil(rpm / 60 * latency) + 1)
+
+
+def _limiter(provider: str) -> Optional[_Limiter]:
+    global _in_flight_loop
+    loop = asyncio.get_running_loop()
+    if _in_flight_loop is not loop:
+        # Celery tasks may run each job on a fresh event loop
+        _in_flight.clear()
+        _in_flight_loop = loop
+    limiter = _in_flight.get(provider)
+    if limiter is not None and time.monotonic() - limiter.updated_at < _LIMIT_REFRESH_SECONDS:
+        return limiter
+
+    limit = concurrency_limit(provider)
+    if limit is None:
+        _in_flight.pop(provider, None)
+        return None
+    if limiter is None:
+        limiter = _in_flight[provider] = _Limiter(limit)
+    else:
+        limiter.resize(limit)
+    return limiter
+
+
+async def _enter(provider: str, tokens: int, max_wait: Optional[float]) -> Optional[_Limiter]:
+    """Take an in-flight slot and the budget; returns the limiter to release."""
+    if max_wait is None:
+        max_wait = 0.0 if failover_available() else settings.AI_RATE_LIMIT_MAX_WAIT_SECONDS
+    start = time.monotonic()
+    limiter = _limiter(provider)
+    if limiter is None:
+        await acquire(provider, tokens, max_wait)
+        return None
+    try:
+        if max_wait <= 0 and limiter.locked():
+            raise TimeoutError
+        async with asyncio.timeout(max_wait if max_wait > 0 else None):
+            await limiter.acquire()
+    except TimeoutError:
+        ai_rate_limited_total.labels(provider=provider).inc()
+        raise ProviderRateLimited(provider, 1.0) from None
+    try:
+        await acquire(provider, tokens, max(0.0, max_wait - (time.monotonic() - start)))
+    except BaseException:
+        limiter.release()
+        raise
+    return limiter
+
+
+@asynccontextmanager
+async def slot(provider: str, tokens: int, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+    """Hold an in-flight slot and budget for one provider call."""
+    limiter = await _enter(provider, tokens, max_wait)
+    try:
+        yield
+    finally:
+        if limiter is not None:
+            limiter.release()
+
+
+async def stream(
+    provider: str, tokens: int, chunks: AsyncIterator[str], max_wait: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield a provider stream under the budget.
+
+    The in-flight slot is held until the first chunk arrives; after that
+    the call is paced by its reader, not by the provider.
+    """
+    limiter = await _enter(provider, tokens, max_wait)
+    try:
+        async for chunk in chunks:
+            if limiter is not None:
+                limiter.release()
+                limiter = None
+            yield chunk
+    finally:
+        if limiter is not None:
+            limiter.release()
@@ -1,6 +1,11 @@
 """Async retry helper with exponential backoff for AI provider calls."""
 
 import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Optional
 
 import structlog
 
@@ -11,6 +16,54 @@ BACKOFF_SECONDS = [1, 2, 4]
 
 TRANSIENT_STATUS_CODES = {429, 502, 503}
 
+# Set by the provider router while another provider can take the call:
+# failing fast beats sleeping on a provider that may be down for minutes.
+_failover_available: ContextVar[bool] = ContextVar("ai_failover_available", default=False)
+
+
+def failover_available() -> bool:
+    return _failover_available.get()
+
+
+@contextmanager
+def failover_mode(enabled: bool = True):
+    token = _failover_available.set(enabled)
+    try:
+        yield
+    finally:
+        _failover_available.reset(token)
+
+
+def status_code(exc: Exception) -> Optional[int]:
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if not status and hasattr(exc, "response"):
+        resp = exc.response
+        status = getattr(resp, "status_code", None) or getattr(resp, "status", None)
+    try:
+        return int(status) if status else None
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Seconds from a 429's Retry-After header (delta or HTTP date), else None."""
+    if status_code(exc) != 429:
+        return None
+    if getattr(exc, "retry_after", None) is not None:
+        return max(0.0, float(exc.retry_after))
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
 
 def is_transient(exc: Exception) -> bool:
     if isinstance(exc, (TimeoutError, ConnectionError, OSError)):
@@ -21,20 +74,15 @@ def is_transient(exc: Exception) -> bool:
             return True
     except ImportError:
         pass
-    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
-    if status and int(status) in TRANSIENT_STATUS_CODES:
-        return True
-    if hasattr(exc, "response"):
-        resp = exc.response
-        resp_status = getattr(resp, "status_code", None) or getattr(resp, "status", None)
-        if resp_status and int(resp_status) in TRANSIENT_STATUS_CODES:
-            return True
-    return False
+    return status_code(exc) in TRANSIENT_STATUS_CODES
 
 
 async def with_retries(coro_fn, *, provider: str):
     """Call an async callable with retry on transient errors.
 
+    Honors 429 Retry-After (gives up when it exceeds the backoff budget)
+    and makes a single attempt under ``failover_mode``.
+
     Args:
         coro_fn: Zero-arg async callable that returns the result.
         provider: Provider name for logging.
@@ -46,9 +94,15 @@ async def with_retries(coro_fn, *, provider: str):
         try:
             return await coro_fn()
         except Exception as exc:
-            if attempt == MAX_RETRIES or not is_transient(exc):
+            if attempt == MAX_RETRIES or not is_transient(exc) or _failover_available.get():
                 raise
             delay = BACKOFF_SECONDS[attempt - 1]
+            retry_after = retry_after_seconds(exc)
+            if retry_after is not None:
+                if retry_after > BACKOFF_SECONDS[-1]:
+                    # Rate limited for longer than we would wait in total
+                    raise
+                delay = max(delay, retry_after)
             logger.warning(
                 "provider_retry",
                 provider=provider,
@@ -0,0 +1,306 @@
+"""
+Latency-aware AI provider router.
+
+Keeps a rolling window of latencies and outcomes per provider and picks,
+for each call, the provider with the lowest expected latency within the
+requested cost tier:
+
+    expected = (0.7 * p50 + 0.3 * p95) / success_rate
+
+Providers with fewer than AI_ROUTER_MIN_SAMPLES recent samples use a prior
+latency instead, so stale stats decay back to the prior once their samples
+leave the window.  A provider is skipped while:
+
+- its circuit breaker (core.circuit_breaker) is OPEN;
+- it is inside a 429 ``Retry-After`` window;
+- it reported missing credentials (re-checked after a few minutes).
+
+On failure the next candidate is tried at once; retry.with_retries does
+not sleep on a provider while the router can fail over.  Breaker state
+and routing decisions are exported as Prometheus metrics.
+"""
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+from app.ai_assistant.retry import failover_mode, retry_after_seconds, status_code
+from app.config import settings
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from app.metrics import (
+    ai_provider_circuit_state,
+    ai_provider_latency_seconds,
+    ai_router_decisions_total,
+    ai_router_skips_total,
+)
+
+logger = structlog.get_logger(__name__)
+
+COST_TIERS = ["free", "low", "medium", "high"]
+
+# name -> (cost tier, prior latency in seconds)
+PROVIDERS: dict[str, tuple[str, float]] = {
+    "groq": ("free", 1.0),
+    "gemini": ("free", 2.0),
+    "claude": ("high", 4.0),
+}
+
+_UNCONFIGURED_RECHECK_SECONDS = 300.0
+_DEFAULT_RATE_LIMIT_SECONDS = 5.0  # 429 without a usable Retry-After
+_STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class NoProviderAvailable(RuntimeError):
+    """Every candidate provider was skipped or failed."""
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling latency/outcome window and availability for one provider."""
+
+    name: str
+    cost_tier: str
+    prior_latency: float
+    breaker: CircuitBreaker
+    samples: deque = field(default_factory=deque)  # (monotonic time, latency seconds, ok)
+    retry_after_until: float = 0.0
+    unconfigured_until: float = 0.0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - settings.AI_ROUTER_WINDOW_SECONDS
+        while self.samples and self.samples[0][0] < cutoff:
+            self.samples.popleft()
+        while len(self.samples) > settings.AI_ROUTER_MAX_SAMPLES:
+            self.samples.popleft()
+
+    def record(self, latency: float, ok: bool, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.samples.append((now, latency, ok))
+        self._trim(now)
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        now = time.monotonic() if now is None else now
+        self._trim(now)
+        latencies = sorted(s[1] for s in self.samples if s[2])
+        total = len(self.samples)
+        errors = sum(1 for s in self.samples if not s[2])
+        warm = total >= settings.AI_ROUTER_MIN_SAMPLES and latencies
+        p50 = _percentile(latencies, 0.5) if warm else self.prior_latency
+        p95 = _percentile(latencies, 0.95) if warm else self.prior_latency
+        error_rate = errors / total if total else 0.0
+        # A couple of errors on a cold provider should not demote it for the whole window
+        smoothed_error_rate = errors / max(total, settings.AI_ROUTER_MIN_SAMPLES)
+        return {
+            "provider": self.name,
+            "cost_tier": self.cost_tier,
+            "samples": total,
+            "p50_ms": round(p50 * 1000),
+            "p95_ms": round(p95 * 1000),
+            "error_rate": round(error_rate, 3),
+            "expected_ms": round(self.expected_latency(p50, p95, smoothed_error_rate) * 1000),
+            "circuit": self.breaker.stats.state.value,
+            "retry_after_s": round(max(0.0, self.retry_after_until - now), 1),
+            "configured": self.unconfigured_until <= now,
+        }
+
+    def latency_percentile(self, q: float, now: Optional[float] = None) -> Optional[float]:
+        """Percentile of recent successful latencies, None while cold."""
+        self._trim(time.monotonic() if now is None else now)
+        latencies = sorted(s[1] for s in self.samples if s[2])
+        if len(latencies) < settings.AI_ROUTER_MIN_SAMPLES:
+            return None
+        return _percentile(latencies, q)
+
+    @staticmethod
+    def expected_latency(p50: float, p95: float, error_rate: float) -> float:
+        return (0.7 * p50 + 0.3 * p95) / max(1.0 - error_rate, 0.05)
+
+    def skip_reason(self, now: float) -> Optional[str]:
+        if self.unconfigured_until > now:
+            return "not_configured"
+        if self.retry_after_until > now:
+            return "rate_limited"
+        if not self.breaker.allows_request():
+            return "circuit_open"
+        return None
+
+
+class _NotAnOutage(Exception):
+    """Wraps an error the breaker should not count (see CircuitBreaker.ignore_exceptions)."""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+class ProviderRouter:
+    """Routes calls across providers by expected latency and health."""
+
+    def __init__(self, providers: Optional[dict[str, tuple[str, float]]] = None) -> None:
+        self._health: dict[str, ProviderHealth] = {}
+        for name, (tier, prior) in (providers or PROVIDERS).items():
+            self._health[name] = ProviderHealth(
+                name=name,
+                cost_tier=tier,
+                prior_latency=prior,
+                breaker=CircuitBreaker(
+                    name=f"ai:{name}",
+                    failure_threshold=settings.AI_ROUTER_BREAKER_FAILURES,
+                    recovery_timeout=settings.AI_ROUTER_BREAKER_RECOVERY_SECONDS,
+                    half_open_max_calls=1,
+                    window_size=settings.AI_ROUTER_WINDOW_SECONDS,
+                    ignore_exceptions=(_NotAnOutage,),
+                ),
+            )
+            ai_provider_circuit_state.labels(provider=name).set(0)
+
+    def health(self, name: str) -> Optional[ProviderHealth]:
+        return self._health.get(name)
+
+    def rank(self, cost_tier: str = "high", escalate: bool = False) -> list[str]:
+        """
+        Usable providers, best first.
+
+        Providers within ``cost_tier`` are ordered by expected latency; with
+        ``escalate`` the pricier ones follow (cheapest tier first) as a
+        last resort.
+        """
+        now = time.monotonic()
+        max_tier = COST_TIERS.index(cost_tier) if cost_tier in COST_TIERS else len(COST_TIERS) - 1
+        within, above = [], []
+        for health in self._health.values():
+            reason = health.skip_reason(now)
+            if reason:
+                ai_router_skips_total.labels(provider=health.name, reason=reason).inc()
+                continue
+            tier = COST_TIERS.index(health.cost_tier)
+            expected = health.snapshot(now)["expected_ms"]
+            if tier <= max_tier:
+                within.append((expected, health.name))
+            elif escalate:
+                above.append((tier, expected, health.name))
+        return [name for _, name in sorted(within)] + [name for _, _, name in sorted(above)]
+
+    def observe(self, name: str, latency: float, error: Optional[Exception] = None) -> None:
+        """
+        Record an outcome for a call made outside ``call`` (explicit provider).
+
+        The outcome also feeds the provider's breaker, so a provider that is
+        only ever called by name still trips it.
+        """
+        health = self._health.get(name)
+        if health is None:
+            return
+        if self._classify(health, latency, error):
+            health.breaker.record_failure(error)
+        elif error is None:
+            health.breaker.record_success()
+        self._export_state(health)
+
+    def _classify(self, health: ProviderHealth, latency: float, error: Optional[Exception]) -> bool:
+        """Record the outcome; returns True when the error should count against the breaker."""
+        outcome = "ok" if error is None else "error"
+        ai_provider_latency_seconds.labels(provider=health.name, outcome=outcome).observe(latency)
+        if error is None:
+            health.record(latency, ok=True)
+            return False
+
+        now = time.monotonic()
+        if "not configured" in str(error):
+            health.unconfigured_until = now + _UNCONFIGURED_RECHECK_SECONDS
+            return False
+        retry_after = retry_after_seconds(error)
+        if retry_after is None and status_code(error) == 429:
+            retry_after = _DEFAULT_RATE_LIMIT_SECONDS
+        if retry_after is not None:
+            wait = min(retry_after, settings.AI_ROUTER_MAX_RETRY_AFTER_SECONDS)
+            health.retry_after_until = max(health.retry_after_until, now + wait)
+            logger.info("ai_router_rate_limited", provider=health.name, retry_after=wait)
+            return False
+        health.record(latency, ok=False)
+        return True
+
+    async def call(
+        self,
+        fn: Callable[[str], Awaitable[Any]],
+        cost_tier: str = "high",
+        escalate: bool = False,
+    ) -> tuple[str, Any]:
+        """
+        Call ``fn(provider_name)`` on the best provider, failing over in order.
+
+        Returns (provider_name, result).  Raises NoProviderAvailable when
+        every candidate was skipped or failed.
+        """
+        candidates = self.rank(cost_tier, escalate)
+        errors: list[str] = []
+        for position, name in enumerate(candidates):
+            health = self._health[name]
+            if health.skip_reason(time.monotonic()):
+                # Tripped by a concurrent call since ranking
+                continue
+            start = time.monotonic()
+            try:
+                with failover_mode(position < len(candidates) - 1):
+                    result = await health.breaker.call(self._timed, health, fn)
+            except CircuitOpenError:
+                ai_router_skips_total.labels(provider=name, reason="circuit_open").inc()
+                continue
+            except Exception as exc:
+                errors.append(f"{name}: {str(exc)[:200]}")
+                logger.warning("ai_router_provider_failed", provider=name, error=str(exc)[:300])
+                continue
+            finally:
+                self._export_state(health)
+
+            reason = "best" if position == 0 else "failover"
+            ai_router_decisions_total.labels(provider=name, reason=reason).inc()
+            logger.debug("ai_router_decision", provider=name, reason=reason,
+                         latency_ms=round((time.monotonic() - start) * 1000))
+            return name, result
+
+        raise NoProviderAvailable(
+            "All AI providers failed: " + "; ".join(errors) if errors
+            else "No AI provider available (circuit open, rate limited or not configured)"
+        )
+
+    async def _timed(self, health: ProviderHealth, fn: Callable[[str], Awaitable[Any]]) -> Any:
+        """Run one attempt; only errors that signal provider trouble reach the breaker."""
+        start = time.monotonic()
+        try:
+            result = await fn(health.name)
+        except Exception as exc:
+            if self._classify(health, time.monotonic() - start, exc):
+                raise
+            # Rate limits and missing credentials are not outages
+            raise _NotAnOutage(exc) from exc
+        self._classify(health, time.monotonic() - start, None)
+        return result
+
+    def _export_state(self, health: ProviderHealth) -> None:
+        state = health.breaker.stats.state
+        ai_provider_circuit_state.labels(provider=health.name).set(_STATE_VALUES[state])
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [health.snapshot(now) for health in self._health.values()]
+
+
+_router: Optional[ProviderRouter] = None
+
+
+def get_router() -> ProviderRouter:
+    """Process-wide router shared by litellm_proxy and AIAssistantService."""
+    global _router
+    if _router is None:
+        _router = ProviderRouter()
+    return _router
@@ -10,7 +10,8 @@ import structlog
 from app.ai_assistant.schemas import (
     TextProcessingRequest,
     TextProcessingResponse,
-    ProviderInfo
+    ProviderInfo,
+    ProviderHealthInfo,
 )
 from app.ai_assistant.service import AIAssistantService
 from app.ai_assistant.classification.content_classifier import ContentClassifier
@@ -53,6 +54,19 @@ async def list_providers(
         )
 
 
+@router.get("/providers/health", response_model=List[ProviderHealthInfo])
+async def provider_health(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Rolling latency, error rate and circuit state per provider, as used by
+    the provider router for this API process.
+    """
+    from app.ai_assistant.router import get_router
+
+    return get_router().stats()
+
+
 @router.post("/process-text", response_model=TextProcessingResponse)
 async def process_text(
     request: TextProcessingRequest,
@@ -99,6 +99,20 @@ class ProviderInfo(BaseModel):
     priority: int = Field(default=999, description="Priority (1=highest)")
 
 
+class ProviderHealthInfo(BaseModel):
+    """Rolling routing stats for one provider (see ai_assistant.router)."""
+    provider: str
+    cost_tier: str
+    samples: int
+    p50_ms: int
+    p95_ms: int
+    error_rate: float
+    expected_ms: int
+    circuit: str
+    retry_after_s: float
+    configured: bool
+
+
 class ProviderConfigUpdate(BaseModel):
     """
     Schema for updating provider configuration.
@@ -5,10 +5,12 @@ import time
 import structlog
 from typing import Optional, Dict, Any, AsyncGenerator
 from collections import OrderedDict
+from contextlib import nullcontext
 from datetime import UTC, datetime
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.ai_assistant import rate_limits
 from app.ai_assistant.providers.base import BaseAIProvider
 from app.ai_assistant.providers import GeminiProvider, ClaudeProvider, GroqProvider
 from app.metrics import ai_provider_requests_total
@@ -22,19 +24,17 @@ from app.ai_assistant.classification.enums import SelectionStrategy
 logger = structlog.get_logger(__name__)
 
 _USER_CONCURRENCY_LIMIT = 5
-_GLOBAL_CONCURRENCY_LIMIT = 10
 _MAX_SEMAPHORES = 1024
 
 _user_semaphores: OrderedDict[UUID, asyncio.Semaphore] = OrderedDict()
-_global_semaphore: asyncio.Semaphore | None = None
+# Anonymous calls have no per-user cap; provider in-flight limits and
+# rate-limit buckets (rate_limits.slot) bound them instead.
+_NO_USER_LIMIT = nullcontext()
 
 
-def _get_user_semaphore(user_id: Optional[UUID]) -> asyncio.Semaphore:
-    global _global_semaphore
+def _get_user_semaphore(user_id: Optional[UUID]) -> asyncio.Semaphore | nullcontext:
     if user_id is None:
-        if _global_semaphore is None:
-            _global_semaphore = asyncio.Semaphore(_GLOBAL_CONCURRENCY_LIMIT)
-        return _global_semaphore
+        return _NO_USER_LIMIT
 
     if user_id in _user_semaphores:
         _user_semaphores.move_to_end(user_id)
@@ -138,26 +138,30 @@ class AIAssistantService:
             str: Name of the best provider
         """
         exclude = exclude or []
-        available_providers = [p for p in cls._fallback_order if p not in exclude]
-        
+        from app.ai_assistant.router import get_router
+
+        # Healthy providers by expected latency (free tier first when preferred),
+        # then any the router currently skips, in the static fallback order
+        ranked = get_router().rank("free" if prefer_free else "high", escalate=True)
+        ranked += [p for p in cls._fallback_order if p not in ranked]
+        available_providers = [p for p in ranked if p not in exclude]
+
         if not available_providers:
             raise ValueError("No providers available")
-        
-        if prefer_free:
-            # Find first free provider
-            for provider_name in available_providers:
-                try:
-                    provider = cls.get_provider(provider_name)
-                    if provider.is_free:
-                        logger.info(
-                            "best_provider_selected",
-                            provider=provider_name,
-                            reason="free_and_available"
-                        )
-                        return provider_name
-                except Exception:
-                    continue
-        
+
+        for provider_name in available_providers:
+            try:
+                provider = cls.get_provider(provider_name)
+                if provider.is_free or not prefer_free:
+                    logger.info(
+                        "best_provider_selected",
+                        provider=provider_name,
+                        reason="router_ranked"
+                    )
+                    return provider_name
+            except Exception:
+                continue
+
         # Return first available
         best = available_providers[0]
         logger.info(
@@ -166,7 +170,7 @@ class AIAssistantService:
             reason="first_available"
         )
         return best
-    
+
     @classmethod
     def list_providers(cls) -> list[dict]:
         """
@@ -486,7 +490,8 @@ Contenu restructuré :"""
             processed_text = ""
 
             try:
-                processed_text = await provider.complete(prompt)
+                async with rate_limits.slot(provider_name, rate_limits.estimate_tokens(prompt)):
+                    processed_text = await provider.complete(prompt)
 
                 ai_provider_requests_total.labels(
                     provider=provider_name, success="true"
@@ -703,33 +708,80 @@ Contenu restructuré :"""
         provider_name: str = "gemini",
         user_id: Optional[UUID] = None,
         module: str = "general",
+        hedge: bool = False,
+        tenant_id: Optional[UUID] = None,
     ) -> dict:
         """Process text using a specific provider.
 
         Auto-routes through LiteLLM proxy if available (exact token counting + cost).
         Falls back to direct provider calls if LiteLLM is not installed.
+
+        ``provider_name="auto"`` lets the provider router pick the fastest
+        healthy provider.  A named provider whose circuit is open, or that
+        is inside a rate-limit window, is replaced by the router's choice.
+
+        ``hedge=True`` (interactive paths) races a backup provider when the
+        primary is slow, if the tenant opted in (see ai_assistant.hedging).
         """
+        from app.ai_assistant import hedging
+        from app.ai_assistant.router import get_router
+
+        router = get_router()
+        health = router.health(provider_name)
         sem = _get_user_semaphore(user_id)
         async with sem:
-            # Try LiteLLM proxy first (better cost tracking, unified API)
+            if provider_name == "auto" or (health and health.skip_reason(time.monotonic())):
+                cost_tier = health.cost_tier if health else "free"
+                _, result = await router.call(
+                    lambda name: AIAssistantService._complete(text, task, name, user_id, module),
+                    cost_tier=cost_tier,
+                    escalate=True,
+                )
+                return result
+
+            if hedge and health and hedging.enabled_for(tenant_id):
+                return await hedging.hedged_complete(
+                    lambda name: AIAssistantService._complete(text, task, name, user_id, module),
+                    provider_name,
+                    tenant_id=tenant_id,
+                )
+
+            start = time.monotonic()
             try:
-                from app.ai_assistant.litellm_proxy import is_available as litellm_available, complete as litellm_complete
-                if litellm_available():
-                    return await litellm_complete(
-                        text=f"Task: {task}\n\n{text}",
-                        provider_name=provider_name,
-                        user_id=user_id,
-                        module=module,
-                        task=task,
-                    )
+                result = await AIAssistantService._complete(text, task, provider_name, user_id, module)
             except Exception as e:
-                logger.debug("litellm_proxy_fallback", error=str(e))
+                router.observe(provider_name, time.monotonic() - start, e)
+                raise
+            router.observe(provider_name, time.monotonic() - start)
+            return result
 
-            # Fallback: direct provider calls (original implementation)
-            return await AIAssistantService._process_text_direct(
-                text=text, task=task, provider_name=provider_name,
-                user_id=user_id, module=module,
-            )
+    @staticmethod
+    async def _complete(
+        text: str,
+        task: str,
+        provider_name: str,
+        user_id: Optional[UUID],
+        module: str,
+    ) -> dict:
+        # Try LiteLLM proxy first (better cost tracking, unified API)
+        try:
+            from app.ai_assistant.litellm_proxy import is_available as litellm_available, complete as litellm_complete
+            if litellm_available():
+                return await litellm_complete(
+                    text=f"Task: {task}\n\n{text}",
+                    provider_name=provider_name,
+                    user_id=user_id,
+                    module=module,
+                    task=task,
+                )
+        except Exception as e:
+            logger.debug("litellm_proxy_fallback", error=str(e))
+
+        # Fallback: direct provider calls (original implementation)
+        return await AIAssistantService._process_text_direct(
+            text=text, task=task, provider_name=provider_name,
+            user_id=user_id, module=module,
+        )
 
     @staticmethod
     async def _process_text_direct(
@@ -763,7 +815,13 @@ Contenu restructuré :"""
         result = ""
 
         try:
-            result = await provider.complete(prompt)
+            async with rate_limits.slot(provider_name, rate_limits.estimate_tokens(prompt)):
+                result = await provider.complete(prompt)
+        except asyncio.CancelledError:
+            # Hedged request lost the race: still record the spend
+            success = False
+            error_msg = "cancelled"
+            raise
         except Exception as e:
             success = False
             error_msg = str(e)
@@ -802,7 +860,9 @@ Contenu restructuré :"""
         task: str,
         target_language: Optional[str] = None,
         strategy: SelectionStrategy = SelectionStrategy.BALANCED,
-        user_id: Optional[UUID] = None
+        user_id: Optional[UUID] = None,
+        hedge: bool = False,
+        tenant_id: Optional[UUID] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Stream text processing using the AI Router pipeline.
@@ -822,6 +882,9 @@ Contenu restructuré :"""
                   {"provider": "groq", "model": "...", "classification": {...}}
                   Subsequent yields contain token chunks:
                   {"token": "chunk_text"}
+                  With ``hedge=True`` a backup provider that wins the race
+                  is announced before its tokens:
+                  {"provider": "gemini", "hedged": True}
         """
         # 1. Classification (0 cost, <50ms)
         classification = ContentClassifier.classify(
@@ -889,13 +952,29 @@ Contenu restructuré :"""
         # 5. Stream tokens from the provider (under per-user concurrency limit)
         sem = _get_user_semaphore(user_id)
         async with sem:
+            from app.ai_assistant import hedging
+
+            if hedge and hedging.enabled_for(tenant_id):
+                # Cost tracking for both contenders happens in hedged_stream
+                async for served_by, chunk in hedging.hedged_stream(
+                    prompt, provider_name, user_id=user_id,
+                    module="stream_processing", action=task, tenant_id=tenant_id,
+                ):
+                    if served_by != provider_name:
+                        provider_name = served_by
+                        yield {"provider": served_by, "hedged": True}
+                    yield {"token": chunk}
+                return
+
             start_time = time.monotonic()
             collected_output = []
             stream_success = True
             stream_error = None
 
             try:
-                async for chunk in provider.stream_chat(prompt):
+                async for chunk in rate_limits.stream(
+                    provider_name, rate_limits.estimate_tokens(prompt), provider.stream_chat(prompt),
+                ):
                     collected_output.append(chunk)
                     yield {"token": chunk}
             except Exception as e:
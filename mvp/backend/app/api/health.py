@@ -6,6 +6,9 @@ Three probes following K8s conventions:
 - /health/ready  -> readiness (200 only when Postgres + Redis respond)
 - /health/startup -> startup  (200 only after the application has finished booting)
 
+Outside production, /health/startup/profile reports per-module import cost
+and which optional dependencies are installed / loaded.
+
 Usage:
     from app.api.health import router as health_router, mark_startup_complete
     app.include_router(health_router)
@@ -16,10 +19,11 @@ import asyncio
 import time
 
 import structlog
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
+from app.config import settings
 from app.database import engine
 from app.cache import _get_redis
 
@@ -131,3 +135,19 @@ async def startup():
         "uptime_seconds": round(time.time() - _startup_time, 2),
         "modules_loaded": len(_modules_loaded),
     }
+
+
+@router.get("/startup/profile")
+async def startup_profile():
+    """Per-module import time / RSS and optional dependency status (non-production only)."""
+    if settings.ENVIRONMENT == "production":
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    from app.core.optional_deps import capabilities
+    from app.modules import ModuleRegistry
+
+    return {
+        "startup_complete": _startup_complete,
+        "imports": ModuleRegistry.get_import_profile(),
+        "optional_dependencies": capabilities(),
+    }
@@ -17,6 +17,18 @@ celery_app = Celery(
     "saas_ia",
     broker=_redis_url,
     backend=_redis_url,
+    # app.tasks holds one module per concern (no tasks.py), so autodiscovery
+    # does not find them: list them explicitly.
+    include=[
+        "app.tasks.outbox_worker",
+        "app.tasks.secrets_checker",
+        "app.tasks.quota_reconciler",
+        "app.tasks.usage_rollups",
+        "app.tasks.search_reindex",
+        "app.tasks.vector_index",
+        "app.tasks.crawl_cache",
+        "app.tasks.frontier_crawl",
+    ],
 )
 
 celery_app.conf.update(
@@ -40,6 +52,38 @@ celery_app.conf.update(
             "task": "outbox.cleanup",
             "schedule": crontab(hour=3, minute=0),  # daily at 03:00 UTC
         },
+        "billing-reconcile-quotas": {
+            "task": "billing.reconcile_quotas",
+            "schedule": 30.0,  # every 30 seconds
+        },
+        "billing-reset-quotas": {
+            "task": "billing.reset_quotas",
+            "schedule": crontab(hour=0, minute=5),  # daily at 00:05 UTC
+        },
+        "cost-tracker-compact-usage": {
+            "task": "cost_tracker.compact_usage",
+            "schedule": 600.0,  # every 10 minutes
+        },
+        "cost-tracker-prune-usage-logs": {
+            "task": "cost_tracker.prune_usage_logs",
+            "schedule": crontab(hour=4, minute=0),  # daily at 04:00 UTC
+        },
+        "unified-search-delta-sync": {
+            "task": "unified_search.delta_sync",
+            "schedule": crontab(hour=2, minute=30),  # daily at 02:30 UTC
+        },
+        "knowledge-sync-tenant-vector-indexes": {
+            "task": "knowledge.sync_tenant_vector_indexes",
+            "schedule": crontab(hour=3, minute=30),  # daily at 03:30 UTC
+        },
+        "web-crawler-prune-crawl-cache": {
+            "task": "web_crawler.prune_crawl_cache",
+            "schedule": crontab(hour=4, minute=30),  # daily at 04:30 UTC
+        },
+        "web-crawler-resume-frontier-crawls": {
+            "task": "web_crawler.resume_frontier_crawls",
+            "schedule": 300.0,  # every 5 minutes
+        },
         "secrets-check-rotations": {
             "task": "secrets.check_rotations",
             "schedule": crontab(hour=6, minute=0),  # daily at 06:00 UTC
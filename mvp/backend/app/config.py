@@ -74,7 +74,186 @@ class Settings(BaseSettings):
     
     # Logging
     LOG_LEVEL: str = "INFO"
-    
+
+    # AI usage rollups (cost_tracker): raw ai_usage_logs are compacted into
+    # hourly/daily buckets once an hour is older than the lag, and pruned
+    # after the retention window.
+    USAGE_ROLLUP_LAG_SECONDS: int = 300
+    USAGE_LOG_RETENTION_DAYS: int = 90
+
+    # AI usage writer: track_ai_usage() queues rows for a background task that
+    # bulk-inserts them. "sync" writes each row inline (used by tests).
+    USAGE_WRITER_MODE: str = "async"
+    USAGE_WRITER_QUEUE_SIZE: int = 10000
+    USAGE_WRITER_BATCH_SIZE: int = 500
+    USAGE_WRITER_FLUSH_MS: int = 250
+
+    # Unified search (PostgreSQL fallback): per-source deadline. Sources run
+    # concurrently; one that misses its deadline is reported as partial.
+    UNIFIED_SEARCH_SOURCE_TIMEOUT_MS: int = 800
+
+    # Knowledge base vector search (pgvector). Tenants up to EXACT_MAX_CHUNKS
+    # embedded chunks are searched exactly; tenants above TENANT_INDEX_MIN_CHUNKS
+    # get their own partial HNSW index (nightly sync). IVFFLAT_LISTS=0 derives
+    # lists from the row count.
+    KNOWLEDGE_ANN_METHOD: str = "hnsw"
+    KNOWLEDGE_HNSW_M: int = 16
+    KNOWLEDGE_HNSW_EF_CONSTRUCTION: int = 64
+    KNOWLEDGE_HNSW_EF_SEARCH: int = 40
+    KNOWLEDGE_IVFFLAT_LISTS: int = 0
+    KNOWLEDGE_IVFFLAT_PROBES: int = 10
+    KNOWLEDGE_ANN_EXACT_MAX_CHUNKS: int = 20000
+    KNOWLEDGE_ANN_TENANT_INDEX_MIN_CHUNKS: int = 200000
+
+    # PDF processor: extraction and OCR run in a pool of WORKER_PROCESSES
+    # (0 = min(4, CPUs)) over ranges of PAGES_PER_TASK pages.  Each PDF's
+    # chunks, TF-IDF weights and embeddings are stored next to the file at
+    # upload (pdf_processor.chunk_index) so queries only retrieve.
+    PDF_WORKER_PROCESSES: int = 0
+    PDF_PAGES_PER_TASK: int = 16
+    PDF_OCR_PAGES_PER_TASK: int = 2
+    PDF_OCR_DPI: int = 300
+
+    # Local inference server (python -m app.inference.server): owns local ML
+    # models once per host. Empty socket path = every process loads its own.
+    INFERENCE_SOCKET_PATH: str = ""
+    INFERENCE_PRELOAD_MODELS: str = "embedding"
+    INFERENCE_MAX_BATCH: int = 32
+    INFERENCE_MAX_WAIT_MS: int = 5
+    INFERENCE_TIMEOUT_SECONDS: float = 30.0
+    INFERENCE_METRICS_PORT: int = 9109
+
+    # Pooled HTTP crawler engine (web_crawler.http_engine): one shared client
+    # per process for HTTP-only scraping, seeding and the Jina fallback.
+    # HTTP/2 is used when the h2 package is installed.
+    CRAWLER_HTTP_MAX_CONNECTIONS: int = 200
+    CRAWLER_HTTP_MAX_PER_HOST: int = 8
+    CRAWLER_HTTP_TIMEOUT_SECONDS: float = 20.0
+    CRAWLER_HTTP_DNS_TTL_SECONDS: float = 300.0
+    CRAWLER_HTTP_MAX_BYTES: int = 5_000_000
+
+    # Crawl page cache (web_crawler.page_cache): bodies and rendered results
+    # on disk (content-addressed, gzip), metadata in Redis.  Internal callers
+    # (agents, workflows, pipelines, KB indexing) accept pages up to
+    # DEFAULT_MAX_AGE old; API callers choose max_age per request.
+    CRAWL_CACHE_ENABLED: bool = True
+    CRAWL_CACHE_DIR: str = "/tmp/saas_ia_crawl_cache"
+    CRAWL_CACHE_RETENTION_DAYS: int = 7
+    CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS: int = 3600
+
+    # Browser pool (web_crawler.browser_pool): warm browsers per configuration
+    # for scrapes with proxy / user agent / stealth / browser_type options.
+    # PREWARM is a comma list of "stealth", "no-js" or browser types.
+    BROWSER_POOL_MAX_BROWSERS: int = 4
+    BROWSER_POOL_CONTEXTS_PER_BROWSER: int = 5
+    BROWSER_POOL_DEFAULT_MAX_PAGES: int = 10
+    BROWSER_POOL_RECYCLE_AFTER_PAGES: int = 200
+    BROWSER_POOL_MEMORY_LIMIT_PERCENT: float = 85.0
+    BROWSER_POOL_IDLE_SECONDS: int = 300
+    BROWSER_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 60.0
+    BROWSER_POOL_PREWARM: str = ""
+
+    # Frontier crawls (web_crawler.frontier): persistent site-wide crawl jobs.
+    # Per-host request rate is lowered further by robots.txt Crawl-delay;
+    # pages within SIMHASH_MAX_DISTANCE bits of an earlier page are skipped.
+    FRONTIER_CONCURRENCY: int = 16
+    FRONTIER_HOST_RATE_PER_SECOND: float = 2.0
+    FRONTIER_HOST_BURST: int = 4
+    FRONTIER_MAX_ATTEMPTS: int = 3
+    FRONTIER_ROBOTS_MAX_AGE_SECONDS: int = 86400
+    FRONTIER_SIMHASH_MAX_DISTANCE: int = 3
+    FRONTIER_STALE_SECONDS: int = 300
+
+    # Agent runs (agents.executor): plan steps run as soon as their
+    # dependencies finish, at most MAX_PARALLEL_STEPS per run.
+    AGENT_MAX_PARALLEL_STEPS: int = 8
+
+    # Background runs (core.run_supervisor): workflow, pipeline and crew runs
+    # started over the API execute as tasks in the API process; a user can
+    # have at most MAX_PER_USER of them going at once (all kinds together).
+    BACKGROUND_RUNS_MAX_PER_USER: int = 3
+    BACKGROUND_RUNS_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+
+    # Sequential crews (multi_agent_crew.context): what each agent sees of
+    # the earlier ones is capped at BUDGET_TOKENS, of which the scratchpad
+    # of facts and decisions takes at most SCRATCHPAD_TOKENS.
+    CREW_CONTEXT_BUDGET_TOKENS: int = 1500
+    CREW_CONTEXT_SCRATCHPAD_TOKENS: int = 400
+
+    # Action runtime (core.action_runtime) shared by agents, workflows and
+    # pipelines.  CONCURRENCY caps running actions per resource class
+    # (cpu, browser, ml, llm, network) process-wide; ACTION_CONCURRENCY adds
+    # per-action caps and TIMEOUTS overrides registry timeouts, both as
+    # "name=value" lists.
+    ACTION_RUNTIME_CONCURRENCY: str = "cpu=4,browser=8,ml=2,llm=32,network=64"
+    ACTION_RUNTIME_ACTION_CONCURRENCY: str = "deep_crawl=2,execute_code=2,generate_video=2"
+    ACTION_RUNTIME_TIMEOUTS: str = ""
+
+    # AI provider router (ai_assistant.router): rolling latency/error window
+    # per provider; a provider's breaker opens after BREAKER_FAILURES errors
+    # in the window and is probed again after BREAKER_RECOVERY_SECONDS.
+    AI_ROUTER_WINDOW_SECONDS: float = 300.0
+    AI_ROUTER_MAX_SAMPLES: int = 500
+    AI_ROUTER_MIN_SAMPLES: int = 5
+    AI_ROUTER_BREAKER_FAILURES: int = 5
+    AI_ROUTER_BREAKER_RECOVERY_SECONDS: float = 30.0
+    AI_ROUTER_MAX_RETRY_AFTER_SECONDS: float = 300.0
+
+    # Hedged AI requests (ai_assistant.hedging) on interactive chat paths:
+    # after the PERCENTILE of the primary's recent latency (first token when
+    # streaming) a backup request goes to the next-best provider.  Opt-in
+    # by tenant id, comma-separated ("*" = everyone); hedges are capped at
+    # MAX_EXTRA_PERCENT of each tenant's requests over the budget window.
+    AI_HEDGING_TENANTS: str = ""
+    AI_HEDGE_PERCENTILE: float = 0.9
+    AI_HEDGE_DEFAULT_DELAY_MS: int = 2000
+    AI_HEDGE_MIN_DELAY_MS: int = 250
+    AI_HEDGE_MAX_EXTRA_PERCENT: float = 10.0
+    AI_HEDGE_BUDGET_WINDOW_SECONDS: int = 300
+
+    # Client-side AI provider rate limits (ai_assistant.rate_limits), shared
+    # across workers through Redis: "provider=requests_per_min:tokens_per_min"
+    # per API key (0 = unlimited; defaults are the providers' free tiers).
+    # Calls wait up to MAX_WAIT_SECONDS for budget, none while the router can
+    # fail over.  OUTPUT_TOKENS is the completion size assumed up front.
+    AI_PROVIDER_RATE_LIMITS: str = "groq=30:12000,gemini=15:1000000,claude=50:40000"
+    AI_RATE_LIMIT_MAX_WAIT_SECONDS: float = 10.0
+    AI_RATE_LIMIT_OUTPUT_TOKENS: int = 512
+
+    # Long-text map-reduce (ai_assistant.long_text) for summaries, chapters
+    # and keywords: texts over CHUNK_TOKENS are split at paragraph/sentence
+    # boundaries, up to MAX_PARALLEL chunks are processed at once, and
+    # chunk-level results are cached by content hash for CACHE_TTL_SECONDS.
+    AI_LONG_TEXT_CHUNK_TOKENS: int = 4000
+    AI_LONG_TEXT_MAX_PARALLEL: int = 8
+    AI_LONG_TEXT_CACHE_TTL_SECONDS: int = 7 * 86400
+
+    # List endpoints (core.pagination): with count=estimate, totals come from
+    # the PostgreSQL planner unless it estimates fewer rows than this, in
+    # which case an exact COUNT(*) is cheap enough to run.
+    PAGINATION_EXACT_COUNT_BELOW: int = 1000
+
+    # Off-row blob store (core.blob_store) for large text/JSON columns:
+    # values over MIN_BYTES are zstd-compressed (gzip without the zstandard
+    # package), stored once per SHA-256 and replaced in the row by a
+    # reference plus a PREVIEW_CHARS preview.  BACKEND is "fs" (under DIR,
+    # shared by API and workers) or "s3" (any S3-compatible endpoint, such
+    # as the MinIO service in docker-compose; needs boto3).
+    BLOB_STORE_BACKEND: str = "fs"
+    BLOB_STORE_DIR: str = "/tmp/saas_ia_blobs"
+    BLOB_STORE_MIN_BYTES: int = 8192
+    BLOB_STORE_PREVIEW_CHARS: int = 200
+    BLOB_STORE_ZSTD_LEVEL: int = 3
+    BLOB_STORE_S3_ENDPOINT: str = ""
+    BLOB_STORE_S3_BUCKET: str = "saas-ia-blobs"
+    BLOB_STORE_S3_REGION: str = "us-east-1"
+    BLOB_STORE_S3_ACCESS_KEY: str = ""
+    BLOB_STORE_S3_SECRET_KEY: str = ""
+
+    # Transcript exports (transcription.export): bulk exports stream a zip of
+    # at most BULK_MAX_ITEMS transcripts, loading one transcript at a time.
+    TRANSCRIPT_EXPORT_BULK_MAX_ITEMS: int = 500
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,219 @@
+"""
+Action Runtime
+==============
+
+One execution path for the platform actions run by agents
+(agents.executor), AI workflows (ai_workflows) and pipelines (pipelines).
+
+Every action has a static ActionSpec declaring its resource class and
+timeout.  ``run()`` wraps an engine's handler with:
+
+- a process-wide semaphore per resource class (cpu, browser, ml, llm,
+  network), so heavy actions from all three engines share one budget,
+  plus optional per-action caps;
+- a uniform timeout: the handler is cancelled and ActionTimeout raised;
+- Prometheus histograms of queue wait and execution time per action and
+  outcome (ok, error, timeout, cancelled).
+
+Orchestration actions (run_workflow, run_crew) take no slot: the actions
+they run acquire their own, and holding one while waiting on them could
+exhaust a class.
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+from app.config import settings
+from app.metrics import action_duration_seconds, action_queue_seconds, actions_in_flight
+
+logger = structlog.get_logger()
+
+
+class ResourceClass(str, Enum):
+    CPU = "cpu"            # local CPU work: code sandbox, PDF parsing, audio editing
+    BROWSER = "browser"    # headless browser pages
+    ML = "ml"              # local (GPU-less) models: Whisper, RoBERTa, TTS
+    LLM = "llm"            # remote AI provider calls
+    NETWORK = "network"    # plain HTTP / third-party APIs
+
+
+class ActionTimeout(TimeoutError):
+    """An action exceeded its runtime timeout and was cancelled."""
+
+    def __init__(self, action: str, timeout: float):
+        super().__init__(f"Action '{action}' timed out after {timeout:g}s")
+        self.action = action
+        self.timeout = timeout
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    name: str
+    resource: Optional[ResourceClass]
+    timeout: float
+
+
+_DEFAULT_TIMEOUTS = {
+    ResourceClass.CPU: 300.0,
+    ResourceClass.BROWSER: 180.0,
+    ResourceClass.ML: 900.0,
+    ResourceClass.LLM: 120.0,
+    ResourceClass.NETWORK: 60.0,
+}
+
+
+def _specs(resource: Optional[ResourceClass], names: str, timeout: Optional[float] = None) -> dict[str, ActionSpec]:
+    default = timeout or _DEFAULT_TIMEOUTS.get(resource, 900.0)
+    return {name: ActionSpec(name, resource, default) for name in names.split()}
+
+
+# Action names across the three engines (agent actions, workflow node
+# actions, pipeline step types).  Unknown actions fall back to LLM, matching
+# the engines' generate fallback.
+ACTIONS: dict[str, ActionSpec] = {
+    **_specs(ResourceClass.BROWSER, """
+        crawl_web crawl web_crawl crawl_and_index adaptive_crawl hub_crawl
+        extract_cosine extract_lxml
+    """),
+    **_specs(ResourceClass.BROWSER, "batch_crawl deep_crawl", timeout=600.0),
+    **_specs(ResourceClass.NETWORK, """
+        scrape_http scrape_pdf seed_web_urls docker_crawl youtube_transcript
+        youtube_metadata instagram_validate search_marketplace webhook_call
+        send_webhook create_webhook create_integration_webhook publish_social
+        notify
+    """),
+    **_specs(ResourceClass.ML, """
+        transcribe transcribe_audio youtube_smart youtube_analyze
+        analyze_sentiment_roberta text_to_speech voice_dub
+        instagram_analyze_reel
+    """),
+    **_specs(ResourceClass.ML, "batch_transcribe youtube_playlist instagram_analyze_profile", timeout=1800.0),
+    **_specs(ResourceClass.CPU, """
+        execute_code process_pdf edit_audio chunk_regex analyze_data condition
+        export transcription analyze_repo scrape_repos generate_podcast
+    """),
+    **_specs(ResourceClass.CPU, "fine_tune", timeout=600.0),
+    **_specs(ResourceClass.LLM, """
+        summarize translate generate generate_text extract_info compare
+        compare_models content_studio generate_content search_knowledge
+        ask_knowledge index_knowledge sentiment analyze_sentiment
+        security_scan analyze_image generate_image upscale_image
+        generate_thumbnail generate_presentation generate_form deploy_chatbot
+        generate_summary generate_clips realtime_chat create_pipeline
+    """),
+    **_specs(ResourceClass.LLM, "generate_video", timeout=600.0),
+    **_specs(None, "run_workflow run_crew", timeout=900.0),
+}
+
+
+def _parse_pairs(raw: str) -> dict[str, str]:
+    pairs = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+def get_spec(action: str) -> ActionSpec:
+    """Registry entry for an action, with any ACTION_RUNTIME_TIMEOUTS override."""
+    spec = ACTIONS.get(action) or ActionSpec(action, ResourceClass.LLM, _DEFAULT_TIMEOUTS[ResourceClass.LLM])
+    override = _parse_pairs(settings.ACTION_RUNTIME_TIMEOUTS).get(action)
+    if override:
+        try:
+            return ActionSpec(spec.name, spec.resource, float(override))
+        except ValueError:
+            logger.warning("action_runtime_bad_timeout", action=action, value=override)
+    return spec
+
+
+# ---------------------------------------------------------------------------
+# Slots
+# ---------------------------------------------------------------------------
+
+_slots: dict[str, asyncio.Semaphore] = {}
+_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _limit(key: str, raw: str) -> Optional[int]:
+    value = _parse_pairs(raw).get(key)
+    return max(1, int(value)) if value and value.isdigit() else None
+
+
+def _slot(key: str, limit: int) -> asyncio.Semaphore:
+    global _slots_loop
+    loop = asyncio.get_running_loop()
+    if _slots_loop is not loop:
+        # Celery tasks may run each job on a fresh event loop
+        _slots.clear()
+        _slots_loop = loop
+    if key not in _slots:
+        _slots[key] = asyncio.Semaphore(limit)
+    return _slots[key]
+
+
+def _semaphores(spec: ActionSpec) -> list[asyncio.Semaphore]:
+    """Per-action slot (if capped) then the resource-class slot."""
+    semaphores = []
+    action_limit = _limit(spec.name, settings.ACTION_RUNTIME_ACTION_CONCURRENCY)
+    if action_limit:
+        semaphores.append(_slot(f"action:{spec.name}", action_limit))
+    if spec.resource is not None:
+        class_limit = _limit(spec.resource.value, settings.ACTION_RUNTIME_CONCURRENCY) or 4
+        semaphores.append(_slot(f"class:{spec.resource.value}", class_limit))
+    return semaphores
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+async def run(engine: str, action: str, handler: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run ``handler(*args, **kwargs)`` as ``action`` for ``engine``.
+
+    Waits for the action's slots, then runs it under its timeout.  Results
+    are returned and exceptions re-raised unchanged, so each engine keeps
+    its own error handling; a timeout raises ActionTimeout.  A dict result
+    with an ``error`` key is recorded as outcome "error".
+    """
+    spec = get_spec(action)
+    resource = spec.resource.value if spec.resource else "none"
+    queued = time.monotonic()
+
+    async with AsyncExitStack() as stack:
+        for semaphore in _semaphores(spec):
+            await stack.enter_async_context(semaphore)
+        started = time.monotonic()
+        action_queue_seconds.labels(resource=resource).observe(started - queued)
+        actions_in_flight.labels(resource=resource).inc()
+
+        outcome = "error"
+        try:
+            async with asyncio.timeout(spec.timeout) as deadline:
+                result = await handler(*args, **kwargs)
+            outcome = "error" if isinstance(result, dict) and result.get("error") else "ok"
+            return result
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            outcome = "timeout"
+            logger.warning("action_timeout", engine=engine, action=action, timeout=spec.timeout)
+            raise ActionTimeout(action, spec.timeout) from None
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            actions_in_flight.labels(resource=resource).dec()
+            # Workflow node actions come from user JSON: keep label cardinality bounded
+            label = action if action in ACTIONS else "other"
+            action_duration_seconds.labels(engine=engine, action=label, outcome=outcome).observe(
+                time.monotonic() - started
+            )
+
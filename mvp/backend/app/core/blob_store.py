@@ -0,0 +1,288 @@
+"""
+Blob Store
+==========
+
+Off-row storage for large text/JSON column values (PDF pages, workflow run
+results, crew messages, agent step outputs).
+
+``offload(value)`` stores a value of BLOB_STORE_MIN_BYTES or more and
+returns the reference to keep in the column instead:
+
+    blob:v1:<sha256>:<size>\\n<preview>
+
+``load(value)`` resolves a reference and passes inline values through
+unchanged, so rows written before offloading keep working and the columns
+need no migration.  ``stream(value)`` yields the value in chunks,
+decompressing as it reads, for routes that send it to the client as is.
+
+Blobs are content-addressed by the SHA-256 of the uncompressed value, so
+identical values are stored once.  They are zstd frames (gzip when the
+zstandard package is missing); reads detect the format by magic number.
+Backends: a local directory (``fs``) or an S3-compatible bucket (``s3``).
+Rows never delete blobs, since other rows may share them.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Optional
+
+from app.config import settings
+from app.core.optional_deps import optional
+from app.metrics import blob_store_bytes_total, blob_store_writes_total
+
+_zstd = optional("zstandard")
+_boto3 = optional("boto3")
+
+REF_PREFIX = "blob:v1:"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class BlobNotFound(LookupError):
+    """A referenced blob is missing from the store."""
+
+
+# ---------------------------------------------------------------------------
+# Backends (synchronous; called through asyncio.to_thread)
+# ---------------------------------------------------------------------------
+
+class FilesystemBackend:
+    name = "fs"
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).exists()
+
+    def write(self, key: str, data: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Per thread: concurrent puts of the same content write the same key
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return open(self.root / key, "rb")
+        except FileNotFoundError as e:
+            raise BlobNotFound(key) from e
+
+
+class S3Backend:
+    name = "s3"
+
+    def __init__(self) -> None:
+        boto3 = _boto3.load()
+        self.bucket = settings.BLOB_STORE_S3_BUCKET
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.BLOB_STORE_S3_ENDPOINT or None,
+            region_name=settings.BLOB_STORE_S3_REGION,
+            aws_access_key_id=settings.BLOB_STORE_S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.BLOB_STORE_S3_SECRET_KEY or None,
+        )
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except self.client.exceptions.ClientError:
+            self.client.create_bucket(Bucket=self.bucket)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def write(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        except self.client.exceptions.NoSuchKey as e:
+            raise BlobNotFound(key) from e
+
+
+_backend: Optional[Any] = None
+
+
+def get_backend() -> Any:
+    global _backend
+    if _backend is None:
+        if settings.BLOB_STORE_BACKEND == "s3":
+            _backend = S3Backend()
+        else:
+            _backend = FilesystemBackend(settings.BLOB_STORE_DIR)
+    return _backend
+
+
+# ---------------------------------------------------------------------------
+# Compression
+# ---------------------------------------------------------------------------
+
+def _compress(data: bytes) -> bytes:
+    if _zstd.available:
+        try:
+            return _zstd.load().ZstdCompressor(level=settings.BLOB_STORE_ZSTD_LEVEL).compress(data)
+        except ImportError:
+            pass
+    return gzip.compress(data, compresslevel=6)
+
+
+class _Prefixed:
+    """A read-only stream with bytes already read from it put back in front."""
+
+    def __init__(self, head: bytes, raw: BinaryIO):
+        self._head = head
+        self._raw = raw
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._head:
+            return self._raw.read(size) if size is not None and size >= 0 else self._raw.read()
+        if size is None or size < 0:
+            data, self._head = self._head + self._raw.read(), b""
+            return data
+        data, self._head = self._head[:size], self._head[size:]
+        if len(data) < size:
+            data += self._raw.read(size - len(data))
+        return data
+
+    def close(self) -> None:
+        pass
+
+
+def _open(sha: str) -> tuple[Any, BinaryIO]:
+    """(decompressing reader, underlying stream) for a blob; close both."""
+    raw = get_backend().open(_key(sha))
+    head = raw.read(4)
+    stream = _Prefixed(head, raw)
+    if head.startswith(_ZSTD_MAGIC):
+        return _zstd.load().ZstdDecompressor().stream_reader(stream, closefd=False), raw
+    if head.startswith(_GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=stream, mode="rb"), raw
+    return stream, raw
+
+
+def _close(reader: Any, raw: BinaryIO) -> None:
+    reader.close()
+    raw.close()
+
+
+def _key(sha: str) -> str:
+    return f"{sha[:2]}/{sha}"
+
+
+# ---------------------------------------------------------------------------
+# Blobs
+# ---------------------------------------------------------------------------
+
+def _put(data: bytes) -> str:
+    sha = hashlib.sha256(data).hexdigest()
+    backend = get_backend()
+    if backend.exists(_key(sha)):
+        blob_store_writes_total.labels(backend=backend.name, result="deduplicated").inc()
+        return sha
+    compressed = _compress(data)
+    backend.write(_key(sha), compressed)
+    blob_store_writes_total.labels(backend=backend.name, result="stored").inc()
+    blob_store_bytes_total.labels(kind="raw").inc(len(data))
+    blob_store_bytes_total.labels(kind="stored").inc(len(compressed))
+    return sha
+
+
+def _get(sha: str) -> bytes:
+    reader, raw = _open(sha)
+    try:
+        return reader.read()
+    finally:
+        _close(reader, raw)
+
+
+async def put(data: bytes) -> str:
+    """Store ``data`` (once per content) and return its SHA-256."""
+    return await asyncio.to_thread(_put, data)
+
+
+async def get(sha: str) -> bytes:
+    """The uncompressed blob; raises BlobNotFound."""
+    return await asyncio.to_thread(_get, sha)
+
+
+# ---------------------------------------------------------------------------
+# Column values
+# ---------------------------------------------------------------------------
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+def _parse(ref: str) -> tuple[str, int, str]:
+    header, _, preview_text = ref.partition("\n")
+    _, _, sha, size = header.split(":")
+    return sha, int(size), preview_text
+
+
+async def offload(value: Optional[str]) -> Optional[str]:
+    """The value to store in the row: a reference for large values, else ``value``."""
+    if value is None or is_ref(value):
+        return value
+    data = value.encode("utf-8")
+    if len(data) < settings.BLOB_STORE_MIN_BYTES:
+        return value
+    sha = await put(data)
+    return f"{REF_PREFIX}{sha}:{len(data)}\n{value[:settings.BLOB_STORE_PREVIEW_CHARS]}"
+
+
+async def load(value: Optional[str]) -> Optional[str]:
+    """The full value of a column that may hold a reference."""
+    if not is_ref(value):
+        return value
+    sha, _, _ = _parse(value)
+    return (await get(sha)).decode("utf-8")
+
+
+async def dump_json(obj: Any) -> str:
+    """``json.dumps`` then ``offload``."""
+    return await offload(json.dumps(obj, ensure_ascii=False))
+
+
+async def load_json(value: Optional[str], default: Any = None) -> Any:
+    """``load`` then ``json.loads``; ``default`` for empty columns."""
+    value = await load(value)
+    return json.loads(value) if value else default
+
+
+def preview(value: Optional[str]) -> Optional[str]:
+    """A short preview of a column value without reading the blob."""
+    if is_ref(value):
+        return _parse(value)[2]
+    return value[:settings.BLOB_STORE_PREVIEW_CHARS] if value is not None else None
+
+
+async def stream(value: Optional[str], chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Yield a column value as UTF-8 chunks, reading the blob lazily."""
+    if not is_ref(value):
+        data = (value or "").encode("utf-8")
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+        return
+
+    sha, _, _ = _parse(value)
+    reader, raw = await asyncio.to_thread(_open, sha)
+    try:
+        while True:
+            chunk = await asyncio.to_thread(reader.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await asyncio.to_thread(_close, reader, raw)
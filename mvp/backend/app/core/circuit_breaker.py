@@ -83,6 +83,7 @@ class CircuitBreaker:
         recovery_timeout: seconds to wait in OPEN before transitioning to HALF_OPEN
         half_open_max_calls: consecutive successes required in HALF_OPEN to close
         window_size: sliding window (seconds) for counting failures
+        ignore_exceptions: exception types re-raised without counting as failures
     """
 
     name: str
@@ -90,6 +91,7 @@ class CircuitBreaker:
     recovery_timeout: float = 60.0
     half_open_max_calls: int = 3
     window_size: float = 60.0
+    ignore_exceptions: tuple[type[Exception], ...] = ()
 
     # -- internal state (not part of the public constructor) --
     _state: CircuitState = field(default=CircuitState.CLOSED, init=False, repr=False)
@@ -125,40 +127,48 @@ class CircuitBreaker:
             to_state=new_state.value,
         )
 
+    def record_success(self) -> None:
+        """Count a successful call made without going through ``call``."""
+        self._total_successes += 1
+
+        if self._state == CircuitState.HALF_OPEN:
+            self._half_open_successes += 1
+            if self._half_open_successes >= self.half_open_max_calls:
+                self._transition(CircuitState.CLOSED)
+                self._failures.clear()
+
+    def record_failure(self, error: Exception) -> None:
+        """Count a failed call made without going through ``call``."""
+        now = time.monotonic()
+        self._total_failures += 1
+        self._last_failure_time = now
+        self._failures.append(now)
+        self._clean_old_failures()
+
+        logger.warning(
+            "circuit_breaker_failure",
+            name=self.name,
+            state=self._state.value,
+            failure_count=len(self._failures),
+            error=str(error),
+        )
+
+        if self._state == CircuitState.HALF_OPEN:
+            # Any failure in half-open immediately re-opens
+            self._transition(CircuitState.OPEN)
+        elif (
+            self._state == CircuitState.CLOSED
+            and len(self._failures) >= self.failure_threshold
+        ):
+            self._transition(CircuitState.OPEN)
+
     async def _record_success(self) -> None:
         async with self._lock:
-            self._total_successes += 1
-
-            if self._state == CircuitState.HALF_OPEN:
-                self._half_open_successes += 1
-                if self._half_open_successes >= self.half_open_max_calls:
-                    self._transition(CircuitState.CLOSED)
-                    self._failures.clear()
+            self.record_success()
 
     async def _record_failure(self, error: Exception) -> None:
         async with self._lock:
-            now = time.monotonic()
-            self._total_failures += 1
-            self._last_failure_time = now
-            self._failures.append(now)
-            self._clean_old_failures()
-
-            logger.warning(
-                "circuit_breaker_failure",
-                name=self.name,
-                state=self._state.value,
-                failure_count=len(self._failures),
-                error=str(error),
-            )
-
-            if self._state == CircuitState.HALF_OPEN:
-                # Any failure in half-open immediately re-opens
-                self._transition(CircuitState.OPEN)
-            elif (
-                self._state == CircuitState.CLOSED
-                and len(self._failures) >= self.failure_threshold
-            ):
-                self._transition(CircuitState.OPEN)
+            self.record_failure(error)
 
     def _should_allow_request(self) -> bool:
         """Determine whether a request should be allowed (non-locking read)."""
@@ -175,6 +185,12 @@ class CircuitBreaker:
         # HALF_OPEN -- allow through for probing
         return True
 
+    def allows_request(self) -> bool:
+        """Whether a call would be let through now (read-only, no transition)."""
+        if self._state != CircuitState.OPEN:
+            return True
+        return time.monotonic() - self._last_state_change >= self.recovery_timeout
+
     async def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
         """
         Execute *func* through the circuit breaker.
@@ -195,6 +211,8 @@ class CircuitBreaker:
             result = func(*args, **kwargs)
             if inspect.isawaitable(result):
                 result = await result
+        except self.ignore_exceptions:
+            raise
         except Exception as exc:
             await self._record_failure(exc)
             raise
@@ -92,11 +92,14 @@ async def lifespan(app):
     STARTUP:
       - Validate critical configuration (SECRET_KEY, DATABASE_URL)
       - Initialize the database (create tables via init_db)
+      - Start the batched AI usage writer
       - Install OS signal handlers for graceful shutdown
 
     SHUTDOWN:
       - Set the shutting-down flag
       - Drain active requests (up to 30 s)
+      - Cancel background workflow, pipeline and crew runs
+      - Flush queued AI usage rows and pending Redis quota counters
       - Dispose the SQLAlchemy async engine
       - Close the Redis connection (if active)
       - Log completion
@@ -137,6 +140,13 @@ async def lifespan(app):
     except Exception as exc:
         logger.debug("crawl4ai_init_skipped", error=str(exc))
 
+    # Pre-warm pooled browsers for configured non-default profiles
+    try:
+        from app.modules.web_crawler import browser_pool
+        await browser_pool.prewarm()
+    except Exception as exc:
+        logger.debug("browser_pool_prewarm_skipped", error=str(exc))
+
     # Recover orphaned skill_seekers jobs (stuck in RUNNING after restart)
     try:
         from app.modules.skill_seekers.service import SkillSeekersService
@@ -158,6 +168,13 @@ async def lifespan(app):
     except Exception as exc:
         logger.debug("secrets_seed_skipped", error=str(exc))
 
+    # Start the batched AI usage writer (track_ai_usage queues rows to it)
+    try:
+        from app.modules.cost_tracker import usage_writer
+        usage_writer.start()
+    except Exception as exc:
+        logger.debug("ai_usage_writer_start_skipped", error=str(exc))
+
     # Install signal handlers for graceful shutdown
     loop = asyncio.get_running_loop()
 
@@ -181,6 +198,13 @@ async def lifespan(app):
     # Drain active requests
     await _wait_for_drain(timeout=30.0)
 
+    # Cancel background workflow/pipeline/crew runs so they record it
+    try:
+        from app.core import run_supervisor
+        await run_supervisor.shutdown()
+    except Exception as exc:
+        logger.debug("background_runs_shutdown_skipped", error=str(exc))
+
     # Close crawl4ai singleton browser
     try:
         from app.modules.web_crawler.service import close_crawler
@@ -188,6 +212,46 @@ async def lifespan(app):
     except Exception as exc:
         logger.debug("crawl4ai_close_skipped", error=str(exc))
 
+    # Close pooled browsers
+    try:
+        from app.modules.web_crawler import browser_pool
+        await browser_pool.close_all()
+    except Exception as exc:
+        logger.debug("browser_pool_close_skipped", error=str(exc))
+
+    # Close the pooled HTTP crawler client
+    try:
+        from app.modules.web_crawler import http_engine
+        await http_engine.close()
+    except Exception as exc:
+        logger.debug("crawler_http_engine_close_skipped", error=str(exc))
+
+    # Stop PDF extraction/OCR worker processes
+    try:
+        from app.modules.pdf_processor import extraction
+        extraction.shutdown()
+    except Exception as exc:
+        logger.debug("pdf_worker_pool_shutdown_skipped", error=str(exc))
+
+    # Flush queued AI usage rows
+    try:
+        from app.modules.cost_tracker import usage_writer
+        await usage_writer.stop()
+    except Exception as exc:
+        logger.debug("ai_usage_writer_stop_skipped", error=str(exc))
+
+    # Flush pending Redis quota increments before the engine goes away
+    try:
+        from app.database import get_session_context
+        from app.modules.billing.service import BillingService
+
+        async with get_session_context() as session:
+            flushed = await BillingService.reconcile_quota_counters(session)
+            if flushed:
+                logger.info("quota_counters_flushed", count=flushed)
+    except Exception as exc:
+        logger.debug("quota_flush_skipped", error=str(exc))
+
     # Dispose database engine
     try:
         await engine.dispose()
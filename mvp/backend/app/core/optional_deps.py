@@ -0,0 +1,132 @@
+"""
+Optional Dependencies -- cheap availability probes, imports on first use.
+
+Heavy optional stacks (transformers, OCR engines, Real-ESRGAN, unsloth,
+pydub...) used to be imported at module import time, so every API worker
+paid their import time and memory on boot even if no request ever used
+them.  Services now declare them with ``optional()``:
+
+    _transformers = optional("transformers")
+    HAS_TRANSFORMERS = _transformers.available   # find_spec, no import
+
+    pipeline = _transformers.load().pipeline     # imported on first use
+
+``available`` only checks that the packages are installed
+(``importlib.util.find_spec`` on each top-level package).  A package that
+is installed but fails to import (e.g. a missing native library) raises
+``ImportError`` from ``load()`` and is reported unavailable from then on,
+so call sites keep handling ``ImportError`` as before.
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+from types import ModuleType
+from typing import Any, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class OptionalDependency:
+    """An optional import probed with find_spec and loaded on demand."""
+
+    def __init__(self, name: str, *requires: str):
+        self.name = name
+        # Top-level packages that must be installed (find_spec on a dotted
+        # name would import its parents, which is what we want to avoid)
+        self._probe = {n.split(".")[0] for n in (name, *requires)}
+        self._requires = requires
+        self._available: Optional[bool] = None
+        self._module: Optional[ModuleType] = None
+        self._error: Optional[str] = None
+        self._import_ms: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        if self._available is None:
+            try:
+                self._available = all(importlib.util.find_spec(n) is not None for n in self._probe)
+            except (ImportError, ValueError):
+                self._available = False
+        return self._available
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __bool__(self) -> bool:
+        return self.available
+
+    def load(self) -> ModuleType:
+        """Import and return the module, raising ImportError if unusable."""
+        if self._module is not None:
+            return self._module
+        if not self.available:
+            raise ImportError(self._error or f"optional dependency '{self.name}' is not installed")
+
+        with self._lock:
+            if self._module is None:
+                started = time.perf_counter()
+                try:
+                    for required in self._requires:
+                        importlib.import_module(required)
+                    module = importlib.import_module(self.name)
+                except Exception as exc:
+                    self._available = False
+                    self._error = f"{type(exc).__name__}: {exc}"
+                    logger.warning("optional_dependency_import_failed", dependency=self.name, error=self._error)
+                    raise ImportError(self._error) from exc
+                self._import_ms = round((time.perf_counter() - started) * 1000, 1)
+                self._module = module
+                logger.info("optional_dependency_loaded", dependency=self.name, import_ms=self._import_ms)
+        return self._module
+
+    def proxy(self) -> "_ModuleProxy":
+        """Return a stand-in that imports the module on first attribute access."""
+        return _ModuleProxy(self)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "available": self.available,
+            "loaded": self.loaded,
+            "import_ms": self._import_ms,
+            "error": self._error,
+        }
+
+
+class _ModuleProxy:
+    """Module stand-in for code that references ``pkg.attr`` in many places."""
+
+    def __init__(self, dep: OptionalDependency):
+        self._dep = dep
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._dep.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self._dep.name}'>"
+
+
+_registry: dict[str, OptionalDependency] = {}
+
+
+def optional(name: str, *requires: str) -> OptionalDependency:
+    """Declare (or fetch) an optional dependency.
+
+    ``requires`` lists extra modules that must import successfully before
+    ``name`` is considered usable (e.g. ``numpy`` for ``noisereduce``).
+    """
+    key = ",".join((name, *requires))
+    dep = _registry.get(key)
+    if dep is None:
+        dep = _registry[key] = OptionalDependency(name, *requires)
+    return dep
+
+
+def capabilities() -> dict[str, dict[str, Any]]:
+    """Return the status of every declared optional dependency."""
+    return {key: dep.status() for key, dep in sorted(_registry.items())}
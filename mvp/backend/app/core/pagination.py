@@ -0,0 +1,203 @@
+"""
+Pagination
+==========
+
+Keyset (cursor) pagination shared by the list endpoints.
+
+A listing is ordered by a sort column plus a unique tie-breaker (the
+primary key).  ``paginate()`` fetches ``limit + 1`` rows after the cursor
+position, so the next page is an index range scan instead of an OFFSET
+that reads and discards every earlier row.  The range scan needs an index
+on the listing's equality filters followed by the sort columns, e.g.
+``(user_id, created_at, id)`` (migration pagination_indexes_025).  Cursors are opaque url-safe
+strings carrying the last row's sort values and the column names they
+belong to; a cursor issued for another ordering is rejected with
+InvalidCursor.
+
+``skip`` is still accepted for clients that page by offset; it is ignored
+when a cursor is given.
+
+Totals are optional:
+
+- ``exact``: ``COUNT(*)`` over the filtered listing;
+- ``estimate``: the PostgreSQL planner's row estimate, falling back to an
+  exact count below PAGINATION_EXACT_COUNT_BELOW rows or on other
+  databases;
+- ``none``: no count query at all.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, Literal, Optional, Sequence, TypeVar
+from uuid import UUID
+
+import structlog
+from sqlalchemy import func, literal, tuple_
+from sqlalchemy.sql import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+CountMode = Literal["exact", "estimate", "none"]
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or was issued for a different ordering."""
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Cursors
+# ---------------------------------------------------------------------------
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _load(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return UUID(value["uuid"])
+        raise InvalidCursor("Invalid cursor")
+    return value
+
+
+def encode_cursor(keys: Sequence[str], values: Sequence[Any]) -> str:
+    raw = json.dumps({"k": list(keys), "v": [_dump(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> list[Any]:
+    """Sort values of ``cursor``; raises InvalidCursor unless it was issued for ``keys``."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if raw["k"] != list(keys) or len(raw["v"]) != len(keys):
+            raise InvalidCursor("Cursor does not match this listing")
+        return [_load(v) for v in raw["v"]]
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError, KeyError, binascii.Error) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def _after(columns: Sequence[Any], values: Sequence[Any], descending: bool) -> Any:
+    """
+    Rows strictly after ``values`` in (columns...) order.
+
+    A row-value comparison, ``(a, b) < (x, y)``, which PostgreSQL uses as
+    an index range condition; the expanded ``a < x OR (a = x AND b < y)``
+    form it cannot.
+    """
+    row, position = tuple_(*columns), tuple_(*(literal(v, c.type) for c, v in zip(columns, values)))
+    return row < position if descending else row > position
+
+
+# ---------------------------------------------------------------------------
+# Counts
+# ---------------------------------------------------------------------------
+
+def _dialect_name(session: AsyncSession) -> str:
+    bind = getattr(session, "bind", None)
+    return getattr(getattr(bind, "dialect", None), "name", "")
+
+
+async def _planner_estimate(session: AsyncSession, stmt: Select) -> Optional[int]:
+    try:
+        connection = await session.connection()
+        sql = stmt.order_by(None).compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True},
+        )
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug("pagination_estimate_failed", error=str(e))
+        return None
+
+
+async def count_rows(session: AsyncSession, stmt: Select, mode: CountMode = "exact") -> Optional[int]:
+    """Number of rows ``stmt`` returns, according to ``mode``."""
+    if mode == "none":
+        return None
+    if mode == "estimate" and _dialect_name(session) == "postgresql":
+        estimate = await _planner_estimate(session, stmt)
+        if estimate is not None and estimate >= settings.PAGINATION_EXACT_COUNT_BELOW:
+            return estimate
+    count_stmt = stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+    return (await session.execute(count_stmt)).scalar_one()
+
+
+# ---------------------------------------------------------------------------
+# Pages
+# ---------------------------------------------------------------------------
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    *,
+    order_by: Sequence[Any],
+    limit: int,
+    descending: bool = True,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    count: CountMode = "exact",
+    options: Sequence[Any] = (),
+) -> Page:
+    """
+    One page of the entities selected by ``stmt`` (filters only, no ordering).
+
+    ``order_by`` is the sort column followed by a unique tie-breaker, all
+    non-nullable and sorted in the same direction.  ``options`` are loader
+    options (e.g. ``defer()`` for large columns) for the page query.
+    """
+    keys = [column.key for column in order_by]
+    total = await count_rows(session, stmt, count)
+
+    page_stmt = stmt.order_by(*(c.desc() if descending else c.asc() for c in order_by))
+    if cursor:
+        page_stmt = page_stmt.where(_after(order_by, decode_cursor(cursor, keys), descending))
+    elif skip:
+        page_stmt = page_stmt.offset(skip)
+    if options:
+        page_stmt = page_stmt.options(*options)
+
+    result = await session.execute(page_stmt.limit(limit + 1))
+    items = list(result.scalars().all())
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = encode_cursor(keys, [getattr(last, key) for key in keys])
+    return Page(items=items, total=total, next_cursor=next_cursor, has_more=has_more)
+
+
+def loaded_fields(obj: Any) -> dict[str, Any]:
+    """Loaded attributes of an ORM object; deferred columns are left out instead of lazy-loaded."""
+    return {k: v for k, v in vars(obj).items() if not k.startswith("_sa_")}
@@ -0,0 +1,187 @@
+"""
+Run Supervisor
+==============
+
+Background execution for long runs (workflow runs, pipeline executions,
+crew runs, agent runs).  The request that starts a run creates its row, hands the
+execution to a supervised task in this process and returns the run id;
+progress goes to the owner's WebSocket, which is held by this process too.
+
+    with run_supervisor.reserve(user_id) as slot:
+        run = ...                       # create and commit the row
+        slot.start("workflow", run.id, WorkflowService.execute_run(run.id),
+                   on_cancelled=lambda: WorkflowService.record_cancelled(run.id))
+
+``reserve`` raises RunLimitExceeded when the user already has
+BACKGROUND_RUNS_MAX_PER_USER runs going; a slot that is never started is
+given back when the block exits.  ``cancel(run_id)`` cancels the task; runs
+record the cancellation themselves when CancelledError reaches them
+(``on_cancelled`` does it for a run cancelled before it started), and
+check their row between steps for cancellations made in another process.
+``shutdown()`` cancels what is left when the application stops.
+
+Runs open their own session and commit before every step, so the pooled
+connection is released between steps.  A step that reads through the
+session (pipeline steps such as the PDF ones) may still hold it until the
+step's own commit.
+"""
+
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+from uuid import UUID
+
+import structlog
+
+from app.config import settings
+from app.metrics import background_runs_in_flight, background_runs_total
+
+logger = structlog.get_logger()
+
+
+# Error recorded on cancelled workflow and crew runs, whose status enums
+# have no cancelled state (they end ``failed``); pipeline executions end
+# ``cancelled``.
+CANCELLED_ERROR = "Cancelled by user"
+
+
+class RunLimitExceeded(Exception):
+    """The user already has the maximum number of background runs going."""
+
+
+_tasks: dict[UUID, asyncio.Task] = {}
+_per_user: dict[UUID, int] = {}
+# on_cancelled hooks of runs cancelled before they started
+_cleanups: set[asyncio.Task] = set()
+
+
+def active_runs(user_id: UUID) -> int:
+    """Runs reserved or executing for ``user_id`` in this process."""
+    return _per_user.get(user_id, 0)
+
+
+def _release(user_id: UUID) -> None:
+    remaining = _per_user.get(user_id, 0) - 1
+    if remaining > 0:
+        _per_user[user_id] = remaining
+    else:
+        _per_user.pop(user_id, None)
+
+
+class _Slot:
+    def __init__(self, user_id: UUID):
+        self.user_id = user_id
+        self.task: Optional[asyncio.Task] = None
+
+    def __enter__(self) -> "_Slot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.task is None:
+            _release(self.user_id)
+
+    def start(
+        self,
+        kind: str,
+        run_id: UUID,
+        coro: Coroutine[Any, Any, Any],
+        on_cancelled: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> asyncio.Task:
+        """
+        Execute ``coro`` in the background under this slot.
+
+        A task cancelled before ``coro`` started cannot record that itself;
+        ``on_cancelled()`` is then run to record it instead.
+        """
+        self.task = asyncio.create_task(_supervise(kind, run_id, self.user_id, coro))
+        self.task.add_done_callback(lambda _: _finished(kind, run_id, self.user_id, coro, on_cancelled))
+        _tasks[run_id] = self.task
+        background_runs_total.labels(kind=kind, result="started").inc()
+        return self.task
+
+
+def reserve(user_id: UUID, kind: str = "run") -> _Slot:
+    """A slot for one background run of ``user_id``; raises RunLimitExceeded."""
+    if active_runs(user_id) >= settings.BACKGROUND_RUNS_MAX_PER_USER:
+        background_runs_total.labels(kind=kind, result="refused").inc()
+        raise RunLimitExceeded(
+            f"At most {settings.BACKGROUND_RUNS_MAX_PER_USER} runs can execute at once"
+        )
+    _per_user[user_id] = active_runs(user_id) + 1
+    return _Slot(user_id)
+
+
+async def _supervise(kind: str, run_id: UUID, user_id: UUID, coro: Coroutine[Any, Any, Any]) -> None:
+    background_runs_in_flight.labels(kind=kind).inc()
+    try:
+        await coro
+    except asyncio.CancelledError:
+        logger.info("background_run_cancelled", kind=kind, run_id=str(run_id))
+    except Exception as e:
+        logger.error("background_run_crashed", kind=kind, run_id=str(run_id), error=str(e))
+    finally:
+        background_runs_in_flight.labels(kind=kind).dec()
+
+
+def _finished(
+    kind: str,
+    run_id: UUID,
+    user_id: UUID,
+    coro: Coroutine[Any, Any, Any],
+    on_cancelled: Optional[Callable[[], Awaitable[Any]]],
+) -> None:
+    """Done callback of a run's task: also runs when it was cancelled before starting."""
+    _tasks.pop(run_id, None)
+    _release(user_id)
+    if inspect.getcoroutinestate(coro) != inspect.CORO_CREATED:
+        return
+    coro.close()
+    logger.info("background_run_cancelled", kind=kind, run_id=str(run_id), started=False)
+    if on_cancelled is not None:
+        cleanup = asyncio.ensure_future(_record_cancelled(kind, run_id, on_cancelled))
+        _cleanups.add(cleanup)
+        cleanup.add_done_callback(_cleanups.discard)
+
+
+async def _record_cancelled(kind: str, run_id: UUID, on_cancelled: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        await on_cancelled()
+    except Exception as e:
+        logger.error("background_run_cancel_record_failed", kind=kind, run_id=str(run_id), error=str(e))
+
+
+def is_running(run_id: UUID) -> bool:
+    return run_id in _tasks
+
+
+def cancel(run_id: UUID) -> bool:
+    """Cancel the task executing ``run_id``; False if it is not running here."""
+    task = _tasks.get(run_id)
+    if task is None or task.done():
+        return False
+    task.cancel()
+    return True
+
+
+async def shutdown() -> None:
+    """Cancel all background runs and wait for them to record it."""
+    tasks = list(_tasks.values())
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    await asyncio.wait(tasks, timeout=settings.BACKGROUND_RUNS_SHUTDOWN_TIMEOUT_SECONDS)
+    if _cleanups:
+        await asyncio.wait(list(_cleanups), timeout=settings.BACKGROUND_RUNS_SHUTDOWN_TIMEOUT_SECONDS)
+    logger.info("background_runs_cancelled", count=len(tasks))
+
+
+async def notify(user_id: UUID, msg_type: str, event: dict[str, Any]) -> None:
+    """Push a progress event to the run owner's WebSocket (best effort)."""
+    try:
+        from app.core.websocket_manager import build_message, manager
+
+        uid = str(user_id)
+        await manager.send_personal(uid, build_message(msg_type, event, user_id=uid))
+    except Exception as e:
+        logger.debug("run_progress_push_failed", msg_type=msg_type, error=str(e))
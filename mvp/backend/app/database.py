@@ -63,7 +63,9 @@ async def init_db() -> None:
         from app.models.workspace import Workspace, WorkspaceMember, SharedItem, Comment  # noqa: F401
         from app.models.agent import AgentRun, AgentStep  # noqa: F401
         from app.models.cost_tracking import AIUsageLog  # noqa: F401
+        from app.models.usage_rollup import AIUsageDaily, AIUsageHourly, AIUsageRollupState  # noqa: F401
         from app.models.skill_seekers import ScrapeJob, ScrapeJobStatus  # noqa: F401
+        from app.models.crawl_frontier import CrawlJob, CrawlFrontierURL  # noqa: F401
         from app.models.notification import Notification  # noqa: F401
         from app.models.outbox import OutboxEvent  # noqa: F401
         from app.models.audit_log import AuditLogEntry  # noqa: F401
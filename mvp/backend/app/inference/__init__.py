@@ -0,0 +1,8 @@
+"""
+Local inference server -- one process per host owns the local ML models.
+
+Module code keeps calling its usual helpers (embedding_service.embed_texts,
+SentimentService, presidio_service, whisper_local); those ask
+``app.inference.client`` first and fall back to loading the model in-process
+when no server is configured or reachable.
+"""
@@ -0,0 +1,163 @@
+"""
+Thin client for the local inference server.
+
+``infer`` (async) and ``infer_sync`` (blocking, for the sync helpers that
+already run model code inline or in a thread) return the server's outputs,
+or ``None`` when the caller should run the model in-process:
+
+- INFERENCE_SOCKET_PATH is empty (the default),
+- this process *is* the inference server,
+- the server could not be reached recently (retried after a backoff),
+- the server returned an error or timed out.
+"""
+
+import asyncio
+import socket
+import time
+from typing import Any, Optional
+
+import structlog
+
+from app.inference import protocol
+
+logger = structlog.get_logger()
+
+UNREACHABLE_BACKOFF_SECONDS = 30.0
+
+_disabled = False
+_unreachable_until = 0.0
+
+
+def disable() -> None:
+    """Always run in-process (called by the server so it never calls itself)."""
+    global _disabled
+    _disabled = True
+
+
+def _socket_path() -> Optional[str]:
+    from app.config import settings
+
+    if _disabled or not settings.INFERENCE_SOCKET_PATH:
+        return None
+    if time.monotonic() < _unreachable_until:
+        return None
+    return settings.INFERENCE_SOCKET_PATH
+
+
+def enabled() -> bool:
+    """True when calls are currently routed to the server."""
+    return _socket_path() is not None
+
+
+def _default_timeout() -> float:
+    from app.config import settings
+
+    return settings.INFERENCE_TIMEOUT_SECONDS
+
+
+def _mark_unreachable(path: str, error: Exception) -> None:
+    global _unreachable_until
+    if time.monotonic() >= _unreachable_until:
+        logger.warning("inference_server_unreachable", socket=path, error=str(error))
+    _unreachable_until = time.monotonic() + UNREACHABLE_BACKOFF_SECONDS
+
+
+def _record(model: str, outcome: str) -> None:
+    try:
+        from app.metrics import inference_client_requests_total
+
+        inference_client_requests_total.labels(model=model, outcome=outcome).inc()
+    except Exception:
+        pass
+
+
+def _result(model: str, response: dict[str, Any]) -> Optional[list]:
+    if response.get("ok"):
+        _record(model, "remote")
+        return response["outputs"]
+    logger.warning("inference_server_error", model=model, error=response.get("error"))
+    _record(model, "error")
+    return None
+
+
+async def infer(
+    model: str,
+    inputs: list,
+    options: Optional[dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+) -> Optional[list]:
+    """Run ``inputs`` through ``model`` on the server; None means run locally."""
+    path = _socket_path()
+    if path is None:
+        _record(model, "fallback")
+        return None
+
+    request = protocol.encode({"op": "infer", "model": model, "inputs": inputs, "options": options or {}})
+    try:
+        reader, writer = await asyncio.open_unix_connection(path)
+    except OSError as e:
+        _mark_unreachable(path, e)
+        _record(model, "fallback")
+        return None
+
+    try:
+        async with asyncio.timeout(timeout or _default_timeout()):
+            writer.write(request)
+            await writer.drain()
+            length = protocol.decode_length(await reader.readexactly(protocol.HEADER.size))
+            response = protocol.decode(await reader.readexactly(length))
+    except Exception as e:
+        logger.warning("inference_request_failed", model=model, error=str(e) or type(e).__name__)
+        _record(model, "error")
+        return None
+    finally:
+        writer.close()
+
+    return _result(model, response)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("inference server closed the connection")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def infer_sync(
+    model: str,
+    inputs: list,
+    options: Optional[dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+) -> Optional[list]:
+    """Blocking variant of ``infer``."""
+    path = _socket_path()
+    if path is None:
+        _record(model, "fallback")
+        return None
+
+    request = protocol.encode({"op": "infer", "model": model, "inputs": inputs, "options": options or {}})
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout or _default_timeout())
+    try:
+        try:
+            sock.connect(path)
+        except OSError as e:
+            _mark_unreachable(path, e)
+            _record(model, "fallback")
+            return None
+        try:
+            sock.sendall(request)
+            length = protocol.decode_length(_recv_exactly(sock, protocol.HEADER.size))
+            response = protocol.decode(_recv_exactly(sock, length))
+        except Exception as e:
+            logger.warning("inference_request_failed", model=model, error=str(e) or type(e).__name__)
+            _record(model, "error")
+            return None
+    finally:
+        sock.close()
+
+    return _result(model, response)
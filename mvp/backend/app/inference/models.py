@@ -0,0 +1,83 @@
+"""
+Models served by the local inference server.
+
+Each entry knows how to warm its model and how to run one batch of inputs
+that share the same options.  The runners call the modules' own in-process
+implementations, so the server and the fallback path produce identical
+results.
+"""
+
+from typing import Any, Callable
+
+
+class ModelSpec:
+    """How to load and batch-run one served model."""
+
+    def __init__(self, load: Callable[[], Any], run: Callable[[list, dict], list], max_batch: int = 0):
+        self.load = load
+        self.run = run
+        # 0 = INFERENCE_MAX_BATCH
+        self.max_batch = max_batch
+
+
+def _load_embedding() -> None:
+    from app.modules.knowledge import embedding_service
+
+    if embedding_service._get_model() is None:
+        raise RuntimeError("sentence-transformers is not available")
+
+
+def _run_embedding(texts: list, options: dict) -> list:
+    from app.modules.knowledge import embedding_service
+
+    return embedding_service.embed_texts_local(texts, options.get("model_name", embedding_service.DEFAULT_MODEL))
+
+
+def _load_sentiment() -> None:
+    from app.modules.sentiment.service import get_roberta_pipeline
+
+    get_roberta_pipeline()
+
+
+def _run_sentiment(texts: list, options: dict) -> list:
+    from app.modules.sentiment.service import get_roberta_pipeline
+
+    return [
+        {"label": r.get("label"), "score": float(r.get("score", 0.0))}
+        for r in get_roberta_pipeline()(texts)
+    ]
+
+
+def _load_pii() -> None:
+    from app.modules.security_guardian import presidio_service
+
+    if presidio_service._get_analyzer() is None:
+        raise RuntimeError("presidio is not available")
+
+
+def _run_pii(texts: list, options: dict) -> list:
+    from app.modules.security_guardian import presidio_service
+
+    return presidio_service.analyze_local(texts, options.get("language", "en"), options.get("score_threshold", 0.4))
+
+
+def _load_whisper() -> None:
+    from app.modules.transcription import whisper_local
+
+    if whisper_local._get_model() is None:
+        raise RuntimeError("faster-whisper is not available")
+
+
+def _run_whisper(paths: list, options: dict) -> list:
+    from app.modules.transcription import whisper_local
+
+    return whisper_local.transcribe_local_batch(paths, options)
+
+
+MODELS: dict[str, ModelSpec] = {
+    "embedding": ModelSpec(_load_embedding, _run_embedding),
+    "sentiment": ModelSpec(_load_sentiment, _run_sentiment),
+    "pii": ModelSpec(_load_pii, _run_pii),
+    # One file is already a long batch of audio windows
+    "whisper": ModelSpec(_load_whisper, _run_whisper, max_batch=1),
+}
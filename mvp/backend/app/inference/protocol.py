@@ -0,0 +1,32 @@
+"""
+Wire format between the inference client and server.
+
+Each message is a 4-byte big-endian length followed by a UTF-8 JSON body.
+
+Request:  {"op": "infer", "model": "embedding", "inputs": [...], "options": {...}}
+          {"op": "stats"}
+Response: {"ok": true, "outputs": [...]} | {"ok": false, "error": "..."}
+"""
+
+import json
+import struct
+from typing import Any
+
+HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+def encode(message: dict[str, Any]) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    return HEADER.pack(len(body)) + body
+
+
+def decode(body: bytes) -> dict[str, Any]:
+    return json.loads(body)
+
+
+def decode_length(header: bytes) -> int:
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"inference message too large ({length} bytes)")
+    return length
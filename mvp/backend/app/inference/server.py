@@ -0,0 +1,240 @@
+"""
+Local inference server.
+
+Run one per host (or container group sharing the socket volume):
+
+    python -m app.inference.server
+
+Listens on INFERENCE_SOCKET_PATH, preloads INFERENCE_PRELOAD_MODELS before
+accepting connections, and exposes Prometheus metrics on
+INFERENCE_METRICS_PORT (0 disables).
+
+Every request's inputs are queued item by item per model.  A batcher per
+model waits up to INFERENCE_MAX_WAIT_MS for more items (from any caller),
+groups them by options and runs each group as one batch on the model's
+single worker thread, so concurrent callers share a forward pass.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import structlog
+
+from app.inference import client, protocol
+from app.inference.models import MODELS, ModelSpec
+
+logger = structlog.get_logger()
+
+
+class _Item:
+    __slots__ = ("input", "options", "key", "future", "enqueued_at")
+
+    def __init__(self, input: Any, options: dict, key: str, future: asyncio.Future):
+        self.input = input
+        self.options = options
+        self.key = key
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class ModelWorker:
+    """Queue + batcher + single worker thread for one model."""
+
+    def __init__(self, name: str, spec: ModelSpec, max_batch: int, max_wait_ms: int):
+        self.name = name
+        self.spec = spec
+        self.max_batch = spec.max_batch or max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: asyncio.Queue[_Item] = asyncio.Queue()
+        self.loaded = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"inference-{name}")
+        self._task: Optional[asyncio.Task] = None
+
+    async def warm(self) -> None:
+        started = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.spec.load)
+        self.loaded = True
+        logger.info("inference_model_warmed", model=self.name, load_ms=round((time.perf_counter() - started) * 1000))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"inference-batcher-{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, inputs: list, options: dict) -> list:
+        loop = asyncio.get_running_loop()
+        key = json.dumps(options, sort_keys=True, default=str)
+        items = [_Item(value, options, key, loop.create_future()) for value in inputs]
+        for item in items:
+            self.queue.put_nowait(item)
+        self._set_depth()
+        return list(await asyncio.gather(*(item.future for item in items)))
+
+    def _set_depth(self) -> None:
+        from app.metrics import inference_queue_depth
+
+        inference_queue_depth.labels(model=self.name).set(self.queue.qsize())
+
+    async def _next_batch(self) -> list[_Item]:
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 and self.queue.empty():
+                break
+            try:
+                batch.append(self.queue.get_nowait() if remaining <= 0 else await asyncio.wait_for(self.queue.get(), remaining))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def _run(self) -> None:
+        from app.metrics import inference_batch_size, inference_latency_seconds
+
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            self._set_depth()
+
+            groups: dict[str, list[_Item]] = {}
+            for item in batch:
+                if not item.future.cancelled():
+                    groups.setdefault(item.key, []).append(item)
+
+            for items in groups.values():
+                inference_batch_size.labels(model=self.name).observe(len(items))
+                try:
+                    outputs = await loop.run_in_executor(
+                        self._executor, self.spec.run, [i.input for i in items], items[0].options,
+                    )
+                    self.loaded = True
+                    if len(outputs) != len(items):
+                        raise RuntimeError(f"{self.name} returned {len(outputs)} outputs for {len(items)} inputs")
+                except Exception as e:
+                    logger.warning("inference_batch_failed", model=self.name, size=len(items), error=str(e))
+                    for item in items:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                    continue
+
+                now = time.perf_counter()
+                for item, output in zip(items, outputs):
+                    inference_latency_seconds.labels(model=self.name).observe(now - item.enqueued_at)
+                    if not item.future.done():
+                        item.future.set_result(output)
+
+
+class InferenceServer:
+    def __init__(self, socket_path: str, models: dict[str, ModelSpec], max_batch: int, max_wait_ms: int):
+        self.socket_path = socket_path
+        self.workers = {name: ModelWorker(name, spec, max_batch, max_wait_ms) for name, spec in models.items()}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, preload: list[str]) -> None:
+        for name in preload:
+            worker = self.workers.get(name)
+            if worker is None:
+                logger.warning("inference_preload_unknown_model", model=name)
+                continue
+            try:
+                await worker.warm()
+            except Exception as e:
+                # Still served: requests fail fast and callers fall back
+                logger.warning("inference_preload_failed", model=name, error=str(e))
+
+        for worker in self.workers.values():
+            worker.start()
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        logger.info("inference_server_started", socket=self.socket_path, models=sorted(self.workers))
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for worker in self.workers.values():
+            await worker.stop()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            name: {"loaded": w.loaded, "queue_depth": w.queue.qsize(), "max_batch": w.max_batch}
+            for name, w in self.workers.items()
+        }
+
+    async def _dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        if request.get("op") == "stats":
+            return {"ok": True, "outputs": [self.stats()]}
+
+        worker = self.workers.get(request.get("model"))
+        if worker is None:
+            return {"ok": False, "error": f"unknown model {request.get('model')!r}"}
+        try:
+            outputs = await worker.submit(list(request.get("inputs") or []), request.get("options") or {})
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": True, "outputs": outputs}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            length = protocol.decode_length(await reader.readexactly(protocol.HEADER.size))
+            request = protocol.decode(await reader.readexactly(length))
+            writer.write(protocol.encode(await self._dispatch(request)))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.warning("inference_request_handling_failed", error=str(e))
+        finally:
+            writer.close()
+
+
+async def serve() -> None:
+    from app.config import settings
+
+    if not settings.INFERENCE_SOCKET_PATH:
+        raise SystemExit("INFERENCE_SOCKET_PATH is not set")
+
+    # Runners call the modules' helpers, which must not route back to us
+    client.disable()
+
+    if settings.INFERENCE_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.INFERENCE_METRICS_PORT)
+
+    preload = [m.strip() for m in settings.INFERENCE_PRELOAD_MODELS.split(",") if m.strip()]
+    server = InferenceServer(
+        settings.INFERENCE_SOCKET_PATH, MODELS, settings.INFERENCE_MAX_BATCH, settings.INFERENCE_MAX_WAIT_MS,
+    )
+    await server.start(preload)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    logger.info("inference_server_stopping")
+    await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
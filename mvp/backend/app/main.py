@@ -115,6 +115,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-Request-ID", "X-Tenant-ID", "Accept"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Import Celery request_id signals (auto-registers on import)
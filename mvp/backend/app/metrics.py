@@ -50,6 +50,167 @@ ai_provider_requests_total = Counter(
     ["provider", "success"],
 )
 
+ai_provider_latency_seconds = Histogram(
+    "ai_provider_latency_seconds",
+    "AI provider call latency seen by the provider router",
+    ["provider", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+
+ai_provider_circuit_state = Gauge(
+    "ai_provider_circuit_state",
+    "AI provider circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["provider"],
+)
+
+ai_router_decisions_total = Counter(
+    "ai_router_decisions_total",
+    "Calls served by each provider, by reason (best, failover)",
+    ["provider", "reason"],
+)
+
+ai_router_skips_total = Counter(
+    "ai_router_skips_total",
+    "Providers skipped by the router, by reason (circuit_open, rate_limited, not_configured)",
+    ["provider", "reason"],
+)
+
+ai_rate_limit_wait_seconds = Histogram(
+    "ai_rate_limit_wait_seconds",
+    "Time spent waiting for a provider's client-side rate limit budget",
+    ["provider"],
+    buckets=(0.0, 0.05, 0.25, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+ai_rate_limited_total = Counter(
+    "ai_rate_limited_total",
+    "AI calls rejected by the client-side rate limiter (caller fails over or errors)",
+    ["provider"],
+)
+
+ai_hedged_requests_total = Counter(
+    "ai_hedged_requests_total",
+    "Hedge-eligible AI requests by outcome (not_needed, primary_won, backup_won, "
+    "budget_exhausted, no_backup, failed)",
+    ["outcome"],
+)
+
+ai_long_text_calls_total = Counter(
+    "ai_long_text_calls_total",
+    "Map-reduce calls over long texts by stage (single, map, reduce, final) and cache hit",
+    ["stage", "cached"],
+)
+
+ai_usage_writer_rows_total = Counter(
+    "ai_usage_writer_rows_total",
+    "AI usage log rows handled by the batched writer, by outcome",
+    ["outcome"],
+)
+
+ai_usage_writer_queue_depth = Gauge(
+    "ai_usage_writer_queue_depth",
+    "AI usage log rows waiting in the writer queue",
+)
+
+inference_queue_depth = Gauge(
+    "inference_queue_depth",
+    "Items waiting for a batch in the local inference server, per model",
+    ["model"],
+)
+
+inference_latency_seconds = Histogram(
+    "inference_latency_seconds",
+    "Local inference server latency per item (queue wait + batch run)",
+    ["model"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0),
+)
+
+inference_batch_size = Histogram(
+    "inference_batch_size",
+    "Items per batch run by the local inference server",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+inference_client_requests_total = Counter(
+    "inference_client_requests_total",
+    "Inference client calls by outcome (remote, fallback, error)",
+    ["model", "outcome"],
+)
+
+crawl_cache_requests_total = Counter(
+    "crawl_cache_requests_total",
+    "Crawl cache lookups by layer (page, derived, rendered) and result (hit, revalidated, miss, bypass)",
+    ["layer", "result"],
+)
+
+crawl_cache_bytes_saved_total = Counter(
+    "crawl_cache_bytes_saved_total",
+    "Bytes served from the crawl cache instead of being downloaded or re-rendered",
+    ["layer"],
+)
+
+browser_pool_browsers = Gauge(
+    "browser_pool_browsers",
+    "Browsers currently running in the crawler browser pool",
+)
+
+browser_pool_leases_total = Counter(
+    "browser_pool_leases_total",
+    "Browser pool lease requests by outcome (reused, launched, timeout)",
+    ["outcome"],
+)
+
+browser_pool_recycles_total = Counter(
+    "browser_pool_recycles_total",
+    "Pooled browsers closed, by reason (pages, memory, idle, evicted, error, shutdown)",
+    ["reason"],
+)
+
+
+action_duration_seconds = Histogram(
+    "action_duration_seconds",
+    "Action runtime execution time (after the resource slot is acquired), by outcome (ok, error, timeout, cancelled)",
+    ["engine", "action", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0),
+)
+
+action_queue_seconds = Histogram(
+    "action_queue_seconds",
+    "Time actions waited for a resource-class slot",
+    ["resource"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+
+actions_in_flight = Gauge(
+    "actions_in_flight",
+    "Actions currently running, by resource class",
+    ["resource"],
+)
+
+blob_store_writes_total = Counter(
+    "blob_store_writes_total",
+    "Off-row blob writes by backend and result (stored, deduplicated)",
+    ["backend", "result"],
+)
+
+blob_store_bytes_total = Counter(
+    "blob_store_bytes_total",
+    "Bytes offloaded to the blob store, uncompressed (raw) and as stored (compressed)",
+    ["kind"],
+)
+
+background_runs_in_flight = Gauge(
+    "background_runs_in_flight",
+    "Workflow, pipeline and crew runs executing in the background, by kind",
+    ["kind"],
+)
+
+background_runs_total = Counter(
+    "background_runs_total",
+    "Background runs started or refused (per-user limit), by kind and result",
+    ["kind", "result"],
+)
 
 # ---------------------------------------------------------------------------
 # Middleware
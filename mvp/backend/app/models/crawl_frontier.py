@@ -0,0 +1,81 @@
+"""
+Crawl frontier models: persistent site-wide crawl jobs.
+
+A CrawlJob owns a frontier of CrawlFrontierURL rows (one per normalized URL,
+unique per job) that workers claim in priority order.  Rows survive worker
+restarts, so an interrupted job resumes where it stopped.
+"""
+
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import BigInteger, Index, String, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class CrawlJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class FrontierURLStatus(str, Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"      # robots.txt disallowed or out of budget
+    DUPLICATE = "duplicate"  # near-duplicate content (SimHash)
+
+
+class CrawlJob(SQLModel, table=True):
+    """A site-wide crawl with its options and progress counters."""
+    __tablename__ = "crawl_jobs"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    seed_url: str = Field(max_length=2000)
+    status: CrawlJobStatus = Field(default=CrawlJobStatus.PENDING, sa_type=String(20), index=True)
+    max_pages: int = Field(default=1000)
+    max_depth: int = Field(default=5)
+    config_json: str = Field(default="{}")
+    pages_crawled: int = Field(default=0)
+    pages_failed: int = Field(default=0)
+    pages_skipped: int = Field(default=0)
+    pages_duplicate: int = Field(default=0)
+    chunks_indexed: int = Field(default=0)
+    error: Optional[str] = Field(default=None, max_length=2000)
+    heartbeat_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
+    finished_at: Optional[datetime] = Field(default=None)
+
+
+class CrawlFrontierURL(SQLModel, table=True):
+    """One normalized URL in a job's frontier."""
+    __tablename__ = "crawl_frontier"
+    __table_args__ = (
+        UniqueConstraint("job_id", "url_hash", name="uq_crawl_frontier_job_url"),
+        Index("ix_crawl_frontier_claim", "job_id", "status", "priority"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
+    job_id: UUID = Field(foreign_key="crawl_jobs.id")
+    url: str
+    url_hash: int = Field(sa_type=BigInteger)
+    host: str = Field(max_length=255)
+    depth: int = Field(default=0)
+    priority: float = Field(default=0.0)
+    status: FrontierURLStatus = Field(default=FrontierURLStatus.PENDING, sa_type=String(20))
+    attempts: int = Field(default=0)
+    simhash: Optional[int] = Field(default=None, sa_type=BigInteger)
+    error: Optional[str] = Field(default=None, max_length=500)
+    updated_at: datetime = Field(default_factory=_utcnow)
@@ -0,0 +1,60 @@
+"""
+Usage rollup models: pre-aggregated AI usage for cost and monitoring dashboards.
+
+Rows are produced by the cost_tracker compaction job from ai_usage_logs.
+Hourly buckets are aggregated from raw logs; daily buckets from hourly ones.
+"""
+
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+from sqlalchemy import BigInteger, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class AIUsageRollupBase(SQLModel):
+    """Aggregated usage for one (bucket, user, provider, model, module)."""
+
+    bucket_start: datetime = Field(index=True)
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    provider: str = Field(max_length=50)
+    model: str = Field(max_length=100)
+    module: str = Field(max_length=50)
+    calls: int = Field(default=0)
+    successes: int = Field(default=0)
+    input_tokens: int = Field(default=0, sa_type=BigInteger)
+    output_tokens: int = Field(default=0, sa_type=BigInteger)
+    total_tokens: int = Field(default=0, sa_type=BigInteger)
+    cost_cents: float = Field(default=0.0)
+    latency_ms_sum: int = Field(default=0, sa_type=BigInteger)
+    latency_ms_min: int = Field(default=0)
+    latency_ms_max: int = Field(default=0)
+
+
+class AIUsageHourly(AIUsageRollupBase, table=True):
+    """Hourly usage rollup."""
+    __tablename__ = "ai_usage_hourly"
+    __table_args__ = (
+        UniqueConstraint("bucket_start", "user_id", "provider", "model", "module", name="uq_ai_usage_hourly_key"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+
+
+class AIUsageDaily(AIUsageRollupBase, table=True):
+    """Daily usage rollup."""
+    __tablename__ = "ai_usage_daily"
+    __table_args__ = (
+        UniqueConstraint("bucket_start", "user_id", "provider", "model", "module", name="uq_ai_usage_daily_key"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+
+
+class AIUsageRollupState(SQLModel, table=True):
+    """Compaction watermark: raw logs before ``rolled_until`` are in the rollups."""
+    __tablename__ = "ai_usage_rollup_state"
+
+    id: int = Field(default=1, primary_key=True)
+    rolled_until: datetime
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC).replace(tzinfo=None))
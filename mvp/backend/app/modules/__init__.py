@@ -7,6 +7,10 @@ Each module is a subdirectory under app/modules/ containing:
 
 Modules can be disabled at runtime via the DISABLED_MODULES environment variable
 (comma-separated list of module names).
+
+Discovery records how long each routes.py took to import and how much RSS
+it added (see ``get_import_profile``).  Shared dependencies are charged to
+the first module that imports them.
 """
 
 from __future__ import annotations
@@ -14,8 +18,14 @@ from __future__ import annotations
 import importlib
 import json
 import os
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 import structlog
 from fastapi import FastAPI
@@ -52,10 +62,23 @@ def _validate_manifest(manifest: dict[str, Any], manifest_path: str) -> list[str
     return errors
 
 
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size (falls back to peak RSS off Linux); None on Windows."""
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return None
+        # ru_maxrss is KiB on Linux, bytes on macOS; close enough for a profile
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
 class ModuleRegistry:
     """Auto-discovers and registers API modules from manifest files."""
 
     _registered: list[dict[str, Any]] = []
+    _import_profile: list[dict[str, Any]] = []
 
     @classmethod
     def discover_modules(cls, app: FastAPI) -> list[dict[str, Any]]:
@@ -65,6 +88,7 @@ class ModuleRegistry:
         Returns a list of dicts describing every successfully registered module.
         """
         cls._registered = []
+        cls._import_profile = []
 
         modules_dir = Path(__file__).resolve().parent
         disabled_raw = os.environ.get("DISABLED_MODULES", "")
@@ -125,6 +149,8 @@ class ModuleRegistry:
             # 3. Dynamically import routes.py and retrieve the router
             # ----------------------------------------------------------
             routes_module_path = f"app.modules.{module_dir_name}.routes"
+            started = time.perf_counter()
+            rss_before = _rss_bytes()
             try:
                 routes_module = importlib.import_module(routes_module_path)
             except Exception as exc:
@@ -135,6 +161,12 @@ class ModuleRegistry:
                     error=str(exc),
                 )
                 continue
+            import_ms = round((time.perf_counter() - started) * 1000, 1)
+            rss_after = _rss_bytes()
+            rss_delta_kb = None if rss_before is None or rss_after is None else max(0, rss_after - rss_before) // 1024
+            cls._import_profile.append(
+                {"name": module_name, "import_ms": import_ms, "rss_delta_kb": rss_delta_kb}
+            )
 
             router = getattr(routes_module, "router", None)
             if router is None:
@@ -176,6 +208,17 @@ class ModuleRegistry:
                 module=module_name,
                 version=manifest["version"],
                 prefix=prefix,
+                import_ms=import_ms,
+            )
+
+        if cls._import_profile:
+            slowest = max(cls._import_profile, key=lambda p: p["import_ms"])
+            logger.info(
+                "module_import_profile",
+                modules=len(cls._import_profile),
+                total_import_ms=round(sum(p["import_ms"] for p in cls._import_profile), 1),
+                slowest=slowest["name"],
+                slowest_ms=slowest["import_ms"],
             )
 
         return cls._registered
@@ -184,3 +227,18 @@ class ModuleRegistry:
     def get_registered_modules(cls) -> list[dict[str, Any]]:
         """Return info about all currently registered modules."""
         return list(cls._registered)
+
+    @classmethod
+    def get_import_profile(cls) -> dict[str, Any]:
+        """Return per-module routes import time and RSS delta, slowest first.
+
+        RSS figures are None where the platform cannot measure them (Windows).
+        """
+        modules = sorted(cls._import_profile, key=lambda p: p["import_ms"], reverse=True)
+        rss = _rss_bytes()
+        return {
+            "total_import_ms": round(sum(p["import_ms"] for p in modules), 1),
+            "total_rss_delta_kb": None if rss is None else sum(p["rss_delta_kb"] or 0 for p in modules),
+            "rss_kb": None if rss is None else rss // 1024,
+            "modules": modules,
+        }
@@ -2,12 +2,16 @@
 Agent Executor - Executes planned steps using platform capabilities.
 """
 
+import asyncio
 import json
 from datetime import datetime
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 import structlog
 
+from app.config import settings
+from app.core import action_runtime
+
 logger = structlog.get_logger()
 
 
@@ -27,6 +31,7 @@ async def _exec_crawl_web(input_data: dict, previous: Optional[str]) -> dict:
             content_filter_mode=input_data.get("content_filter_mode", "pruning"),
             antibot_retry=input_data.get("antibot_retry", False),
             proxies=input_data.get("proxies"),
+            max_age=input_data.get("max_age", settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS),
         )
 
         if result.get("success"):
@@ -174,6 +179,7 @@ async def _exec_scrape_http(input_data: dict, previous: Optional[str]) -> dict:
             use_fit_markdown=input_data.get("use_fit_markdown", True),
             headers=input_data.get("headers"),
             follow_redirects=input_data.get("follow_redirects", True),
+            max_age=input_data.get("max_age", settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS),
         )
 
         if result.get("success"):
@@ -446,70 +452,92 @@ async def _exec_analyze_image(input_data: dict, previous: Optional[str]) -> dict
 
 
 async def execute_step(action: str, input_data: dict, previous_output: Optional[str] = None) -> dict:
-    """Execute a single agent step."""
-    handlers = {
-        "transcribe": _exec_transcribe,
-        "summarize": _exec_summarize,
-        "translate": _exec_translate,
-        "search_knowledge": _exec_search,
-        "ask_knowledge": _exec_ask,
-        "compare_models": _exec_compare,
-        "generate_text": _exec_generate,
-        "extract_info": _exec_extract,
-        "analyze_sentiment": _exec_sentiment,
-        "create_pipeline": _exec_generate,  # Fallback to generate for now
-        "crawl_web": _exec_crawl_web,
-        "seed_web_urls": _exec_seed_web_urls,
-        "batch_crawl": _exec_batch_crawl,
-        "deep_crawl": _exec_deep_crawl,
-        "scrape_http": _exec_scrape_http,
-        "adaptive_crawl": _exec_adaptive_crawl,
-        "hub_crawl": _exec_hub_crawl,
-        "scrape_pdf": _exec_scrape_pdf,
-        "extract_cosine": _exec_extract_cosine,
-        "extract_lxml": _exec_extract_lxml,
-        "docker_crawl": _exec_docker_crawl,
-        "chunk_regex": _exec_chunk_regex,
-        "analyze_image": _exec_analyze_image,
-        "generate_content": _exec_generate_content,
-        "run_workflow": _exec_run_workflow,
-        "run_crew": _exec_run_crew,
-        "text_to_speech": _exec_tts,
-        "voice_dub": _exec_voice_dub,
-        "realtime_chat": _exec_realtime_chat,
-        "security_scan": _exec_security_scan,
-        "generate_image": _exec_generate_image,
-        "generate_thumbnail": _exec_generate_thumbnail,
-        "analyze_data": _exec_analyze_data,
-        "generate_video": _exec_generate_video,
-        "generate_clips": _exec_generate_clips,
-        "fine_tune": _exec_fine_tune,
-        "publish_social": _exec_publish_social,
-        "create_integration_webhook": _exec_create_integration_webhook,
-        "deploy_chatbot": _exec_deploy_chatbot,
-        "search_marketplace": _exec_search_marketplace,
-        "generate_presentation": _exec_generate_presentation,
-        "execute_code": _exec_execute_code,
-        "generate_form": _exec_generate_form,
-        "scrape_repos": _exec_scrape_repos,
-        "analyze_repo": _exec_analyze_repo,
-        "batch_transcribe": _exec_batch_transcribe,
-        "generate_summary": _exec_generate_summary,
-        "process_pdf": _exec_process_pdf,
-        "edit_audio": _exec_edit_audio,
-        "generate_podcast": _exec_generate_podcast,
-        "youtube_transcript": _exec_youtube_transcript,
-        "youtube_metadata": _exec_youtube_metadata,
-        "youtube_smart": _exec_youtube_smart,
-        "youtube_playlist": _exec_youtube_playlist,
-        "youtube_analyze": _exec_youtube_analyze,
-        "instagram_analyze_profile": _exec_instagram_analyze_profile,
-        "instagram_analyze_reel": _exec_instagram_analyze_reel,
-        "instagram_validate": _exec_instagram_validate,
-    }
+    """Execute a single agent step through the shared action runtime."""
+    handler = _HANDLERS.get(action, _exec_generate)
+    return await action_runtime.run("agents", action, handler, input_data, previous_output)
+
+
+# ---------------------------------------------------------------------------
+# Plan scheduling: dependency-aware, concurrent step execution
+# ---------------------------------------------------------------------------
+
+# on_progress(started, finished) -> False to stop the run.  ``started`` are
+# step indices; ``finished`` are (index, result, failed) tuples.
+ProgressCallback = Callable[[list[int], list[tuple[int, dict, bool]]], Awaitable[Optional[bool]]]
+
+
+async def _run_planned_step(step: dict, previous_output: Optional[str], user_id: str) -> tuple[dict, bool]:
+    action = step.get("action", "generate_text")
+    step_input = {**(step.get("input") or {}), "_user_id": user_id}
+    try:
+        return await execute_step(action=action, input_data=step_input, previous_output=previous_output), False
+    except Exception as e:
+        logger.error("agent_step_failed", action=action, error=str(e))
+        return {"error": str(e), "action": action}, True
+
+
+async def execute_plan(
+    plan: list[dict],
+    user_id: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Optional[list[dict]]:
+    """
+    Execute a resolved plan (see planner.resolve_dependencies).
+
+    A step starts as soon as every step in its ``depends_on`` has finished
+    and receives their outputs, joined, as ``previous_output``.  Up to
+    AGENT_MAX_PARALLEL_STEPS steps run at once; the action runtime applies
+    the process-wide resource limits and timeouts.  ``on_progress`` is awaited once per scheduling round
+    with the steps started and finished in that round, so callers can batch
+    their writes; returning False cancels the remaining steps.
+
+    Returns the results in plan order, or None if the run was stopped.
+    """
+    results: dict[int, dict] = {}
+    pending = list(range(len(plan)))
+    running: dict[asyncio.Task, int] = {}
+    finished: list[tuple[int, dict, bool]] = []
+    max_parallel = max(1, settings.AGENT_MAX_PARALLEL_STEPS)
 
-    handler = handlers.get(action, _exec_generate)
-    return await handler(input_data, previous_output)
+    try:
+        while pending or running:
+            started = []
+            for i in list(pending):
+                if len(running) >= max_parallel:
+                    break
+                deps = plan[i].get("depends_on") or []
+                if not all(d in results for d in deps):
+                    continue
+                outputs = [results[d].get("output") or "" for d in deps]
+                previous = "\n\n".join(o for o in outputs if o) if deps else None
+                pending.remove(i)
+                running[asyncio.create_task(_run_planned_step(plan[i], previous, user_id))] = i
+                started.append(i)
+
+            if on_progress and (started or finished):
+                if await on_progress(started, finished) is False:
+                    return None
+            finished = []
+            if not running:
+                # Unsatisfiable dependencies; resolve_dependencies prevents this
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = running.pop(task)
+                result, failed = task.result()
+                results[i] = result
+                finished.append((i, result, failed))
+
+        if on_progress and finished:
+            if await on_progress([], finished) is False:
+                return None
+    finally:
+        for task in running:
+            task.cancel()
+
+    return [results.get(i, {"error": "Dependencies not met", "action": step.get("action")})
+            for i, step in enumerate(plan)]
 
 
 async def _exec_transcribe(input_data: dict, previous: Optional[str]) -> dict:
@@ -535,10 +563,11 @@ async def _exec_summarize(input_data: dict, previous: Optional[str]) -> dict:
         return {"output": "", "error": "No text to summarize", "action": "summarize"}
 
     try:
-        from app.ai_assistant.service import AIAssistantService
+        from app.ai_assistant.long_text import map_reduce
         max_length = input_data.get("max_length", 500)
-        result = await AIAssistantService.process_text_with_provider(
-            text=f"Summarize the following text in {max_length} words or less:\n\n{text[:8000]}",
+        result = await map_reduce(
+            text,
+            f"Summarize the following text in {max_length} words or less.",
             task="summarize",
             provider_name=input_data.get("provider", "gemini"),
             user_id=input_data.get("_user_id"),
@@ -1278,7 +1307,7 @@ async def _exec_search_marketplace(input_data: dict, previous: Optional[str]) ->
 
         async with get_session_context() as session:
             service = MarketplaceService(session)
-            listings, total = await service.list_listings(
+            page = await service.list_listings(
                 type=input_data.get("type"),
                 category=input_data.get("category"),
                 sort_by=input_data.get("sort_by", "newest"),
@@ -1286,6 +1315,7 @@ async def _exec_search_marketplace(input_data: dict, previous: Optional[str]) ->
                 limit=input_data.get("limit", 10),
                 offset=0,
             )
+            listings, total = page.items, page.total
 
         if listings:
             results_text = f"Found {total} marketplace listing(s) for '{query}':\n\n"
@@ -1932,3 +1962,66 @@ async def _exec_instagram_analyze_reel(input_data: dict, previous: Optional[str]
         return {"output": output, "reel": reel, "action": "instagram_analyze_reel"}
     except Exception as e:
         return {"output": "", "error": str(e)[:500], "action": "instagram_analyze_reel"}
+
+
+# Built once at import; execute_step falls back to _exec_generate.
+_HANDLERS = {
+    "transcribe": _exec_transcribe,
+    "summarize": _exec_summarize,
+    "translate": _exec_translate,
+    "search_knowledge": _exec_search,
+    "ask_knowledge": _exec_ask,
+    "compare_models": _exec_compare,
+    "generate_text": _exec_generate,
+    "extract_info": _exec_extract,
+    "analyze_sentiment": _exec_sentiment,
+    "create_pipeline": _exec_generate,  # Fallback to generate for now
+    "crawl_web": _exec_crawl_web,
+    "seed_web_urls": _exec_seed_web_urls,
+    "batch_crawl": _exec_batch_crawl,
+    "deep_crawl": _exec_deep_crawl,
+    "scrape_http": _exec_scrape_http,
+    "adaptive_crawl": _exec_adaptive_crawl,
+    "hub_crawl": _exec_hub_crawl,
+    "scrape_pdf": _exec_scrape_pdf,
+    "extract_cosine": _exec_extract_cosine,
+    "extract_lxml": _exec_extract_lxml,
+    "docker_crawl": _exec_docker_crawl,
+    "chunk_regex": _exec_chunk_regex,
+    "analyze_image": _exec_analyze_image,
+    "generate_content": _exec_generate_content,
+    "run_workflow": _exec_run_workflow,
+    "run_crew": _exec_run_crew,
+    "text_to_speech": _exec_tts,
+    "voice_dub": _exec_voice_dub,
+    "realtime_chat": _exec_realtime_chat,
+    "security_scan": _exec_security_scan,
+    "generate_image": _exec_generate_image,
+    "generate_thumbnail": _exec_generate_thumbnail,
+    "analyze_data": _exec_analyze_data,
+    "generate_video": _exec_generate_video,
+    "generate_clips": _exec_generate_clips,
+    "fine_tune": _exec_fine_tune,
+    "publish_social": _exec_publish_social,
+    "create_integration_webhook": _exec_create_integration_webhook,
+    "deploy_chatbot": _exec_deploy_chatbot,
+    "search_marketplace": _exec_search_marketplace,
+    "generate_presentation": _exec_generate_presentation,
+    "execute_code": _exec_execute_code,
+    "generate_form": _exec_generate_form,
+    "scrape_repos": _exec_scrape_repos,
+    "analyze_repo": _exec_analyze_repo,
+    "batch_transcribe": _exec_batch_transcribe,
+    "generate_summary": _exec_generate_summary,
+    "process_pdf": _exec_process_pdf,
+    "edit_audio": _exec_edit_audio,
+    "generate_podcast": _exec_generate_podcast,
+    "youtube_transcript": _exec_youtube_transcript,
+    "youtube_metadata": _exec_youtube_metadata,
+    "youtube_smart": _exec_youtube_smart,
+    "youtube_playlist": _exec_youtube_playlist,
+    "youtube_analyze": _exec_youtube_analyze,
+    "instagram_analyze_profile": _exec_instagram_analyze_profile,
+    "instagram_analyze_reel": _exec_instagram_analyze_reel,
+    "instagram_validate": _exec_instagram_validate,
+}
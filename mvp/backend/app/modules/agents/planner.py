@@ -2,7 +2,9 @@
 Agent Planner - Decomposes natural language instructions into executable steps.
 
 Uses AI to analyze the instruction and create a step-by-step plan
-using available platform capabilities.
+using available platform capabilities.  Every step carries ``depends_on``,
+the indices of earlier steps whose output it consumes; steps without
+dependencies run concurrently.
 """
 
 import json
@@ -93,11 +95,15 @@ Respond with a JSON array of steps. Each step must have:
 - "action": one of the available action keys
 - "description": what this step does
 - "input": parameters for the action (object)
+- "depends_on": indices (0-based) of earlier steps whose output this step needs; [] if it needs none
+
+Steps that fetch independent sources (several URLs, several videos) must not depend on each other.
 
 Example response:
 [
-  {{"action": "transcribe", "description": "Transcribe the YouTube video", "input": {{"url": "https://..."}}}},
-  {{"action": "summarize", "description": "Summarize the transcription", "input": {{"max_length": 500}}}}
+  {{"action": "youtube_transcript", "description": "Get the first video transcript", "input": {{"url": "https://..."}}, "depends_on": []}},
+  {{"action": "youtube_transcript", "description": "Get the second video transcript", "input": {{"url": "https://..."}}, "depends_on": []}},
+  {{"action": "summarize", "description": "Summarize both transcripts", "input": {{"max_length": 500}}, "depends_on": [0, 1]}}
 ]
 
 Respond ONLY with the JSON array, no other text."""
@@ -116,7 +122,7 @@ Respond ONLY with the JSON array, no other text."""
         if start >= 0 and end > start:
             plan = json.loads(response_text[start:end])
             if isinstance(plan, list) and len(plan) > 0:
-                return plan
+                return resolve_dependencies(plan)
 
     except Exception as e:
         logger.warning("agent_planner_ai_failed", error=str(e))
@@ -125,8 +131,70 @@ Respond ONLY with the JSON array, no other text."""
     return _heuristic_plan(instruction)
 
 
+# Actions that read their own source (URL, query, username...) and can run
+# without an earlier step's output when that source is given in their input.
+SOURCE_ACTIONS = {
+    "transcribe", "batch_transcribe", "search_knowledge", "ask_knowledge",
+    "crawl_web", "crawl_and_index", "seed_web_urls", "batch_crawl", "deep_crawl",
+    "scrape_http", "adaptive_crawl", "hub_crawl", "scrape_pdf", "extract_cosine",
+    "extract_lxml", "docker_crawl", "analyze_image", "search_marketplace",
+    "scrape_repos", "analyze_repo", "youtube_transcript", "youtube_metadata",
+    "youtube_smart", "youtube_playlist", "youtube_analyze",
+    "instagram_analyze_profile", "instagram_analyze_reel", "instagram_validate",
+}
+
+_SOURCE_KEYS = ("url", "urls", "query", "question", "username", "reel_url", "domain", "image_url", "repo_url", "repos")
+
+
+def _is_independent(step: dict) -> bool:
+    """A source action with its source in the input needs no earlier output."""
+    if step.get("action") not in SOURCE_ACTIONS:
+        return False
+    step_input = step.get("input") or {}
+    return any(step_input.get(key) for key in _SOURCE_KEYS)
+
+
+def resolve_dependencies(plan: list[dict]) -> list[dict]:
+    """
+    Give every step a valid ``depends_on`` list.
+
+    Explicit dependencies are kept when they point at earlier steps.  Missing
+    or invalid ones are inferred: a source action with its own input has no
+    dependencies; any other step consumes the output of the step before it,
+    or of the whole run of independent steps before it (five fetches followed
+    by a summary give a summary of all five).
+    """
+    resolved = []
+    tail: list[int] = []
+    previous_independent = False
+    for i, step in enumerate(plan):
+        step = dict(step)
+        deps = step.get("depends_on")
+        if isinstance(deps, list) and all(isinstance(d, int) and 0 <= d < i for d in deps):
+            deps = sorted(set(deps))
+        elif _is_independent(step) or i == 0:
+            deps = []
+        else:
+            deps = list(tail)
+        step["depends_on"] = deps
+
+        independent = not deps
+        if independent and previous_independent:
+            tail.append(i)
+        else:
+            tail = [i]
+        previous_independent = independent
+        resolved.append(step)
+    return resolved
+
+
 def _heuristic_plan(instruction: str) -> list[dict]:
     """Simple rule-based planning fallback."""
+    return resolve_dependencies(_heuristic_steps(instruction))
+
+
+def _heuristic_steps(instruction: str) -> list[dict]:
+    """Match instruction keywords to an ordered list of steps."""
     instruction_lower = instruction.lower()
     steps = []
 
@@ -2,6 +2,7 @@
 Agent API routes - Autonomous AI task execution.
 """
 
+import asyncio
 import json
 from uuid import UUID
 
@@ -10,6 +11,8 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
+from app.core import blob_store
+from app.core.run_supervisor import RunLimitExceeded
 from app.database import get_session
 from app.models.user import User
 from app.modules.agents.schemas import AgentRunRead, AgentRunRequest, AgentStepRead
@@ -21,7 +24,7 @@ from app.rate_limit import limiter
 router = APIRouter()
 
 
-@router.post("/run", response_model=AgentRunRead)
+@router.post("/run", response_model=AgentRunRead, status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("5/minute")
 async def run_agent(
     request: Request,
@@ -30,40 +33,29 @@ async def run_agent(
     session: AsyncSession = Depends(get_session),
 ):
     """
-    Execute an autonomous AI agent.
+    Execute an autonomous AI agent as a background job (core.run_supervisor).
 
-    The agent decomposes the instruction into steps and executes them
-    sequentially using platform capabilities.
+    The agent decomposes the instruction into steps and executes them using
+    platform capabilities; steps that do not depend on each other run
+    concurrently.  Returns the run in the ``planning`` state immediately.
+    Progress is pushed over the user's WebSocket as ``agent_run_progress``
+    messages and can be polled with ``GET /runs/{run_id}``.  AI quota is
+    consumed once planning is done (1 per step).  Answers 429 when the user
+    already has BACKGROUND_RUNS_MAX_PER_USER runs going.
 
     Rate limit: 5 requests/minute
     """
-    run = await AgentService.create_and_run(
-        user_id=current_user.id,
-        instruction=body.instruction,
-        session=session,
-    )
-
-    # Consume AI quota (1 per step executed)
-    await BillingService.consume_quota(
-        current_user.id, "ai_call", max(run.total_steps, 1), session
-    )
-
-    # Fetch steps for response
-    data = await AgentService.get_run(run.id, current_user.id, session)
-    steps = []
-    if data:
-        for s in data["steps"]:
-            steps.append(AgentStepRead(
-                id=s.id, step_index=s.step_index, action=s.action,
-                description=s.description, status=s.status.value if hasattr(s.status, 'value') else s.status,
-                error=s.error, output_json=s.output_json, started_at=s.started_at, completed_at=s.completed_at,
-            ))
+    # Runs in this process so progress reaches the WebSocket connections it holds
+    try:
+        run = await AgentService.start_run(current_user.id, body.instruction, session)
+    except RunLimitExceeded as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
 
     return AgentRunRead(
         id=run.id, instruction=run.instruction,
         status=run.status.value if hasattr(run.status, 'value') else run.status,
         current_step=run.current_step, total_steps=run.total_steps,
-        steps=steps, error=run.error,
+        steps=[], error=run.error,
         created_at=run.created_at, completed_at=run.completed_at,
     )
 
@@ -103,13 +95,14 @@ async def get_run(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent run not found")
 
     run = data["run"]
+    outputs = await asyncio.gather(*(blob_store.load(s.output_json) for s in data["steps"]))
     steps = [
         AgentStepRead(
             id=s.id, step_index=s.step_index, action=s.action,
             description=s.description, status=s.status.value if hasattr(s.status, 'value') else s.status,
-            error=s.error, output_json=s.output_json, started_at=s.started_at, completed_at=s.completed_at,
+            error=s.error, output_json=output, started_at=s.started_at, completed_at=s.completed_at,
         )
-        for s in data["steps"]
+        for s, output in zip(data["steps"], outputs)
     ]
 
     return AgentRunRead(
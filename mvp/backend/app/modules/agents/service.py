@@ -2,6 +2,7 @@
 Agent service - Orchestrates planning and execution of autonomous agents.
 """
 
+import asyncio
 import json
 from datetime import UTC, datetime
 from typing import Optional
@@ -11,42 +12,164 @@ import structlog
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import blob_store, run_supervisor
 from app.models.agent import AgentRun, AgentStep, AgentStatus
 from app.modules.agents.planner import create_plan
-from app.modules.agents.executor import execute_step
+from app.modules.agents.executor import execute_plan
 
 logger = structlog.get_logger()
 
 
+async def _track_step_cost(run: AgentRun, step: AgentStep, result: dict, session: AsyncSession) -> None:
+    try:
+        from app.modules.cost_tracker.tracker import track_ai_usage
+        await track_ai_usage(
+            user_id=run.user_id,
+            provider=result.get("provider", "unknown"),
+            model="agent",
+            module="agents",
+            action=step.action,
+            input_tokens=0,
+            output_tokens=len(result.get("output", "")),
+            latency_ms=int((step.completed_at - step.started_at).total_seconds() * 1000) if step.completed_at and step.started_at else 0,
+            success=step.status == AgentStatus.COMPLETED,
+            session=session,
+        )
+    except Exception as e:
+        logger.warning("agent_cost_tracking_failed", run_id=str(run.id), step=step.step_index, error=str(e))
+
+
+async def _consume_quota(run: AgentRun, session: AsyncSession) -> None:
+    """Charge the run's AI calls (one per planned step) to its owner's quota."""
+    try:
+        from app.modules.billing.service import BillingService
+        await BillingService.consume_quota(run.user_id, "ai_call", max(run.total_steps, 1), session)
+    except Exception as e:
+        logger.warning("agent_quota_consume_failed", run_id=str(run.id), error=str(e))
+
+
+async def _notify_progress(
+    run: AgentRun,
+    steps: list[AgentStep],
+    started: Optional[list[int]] = None,
+    finished: Optional[list[tuple[int, dict, bool]]] = None,
+) -> None:
+    """Push an ``agent_run_progress`` message to the run owner's WebSocket."""
+    try:
+        from app.core.websocket_manager import build_message, manager
+
+        user_id = str(run.user_id)
+        event = {
+            "run_id": str(run.id),
+            "status": run.status.value if hasattr(run.status, "value") else run.status,
+            "completed_steps": run.current_step,
+            "total_steps": run.total_steps,
+            "started": [{"step_index": i, "action": steps[i].action} for i in started or []],
+            "finished": [
+                {"step_index": i, "action": steps[i].action,
+                 "status": steps[i].status.value, "error": steps[i].error}
+                for i, _, _ in finished or []
+            ],
+        }
+        await manager.send_personal(user_id, build_message("agent_run_progress", event, user_id=user_id))
+    except Exception as e:
+        logger.debug("agent_progress_push_failed", run_id=str(run.id), error=str(e))
+
+
 class AgentService:
     """Service for autonomous AI agent operations."""
 
     @staticmethod
-    async def create_and_run(
+    async def create_run(
         user_id: UUID,
         instruction: str,
         session: AsyncSession,
     ) -> AgentRun:
-        """Create an agent run, plan steps, and execute them."""
-        # Create the run
+        """Create an agent run in the planning state; execute it with execute_run."""
         run = AgentRun(
             user_id=user_id,
             instruction=instruction,
             status=AgentStatus.PLANNING,
         )
         session.add(run)
-        await session.flush()
+        await session.commit()
+        await session.refresh(run)
 
         logger.info("agent_run_created", run_id=str(run.id), instruction=instruction[:100])
+        return run
+
+    @staticmethod
+    async def start_run(user_id: UUID, instruction: str, session: AsyncSession) -> AgentRun:
+        """
+        Create a run and execute it in the background (core.run_supervisor).
+
+        Returns the ``planning`` run right away; raises RunLimitExceeded when
+        the user already has too many runs going.
+        """
+        with run_supervisor.reserve(user_id, "agent") as slot:
+            run = await AgentService.create_run(user_id, instruction, session)
+            slot.start(
+                "agent", run.id, AgentService.execute_run(run.id),
+                on_cancelled=lambda: AgentService.record_cancelled(run.id),
+            )
+        return run
+
+    @staticmethod
+    async def create_and_run(
+        user_id: UUID,
+        instruction: str,
+        session: AsyncSession,
+    ) -> AgentRun:
+        """Create an agent run, plan steps, and execute them."""
+        run = await AgentService.create_run(user_id, instruction, session)
+        return await AgentService._execute(run, session)
+
+    @staticmethod
+    async def execute_run(run_id: UUID) -> None:
+        """Background job: plan and execute a run created by create_run."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            run = await session.get(AgentRun, run_id)
+            if run is None or run.status != AgentStatus.PLANNING:
+                return
+            await AgentService._execute(run, session)
+
+    @staticmethod
+    async def record_cancelled(run_id: UUID) -> None:
+        """Mark a run cancelled before it started as ``cancelled``."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            run = await session.get(AgentRun, run_id)
+            if not run or run.status not in (AgentStatus.PLANNING, AgentStatus.EXECUTING):
+                return
+            run.status = AgentStatus.CANCELLED
+            run.completed_at = datetime.now(UTC)
+            session.add(run)
+            await session.commit()
+
+    @staticmethod
+    async def _execute(run: AgentRun, session: AsyncSession) -> AgentRun:
+        """
+        Plan the run and execute its steps.
+
+        The AI quota (one call per planned step) is consumed as soon as the
+        plan is committed.  Independent steps run concurrently
+        (executor.execute_plan); step status changes are written in one
+        commit per scheduling round and pushed to the user's WebSocket as
+        ``agent_run_progress`` messages.
+        """
+        user_id = run.user_id
+        steps: list[AgentStep] = []
 
         try:
             # Plan the steps
-            plan = await create_plan(instruction)
+            plan = await create_plan(run.instruction)
             run.plan_json = json.dumps(plan, ensure_ascii=False)
             run.total_steps = len(plan)
 
             # Create step records
-            steps = []
             for i, step_data in enumerate(plan):
                 step = AgentStep(
                     run_id=run.id,
@@ -59,86 +182,80 @@ class AgentService:
                 steps.append(step)
 
             run.status = AgentStatus.EXECUTING
+            session.add(run)
             await session.commit()
 
             logger.info("agent_plan_created", run_id=str(run.id), steps=len(plan))
-
-            # Execute steps sequentially
-            previous_output = None
-            results = []
-
-            for i, (step, step_data) in enumerate(zip(steps, plan)):
-                step.status = AgentStatus.EXECUTING
-                step.started_at = datetime.now(UTC)
-                run.current_step = i + 1
-                session.add(step)
+            await _consume_quota(run, session)
+            await _notify_progress(run, steps)
+
+            async def on_progress(started: list[int], finished: list[tuple[int, dict, bool]]) -> bool:
+                now = datetime.now(UTC)
+                for i in started:
+                    steps[i].status = AgentStatus.EXECUTING
+                    steps[i].started_at = now
+                    session.add(steps[i])
+                for i, result, failed in finished:
+                    step = steps[i]
+                    step.completed_at = now
+                    if failed:
+                        step.status = AgentStatus.FAILED
+                        step.error = str(result.get("error", ""))[:1000]
+                    else:
+                        step.status = AgentStatus.COMPLETED
+                        step.output_json = await blob_store.dump_json(result)
+                        if result.get("error"):
+                            step.error = result["error"][:1000]
+                        await _track_step_cost(run, step, result, session)
+                run.current_step += len(finished)
                 session.add(run)
                 await session.commit()
 
-                try:
-                    step_input = step_data.get("input", {})
-                    step_input["_user_id"] = str(user_id)
-
-                    result = await execute_step(
-                        action=step_data.get("action", "generate_text"),
-                        input_data=step_input,
-                        previous_output=previous_output,
-                    )
-
-                    step.output_json = json.dumps(result, ensure_ascii=False)
-                    step.status = AgentStatus.COMPLETED
-                    step.completed_at = datetime.now(UTC)
-
-                    previous_output = result.get("output", "")
-                    results.append(result)
-
-                    if result.get("error"):
-                        step.error = result["error"][:1000]
-
-                    # Track cost for this step
-                    try:
-                        from app.modules.cost_tracker.tracker import track_ai_usage
-                        await track_ai_usage(
-                            user_id=user_id,
-                            provider=result.get("provider", "unknown"),
-                            model="agent",
-                            module="agents",
-                            action=step.action,
-                            input_tokens=0,
-                            output_tokens=len(result.get("output", "")),
-                            latency_ms=int((step.completed_at - step.started_at).total_seconds() * 1000) if step.completed_at and step.started_at else 0,
-                            success=step.status == AgentStatus.COMPLETED,
-                            session=session,
-                        )
-                    except Exception as e:
-                        logger.warning("agent_cost_tracking_failed", run_id=str(run.id), step=i, error=str(e))
-
-                except Exception as e:
-                    step.status = AgentStatus.FAILED
-                    step.error = str(e)[:1000]
-                    step.completed_at = datetime.now(UTC)
-                    results.append({"error": str(e), "action": step.action})
-                    logger.error("agent_step_failed", run_id=str(run.id), step=i, error=str(e))
-
-                session.add(step)
-                await session.commit()
-
-            # Finalize: determine run status based on step outcomes
-            failed_steps = sum(1 for s in steps if s.status == AgentStatus.FAILED)
-            total_steps = len(steps)
-
-            if failed_steps == 0:
-                run.status = AgentStatus.COMPLETED
-            elif failed_steps == total_steps:
-                run.status = AgentStatus.FAILED
-                run.error = f"All {total_steps} steps failed"
+                # A cancel from another request lands in the same row
+                cancelled = (await session.execute(
+                    select(AgentRun.status).where(AgentRun.id == run.id)
+                )).scalar_one_or_none() == AgentStatus.CANCELLED
+                await _notify_progress(run, steps, started, finished)
+                return not cancelled
+
+            results = await execute_plan(plan, str(user_id), on_progress)
+
+            if results is None:
+                # Cancelled mid-run: the steps still queued or running never finish
+                run.status = AgentStatus.CANCELLED
+                run.completed_at = run.completed_at or datetime.now(UTC)
+                for step in steps:
+                    if step.status in (AgentStatus.PLANNING, AgentStatus.EXECUTING):
+                        step.status = AgentStatus.CANCELLED
+                        session.add(step)
+                results = list(await asyncio.gather(*(
+                    blob_store.load_json(s.output_json) for s in steps if s.status == AgentStatus.COMPLETED
+                )))
             else:
-                run.status = AgentStatus.PARTIAL_FAILURE
-                run.error = f"{failed_steps}/{total_steps} steps failed"
+                # Finalize: determine run status based on step outcomes
+                failed_steps = sum(1 for s in steps if s.status == AgentStatus.FAILED)
+                total_steps = len(steps)
+
+                if failed_steps == 0:
+                    run.status = AgentStatus.COMPLETED
+                elif failed_steps == total_steps:
+                    run.status = AgentStatus.FAILED
+                    run.error = f"All {total_steps} steps failed"
+                else:
+                    run.status = AgentStatus.PARTIAL_FAILURE
+                    run.error = f"{failed_steps}/{total_steps} steps failed"
+                run.completed_at = datetime.now(UTC)
 
             run.results_json = json.dumps(results, ensure_ascii=False)
-            run.completed_at = datetime.now(UTC)
 
+        except asyncio.CancelledError:
+            # Supervisor cancellation (e.g. shutdown): record it like a cancel request
+            run.status = AgentStatus.CANCELLED
+            run.completed_at = datetime.now(UTC)
+            for step in steps:
+                if step.status in (AgentStatus.PLANNING, AgentStatus.EXECUTING):
+                    step.status = AgentStatus.CANCELLED
+                    session.add(step)
         except Exception as e:
             run.status = AgentStatus.FAILED
             run.error = str(e)[:2000]
@@ -148,6 +265,7 @@ class AgentService:
         session.add(run)
         await session.commit()
         await session.refresh(run)
+        await _notify_progress(run, steps)
 
         logger.info(
             "agent_run_finished",
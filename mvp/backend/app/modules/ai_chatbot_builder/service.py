@@ -13,6 +13,7 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.ai_chatbot_builder import Chatbot, ChatbotConversation
+from app.models.user import User
 
 logger = structlog.get_logger()
 
@@ -258,12 +259,16 @@ class ChatbotBuilderService:
         assistant_response = ""
         try:
             from app.ai_assistant.service import AIAssistantService
+            # Public widget: no request tenant, hedge on the owner's opt-in
+            owner = await self.session.get(User, chatbot.user_id)
             result = await AIAssistantService.process_text_with_provider(
                 text=full_prompt,
                 task="chatbot_response",
                 provider_name=chatbot.model or "gemini",
                 user_id=chatbot.user_id,
                 module="ai_chatbot_builder",
+                hedge=True,
+                tenant_id=owner.tenant_id if owner else None,
             )
             assistant_response = result.get("processed_text", "I'm sorry, I couldn't process your request.")
         except Exception as e:
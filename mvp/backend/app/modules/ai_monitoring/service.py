@@ -9,17 +9,17 @@ Langfuse integration adds LLM-specific observability (traces, generations, score
 """
 
 import os
-import json
 from datetime import UTC, datetime, timedelta
 from typing import Any, Optional
 from uuid import UUID
 
 import structlog
-from sqlalchemy import func, text
+from sqlalchemy import Float, cast, func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.cost_tracking import AIUsageLog
+from app.modules.cost_tracker import rollups
 
 # Langfuse integration - auto-detection + graceful fallback
 try:
@@ -79,17 +79,21 @@ class AIMonitoringService:
         """Get comprehensive monitoring dashboard data."""
         since = datetime.now(UTC) - timedelta(days=days)
 
+        # Rollups cover everything up to the compaction watermark; only the
+        # raw tail after it is aggregated from ai_usage_logs.
+        watermark = await rollups.get_watermark(session)
+        usage = rollups.usage_source(user_id, since, watermark)
+
         # Query 1: Provider breakdown (derives totals + per-provider stats)
         provider_stats = await session.execute(
             select(
-                AIUsageLog.provider,
-                func.count().label("calls"),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0).label("tokens"),
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-                func.coalesce(func.avg(AIUsageLog.latency_ms), 0).label("avg_latency"),
-                func.sum(func.cast(AIUsageLog.success, type_=func.count().type)).label("successes"),
-            ).where(AIUsageLog.user_id == user_id, AIUsageLog.created_at >= since)
-            .group_by(AIUsageLog.provider)
+                usage.c.provider,
+                func.sum(usage.c.calls).label("calls"),
+                func.coalesce(func.sum(usage.c.total_tokens), 0).label("tokens"),
+                func.coalesce(func.sum(usage.c.cost_cents), 0).label("cost"),
+                rollups.avg_latency(usage).label("avg_latency"),
+                func.sum(usage.c.successes).label("successes"),
+            ).group_by(usage.c.provider)
         )
         providers = []
         total = 0
@@ -121,67 +125,44 @@ class AIMonitoringService:
         # Query 2: Module breakdown (top 10)
         module_stats = await session.execute(
             select(
-                AIUsageLog.module,
-                func.count().label("calls"),
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-            ).where(AIUsageLog.user_id == user_id, AIUsageLog.created_at >= since)
-            .group_by(AIUsageLog.module)
-            .order_by(func.count().desc())
+                usage.c.module,
+                func.sum(usage.c.calls).label("calls"),
+                func.coalesce(func.sum(usage.c.cost_cents), 0).label("cost"),
+            ).group_by(usage.c.module)
+            .order_by(func.sum(usage.c.calls).desc())
             .limit(10)
         )
         modules = [{"module": r[0], "calls": int(r[1]), "cost_cents": round(float(r[2]), 2)} for r in module_stats]
 
-        # Query 3: Daily trend + recent errors (single raw SQL)
-        combined = await session.execute(
-            text("""
-                WITH trend AS (
-                    SELECT DATE(created_at) as day, COUNT(*) as calls,
-                           COALESCE(SUM(total_tokens), 0) as tokens,
-                           COALESCE(SUM(cost_cents), 0) as cost
-                    FROM ai_usage_logs
-                    WHERE user_id = :uid AND created_at >= :since
-                    GROUP BY DATE(created_at)
-                    ORDER BY day
-                ),
-                errors AS (
-                    SELECT provider, module, action, error,
-                           to_char(created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US') as created_at_iso
-                    FROM ai_usage_logs
-                    WHERE user_id = :uid AND success = false AND created_at >= :since
-                    ORDER BY created_at DESC
-                    LIMIT 10
-                )
-                SELECT
-                    COALESCE((SELECT json_agg(json_build_object(
-                        'day', t.day::text,
-                        'calls', t.calls,
-                        'tokens', t.tokens,
-                        'cost_cents', ROUND(t.cost::numeric, 2)
-                    )) FROM trend t), '[]'::json) as daily_trend,
-                    COALESCE((SELECT json_agg(json_build_object(
-                        'provider', e.provider,
-                        'module', e.module,
-                        'action', e.action,
-                        'error', e.error,
-                        'created_at', e.created_at_iso
-                    )) FROM errors e), '[]'::json) as recent_errors
-            """),
-            {"uid": str(user_id), "since": since.isoformat()},
+        # Query 3: Daily trend
+        day = func.date(usage.c.bucket).label("day")
+        trend_rows = await session.execute(
+            select(
+                day,
+                func.sum(usage.c.calls).label("calls"),
+                func.coalesce(func.sum(usage.c.total_tokens), 0).label("tokens"),
+                func.coalesce(func.sum(usage.c.cost_cents), 0).label("cost"),
+            ).group_by(day).order_by(day)
         )
-        combined_row = combined.one()
-        raw_trend = combined_row[0] if combined_row[0] else []
-        raw_errors = combined_row[1] if combined_row[1] else []
-        if isinstance(raw_trend, str):
-            raw_trend = json.loads(raw_trend)
-        if isinstance(raw_errors, str):
-            raw_errors = json.loads(raw_errors)
         daily_trend = [
-            {"day": r["day"], "calls": int(r["calls"]), "tokens": int(r["tokens"]), "cost_cents": float(r["cost_cents"])}
-            for r in raw_trend
+            {"day": str(r[0]), "calls": int(r[1]), "tokens": int(r[2]), "cost_cents": round(float(r[3]), 2)}
+            for r in trend_rows
         ]
+
+        # Query 4: Recent errors (raw rows, bounded by LIMIT)
+        error_rows = await session.execute(
+            select(
+                AIUsageLog.provider, AIUsageLog.module, AIUsageLog.action,
+                AIUsageLog.error, AIUsageLog.created_at,
+            ).where(
+                AIUsageLog.user_id == user_id,
+                AIUsageLog.success == False,  # noqa: E712
+                AIUsageLog.created_at >= rollups.to_naive_utc(since),
+            ).order_by(AIUsageLog.created_at.desc()).limit(10)
+        )
         recent_errors = [
-            {"provider": r["provider"], "module": r["module"], "action": r["action"], "error": r["error"], "created_at": r["created_at"]}
-            for r in raw_errors
+            {"provider": r[0], "module": r[1], "action": r[2], "error": r[3], "created_at": r[4].isoformat()}
+            for r in error_rows
         ]
 
         return {
@@ -205,20 +186,23 @@ class AIMonitoringService:
         """Compare providers by quality, speed, and cost."""
         since = datetime.now(UTC) - timedelta(days=days)
 
+        watermark = await rollups.get_watermark(session)
+        usage = rollups.usage_source(user_id, since, watermark)
+        calls = func.sum(usage.c.calls)
+
         result = await session.execute(
             select(
-                AIUsageLog.provider,
-                AIUsageLog.model,
-                func.count().label("calls"),
-                func.avg(AIUsageLog.latency_ms).label("avg_latency"),
-                func.min(AIUsageLog.latency_ms).label("min_latency"),
-                func.max(AIUsageLog.latency_ms).label("max_latency"),
-                func.sum(AIUsageLog.cost_cents).label("total_cost"),
-                func.avg(AIUsageLog.cost_cents).label("avg_cost_per_call"),
-                func.avg(AIUsageLog.total_tokens).label("avg_tokens"),
-            ).where(AIUsageLog.user_id == user_id, AIUsageLog.created_at >= since)
-            .group_by(AIUsageLog.provider, AIUsageLog.model)
-            .order_by(func.count().desc())
+                usage.c.provider,
+                usage.c.model,
+                calls.label("calls"),
+                rollups.avg_latency(usage).label("avg_latency"),
+                func.min(usage.c.latency_ms_min).label("min_latency"),
+                func.max(usage.c.latency_ms_max).label("max_latency"),
+                func.sum(usage.c.cost_cents).label("total_cost"),
+                (func.sum(usage.c.cost_cents) / cast(func.nullif(calls, 0), Float)).label("avg_cost_per_call"),
+                (cast(func.sum(usage.c.total_tokens), Float) / cast(func.nullif(calls, 0), Float)).label("avg_tokens"),
+            ).group_by(usage.c.provider, usage.c.model)
+            .order_by(calls.desc())
         )
 
         return [
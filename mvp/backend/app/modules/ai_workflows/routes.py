@@ -2,15 +2,20 @@
 AI Workflows API routes - No-code automation workflow management and execution.
 """
 
+import asyncio
 import json
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
+from app.core import blob_store
+from app.core.pagination import InvalidCursor
+from app.core.run_supervisor import RunLimitExceeded
 from app.database import get_session
 from app.models.user import User
 from app.modules.ai_workflows.schemas import (
@@ -54,9 +59,9 @@ def _workflow_to_read(workflow) -> WorkflowRead:
     )
 
 
-def _run_to_read(run) -> RunRead:
+async def _run_to_read(run, include_results: bool = True) -> RunRead:
     """Convert a WorkflowRun model to RunRead schema."""
-    results_data = json.loads(run.results_json) if run.results_json else []
+    results_data = await blob_store.load_json(run.results_json, []) if include_results else []
     return RunRead(
         id=run.id,
         workflow_id=run.workflow_id,
@@ -261,7 +266,7 @@ async def delete_workflow(
     return None
 
 
-@router.post("/{workflow_id}/run", response_model=RunRead)
+@router.post("/{workflow_id}/run", response_model=RunRead, status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("3/minute")
 async def trigger_workflow(
     request: Request,
@@ -273,18 +278,27 @@ async def trigger_workflow(
     """
     Trigger a workflow execution with optional input data.
 
+    The run executes in the background and is returned in the ``running``
+    state immediately.  Node progress is pushed over the user's WebSocket
+    as ``workflow_run_progress`` messages; poll ``GET /runs/{run_id}`` for
+    the results and cancel with ``POST /runs/{run_id}/cancel``.  Returns
+    429 when the user already has BACKGROUND_RUNS_MAX_PER_USER runs going.
+
     Rate limit: 3 requests/minute
     """
-    run = await WorkflowService.execute_workflow(
-        workflow_id, current_user.id, session,
-        input_data=body.input_data,
-    )
+    try:
+        run = await WorkflowService.start_workflow(
+            workflow_id, current_user.id, session,
+            input_data=body.input_data,
+        )
+    except RunLimitExceeded as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
     if not run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Workflow not found",
         )
-    return _run_to_read(run)
+    return await _run_to_read(run)
 
 
 @router.post("/validate")
@@ -300,19 +314,31 @@ async def validate_workflow_graph(body: WorkflowCreate):
 @limiter.limit("20/minute")
 async def list_runs(
     request: Request,
+    response: Response,
     workflow_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_results: bool = Query(True, description="Include node results of each run"),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """
     List execution history for a workflow.
 
+    The cursor of the next page is returned in the ``X-Next-Cursor`` header.
+
     Rate limit: 20 requests/minute
     """
-    runs = await WorkflowService.list_runs(
-        workflow_id, current_user.id, session
-    )
-    return [_run_to_read(r) for r in runs]
+    try:
+        page = await WorkflowService.list_runs(
+            workflow_id, current_user.id, session,
+            limit=limit, cursor=cursor, include_results=include_results,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return list(await asyncio.gather(*(_run_to_read(r, include_results) for r in page.items)))
 
 
 @router.get("/runs/{run_id}", response_model=RunRead)
@@ -334,4 +360,47 @@ async def get_run(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Run not found",
         )
-    return _run_to_read(run)
+    return await _run_to_read(run)
+
+
+@router.get("/runs/{run_id}/results")
+@limiter.limit("30/minute")
+async def get_run_results(
+    request: Request,
+    run_id: UUID,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Stream the node results of a workflow run as a JSON array.
+
+    Rate limit: 30 requests/minute
+    """
+    run = await WorkflowService.get_run(run_id, current_user.id, session)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Run not found",
+        )
+    return StreamingResponse(blob_store.stream(run.results_json or "[]"), media_type="application/json")
+
+
+@router.post("/runs/{run_id}/cancel", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute")
+async def cancel_run(
+    request: Request,
+    run_id: UUID,
+    current_user: User = Depends(require_verified_email),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Cancel a running workflow run.
+
+    The run stops before its next node and ends ``failed`` with the error
+    "Cancelled by user"; results of the nodes that finished are kept.
+
+    Rate limit: 10 requests/minute
+    """
+    if not await WorkflowService.cancel_run(run_id, current_user.id, session):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot cancel this run")
+    return {"status": "cancelled"}
@@ -5,6 +5,7 @@ Supports triggers, conditional logic, and chained actions
 that orchestrate all platform modules.
 """
 
+import asyncio
 import json
 from datetime import UTC, datetime
 from typing import Optional
@@ -12,9 +13,13 @@ from uuid import UUID
 
 import structlog
 from sqlalchemy import func
+from sqlalchemy.orm import defer
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.config import settings
+from app.core import action_runtime, blob_store, pagination, run_supervisor
+from app.core.pagination import Page
 from app.models.workflow import (
     RunStatus,
     Workflow,
@@ -260,6 +265,27 @@ class WorkflowService:
         logger.info("workflow_deleted", workflow_id=str(workflow_id))
         return True
 
+    @staticmethod
+    async def _create_run(
+        workflow: Workflow,
+        user_id: UUID,
+        session: AsyncSession,
+        input_data: Optional[dict] = None,
+    ) -> WorkflowRun:
+        run = WorkflowRun(
+            workflow_id=workflow.id,
+            user_id=user_id,
+            status=RunStatus.RUNNING,
+            trigger_type=workflow.trigger_type,
+            trigger_data_json=json.dumps(input_data or {}, ensure_ascii=False),
+            total_nodes=len(json.loads(workflow.nodes_json)),
+            started_at=datetime.now(UTC),
+        )
+        session.add(run)
+        await session.commit()
+        await session.refresh(run)
+        return run
+
     @staticmethod
     async def execute_workflow(
         workflow_id: UUID,
@@ -267,28 +293,111 @@ class WorkflowService:
         session: AsyncSession,
         input_data: Optional[dict] = None,
     ) -> Optional[WorkflowRun]:
-        """Execute a workflow by traversing the node graph."""
-        import time
+        """Execute a workflow by traversing the node graph, in the caller's session."""
+        workflow = await session.get(Workflow, workflow_id)
+        if not workflow or workflow.user_id != user_id:
+            return None
 
+        run = await WorkflowService._create_run(workflow, user_id, session, input_data)
+        return await WorkflowService._execute(run, workflow, session, input_data)
+
+    @staticmethod
+    async def start_workflow(
+        workflow_id: UUID,
+        user_id: UUID,
+        session: AsyncSession,
+        input_data: Optional[dict] = None,
+    ) -> Optional[WorkflowRun]:
+        """
+        Create a run and execute it in the background (core.run_supervisor).
+
+        Returns the ``running`` run right away; raises RunLimitExceeded when
+        the user already has too many runs going.
+        """
         workflow = await session.get(Workflow, workflow_id)
         if not workflow or workflow.user_id != user_id:
             return None
 
-        nodes = json.loads(workflow.nodes_json)
-        edges = json.loads(workflow.edges_json)
+        with run_supervisor.reserve(user_id, "workflow") as slot:
+            run = await WorkflowService._create_run(workflow, user_id, session, input_data)
+            slot.start(
+                "workflow", run.id, WorkflowService.execute_run(run.id),
+                on_cancelled=lambda: WorkflowService.record_cancelled(run.id),
+            )
+        return run
 
-        run = WorkflowRun(
-            workflow_id=workflow_id,
-            user_id=user_id,
-            status=RunStatus.RUNNING,
-            trigger_type=workflow.trigger_type,
-            trigger_data_json=json.dumps(input_data or {}, ensure_ascii=False),
-            total_nodes=len(nodes),
-            started_at=datetime.now(UTC),
-        )
+    @staticmethod
+    async def execute_run(run_id: UUID) -> None:
+        """Background entry point: execute a created run in its own session."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            run = await session.get(WorkflowRun, run_id)
+            workflow = await session.get(Workflow, run.workflow_id) if run else None
+            if not run or not workflow:
+                return
+            input_data = json.loads(run.trigger_data_json or "{}") or None
+            await WorkflowService._execute(run, workflow, session, input_data, supervised=True)
+
+    @staticmethod
+    async def record_cancelled(run_id: UUID) -> None:
+        """Mark a run cancelled before it started as ``failed`` with a cancellation error."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            run = await session.get(WorkflowRun, run_id)
+            if not run or run.status != RunStatus.RUNNING:
+                return
+            run.status = RunStatus.FAILED
+            run.error = run_supervisor.CANCELLED_ERROR
+            run.completed_at = datetime.now(UTC)
+            session.add(run)
+            await session.commit()
+
+    @staticmethod
+    async def cancel_run(run_id: UUID, user_id: UUID, session: AsyncSession) -> bool:
+        """Cancel a running workflow run (it ends ``failed`` with a cancellation error)."""
+        run = await session.get(WorkflowRun, run_id)
+        if not run or run.user_id != user_id or run.status != RunStatus.RUNNING:
+            return False
+
+        run.status = RunStatus.FAILED
+        run.error = run_supervisor.CANCELLED_ERROR
+        run.completed_at = datetime.now(UTC)
         session.add(run)
         await session.commit()
-        await session.refresh(run)
+        # The run stops at its next node if another process executes it
+        run_supervisor.cancel(run.id)
+        return True
+
+    @staticmethod
+    async def _cancel_requested(run_id: UUID, session: AsyncSession) -> bool:
+        status = (await session.execute(
+            select(WorkflowRun.status).where(WorkflowRun.id == run_id)
+        )).scalar_one_or_none()
+        return status != RunStatus.RUNNING
+
+    @staticmethod
+    async def _execute(
+        run: WorkflowRun,
+        workflow: Workflow,
+        session: AsyncSession,
+        input_data: Optional[dict] = None,
+        supervised: bool = False,
+    ) -> WorkflowRun:
+        """
+        Run the node graph of ``workflow`` for ``run``.
+
+        Progress is committed before every node, so the session holds no
+        connection while a node runs, and pushed to the owner's WebSocket
+        as ``workflow_run_progress`` events.  ``supervised`` runs also stop
+        when their row is cancelled.
+        """
+        import time
+
+        nodes = json.loads(workflow.nodes_json)
+        edges = json.loads(workflow.edges_json)
+        user_id = run.user_id
 
         start_time = time.monotonic()
 
@@ -313,9 +422,19 @@ class WorkflowService:
         node_outputs = {}
         executed = set()
         queue = list(start_nodes)
-
-        commit_batch_size = 5
-        nodes_since_commit = 0
+        cancelled = False
+
+        async def progress(event: str, node: Optional[dict] = None, **extra) -> None:
+            await run_supervisor.notify(user_id, "workflow_run_progress", {
+                "run_id": str(run.id),
+                "workflow_id": str(workflow.id),
+                "event": event,
+                "status": run.status.value if hasattr(run.status, "value") else run.status,
+                "current_node": run.current_node,
+                "total_nodes": run.total_nodes,
+                "node": {"id": node["id"], "label": node.get("label", ""), "action": node.get("action", "")} if node else None,
+                **extra,
+            })
 
         try:
             while queue:
@@ -327,6 +446,10 @@ class WorkflowService:
                 if not node:
                     continue
 
+                if supervised and await WorkflowService._cancel_requested(run.id, session):
+                    cancelled = True
+                    break
+
                 # Gather inputs from parent nodes
                 parent_outputs = []
                 for edge in edges:
@@ -339,11 +462,8 @@ class WorkflowService:
 
                 run.current_node = len(executed) + 1
                 session.add(run)
-                nodes_since_commit += 1
-
-                if nodes_since_commit >= commit_batch_size:
-                    await session.commit()
-                    nodes_since_commit = 0
+                await session.commit()
+                await progress("node_started", node)
 
                 node_result = await WorkflowService._execute_node(
                     node, previous_output, user_id
@@ -356,6 +476,7 @@ class WorkflowService:
                     **node_result,
                 })
                 executed.add(node_id)
+                await progress("node_finished", node, error=node_result.get("error"))
 
                 # Enqueue children
                 for child_id in adjacency.get(node_id, []):
@@ -368,7 +489,13 @@ class WorkflowService:
                     if parents_done and child_id not in executed:
                         queue.append(child_id)
 
-            run.status = RunStatus.COMPLETED
+            if supervised and not cancelled and await WorkflowService._cancel_requested(run.id, session):
+                # A cancel that landed during the last node wins over its outcome
+                cancelled = True
+            if not cancelled:
+                run.status = RunStatus.COMPLETED
+        except asyncio.CancelledError:
+            cancelled = True
         except Exception as e:
             run.status = RunStatus.FAILED
             run.error = str(e)[:2000]
@@ -378,8 +505,12 @@ class WorkflowService:
                 error=str(e),
             )
 
+        if cancelled:
+            run.status = RunStatus.FAILED
+            run.error = run_supervisor.CANCELLED_ERROR
+
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
-        run.results_json = json.dumps(results, ensure_ascii=False)
+        run.results_json = await blob_store.dump_json(results)
         run.completed_at = datetime.now(UTC)
         run.duration_ms = elapsed_ms
         run.current_node = len(executed)
@@ -392,6 +523,7 @@ class WorkflowService:
 
         await session.commit()
         await session.refresh(run)
+        await progress("finished", error=run.error)
 
         logger.info(
             "workflow_execution_finished",
@@ -408,7 +540,19 @@ class WorkflowService:
         previous_output: str,
         user_id: UUID,
     ) -> dict:
-        """Execute a single workflow node."""
+        """Execute a single workflow node through the shared action runtime."""
+        return await action_runtime.run(
+            "workflows", node.get("action", "generate"),
+            WorkflowService._dispatch_node, node, previous_output, user_id,
+        )
+
+    @staticmethod
+    async def _dispatch_node(
+        node: dict,
+        previous_output: str,
+        user_id: UUID,
+    ) -> dict:
+        """Route a workflow node to its handler."""
         action = node.get("action", "generate")
         config = node.get("config", {})
 
@@ -519,10 +663,11 @@ class WorkflowService:
         if not text:
             return {"output": "", "error": "No input text", "action": "summarize"}
         try:
-            from app.ai_assistant.service import AIAssistantService
+            from app.ai_assistant.long_text import map_reduce
             max_len = config.get("max_length", 500)
-            result = await AIAssistantService.process_text_with_provider(
-                text=f"Summarize in {max_len} words or less:\n\n{text[:10000]}",
+            result = await map_reduce(
+                text,
+                f"Summarize in {max_len} words or less:",
                 task="summarize",
                 provider_name=config.get("provider", "gemini"),
                 user_id=user_id,
@@ -590,7 +735,9 @@ class WorkflowService:
             return {"output": "", "error": "No valid URL", "action": "crawl"}
         try:
             from app.modules.web_crawler.service import WebCrawlerService
-            result = await WebCrawlerService.scrape(url=url, extract_images=True)
+            result = await WebCrawlerService.scrape(
+                url=url, extract_images=True, max_age=settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS,
+            )
             if result.get("success"):
                 return {
                     "output": result.get("markdown", "")[:10000],
@@ -669,6 +816,7 @@ class WorkflowService:
                 use_fit_markdown=config.get("use_fit_markdown", True),
                 headers=config.get("headers"),
                 follow_redirects=config.get("follow_redirects", True),
+                max_age=config.get("max_age", settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS),
             )
             if result.get("success"):
                 return {
@@ -1149,11 +1297,12 @@ class WorkflowService:
             from app.database import get_session_context
             async with get_session_context() as mp_session:
                 svc = MarketplaceService(mp_session)
-                listings, total = await svc.list_listings(
+                page = await svc.list_listings(
                     search=query[:200],
                     category=config.get("category"),
                     limit=config.get("limit", 5),
                 )
+                listings, total = page.items, page.total
             if listings:
                 output = f"Found {total} result(s):\n" + "\n".join(
                     f"- {l.title} ({l.type}/{l.category}) v{l.version}" for l in listings
@@ -1407,18 +1556,22 @@ class WorkflowService:
         user_id: UUID,
         session: AsyncSession,
         limit: int = 20,
-    ) -> list[WorkflowRun]:
-        """List runs for a workflow."""
-        result = await session.execute(
-            select(WorkflowRun)
-            .where(
+        cursor: Optional[str] = None,
+        include_results: bool = True,
+    ) -> Page[WorkflowRun]:
+        """List runs for a workflow, newest first (``results_json`` is deferred unless ``include_results``)."""
+        return await pagination.paginate(
+            session,
+            select(WorkflowRun).where(
                 WorkflowRun.workflow_id == workflow_id,
                 WorkflowRun.user_id == user_id,
-            )
-            .order_by(WorkflowRun.created_at.desc())
-            .limit(limit)
+            ),
+            order_by=(WorkflowRun.created_at, WorkflowRun.id),
+            limit=limit,
+            cursor=cursor,
+            count="none",
+            options=() if include_results else (defer(WorkflowRun.results_json),),
         )
-        return list(result.scalars().all())
 
     @staticmethod
     async def get_run(
@@ -20,6 +20,7 @@ from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.optional_deps import optional
 from app.models.audio_studio import AudioFile, AudioFileStatus, PodcastEpisode
 
 logger = structlog.get_logger()
@@ -28,22 +29,15 @@ logger = structlog.get_logger()
 # Optional dependency detection (auto-detect + fallback pattern)
 # ---------------------------------------------------------------------------
 
-HAS_PYDUB = False
-try:
-    from pydub import AudioSegment
-    from pydub.silence import detect_silence
-    HAS_PYDUB = True
-    logger.info("audio_studio_pydub_available")
-except ImportError:
+# Probed with find_spec at import; the packages are imported on first use.
+_pydub = optional("pydub")
+_pydub_silence = optional("pydub.silence")
+HAS_PYDUB = _pydub.available
+if not HAS_PYDUB:
     logger.warning("audio_studio_pydub_unavailable", fallback="metadata_mock")
 
-HAS_NOISEREDUCE = False
-try:
-    import noisereduce  # noqa: F401
-    import numpy as np  # noqa: F401
-    HAS_NOISEREDUCE = True
-    logger.info("audio_studio_noisereduce_available")
-except ImportError:
+HAS_NOISEREDUCE = optional("noisereduce", "numpy").available
+if not HAS_NOISEREDUCE:
     logger.warning("audio_studio_noisereduce_unavailable", fallback="skip_noise_reduction")
 
 # Base upload directory
@@ -87,7 +81,7 @@ class AudioStudioService:
 
         if HAS_PYDUB:
             try:
-                seg = await asyncio.to_thread(AudioSegment.from_file, str(file_path))
+                seg = await asyncio.to_thread(_pydub.load().AudioSegment.from_file, str(file_path))
                 duration = len(seg) / 1000.0
                 sample_rate = seg.frame_rate
                 channels = seg.channels
@@ -188,7 +182,7 @@ class AudioStudioService:
         await self.session.commit()
 
         try:
-            seg = await asyncio.to_thread(AudioSegment.from_file, record.file_path)
+            seg = await asyncio.to_thread(_pydub.load().AudioSegment.from_file, record.file_path)
 
             for op in operations:
                 op_type = op.get("type", "")
@@ -285,7 +279,7 @@ class AudioStudioService:
             for merge_id in audio_ids:
                 merge_record = await self.get_audio(user_id, UUID(str(merge_id)))
                 if merge_record and os.path.exists(merge_record.file_path):
-                    other = await asyncio.to_thread(AudioSegment.from_file, merge_record.file_path)
+                    other = await asyncio.to_thread(_pydub.load().AudioSegment.from_file, merge_record.file_path)
                     seg = seg + other
             return seg
 
@@ -472,7 +466,7 @@ class AudioStudioService:
 
         if HAS_PYDUB:
             try:
-                seg = await asyncio.to_thread(AudioSegment.from_file, record.file_path)
+                seg = await asyncio.to_thread(_pydub.load().AudioSegment.from_file, record.file_path)
                 samples = seg.get_array_of_samples()
                 total = len(samples)
                 chunk_size = max(1, total // points)
@@ -519,9 +513,9 @@ class AudioStudioService:
         if not HAS_PYDUB:
             raise RuntimeError("pydub is required for silence detection but is not installed")
 
-        seg = await asyncio.to_thread(AudioSegment.from_file, record.file_path)
+        seg = await asyncio.to_thread(_pydub.load().AudioSegment.from_file, record.file_path)
         silences = await asyncio.to_thread(
-            detect_silence, seg, min_silence_len=min_silence_ms, silence_thresh=silence_thresh_db
+            _pydub_silence.load().detect_silence, seg, min_silence_len=min_silence_ms, silence_thresh=silence_thresh_db
         )
 
         segments = []
@@ -578,7 +572,7 @@ class AudioStudioService:
         if not HAS_PYDUB:
             raise RuntimeError("pydub is required for audio export but is not installed")
 
-        seg = await asyncio.to_thread(AudioSegment.from_file, record.file_path)
+        seg = await asyncio.to_thread(_pydub.load().AudioSegment.from_file, record.file_path)
 
         export_filename = f"{Path(record.filename).stem}.{target_format}"
         export_path = Path(record.file_path).parent / export_filename
@@ -0,0 +1,363 @@
+"""
+Redis-backed quota counters for BillingService.
+
+Each (user, billing period) pair owns one Redis hash holding the current
+usage per resource (``used:<column>``) and the part of that usage not yet
+written to Postgres (``pending:<column>``).  Increments run as a single Lua
+script so the limit check and the increment are atomic across workers.
+
+Pending deltas are flushed to ``user_quotas`` in bulk by
+``reconcile_pending`` (Celery beat + application shutdown).  The hash also
+keeps the usage it was seeded with (``base:<column>``) so ``roll_over`` can
+tell the new period's usage apart when a quota is reset.  Every public
+function returns ``None`` when Redis is unavailable so callers can fall back
+to the direct database path.
+"""
+
+import time
+from datetime import UTC, date, datetime, time as dt_time, timedelta
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import bindparam, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.billing import Plan, UserQuota
+
+logger = structlog.get_logger()
+
+# resource_type -> UserQuota column
+RESOURCE_COLUMNS: dict[str, str] = {
+    "transcription": "transcriptions_used",
+    "audio_minutes": "audio_minutes_used",
+    "ai_call": "ai_calls_used",
+}
+
+# UserQuota column -> Plan limit column
+LIMIT_COLUMNS: dict[str, str] = {
+    "transcriptions_used": "max_transcriptions_month",
+    "audio_minutes_used": "max_audio_minutes_month",
+    "ai_calls_used": "max_ai_calls_month",
+}
+
+_KEY_PREFIX = "saas_ia:quota"
+_DIRTY_SET = f"{_KEY_PREFIX}:dirty"
+
+# Counters outlive the period by a grace window so late reconciles still see them
+_EXPIRY_GRACE = timedelta(days=2)
+
+_PLAN_LIMITS_TTL = 300.0
+_plan_limits: dict[UUID, tuple[float, dict[str, int]]] = {}
+
+# KEYS[1] = counter hash, KEYS[2] = dirty set
+# ARGV[1] = column, ARGV[2] = amount, ARGV[3] = limit (-1 = no enforcement)
+# Returns -2 when the hash is not seeded, -1 when the limit would be exceeded,
+# otherwise the new usage value.
+_INCR_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -2
+end
+local used = tonumber(redis.call('HGET', KEYS[1], 'used:' .. ARGV[1]) or '0')
+local amount = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+if limit >= 0 and used + amount > limit then
+    return -1
+end
+redis.call('HINCRBY', KEYS[1], 'used:' .. ARGV[1], amount)
+redis.call('HINCRBY', KEYS[1], 'pending:' .. ARGV[1], amount)
+redis.call('SADD', KEYS[2], KEYS[1])
+return used + amount
+"""
+
+# KEYS[1] = counter hash; ARGV[1] = expire-at (unix seconds); ARGV[2..] = field/value pairs
+_SEED_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIREAT', KEYS[1], tonumber(ARGV[1]))
+return 1
+"""
+
+# KEYS[1] = counter hash, KEYS[2] = dirty set; ARGV[1] = '1' to delete the hash afterwards
+# Atomically takes the pending deltas and returns {quota_id, col1, delta1, ...}.
+_DRAIN_SCRIPT = """
+redis.call('SREM', KEYS[2], KEYS[1])
+local quota_id = redis.call('HGET', KEYS[1], 'quota_id')
+if not quota_id then
+    return {}
+end
+local out = {quota_id}
+local fields = redis.call('HKEYS', KEYS[1])
+for _, field in ipairs(fields) do
+    if string.sub(field, 1, 8) == 'pending:' then
+        local delta = tonumber(redis.call('HGET', KEYS[1], field) or '0')
+        if delta ~= 0 then
+            redis.call('HINCRBY', KEYS[1], field, -delta)
+            table.insert(out, string.sub(field, 9))
+            table.insert(out, delta)
+        end
+    end
+end
+if ARGV[1] == '1' then
+    redis.call('DEL', KEYS[1])
+end
+return out
+"""
+
+
+async def _client():
+    from app import cache
+
+    return await cache._get_redis()
+
+
+def _key(user_id: UUID, today: Optional[date] = None) -> str:
+    period = (today or date.today()).strftime("%Y-%m")
+    return f"{_KEY_PREFIX}:{user_id}:{period}"
+
+
+def plan_limit(plan: Plan, column: str) -> int:
+    """Return the plan limit for a UserQuota usage column."""
+    return getattr(plan, LIMIT_COLUMNS[column])
+
+
+async def get_plan_limits(plan_id: UUID, session: AsyncSession) -> Optional[dict[str, int]]:
+    """Return ``{usage_column: limit}`` for a plan, cached in-process."""
+    cached = _plan_limits.get(plan_id)
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    plan = await session.get(Plan, plan_id)
+    if plan is None:
+        return None
+    limits = {column: plan_limit(plan, column) for column in LIMIT_COLUMNS}
+    _plan_limits[plan_id] = (now + _PLAN_LIMITS_TTL, limits)
+    return limits
+
+
+def invalidate_plan_limits(plan_id: Optional[UUID] = None) -> None:
+    """Drop cached plan limits (one plan, or all when ``plan_id`` is None)."""
+    if plan_id is None:
+        _plan_limits.clear()
+    else:
+        _plan_limits.pop(plan_id, None)
+
+
+async def seed(user_id: UUID, quota: UserQuota) -> bool:
+    """Initialise the counter hash from a database quota row.
+
+    Uses HSETNX so a concurrent seed never overwrites counters another
+    worker has already started incrementing.
+    """
+    client = await _client()
+    if client is None:
+        return False
+
+    expire_at = datetime.combine(quota.period_end, dt_time.max) + _EXPIRY_GRACE
+    args: list = [int(expire_at.timestamp()), "quota_id", str(quota.id), "plan_id", str(quota.plan_id)]
+    for column in RESOURCE_COLUMNS.values():
+        used = int(getattr(quota, column) or 0)
+        args.extend([f"used:{column}", used, f"base:{column}", used, f"pending:{column}", 0])
+
+    try:
+        await client.eval(_SEED_SCRIPT, 1, _key(user_id), *args)
+        return True
+    except Exception as e:
+        logger.warning("quota_counter_seed_failed", user_id=str(user_id), error=str(e))
+        return False
+
+
+async def increment(
+    user_id: UUID,
+    column: str,
+    amount: int,
+    limit: int = -1,
+) -> Optional[int]:
+    """Atomically check ``limit`` and add ``amount`` to a usage counter.
+
+    Returns the new usage, ``-1`` if the limit would be exceeded, ``-2`` if
+    the counters for the current period are not seeded yet, or ``None`` if
+    Redis is unavailable.
+    """
+    client = await _client()
+    if client is None:
+        return None
+    try:
+        result = await client.eval(_INCR_SCRIPT, 2, _key(user_id), _DIRTY_SET, column, amount, limit)
+        return int(result)
+    except Exception as e:
+        logger.warning("quota_counter_incr_failed", user_id=str(user_id), error=str(e))
+        return None
+
+
+async def get_usage(user_id: UUID) -> Optional[dict]:
+    """Return the live counter hash for the current period, or None on miss."""
+    client = await _client()
+    if client is None:
+        return None
+    try:
+        raw = await client.hgetall(_key(user_id))
+    except Exception as e:
+        logger.warning("quota_counter_read_failed", user_id=str(user_id), error=str(e))
+        return None
+    if not raw:
+        return None
+    usage: dict = {"quota_id": raw.get("quota_id"), "plan_id": raw.get("plan_id")}
+    for column in RESOURCE_COLUMNS.values():
+        usage[column] = int(raw.get(f"used:{column}", 0))
+    return usage
+
+
+async def _apply_deltas(rows: list[dict], session: AsyncSession) -> None:
+    """Write drained deltas to Postgres, one executemany UPDATE per column."""
+    by_column: dict[str, list[dict]] = {}
+    for row in rows:
+        for column, delta in row["deltas"].items():
+            by_column.setdefault(column, []).append({"b_id": row["quota_id"], "b_delta": delta})
+
+    table = UserQuota.__table__
+    for column, params in by_column.items():
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({column: table.c[column] + bindparam("b_delta"), "updated_at": datetime.now(UTC).replace(tzinfo=None)})
+        )
+        await session.execute(stmt, params)
+    await session.commit()
+
+
+async def _drain(client, key: str, delete: bool) -> Optional[dict]:
+    raw = await client.eval(_DRAIN_SCRIPT, 2, key, _DIRTY_SET, "1" if delete else "0")
+    if not raw:
+        return None
+    deltas = {raw[i]: int(raw[i + 1]) for i in range(1, len(raw), 2) if raw[i] in LIMIT_COLUMNS}
+    if not deltas:
+        return None
+    return {"key": key, "quota_id": UUID(raw[0]), "deltas": deltas}
+
+
+async def _restore(client, rows: list[dict]) -> None:
+    """Put deltas back after a failed database write so they are retried."""
+    for row in rows:
+        try:
+            pipe = client.pipeline()
+            for column, delta in row["deltas"].items():
+                pipe.hincrby(row["key"], f"pending:{column}", delta)
+            pipe.sadd(_DIRTY_SET, row["key"])
+            await pipe.execute()
+        except Exception as e:
+            logger.error("quota_counter_restore_failed", key=row["key"], error=str(e))
+
+
+async def reconcile_pending(session: AsyncSession, batch_size: int = 500) -> int:
+    """Flush pending Redis deltas to ``user_quotas`` in bulk.
+
+    Returns the number of quota rows updated.
+    """
+    client = await _client()
+    if client is None:
+        return 0
+
+    total = 0
+    while True:
+        try:
+            keys = await client.spop(_DIRTY_SET, batch_size)
+        except Exception as e:
+            logger.warning("quota_reconcile_unavailable", error=str(e))
+            return total
+        if not keys:
+            return total
+
+        rows = []
+        for key in keys:
+            row = await _drain(client, key, delete=False)
+            if row is not None:
+                rows.append(row)
+        if not rows:
+            continue
+
+        try:
+            await _apply_deltas(rows, session)
+        except Exception as e:
+            await session.rollback()
+            await _restore(client, rows)
+            logger.error("quota_reconcile_failed", rows=len(rows), error=str(e))
+            return total
+
+        total += len(rows)
+        logger.info("quota_counters_reconciled", rows=len(rows))
+
+
+async def evict(user_id: UUID, session: AsyncSession) -> None:
+    """Flush and drop a user's counters, e.g. after a plan change."""
+    client = await _client()
+    if client is None:
+        return
+    key = _key(user_id)
+    try:
+        row = await _drain(client, key, delete=True)
+    except Exception as e:
+        logger.warning("quota_counter_evict_failed", user_id=str(user_id), error=str(e))
+        return
+    if row is None:
+        return
+    try:
+        await _apply_deltas([row], session)
+    except Exception:
+        await session.rollback()
+        logger.error("quota_counter_evict_lost", user_id=str(user_id), deltas=row["deltas"])
+        raise
+
+
+async def roll_over(user_ids: list[UUID], session: AsyncSession, today: Optional[date] = None) -> None:
+    """Drop the counters of quotas that were just reset to a new period.
+
+    The previous period's hash goes with its pending deltas: the reset
+    zeroed that usage, so flushing them later would count them in the new
+    period.  A current period hash was seeded from the old row before the
+    reset; what was counted on top of its seed (flushed or not) is written
+    to the reset row and the hash is dropped, so it is seeded again.
+    """
+    client = await _client()
+    if client is None or not user_ids:
+        return
+
+    today = today or date.today()
+    previous = today.replace(day=1) - timedelta(days=1)
+    rows = []
+    for user_id in user_ids:
+        key = _key(user_id, today)
+        try:
+            pipe = client.pipeline()
+            pipe.delete(_key(user_id, previous))
+            pipe.hgetall(key)
+            pipe.delete(key)
+            _, raw, _ = await pipe.execute()
+        except Exception as e:
+            logger.warning("quota_counter_roll_over_failed", user_id=str(user_id), error=str(e))
+            continue
+        if not raw or not raw.get("quota_id"):
+            continue
+
+        deltas = {}
+        for column in RESOURCE_COLUMNS.values():
+            base = raw.get(f"base:{column}")
+            if base is None:  # seeded before base:<column> existed
+                delta = int(raw.get(f"pending:{column}", 0))
+            else:
+                delta = int(raw.get(f"used:{column}", 0)) - int(base)
+            if delta > 0:
+                deltas[column] = delta
+        if deltas:
+            rows.append({"key": key, "quota_id": UUID(raw["quota_id"]), "deltas": deltas})
+
+    if not rows:
+        return
+    try:
+        await _apply_deltas(rows, session)
+    except Exception:
+        await session.rollback()
+        logger.error("quota_counter_roll_over_lost", rows=[(str(r["quota_id"]), r["deltas"]) for r in rows])
+        raise
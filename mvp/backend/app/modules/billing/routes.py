@@ -10,6 +10,7 @@ from app.modules.auth_guards.middleware import require_verified_email
 from app.database import get_session
 from app.models.user import User
 from app.modules.billing.schemas import CheckoutRequest, CheckoutResponse, PlanRead, PortalResponse, QuotaRead
+from app.modules.billing import quota_counters
 from app.modules.billing.service import BillingService
 from app.modules.billing.stripe_service import StripeService
 from app.cache import cache_get, cache_set, cache_delete
@@ -63,23 +64,30 @@ async def get_my_quota(
 
     quota, plan = await BillingService.get_user_quota(current_user.id, session)
 
+    # Prefer live Redis counters: the row only catches up on the next reconcile
+    live = await quota_counters.get_usage(current_user.id)
+    used = {
+        column: live[column] if live and live.get("quota_id") == str(quota.id) else getattr(quota, column)
+        for column in quota_counters.LIMIT_COLUMNS
+    }
+
     # Calculate max usage across all resource types as overall percent
     pcts = []
     if plan.max_transcriptions_month > 0:
-        pcts.append(quota.transcriptions_used / plan.max_transcriptions_month)
+        pcts.append(used["transcriptions_used"] / plan.max_transcriptions_month)
     if plan.max_audio_minutes_month > 0:
-        pcts.append(quota.audio_minutes_used / plan.max_audio_minutes_month)
+        pcts.append(used["audio_minutes_used"] / plan.max_audio_minutes_month)
     if plan.max_ai_calls_month > 0:
-        pcts.append(quota.ai_calls_used / plan.max_ai_calls_month)
+        pcts.append(used["ai_calls_used"] / plan.max_ai_calls_month)
     usage_percent = round(max(pcts) * 100, 1) if pcts else 0.0
 
     result = QuotaRead(
         plan=PlanRead.model_validate(plan),
-        transcriptions_used=quota.transcriptions_used,
+        transcriptions_used=used["transcriptions_used"],
         transcriptions_limit=plan.max_transcriptions_month,
-        audio_minutes_used=quota.audio_minutes_used,
+        audio_minutes_used=used["audio_minutes_used"],
         audio_minutes_limit=plan.max_audio_minutes_month,
-        ai_calls_used=quota.ai_calls_used,
+        ai_calls_used=used["ai_calls_used"],
         ai_calls_limit=plan.max_ai_calls_month,
         period_start=quota.period_start,
         period_end=quota.period_end,
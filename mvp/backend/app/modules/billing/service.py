@@ -13,6 +13,7 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.billing import Plan, PlanName, UserQuota
+from app.modules.billing import quota_counters
 
 logger = structlog.get_logger()
 
@@ -125,19 +126,26 @@ class BillingService:
 
         resource_type: "transcription", "audio_minutes", or "ai_call"
         Returns True if quota is available, False if exceeded.
-        """
-        quota, plan = await BillingService.get_user_quota(user_id, session)
 
-        if resource_type == "transcription":
-            return quota.transcriptions_used < plan.max_transcriptions_month
-        elif resource_type == "audio_minutes":
-            return quota.audio_minutes_used < plan.max_audio_minutes_month
-        elif resource_type == "ai_call":
-            return quota.ai_calls_used < plan.max_ai_calls_month
-        else:
+        Reads the Redis counters when they are seeded (no database query
+        beyond a cached plan lookup); otherwise falls back to the quota row
+        and seeds the counters for the next call.
+        """
+        column_name = quota_counters.RESOURCE_COLUMNS.get(resource_type)
+        if column_name is None:
             logger.warning("unknown_resource_type", resource_type=resource_type)
             return True
 
+        usage = await quota_counters.get_usage(user_id)
+        if usage is not None and usage.get("plan_id"):
+            limits = await quota_counters.get_plan_limits(UUID(usage["plan_id"]), session)
+            if limits is not None:
+                return usage[column_name] < limits[column_name]
+
+        quota, plan = await BillingService.get_user_quota(user_id, session)
+        await quota_counters.seed(user_id, quota)
+        return getattr(quota, column_name) < quota_counters.plan_limit(plan, column_name)
+
     @staticmethod
     async def consume_quota(
         user_id: UUID,
@@ -149,26 +157,25 @@ class BillingService:
         Increment usage for a given resource type.
 
         resource_type: "transcription", "audio_minutes", or "ai_call"
+
+        The increment goes to the Redis counters and is written to Postgres
+        by the periodic reconcile; when Redis is unavailable the quota row
+        is updated directly.
         """
-        quota, _ = await BillingService.get_user_quota(user_id, session)
-
-        column_map = {
-            "transcription": "transcriptions_used",
-            "audio_minutes": "audio_minutes_used",
-            "ai_call": "ai_calls_used",
-        }
-        column_name = column_map.get(resource_type)
+        column_name = quota_counters.RESOURCE_COLUMNS.get(resource_type)
         if column_name is None:
             logger.warning("unknown_resource_type", resource_type=resource_type)
             return
 
-        column = getattr(UserQuota, column_name)
-        await session.execute(
-            update(UserQuota)
-            .where(UserQuota.id == quota.id)
-            .values(**{column_name: column + amount, "updated_at": datetime.now(UTC)})
-        )
-        await session.commit()
+        quota = None
+        used = await quota_counters.increment(user_id, column_name, amount)
+        if used == -2:
+            quota, _ = await BillingService.get_user_quota(user_id, session)
+            if await quota_counters.seed(user_id, quota):
+                used = await quota_counters.increment(user_id, column_name, amount)
+
+        if used is None or used < 0:
+            await BillingService._consume_quota_db(user_id, column_name, amount, session, quota=quota)
 
         logger.info(
             "quota_consumed",
@@ -177,35 +184,105 @@ class BillingService:
             amount=amount,
         )
 
+    @staticmethod
+    async def try_consume_quota(
+        user_id: UUID,
+        resource_type: str,
+        amount: int,
+        session: AsyncSession,
+    ) -> bool:
+        """
+        Atomically check the plan limit and consume ``amount`` if it fits.
+
+        Returns False (and consumes nothing) when the increment would exceed
+        the plan limit.  Without Redis the check and the UPDATE are separate
+        statements and therefore not atomic across workers.
+        """
+        column_name = quota_counters.RESOURCE_COLUMNS.get(resource_type)
+        if column_name is None:
+            logger.warning("unknown_resource_type", resource_type=resource_type)
+            return True
+
+        limit = None
+        usage = await quota_counters.get_usage(user_id)
+        if usage is not None and usage.get("plan_id"):
+            limits = await quota_counters.get_plan_limits(UUID(usage["plan_id"]), session)
+            if limits is not None:
+                limit = limits[column_name]
+        if limit is None:
+            quota, plan = await BillingService.get_user_quota(user_id, session)
+            await quota_counters.seed(user_id, quota)
+            limit = quota_counters.plan_limit(plan, column_name)
+
+        used = await quota_counters.increment(user_id, column_name, amount, limit)
+        if used == -1:
+            logger.info("quota_exceeded", user_id=str(user_id), resource=resource_type)
+            return False
+        if used is None or used < 0:
+            quota, _ = await BillingService.get_user_quota(user_id, session)
+            if getattr(quota, column_name) + amount > limit:
+                return False
+            await BillingService._consume_quota_db(user_id, column_name, amount, session, quota=quota)
+        return True
+
+    @staticmethod
+    async def _consume_quota_db(
+        user_id: UUID,
+        column_name: str,
+        amount: int,
+        session: AsyncSession,
+        quota: Optional[UserQuota] = None,
+    ) -> None:
+        """Increment a usage column directly on the quota row."""
+        if quota is None:
+            quota, _ = await BillingService.get_user_quota(user_id, session)
+
+        column = getattr(UserQuota, column_name)
+        await session.execute(
+            update(UserQuota)
+            .where(UserQuota.id == quota.id)
+            .values(**{column_name: column + amount, "updated_at": datetime.now(UTC)})
+        )
+        await session.commit()
+
     @staticmethod
     async def reset_monthly_quotas(session: AsyncSession) -> int:
         """
         Reset quotas for all users whose billing period has ended.
 
-        Returns the number of quotas reset.
+        Runs as a single set-based UPDATE, then drops the Redis counters of
+        the reset quotas (see ``quota_counters.roll_over``).  Returns the
+        number of quotas reset.
         """
         today = date.today()
+        period_start = today.replace(day=1)
+        period_end = (period_start + relativedelta(months=1)) - relativedelta(days=1)
+
         result = await session.execute(
-            select(UserQuota).where(UserQuota.period_end < today)
+            update(UserQuota)
+            .where(UserQuota.period_end < today)
+            .values(
+                transcriptions_used=0,
+                audio_minutes_used=0,
+                ai_calls_used=0,
+                period_start=period_start,
+                period_end=period_end,
+                updated_at=datetime.now(UTC),
+            )
+            .returning(UserQuota.user_id)
+            .execution_options(synchronize_session=False)
         )
-        expired_quotas = list(result.scalars().all())
-
-        count = 0
-        for quota in expired_quotas:
-            period_start = today.replace(day=1)
-            period_end = (period_start + relativedelta(months=1)) - relativedelta(days=1)
-
-            quota.transcriptions_used = 0
-            quota.audio_minutes_used = 0
-            quota.ai_calls_used = 0
-            quota.period_start = period_start
-            quota.period_end = period_end
-            quota.updated_at = datetime.now(UTC)
-            session.add(quota)
-            count += 1
+        count = result.rowcount or 0
 
         if count > 0:
+            user_ids = list(result.scalars().all())
             await session.commit()
             logger.info("monthly_quotas_reset", count=count)
+            await quota_counters.roll_over(user_ids, session, today)
 
         return count
+
+    @staticmethod
+    async def reconcile_quota_counters(session: AsyncSession) -> int:
+        """Flush pending Redis quota increments to Postgres in bulk."""
+        return await quota_counters.reconcile_pending(session)
@@ -13,6 +13,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
 from app.models.billing import Plan, PlanName, UserQuota
+from app.modules.billing import quota_counters
 from app.modules.billing.service import BillingService
 
 logger = structlog.get_logger()
@@ -208,6 +209,9 @@ class StripeService:
         session.add(quota)
         await session.commit()
 
+        # Counters cache the old plan id: flush and drop them so they reseed
+        await quota_counters.evict(quota.user_id, session)
+
         logger.info(
             "stripe_plan_upgraded",
             user_id=user_id,
@@ -245,6 +249,7 @@ class StripeService:
         quota.updated_at = datetime.now(UTC)
         session.add(quota)
         await session.commit()
+        await quota_counters.evict(quota.user_id, session)
 
         logger.info(
             "stripe_subscription_canceled",
@@ -23,6 +23,7 @@ from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.config import settings
 from app.models.content_studio import (
     ContentFormat,
     ContentProject,
@@ -607,7 +608,8 @@ Source content:
             from app.modules.web_crawler.service import WebCrawlerService
 
             result = await WebCrawlerService.scrape(
-                url=url, extract_images=False, max_images=0
+                url=url, extract_images=False, max_images=0,
+                max_age=settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS,
             )
             if result.get("success"):
                 return result.get("markdown", "")
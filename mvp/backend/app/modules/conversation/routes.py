@@ -11,13 +11,13 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy import func as sa_func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 import structlog
 
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
+from app.core.pagination import CountMode, InvalidCursor
 from app.database import get_session
 from app.models.user import User
 from app.modules.billing.service import BillingService
@@ -32,6 +32,7 @@ from app.modules.conversation.schemas import (
     MessageRead,
     PaginatedConversations,
 )
+from app.modules.conversation.service import ConversationService
 from app.ai_assistant.service import AIAssistantService
 from app.ai_assistant.classification.enums import SelectionStrategy
 from app.rate_limit import limiter
@@ -71,16 +72,6 @@ async def _get_conversation_or_404(
     return conversation
 
 
-async def _count_messages(conversation_id: UUID, session: AsyncSession) -> int:
-    """Return the number of messages in a conversation."""
-    result = await session.execute(
-        select(sa_func.count()).select_from(Message).where(
-            Message.conversation_id == conversation_id
-        )
-    )
-    return result.scalar_one()
-
-
 async def _fetch_messages(
     conversation_id: UUID,
     session: AsyncSession,
@@ -226,8 +217,10 @@ async def create_conversation(
 @limiter.limit("30/minute")
 async def list_conversations(
     request: Request,
-    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    skip: int = Query(0, ge=0, description="Number of items to skip (ignored with cursor)"),
     limit: int = Query(20, ge=1, le=100, description="Maximum items to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -236,46 +229,20 @@ async def list_conversations(
 
     Rate limit: 30 requests/minute
     """
-    # Total count
-    count_result = await session.execute(
-        select(sa_func.count()).select_from(Conversation).where(
-            Conversation.user_id == current_user.id
-        )
-    )
-    total = count_result.scalar_one()
-
-    # Fetch page
-    result = await session.execute(
-        select(Conversation)
-        .where(Conversation.user_id == current_user.id)
-        .order_by(Conversation.updated_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    conversations = list(result.scalars().all())
-
-    # Build response with message counts
-    items: list[ConversationRead] = []
-    for conv in conversations:
-        msg_count = await _count_messages(conv.id, session)
-        items.append(
-            ConversationRead(
-                id=conv.id,
-                user_id=conv.user_id,
-                title=conv.title,
-                transcription_id=conv.transcription_id,
-                message_count=msg_count,
-                created_at=conv.created_at,
-                updated_at=conv.updated_at,
-            )
+    try:
+        page = await ConversationService.list_conversations(
+            session, current_user.id, skip=skip, limit=limit, cursor=cursor, count=count,
         )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return PaginatedConversations(
-        items=items,
-        total=total,
-        skip=skip,
+        items=[ConversationRead(**item) for item in page.items],
+        total=page.total,
+        skip=0 if cursor else skip,
         limit=limit,
-        has_more=(skip + limit) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -452,12 +419,13 @@ async def send_message(
         collected_tokens: list[str] = []
 
         try:
-            is_first = True
             async for chunk in AIAssistantService.stream_text(
                 text=prompt,
                 task="improve_quality",
                 target_language="french",
                 strategy=SelectionStrategy.BALANCED,
+                hedge=True,
+                tenant_id=current_user.tenant_id,
             ):
                 # Check for client disconnect.
                 if await request.is_disconnected():
@@ -469,9 +437,9 @@ async def send_message(
                     )
                     break
 
-                if is_first and "provider" in chunk:
+                if "provider" in chunk:
+                    # First chunk, or a hedged backup provider taking over
                     provider_name = chunk["provider"]
-                    is_first = False
                     continue
 
                 if "token" in chunk:
@@ -80,7 +80,8 @@ class ConversationWithMessages(BaseModel):
 class PaginatedConversations(BaseModel):
     """Paginated list of conversations."""
     items: List[ConversationRead]
-    total: int = Field(..., description="Total number of conversations")
+    total: Optional[int] = Field(..., description="Total number of conversations (null with count=none)")
     skip: int = Field(..., description="Number of items skipped")
     limit: int = Field(..., description="Maximum items per page")
     has_more: bool = Field(..., description="More items available")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
@@ -11,6 +11,8 @@ from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import pagination
+from app.core.pagination import CountMode, Page
 from app.models.conversation import Conversation, Message
 from app.models.transcription import Transcription
 
@@ -202,38 +204,33 @@ class ConversationService:
         user_id: UUID,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[List[Dict], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+    ) -> Page[Dict]:
         """
-        List conversations for a user with pagination and message counts.
+        List conversations for a user, most recently updated first, with message counts.
 
         Args:
             session: Database session.
             user_id: Owner filter.
-            skip: Pagination offset.
+            skip: Pagination offset (ignored with ``cursor``).
             limit: Page size.
+            cursor: ``next_cursor`` of the previous page.
+            count: Total count mode (exact, estimate or none).
 
         Returns:
-            Tuple of (conversation list with message_count, total count).
+            Page of conversation dicts with message_count.
         """
-        # Total count
-        count_stmt = (
-            select(func.count())
-            .select_from(Conversation)
-            .where(Conversation.user_id == user_id)
+        page = await pagination.paginate(
+            session,
+            select(Conversation).where(Conversation.user_id == user_id),
+            order_by=(Conversation.updated_at, Conversation.id),
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            count=count,
         )
-        count_result = await session.execute(count_stmt)
-        total = count_result.scalar_one()
-
-        # Fetch conversations
-        stmt = (
-            select(Conversation)
-            .where(Conversation.user_id == user_id)
-            .order_by(Conversation.updated_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await session.execute(stmt)
-        conversations = result.scalars().all()
+        conversations = page.items
 
         # Fetch message counts in bulk
         if conversations:
@@ -251,9 +248,10 @@ class ConversationService:
         else:
             count_map = {}
 
-        items = [
+        page.items = [
             {
                 "id": conv.id,
+                "user_id": conv.user_id,
                 "title": conv.title,
                 "transcription_id": conv.transcription_id,
                 "message_count": count_map.get(conv.id, 0),
@@ -263,7 +261,7 @@ class ConversationService:
             for conv in conversations
         ]
 
-        return items, total
+        return page
 
     @staticmethod
     async def delete_conversation(
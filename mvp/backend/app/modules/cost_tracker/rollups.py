@@ -0,0 +1,271 @@
+"""
+AI usage rollups - compaction of ai_usage_logs into hourly/daily buckets.
+
+``compact`` folds raw logs older than the compaction lag into
+``ai_usage_hourly``, recomputes the affected ``ai_usage_daily`` buckets and
+advances the watermark stored in ``ai_usage_rollup_state``.  It is
+idempotent per hour window and runs from Celery beat.
+
+``usage_source`` returns a subquery with one normalized shape over
+daily buckets, hourly buckets and the raw tail after the watermark, so
+dashboards aggregate a few thousand rollup rows instead of scanning every
+raw log in the window.
+"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import Float, case, cast, delete, func, literal, select, text, union_all
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.models.cost_tracking import AIUsageLog
+from app.models.usage_rollup import AIUsageDaily, AIUsageHourly, AIUsageRollupState
+
+logger = structlog.get_logger()
+
+# Upper bound on how much raw history a single compaction run folds in
+_MAX_HOURS_PER_RUN = 24 * 7
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(ts: datetime) -> datetime:
+    floored = _floor_hour(ts)
+    return floored if floored == ts else floored + timedelta(hours=1)
+
+
+def _floor_day(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(ts: datetime) -> datetime:
+    floored = _floor_day(ts)
+    return floored if floored == ts else floored + timedelta(days=1)
+
+
+def to_naive_utc(ts: datetime) -> datetime:
+    """ai_usage_logs.created_at is a naive UTC timestamp."""
+    if ts.tzinfo is not None:
+        return ts.astimezone(UTC).replace(tzinfo=None)
+    return ts
+
+
+async def get_watermark(session: AsyncSession) -> Optional[datetime]:
+    """Return the compaction watermark, or None before the first compaction."""
+    state = await session.get(AIUsageRollupState, 1)
+    return state.rolled_until if state is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+_ROLLUP_HOURLY_SQL = text("""
+    INSERT INTO ai_usage_hourly (
+        id, bucket_start, user_id, provider, model, module,
+        calls, successes, input_tokens, output_tokens, total_tokens,
+        cost_cents, latency_ms_sum, latency_ms_min, latency_ms_max
+    )
+    SELECT gen_random_uuid(), date_trunc('hour', created_at), user_id, provider, model, module,
+           COUNT(*), COUNT(*) FILTER (WHERE success),
+           COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0),
+           COALESCE(SUM(total_tokens), 0), COALESCE(SUM(cost_cents), 0),
+           COALESCE(SUM(latency_ms), 0), COALESCE(MIN(latency_ms), 0), COALESCE(MAX(latency_ms), 0)
+    FROM ai_usage_logs
+    WHERE created_at >= :start AND created_at < :end
+    GROUP BY 2, user_id, provider, model, module
+    ON CONFLICT (bucket_start, user_id, provider, model, module) DO UPDATE SET
+        calls = EXCLUDED.calls,
+        successes = EXCLUDED.successes,
+        input_tokens = EXCLUDED.input_tokens,
+        output_tokens = EXCLUDED.output_tokens,
+        total_tokens = EXCLUDED.total_tokens,
+        cost_cents = EXCLUDED.cost_cents,
+        latency_ms_sum = EXCLUDED.latency_ms_sum,
+        latency_ms_min = EXCLUDED.latency_ms_min,
+        latency_ms_max = EXCLUDED.latency_ms_max
+""")
+
+_ROLLUP_DAILY_SQL = text("""
+    INSERT INTO ai_usage_daily (
+        id, bucket_start, user_id, provider, model, module,
+        calls, successes, input_tokens, output_tokens, total_tokens,
+        cost_cents, latency_ms_sum, latency_ms_min, latency_ms_max
+    )
+    SELECT gen_random_uuid(), date_trunc('day', bucket_start), user_id, provider, model, module,
+           SUM(calls), SUM(successes), SUM(input_tokens), SUM(output_tokens), SUM(total_tokens),
+           SUM(cost_cents), SUM(latency_ms_sum), MIN(latency_ms_min), MAX(latency_ms_max)
+    FROM ai_usage_hourly
+    WHERE bucket_start >= :start AND bucket_start < :end
+    GROUP BY 2, user_id, provider, model, module
+    ON CONFLICT (bucket_start, user_id, provider, model, module) DO UPDATE SET
+        calls = EXCLUDED.calls,
+        successes = EXCLUDED.successes,
+        input_tokens = EXCLUDED.input_tokens,
+        output_tokens = EXCLUDED.output_tokens,
+        total_tokens = EXCLUDED.total_tokens,
+        cost_cents = EXCLUDED.cost_cents,
+        latency_ms_sum = EXCLUDED.latency_ms_sum,
+        latency_ms_min = EXCLUDED.latency_ms_min,
+        latency_ms_max = EXCLUDED.latency_ms_max
+""")
+
+
+async def compact(session: AsyncSession, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Fold closed hours of raw usage into the rollup tables.
+
+    Only hours that ended at least ``USAGE_ROLLUP_LAG_SECONDS`` ago are
+    compacted so late writers still land in the raw tail.  Returns the new
+    watermark (or None when there is nothing to compact yet).
+    """
+    now = to_naive_utc(now or datetime.now(UTC))
+    target = _floor_hour(now - timedelta(seconds=settings.USAGE_ROLLUP_LAG_SECONDS))
+
+    state = await session.get(AIUsageRollupState, 1)
+    if state is None:
+        oldest = (await session.execute(select(func.min(AIUsageLog.created_at)))).scalar_one_or_none()
+        if oldest is None:
+            return None
+        start = _floor_hour(oldest)
+        state = AIUsageRollupState(id=1, rolled_until=start)
+        session.add(state)
+    else:
+        start = state.rolled_until
+
+    end = min(target, start + timedelta(hours=_MAX_HOURS_PER_RUN))
+    if end <= start:
+        return start
+
+    await session.execute(_ROLLUP_HOURLY_SQL, {"start": start, "end": end})
+    # Daily buckets are recomputed whole from their hourly rows
+    await session.execute(_ROLLUP_DAILY_SQL, {"start": _floor_day(start), "end": _ceil_day(end)})
+
+    state.rolled_until = end
+    state.updated_at = datetime.now(UTC).replace(tzinfo=None)
+    session.add(state)
+    await session.commit()
+
+    logger.info("ai_usage_compacted", start=start.isoformat(), end=end.isoformat())
+    return end
+
+
+async def prune_raw_logs(
+    session: AsyncSession,
+    retention_days: Optional[int] = None,
+    batch_size: int = 10_000,
+) -> int:
+    """Delete raw usage logs past retention that are already rolled up.
+
+    Deletes in bounded batches to keep lock time and WAL bursts small.
+    Returns the number of rows deleted.
+    """
+    retention_days = retention_days or settings.USAGE_LOG_RETENTION_DAYS
+    watermark = await get_watermark(session)
+    if watermark is None:
+        return 0
+    cutoff = min(watermark, to_naive_utc(datetime.now(UTC)) - timedelta(days=retention_days))
+
+    total = 0
+    while True:
+        ids = select(AIUsageLog.id).where(AIUsageLog.created_at < cutoff).limit(batch_size)
+        result = await session.execute(
+            delete(AIUsageLog)
+            .where(AIUsageLog.id.in_(ids.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        deleted = result.rowcount or 0
+        total += deleted
+        if deleted < batch_size:
+            break
+
+    if total:
+        logger.info("ai_usage_logs_pruned", deleted=total, cutoff=cutoff.isoformat())
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Read path
+# ---------------------------------------------------------------------------
+
+def _rollup_select(model, user_id: UUID, start: datetime, end: datetime):
+    return select(
+        model.bucket_start.label("bucket"),
+        model.provider.label("provider"),
+        model.model.label("model"),
+        model.module.label("module"),
+        model.calls.label("calls"),
+        model.successes.label("successes"),
+        model.input_tokens.label("input_tokens"),
+        model.output_tokens.label("output_tokens"),
+        model.total_tokens.label("total_tokens"),
+        model.cost_cents.label("cost_cents"),
+        model.latency_ms_sum.label("latency_ms_sum"),
+        model.latency_ms_min.label("latency_ms_min"),
+        model.latency_ms_max.label("latency_ms_max"),
+    ).where(model.user_id == user_id, model.bucket_start >= start, model.bucket_start < end)
+
+
+def _raw_select(user_id: UUID, start: datetime, end: Optional[datetime] = None):
+    query = select(
+        AIUsageLog.created_at.label("bucket"),
+        AIUsageLog.provider.label("provider"),
+        AIUsageLog.model.label("model"),
+        AIUsageLog.module.label("module"),
+        literal(1).label("calls"),
+        case((AIUsageLog.success, 1), else_=0).label("successes"),
+        AIUsageLog.input_tokens.label("input_tokens"),
+        AIUsageLog.output_tokens.label("output_tokens"),
+        AIUsageLog.total_tokens.label("total_tokens"),
+        AIUsageLog.cost_cents.label("cost_cents"),
+        AIUsageLog.latency_ms.label("latency_ms_sum"),
+        AIUsageLog.latency_ms.label("latency_ms_min"),
+        AIUsageLog.latency_ms.label("latency_ms_max"),
+    ).where(AIUsageLog.user_id == user_id, AIUsageLog.created_at >= start)
+    if end is not None:
+        query = query.where(AIUsageLog.created_at < end)
+    return query
+
+
+def usage_source(user_id: UUID, since: datetime, watermark: Optional[datetime]):
+    """Build a subquery covering [since, now) from rollups plus the raw tail.
+
+    Columns: bucket, provider, model, module, calls, successes,
+    input_tokens, output_tokens, total_tokens, cost_cents,
+    latency_ms_sum, latency_ms_min, latency_ms_max.
+    """
+    since = to_naive_utc(since)
+    if watermark is None or since >= watermark:
+        return _raw_select(user_id, since).subquery("usage")
+
+    parts = []
+    hour_start = _ceil_hour(since)
+    if hour_start > since:
+        parts.append(_raw_select(user_id, since, hour_start))
+
+    day_start = _ceil_day(hour_start)
+    day_end = _floor_day(watermark)
+    if day_start < day_end:
+        if hour_start < day_start:
+            parts.append(_rollup_select(AIUsageHourly, user_id, hour_start, day_start))
+        parts.append(_rollup_select(AIUsageDaily, user_id, day_start, day_end))
+        if day_end < watermark:
+            parts.append(_rollup_select(AIUsageHourly, user_id, day_end, watermark))
+    elif hour_start < watermark:
+        parts.append(_rollup_select(AIUsageHourly, user_id, hour_start, watermark))
+
+    parts.append(_raw_select(user_id, watermark))
+    return union_all(*parts).subquery("usage")
+
+
+def avg_latency(source):
+    """Call-weighted average latency over a usage_source subquery."""
+    return func.coalesce(
+        cast(func.sum(source.c.latency_ms_sum), Float) / cast(func.nullif(func.sum(source.c.calls), 0), Float),
+        0,
+    )
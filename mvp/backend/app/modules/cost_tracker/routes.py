@@ -66,43 +66,70 @@ async def get_cost_alerts(
 async def export_costs_csv(
     request: Request,
     days: int = Query(default=30, ge=1, le=365),
+    granularity: str = Query(
+        default="day",
+        pattern="^(raw|hour|day)$",
+        description="day/hour: aggregated rows from rollups; raw: one row per call (retention-limited)",
+    ),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """
-    Export AI usage logs as a CSV file.
+    Export AI usage as a CSV file.
 
     Rate limit: 5 requests/minute
     """
-    logs = await CostTrackerService.get_usage_logs(current_user.id, days, session)
-
     output = io.StringIO()
     writer = csv.writer(output)
-    writer.writerow([
-        "Date", "Provider", "Model", "Module", "Action",
-        "Input Tokens", "Output Tokens", "Total Tokens",
-        "Cost (cents)", "Latency (ms)", "Status",
-    ])
-    for log in logs:
+
+    if granularity == "raw":
+        logs = await CostTrackerService.get_usage_logs(current_user.id, days, session)
+        writer.writerow([
+            "Date", "Provider", "Model", "Module", "Action",
+            "Input Tokens", "Output Tokens", "Total Tokens",
+            "Cost (cents)", "Latency (ms)", "Status",
+        ])
+        for log in logs:
+            writer.writerow([
+                log.created_at.isoformat(),
+                log.provider,
+                log.model,
+                log.module,
+                log.action,
+                log.input_tokens,
+                log.output_tokens,
+                log.total_tokens,
+                log.cost_cents,
+                log.latency_ms,
+                "success" if log.success else "failed",
+            ])
+    else:
+        rows = await CostTrackerService.get_usage_buckets(current_user.id, days, granularity, session)
         writer.writerow([
-            log.created_at.isoformat(),
-            log.provider,
-            log.model,
-            log.module,
-            log.action,
-            log.input_tokens,
-            log.output_tokens,
-            log.total_tokens,
-            log.cost_cents,
-            log.latency_ms,
-            "success" if log.success else "failed",
+            "Period", "Provider", "Model", "Module", "Calls", "Failed Calls",
+            "Input Tokens", "Output Tokens", "Total Tokens",
+            "Cost (cents)", "Avg Latency (ms)",
         ])
+        for row in rows:
+            writer.writerow([
+                row.bucket.isoformat(),
+                row.provider,
+                row.model,
+                row.module,
+                int(row.calls),
+                int(row.calls) - int(row.successes or 0),
+                int(row.input_tokens),
+                int(row.output_tokens),
+                int(row.total_tokens),
+                round(float(row.cost_cents), 4),
+                round(float(row.avg_latency_ms), 1),
+            ])
 
     output.seek(0)
     return StreamingResponse(
         iter([output.getvalue()]),
         media_type="text/csv",
         headers={
-            "Content-Disposition": f"attachment; filename=ai-costs-{days}d.csv",
+            "Content-Disposition": f"attachment; filename=ai-costs-{days}d-{granularity}.csv",
         },
     )
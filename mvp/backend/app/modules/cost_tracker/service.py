@@ -6,11 +6,12 @@ from datetime import date, datetime, timedelta
 from uuid import UUID
 
 import structlog
-from sqlalchemy import func
+from sqlalchemy import and_, case, func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.cost_tracking import AIUsageLog
+from app.modules.cost_tracker import rollups
 from app.modules.cost_tracker.pricing import PRICING
 
 logger = structlog.get_logger()
@@ -29,19 +30,19 @@ class CostTrackerService:
         period_start = date.today() - timedelta(days=days)
         period_end = date.today()
 
-        base_filter = [
-            AIUsageLog.user_id == user_id,
-            AIUsageLog.created_at >= datetime.combine(period_start, datetime.min.time()),
-        ]
+        watermark = await rollups.get_watermark(session)
+        usage = rollups.usage_source(
+            user_id, datetime.combine(period_start, datetime.min.time()), watermark,
+        )
 
         # Summary
         summary_result = await session.execute(
             select(
-                func.count().label("total_calls"),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0).label("total_tokens"),
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("total_cost"),
-                func.coalesce(func.avg(AIUsageLog.latency_ms), 0).label("avg_latency"),
-            ).where(*base_filter)
+                func.coalesce(func.sum(usage.c.calls), 0).label("total_calls"),
+                func.coalesce(func.sum(usage.c.total_tokens), 0).label("total_tokens"),
+                func.coalesce(func.sum(usage.c.cost_cents), 0).label("total_cost"),
+                rollups.avg_latency(usage).label("avg_latency"),
+            )
         )
         summary_row = summary_result.one()
 
@@ -57,17 +58,16 @@ class CostTrackerService:
         # By provider
         provider_result = await session.execute(
             select(
-                AIUsageLog.provider,
-                AIUsageLog.model,
-                func.count().label("calls"),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0).label("tokens"),
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-                func.coalesce(func.avg(AIUsageLog.latency_ms), 0).label("latency"),
-                func.sum(func.cast(AIUsageLog.success, type_=func.coalesce.type)).label("successes"),
+                usage.c.provider,
+                usage.c.model,
+                func.sum(usage.c.calls).label("calls"),
+                func.coalesce(func.sum(usage.c.total_tokens), 0).label("tokens"),
+                func.coalesce(func.sum(usage.c.cost_cents), 0).label("cost"),
+                rollups.avg_latency(usage).label("latency"),
+                func.sum(usage.c.successes).label("successes"),
             )
-            .where(*base_filter)
-            .group_by(AIUsageLog.provider, AIUsageLog.model)
-            .order_by(func.sum(AIUsageLog.cost_cents).desc())
+            .group_by(usage.c.provider, usage.c.model)
+            .order_by(func.sum(usage.c.cost_cents).desc())
         )
 
         by_provider = []
@@ -88,14 +88,13 @@ class CostTrackerService:
         # By module
         module_result = await session.execute(
             select(
-                AIUsageLog.module,
-                func.count().label("calls"),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0).label("tokens"),
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
+                usage.c.module,
+                func.sum(usage.c.calls).label("calls"),
+                func.coalesce(func.sum(usage.c.total_tokens), 0).label("tokens"),
+                func.coalesce(func.sum(usage.c.cost_cents), 0).label("cost"),
             )
-            .where(*base_filter)
-            .group_by(AIUsageLog.module)
-            .order_by(func.sum(AIUsageLog.cost_cents).desc())
+            .group_by(usage.c.module)
+            .order_by(func.sum(usage.c.cost_cents).desc())
         )
 
         by_module = [
@@ -111,7 +110,10 @@ class CostTrackerService:
         # Recent calls
         recent_result = await session.execute(
             select(AIUsageLog)
-            .where(*base_filter)
+            .where(
+                AIUsageLog.user_id == user_id,
+                AIUsageLog.created_at >= datetime.combine(period_start, datetime.min.time()),
+            )
             .order_by(AIUsageLog.created_at.desc())
             .limit(20)
         )
@@ -159,35 +161,36 @@ class CostTrackerService:
         alerts: list[dict] = []
         today_start = datetime.combine(date.today(), datetime.min.time())
 
-        # --- Today's spending ---
-        today_result = await session.execute(
+        month_start = today_start - timedelta(days=30)
+        this_week_start = today_start - timedelta(days=7)
+        last_week_start = today_start - timedelta(days=14)
+
+        # All windows are day-aligned, so rollup buckets never straddle them
+        watermark = await rollups.get_watermark(session)
+        usage = rollups.usage_source(user_id, month_start, watermark)
+
+        def _window_sum(column, start, end=None):
+            cond = usage.c.bucket >= start if end is None else and_(usage.c.bucket >= start, usage.c.bucket < end)
+            return func.coalesce(func.sum(case((cond, column), else_=0)), 0)
+
+        totals = (await session.execute(
             select(
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-                func.count().label("calls"),
-            ).where(
-                AIUsageLog.user_id == user_id,
-                AIUsageLog.created_at >= today_start,
+                _window_sum(usage.c.cost_cents, today_start).label("today_cost"),
+                _window_sum(usage.c.calls, today_start).label("today_calls"),
+                _window_sum(usage.c.cost_cents, month_start, today_start).label("month_cost"),
+                _window_sum(usage.c.calls, month_start, today_start).label("month_calls"),
+                _window_sum(usage.c.cost_cents, this_week_start).label("this_week_cost"),
+                _window_sum(usage.c.cost_cents, last_week_start, this_week_start).label("last_week_cost"),
             )
-        )
-        today_row = today_result.one()
-        today_cost = float(today_row.cost)
-        today_calls = int(today_row.calls)
+        )).one()
+
+        # --- Today's spending ---
+        today_cost = float(totals.today_cost)
+        today_calls = int(totals.today_calls)
 
         # --- 30-day daily average ---
-        month_start = today_start - timedelta(days=30)
-        month_result = await session.execute(
-            select(
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-                func.count().label("calls"),
-            ).where(
-                AIUsageLog.user_id == user_id,
-                AIUsageLog.created_at >= month_start,
-                AIUsageLog.created_at < today_start,
-            )
-        )
-        month_row = month_result.one()
-        month_cost = float(month_row.cost)
-        month_calls = int(month_row.calls)
+        month_cost = float(totals.month_cost)
+        month_calls = int(totals.month_calls)
         daily_avg_cost = month_cost / 30 if month_cost > 0 else 0
         daily_avg_calls = month_calls / 30 if month_calls > 0 else 0
 
@@ -222,29 +225,8 @@ class CostTrackerService:
             })
 
         # --- Monthly trend (this week vs last week) ---
-        this_week_start = today_start - timedelta(days=7)
-        last_week_start = today_start - timedelta(days=14)
-
-        this_week_result = await session.execute(
-            select(
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-            ).where(
-                AIUsageLog.user_id == user_id,
-                AIUsageLog.created_at >= this_week_start,
-            )
-        )
-        this_week_cost = float(this_week_result.scalar_one())
-
-        last_week_result = await session.execute(
-            select(
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-            ).where(
-                AIUsageLog.user_id == user_id,
-                AIUsageLog.created_at >= last_week_start,
-                AIUsageLog.created_at < this_week_start,
-            )
-        )
-        last_week_cost = float(last_week_result.scalar_one())
+        this_week_cost = float(totals.this_week_cost)
+        last_week_cost = float(totals.last_week_cost)
 
         if last_week_cost > 0 and this_week_cost > last_week_cost * 1.5:
             pct_increase = ((this_week_cost - last_week_cost) / last_week_cost) * 100
@@ -263,16 +245,12 @@ class CostTrackerService:
         # --- Most expensive provider recommendation ---
         provider_result = await session.execute(
             select(
-                AIUsageLog.provider,
-                func.coalesce(func.sum(AIUsageLog.cost_cents), 0).label("cost"),
-                func.count().label("calls"),
+                usage.c.provider,
+                func.coalesce(func.sum(usage.c.cost_cents), 0).label("cost"),
+                func.sum(usage.c.calls).label("calls"),
             )
-            .where(
-                AIUsageLog.user_id == user_id,
-                AIUsageLog.created_at >= month_start,
-            )
-            .group_by(AIUsageLog.provider)
-            .order_by(func.sum(AIUsageLog.cost_cents).desc())
+            .group_by(usage.c.provider)
+            .order_by(func.sum(usage.c.cost_cents).desc())
         )
         provider_rows = provider_result.all()
 
@@ -327,6 +305,45 @@ class CostTrackerService:
         )
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_usage_buckets(
+        user_id: UUID,
+        days: int,
+        granularity: str,
+        session: AsyncSession,
+    ) -> list:
+        """Aggregated usage per (hour|day, provider, model, module) for export.
+
+        Reads the rollup tables plus the raw tail, so it keeps working for
+        windows older than the raw log retention.
+        """
+        period_start = datetime.combine(
+            date.today() - timedelta(days=days),
+            datetime.min.time(),
+        )
+        watermark = await rollups.get_watermark(session)
+        usage = rollups.usage_source(user_id, period_start, watermark)
+        bucket = func.date_trunc(granularity, usage.c.bucket).label("bucket")
+
+        result = await session.execute(
+            select(
+                bucket,
+                usage.c.provider,
+                usage.c.model,
+                usage.c.module,
+                func.sum(usage.c.calls).label("calls"),
+                func.sum(usage.c.successes).label("successes"),
+                func.sum(usage.c.input_tokens).label("input_tokens"),
+                func.sum(usage.c.output_tokens).label("output_tokens"),
+                func.sum(usage.c.total_tokens).label("total_tokens"),
+                func.sum(usage.c.cost_cents).label("cost_cents"),
+                rollups.avg_latency(usage).label("avg_latency_ms"),
+            )
+            .group_by(bucket, usage.c.provider, usage.c.model, usage.c.module)
+            .order_by(bucket.desc())
+        )
+        return list(result.all())
+
     @staticmethod
     def _generate_recommendations(
         by_provider: list[dict],
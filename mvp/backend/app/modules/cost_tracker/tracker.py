@@ -2,6 +2,8 @@
 Cost tracking utility - logs every AI call.
 
 Import and call `track_ai_usage()` after each AI provider call.
+Rows are handed to the batched usage writer (see usage_writer.py) so the
+call does not wait on a database round-trip.
 Also sends events to Langfuse if available (auto-detection + fallback).
 """
 
@@ -12,6 +14,7 @@ from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.cost_tracking import AIUsageLog
+from app.modules.cost_tracker import usage_writer
 from app.modules.cost_tracker.pricing import estimate_cost_cents
 
 logger = structlog.get_logger()
@@ -36,6 +39,7 @@ async def track_ai_usage(
     Log an AI usage event.
 
     Call this after every AI provider interaction to build cost analytics.
+    The row is queued for a batched insert; see ``usage_writer``.
     Also sends the event to Langfuse if configured (LLM-specific observability).
     Fails silently to never block the main flow.
     """
@@ -58,14 +62,9 @@ async def track_ai_usage(
             error=error[:500] if error else None,
         )
 
-        if session:
-            session.add(log_entry)
-            await session.commit()
-        else:
-            from app.database import get_session_context
-            async with get_session_context() as s:
-                s.add(log_entry)
-                await s.commit()
+        # ``session`` is only used when the row is written inline (sync mode
+        # or no background writer in this event loop).
+        await usage_writer.submit(log_entry.model_dump(), session=session)
 
         logger.debug(
             "ai_usage_tracked",
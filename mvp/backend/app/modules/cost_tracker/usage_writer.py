@@ -0,0 +1,147 @@
+"""
+Batched, non-blocking writer for AI usage logs.
+
+``track_ai_usage`` hands rows to ``submit`` which only appends them to an
+in-process bounded queue.  A background task started by the application
+lifespan drains the queue and bulk-inserts rows into ``ai_usage_logs``
+every ``USAGE_WRITER_BATCH_SIZE`` rows or ``USAGE_WRITER_FLUSH_MS``
+milliseconds, whichever comes first.
+
+When the queue is full the row is dropped and counted rather than making
+the AI request wait on the database.  When no writer is running in the
+current event loop (Celery workers, scripts) or ``USAGE_WRITER_MODE`` is
+``"sync"`` (tests), rows are inserted immediately.
+"""
+
+import asyncio
+from typing import Optional
+
+import structlog
+from sqlalchemy import insert
+
+from app.config import settings
+from app.metrics import ai_usage_writer_queue_depth, ai_usage_writer_rows_total
+from app.models.cost_tracking import AIUsageLog
+
+logger = structlog.get_logger()
+
+_queue: Optional[asyncio.Queue] = None
+_task: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_stopping: Optional[asyncio.Event] = None
+
+
+def is_running() -> bool:
+    """True when a background writer is draining in the current event loop."""
+    if _task is None or _task.done():
+        return False
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+async def write_rows(rows: list[dict], session=None) -> None:
+    """Insert usage rows with a single multi-row INSERT."""
+    if not rows:
+        return
+    if session is not None:
+        await session.execute(insert(AIUsageLog), rows)
+        await session.commit()
+        return
+
+    from app.database import get_session_context
+
+    async with get_session_context() as s:
+        await s.execute(insert(AIUsageLog), rows)
+        await s.commit()
+
+
+async def submit(row: dict, session=None) -> None:
+    """Record one usage row without waiting on the database when possible."""
+    if settings.USAGE_WRITER_MODE == "sync" or not is_running():
+        await write_rows([row], session=session)
+        ai_usage_writer_rows_total.labels(outcome="written").inc()
+        return
+
+    try:
+        _queue.put_nowait(row)
+    except asyncio.QueueFull:
+        ai_usage_writer_rows_total.labels(outcome="dropped").inc()
+        logger.warning("ai_usage_writer_overflow", queue_size=_queue.maxsize)
+        return
+    ai_usage_writer_queue_depth.set(_queue.qsize())
+
+
+async def _next_batch(batch_size: int, interval: float) -> list[dict]:
+    """Wait for up to ``batch_size`` rows, at most ``interval`` after the first."""
+    loop = asyncio.get_running_loop()
+    batch: list[dict] = []
+    deadline: Optional[float] = None
+    while len(batch) < batch_size:
+        timeout = interval if deadline is None else deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(_queue.get(), timeout))
+        except asyncio.TimeoutError:
+            break
+        if deadline is None:
+            deadline = loop.time() + interval
+    return batch
+
+
+async def _flush(batch: list[dict]) -> None:
+    try:
+        await write_rows(batch)
+        ai_usage_writer_rows_total.labels(outcome="written").inc(len(batch))
+    except Exception as e:
+        ai_usage_writer_rows_total.labels(outcome="failed").inc(len(batch))
+        logger.error("ai_usage_writer_flush_failed", rows=len(batch), error=str(e))
+    ai_usage_writer_queue_depth.set(_queue.qsize())
+
+
+async def _drain_loop() -> None:
+    interval = settings.USAGE_WRITER_FLUSH_MS / 1000
+    batch_size = settings.USAGE_WRITER_BATCH_SIZE
+    while True:
+        batch = await _next_batch(batch_size, interval)
+        if batch:
+            await _flush(batch)
+        elif _stopping.is_set():
+            return
+
+
+def start() -> None:
+    """Start the background writer in the running event loop."""
+    global _queue, _task, _loop, _stopping
+    if settings.USAGE_WRITER_MODE == "sync" or is_running():
+        return
+    _loop = asyncio.get_running_loop()
+    _queue = asyncio.Queue(maxsize=settings.USAGE_WRITER_QUEUE_SIZE)
+    _stopping = asyncio.Event()
+    _task = _loop.create_task(_drain_loop(), name="ai_usage_writer")
+    logger.info("ai_usage_writer_started", batch_size=settings.USAGE_WRITER_BATCH_SIZE)
+
+
+async def stop(timeout: float = 10.0) -> int:
+    """Flush queued rows and stop the writer.
+
+    Returns the number of rows still queued (and lost) if the flush did
+    not finish within ``timeout`` seconds.
+    """
+    global _task
+    if _task is None:
+        return 0
+    _stopping.set()
+    try:
+        await asyncio.wait_for(_task, timeout)
+    except asyncio.TimeoutError:
+        pass
+    lost = _queue.qsize()
+    if lost:
+        ai_usage_writer_rows_total.labels(outcome="dropped").inc(lost)
+        logger.error("ai_usage_writer_flush_incomplete", lost=lost)
+    _task = None
+    ai_usage_writer_queue_depth.set(0)
+    return lost
@@ -17,6 +17,7 @@ from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.optional_deps import optional
 from app.models.fine_tuning import (
     DatasetType,
     FineTuneJob,
@@ -27,20 +28,14 @@ from app.models.fine_tuning import (
 
 logger = structlog.get_logger()
 
-# Unsloth - fast LoRA training (heavy, lazy-loaded)
-try:
-    from unsloth import FastLanguageModel
-    HAS_UNSLOTH = True
-except ImportError:
-    HAS_UNSLOTH = False
-
-# lm-evaluation-harness (heavy, lazy-loaded)
-try:
-    from lm_eval import evaluator as lm_evaluator
-    from lm_eval.models.huggingface import HFLM
-    HAS_LM_EVAL = True
-except ImportError:
-    HAS_LM_EVAL = False
+# Unsloth - fast LoRA training (heavy, imported on first training run)
+_unsloth = optional("unsloth")
+HAS_UNSLOTH = _unsloth.available
+
+# lm-evaluation-harness (heavy, imported on first evaluation)
+_lm_eval = optional("lm_eval.evaluator")
+_lm_eval_hf = optional("lm_eval.models.huggingface")
+HAS_LM_EVAL = _lm_eval.available
 
 AVAILABLE_MODELS = [
     {"id": "llama-3.3-8b", "name": "Llama 3.3 8B", "provider": "together", "parameters": "8B", "cost_per_1k_tokens": 0.0002, "supports_lora": True, "max_context": 128000},
@@ -366,6 +361,7 @@ Respond with ONLY a JSON: {{"score": 85, "issues": ["issue1"], "suggestions": ["
             from trl import SFTTrainer
             from transformers import TrainingArguments
             from datasets import Dataset
+            FastLanguageModel = _unsloth.load().FastLanguageModel
 
             max_seq_length = hyperparams.get("max_seq_length", 2048)
             model, tokenizer = FastLanguageModel.from_pretrained(
@@ -459,6 +455,8 @@ Respond with ONLY a JSON: {{"score": 85, "issues": ["issue1"], "suggestions": ["
             return None
 
         try:
+            HFLM = _lm_eval_hf.load().HFLM
+            lm_evaluator = _lm_eval.load()
             lm = HFLM(pretrained=model_path)
 
             results = lm_evaluator.simple_evaluate(
@@ -20,17 +20,15 @@ from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.optional_deps import optional
 from app.models.image_gen import GeneratedImage, ImageProject, ImageStatus
 
 logger = structlog.get_logger()
 
-# Real-ESRGAN auto-detection with graceful fallback
-try:
-    from realesrgan import RealESRGANer
-    from basicsr.archs.rrdbnet_arch import RRDBNet
-    HAS_REALESRGAN = True
-except ImportError:
-    HAS_REALESRGAN = False
+# Real-ESRGAN auto-detection with graceful fallback (imported on first upscale)
+_realesrgan = optional("realesrgan", "basicsr")
+_rrdbnet_arch = optional("basicsr.archs.rrdbnet_arch")
+HAS_REALESRGAN = _realesrgan.available
 
 _upscaler = None  # Lazy singleton
 
@@ -243,6 +241,8 @@ class ImageGenService:
             return _upscaler
         if not HAS_REALESRGAN:
             return None
+        RRDBNet = _rrdbnet_arch.load().RRDBNet
+        RealESRGANer = _realesrgan.load().RealESRGANer
         model = RRDBNet(num_in_ch=3, num_out_ch=3, num_feat=64, num_block=23, num_grow_ch=32, scale=4)
         _upscaler = RealESRGANer(
             scale=4,
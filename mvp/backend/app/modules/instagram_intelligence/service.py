@@ -7,51 +7,28 @@ from typing import Optional
 
 import structlog
 
+from app.core.optional_deps import optional
+
 logger = structlog.get_logger()
 
 # Auto-detection: Playwright (preferred) → instagrapi → instaloader → mock
-HAS_PLAYWRIGHT = False
-HAS_INSTAGRAPI = False
-HAS_INSTALOADER = False
-HAS_PADDLEOCR = False
-HAS_SURYA = False
-HAS_EASYOCR = False
-
-try:
-    from playwright.async_api import async_playwright
-    HAS_PLAYWRIGHT = True
-except ImportError:
-    pass
-
-try:
-    from instagrapi import Client as InstagrapiClient
-    HAS_INSTAGRAPI = True
-except ImportError:
-    pass
-
-try:
-    import instaloader
-    HAS_INSTALOADER = True
-except ImportError:
-    pass
-
-try:
-    from paddleocr import PaddleOCR as _PaddleOCR
-    HAS_PADDLEOCR = True
-except ImportError:
-    pass
-
-try:
-    from surya.ocr import run_ocr as _surya_run_ocr
-    HAS_SURYA = True
-except ImportError:
-    pass
-
-try:
-    import easyocr as _easyocr_mod
-    HAS_EASYOCR = True
-except ImportError:
-    pass
+# Availability is probed with find_spec; the libraries (and the OCR engines
+# with their models) are imported on first use.
+_playwright = optional("playwright.async_api")
+_instagrapi = optional("instagrapi")
+_instaloader = optional("instaloader")
+_paddleocr = optional("paddleocr")
+_surya_ocr = optional("surya.ocr")
+_easyocr = optional("easyocr")
+
+HAS_PLAYWRIGHT = _playwright.available
+HAS_INSTAGRAPI = _instagrapi.available
+HAS_INSTALOADER = _instaloader.available
+HAS_PADDLEOCR = _paddleocr.available
+HAS_SURYA = _surya_ocr.available
+HAS_EASYOCR = _easyocr.available
+
+instaloader = _instaloader.proxy()
 
 
 def _get_instagram_settings():
@@ -125,7 +102,7 @@ class InstagramIntelligenceService:
 
     def _validate_instagrapi(self, username: str) -> dict:
         try:
-            cl = InstagrapiClient()
+            cl = _instagrapi.load().Client()
             user_id = cl.user_id_from_username(username)
             info = cl.user_info(user_id)
             return {
@@ -234,7 +211,7 @@ class InstagramIntelligenceService:
 
     def _fetch_profile_instagrapi(self, username: str, max_reels: int) -> dict:
         try:
-            cl = InstagrapiClient()
+            cl = _instagrapi.load().Client()
             user_id = cl.user_id_from_username(username)
             info = cl.user_info(user_id)
             clips = cl.user_clips(user_id, amount=max_reels)
@@ -253,7 +230,7 @@ class InstagramIntelligenceService:
 
     def _fetch_reel_instagrapi(self, reel_url: str) -> dict:
         try:
-            cl = InstagrapiClient()
+            cl = _instagrapi.load().Client()
             media_pk = cl.media_pk_from_url(reel_url)
             media = cl.media_info(media_pk)
             username = media.user.username if media.user else "unknown"
@@ -288,7 +265,7 @@ class InstagramIntelligenceService:
     async def _fetch_profile_playwright(self, username: str, max_reels: int) -> dict:
         """Scrape Instagram profile + reels via headless Chromium."""
         try:
-            async with async_playwright() as pw:
+            async with _playwright.load().async_playwright() as pw:
                 browser = await pw.chromium.launch(
                     headless=True,
                     args=["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"],
@@ -372,7 +349,7 @@ class InstagramIntelligenceService:
     async def _fetch_reel_playwright(self, reel_url: str) -> dict:
         """Scrape a single Reel page via Playwright — intercepts CDN video URL."""
         try:
-            async with async_playwright() as pw:
+            async with _playwright.load().async_playwright() as pw:
                 browser = await pw.chromium.launch(
                     headless=True,
                     args=["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"],
@@ -909,7 +886,7 @@ class InstagramIntelligenceService:
         }
         """
 
-        async with async_playwright() as pw:
+        async with _playwright.load().async_playwright() as pw:
             browser = await pw.chromium.launch(
                 headless=True,
                 args=["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"],
@@ -1087,7 +1064,7 @@ class InstagramIntelligenceService:
         import os as _os
         _os.environ.setdefault("FLAGS_use_mkldnn", "0")
         try:
-            ocr = _PaddleOCR(use_angle_cls=True, lang="en", use_gpu=False, show_log=False)
+            ocr = _paddleocr.load().PaddleOCR(use_angle_cls=True, lang="en", use_gpu=False, show_log=False)
         except Exception as e:
             logger.warning("paddleocr_init_failed", error=str(e))
             return self._ocr_slides_easyocr(image_paths) if HAS_EASYOCR else [
@@ -1127,7 +1104,7 @@ class InstagramIntelligenceService:
         for i, path in enumerate(image_paths):
             try:
                 img = _Image.open(path).convert("RGB")
-                preds = _surya_run_ocr([img], [["en"]], det_model, det_proc, rec_model, rec_proc)
+                preds = _surya_ocr.load().run_ocr([img], [["en"]], det_model, det_proc, rec_model, rec_proc)
                 lines = [line.text for line in preds[0].text_lines]
                 text = "\n".join(lines)
                 results.append({"index": i + 1, "path": path, "text": text, "method": "surya"})
@@ -1143,7 +1120,7 @@ class InstagramIntelligenceService:
             logger.warning("easyocr_not_available")
             return [{"index": i + 1, "path": p, "text": "", "method": "local_ocr"} for i, p in enumerate(image_paths)]
 
-        reader = _easyocr_mod.Reader(["en"], gpu=False, verbose=False)
+        reader = _easyocr.load().Reader(["en"], gpu=False, verbose=False)
         results = []
         for i, path in enumerate(image_paths):
             try:
@@ -550,6 +550,7 @@ class IntegrationHubService:
     async def _action_ai_workflows(
         self, config: dict, payload: dict, user_id: UUID
     ) -> dict:
+        from app.core.run_supervisor import RunLimitExceeded
         from app.modules.ai_workflows.service import WorkflowService
 
         workflow_id_str = config.get("workflow_id", "")
@@ -558,12 +559,15 @@ class IntegrationHubService:
 
         from uuid import UUID as _UUID
         workflow_id = _UUID(workflow_id_str)
-        run = await WorkflowService.execute_workflow(
-            workflow_id=workflow_id,
-            user_id=user_id,
-            session=self.session,
-            input_data=payload,
-        )
+        try:
+            run = await WorkflowService.start_workflow(
+                workflow_id=workflow_id,
+                user_id=user_id,
+                session=self.session,
+                input_data=payload,
+            )
+        except RunLimitExceeded as e:
+            return {"success": False, "error": str(e)}
         if not run:
             return {"success": False, "error": "Workflow not found or not owned by user"}
         return {"success": True, "run_id": str(run.id)}
@@ -3,6 +3,10 @@ Embedding Service - Generates vector embeddings using sentence-transformers.
 
 Uses all-MiniLM-L6-v2 (384 dimensions) by default - fast, lightweight, free.
 Falls back gracefully if sentence-transformers is not installed.
+
+When INFERENCE_SOCKET_PATH is set, embeddings are computed by the shared
+inference server (app.inference) and the model is only loaded here if the
+server is unreachable.
 """
 
 import structlog
@@ -43,7 +47,10 @@ def _get_model(model_name: str = DEFAULT_MODEL):
 
 def is_available() -> bool:
     """Check if the embedding service is available."""
-    return _get_model() is not None
+    from app.inference.client import enabled
+
+    # The inference server owns the model; don't load a copy just to check
+    return enabled() or _get_model() is not None
 
 
 def get_model_name() -> str:
@@ -56,19 +63,7 @@ def embed_text(text: str, model_name: str = DEFAULT_MODEL) -> Optional[list[floa
 
     Returns a list of floats (384 dimensions) or None if unavailable.
     """
-    model = _get_model(model_name)
-    if model is None:
-        return None
-    try:
-        # Truncate to model max length (256 tokens ~ 1000 chars for safety)
-        text = text[:2000].strip()
-        if not text:
-            return None
-        embedding = model.encode(text, normalize_embeddings=True)
-        return embedding.tolist()
-    except Exception as e:
-        logger.error("embedding_failed", error=str(e), text_length=len(text))
-        return None
+    return embed_texts([text], model_name)[0]
 
 
 def embed_texts(texts: list[str], model_name: str = DEFAULT_MODEL) -> list[Optional[list[float]]]:
@@ -76,6 +71,18 @@ def embed_texts(texts: list[str], model_name: str = DEFAULT_MODEL) -> list[Optio
 
     Returns a list of embeddings (or None for empty/failed texts).
     """
+    from app.inference.client import infer_sync
+
+    if not texts:
+        return []
+    remote = infer_sync("embedding", list(texts), {"model_name": model_name})
+    if remote is not None:
+        return remote
+    return embed_texts_local(texts, model_name)
+
+
+def embed_texts_local(texts: list[str], model_name: str = DEFAULT_MODEL) -> list[Optional[list[float]]]:
+    """Embed ``texts`` with the model loaded in this process."""
     model = _get_model(model_name)
     if model is None:
         return [None] * len(texts)
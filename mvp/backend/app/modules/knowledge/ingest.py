@@ -0,0 +1,208 @@
+"""
+Bulk knowledge ingestion.
+
+All document writes into the knowledge base go through ``ingest_documents``:
+
+1. Documents are inserted together (one flush) as PROCESSING and committed.
+2. Every document is chunked, and the chunks are embedded in batches of
+   EMBED_BATCH_SIZE on a worker thread (or by the inference server), so the
+   event loop is never blocked by the model.  Embedding of batch N+1 runs
+   while batch N is written.
+3. Each batch of chunks is written, vectors included, with one multi-row
+   ``INSERT ... VALUES`` and committed, then progress is reported.
+4. Documents are marked INDEXED.  On failure their partial chunks are
+   removed and they are marked FAILED.
+
+This replaces per-chunk ``add`` + ``flush`` + ``UPDATE ... SET embedding``
+(two round trips per chunk).
+"""
+
+import asyncio
+import inspect
+import json
+from datetime import UTC, datetime
+from typing import Any, Awaitable, Callable, Optional, Union
+from uuid import UUID, uuid4
+
+import sqlalchemy as sa
+import structlog
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.knowledge import Document, DocumentStatus
+
+logger = structlog.get_logger()
+
+# Chunks per embedding call and per INSERT (8 bind parameters per chunk;
+# asyncpg allows at most 32767 per statement)
+EMBED_BATCH_SIZE = 256
+
+ProgressCallback = Callable[[dict[str, Any]], Union[None, Awaitable[None]]]
+
+# The pgvector column is not declared on the SQLModel, so chunks are
+# written through a lightweight table clause that includes it.
+_chunks = sa.table(
+    "document_chunks",
+    sa.column("id"),
+    sa.column("document_id"),
+    sa.column("user_id"),
+    sa.column("content"),
+    sa.column("chunk_index"),
+    sa.column("metadata_json"),
+    sa.column("created_at"),
+    sa.column("embedding"),
+)
+
+
+def vector_literal(embedding: Optional[list[float]]) -> Optional[str]:
+    """pgvector text representation (``[0.1,0.2,...]``)."""
+    if embedding is None:
+        return None
+    return "[" + ",".join(repr(float(v)) for v in embedding) + "]"
+
+
+def _embed_async(texts: list[str], enabled: bool) -> "asyncio.Future[list]":
+    if not enabled:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result([None] * len(texts))
+        return future
+    from app.modules.knowledge import embedding_service
+
+    return asyncio.ensure_future(asyncio.to_thread(embedding_service.embed_texts, texts))
+
+
+async def _report(progress: Optional[ProgressCallback], event: dict[str, Any]) -> None:
+    if progress is None:
+        return
+    try:
+        result = progress(event)
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.debug("knowledge_ingest_progress_failed", error=str(e))
+
+
+async def write_chunks(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert chunk rows (``embedding`` as a pgvector literal or None) in one statement."""
+    if rows:
+        await session.execute(sa.insert(_chunks).values(rows))
+
+
+async def ingest_documents(
+    user_id: UUID,
+    documents: list[dict[str, Any]],
+    session: AsyncSession,
+    progress: Optional[ProgressCallback] = None,
+    embed: bool = True,
+) -> list[Document]:
+    """Chunk, embed and store ``documents`` (dicts with filename, content_type, text).
+
+    Returns the Document records in input order.  ``progress`` (sync or
+    async) receives ``{"stage", "chunks_done", "chunks_total", "documents"}``
+    after each committed batch.
+    """
+    from app.modules.knowledge import embedding_service
+    from app.modules.knowledge.service import KnowledgeService
+
+    now = datetime.now(UTC)
+    records: list[Document] = []
+    for item in documents:
+        doc = Document(
+            id=uuid4(),
+            user_id=user_id,
+            filename=item["filename"][:500],
+            content_type=item.get("content_type") or "text/plain",
+            status=DocumentStatus.PROCESSING,
+            created_at=now,
+            updated_at=now,
+        )
+        session.add(doc)
+        records.append(doc)
+    await session.flush()
+    await session.commit()
+
+    pending: Optional[asyncio.Future] = None
+    try:
+        # (document, chunk_index, text) for every chunk of every document
+        chunk_rows: list[tuple[Document, int, str]] = []
+        for doc, item in zip(records, documents):
+            chunks = KnowledgeService._chunk_text(item.get("text") or "")
+            doc.total_chunks = len(chunks)
+            chunk_rows.extend((doc, i, text) for i, text in enumerate(chunks))
+
+        use_embeddings = embed and embedding_service.is_available()
+        model_name = embedding_service.get_model_name() if use_embeddings else None
+        batches = [chunk_rows[i:i + EMBED_BATCH_SIZE] for i in range(0, len(chunk_rows), EMBED_BATCH_SIZE)]
+        total = len(chunk_rows)
+        done = 0
+        embedded = 0
+
+        if batches:
+            pending = _embed_async([text for _, _, text in batches[0]], use_embeddings)
+        for n, batch in enumerate(batches):
+            embeddings = await pending
+            pending = (
+                _embed_async([text for _, _, text in batches[n + 1]], use_embeddings)
+                if n + 1 < len(batches) else None
+            )
+
+            created_at = datetime.now(UTC)
+            rows = []
+            for (doc, index, text), embedding in zip(batch, embeddings):
+                rows.append({
+                    "id": uuid4(),
+                    "document_id": doc.id,
+                    "user_id": user_id,
+                    "content": text,
+                    "chunk_index": index,
+                    "metadata_json": json.dumps({"filename": doc.filename, "chunk_index": index}),
+                    "created_at": created_at,
+                    "embedding": vector_literal(embedding),
+                })
+                embedded += embedding is not None
+            await write_chunks(session, rows)
+            await session.commit()
+
+            done += len(batch)
+            await _report(progress, {
+                "stage": "chunks", "chunks_done": done, "chunks_total": total, "documents": len(records),
+            })
+
+        finished = datetime.now(UTC)
+        for doc in records:
+            doc.status = DocumentStatus.INDEXED
+            doc.embedding_model = model_name if embedded else None
+            doc.updated_at = finished
+            session.add(doc)
+        await session.commit()
+        for doc in records:
+            await session.refresh(doc)
+
+        logger.info(
+            "knowledge_documents_ingested",
+            documents=len(records),
+            chunks=total,
+            embedded=embedded,
+            vector_search_enabled=embedded > 0,
+        )
+        await _report(progress, {
+            "stage": "done", "chunks_done": total, "chunks_total": total, "documents": len(records),
+        })
+
+    except Exception as e:
+        if pending is not None:
+            pending.cancel()
+        logger.error("knowledge_ingest_failed", documents=len(records), error=str(e))
+        await session.rollback()
+        doc_ids = [doc.id for doc in records]
+        await session.execute(sa.delete(_chunks).where(_chunks.c.document_id.in_(doc_ids)))
+        await session.execute(
+            sa.update(Document)
+            .where(Document.id.in_(doc_ids))
+            .values(status=DocumentStatus.FAILED, total_chunks=0, error=str(e)[:1000], updated_at=datetime.now(UTC))
+        )
+        await session.commit()
+        for doc in records:
+            await session.refresh(doc)
+        await _report(progress, {"stage": "failed", "error": str(e)[:200], "documents": len(records)})
+
+    return records
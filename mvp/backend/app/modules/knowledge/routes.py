@@ -13,12 +13,15 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
 from app.database import get_session
-from app.models.user import User
+from app.models.user import Role, User
 from app.modules.knowledge.schemas import (
     AskRequest,
     AskResponse,
+    BulkIngestRequest,
+    BulkIngestResponse,
     ChunkRead,
     DocumentRead,
+    VectorIndexRebuildRequest,
     SearchRequest,
     SearchResponse,
     SearchResult,
@@ -38,6 +41,7 @@ ALLOWED_DOC_TYPES = {
     ".csv": "text/csv",
 }
 MAX_DOC_SIZE = 10 * 1024 * 1024  # 10 MB
+MAX_BULK_SIZE = 50 * 1024 * 1024  # 50 MB of text per bulk call
 
 
 def _extract_text(content: bytes, filename: str) -> str:
@@ -109,6 +113,51 @@ async def upload_document(
     return document
 
 
+@router.post("/bulk", response_model=BulkIngestResponse, status_code=status.HTTP_201_CREATED)
+@limiter.limit("2/minute")
+async def bulk_ingest(
+    request: Request,
+    body: BulkIngestRequest,
+    current_user: User = Depends(require_verified_email),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Index many text documents in one call.
+
+    Chunks are embedded in batches and written with multi-row inserts.
+    Progress is pushed over the user's WebSocket as
+    ``knowledge_ingest_progress`` messages.
+
+    Rate limit: 2 requests/minute
+    """
+    if sum(len(d.text) for d in body.documents) > MAX_BULK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk payload too large. Maximum is {MAX_BULK_SIZE // (1024 * 1024)} MB of text.",
+        )
+
+    from app.core.websocket_manager import build_message, manager
+
+    user_id = str(current_user.id)
+
+    async def _progress(event: dict) -> None:
+        await manager.send_personal(user_id, build_message("knowledge_ingest_progress", event, user_id=user_id))
+
+    documents = await KnowledgeService.upload_documents(
+        current_user.id,
+        [d.model_dump() for d in body.documents],
+        session,
+        progress=_progress,
+    )
+    failed = sum(1 for d in documents if d.status == "failed")
+    return {
+        "documents": documents,
+        "indexed": len(documents) - failed,
+        "failed": failed,
+        "total_chunks": sum(d.total_chunks for d in documents),
+    }
+
+
 @router.get("/documents", response_model=list[DocumentRead])
 @limiter.limit("20/minute")
 async def list_documents(
@@ -184,7 +233,7 @@ async def search_documents(
     Rate limit: 20 requests/minute
     """
     import hashlib
-    cache_key = f"search:{current_user.id}:{hashlib.md5(body.query.encode()).hexdigest()}"
+    cache_key = f"search:{current_user.id}:{body.ef_search or ''}:{hashlib.md5(body.query.encode()).hexdigest()}"
     cached = await cache_get(cache_key)
     if cached is not None:
         return SearchResponse(**cached)
@@ -194,6 +243,7 @@ async def search_documents(
         query=body.query,
         session=session,
         limit=body.limit,
+        ef_search=body.ef_search,
     )
 
     # Cache for 2 minutes
@@ -261,6 +311,8 @@ async def search_vector(
         query=body.query,
         session=session,
         limit=body.limit,
+        ef_search=body.ef_search,
+        exact=body.exact,
     )
 
     return SearchResponse(
@@ -335,6 +387,46 @@ async def reindex_embeddings(
     }
 
 
+def _require_admin(user: User) -> None:
+    if user.role != Role.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Vector index management is restricted to admin users.",
+        )
+
+
+@router.get("/admin/vector-index")
+@limiter.limit("10/minute")
+async def vector_index_status(
+    request: Request,
+    current_user: User = Depends(require_verified_email),
+    session: AsyncSession = Depends(get_session),
+):
+    """List pgvector ANN indexes (validity, size) and the search settings."""
+    _require_admin(current_user)
+    from app.modules.knowledge import vector_index
+
+    return await vector_index.index_status(session)
+
+
+@router.post("/admin/vector-index/rebuild", status_code=202)
+@limiter.limit("1/minute")
+async def rebuild_vector_index(
+    request: Request,
+    body: VectorIndexRebuildRequest,
+    current_user: User = Depends(require_verified_email),
+):
+    """
+    Rebuild the global ANN index CONCURRENTLY (search keeps working) and
+    resync per-tenant partial indexes, in a background Celery task.
+    """
+    _require_admin(current_user)
+    from app.tasks.vector_index import rebuild_vector_index as rebuild_task
+
+    task = rebuild_task.delay(**body.model_dump(exclude_none=True))
+    return {"task_id": task.id, "status": "queued"}
+
+
 @router.get("/search/status")
 async def search_status():
     """Check which search modes are available."""
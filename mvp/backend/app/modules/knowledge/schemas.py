@@ -24,10 +24,42 @@ class DocumentRead(BaseModel):
         from_attributes = True
 
 
+class BulkIngestDocument(BaseModel):
+    """One document of a bulk ingestion request."""
+    filename: str = Field(..., min_length=1, max_length=500)
+    content_type: str = Field(default="text/plain", max_length=100)
+    text: str = Field(..., max_length=10 * 1024 * 1024)
+
+
+class BulkIngestRequest(BaseModel):
+    """Index many documents in one call."""
+    documents: list[BulkIngestDocument] = Field(..., min_length=1, max_length=200)
+
+
+class VectorIndexRebuildRequest(BaseModel):
+    """Global ANN index rebuild parameters (defaults from settings)."""
+    method: Optional[str] = Field(default=None, pattern="^(hnsw|ivfflat)$")
+    m: Optional[int] = Field(default=None, ge=4, le=100)
+    ef_construction: Optional[int] = Field(default=None, ge=16, le=1000)
+    lists: Optional[int] = Field(default=None, ge=1, le=100000)
+
+
+class BulkIngestResponse(BaseModel):
+    """Bulk ingestion result."""
+    documents: list[DocumentRead]
+    indexed: int
+    failed: int
+    total_chunks: int
+
+
 class SearchRequest(BaseModel):
     """Semantic search request."""
     query: str = Field(..., min_length=1, max_length=5000)
     limit: int = Field(default=5, ge=1, le=20)
+    # Recall/latency knob for ANN index scans (pgvector hnsw.ef_search)
+    ef_search: Optional[int] = Field(default=None, ge=10, le=1000)
+    # Vector search only: bypass the ANN index
+    exact: bool = False
 
 
 class SearchResult(BaseModel):
@@ -7,11 +7,9 @@ Search modes (auto-selected):
 - Hybrid search (TF-IDF + vector, auto-selected when embeddings exist)
 """
 
-import json
 import math
 import re
 from collections import Counter
-from datetime import UTC, datetime
 from typing import Optional
 from uuid import UUID
 
@@ -102,75 +100,26 @@ class KnowledgeService:
         session: AsyncSession,
     ) -> Document:
         """Upload and index a document."""
-        # Create document record
-        document = Document(
-            user_id=user_id,
-            filename=filename,
-            content_type=content_type,
-            status=DocumentStatus.PROCESSING,
-        )
-        session.add(document)
-        await session.flush()
-
-        try:
-            # Chunk the text
-            chunks = KnowledgeService._chunk_text(text_content)
+        from app.modules.knowledge.ingest import ingest_documents
 
-            # Generate embeddings if sentence-transformers is available
-            from app.modules.knowledge import embedding_service
-            embeddings = None
-            if embedding_service.is_available():
-                chunk_texts = [c for c in chunks]
-                embeddings = embedding_service.embed_texts(chunk_texts)
-                document.embedding_model = embedding_service.get_model_name()
-
-            # Store chunks (with embeddings if available)
-            for i, chunk_text in enumerate(chunks):
-                chunk = DocumentChunk(
-                    document_id=document.id,
-                    user_id=user_id,
-                    content=chunk_text,
-                    chunk_index=i,
-                    metadata_json=json.dumps({"filename": filename, "chunk_index": i}),
-                )
-                session.add(chunk)
-                await session.flush()
-
-                # Store embedding via raw SQL (pgvector column not in SQLModel)
-                if embeddings and embeddings[i] is not None:
-                    emb_str = "[" + ",".join(str(v) for v in embeddings[i]) + "]"
-                    await session.execute(
-                        __import__("sqlalchemy").text(
-                            "UPDATE document_chunks SET embedding = :emb WHERE id = :cid"
-                        ),
-                        {"emb": emb_str, "cid": str(chunk.id)},
-                    )
-
-            document.total_chunks = len(chunks)
-            document.status = DocumentStatus.INDEXED
-            document.updated_at = datetime.now(UTC)
-
-            await session.commit()
-            await session.refresh(document)
-
-            has_vectors = embeddings is not None and any(e is not None for e in embeddings)
-            logger.info(
-                "document_indexed",
-                document_id=str(document.id),
-                filename=filename,
-                chunks=len(chunks),
-                vector_search_enabled=has_vectors,
-            )
+        documents = await ingest_documents(
+            user_id,
+            [{"filename": filename, "content_type": content_type, "text": text_content}],
+            session,
+        )
+        return documents[0]
 
-        except Exception as e:
-            document.status = DocumentStatus.FAILED
-            document.error = str(e)[:1000]
-            document.updated_at = datetime.now(UTC)
-            await session.commit()
-            await session.refresh(document)
-            logger.error("document_indexing_failed", error=str(e))
+    @staticmethod
+    async def upload_documents(
+        user_id: UUID,
+        documents: list[dict],
+        session: AsyncSession,
+        progress=None,
+    ) -> list[Document]:
+        """Index many documents (dicts with filename, content_type, text) in one pass."""
+        from app.modules.knowledge.ingest import ingest_documents
 
-        return document
+        return await ingest_documents(user_id, documents, session, progress=progress)
 
     @staticmethod
     async def index_text_content(
@@ -180,41 +129,22 @@ class KnowledgeService:
         content_type: str = "text/markdown",
         session: AsyncSession = None,
     ) -> Optional[dict]:
-        """Index raw text content into the knowledge base."""
+        """Index raw text content into the knowledge base; raises when indexing fails."""
         if not content.strip():
             return None
 
-        # Create document record
-        doc = Document(
-            user_id=user_id,
-            filename=filename[:255],
-            content_type=content_type,
-            total_chunks=0,
-            status=DocumentStatus.PROCESSING,
-        )
-        session.add(doc)
-        await session.flush()
-
-        # Chunk the content
-        chunks = KnowledgeService._chunk_text(content)
-
-        for i, chunk_text in enumerate(chunks):
-            chunk = DocumentChunk(
-                document_id=doc.id,
-                user_id=user_id,
-                content=chunk_text,
-                chunk_index=i,
-                metadata_json=json.dumps({"filename": filename[:255], "chunk_index": i}),
-            )
-            session.add(chunk)
-
-        doc.total_chunks = len(chunks)
-        doc.status = DocumentStatus.INDEXED
-        doc.updated_at = datetime.now(UTC)
-        session.add(doc)
-        await session.commit()
+        from app.modules.knowledge.ingest import ingest_documents
 
-        return {"document_id": str(doc.id), "total_chunks": len(chunks)}
+        documents = await ingest_documents(
+            user_id,
+            [{"filename": filename[:255], "content_type": content_type, "text": content}],
+            session,
+        )
+        document = documents[0]
+        # ingest_documents records a failure on the document instead of raising
+        if document.status == DocumentStatus.FAILED:
+            raise RuntimeError(f"Indexing {filename} failed: {document.error}")
+        return {"document_id": str(document.id), "total_chunks": document.total_chunks}
 
     @staticmethod
     async def list_documents(
@@ -276,6 +206,7 @@ class KnowledgeService:
         query: str,
         session: AsyncSession,
         limit: int = 5,
+        ef_search: Optional[int] = None,
     ) -> list[dict]:
         """Smart search: uses hybrid (vector + TF-IDF) when embeddings exist, falls back to TF-IDF.
 
@@ -288,7 +219,7 @@ class KnowledgeService:
             from app.modules.knowledge import embedding_service
             if embedding_service.is_available():
                 hybrid_results = await KnowledgeService.search_hybrid(
-                    user_id, query, session, limit
+                    user_id, query, session, limit, ef_search=ef_search
                 )
                 if hybrid_results:
                     return hybrid_results
@@ -348,43 +279,28 @@ class KnowledgeService:
         query: str,
         session: AsyncSession,
         limit: int = 5,
+        ef_search: Optional[int] = None,
+        exact: bool = False,
     ) -> list[dict]:
         """Semantic vector search using pgvector cosine similarity.
 
         Requires embeddings to be generated (sentence-transformers + pgvector).
-        Returns empty list if embeddings are not available.
+        Returns empty list if embeddings are not available.  ``ef_search``
+        trades latency for recall on ANN index scans; ``exact`` skips the
+        index (see vector_index for how the strategy is chosen).
         """
-        from app.modules.knowledge import embedding_service
+        from app.modules.knowledge import embedding_service, vector_index
+        from app.modules.knowledge.ingest import vector_literal
 
         query_embedding = embedding_service.embed_text(query)
         if query_embedding is None:
             return []
 
-        emb_str = "[" + ",".join(str(v) for v in query_embedding) + "]"
-
         try:
-            import sqlalchemy as sa
-            # pgvector cosine distance: 1 - cosine_similarity (lower = more similar)
-            sql = sa.text("""
-                SELECT
-                    dc.id AS chunk_id,
-                    dc.document_id,
-                    d.filename,
-                    dc.content,
-                    dc.chunk_index,
-                    1 - (dc.embedding <=> :query_emb::vector) AS score
-                FROM document_chunks dc
-                JOIN documents d ON dc.document_id = d.id
-                WHERE dc.user_id = :uid
-                  AND dc.embedding IS NOT NULL
-                ORDER BY dc.embedding <=> :query_emb::vector
-                LIMIT :lim
-            """)
-
-            result = await session.execute(
-                sql, {"uid": str(user_id), "query_emb": emb_str, "lim": limit}
+            strategy, rows = await vector_index.nearest_chunks(
+                session, user_id, vector_literal(query_embedding), limit, ef_search=ef_search, exact=exact,
             )
-            rows = result.fetchall()
+            logger.debug("vector_search", strategy=strategy, results=len(rows))
 
             return [
                 {
@@ -410,6 +326,7 @@ class KnowledgeService:
         session: AsyncSession,
         limit: int = 5,
         vector_weight: float = 0.7,
+        ef_search: Optional[int] = None,
     ) -> list[dict]:
         """Hybrid search: combines vector similarity (70%) with TF-IDF (30%).
 
@@ -418,7 +335,7 @@ class KnowledgeService:
         """
         # Run both searches
         vector_results = await KnowledgeService.search_vector(
-            user_id, query, session, limit=limit * 2
+            user_id, query, session, limit=limit * 2, ef_search=ef_search
         )
         tfidf_results = await KnowledgeService.search_tfidf(
             user_id, query, session, limit=limit * 2
@@ -0,0 +1,378 @@
+"""
+pgvector ANN index management and filtered vector search.
+
+Index layout on ``document_chunks.embedding`` (cosine distance):
+
+- one global ANN index, ``ix_document_chunks_embedding_ann`` (HNSW by
+  default, IVFFlat optional), rebuilt CONCURRENTLY under a temporary name and
+  swapped in so search keeps working during a rebuild;
+- partial HNSW indexes ``WHERE user_id = '<uuid>'`` for tenants with at
+  least KNOWLEDGE_ANN_TENANT_INDEX_MIN_CHUNKS chunks, created / dropped by
+  ``sync_tenant_indexes`` (nightly).
+
+Every search filters on ``user_id``, which an ANN scan applies *after*
+collecting ef_search candidates, so small tenants could get too few rows
+back.  ``choose_strategy`` therefore picks, per query:
+
+- ``exact``: the tenant is small (<= KNOWLEDGE_ANN_EXACT_MAX_CHUNKS) or exact
+  search was requested -- distances are computed over the tenant's rows only;
+- ``tenant_index``: the tenant has its own partial index (the user_id is
+  inlined so even generic plans match the index predicate);
+- ``global_index``: pgvector >= 0.8 iterative scan keeps scanning until
+  enough rows pass the filter; on older versions ef_search is raised in
+  proportion to the tenant's share of the table (exact search past 1000).
+"""
+
+import math
+import time
+from typing import Any, Optional
+from uuid import UUID
+
+import sqlalchemy as sa
+import structlog
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+ANN_INDEX = "ix_document_chunks_embedding_ann"
+TENANT_INDEX_PREFIX = "ix_dc_embedding_u_"
+MAINTENANCE_WORK_MEM = "1GB"
+MAX_EF_SEARCH = 1000
+CACHE_TTL_SECONDS = 300.0
+
+_cache: dict[str, tuple[float, Any]] = {}
+
+
+def _cached(key: str) -> Any:
+    entry = _cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _store(key: str, value: Any) -> Any:
+    _cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, value)
+    return value
+
+
+def invalidate_cache() -> None:
+    _cache.clear()
+
+
+def tenant_index_name(user_id: UUID | str) -> str:
+    return TENANT_INDEX_PREFIX + UUID(str(user_id)).hex
+
+
+def index_ddl(
+    name: str,
+    method: str,
+    *,
+    m: int = 16,
+    ef_construction: int = 64,
+    lists: int = 100,
+    user_id: Optional[UUID] = None,
+    concurrently: bool = True,
+) -> str:
+    """CREATE INDEX statement for an ANN index on document_chunks.embedding."""
+    if method == "hnsw":
+        params = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+    elif method == "ivfflat":
+        params = f"lists = {int(lists)}"
+    else:
+        raise ValueError(f"unknown ANN method {method!r}")
+    where = f" WHERE user_id = '{UUID(str(user_id))}'::uuid" if user_id is not None else ""
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON document_chunks USING {method} (embedding vector_cosine_ops) WITH ({params}){where}"
+    )
+
+
+def ivfflat_lists(rows: int) -> int:
+    """pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    if settings.KNOWLEDGE_IVFFLAT_LISTS:
+        return settings.KNOWLEDGE_IVFFLAT_LISTS
+    return max(10, rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows)))
+
+
+# ---------------------------------------------------------------------------
+# Introspection (cached)
+# ---------------------------------------------------------------------------
+
+async def pgvector_version(session: AsyncSession) -> tuple[int, ...]:
+    version = _cached("version")
+    if version is None:
+        raw = (await session.execute(
+            sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )).scalar_one_or_none() or "0"
+        version = _store("version", tuple(int(p) for p in raw.split(".") if p.isdigit()))
+    return version
+
+
+async def global_index_method(session: AsyncSession) -> Optional[str]:
+    method = _cached("method")
+    if method is None:
+        indexdef = (await session.execute(
+            sa.text("SELECT indexdef FROM pg_indexes WHERE indexname = :name"), {"name": ANN_INDEX},
+        )).scalar_one_or_none() or ""
+        method = _store("method", "ivfflat" if "USING ivfflat" in indexdef else "hnsw" if indexdef else "none")
+    return None if method == "none" else method
+
+
+async def tenant_profile(session: AsyncSession, user_id: UUID) -> tuple[int, bool]:
+    """(embedded chunk count, has a partial index) for a tenant."""
+    key = f"tenant:{user_id}"
+    profile = _cached(key)
+    if profile is None:
+        chunks = (await session.execute(
+            sa.text("SELECT count(*) FROM document_chunks WHERE user_id = :uid AND embedding IS NOT NULL"),
+            {"uid": str(user_id)},
+        )).scalar_one()
+        has_index = (await session.execute(
+            sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": tenant_index_name(user_id)},
+        )).scalar_one_or_none() is not None
+        profile = _store(key, (int(chunks), has_index))
+    return profile
+
+
+async def table_rows(session: AsyncSession) -> int:
+    rows = _cached("rows")
+    if rows is None:
+        estimate = (await session.execute(
+            sa.text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'document_chunks'")
+        )).scalar_one_or_none()
+        rows = _store("rows", max(int(estimate or 0), 0))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+async def choose_strategy(
+    session: AsyncSession,
+    user_id: UUID,
+    limit: int,
+    ef_search: Optional[int] = None,
+    exact: bool = False,
+) -> tuple[str, dict[str, Any]]:
+    """Return (strategy, search settings) for one query."""
+    if exact:
+        return "exact", {}
+
+    chunks, has_tenant_index = await tenant_profile(session, user_id)
+    method = await global_index_method(session)
+    if method is None or chunks <= settings.KNOWLEDGE_ANN_EXACT_MAX_CHUNKS:
+        return "exact", {}
+
+    ef = max(ef_search or settings.KNOWLEDGE_HNSW_EF_SEARCH, limit)
+    knobs: dict[str, Any] = {"ef_search": min(ef, MAX_EF_SEARCH), "probes": settings.KNOWLEDGE_IVFFLAT_PROBES}
+    if has_tenant_index:
+        return "tenant_index", knobs
+
+    if await pgvector_version(session) >= (0, 8):
+        knobs["iterative_scan"] = True
+        return "global_index", {**knobs, "method": method}
+
+    # No iterative scan: widen the candidate list by the inverse selectivity
+    total = await table_rows(session)
+    selectivity = min(1.0, chunks / total) if total else 1.0
+    needed = math.ceil(ef / selectivity)
+    if method == "hnsw" and needed > MAX_EF_SEARCH:
+        return "exact", {}
+    knobs["ef_search"] = min(needed, MAX_EF_SEARCH)
+    knobs["probes"] = min(ivfflat_lists(total), math.ceil(knobs["probes"] / selectivity))
+    return "global_index", {**knobs, "method": method}
+
+
+async def apply_search_settings(session: AsyncSession, knobs: dict[str, Any]) -> None:
+    """SET LOCAL the per-query index parameters (transaction scoped)."""
+    if "ef_search" in knobs:
+        await session.execute(sa.text(f"SET LOCAL hnsw.ef_search = {int(knobs['ef_search'])}"))
+    if "probes" in knobs:
+        await session.execute(sa.text(f"SET LOCAL ivfflat.probes = {int(knobs['probes'])}"))
+    if knobs.get("iterative_scan"):
+        prefix = "ivfflat" if knobs.get("method") == "ivfflat" else "hnsw"
+        await session.execute(sa.text(f"SET LOCAL {prefix}.iterative_scan = relaxed_order"))
+
+
+def search_sql(strategy: str, user_id: UUID) -> sa.TextClause:
+    """Top-k query for a strategy; binds :query_emb, :uid and :lim."""
+    if strategy == "exact":
+        # MATERIALIZED keeps the planner from walking the global ANN index
+        return sa.text("""
+            WITH candidates AS MATERIALIZED (
+                SELECT id, document_id, content, chunk_index,
+                       embedding <=> CAST(:query_emb AS vector) AS distance
+                FROM document_chunks
+                WHERE user_id = :uid AND embedding IS NOT NULL
+            )
+            SELECT c.id, c.document_id, d.filename, c.content, c.chunk_index, 1 - c.distance AS score
+            FROM candidates c
+            JOIN documents d ON c.document_id = d.id
+            ORDER BY c.distance
+            LIMIT :lim
+        """)
+
+    # Partial index predicates only match a literal user_id
+    tenant = f"'{UUID(str(user_id))}'::uuid" if strategy == "tenant_index" else ":uid"
+    return sa.text(f"""
+        SELECT c.id, c.document_id, d.filename, c.content, c.chunk_index, 1 - c.distance AS score
+        FROM (
+            SELECT id, document_id, content, chunk_index,
+                   embedding <=> CAST(:query_emb AS vector) AS distance
+            FROM document_chunks
+            WHERE user_id = {tenant} AND embedding IS NOT NULL
+            ORDER BY embedding <=> CAST(:query_emb AS vector)
+            LIMIT :lim
+        ) c
+        JOIN documents d ON c.document_id = d.id
+        ORDER BY c.distance
+    """)
+
+
+async def nearest_chunks(
+    session: AsyncSession,
+    user_id: UUID,
+    query_vector: str,
+    limit: int,
+    ef_search: Optional[int] = None,
+    exact: bool = False,
+) -> tuple[str, list]:
+    """Run the filtered top-k search; returns (strategy, rows)."""
+    strategy, knobs = await choose_strategy(session, user_id, limit, ef_search=ef_search, exact=exact)
+    if strategy != "exact":
+        await apply_search_settings(session, knobs)
+    params = {"query_emb": query_vector, "lim": limit}
+    if strategy != "tenant_index":
+        params["uid"] = str(user_id)
+    result = await session.execute(search_sql(strategy, user_id), params)
+    return strategy, result.fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Maintenance (AUTOCOMMIT: CONCURRENTLY cannot run in a transaction)
+# ---------------------------------------------------------------------------
+
+async def _autocommit():
+    from app.database import engine
+
+    conn = await engine.connect()
+    return await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+
+async def rebuild_global_index(
+    method: Optional[str] = None,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    lists: Optional[int] = None,
+) -> dict[str, Any]:
+    """Build a new global ANN index CONCURRENTLY and swap it in."""
+    method = method or settings.KNOWLEDGE_ANN_METHOD
+    m = m or settings.KNOWLEDGE_HNSW_M
+    ef_construction = ef_construction or settings.KNOWLEDGE_HNSW_EF_CONSTRUCTION
+    building = f"{ANN_INDEX}_new"
+
+    conn = await _autocommit()
+    try:
+        rows = (await conn.execute(
+            sa.text("SELECT count(*) FROM document_chunks WHERE embedding IS NOT NULL")
+        )).scalar_one()
+        lists = lists or ivfflat_lists(rows)
+
+        started = time.perf_counter()
+        await conn.execute(sa.text(f"SET maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"))
+        # An interrupted earlier build leaves an INVALID index behind
+        await conn.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {building}"))
+        await conn.execute(sa.text(index_ddl(building, method, m=m, ef_construction=ef_construction, lists=lists)))
+        await conn.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {ANN_INDEX}"))
+        await conn.execute(sa.text(f"ALTER INDEX {building} RENAME TO {ANN_INDEX}"))
+        seconds = round(time.perf_counter() - started, 1)
+    finally:
+        await conn.close()
+
+    invalidate_cache()
+    params = {"m": m, "ef_construction": ef_construction} if method == "hnsw" else {"lists": lists}
+    logger.info("vector_index_rebuilt", method=method, rows=rows, seconds=seconds, **params)
+    return {"index": ANN_INDEX, "method": method, "rows": rows, "build_seconds": seconds, **params}
+
+
+async def sync_tenant_indexes(min_chunks: Optional[int] = None) -> dict[str, list[str]]:
+    """Create partial indexes for large tenants, drop them for shrunk ones.
+
+    Tenants keep their index until they fall below half the threshold so a
+    tenant hovering around it does not rebuild every night.
+    """
+    min_chunks = min_chunks or settings.KNOWLEDGE_ANN_TENANT_INDEX_MIN_CHUNKS
+    conn = await _autocommit()
+    created, dropped = [], []
+    try:
+        counts = {
+            str(row[0]): int(row[1])
+            for row in (await conn.execute(
+                sa.text("""
+                    SELECT user_id, count(*) FROM document_chunks
+                    WHERE embedding IS NOT NULL
+                    GROUP BY user_id HAVING count(*) >= :floor
+                """),
+                {"floor": min_chunks // 2},
+            )).fetchall()
+        }
+        existing = {
+            row[0] for row in (await conn.execute(
+                sa.text("SELECT indexname FROM pg_indexes WHERE tablename = 'document_chunks' AND indexname LIKE :prefix"),
+                {"prefix": TENANT_INDEX_PREFIX + "%"},
+            )).fetchall()
+        }
+
+        await conn.execute(sa.text(f"SET maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"))
+        for user_id, chunks in counts.items():
+            name = tenant_index_name(user_id)
+            if chunks >= min_chunks and name not in existing:
+                await conn.execute(sa.text(index_ddl(
+                    name, "hnsw", m=settings.KNOWLEDGE_HNSW_M,
+                    ef_construction=settings.KNOWLEDGE_HNSW_EF_CONSTRUCTION, user_id=UUID(user_id),
+                )))
+                created.append(name)
+
+        keep = {tenant_index_name(u) for u in counts}
+        for name in sorted(existing - keep):
+            await conn.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            dropped.append(name)
+    finally:
+        await conn.close()
+
+    invalidate_cache()
+    logger.info("vector_tenant_indexes_synced", created=len(created), dropped=len(dropped))
+    return {"created": created, "dropped": dropped}
+
+
+async def index_status(session: AsyncSession) -> dict[str, Any]:
+    """ANN indexes on document_chunks with validity and size."""
+    rows = (await session.execute(
+        sa.text("""
+            SELECT c.relname, pg_relation_size(c.oid), i.indisvalid, pg_get_indexdef(c.oid)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'document_chunks'::regclass
+              AND pg_get_indexdef(c.oid) ~ 'USING (hnsw|ivfflat)'
+            ORDER BY c.relname
+        """)
+    )).fetchall()
+    version = await pgvector_version(session)
+    return {
+        "pgvector_version": ".".join(str(p) for p in version),
+        "iterative_scan": version >= (0, 8),
+        "indexes": [
+            {"name": r[0], "size_bytes": int(r[1]), "valid": bool(r[2]), "definition": r[3]}
+            for r in rows
+        ],
+        "settings": {
+            "method": settings.KNOWLEDGE_ANN_METHOD,
+            "ef_search": settings.KNOWLEDGE_HNSW_EF_SEARCH,
+            "probes": settings.KNOWLEDGE_IVFFLAT_PROBES,
+            "exact_max_chunks": settings.KNOWLEDGE_ANN_EXACT_MAX_CHUNKS,
+            "tenant_index_min_chunks": settings.KNOWLEDGE_ANN_TENANT_INDEX_MIN_CHUNKS,
+        },
+    }
@@ -6,11 +6,12 @@ import json
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
+from app.core.pagination import InvalidCursor
 from app.database import get_session
 from app.models.user import User
 from app.modules.marketplace.schemas import (
@@ -75,28 +76,40 @@ def _review_to_read(
 @limiter.limit("30/minute")
 async def browse_listings(
     request: Request,
+    response: Response,
     type: Optional[str] = Query(None, description="Filter by type: module, template, prompt, workflow, dataset"),
     category: Optional[str] = Query(None, description="Filter by category"),
     sort_by: str = Query("newest", description="Sort: newest, popular, rating, price_asc, price_desc"),
     search: Optional[str] = Query(None, description="Search in title and description"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Browse published marketplace listings (public, no auth needed).
 
+    The cursor of the next page is returned in the ``X-Next-Cursor`` header.
+
     Rate limit: 30 requests/minute
     """
     service = MarketplaceService(session)
-    listings, _ = await service.list_listings(
-        type=type,
-        category=category,
-        sort_by=sort_by,
-        search=search,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        page = await service.list_listings(
+            type=type,
+            category=category,
+            sort_by=sort_by,
+            search=search,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count="none",
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    listings = page.items
     names = await service._get_user_names([l.author_id for l in listings])
     return [_listing_to_read(l, names) for l in listings]
 
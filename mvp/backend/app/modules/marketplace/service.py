@@ -8,10 +8,11 @@ from typing import Optional
 from uuid import UUID
 
 import structlog
-from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import pagination
+from app.core.pagination import CountMode, Page
 from app.models.marketplace import (
     MarketplaceInstall,
     MarketplaceListing,
@@ -74,8 +75,10 @@ class MarketplaceService:
         search: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> tuple[list[MarketplaceListing], int]:
-        """Browse/search published marketplace listings (public)."""
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+    ) -> Page[MarketplaceListing]:
+        """Browse/search published marketplace listings (public), paged by ``cursor`` or ``offset``."""
         base = select(MarketplaceListing).where(
             MarketplaceListing.is_published == True,
             MarketplaceListing.is_deleted == False,
@@ -92,26 +95,24 @@ class MarketplaceService:
                 | MarketplaceListing.description.ilike(pattern)
             )
 
-        # Count
-        count_stmt = select(func.count()).select_from(base.subquery())
-        count_result = await self.session.execute(count_stmt)
-        total = count_result.scalar_one()
-
-        # Sort
-        if sort_by == "popular":
-            base = base.order_by(MarketplaceListing.installs_count.desc())
-        elif sort_by == "rating":
-            base = base.order_by(MarketplaceListing.rating.desc())
-        elif sort_by == "price_asc":
-            base = base.order_by(MarketplaceListing.price.asc())
-        elif sort_by == "price_desc":
-            base = base.order_by(MarketplaceListing.price.desc())
-        else:
-            base = base.order_by(MarketplaceListing.created_at.desc())
-
-        base = base.offset(offset).limit(limit)
-        result = await self.session.execute(base)
-        return list(result.scalars().all()), total
+        # Sort (listing id breaks ties so cursors are stable)
+        sort_column, descending = {
+            "popular": (MarketplaceListing.installs_count, True),
+            "rating": (MarketplaceListing.rating, True),
+            "price_asc": (MarketplaceListing.price, False),
+            "price_desc": (MarketplaceListing.price, True),
+        }.get(sort_by, (MarketplaceListing.created_at, True))
+
+        return await pagination.paginate(
+            self.session,
+            base,
+            order_by=(sort_column, MarketplaceListing.id),
+            descending=descending,
+            limit=limit,
+            cursor=cursor,
+            skip=offset,
+            count=count,
+        )
 
     async def get_listing(
         self, listing_id: UUID, user_id: Optional[UUID] = None
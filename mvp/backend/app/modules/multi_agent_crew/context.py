@@ -0,0 +1,228 @@
+"""
+Crew context
+============
+
+Shared rolling context for sequential crew runs.  Replaying earlier
+agents' outputs into every prompt makes prompts (and latency) grow with
+the crew; instead each agent sees, within CREW_CONTEXT_BUDGET_TOKENS:
+
+- the scratchpad: key facts and decisions reported by earlier agents,
+  newest kept first, at most CREW_CONTEXT_SCRATCHPAD_TOKENS;
+- an index of artifacts, one per earlier output (``A1``, ``A2``, ...),
+  with author and size but not the text;
+- the previous agent's output, clipped to what is left of the budget.
+
+Agents end their output with ``FACTS:`` / ``DECISIONS:`` bullet lists,
+which ``record`` moves to the scratchpad (an output without them
+contributes its first sentences).  An agent that needs more of an earlier
+output replies ``READ: A1, A3`` and is called again with those artifacts,
+each clipped to an equal share of the budget (see ``read_request`` and
+``read``).  Its last allowed call is made with ``FINAL_INSTRUCTIONS``,
+which do not offer ``READ:``, so a request never becomes its output.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.ai_assistant.long_text import estimate_tokens
+from app.config import settings
+
+_CHARS_PER_TOKEN = 4
+_NOTES_HEADER = re.compile(r"^\s*\**\s*(FACTS|DECISIONS)\s*\**\s*:\s*\**\s*$", re.IGNORECASE | re.MULTILINE)
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.*\S)\s*$")
+_READ = re.compile(r"^\s*READ\s*:\s*(.+)$", re.IGNORECASE)
+_REF = re.compile(r"\bA(\d+)\b", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# For an agent's last allowed call, when it can no longer ask for artifacts
+FINAL_INSTRUCTIONS = """Instructions:
+1. Build on the scratchpad and the previous agent's output
+2. Execute your role to achieve your goal
+3. Produce a clear, comprehensive output for the next agent
+4. End with the key facts and decisions later agents need, as short bullets:
+FACTS:
+- ...
+DECISIONS:
+- ..."""
+
+AGENT_INSTRUCTIONS = FINAL_INSTRUCTIONS + """
+
+If you need the full text of an earlier output, reply only with READ: and its ids (for example READ: A1).
+Requested outputs share the context budget, so ask only for the ones you need."""
+
+# Agents that run without a crew context (parallel crews)
+SOLO_INSTRUCTIONS = """Instructions:
+1. Analyze the context and previous agent outputs
+2. Execute your role to achieve your goal
+3. Produce a clear, comprehensive output for the next agent"""
+
+
+def clip(text: str, max_tokens: int) -> str:
+    """``text`` cut to about ``max_tokens``, marked when cut."""
+    limit = max(0, max_tokens) * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + " [...]"
+
+
+def split_notes(output: str) -> tuple[str, list[str], list[str]]:
+    """(output without its notes, facts, decisions) of an agent output."""
+    match = _NOTES_HEADER.search(output)
+    if not match:
+        return output.strip(), [], []
+
+    notes: dict[str, list[str]] = {"FACTS": [], "DECISIONS": []}
+    section = None
+    for line in output[match.start():].splitlines():
+        header = _NOTES_HEADER.match(line)
+        if header:
+            section = header.group(1).upper()
+            continue
+        bullet = _BULLET.match(line)
+        if section and bullet:
+            notes[section].append(bullet.group(1))
+    return output[:match.start()].strip(), notes["FACTS"], notes["DECISIONS"]
+
+
+def _lead_sentences(text: str, count: int = 2) -> list[str]:
+    sentences = [s.strip() for s in _SENTENCE_END.split(text.strip(), maxsplit=count) if s.strip()]
+    return [clip(" ".join(sentences[:count]), 60)] if sentences else []
+
+
+@dataclass
+class Artifact:
+    ref: str
+    agent_name: str
+    role: str
+    content: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.content)
+
+
+@dataclass
+class CrewContext:
+    """Scratchpad and artifacts of one sequential crew run."""
+
+    budget_tokens: int = field(default_factory=lambda: settings.CREW_CONTEXT_BUDGET_TOKENS)
+    scratchpad_tokens: int = field(default_factory=lambda: settings.CREW_CONTEXT_SCRATCHPAD_TOKENS)
+    artifacts: list[Artifact] = field(default_factory=list)
+    # (kind, artifact ref, note), in the order they were recorded
+    notes: list[tuple[str, str, str]] = field(default_factory=list)
+
+    def record(self, agent_def: dict, output: str) -> str:
+        """Store an agent's output as the next artifact; returns it without its notes."""
+        body, facts, decisions = split_notes(output)
+        role = agent_def.get("role", "assistant")
+        ref = f"A{len(self.artifacts) + 1}"
+        self.artifacts.append(Artifact(ref, agent_def.get("name", role), role, body))
+
+        if not facts and not decisions:
+            facts = _lead_sentences(body)
+        self.notes += [("decision", ref, d) for d in decisions]
+        self.notes += [("fact", ref, f) for f in facts]
+        return body
+
+    def _scratchpad(self) -> str:
+        kept, used = [], 0
+        for i in range(len(self.notes) - 1, -1, -1):
+            kind, ref, note = self.notes[i]
+            line = f"- [{ref}] {note}"
+            cost = estimate_tokens(line) + 1
+            if used + cost > self.scratchpad_tokens:
+                break
+            kept.append((i, kind, line))
+            used += cost
+
+        sections = []
+        for kind, title in (("decision", "Decisions"), ("fact", "Facts")):
+            lines = [line for _, k, line in sorted(kept) if k == kind]
+            if lines:
+                sections.append(f"{title}:\n" + "\n".join(lines))
+        return "\n".join(sections)
+
+    def render(self, reads: bool = True) -> str:
+        """What the next agent sees of the earlier ones, within the budget."""
+        if not self.artifacts:
+            return "(You are the first agent)"
+
+        parts = []
+        scratchpad = self._scratchpad()
+        if scratchpad:
+            parts.append(f"Scratchpad:\n{scratchpad}")
+        header = "Earlier outputs (reply READ: <ids> for the full text):" if reads else "Earlier outputs:"
+        parts.append(header + "\n" + "\n".join(
+            f"- {a.ref}: {a.agent_name} ({a.role}), ~{a.tokens} tokens" for a in self.artifacts
+        ))
+
+        last = self.artifacts[-1]
+        remaining = self.budget_tokens - estimate_tokens("\n\n".join(parts))
+        parts.append(f"Previous output [{last.ref}] from {last.agent_name} ({last.role}):\n{clip(last.content, remaining)}")
+        return "\n\n".join(parts)
+
+    def read_request(self, output: str) -> list[str]:
+        """Artifact refs an agent asked for with ``READ:``, or [] for a regular output."""
+        lines = [line for line in output.strip().splitlines() if line.strip()]
+        if not lines or len(lines) > 2:
+            return []
+        match = _READ.match(lines[0])
+        if not match:
+            return []
+        refs = [f"A{n}" for n in dict.fromkeys(_REF.findall(match.group(1)))]
+        return [ref for ref in refs if self.artifact(ref) is not None]
+
+    def artifact(self, ref: str) -> Optional[Artifact]:
+        index = int(ref[1:]) - 1 if ref[1:].isdigit() else -1
+        return self.artifacts[index] if 0 <= index < len(self.artifacts) else None
+
+    def read(self, refs: list[str]) -> str:
+        """
+        The requested artifacts, sharing the budget.
+
+        Each is clipped to ``budget_tokens / len(refs)``: an artifact larger
+        than its share is not returned in full.
+        """
+        share = self.budget_tokens // max(len(refs), 1)
+        return "Requested earlier outputs:\n\n" + "\n\n".join(
+            f"[{a.ref}] {a.agent_name} ({a.role}):\n{clip(a.content, share)}"
+            for a in (self.artifact(ref) for ref in refs) if a is not None
+        )
+
+    def prompt(self, agent_def: dict, crew_goal: str, task: str, reads: bool = True) -> str:
+        """An agent's prompt; without ``reads`` it is not offered ``READ:``."""
+        instructions = AGENT_INSTRUCTIONS if reads else FINAL_INSTRUCTIONS
+        return agent_prompt(agent_def, crew_goal, task, self.render(reads), instructions)
+
+
+def agent_prompt(
+    agent_def: dict,
+    crew_goal: str,
+    task: str,
+    shared_context: str,
+    instructions: str = AGENT_INSTRUCTIONS,
+) -> str:
+    """The prompt of one crew agent (tool output is appended by the caller)."""
+    role = agent_def.get("role", "assistant")
+    name = agent_def.get("name", role)
+    goal = agent_def.get("goal", "")
+    backstory = agent_def.get("backstory", "")
+    tools = agent_def.get("tools", [])
+
+    return f"""You are {name}, a {role} agent in an AI crew.
+
+Crew Goal: {crew_goal}
+Your Goal: {goal}
+{f'Backstory: {backstory}' if backstory else ''}
+Available Tools: {', '.join(tools) if tools else 'none (text generation only)'}
+
+Previous agent outputs:
+{shared_context}
+
+Current task/context:
+{task[:8000]}
+
+{instructions}
+
+Respond with your output directly. Be thorough and specific."""
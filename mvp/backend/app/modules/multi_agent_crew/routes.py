@@ -2,6 +2,7 @@
 Multi-Agent Crew API routes - Create and run collaborative AI agent teams.
 """
 
+import asyncio
 import json
 from typing import Optional
 from uuid import UUID
@@ -11,6 +12,8 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
+from app.core import blob_store
+from app.core.run_supervisor import RunLimitExceeded
 from app.database import get_session
 from app.models.user import User
 from app.modules.multi_agent_crew.schemas import (
@@ -44,8 +47,8 @@ def _crew_to_read(crew) -> CrewRead:
     )
 
 
-def _run_to_read(run) -> CrewRunRead:
-    messages_data = json.loads(run.messages_json) if run.messages_json else []
+async def _run_to_read(run) -> CrewRunRead:
+    messages_data = await blob_store.load_json(run.messages_json, [])
     return CrewRunRead(
         id=run.id, crew_id=run.crew_id, user_id=run.user_id,
         status=run.status.value if hasattr(run.status, "value") else run.status,
@@ -156,20 +159,61 @@ async def delete_crew(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Crew not found")
 
 
-@router.post("/{crew_id}/run", response_model=CrewRunRead)
+@router.post("/{crew_id}/run", response_model=CrewRunRead, status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("3/minute")
 async def run_crew(
     request: Request, crew_id: UUID, body: CrewRunRequest,
     current_user: User = Depends(require_verified_email),
     session: AsyncSession = Depends(get_session),
 ):
-    """Run a crew with an instruction. Rate limit: 3/min"""
-    run = await MultiAgentCrewService.run_crew(
-        crew_id, current_user.id, body.instruction, session, body.input_data,
-    )
+    """
+    Run a crew with an instruction in the background.
+
+    Returns the run in the ``running`` state immediately; agent progress is
+    pushed over the user's WebSocket as ``crew_run_progress`` messages.
+    Poll ``GET /runs/{run_id}`` and cancel with ``POST /runs/{run_id}/cancel``.
+    429 when the user already has BACKGROUND_RUNS_MAX_PER_USER runs going.
+    Rate limit: 3/min
+    """
+    try:
+        run = await MultiAgentCrewService.start_crew(
+            crew_id, current_user.id, body.instruction, session, body.input_data,
+        )
+    except RunLimitExceeded as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
     if not run:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Crew not found")
-    return _run_to_read(run)
+    return await _run_to_read(run)
+
+
+@router.get("/runs/{run_id}", response_model=CrewRunRead)
+@limiter.limit("30/minute")
+async def get_run(
+    request: Request, run_id: UUID,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get a crew run with its messages. Rate limit: 30/min"""
+    run = await MultiAgentCrewService.get_run(run_id, current_user.id, session)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    return await _run_to_read(run)
+
+
+@router.post("/runs/{run_id}/cancel", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute")
+async def cancel_run(
+    request: Request, run_id: UUID,
+    current_user: User = Depends(require_verified_email),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Cancel a running crew run; it ends ``failed`` with the error
+    "Cancelled by user". Rate limit: 10/min
+    """
+    if not await MultiAgentCrewService.cancel_run(run_id, current_user.id, session):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot cancel this run")
+    return {"status": "cancelled"}
 
 
 @router.get("/{crew_id}/runs", response_model=list[CrewRunRead])
@@ -182,4 +226,4 @@ async def list_runs(
 ):
     """List crew runs. Rate limit: 20/min"""
     runs = await MultiAgentCrewService.list_runs(crew_id, current_user.id, session, skip, limit)
-    return [_run_to_read(r) for r in runs]
+    return list(await asyncio.gather(*(_run_to_read(r) for r in runs)))
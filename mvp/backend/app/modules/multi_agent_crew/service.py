@@ -17,7 +17,10 @@ from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.config import settings
+from app.core import blob_store, run_supervisor
 from app.models.multi_agent import Crew, CrewRun, CrewRunStatus, CrewStatus
+from app.modules.multi_agent_crew.context import SOLO_INSTRUCTIONS, CrewContext, agent_prompt
 
 logger = structlog.get_logger()
 
@@ -172,37 +175,151 @@ class MultiAgentCrewService:
         await session.commit()
         return True
 
+    @staticmethod
+    async def _create_run(
+        crew: Crew, user_id: UUID, instruction: str, session: AsyncSession,
+    ) -> CrewRun:
+        run = CrewRun(
+            crew_id=crew.id,
+            user_id=user_id,
+            status=CrewRunStatus.RUNNING,
+            instruction=instruction[:5000],
+            total_agents=len(json.loads(crew.agents_json)),
+            started_at=datetime.now(UTC),
+        )
+        session.add(run)
+        await session.commit()
+        await session.refresh(run)
+        return run
+
     @staticmethod
     async def run_crew(
         crew_id: UUID, user_id: UUID, instruction: str,
         session: AsyncSession, input_data: Optional[dict] = None,
     ) -> Optional[CrewRun]:
-        """Execute a crew by running agents sequentially or in parallel."""
+        """Execute a crew by running agents sequentially or in parallel, in the caller's session."""
         crew = await session.get(Crew, crew_id)
         if not crew or crew.user_id != user_id:
             return None
 
-        agents = json.loads(crew.agents_json)
-        start_time = time.monotonic()
+        run = await MultiAgentCrewService._create_run(crew, user_id, instruction, session)
+        return await MultiAgentCrewService._execute(run, crew, session, input_data)
 
-        run = CrewRun(
-            crew_id=crew_id,
-            user_id=user_id,
-            status=CrewRunStatus.RUNNING,
-            instruction=instruction[:5000],
-            total_agents=len(agents),
-            started_at=datetime.now(UTC),
-        )
+    @staticmethod
+    async def start_crew(
+        crew_id: UUID, user_id: UUID, instruction: str,
+        session: AsyncSession, input_data: Optional[dict] = None,
+    ) -> Optional[CrewRun]:
+        """
+        Create a run and execute it in the background (core.run_supervisor).
+
+        Returns the ``running`` run right away; raises RunLimitExceeded when
+        the user already has too many runs going.
+        """
+        crew = await session.get(Crew, crew_id)
+        if not crew or crew.user_id != user_id:
+            return None
+
+        with run_supervisor.reserve(user_id, "crew") as slot:
+            run = await MultiAgentCrewService._create_run(crew, user_id, instruction, session)
+            slot.start(
+                "crew", run.id, MultiAgentCrewService.execute_run(run.id, input_data),
+                on_cancelled=lambda: MultiAgentCrewService.record_cancelled(run.id),
+            )
+        return run
+
+    @staticmethod
+    async def execute_run(run_id: UUID, input_data: Optional[dict] = None) -> None:
+        """Background entry point: execute a created run in its own session."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            run = await session.get(CrewRun, run_id)
+            crew = await session.get(Crew, run.crew_id) if run else None
+            if not run or not crew:
+                return
+            await MultiAgentCrewService._execute(run, crew, session, input_data, supervised=True)
+
+    @staticmethod
+    async def record_cancelled(run_id: UUID) -> None:
+        """Mark a run cancelled before it started as ``failed`` with a cancellation error."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            run = await session.get(CrewRun, run_id)
+            if not run or run.status != CrewRunStatus.RUNNING:
+                return
+            run.status = CrewRunStatus.FAILED
+            run.error = run_supervisor.CANCELLED_ERROR
+            run.completed_at = datetime.now(UTC)
+            session.add(run)
+            await session.commit()
+
+    @staticmethod
+    async def cancel_run(run_id: UUID, user_id: UUID, session: AsyncSession) -> bool:
+        """Cancel a running crew run (it ends ``failed`` with a cancellation error)."""
+        run = await session.get(CrewRun, run_id)
+        if not run or run.user_id != user_id or run.status != CrewRunStatus.RUNNING:
+            return False
+
+        run.status = CrewRunStatus.FAILED
+        run.error = run_supervisor.CANCELLED_ERROR
+        run.completed_at = datetime.now(UTC)
         session.add(run)
         await session.commit()
-        await session.refresh(run)
+        # The run stops at its next agent if another process executes it
+        run_supervisor.cancel(run.id)
+        return True
+
+    @staticmethod
+    async def _cancel_requested(run_id: UUID, session: AsyncSession) -> bool:
+        status = (await session.execute(
+            select(CrewRun.status).where(CrewRun.id == run_id)
+        )).scalar_one_or_none()
+        return status != CrewRunStatus.RUNNING
+
+    @staticmethod
+    async def _notify(run: CrewRun, event: str, agent_def: Optional[dict] = None, **extra) -> None:
+        await run_supervisor.notify(run.user_id, "crew_run_progress", {
+            "run_id": str(run.id),
+            "crew_id": str(run.crew_id),
+            "event": event,
+            "status": run.status.value if hasattr(run.status, "value") else run.status,
+            "current_agent": run.current_agent,
+            "total_agents": run.total_agents,
+            "agent": {
+                "id": agent_def["id"], "role": agent_def["role"],
+                "name": agent_def.get("name", agent_def["role"]),
+            } if agent_def else None,
+            **extra,
+        })
+
+    @staticmethod
+    async def _execute(
+        run: CrewRun, crew: Crew, session: AsyncSession,
+        input_data: Optional[dict] = None, supervised: bool = False,
+    ) -> CrewRun:
+        """
+        Run the agents of ``crew`` for ``run``.
+
+        Progress is committed before every agent (sequential) or as agents
+        finish (parallel), so the session holds no connection while agents
+        work, and pushed to the owner's WebSocket as ``crew_run_progress``
+        events.  ``supervised`` sequential runs also stop when their row is
+        cancelled.  Sequential agents share a CrewContext rather than
+        replaying each other's outputs.
+        """
+        agents = json.loads(crew.agents_json)
+        user_id = run.user_id
+        start_time = time.monotonic()
 
         messages = []
-        context = instruction
+        context = run.instruction
         if input_data:
             context += f"\n\nInput data: {json.dumps(input_data, ensure_ascii=False)[:3000]}"
 
         total_tokens = 0
+        cancelled = False
 
         process_type = crew.process_type or "sequential"
         if process_type == "hierarchical":
@@ -224,42 +341,58 @@ class MultiAgentCrewService:
                     session=session,
                 )
             else:
+                crew_context = CrewContext()
                 for i, agent_def in enumerate(agents):
+                    if supervised and await MultiAgentCrewService._cancel_requested(run.id, session):
+                        cancelled = True
+                        break
+
                     run.current_agent = i + 1
                     session.add(run)
                     await session.commit()
+                    await MultiAgentCrewService._notify(run, "agent_started", agent_def)
 
                     agent_result = await MultiAgentCrewService._run_agent(
                         agent_def=agent_def,
                         context=context,
                         crew_goal=crew.goal or "",
-                        previous_messages=messages,
                         user_id=user_id,
+                        crew_context=crew_context,
                     )
 
                     msg = {
                         "agent_id": agent_def["id"],
                         "agent_name": agent_def.get("name", agent_def["role"]),
                         "role": agent_def["role"],
-                        "content": agent_result.get("output", ""),
+                        "content": crew_context.record(agent_def, agent_result.get("output", "")),
                         "tool_used": agent_result.get("tool_used"),
                         "iteration": agent_result.get("iterations", 1),
                         "timestamp": datetime.now(UTC).isoformat(),
                     }
                     messages.append(msg)
-                    context = agent_result.get("output", context)
                     total_tokens += agent_result.get("tokens", 0)
+                    await MultiAgentCrewService._notify(run, "agent_finished", agent_def)
 
-            run.status = CrewRunStatus.COMPLETED
-            run.final_output = messages[-1]["content"] if messages else ""
+            if supervised and not cancelled and await MultiAgentCrewService._cancel_requested(run.id, session):
+                # A cancel that landed during the last agent wins over its outcome
+                cancelled = True
+            if not cancelled:
+                run.status = CrewRunStatus.COMPLETED
+                run.final_output = messages[-1]["content"] if messages else ""
 
+        except asyncio.CancelledError:
+            cancelled = True
         except Exception as e:
             run.status = CrewRunStatus.FAILED
             run.error = str(e)[:2000]
             logger.error("crew_run_failed", run_id=str(run.id), error=str(e))
 
+        if cancelled:
+            run.status = CrewRunStatus.FAILED
+            run.error = run_supervisor.CANCELLED_ERROR
+
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
-        run.messages_json = json.dumps(messages, ensure_ascii=False)
+        run.messages_json = await blob_store.dump_json(messages)
         run.duration_ms = elapsed_ms
         run.tokens_used = total_tokens
         run.completed_at = datetime.now(UTC)
@@ -270,6 +403,7 @@ class MultiAgentCrewService:
 
         await session.commit()
         await session.refresh(run)
+        await MultiAgentCrewService._notify(run, "finished", error=run.error)
 
         logger.info(
             "crew_run_finished", run_id=str(run.id),
@@ -296,7 +430,6 @@ class MultiAgentCrewService:
                     agent_def=agent_def,
                     context=context,
                     crew_goal=crew_goal,
-                    previous_messages=[],
                     user_id=user_id,
                 )
                 return {"ok": True, "agent_def": agent_def, "result": result}
@@ -313,6 +446,7 @@ class MultiAgentCrewService:
                     run.current_agent = completed_count
                     session.add(run)
                     await session.commit()
+                await MultiAgentCrewService._notify(run, "agent_finished", agent_def)
 
         raw_results = await asyncio.gather(*[_safe_run(a) for a in agents])
 
@@ -344,52 +478,28 @@ class MultiAgentCrewService:
 
     @staticmethod
     async def _run_agent(
-        agent_def: dict, context: str, crew_goal: str,
-        previous_messages: list[dict], user_id: UUID,
+        agent_def: dict, context: str, crew_goal: str, user_id: UUID,
+        crew_context: Optional[CrewContext] = None,
     ) -> dict:
-        """Run a single agent with its tools and persona."""
+        """
+        Run a single agent with its tools and persona.
+
+        With a ``crew_context`` the agent sees the earlier agents through it
+        and may ask for earlier outputs (``READ: A1``), each request costing
+        one of its ``max_iterations``; its last call does not offer READ.
+        """
+        from app.ai_assistant.long_text import estimate_tokens
         from app.ai_assistant.service import AIAssistantService
 
-        role = agent_def.get("role", "assistant")
-        name = agent_def.get("name", role)
-        goal = agent_def.get("goal", "")
-        backstory = agent_def.get("backstory", "")
         tools = agent_def.get("tools", [])
         provider = agent_def.get("provider", "gemini")
         max_iter = agent_def.get("max_iterations", 3)
 
-        # Build conversation history from previous agents
-        history = ""
-        if previous_messages:
-            history = "\n\n".join(
-                f"[{m['agent_name']} ({m['role']})]:\n{m['content'][:2000]}"
-                for m in previous_messages[-5:]
-            )
-
-        # Build tool descriptions
-        tool_descriptions = []
-        for tool in tools:
-            tool_descriptions.append(f"- {tool}")
-
-        prompt = f"""You are {name}, a {role} agent in an AI crew.
-
-Crew Goal: {crew_goal}
-Your Goal: {goal}
-{f'Backstory: {backstory}' if backstory else ''}
-Available Tools: {', '.join(tools) if tools else 'none (text generation only)'}
-
-Previous agent outputs:
-{history if history else '(You are the first agent)'}
-
-Current task/context:
-{context[:8000]}
-
-Instructions:
-1. Analyze the context and previous agent outputs
-2. Execute your role to achieve your goal
-3. Produce a clear, comprehensive output for the next agent
-
-Respond with your output directly. Be thorough and specific."""
+        reads = crew_context is not None and max_iter > 1
+        if crew_context is not None:
+            prompt = crew_context.prompt(agent_def, crew_goal, context, reads)
+        else:
+            prompt = agent_prompt(agent_def, crew_goal, context, "(You are the first agent)", SOLO_INSTRUCTIONS)
 
         # Execute with tool usage if needed
         tool_used = None
@@ -401,7 +511,9 @@ Respond with your output directly. Be thorough and specific."""
                 urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', context)
                 if urls:
                     from app.modules.web_crawler.service import WebCrawlerService
-                    result = await WebCrawlerService.scrape(url=urls[0], extract_images=False)
+                    result = await WebCrawlerService.scrape(
+                        url=urls[0], extract_images=False, max_age=settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS,
+                    )
                     if result.get("success"):
                         tool_output = f"\n\n[Web Research from {urls[0]}]:\n{result.get('markdown', '')[:4000]}"
                         tool_used = "crawl_web"
@@ -434,20 +546,33 @@ Respond with your output directly. Be thorough and specific."""
                 pass
 
         full_prompt = prompt + tool_output
-
-        result = await AIAssistantService.process_text_with_provider(
-            text=full_prompt,
-            task="agent",
-            provider_name=provider,
-            user_id=user_id,
-            module="multi_agent_crew",
-        )
+        iterations, tokens = 0, 0
+        while True:
+            iterations += 1
+            result = await AIAssistantService.process_text_with_provider(
+                text=full_prompt,
+                task="agent",
+                provider_name=provider,
+                user_id=user_id,
+                module="multi_agent_crew",
+            )
+            output = result.get("processed_text", "")
+            tokens += estimate_tokens(full_prompt) + estimate_tokens(output)
+
+            refs = crew_context.read_request(output) if reads else []
+            if not refs:
+                break
+            if iterations + 1 >= max_iter:
+                # The next call is the last one: the agent has to answer
+                reads = False
+                prompt = crew_context.prompt(agent_def, crew_goal, context, reads)
+            full_prompt = f"{prompt}{tool_output}\n\n{crew_context.read(refs)}"
 
         return {
-            "output": result.get("processed_text", ""),
+            "output": output,
             "tool_used": tool_used,
-            "iterations": 1,
-            "tokens": 0,
+            "iterations": iterations,
+            "tokens": tokens,
         }
 
     @staticmethod
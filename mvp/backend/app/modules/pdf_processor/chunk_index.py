@@ -0,0 +1,309 @@
+"""
+Persisted retrieval index for one PDF.
+
+Built once when a PDF is uploaded (or its text replaced by OCR) and stored
+as ``index.json`` next to the uploaded file:
+
+- chunks: paragraph chunks of each page (CHUNK_SIZE chars, CHUNK_OVERLAP
+  overlap), with their page number
+- TF-IDF weights and norm per chunk, idf computed over the chunks
+- terms: the document's top terms
+- representative: chunk indices ordered by similarity to the whole document
+- embeddings: one vector per chunk when the embedding service is available,
+  and the name of the model that produced them
+
+RAG queries, keyword extraction and comparison read the index instead of
+re-chunking ``text_content`` and recomputing vectors on every call.  PDFs
+uploaded before the index existed get one built on first use.
+"""
+
+import asyncio
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Optional
+
+import structlog
+
+from app.core import blob_store
+
+logger = structlog.get_logger()
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "index.json"
+
+# Chunking config for RAG
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+TOP_TERMS = 50
+
+_STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has have his how its may "
+    "new now old see two who did get let put say she too use that this with from they will "
+    "would there their what about which when were been than them then these some into more "
+    "also only other such each most over very your should could between after before while "
+    "les des une est pour dans par sur pas que qui aux avec sont ont mais plus ses ces leur "
+    "nous vous elle ils elles cette comme tout tous".split()
+)
+
+
+def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split text into overlapping chunks for RAG (same pattern as knowledge module)."""
+    if not text.strip():
+        return []
+
+    paragraphs = re.split(r'\n\s*\n', text)
+    chunks = []
+    current_chunk = ""
+
+    for para in paragraphs:
+        para = para.strip()
+        if not para:
+            continue
+
+        if len(current_chunk) + len(para) <= chunk_size:
+            current_chunk += ("\n\n" + para) if current_chunk else para
+        else:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            if overlap > 0 and current_chunk:
+                overlap_text = current_chunk[-overlap:]
+                current_chunk = overlap_text + "\n\n" + para
+            else:
+                current_chunk = para
+
+    if current_chunk.strip():
+        chunks.append(current_chunk.strip())
+
+    return chunks if chunks else [text.strip()[:chunk_size]]
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def _tf(tokens: list[str]) -> dict[str, float]:
+    counts = Counter(tokens)
+    total = len(tokens)
+    return {term: count / total for term, count in counts.items()} if total > 0 else {}
+
+
+def _norm(vec: dict[str, float]) -> float:
+    return math.sqrt(sum(v * v for v in vec.values()))
+
+
+def _is_term(term: str) -> bool:
+    return len(term) >= 3 and not term.isdigit() and term not in _STOPWORDS
+
+
+# ---------------------------------------------------------------------------
+# Build / persist
+# ---------------------------------------------------------------------------
+
+def build(text: str, pages: Optional[list[dict]] = None) -> dict[str, Any]:
+    """Chunk and weight a document (CPU-bound; call it off the event loop)."""
+    chunks: list[dict[str, Any]] = []
+    if pages and any((p.get("text") or "").strip() for p in pages):
+        for page in pages:
+            for piece in chunk_text(page.get("text") or ""):
+                chunks.append({"text": piece, "page": page.get("page_number")})
+    else:
+        chunks = [{"text": piece, "page": None} for piece in chunk_text(text)]
+
+    term_freqs = [_tf(tokenize(chunk["text"])) for chunk in chunks]
+    df = Counter(term for tf in term_freqs for term in tf)
+    n = len(chunks)
+    idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+    centroid: Counter = Counter()
+    term_scores: Counter = Counter()
+    for chunk, tf in zip(chunks, term_freqs):
+        weights = {term: round(value * idf[term], 6) for term, value in tf.items()}
+        norm = _norm(weights)
+        chunk["weights"] = weights
+        chunk["norm"] = round(norm, 6)
+        if norm:
+            for term, weight in weights.items():
+                centroid[term] += weight / norm
+                if _is_term(term):
+                    term_scores[term] += weight / norm
+
+    centroid_norm = _norm(centroid) or 1.0
+
+    def centrality(i: int) -> float:
+        chunk = chunks[i]
+        if not chunk["norm"]:
+            return 0.0
+        dot = sum(weight * centroid[term] for term, weight in chunk["weights"].items())
+        return dot / (chunk["norm"] * centroid_norm)
+
+    return {
+        "version": INDEX_VERSION,
+        "chunks": chunks,
+        "idf": {term: round(value, 6) for term, value in idf.items()},
+        "terms": [term for term, _ in term_scores.most_common(TOP_TERMS)],
+        "representative": sorted(range(n), key=centrality, reverse=True),
+        "embeddings": None,
+        "embedding_model": None,
+    }
+
+
+async def embed(index: dict[str, Any]) -> None:
+    """Attach chunk embeddings when the embedding service is available."""
+    from app.modules.knowledge import embedding_service
+
+    texts = [chunk["text"] for chunk in index["chunks"]]
+    if not texts or not await asyncio.to_thread(embedding_service.is_available):
+        return
+    model = embedding_service.get_model_name()
+    try:
+        embeddings = await asyncio.to_thread(embedding_service.embed_texts, texts, model)
+    except Exception as e:
+        logger.warning("pdf_index_embedding_failed", error=str(e))
+        return
+    if embeddings and all(e is not None for e in embeddings):
+        index["embeddings"] = [[round(float(v), 6) for v in e] for e in embeddings]
+        index["embedding_model"] = model
+
+
+async def refresh_embeddings(file_path: Optional[str], index: dict[str, Any], model: str) -> None:
+    """Re-embed and store an index whose embeddings were made by another model."""
+    if not index.get("embeddings") or index.get("embedding_model") == model:
+        return
+    logger.info("pdf_index_reembedding", stored_model=index.get("embedding_model"), model=model)
+    await embed(index)
+    if index.get("embedding_model") == model:
+        await save(file_path, index)
+
+
+def path_for(file_path: Optional[str]) -> Optional[str]:
+    return os.path.join(os.path.dirname(file_path), INDEX_FILENAME) if file_path else None
+
+
+def _write(path: str, index: dict[str, Any]) -> None:
+    # Unique per writer: concurrent builds of the same PDF's index must not
+    # share a temp file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _read(path: str) -> Optional[dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+async def save(file_path: Optional[str], index: dict[str, Any]) -> None:
+    path = path_for(file_path)
+    if path and os.path.isdir(os.path.dirname(path)):
+        await asyncio.to_thread(_write, path, index)
+
+
+async def create(
+    file_path: Optional[str],
+    text: str,
+    pages: Optional[list[dict]] = None,
+    with_embeddings: bool = True,
+) -> dict[str, Any]:
+    """Build, embed and store the index for a PDF."""
+    index = await asyncio.to_thread(build, text, pages)
+    if with_embeddings:
+        await embed(index)
+    await save(file_path, index)
+    return index
+
+
+async def for_document(doc: Any) -> dict[str, Any]:
+    """The stored index of a PDFDocument, built (without embeddings) if missing."""
+    path = path_for(doc.file_path)
+    index = await asyncio.to_thread(_read, path) if path else None
+    if index is None:
+        pages = await blob_store.load_json(doc.pages_json)
+        text = await blob_store.load(doc.text_content)
+        index = await create(doc.file_path, text or "", pages, with_embeddings=False)
+        logger.info("pdf_index_built_lazily", pdf_id=str(doc.id), chunks=len(index["chunks"]))
+    return index
+
+
+# ---------------------------------------------------------------------------
+# Retrieval
+# ---------------------------------------------------------------------------
+
+def _dense_cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _comparable_embeddings(
+    index: dict[str, Any],
+    query_embedding: Optional[list[float]],
+    query_model: Optional[str],
+) -> Optional[list[list[float]]]:
+    """The index's embeddings if ``query_embedding`` is in the same space."""
+    embeddings = index.get("embeddings")
+    if query_embedding is None or not embeddings:
+        return None
+    if query_model != index.get("embedding_model") or len(query_embedding) != len(embeddings[0]):
+        logger.warning(
+            "pdf_index_embedding_mismatch",
+            index_model=index.get("embedding_model"), query_model=query_model,
+            index_dim=len(embeddings[0]), query_dim=len(query_embedding),
+        )
+        return None
+    return embeddings
+
+
+def search(
+    index: dict[str, Any],
+    question: str,
+    top_k: int = 5,
+    query_embedding: Optional[list[float]] = None,
+    query_model: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    Top chunks for ``question``: TF-IDF cosine, averaged with embedding
+    cosine when both the index and the question have embeddings from the
+    same model (``query_model``) and of the same dimension.
+    """
+    idf = index["idf"]
+    query = {term: value * idf[term] for term, value in _tf(tokenize(question)).items() if term in idf}
+    query_norm = _norm(query)
+    embeddings = _comparable_embeddings(index, query_embedding, query_model)
+
+    scored = []
+    for i, chunk in enumerate(index["chunks"]):
+        sparse = 0.0
+        if query_norm and chunk["norm"]:
+            weights = chunk["weights"]
+            dot = sum(value * weights[term] for term, value in query.items() if term in weights)
+            sparse = dot / (query_norm * chunk["norm"])
+        score = (sparse + max(0.0, _dense_cosine(query_embedding, embeddings[i]))) / 2 if embeddings else sparse
+        if score > 0:
+            scored.append({"index": i, "text": chunk["text"], "page": chunk["page"], "score": round(score, 4)})
+
+    scored.sort(key=lambda x: x["score"], reverse=True)
+    return scored[:top_k]
+
+
+def representative_text(index: dict[str, Any], max_chars: int) -> str:
+    """The most central chunks up to ``max_chars``, in document order."""
+    chosen = []
+    used = 0
+    for i in index["representative"]:
+        size = len(index["chunks"][i]["text"]) + 2
+        if used + size > max_chars:
+            if chosen:
+                continue
+            return index["chunks"][i]["text"][:max_chars]
+        chosen.append(i)
+        used += size
+    return "\n\n".join(index["chunks"][i]["text"] for i in sorted(chosen))
@@ -0,0 +1,252 @@
+"""
+Off-loop PDF text extraction and OCR.
+
+Parsing and OCR are CPU-bound, so they run in a process pool
+(PDF_WORKER_PROCESSES) instead of on the event loop.  A document is split
+into ranges of PDF_PAGES_PER_TASK pages (PDF_OCR_PAGES_PER_TASK for OCR)
+which are processed in parallel; ``progress`` (sync or async) receives
+``{"stage", "pages_done", "pages_total"}`` as each range finishes.
+
+Workers are spawned rather than forked so they never inherit the event
+loop, its threads or open connections.
+"""
+
+import asyncio
+import inspect
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, Union
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+ProgressCallback = Callable[[dict[str, Any]], Union[None, Awaitable[None]]]
+
+try:
+    import fitz  # PyMuPDF
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+try:
+    import pytesseract
+    from PIL import Image
+    HAS_TESSERACT = True
+except ImportError:
+    HAS_TESSERACT = False
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _worker_count() -> int:
+    return settings.PDF_WORKER_PROCESSES or min(4, os.cpu_count() or 1)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=_worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown() -> None:
+    """Stop the worker processes (application shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def report_progress(progress: Optional[ProgressCallback], event: dict[str, Any]) -> None:
+    if progress is None:
+        return
+    try:
+        result = progress(event)
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.debug("pdf_progress_failed", error=str(e))
+
+
+def _ranges(num_pages: int, per_task: int) -> list[tuple[int, int]]:
+    per_task = max(1, per_task)
+    return [(start, min(start + per_task, num_pages)) for start in range(0, num_pages, per_task)]
+
+
+# ---------------------------------------------------------------------------
+# Worker functions (run in the pool; module-level so they can be pickled)
+# ---------------------------------------------------------------------------
+
+def _pymupdf_info(file_path: str) -> dict:
+    doc = fitz.open(file_path)
+    try:
+        meta = doc.metadata or {}
+        return {
+            "num_pages": len(doc),
+            "metadata": {
+                "author": meta.get("author", ""),
+                "title": meta.get("title", ""),
+                "subject": meta.get("subject", ""),
+                "creator": meta.get("creator", ""),
+                "producer": meta.get("producer", ""),
+                "creation_date": meta.get("creationDate", ""),
+                "modification_date": meta.get("modDate", ""),
+                "engine": "pymupdf",
+            },
+        }
+    finally:
+        doc.close()
+
+
+def _pymupdf_pages(file_path: str, start: int, end: int) -> list[dict]:
+    doc = fitz.open(file_path)
+    try:
+        pages = []
+        for page_num in range(start, end):
+            page = doc[page_num]
+            pages.append({
+                "page_number": page_num + 1,
+                "text": page.get_text("text"),
+                "width": page.rect.width,
+                "height": page.rect.height,
+                "images": len(page.get_images(full=True)),
+            })
+        return pages
+    finally:
+        doc.close()
+
+
+def _pdfplumber_info(file_path: str) -> dict:
+    with pdfplumber.open(file_path) as pdf:
+        meta = pdf.metadata or {}
+        return {
+            "num_pages": len(pdf.pages),
+            "metadata": {
+                "author": meta.get("Author", ""),
+                "title": meta.get("Title", ""),
+                "creator": meta.get("Creator", ""),
+                "creation_date": meta.get("CreationDate", ""),
+                "engine": "pdfplumber",
+            },
+        }
+
+
+def _pdfplumber_pages(file_path: str, start: int, end: int) -> list[dict]:
+    pages = []
+    with pdfplumber.open(file_path) as pdf:
+        for i in range(start, end):
+            page = pdf.pages[i]
+            pages.append({
+                "page_number": i + 1,
+                "text": page.extract_text() or "",
+                "width": page.width,
+                "height": page.height,
+            })
+    return pages
+
+
+def _ocr_pages(file_path: str, start: int, end: int, dpi: int) -> list[dict]:
+    doc = fitz.open(file_path)
+    try:
+        pages = []
+        matrix = fitz.Matrix(dpi / 72, dpi / 72)
+        for i in range(start, end):
+            pix = doc[i].get_pixmap(matrix=matrix)
+            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+            pages.append({"page_number": i + 1, "text": pytesseract.image_to_string(img)})
+        return pages
+    finally:
+        doc.close()
+
+
+def _page_count(file_path: str) -> int:
+    doc = fitz.open(file_path)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+# ---------------------------------------------------------------------------
+# Async API
+# ---------------------------------------------------------------------------
+
+async def _run_ranges(
+    stage: str,
+    fn: Any,
+    file_path: str,
+    num_pages: int,
+    per_task: int,
+    progress: Optional[ProgressCallback],
+    *extra: Any,
+) -> list[dict]:
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    futures = [
+        loop.run_in_executor(pool, fn, file_path, start, end, *extra)
+        for start, end in _ranges(num_pages, per_task)
+    ]
+    pages: list[dict] = []
+    try:
+        for future in asyncio.as_completed(futures):
+            pages.extend(await future)
+            await report_progress(progress, {"stage": stage, "pages_done": len(pages), "pages_total": num_pages})
+    finally:
+        for future in futures:
+            future.cancel()
+    pages.sort(key=lambda p: p["page_number"])
+    return pages
+
+
+async def extract(file_path: str, progress: Optional[ProgressCallback] = None) -> dict:
+    """
+    Extract text, metadata and page info with the best available engine.
+
+    Returns ``{"text", "pages", "num_pages", "metadata"}``; raises
+    RuntimeError when neither PyMuPDF nor pdfplumber is installed.
+    """
+    if HAS_PYMUPDF:
+        info_fn, pages_fn = _pymupdf_info, _pymupdf_pages
+    elif HAS_PDFPLUMBER:
+        info_fn, pages_fn = _pdfplumber_info, _pdfplumber_pages
+    else:
+        raise RuntimeError("No PDF parser available. Install PyMuPDF or pdfplumber.")
+
+    loop = asyncio.get_running_loop()
+    info = await loop.run_in_executor(_get_pool(), info_fn, file_path)
+    pages = await _run_ranges(
+        "extract", pages_fn, file_path, info["num_pages"], settings.PDF_PAGES_PER_TASK, progress,
+    )
+
+    metadata = info["metadata"]
+    if HAS_PYMUPDF:
+        metadata["images_count"] = sum(page.pop("images", 0) for page in pages)
+    return {
+        "text": "\n\n".join(page["text"] for page in pages).strip(),
+        "pages": pages,
+        "num_pages": len(pages),
+        "metadata": metadata,
+    }
+
+
+async def ocr(file_path: str, progress: Optional[ProgressCallback] = None) -> list[dict]:
+    """OCR every page (PyMuPDF rendering + Tesseract); returns ``[{"page_number", "text"}]``."""
+    loop = asyncio.get_running_loop()
+    num_pages = await loop.run_in_executor(_get_pool(), _page_count, file_path)
+    return await _run_ranges(
+        "ocr", _ocr_pages, file_path, num_pages, settings.PDF_OCR_PAGES_PER_TASK, progress,
+        settings.PDF_OCR_DPI,
+    )
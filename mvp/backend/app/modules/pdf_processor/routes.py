@@ -4,14 +4,17 @@ PDF Processor API routes - PDF upload, parsing, AI summarization, RAG queries, a
 
 import json
 import os
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
+from app.core import blob_store
+from app.core.pagination import InvalidCursor
 from app.database import get_session
 from app.models.user import User
 from app.modules.pdf_processor.schemas import (
@@ -31,6 +34,16 @@ router = APIRouter()
 MAX_PDF_SIZE = 50 * 1024 * 1024  # 50 MB
 
 
+def _progress_sender(user_id: str):
+    """Push extraction/OCR progress over the user's WebSocket."""
+    from app.core.websocket_manager import build_message, manager
+
+    async def _progress(event: dict) -> None:
+        await manager.send_personal(user_id, build_message("pdf_processing_progress", event, user_id=user_id))
+
+    return _progress
+
+
 def _doc_to_upload_response(doc) -> dict:
     """Convert a PDFDocument to upload response dict."""
     return {
@@ -44,9 +57,8 @@ def _doc_to_upload_response(doc) -> dict:
     }
 
 
-def _doc_to_read(doc) -> dict:
-    """Convert a PDFDocument to full read dict."""
-    pages = json.loads(doc.pages_json) if doc.pages_json else []
+def _doc_to_read(doc, text: Optional[str], pages: list) -> dict:
+    """Convert a PDFDocument (and its loaded text and pages) to full read dict."""
     metadata = json.loads(doc.metadata_json) if doc.metadata_json else {}
     keywords = json.loads(doc.keywords_json) if doc.keywords_json else []
     return {
@@ -55,7 +67,7 @@ def _doc_to_read(doc) -> dict:
         "filename": doc.original_filename,
         "num_pages": doc.num_pages,
         "file_size_kb": doc.file_size_kb,
-        "text_content": doc.text_content,
+        "text_content": text,
         "pages": pages,
         "metadata": metadata,
         "summary": doc.summary,
@@ -79,6 +91,8 @@ async def upload_pdf(
 
     Extracts text, metadata, and page information.
     Supports PyMuPDF (preferred) and pdfplumber engines.
+    Progress is pushed over the user's WebSocket as
+    ``pdf_processing_progress`` messages.
 
     Rate limit: 5 requests/minute
     """
@@ -105,6 +119,7 @@ async def upload_pdf(
         file_content=content,
         filename=safe_filename,
         session=session,
+        progress=_progress_sender(str(current_user.id)),
     )
     return _doc_to_upload_response(doc)
 
@@ -113,16 +128,29 @@ async def upload_pdf(
 @limiter.limit("30/minute")
 async def list_pdfs(
     request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of items to skip (ignored with cursor)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """
     List all PDFs for the current user.
 
+    The cursor of the next page is returned in the ``X-Next-Cursor`` header.
+
     Rate limit: 30 requests/minute
     """
-    docs = await PDFProcessorService.list_pdfs(current_user.id, session)
-    return [_doc_to_upload_response(d) for d in docs]
+    try:
+        page = await PDFProcessorService.list_pdfs(
+            current_user.id, session, skip=skip, limit=limit, cursor=cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [_doc_to_upload_response(d) for d in page.items]
 
 
 @router.get("/{pdf_id}", response_model=PDFRead)
@@ -141,7 +169,28 @@ async def get_pdf(
     doc = await PDFProcessorService.get_pdf(current_user.id, pdf_id, session)
     if not doc:
         raise HTTPException(status_code=404, detail="PDF not found")
-    return _doc_to_read(doc)
+    return _doc_to_read(
+        doc, await blob_store.load(doc.text_content), await blob_store.load_json(doc.pages_json, []),
+    )
+
+
+@router.get("/{pdf_id}/pages")
+@limiter.limit("30/minute")
+async def get_pdf_pages(
+    request: Request,
+    pdf_id: UUID,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Stream the extracted pages of a PDF as a JSON array.
+
+    Rate limit: 30 requests/minute
+    """
+    doc = await PDFProcessorService.get_pdf(current_user.id, pdf_id, session)
+    if not doc:
+        raise HTTPException(status_code=404, detail="PDF not found")
+    return StreamingResponse(blob_store.stream(doc.pages_json or "[]"), media_type="application/json")
 
 
 @router.delete("/{pdf_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -315,10 +364,14 @@ async def ocr_pdf(
     OCR a scanned PDF to extract text from images.
 
     Requires pytesseract and Tesseract-OCR to be installed.
+    Progress is pushed over the user's WebSocket as
+    ``pdf_processing_progress`` messages.
 
     Rate limit: 5 requests/minute
     """
-    result = await PDFProcessorService.ocr_pdf(current_user.id, pdf_id, session)
+    result = await PDFProcessorService.ocr_pdf(
+        current_user.id, pdf_id, session, progress=_progress_sender(str(current_user.id)),
+    )
     if result is None:
         raise HTTPException(status_code=404, detail="PDF not found")
     if result.get("error"):
@@ -5,23 +5,29 @@ PDF parsing engines (auto-detected):
 - PyMuPDF (fitz) - fast, full-featured (preferred)
 - pdfplumber - Python-native fallback
 - OCR via pytesseract for scanned PDFs (optional)
+
+Parsing and OCR run in worker processes (pdf_processor.extraction); the
+chunk index used for queries is built at upload (pdf_processor.chunk_index).
 """
 
+import asyncio
 import json
-import math
 import os
-import re
 import shutil
-from collections import Counter
 from datetime import UTC, datetime
 from typing import Optional
 from uuid import UUID
 
 import structlog
+from sqlalchemy.orm import defer
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import blob_store, pagination
+from app.core.pagination import Page
 from app.models.pdf_processor import PDFDocument, PDFStatus
+from app.modules.pdf_processor import chunk_index, extraction
+from app.modules.pdf_processor.extraction import ProgressCallback
 
 logger = structlog.get_logger()
 
@@ -38,158 +44,17 @@ try:
 except ImportError:
     HAS_PDFPLUMBER = False
 
-try:
-    import pytesseract
-    from PIL import Image
-    HAS_TESSERACT = True
-except ImportError:
-    HAS_TESSERACT = False
+# OCR runs in the extraction worker processes
+HAS_TESSERACT = extraction.HAS_TESSERACT
 
 # Upload directory
 UPLOAD_DIR = os.environ.get("UPLOAD_DIR", os.path.join(os.path.dirname(__file__), "..", "..", "..", "uploads"))
 MAX_PDF_SIZE = 50 * 1024 * 1024  # 50 MB
 
-# Chunking config for RAG
-CHUNK_SIZE = 500
-CHUNK_OVERLAP = 50
-
 
 class PDFProcessorService:
     """Service for PDF processing, AI analysis, and RAG queries."""
 
-    # ------------------------------------------------------------------
-    # Text chunking (same pattern as knowledge module)
-    # ------------------------------------------------------------------
-
-    @staticmethod
-    def _chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
-        """Split text into overlapping chunks for RAG."""
-        if not text.strip():
-            return []
-
-        paragraphs = re.split(r'\n\s*\n', text)
-        chunks = []
-        current_chunk = ""
-
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
-
-            if len(current_chunk) + len(para) <= chunk_size:
-                current_chunk += ("\n\n" + para) if current_chunk else para
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                if overlap > 0 and current_chunk:
-                    overlap_text = current_chunk[-overlap:]
-                    current_chunk = overlap_text + "\n\n" + para
-                else:
-                    current_chunk = para
-
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-
-        return chunks if chunks else [text.strip()[:chunk_size]]
-
-    @staticmethod
-    def _tokenize(text: str) -> list[str]:
-        return re.findall(r'[a-z0-9]+', text.lower())
-
-    @staticmethod
-    def _compute_tf(tokens: list[str]) -> dict[str, float]:
-        counts = Counter(tokens)
-        total = len(tokens)
-        return {term: count / total for term, count in counts.items()} if total > 0 else {}
-
-    @staticmethod
-    def _cosine_similarity(vec_a: dict[str, float], vec_b: dict[str, float]) -> float:
-        common = set(vec_a.keys()) & set(vec_b.keys())
-        if not common:
-            return 0.0
-        dot_product = sum(vec_a[t] * vec_b[t] for t in common)
-        norm_a = math.sqrt(sum(v ** 2 for v in vec_a.values()))
-        norm_b = math.sqrt(sum(v ** 2 for v in vec_b.values()))
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot_product / (norm_a * norm_b)
-
-    # ------------------------------------------------------------------
-    # PDF parsing engines
-    # ------------------------------------------------------------------
-
-    @staticmethod
-    def _extract_with_pymupdf(file_path: str) -> dict:
-        """Extract text, metadata, and page info using PyMuPDF (fitz)."""
-        doc = fitz.open(file_path)
-        pages = []
-        full_text = ""
-        images_count = 0
-
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_text = page.get_text("text")
-            pages.append({
-                "page_number": page_num + 1,
-                "text": page_text,
-                "width": page.rect.width,
-                "height": page.rect.height,
-            })
-            full_text += page_text + "\n\n"
-            images_count += len(page.get_images(full=True))
-
-        meta = doc.metadata or {}
-        metadata = {
-            "author": meta.get("author", ""),
-            "title": meta.get("title", ""),
-            "subject": meta.get("subject", ""),
-            "creator": meta.get("creator", ""),
-            "producer": meta.get("producer", ""),
-            "creation_date": meta.get("creationDate", ""),
-            "modification_date": meta.get("modDate", ""),
-            "images_count": images_count,
-            "engine": "pymupdf",
-        }
-
-        doc.close()
-        return {
-            "text": full_text.strip(),
-            "pages": pages,
-            "num_pages": len(pages),
-            "metadata": metadata,
-        }
-
-    @staticmethod
-    def _extract_with_pdfplumber(file_path: str) -> dict:
-        """Extract text and page info using pdfplumber (fallback)."""
-        pages = []
-        full_text = ""
-
-        with pdfplumber.open(file_path) as pdf:
-            metadata = {
-                "author": pdf.metadata.get("Author", "") if pdf.metadata else "",
-                "title": pdf.metadata.get("Title", "") if pdf.metadata else "",
-                "creator": pdf.metadata.get("Creator", "") if pdf.metadata else "",
-                "creation_date": pdf.metadata.get("CreationDate", "") if pdf.metadata else "",
-                "engine": "pdfplumber",
-            }
-            for i, page in enumerate(pdf.pages):
-                page_text = page.extract_text() or ""
-                pages.append({
-                    "page_number": i + 1,
-                    "text": page_text,
-                    "width": page.width,
-                    "height": page.height,
-                })
-                full_text += page_text + "\n\n"
-
-        return {
-            "text": full_text.strip(),
-            "pages": pages,
-            "num_pages": len(pages),
-            "metadata": metadata,
-        }
-
     @staticmethod
     def _get_file_dir(user_id: UUID, pdf_id: UUID) -> str:
         """Get the storage directory for a PDF."""
@@ -207,8 +72,14 @@ class PDFProcessorService:
         file_content: bytes,
         filename: str,
         session: AsyncSession,
+        progress: Optional[ProgressCallback] = None,
     ) -> PDFDocument:
-        """Upload and parse a PDF file."""
+        """Upload and parse a PDF file, then build its chunk index.
+
+        ``progress`` (sync or async) receives ``{"pdf_id", "stage",
+        "pages_done", "pages_total"}`` per parsed page range and
+        ``{"pdf_id", "stage": "indexed", "chunks"}`` at the end.
+        """
         pdf_doc = PDFDocument(
             user_id=user_id,
             original_filename=filename,
@@ -225,19 +96,19 @@ class PDFProcessorService:
             raise ValueError("Invalid filename after sanitization")
         file_path = os.path.join(file_dir, filename)
 
+        async def _progress(event: dict) -> None:
+            await extraction.report_progress(progress, {"pdf_id": str(pdf_doc.id), **event})
+
         try:
             # Save file to disk
-            with open(file_path, "wb") as f:
-                f.write(file_content)
+            def _save() -> None:
+                with open(file_path, "wb") as f:
+                    f.write(file_content)
 
+            await asyncio.to_thread(_save)
             pdf_doc.file_path = file_path
 
-            # Extract text using best available engine
-            if HAS_PYMUPDF:
-                extracted = PDFProcessorService._extract_with_pymupdf(file_path)
-            elif HAS_PDFPLUMBER:
-                extracted = PDFProcessorService._extract_with_pdfplumber(file_path)
-            else:
+            if not (extraction.HAS_PYMUPDF or extraction.HAS_PDFPLUMBER):
                 pdf_doc.status = PDFStatus.FAILED
                 pdf_doc.metadata_json = json.dumps({"error": "No PDF parser available. Install PyMuPDF or pdfplumber."})
                 session.add(pdf_doc)
@@ -245,18 +116,24 @@ class PDFProcessorService:
                 await session.refresh(pdf_doc)
                 return pdf_doc
 
-            pdf_doc.text_content = extracted["text"]
-            pdf_doc.pages_json = json.dumps(extracted["pages"], ensure_ascii=False)
+            # Extract text using best available engine, off the event loop
+            extracted = await extraction.extract(file_path, _progress)
+            index = await chunk_index.create(file_path, extracted["text"], extracted["pages"])
+
+            pdf_doc.text_content = await blob_store.offload(extracted["text"])
+            pdf_doc.pages_json = await blob_store.dump_json(extracted["pages"])
             pdf_doc.metadata_json = json.dumps(extracted["metadata"], ensure_ascii=False)
             pdf_doc.num_pages = extracted["num_pages"]
             pdf_doc.status = PDFStatus.READY
             pdf_doc.updated_at = datetime.now(UTC)
+            await _progress({"stage": "indexed", "chunks": len(index["chunks"])})
 
             logger.info(
                 "pdf_uploaded",
                 pdf_id=str(pdf_doc.id),
                 filename=filename,
                 pages=extracted["num_pages"],
+                chunks=len(index["chunks"]),
                 engine=extracted["metadata"].get("engine", "unknown"),
             )
 
@@ -277,16 +154,25 @@ class PDFProcessorService:
         session: AsyncSession,
         skip: int = 0,
         limit: int = 20,
-    ) -> list[PDFDocument]:
-        """List PDFs for a user (paginated)."""
-        result = await session.execute(
-            select(PDFDocument)
-            .where(PDFDocument.user_id == user_id, PDFDocument.is_deleted == False)
-            .order_by(PDFDocument.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        cursor: Optional[str] = None,
+    ) -> Page[PDFDocument]:
+        """List PDFs for a user, newest first, without their text, pages, summary or keywords."""
+        return await pagination.paginate(
+            session,
+            select(PDFDocument).where(PDFDocument.user_id == user_id, PDFDocument.is_deleted == False),
+            order_by=(PDFDocument.created_at, PDFDocument.id),
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            count="none",
+            options=[
+                defer(PDFDocument.text_content),
+                defer(PDFDocument.pages_json),
+                defer(PDFDocument.metadata_json),
+                defer(PDFDocument.summary),
+                defer(PDFDocument.keywords_json),
+            ],
         )
-        return list(result.scalars().all())
 
     @staticmethod
     async def get_pdf(
@@ -343,7 +229,8 @@ class PDFProcessorService:
         if not doc or doc.user_id != user_id or doc.is_deleted:
             return None
 
-        if not doc.text_content:
+        text = await blob_store.load(doc.text_content)
+        if not text:
             return {"summary": "", "error": "No text content available for this PDF"}
 
         style_instructions = {
@@ -352,18 +239,18 @@ class PDFProcessorService:
             "bullet_points": "Write a summary as a structured list of bullet points organized by topic/section.",
         }
 
-        prompt = (
-            f"Summarize the following PDF document.\n\n"
-            f"Style: {style_instructions.get(style, style_instructions['executive'])}\n\n"
-            f"Document ({doc.num_pages} pages, filename: {doc.original_filename}):\n"
-            f"{doc.text_content[:12000]}\n\n"
-            f"Summary:"
+        instruction = (
+            f"Summarize the following PDF document ({doc.num_pages} pages, "
+            f"filename: {doc.original_filename}).\n\n"
+            f"Style: {style_instructions.get(style, style_instructions['executive'])}"
         )
 
         try:
-            from app.ai_assistant.service import AIAssistantService
-            result = await AIAssistantService.process_text_with_provider(
-                text=prompt,
+            from app.ai_assistant.long_text import map_reduce
+            result = await map_reduce(
+                text,
+                instruction,
+                label="document",
                 task="pdf_summarize",
                 provider_name="gemini",
                 user_id=user_id,
@@ -408,10 +295,12 @@ class PDFProcessorService:
         if not doc.text_content:
             return {"keywords": [], "error": "No text content available"}
 
+        index = await chunk_index.for_document(doc)
         prompt = (
             f"Extract the 10-20 most important keywords and key phrases from this document. "
             f"Return them as a JSON array of strings.\n\n"
-            f"Document:\n{doc.text_content[:10000]}\n\n"
+            f"Most frequent terms: {', '.join(index['terms'][:30])}\n\n"
+            f"Document excerpts:\n{chunk_index.representative_text(index, 10000)}\n\n"
             f"Keywords (JSON array):"
         )
 
@@ -441,7 +330,8 @@ class PDFProcessorService:
 
         except Exception as e:
             logger.error("pdf_keywords_failed", error=str(e))
-            return {"keywords": [], "error": str(e)[:500]}
+            # The index's top terms are still a usable answer
+            return {"keywords": index["terms"][:20], "error": str(e)[:500]}
 
     @staticmethod
     async def query_pdf(
@@ -455,26 +345,21 @@ class PDFProcessorService:
         if not doc or doc.user_id != user_id or doc.is_deleted:
             return None
 
-        if not doc.text_content:
+        text = await blob_store.load(doc.text_content)
+        if not text:
             return {"answer": "No text content available for this PDF.", "sources": [], "confidence": 0.0}
 
-        # Chunk the text
-        chunks = PDFProcessorService._chunk_text(doc.text_content)
-
-        # Find relevant chunks using TF-IDF similarity
-        query_tokens = PDFProcessorService._tokenize(question)
-        query_tf = PDFProcessorService._compute_tf(query_tokens)
-
-        scored_chunks = []
-        for i, chunk_text in enumerate(chunks):
-            chunk_tokens = PDFProcessorService._tokenize(chunk_text)
-            chunk_tf = PDFProcessorService._compute_tf(chunk_tokens)
-            score = PDFProcessorService._cosine_similarity(query_tf, chunk_tf)
-            if score > 0:
-                scored_chunks.append({"index": i, "text": chunk_text, "score": round(score, 4)})
-
-        scored_chunks.sort(key=lambda x: x["score"], reverse=True)
-        top_chunks = scored_chunks[:5]
+        # Retrieve from the chunk index built at upload
+        index = await chunk_index.for_document(doc)
+        query_embedding = query_model = None
+        if index.get("embeddings"):
+            from app.modules.knowledge import embedding_service
+            query_model = embedding_service.get_model_name()
+            await chunk_index.refresh_embeddings(doc.file_path, index, query_model)
+            query_embedding = await asyncio.to_thread(embedding_service.embed_text, question, query_model)
+        top_chunks = chunk_index.search(
+            index, question, top_k=5, query_embedding=query_embedding, query_model=query_model,
+        )
 
         if top_chunks:
             context_parts = []
@@ -482,7 +367,7 @@ class PDFProcessorService:
                 context_parts.append(f"[Chunk {j + 1}, score={sc['score']}]\n{sc['text']}")
             context = "\n\n".join(context_parts)
         else:
-            context = doc.text_content[:3000]
+            context = text[:3000]
 
         prompt = (
             f"Based on the following context from a PDF document ({doc.original_filename}), "
@@ -507,7 +392,7 @@ class PDFProcessorService:
             confidence = min(1.0, avg_score * 5)
 
             sources = [
-                {"chunk_index": c["index"], "text": c["text"][:200], "relevance": c["score"]}
+                {"chunk_index": c["index"], "page": c["page"], "text": c["text"][:200], "relevance": c["score"]}
                 for c in top_chunks
             ]
 
@@ -541,7 +426,8 @@ class PDFProcessorService:
         if not doc or doc.user_id != user_id or doc.is_deleted:
             return None
 
-        pages = json.loads(doc.pages_json) if doc.pages_json else []
+        pages = await blob_store.load_json(doc.pages_json, [])
+        text = await blob_store.load(doc.text_content)
         metadata = json.loads(doc.metadata_json) if doc.metadata_json else {}
         keywords = json.loads(doc.keywords_json) if doc.keywords_json else []
 
@@ -563,7 +449,7 @@ class PDFProcessorService:
 
         elif export_format == "txt":
             txt = f"{doc.original_filename}\n{'=' * len(doc.original_filename)}\n\n"
-            txt += doc.text_content or ""
+            txt += text or ""
             return {"content": txt, "format": "txt", "filename": f"{doc.original_filename}.txt"}
 
         elif export_format == "json":
@@ -574,7 +460,7 @@ class PDFProcessorService:
                 "summary": doc.summary,
                 "keywords": keywords,
                 "pages": pages,
-                "text_content": doc.text_content,
+                "text_content": text,
             }
             return {"content": json.dumps(data, ensure_ascii=False, indent=2), "format": "json", "filename": f"{doc.original_filename}.json"}
 
@@ -604,17 +490,24 @@ class PDFProcessorService:
             "summary": "Provide a brief summary of each document, then highlight key similarities and differences.",
         }
 
+        indexes = [await chunk_index.for_document(doc) for doc in docs]
+        shared_terms = [
+            term for term in indexes[0]["terms"][:30]
+            if all(term in index["terms"][:30] for index in indexes[1:])
+        ]
+
         doc_summaries = []
-        for i, doc in enumerate(docs):
-            text = doc.text_content or ""
+        for i, (doc, index) in enumerate(zip(docs, indexes)):
             doc_summaries.append(
                 f"Document {i + 1}: {doc.original_filename} ({doc.num_pages} pages)\n"
-                f"{text[:3000]}\n"
+                f"Key terms: {', '.join(index['terms'][:15])}\n"
+                f"{chunk_index.representative_text(index, 3000)}\n"
             )
 
         prompt = (
             f"Compare the following {len(docs)} PDF documents.\n\n"
             f"Comparison type: {type_instructions.get(comparison_type, type_instructions['content'])}\n\n"
+            f"Key terms shared by all documents: {', '.join(shared_terms) or 'none'}\n\n"
             f"{''.join(doc_summaries)}\n\n"
             f"Provide a structured comparison with similarities, differences, and key insights."
         )
@@ -636,6 +529,7 @@ class PDFProcessorService:
                     {"id": str(d.id), "filename": d.original_filename, "num_pages": d.num_pages}
                     for d in docs
                 ],
+                "shared_terms": shared_terms,
                 "provider": result.get("provider", "gemini"),
             }
 
@@ -707,8 +601,9 @@ class PDFProcessorService:
         user_id: UUID,
         pdf_id: UUID,
         session: AsyncSession,
+        progress: Optional[ProgressCallback] = None,
     ) -> Optional[dict]:
-        """OCR a scanned PDF to extract text from images."""
+        """OCR a scanned PDF to extract text from images (pages in parallel worker processes)."""
         doc = await session.get(PDFDocument, pdf_id)
         if not doc or doc.user_id != user_id or doc.is_deleted:
             return None
@@ -722,33 +617,26 @@ class PDFProcessorService:
         if not HAS_PYMUPDF:
             return {"text": "", "error": "PyMuPDF required for OCR (page rendering). Install PyMuPDF."}
 
+        async def _progress(event: dict) -> None:
+            await extraction.report_progress(progress, {"pdf_id": str(pdf_id), **event})
+
         try:
-            pdf_doc = fitz.open(doc.file_path)
-            ocr_text = ""
-            ocr_pages = []
-
-            for i in range(len(pdf_doc)):
-                page = pdf_doc[i]
-                # Render page as image at 300 DPI
-                mat = fitz.Matrix(300 / 72, 300 / 72)
-                pix = page.get_pixmap(matrix=mat)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                page_text = pytesseract.image_to_string(img)
-                ocr_pages.append({"page_number": i + 1, "text": page_text})
-                ocr_text += page_text + "\n\n"
-
-            pdf_doc.close()
-
-            # Update document with OCR text if it was empty
-            if not doc.text_content or len(doc.text_content.strip()) < 50:
-                doc.text_content = ocr_text.strip()
-                doc.pages_json = json.dumps(ocr_pages, ensure_ascii=False)
+            ocr_pages = await extraction.ocr(doc.file_path, _progress)
+            ocr_text = "\n\n".join(page["text"] for page in ocr_pages).strip()
+
+            # Update document (and its chunk index) with OCR text if it was empty
+            text = await blob_store.load(doc.text_content)
+            if not text or len(text.strip()) < 50:
+                doc.text_content = await blob_store.offload(ocr_text)
+                doc.pages_json = await blob_store.dump_json(ocr_pages)
                 doc.updated_at = datetime.now(UTC)
                 session.add(doc)
                 await session.commit()
+                index = await chunk_index.create(doc.file_path, ocr_text, ocr_pages)
+                await _progress({"stage": "indexed", "chunks": len(index["chunks"])})
 
             logger.info("pdf_ocr_completed", pdf_id=str(pdf_id), pages=len(ocr_pages))
-            return {"text": ocr_text.strip(), "pages": ocr_pages, "total_pages": len(ocr_pages)}
+            return {"text": ocr_text, "pages": ocr_pages, "total_pages": len(ocr_pages)}
 
         except Exception as e:
             logger.error("pdf_ocr_failed", error=str(e))
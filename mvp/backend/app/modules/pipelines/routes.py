@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth import get_current_user
+from app.core.run_supervisor import RunLimitExceeded
 from app.modules.auth_guards.middleware import require_verified_email
 from app.database import get_session
 from app.models.user import User
@@ -182,7 +183,7 @@ async def delete_pipeline(
     return None
 
 
-@router.post("/{pipeline_id}/execute", response_model=ExecutionRead)
+@router.post("/{pipeline_id}/execute", response_model=ExecutionRead, status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("3/minute")
 async def execute_pipeline(
     request: Request,
@@ -194,12 +195,21 @@ async def execute_pipeline(
     Execute a pipeline.
 
     Processes all steps sequentially, passing output from one step as input to the next.
+    The execution runs in the background and is returned in the ``running``
+    state immediately; step progress is pushed over the user's WebSocket as
+    ``pipeline_execution_progress`` messages.  Poll
+    ``GET /executions/{execution_id}`` for the results and cancel with
+    ``POST /executions/{execution_id}/cancel``.  Returns 429 when the user
+    already has BACKGROUND_RUNS_MAX_PER_USER runs going.
 
     Rate limit: 3 requests/minute
     """
-    execution = await PipelineService.execute_pipeline(
-        pipeline_id, current_user.id, session
-    )
+    try:
+        execution = await PipelineService.start_pipeline(
+            pipeline_id, current_user.id, session
+        )
+    except RunLimitExceeded as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
     if not execution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -249,3 +259,24 @@ async def get_execution(
             detail="Execution not found",
         )
     return _execution_to_read(execution)
+
+
+@router.post("/executions/{execution_id}/cancel", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute")
+async def cancel_execution(
+    request: Request,
+    execution_id: UUID,
+    current_user: User = Depends(require_verified_email),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Cancel a running pipeline execution.
+
+    The execution stops before its next step; results of the steps that
+    finished are kept.
+
+    Rate limit: 10 requests/minute
+    """
+    if not await PipelineService.cancel_execution(execution_id, current_user.id, session):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot cancel this execution")
+    return {"status": "cancelled"}
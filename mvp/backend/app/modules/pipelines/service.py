@@ -2,6 +2,7 @@
 Pipeline service - Business logic for creating and executing AI pipelines.
 """
 
+import asyncio
 import json
 from datetime import UTC, datetime
 from typing import Optional
@@ -12,6 +13,8 @@ from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.config import settings
+from app.core import action_runtime, run_supervisor
 from app.models.pipeline import Pipeline, PipelineExecution, PipelineStatus, ExecutionStatus
 
 logger = structlog.get_logger()
@@ -144,55 +147,181 @@ class PipelineService:
         logger.info("pipeline_deleted", pipeline_id=str(pipeline_id))
         return True
 
+    @staticmethod
+    async def _create_execution(
+        pipeline: Pipeline,
+        user_id: UUID,
+        session: AsyncSession,
+    ) -> PipelineExecution:
+        execution = PipelineExecution(
+            pipeline_id=pipeline.id,
+            user_id=user_id,
+            status=ExecutionStatus.RUNNING,
+            current_step=0,
+            total_steps=len(json.loads(pipeline.steps_json)),
+            started_at=datetime.now(UTC),
+        )
+        session.add(execution)
+        await session.commit()
+        return execution
+
     @staticmethod
     async def execute_pipeline(
         pipeline_id: UUID,
         user_id: UUID,
         session: AsyncSession,
     ) -> Optional[PipelineExecution]:
-        """Start executing a pipeline."""
+        """Execute a pipeline in the caller's session and return the finished execution."""
         pipeline = await session.get(Pipeline, pipeline_id)
         if not pipeline or pipeline.user_id != user_id:
             return None
 
-        steps = json.loads(pipeline.steps_json)
+        execution = await PipelineService._create_execution(pipeline, user_id, session)
+        return await PipelineService._execute(execution, pipeline, session)
 
-        execution = PipelineExecution(
-            pipeline_id=pipeline_id,
-            user_id=user_id,
-            status=ExecutionStatus.RUNNING,
-            current_step=0,
-            total_steps=len(steps),
-            started_at=datetime.now(UTC),
-        )
+    @staticmethod
+    async def start_pipeline(
+        pipeline_id: UUID,
+        user_id: UUID,
+        session: AsyncSession,
+    ) -> Optional[PipelineExecution]:
+        """
+        Create an execution and run it in the background (core.run_supervisor).
+
+        Returns the ``running`` execution right away; raises RunLimitExceeded
+        when the user already has too many runs going.
+        """
+        pipeline = await session.get(Pipeline, pipeline_id)
+        if not pipeline or pipeline.user_id != user_id:
+            return None
+
+        with run_supervisor.reserve(user_id, "pipeline") as slot:
+            execution = await PipelineService._create_execution(pipeline, user_id, session)
+            slot.start(
+                "pipeline", execution.id, PipelineService.execute_run(execution.id),
+                on_cancelled=lambda: PipelineService.record_cancelled(execution.id),
+            )
+        return execution
+
+    @staticmethod
+    async def execute_run(execution_id: UUID) -> None:
+        """Background entry point: run a created execution in its own session."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            execution = await session.get(PipelineExecution, execution_id)
+            pipeline = await session.get(Pipeline, execution.pipeline_id) if execution else None
+            if not execution or not pipeline:
+                return
+            await PipelineService._execute(execution, pipeline, session, supervised=True)
+
+    @staticmethod
+    async def record_cancelled(execution_id: UUID) -> None:
+        """Mark an execution cancelled before it started as ``cancelled``."""
+        from app.database import get_session_context
+
+        async with get_session_context() as session:
+            execution = await session.get(PipelineExecution, execution_id)
+            if not execution or execution.status not in (ExecutionStatus.PENDING, ExecutionStatus.RUNNING):
+                return
+            execution.status = ExecutionStatus.CANCELLED
+            execution.completed_at = datetime.now(UTC)
+            session.add(execution)
+            await session.commit()
+
+    @staticmethod
+    async def cancel_execution(execution_id: UUID, user_id: UUID, session: AsyncSession) -> bool:
+        """Cancel a pending or running execution."""
+        execution = await session.get(PipelineExecution, execution_id)
+        if not execution or execution.user_id != user_id:
+            return False
+        if execution.status not in (ExecutionStatus.PENDING, ExecutionStatus.RUNNING):
+            return False
+
+        execution.status = ExecutionStatus.CANCELLED
+        execution.completed_at = datetime.now(UTC)
         session.add(execution)
-        await session.flush()
+        await session.commit()
+        # The execution stops at its next step if another process runs it
+        run_supervisor.cancel(execution.id)
+        return True
+
+    @staticmethod
+    async def _cancel_requested(execution_id: UUID, session: AsyncSession) -> bool:
+        status = (await session.execute(
+            select(PipelineExecution.status).where(PipelineExecution.id == execution_id)
+        )).scalar_one_or_none()
+        return status == ExecutionStatus.CANCELLED
+
+    @staticmethod
+    async def _execute(
+        execution: PipelineExecution,
+        pipeline: Pipeline,
+        session: AsyncSession,
+        supervised: bool = False,
+    ) -> PipelineExecution:
+        """
+        Run the steps of ``pipeline`` for ``execution``, each on the previous output.
+
+        Progress is committed before every step, so the session's connection
+        is released between steps, and pushed to the owner's WebSocket
+        as ``pipeline_execution_progress`` events.  ``supervised``
+        executions also stop when their row is cancelled.
+        """
+        steps = json.loads(pipeline.steps_json)
 
         results = []
         previous_output = None
+        cancelled = False
+        error: Optional[Exception] = None
+
+        async def progress(event: str, step_index: Optional[int] = None, **extra) -> None:
+            await run_supervisor.notify(execution.user_id, "pipeline_execution_progress", {
+                "execution_id": str(execution.id),
+                "pipeline_id": str(pipeline.id),
+                "event": event,
+                "status": execution.status.value,
+                "current_step": execution.current_step,
+                "total_steps": execution.total_steps,
+                "step_index": step_index,
+                **extra,
+            })
 
         try:
             for i, step in enumerate(steps):
+                if supervised and await PipelineService._cancel_requested(execution.id, session):
+                    cancelled = True
+                    break
+
                 execution.current_step = i + 1
                 session.add(execution)
-                await session.flush()
+                await session.commit()
+                await progress("step_started", i, step_type=step.get("type"))
 
                 step_result = await PipelineService._execute_step(
                     step, previous_output, pipeline=pipeline, session=session
                 )
                 results.append(step_result)
                 previous_output = step_result.get("output", "")
+                await progress("step_finished", i, step_type=step.get("type"), error=step_result.get("error"))
+            if supervised and not cancelled and await PipelineService._cancel_requested(execution.id, session):
+                # A cancel that landed during the last step wins over its outcome
+                cancelled = True
+        except asyncio.CancelledError:
+            cancelled = True
+        except Exception as e:
+            error = e
 
-            execution.status = ExecutionStatus.COMPLETED
+        if error is None:
+            execution.status = ExecutionStatus.CANCELLED if cancelled else ExecutionStatus.COMPLETED
             execution.results_json = json.dumps(results, ensure_ascii=False)
             execution.completed_at = datetime.now(UTC)
             session.add(execution)
             await session.commit()
-
-        except Exception as e:
+        else:
             await session.rollback()
             execution.status = ExecutionStatus.FAILED
-            execution.error = str(e)[:2000]
+            execution.error = str(error)[:2000]
             execution.results_json = json.dumps(results, ensure_ascii=False)
             execution.completed_at = datetime.now(UTC)
             session.add(execution)
@@ -200,10 +329,11 @@ class PipelineService:
             logger.error(
                 "pipeline_execution_failed",
                 execution_id=str(execution.id),
-                error=str(e),
+                error=str(error),
             )
 
         await session.refresh(execution)
+        await progress("finished", error=execution.error)
 
         logger.info(
             "pipeline_execution_finished",
@@ -221,7 +351,20 @@ class PipelineService:
         pipeline: Optional["Pipeline"] = None,
         session: Optional[AsyncSession] = None,
     ) -> dict:
-        """Execute a single pipeline step."""
+        """Execute a single pipeline step through the shared action runtime."""
+        return await action_runtime.run(
+            "pipelines", step.get("type", "unknown"),
+            PipelineService._dispatch_step, step, previous_output, pipeline=pipeline, session=session,
+        )
+
+    @staticmethod
+    async def _dispatch_step(
+        step: dict,
+        previous_output: Optional[str],
+        pipeline: Optional["Pipeline"] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> dict:
+        """Route a pipeline step to its implementation."""
         step_type = step.get("type", "unknown")
         config = step.get("config", {})
 
@@ -235,7 +378,9 @@ class PipelineService:
             from app.modules.web_crawler.service import WebCrawlerService
             url = config.get("url", previous_output or "")
             if url:
-                result = await WebCrawlerService.scrape(url=url, extract_images=True)
+                result = await WebCrawlerService.scrape(
+                    url=url, extract_images=True, max_age=settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS,
+                )
                 if result.get("success"):
                     step_output = result.get("markdown", "")
                 else:
@@ -537,11 +682,12 @@ class PipelineService:
                 try:
                     from app.modules.marketplace.service import MarketplaceService
                     svc = MarketplaceService(session)
-                    listings, total = await svc.list_listings(
+                    page = await svc.list_listings(
                         search=query[:200],
                         category=config.get("category"),
                         limit=config.get("limit", 5),
                     )
+                    listings, total = page.items, page.total
                     if listings:
                         step_output = f"Found {total} result(s):\n" + "\n".join(
                             f"- {l.title} ({l.type}/{l.category}) v{l.version}" for l in listings
@@ -1002,6 +1148,7 @@ class PipelineService:
                     use_fit_markdown=config.get("use_fit_markdown", True),
                     headers=config.get("headers"),
                     follow_redirects=config.get("follow_redirects", True),
+                    max_age=config.get("max_age", settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS),
                 )
                 if result.get("success"):
                     step_output = result.get("markdown", "")
@@ -1202,9 +1349,10 @@ class PipelineService:
             return {"type": "summarize", "output": "", "error": "No input text"}
 
         try:
-            from app.ai_assistant.service import AIAssistantService
-            result = await AIAssistantService.process_text_with_provider(
-                text=f"Summarize the following text concisely:\n\n{text}",
+            from app.ai_assistant.long_text import map_reduce
+            result = await map_reduce(
+                text,
+                "Summarize the following text concisely.",
                 task="summarize",
                 provider_name=config.get("provider", "gemini"),
             )
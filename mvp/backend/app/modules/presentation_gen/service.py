@@ -7,25 +7,22 @@ Uses optional marp-cli for PDF/PPTX rendering when available.
 """
 
 import json
+import shutil
 from datetime import UTC, datetime
 from typing import Optional
 from uuid import UUID
 
 import structlog
 
-try:
-    import subprocess
-    _marp_check = subprocess.run(
-        ["marp", "--version"], capture_output=True, timeout=5
-    )
-    HAS_MARP = _marp_check.returncode == 0
-except Exception:
-    HAS_MARP = False
+# PATH lookup only: running `marp --version` here cost every worker a
+# subprocess (up to 5 s) on import
+HAS_MARP = shutil.which("marp") is not None
 
 from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.config import settings
 from app.models.presentation_gen import Presentation, PresentationStatus
 
 logger = structlog.get_logger()
@@ -630,7 +627,8 @@ document.addEventListener('keydown', e => {{
             from app.modules.web_crawler.service import WebCrawlerService
 
             result = await WebCrawlerService.scrape(
-                url=url, extract_images=False, max_images=0
+                url=url, extract_images=False, max_images=0,
+                max_age=settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS,
             )
             if result.get("success"):
                 return result.get("markdown", "")
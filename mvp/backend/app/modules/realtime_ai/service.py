@@ -197,6 +197,7 @@ class RealtimeAIService:
                 provider_name=rt_session.provider,
                 user_id=user_id,
                 module="realtime_ai",
+                hedge=True,
             )
             ai_response = result.get("processed_text", "")
         except Exception as e:
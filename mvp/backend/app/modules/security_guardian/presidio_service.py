@@ -15,10 +15,16 @@ Features over regex:
 - Multiple anonymization modes (replace, mask, hash, redact)
 - Per-entity-type confidence thresholds
 - Batch analysis support
+
+The analyzer (spaCy model included) is the heavy part: when the local
+inference server is configured, ``analyze`` calls go there and this process
+never loads it.
 """
 
 import structlog
-from typing import Optional
+from typing import NamedTuple, Optional
+
+from app.inference.client import infer_sync
 
 logger = structlog.get_logger()
 
@@ -128,6 +134,37 @@ def _get_analyzer():
         return None
 
 
+class _RemoteResult(NamedTuple):
+    """Analyzer result returned by the inference server."""
+
+    entity_type: str
+    start: int
+    end: int
+    score: float
+
+
+def analyze_local(texts: list[str], language: str, score_threshold: float) -> list[list[list]]:
+    """Run the in-process analyzer; results as [entity_type, start, end, score] lists."""
+    analyzer = _get_analyzer()
+    if analyzer is None:
+        raise RuntimeError("presidio is not installed")
+    return [
+        [[r.entity_type, r.start, r.end, r.score] for r in analyzer.analyze(text=text, language=language, score_threshold=score_threshold)]
+        for text in texts
+    ]
+
+
+def _analyze(text: str, language: str, score_threshold: float):
+    """Analyze on the inference server, else locally. None if Presidio is unavailable."""
+    remote = infer_sync("pii", [text], {"language": language, "score_threshold": score_threshold})
+    if remote is not None:
+        return [_RemoteResult(*r) for r in remote[0]]
+    analyzer = _get_analyzer()
+    if analyzer is None:
+        return None
+    return analyzer.analyze(text=text, language=language, score_threshold=score_threshold)
+
+
 def _get_anonymizer():
     """Lazy-load Presidio anonymizer (singleton)."""
     global _anonymizer
@@ -209,21 +246,16 @@ def detect_pii(
     Returns a list of findings compatible with SecurityGuardianService format.
     Returns empty list if Presidio is not available (caller should fallback to regex).
     """
-    analyzer = _get_analyzer()
-    if analyzer is None:
-        return []
-
     # Validate language
     if language not in SUPPORTED_LANGUAGES:
         logger.warning("unsupported_language", language=language, fallback="en")
         language = "en"
 
     try:
-        results = analyzer.analyze(
-            text=text,
-            language=language,
-            score_threshold=0.4,  # Lower threshold to catch more, we filter later
-        )
+        # Lower threshold to catch more, we filter later
+        results = _analyze(text, language, score_threshold=0.4)
+        if results is None:
+            return []
 
         findings = []
         seen = set()  # dedup by position
@@ -283,10 +315,9 @@ def anonymize(
     Returns (anonymized_text, mapping) where mapping allows restoration.
     Returns (original_text, {}) if Presidio is not available.
     """
-    analyzer = _get_analyzer()
     anonymizer_engine = _get_anonymizer()
 
-    if analyzer is None or anonymizer_engine is None:
+    if anonymizer_engine is None:
         return text, {}
 
     # Validate language
@@ -295,13 +326,17 @@ def anonymize(
         language = "en"
 
     try:
-        from presidio_anonymizer.entities import OperatorConfig
+        from presidio_anonymizer.entities import OperatorConfig, RecognizerResult
 
         # Analyze
-        results = analyzer.analyze(text=text, language=language, score_threshold=0.5)
+        results = _analyze(text, language, score_threshold=0.5)
 
         if not results:
             return text, {}
+        results = [
+            r if not isinstance(r, _RemoteResult) else RecognizerResult(r.entity_type, r.start, r.end, r.score)
+            for r in results
+        ]
 
         # Build custom operators for reversible anonymization
         # Group by entity type to number them
@@ -374,14 +409,21 @@ def analyze_batch(
     if not texts:
         return []
 
-    if not is_available():
-        return [[] for _ in texts]
-
     # Validate language
     if language not in SUPPORTED_LANGUAGES:
         logger.warning("unsupported_language", language=language, fallback="en")
         language = "en"
 
+    remote = infer_sync("pii", list(texts), {"language": language, "score_threshold": 0.4})
+    if remote is not None:
+        return [
+            _process_analyzer_results([_RemoteResult(*r) for r in results], entity_thresholds)
+            for results in remote
+        ]
+
+    if not is_available():
+        return [[] for _ in texts]
+
     # Try BatchAnalyzerEngine first
     try:
         from presidio_analyzer import BatchAnalyzerEngine
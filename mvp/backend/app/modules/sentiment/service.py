@@ -13,16 +13,27 @@ from uuid import UUID
 
 import structlog
 
-try:
-    from transformers import pipeline as hf_pipeline
-    _sentiment_pipeline = None
-    HAS_TRANSFORMERS = True
-except ImportError:
-    HAS_TRANSFORMERS = False
+from app.core.optional_deps import optional
+from app.inference import client as inference_client
+
+# transformers (and torch behind it) is imported on first RoBERTa call only
+_transformers = optional("transformers")
+HAS_TRANSFORMERS = _transformers.available
+_sentiment_pipeline = None
+
+ROBERTA_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
 
 logger = structlog.get_logger()
 
 
+def get_roberta_pipeline():
+    """Load the RoBERTa sentiment pipeline once per process."""
+    global _sentiment_pipeline
+    if _sentiment_pipeline is None:
+        _sentiment_pipeline = _transformers.load().pipeline("sentiment-analysis", model=ROBERTA_MODEL)
+    return _sentiment_pipeline
+
+
 class SentimentService:
     """Service for sentiment and emotion analysis."""
 
@@ -144,7 +155,7 @@ Respond ONLY with the JSON array."""
         sentiment_method = "llm"
 
         # Try RoBERTa for a fast, high-quality overall sentiment override
-        if HAS_TRANSFORMERS:
+        if HAS_TRANSFORMERS or inference_client.enabled():
             try:
                 roberta_result = SentimentService._analyze_with_roberta(text)
                 overall = roberta_result["sentiment"]
@@ -180,16 +191,12 @@ Respond ONLY with the JSON array."""
         ~100ms per call vs ~5s for LLM. Only provides overall sentiment
         (no segment-level analysis or emotions).
         """
-        global _sentiment_pipeline
-        if _sentiment_pipeline is None:
-            _sentiment_pipeline = hf_pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-            )
         # Model max token length is ~512 tokens; truncate input text to 512 chars
         # as a safe approximation.
         truncated = text[:512]
-        results = _sentiment_pipeline(truncated)
+        results = inference_client.infer_sync("sentiment", [truncated])
+        if results is None:
+            results = get_roberta_pipeline()(truncated)
         result = results[0]
 
         label_map = {
@@ -0,0 +1,270 @@
+"""
+Transcript export
+=================
+
+Writers for the transcript export formats.  Each writer is a generator of
+text chunks, so a route can send a transcript while it is being formatted
+and a bulk export can zip many transcripts holding only one of them in
+memory at a time.
+
+Timed formats (srt, vtt, jsonl) use the stored speaker utterances
+(``speakers_json``, millisecond timings) when there are any; otherwise the
+text is split into sentences spread evenly over the duration.
+"""
+
+import json
+import zipfile
+from typing import AsyncIterator, Callable, Iterator, NamedTuple, Optional, Sequence
+from uuid import UUID
+
+import structlog
+from sqlmodel import select
+
+from app.config import settings
+from app.database import get_session_context
+from app.models.transcription import Transcription, TranscriptionStatus
+
+logger = structlog.get_logger()
+
+MEDIA_TYPES = {
+    "srt": "application/x-subrip",
+    "vtt": "text/vtt",
+    "jsonl": "application/x-ndjson",
+    "txt": "text/plain",
+    "md": "text/markdown",
+    "json": "application/json",
+}
+
+_TEXT_CHUNK_CHARS = 64 * 1024
+
+
+class Cue(NamedTuple):
+    start_ms: int
+    end_ms: int
+    text: str
+    speaker: Optional[str] = None
+
+
+def filename(job: Transcription, fmt: str, full_id: bool = False) -> str:
+    job_id = str(job.id) if full_id else str(job.id)[:8]
+    return f"transcription_{job_id}.{fmt}"
+
+
+# ---------------------------------------------------------------------------
+# Cues
+# ---------------------------------------------------------------------------
+
+def _json_column(value: Optional[str], default):
+    if not value:
+        return default
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return default
+
+
+def _sentences(text: str) -> Iterator[str]:
+    start = 0
+    while start < len(text):
+        end = text.find(". ", start)
+        if end == -1:
+            end = len(text)
+        line = text[start:end].strip()
+        if line:
+            yield line if line.endswith((".", "!", "?")) else f"{line}."
+        start = end + 2
+
+
+def iter_cues(job: Transcription) -> Iterator[Cue]:
+    """Timed cues of a transcript, from its utterances or synthesized from its text."""
+    utterances = _json_column(job.speakers_json, [])
+    if isinstance(utterances, list) and utterances:
+        for u in utterances:
+            yield Cue(int(u.get("start", 0)), int(u.get("end", 0)), str(u.get("text", "")).strip(), u.get("speaker"))
+        return
+
+    text = job.text or ""
+    count = sum(1 for _ in _sentences(text))
+    if not count:
+        return
+    duration = job.duration_seconds or 0
+    step_ms = int(max(duration / count, 2.0) * 1000) if duration > 0 else 3000
+    for i, line in enumerate(_sentences(text)):
+        yield Cue(i * step_ms, (i + 1) * step_ms, line)
+
+
+def _timestamp(ms: int, separator: str) -> str:
+    h, rest = divmod(ms, 3_600_000)
+    m, rest = divmod(rest, 60_000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{separator}{ms:03d}"
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+def write_srt(job: Transcription) -> Iterator[str]:
+    for i, cue in enumerate(iter_cues(job), 1):
+        text = f"{cue.speaker}: {cue.text}" if cue.speaker else cue.text
+        yield f"{i}\n{_timestamp(cue.start_ms, ',')} --> {_timestamp(cue.end_ms, ',')}\n{text}\n\n"
+
+
+def write_vtt(job: Transcription) -> Iterator[str]:
+    yield "WEBVTT\n\n"
+    for cue in iter_cues(job):
+        text = f"<v {cue.speaker}>{cue.text}" if cue.speaker else cue.text
+        yield f"{_timestamp(cue.start_ms, '.')} --> {_timestamp(cue.end_ms, '.')}\n{text}\n\n"
+
+
+def write_jsonl(job: Transcription) -> Iterator[str]:
+    job_id = str(job.id)
+    for i, cue in enumerate(iter_cues(job)):
+        yield json.dumps({
+            "transcription_id": job_id,
+            "index": i,
+            "start_ms": cue.start_ms,
+            "end_ms": cue.end_ms,
+            "speaker": cue.speaker,
+            "text": cue.text,
+        }, ensure_ascii=False) + "\n"
+
+
+def _text_chunks(text: str) -> Iterator[str]:
+    for start in range(0, len(text), _TEXT_CHUNK_CHARS):
+        yield text[start:start + _TEXT_CHUNK_CHARS]
+
+
+def write_txt(job: Transcription) -> Iterator[str]:
+    yield from _text_chunks(job.text or "")
+
+
+def write_md(job: Transcription) -> Iterator[str]:
+    """Markdown with the source, duration and chapters (if generated) before the text."""
+    parts = [f"# Transcript\n\n**Source:** {job.video_url}\n"]
+
+    duration = job.duration_seconds or 0
+    if duration:
+        parts.append(f"**Duration:** {duration // 60}m {duration % 60}s\n")
+
+    parts.append("---\n")
+
+    chapters = _json_column(job.metadata_json, {}).get("chapters", [])
+    if chapters:
+        parts.append("## Chapters\n")
+        for ch in chapters:
+            start = ch.get("start_time", 0)
+            m, s = int(start // 60), int(start % 60)
+            parts.append(f"### [{m:02d}:{s:02d}] {ch.get('title', 'Chapter')}\n")
+            if ch.get("summary"):
+                parts.append(f"_{ch['summary']}_\n")
+        parts.append("---\n")
+
+    parts.append("## Full Transcript\n")
+    yield "\n".join(parts) + "\n"
+    yield from _text_chunks(job.text or "")
+    yield "\n\n"
+
+
+def write_json(job: Transcription) -> Iterator[str]:
+    """One structured JSON document with the text and generated metadata."""
+    metadata = _json_column(job.metadata_json, {})
+    yield json.dumps({
+        "id": str(job.id),
+        "video_url": job.video_url,
+        "language": job.language,
+        "status": job.status.value if hasattr(job.status, "value") else str(job.status),
+        "text": job.text,
+        "confidence": job.confidence,
+        "duration_seconds": job.duration_seconds,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "chapters": metadata.get("chapters", []),
+        "summaries": metadata.get("summaries", {}),
+        "keywords": metadata.get("keywords", []),
+    }, indent=2, ensure_ascii=False)
+
+
+WRITERS: dict[str, Callable[[Transcription], Iterator[str]]] = {
+    "srt": write_srt,
+    "vtt": write_vtt,
+    "jsonl": write_jsonl,
+    "txt": write_txt,
+    "md": write_md,
+    "json": write_json,
+}
+
+
+def write(job: Transcription, fmt: str) -> Iterator[str]:
+    """Chunks of ``job`` exported as ``fmt`` (plain text for unknown formats)."""
+    return WRITERS.get(fmt, write_txt)(job)
+
+
+# ---------------------------------------------------------------------------
+# Bulk (zip) export
+# ---------------------------------------------------------------------------
+
+class _ZipSink:
+    """Write-only, unseekable file object: zipfile then writes entries with
+    data descriptors and the archive can be sent as it is produced."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def stream_zip(
+    user_id: UUID,
+    fmt: str,
+    job_ids: Optional[Sequence[UUID]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield a zip with one ``fmt`` file per completed transcription of the user.
+
+    ``job_ids`` restricts the export (others' and unfinished jobs are
+    skipped).  Transcripts are loaded one at a time, each in its own short
+    session, so no pooled connection is held while the client reads.
+    """
+    stmt = select(Transcription.id).where(
+        Transcription.user_id == user_id,
+        Transcription.status == TranscriptionStatus.COMPLETED,
+        Transcription.text.is_not(None),
+    )
+    if job_ids is not None:
+        stmt = stmt.where(Transcription.id.in_(list(job_ids)))
+    stmt = stmt.order_by(Transcription.created_at).limit(settings.TRANSCRIPT_EXPORT_BULK_MAX_ITEMS)
+    async with get_session_context() as session:
+        ids = list((await session.execute(stmt)).scalars().all())
+
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for job_id in ids:
+            async with get_session_context() as session:
+                job = await session.get(Transcription, job_id)
+                if job is not None:
+                    session.expunge(job)
+            if job is None:
+                continue
+            with archive.open(filename(job, fmt, full_id=True), "w") as entry:
+                for chunk in write(job, fmt):
+                    entry.write(chunk.encode("utf-8"))
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+    logger.info("transcripts_bulk_exported", user_id=str(user_id), format=fmt, count=len(ids))
@@ -8,9 +8,10 @@ from typing import List, Optional
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, status, Query, Request, UploadFile, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.pagination import CountMode, InvalidCursor, loaded_fields
 from app.database import get_session
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
@@ -33,10 +34,11 @@ from app.schemas.transcription import (
     ChapterItem, ChapterResponse,
     SummaryRequest, SummaryResponse,
     KeywordItem, KeywordResponse,
-    ExportFormat, ExportResponse,
+    ExportFormat, ExportResponse, BulkExportRequest,
     YouTubeMetadataV2,
     SearchTranscriptionResult, SearchTranscriptionsResponse,
 )
+from app.modules.transcription import export
 from app.modules.transcription.service import TranscriptionService
 from app.modules.transcription.websocket import get_debug_manager
 from app.transcription.audio_cache import get_audio_cache
@@ -352,9 +354,12 @@ async def get_transcription_speakers(
 @limiter.limit(get_rate_limit("transcription_list"))
 async def list_transcriptions(
     request: Request,
-    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    skip: int = Query(0, ge=0, description="Number of items to skip (ignored with cursor)"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of items to return"),
     status: Optional[TranscriptionStatus] = Query(None, description="Filter by transcription status"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
+    include_text: bool = Query(True, description="Include the transcript text of each item"),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
     service: TranscriptionService = Depends(get_transcription_service)
@@ -363,24 +368,32 @@ async def list_transcriptions(
     List all transcription jobs for the current user with pagination.
 
     Returns a paginated response containing items, total count, and pagination metadata.
+    Follow ``next_cursor`` for the next page; pass ``include_text=false``
+    for table views that do not show the transcript.
 
     Rate limit: 20 requests/minute
     """
-
-    items, total = await service.list_user_jobs(
-        user_id=current_user.id,
-        session=session,
-        skip=skip,
-        limit=limit,
-        status=status
-    )
+    try:
+        page = await service.list_user_jobs(
+            user_id=current_user.id,
+            session=session,
+            skip=skip,
+            limit=limit,
+            status=status,
+            cursor=cursor,
+            count=count,
+            include_text=include_text,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return PaginatedResponse(
-        items=items,
-        total=total,
-        skip=skip,
+        items=[TranscriptionRead.model_validate(loaded_fields(job)) for job in page.items],
+        total=page.total,
+        skip=0 if cursor else skip,
         limit=limit,
-        has_more=(skip + limit) < total
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -594,6 +607,7 @@ async def export_transcript(
     Supported formats:
     - srt: SubRip subtitle format
     - vtt: WebVTT subtitle format
+    - jsonl: One timed cue per line
     - txt: Plain text
     - md: Markdown with chapters (if generated)
     - json: Structured JSON with all metadata
@@ -615,6 +629,60 @@ async def export_transcript(
     return ExportResponse(**result)
 
 
+@router.get("/{job_id}/export/{fmt}/download")
+@limiter.limit("30/minute")
+async def download_transcript(
+    request: Request,
+    job_id: UUID,
+    fmt: ExportFormat,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    service: TranscriptionService = Depends(get_transcription_service),
+):
+    """
+    Download a completed transcription as a file, streamed while it is formatted.
+
+    Same formats as /{job_id}/export/{fmt}.
+
+    Rate limit: 30 requests/minute
+    """
+    try:
+        job = await service.get_exportable_job(job_id, current_user.id, session)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return StreamingResponse(
+        export.write(job, fmt.value),
+        media_type=export.MEDIA_TYPES[fmt.value],
+        headers={"Content-Disposition": f'attachment; filename="{export.filename(job, fmt.value)}"'},
+    )
+
+
+@router.post("/export/bulk")
+@limiter.limit("5/minute")
+async def bulk_export_transcripts(
+    request: Request,
+    body: BulkExportRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Download completed transcriptions as a zip, one file per transcription.
+
+    Exports the listed job_ids (or every completed transcription) up to
+    TRANSCRIPT_EXPORT_BULK_MAX_ITEMS.  The zip is streamed as it is built
+    and only one transcript is held in memory at a time.
+
+    Rate limit: 5 requests/minute
+    """
+    return StreamingResponse(
+        export.stream_zip(current_user.id, body.format.value, body.job_ids),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="transcriptions_{body.format.value}.zip"'},
+    )
+
+
 @router.get("/metadata/v2")
 @limiter.limit("30/minute")
 async def get_youtube_metadata_v2(
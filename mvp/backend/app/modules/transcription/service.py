@@ -4,17 +4,21 @@ Transcription service - Business logic for transcription jobs
 
 import asyncio
 from datetime import UTC, datetime, timedelta
-from typing import Optional, List
+from typing import Optional
 from uuid import UUID
 
 import structlog
-from sqlalchemy import func
+from sqlalchemy import func, update
+from sqlalchemy.orm import defer
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
+from app.core import pagination
+from app.core.pagination import CountMode, Page
 from app.metrics import transcription_jobs_total
 from app.models.transcription import Transcription, TranscriptionStatus
+from app.modules.transcription import export
 from app.database import get_session_context
 
 # Initialize logger
@@ -540,45 +544,64 @@ class TranscriptionService:
             await self._timeout_stale_pending(job, session)
         return job
     
+    async def _timeout_stale_pending_for_user(self, user_id: UUID, session: AsyncSession) -> None:
+        """Fail all of a user's stale PENDING jobs with one UPDATE (list views)."""
+        cutoff = datetime.now(UTC) - timedelta(minutes=self.PENDING_TIMEOUT_MINUTES)
+        result = await session.execute(
+            update(Transcription)
+            .where(
+                Transcription.user_id == user_id,
+                Transcription.status == TranscriptionStatus.PENDING,
+                Transcription.created_at < cutoff,
+            )
+            .values(
+                status=TranscriptionStatus.FAILED,
+                error="Job timed out after 30 minutes in PENDING status",
+                updated_at=datetime.now(UTC),
+            )
+        )
+        if result.rowcount:
+            await session.commit()
+            logger.warning("pending_jobs_timed_out", user_id=str(user_id), count=result.rowcount)
+
     async def list_user_jobs(
         self,
         user_id: UUID,
         session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-        status: Optional[TranscriptionStatus] = None
-    ) -> tuple[List[Transcription], int]:
+        status: Optional[TranscriptionStatus] = None,
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+        include_text: bool = True,
+    ) -> Page[Transcription]:
         """
-        List transcription jobs for a user with pagination and optional status filter.
+        List transcription jobs for a user, newest first, with an optional status filter.
 
-        Returns a tuple of (items, total_count).
+        Pages by ``cursor`` (or ``skip``); see app.core.pagination.  The
+        diarization, sentiment and metadata JSON columns are never loaded,
+        nor ``text`` when ``include_text`` is False.
         """
-        # Build base filter conditions
-        conditions = [Transcription.user_id == user_id]
-        if status is not None:
-            conditions.append(Transcription.status == status)
+        await self._timeout_stale_pending_for_user(user_id, session)
 
-        # Count query
-        count_statement = select(func.count()).select_from(Transcription).where(*conditions)
-        count_result = await session.execute(count_statement)
-        total = count_result.scalar_one()
-
-        # Data query
-        statement = (
-            select(Transcription)
-            .where(*conditions)
-            .order_by(Transcription.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        statement = select(Transcription).where(Transcription.user_id == user_id)
+        if status is not None:
+            statement = statement.where(Transcription.status == status)
+
+        deferred = [Transcription.speakers_json, Transcription.sentiment_json, Transcription.metadata_json]
+        if not include_text:
+            deferred.append(Transcription.text)
+
+        return await pagination.paginate(
+            session,
+            statement,
+            order_by=(Transcription.created_at, Transcription.id),
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            count=count,
+            options=[defer(column) for column in deferred],
         )
-
-        result = await session.execute(statement)
-        items = list(result.scalars().all())
-
-        for job in items:
-            await self._timeout_stale_pending(job, session)
-
-        return items, total
     
     async def get_user_stats(self, user_id: UUID, session: AsyncSession) -> dict:
         """Get transcription statistics for a user"""
@@ -868,37 +891,54 @@ class TranscriptionService:
             raise ValueError("Transcription is not completed or has no text")
 
         try:
-            from app.ai_assistant.service import AIAssistantService
+            from app.ai_assistant.long_text import map_prompts, split_text
 
-            prompt = (
+            instruction = (
                 "Analyze this transcript and generate timestamped chapters. "
                 "Return a JSON array of objects with keys: start_time (float seconds), "
                 "end_time (float seconds), title (string), summary (string). "
                 "Create logical chapter breaks based on topic changes. "
                 "If you cannot determine exact timestamps, estimate based on text position. "
-                "Respond ONLY with the JSON array.\n\n"
-                f"Transcript ({len(job.text)} chars):\n{job.text[:8000]}"
+                "Respond ONLY with the JSON array."
             )
 
-            result = await AIAssistantService.process_text_with_provider(
-                text=prompt,
+            # Long transcripts are chaptered chunk by chunk, each chunk told
+            # which stretch of the recording it covers (by text position).
+            chunks = split_text(job.text)
+            duration = float(job.duration_seconds or 0)
+            prompts = []
+            offset = 0
+            for chunk in chunks:
+                span = ""
+                if len(chunks) > 1 and duration:
+                    span_start = duration * offset / len(job.text)
+                    span_end = duration * (offset + len(chunk)) / len(job.text)
+                    span = (
+                        f" This is an excerpt covering roughly {span_start:.0f}s to "
+                        f"{span_end:.0f}s of the recording; keep all timestamps in that range."
+                    )
+                prompts.append(f"{instruction}{span}\n\nTranscript ({len(chunk)} chars):\n{chunk}")
+                offset += len(chunk)
+
+            responses = await map_prompts(
+                prompts,
                 task="extract",
                 provider_name="gemini",
                 user_id=user_id,
                 module="transcription",
+                cache=len(chunks) > 1,
             )
 
-            response_text = result.get("processed_text", "[]")
-
-            # Extract JSON array from response
-            start = response_text.find("[")
-            end = response_text.rfind("]") + 1
+            # Extract the JSON array from each response
             chapters = []
-            if start >= 0 and end > start:
-                try:
-                    chapters = json.loads(response_text[start:end])
-                except json.JSONDecodeError:
-                    chapters = []
+            for response_text in responses:
+                start = response_text.find("[")
+                end = response_text.rfind("]") + 1
+                if start >= 0 and end > start:
+                    try:
+                        chapters.extend(json.loads(response_text[start:end]))
+                    except json.JSONDecodeError:
+                        pass
 
             if not chapters:
                 # Fallback: create chapters based on text length
@@ -994,10 +1034,12 @@ class TranscriptionService:
         prompt_instruction = style_prompts.get(style, style_prompts["executive"])
 
         try:
-            from app.ai_assistant.service import AIAssistantService
+            from app.ai_assistant.long_text import map_reduce
 
-            result = await AIAssistantService.process_text_with_provider(
-                text=f"{prompt_instruction}\n\nTranscript:\n{job.text[:8000]}",
+            result = await map_reduce(
+                job.text,
+                prompt_instruction,
+                label="transcript",
                 task="summarize",
                 provider_name="gemini",
                 user_id=user_id,
@@ -1071,34 +1113,51 @@ class TranscriptionService:
 
         # Strategy 1: AI-powered keyword extraction
         try:
-            from app.ai_assistant.service import AIAssistantService
+            from app.ai_assistant.long_text import map_prompts, split_text
 
-            prompt = (
+            instruction = (
                 "Extract the key topics, entities, and keywords from this transcript. "
                 "Return a JSON array of objects with keys: keyword (string), "
                 "score (float 0-1 indicating importance), category (one of: topic, entity, "
                 "person, organization, location, concept, technical_term). "
                 "Return 10-25 keywords sorted by score descending. "
-                "Respond ONLY with the JSON array.\n\n"
-                f"Transcript:\n{job.text[:8000]}"
+                "Respond ONLY with the JSON array."
             )
-
-            result = await AIAssistantService.process_text_with_provider(
-                text=prompt,
+            chunks = split_text(job.text)
+            responses = await map_prompts(
+                [f"{instruction}\n\nTranscript:\n{chunk}" for chunk in chunks],
                 task="extract",
                 provider_name="gemini",
                 user_id=user_id,
                 module="transcription",
+                cache=len(chunks) > 1,
             )
 
-            response_text = result.get("processed_text", "[]")
-            start = response_text.find("[")
-            end = response_text.rfind("]") + 1
-            if start >= 0 and end > start:
+            # Merge per-chunk keywords: highest score wins, small boost per
+            # extra chunk the keyword appears in.
+            merged: dict[str, dict] = {}
+            for response_text in responses:
+                start = response_text.find("[")
+                end = response_text.rfind("]") + 1
+                if start < 0 or end <= start:
+                    continue
                 try:
-                    keywords = json.loads(response_text[start:end])
+                    found = json.loads(response_text[start:end])
                 except json.JSONDecodeError:
-                    keywords = []
+                    continue
+                for item in found:
+                    if not isinstance(item, dict) or not item.get("keyword"):
+                        continue
+                    key = str(item["keyword"]).lower()
+                    if key in merged:
+                        best = merged[key]
+                        score = max(float(best.get("score", 0)), float(item.get("score", 0)))
+                        best["score"] = round(min(1.0, score + 0.05), 4)
+                    else:
+                        merged[key] = dict(item)
+            keywords = sorted(merged.values(), key=lambda k: k.get("score", 0), reverse=True)
+            if len(chunks) > 1:
+                keywords = keywords[:25]
 
         except Exception as e:
             logger.warning("extract_keywords_ai_failed", error=str(e))
@@ -1160,20 +1219,13 @@ class TranscriptionService:
 
         return keywords
 
-    async def export_transcript(
+    async def get_exportable_job(
         self,
         transcription_id: UUID,
         user_id: UUID,
         session: AsyncSession,
-        fmt: str = "txt",
-    ) -> dict:
-        """
-        Export transcription in multiple formats.
-
-        Supported: srt (SubRip), vtt (WebVTT), txt (plain), md (markdown), json (structured).
-        """
-        import json as json_module
-
+    ) -> Transcription:
+        """The user's completed transcription; raises ValueError or PermissionError."""
         job = await session.get(Transcription, transcription_id)
         if not job:
             raise ValueError("Transcription not found")
@@ -1181,165 +1233,33 @@ class TranscriptionService:
             raise PermissionError("Access denied")
         if job.status != TranscriptionStatus.COMPLETED or not job.text:
             raise ValueError("Transcription is not completed or has no text")
+        return job
 
-        text = job.text
-        duration = job.duration_seconds or 0
-        title = job.video_url
-
-        # Parse chapters from metadata if available
-        chapters = []
-        if job.metadata_json:
-            try:
-                meta = json_module.loads(job.metadata_json)
-                chapters = meta.get("chapters", [])
-            except json_module.JSONDecodeError:
-                pass
+    async def export_transcript(
+        self,
+        transcription_id: UUID,
+        user_id: UUID,
+        session: AsyncSession,
+        fmt: str = "txt",
+    ) -> dict:
+        """
+        Export transcription in multiple formats.
 
-        if fmt == "srt":
-            content = self._format_srt(text, duration)
-            filename = f"transcription_{str(transcription_id)[:8]}.srt"
-        elif fmt == "vtt":
-            content = self._format_vtt(text, duration)
-            filename = f"transcription_{str(transcription_id)[:8]}.vtt"
-        elif fmt == "md":
-            content = self._format_markdown(text, title, chapters, duration)
-            filename = f"transcription_{str(transcription_id)[:8]}.md"
-        elif fmt == "json":
-            content = self._format_json(job)
-            filename = f"transcription_{str(transcription_id)[:8]}.json"
-        else:  # txt
-            content = text
-            filename = f"transcription_{str(transcription_id)[:8]}.txt"
+        Supported: srt (SubRip), vtt (WebVTT), jsonl (one cue per line),
+        txt (plain), md (markdown), json (structured).  The formatting lives
+        in transcription.export, which also backs the streaming download.
+        """
+        job = await self.get_exportable_job(transcription_id, user_id, session)
+        if fmt not in export.WRITERS:
+            fmt = "txt"
 
         return {
             "transcription_id": str(transcription_id),
             "format": fmt,
-            "content": content,
-            "filename": filename,
-        }
-
-    @staticmethod
-    def _format_srt(text: str, duration: int) -> str:
-        """Format text as SRT subtitle file."""
-        lines = [s.strip() for s in text.split(". ") if s.strip()]
-        if not lines:
-            return ""
-
-        srt_parts = []
-        time_per_line = max(duration / len(lines), 2.0) if duration > 0 else 3.0
-
-        for i, line in enumerate(lines):
-            start_sec = i * time_per_line
-            end_sec = start_sec + time_per_line
-
-            start_h = int(start_sec // 3600)
-            start_m = int((start_sec % 3600) // 60)
-            start_s = int(start_sec % 60)
-            start_ms = int((start_sec % 1) * 1000)
-
-            end_h = int(end_sec // 3600)
-            end_m = int((end_sec % 3600) // 60)
-            end_s = int(end_sec % 60)
-            end_ms = int((end_sec % 1) * 1000)
-
-            srt_parts.append(
-                f"{i + 1}\n"
-                f"{start_h:02d}:{start_m:02d}:{start_s:02d},{start_ms:03d} --> "
-                f"{end_h:02d}:{end_m:02d}:{end_s:02d},{end_ms:03d}\n"
-                f"{line}.\n"
-            )
-
-        return "\n".join(srt_parts)
-
-    @staticmethod
-    def _format_vtt(text: str, duration: int) -> str:
-        """Format text as WebVTT subtitle file."""
-        lines = [s.strip() for s in text.split(". ") if s.strip()]
-        if not lines:
-            return "WEBVTT\n\n"
-
-        vtt_parts = ["WEBVTT\n"]
-        time_per_line = max(duration / len(lines), 2.0) if duration > 0 else 3.0
-
-        for i, line in enumerate(lines):
-            start_sec = i * time_per_line
-            end_sec = start_sec + time_per_line
-
-            start_h = int(start_sec // 3600)
-            start_m = int((start_sec % 3600) // 60)
-            start_s = int(start_sec % 60)
-            start_ms = int((start_sec % 1) * 1000)
-
-            end_h = int(end_sec // 3600)
-            end_m = int((end_sec % 3600) // 60)
-            end_s = int(end_sec % 60)
-            end_ms = int((end_sec % 1) * 1000)
-
-            vtt_parts.append(
-                f"\n{start_h:02d}:{start_m:02d}:{start_s:02d}.{start_ms:03d} --> "
-                f"{end_h:02d}:{end_m:02d}:{end_s:02d}.{end_ms:03d}\n"
-                f"{line}.\n"
-            )
-
-        return "\n".join(vtt_parts)
-
-    @staticmethod
-    def _format_markdown(text: str, title: str, chapters: list, duration: int) -> str:
-        """Format transcript as Markdown with optional chapters."""
-        parts = [f"# Transcript\n\n**Source:** {title}\n"]
-
-        if duration:
-            minutes = duration // 60
-            seconds = duration % 60
-            parts.append(f"**Duration:** {minutes}m {seconds}s\n")
-
-        parts.append("---\n")
-
-        if chapters:
-            parts.append("## Chapters\n")
-            for ch in chapters:
-                start = ch.get("start_time", 0)
-                m, s = int(start // 60), int(start % 60)
-                parts.append(f"### [{m:02d}:{s:02d}] {ch.get('title', 'Chapter')}\n")
-                if ch.get("summary"):
-                    parts.append(f"_{ch['summary']}_\n")
-            parts.append("---\n")
-
-        parts.append("## Full Transcript\n")
-        parts.append(text)
-        parts.append("\n")
-
-        return "\n".join(parts)
-
-    @staticmethod
-    def _format_json(job) -> str:
-        """Format transcript as structured JSON."""
-        import json as json_module
-
-        metadata = {}
-        if job.metadata_json:
-            try:
-                metadata = json_module.loads(job.metadata_json)
-            except json_module.JSONDecodeError:
-                pass
-
-        data = {
-            "id": str(job.id),
-            "video_url": job.video_url,
-            "language": job.language,
-            "status": job.status.value if hasattr(job.status, "value") else str(job.status),
-            "text": job.text,
-            "confidence": job.confidence,
-            "duration_seconds": job.duration_seconds,
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-            "chapters": metadata.get("chapters", []),
-            "summaries": metadata.get("summaries", {}),
-            "keywords": metadata.get("keywords", []),
+            "content": "".join(export.write(job, fmt)),
+            "filename": export.filename(job, fmt),
         }
 
-        return json_module.dumps(data, indent=2, ensure_ascii=False)
-
     @staticmethod
     async def get_youtube_metadata(url: str) -> dict:
         """
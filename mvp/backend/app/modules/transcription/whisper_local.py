@@ -18,11 +18,16 @@ from typing import Optional
 
 import structlog
 
+from app.inference import client as inference_client
+
 logger = structlog.get_logger()
 
 _model = None
 _model_size = None
 
+# Long files take minutes; the server processes one file per batch
+REMOTE_TIMEOUT_SECONDS = 3600.0
+
 # Supported model variants (standard + distil + turbo)
 SUPPORTED_MODELS = [
     "tiny", "tiny.en",
@@ -122,28 +127,38 @@ async def transcribe(
         dict with text, language, segments, duration_seconds, confidence
         None if faster-whisper is not available
     """
-    if not is_available():
-        return None
+    options = {
+        "task": task,
+        "initial_prompt": initial_prompt,
+        "hotwords": hotwords,
+        "hallucination_silence_threshold": hallucination_silence_threshold,
+        "repetition_penalty": repetition_penalty,
+        "log_progress": log_progress,
+        "clip_timestamps": clip_timestamps,
+    }
 
-    model = _get_model(model_size)
-    if model is None:
-        return None
+    # The shared inference server (same filesystem) owns the model when configured
+    remote = await inference_client.infer(
+        "whisper",
+        [audio_path],
+        {"model_size": model_size, "language": language, **options},
+        timeout=REMOTE_TIMEOUT_SECONDS,
+    )
+
+    if remote is None:
+        if not is_available():
+            return None
+
+        model = _get_model(model_size)
+        if model is None:
+            return None
 
     try:
-        # Run transcription in thread (CPU-bound)
-        result = await asyncio.to_thread(
-            _transcribe_sync,
-            model,
-            audio_path,
-            language,
-            task=task,
-            initial_prompt=initial_prompt,
-            hotwords=hotwords,
-            hallucination_silence_threshold=hallucination_silence_threshold,
-            repetition_penalty=repetition_penalty,
-            log_progress=log_progress,
-            clip_timestamps=clip_timestamps,
-        )
+        if remote is not None:
+            result = remote[0]
+        else:
+            # Run transcription in thread (CPU-bound)
+            result = await asyncio.to_thread(_transcribe_sync, model, audio_path, language, **options)
 
         # Add diarization if requested
         if with_diarization and result:
@@ -159,6 +174,17 @@ async def transcribe(
         return None
 
 
+def transcribe_local_batch(audio_paths: list[str], options: dict) -> list[dict]:
+    """Transcribe files one after another with this process's model (server side)."""
+    options = dict(options)
+    model_size = options.pop("model_size", "base")
+    language = options.pop("language", None)
+    model = _get_model(model_size)
+    if model is None:
+        raise RuntimeError("faster-whisper is not available")
+    return [_transcribe_sync(model, path, language, **options) for path in audio_paths]
+
+
 def _transcribe_sync(
     model,
     audio_path: str,
@@ -0,0 +1,63 @@
+"""
+PostgreSQL full-text helpers for the unified search fallback.
+
+Each searchable column has two GIN indexes (migration
+``unified_search_fts_022``):
+
+- ``to_tsvector('simple', coalesce(col, ''))`` for word / phrase queries
+- ``col gin_trgm_ops`` (pg_trgm) so substring ``ILIKE`` matches stay indexed
+
+The expressions built here must match the index expressions textually,
+which is why the text search configuration is inlined as a literal rather
+than passed as a bound parameter.
+"""
+
+from sqlalchemy import func, literal_column, or_
+
+# Language-agnostic configuration: content is multilingual, so no stemming
+FTS_CONFIG = literal_column("'simple'::regconfig")
+
+# Score weight added on top of each source's base score (ts_rank_cd is
+# normalised to 0..1 with flag 32)
+RANK_WEIGHT = 0.3
+
+_MAX_QUERY_LENGTH = 100
+
+
+def tsvector(column):
+    return func.to_tsvector(FTS_CONFIG, func.coalesce(column, literal_column("''")))
+
+
+def tsquery(query: str):
+    return func.websearch_to_tsquery(FTS_CONFIG, query[:_MAX_QUERY_LENGTH])
+
+
+def like_pattern(query: str) -> str:
+    """Return a ``%query%`` pattern with LIKE wildcards escaped."""
+    escaped = (
+        query[:_MAX_QUERY_LENGTH]
+        .replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+    )
+    return f"%{escaped}%"
+
+
+def match(query: str, *columns):
+    """Full-text OR trigram substring match on any of ``columns``."""
+    tsq = tsquery(query)
+    pattern = like_pattern(query)
+    clauses = []
+    for column in columns:
+        clauses.append(tsvector(column).op("@@")(tsq))
+        clauses.append(column.ilike(pattern, escape="\\"))
+    return or_(*clauses)
+
+
+def rank(query: str, column):
+    """Cover-density rank of ``column`` against ``query`` in 0..1."""
+    return func.ts_rank_cd(tsvector(column), tsquery(query), 32)
+
+
+def score(base: float, rank_value) -> float:
+    return round(base + RANK_WEIGHT * float(rank_value or 0), 4)
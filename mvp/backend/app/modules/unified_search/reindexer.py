@@ -0,0 +1,319 @@
+"""
+Streaming Meilisearch reindexer for unified search.
+
+A full rebuild never empties the live index: rows are paged out of
+PostgreSQL with keyset pagination (``id > last_id ORDER BY id``) and pushed
+in fixed-size batches into a shadow index (``us_<module>__shadow``), with
+a bounded number of batches in flight while the next page is read.  Once
+every batch task has succeeded the shadow is swapped with the live index in
+one atomic Meilisearch ``swap-indexes`` operation and the old documents are
+dropped.
+
+A delta sync pushes only rows changed since the module's watermark
+(``updated_at``, or ``created_at`` for append-only tables) straight into
+the live index.  Delta syncs do not see deletions; the periodic full
+rebuild removes those.  Watermarks are kept in Redis; without one a delta
+request falls back to a full rebuild.
+
+The Meilisearch client is synchronous, so calls go through
+``asyncio.to_thread``.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from typing import Callable, Optional
+
+import structlog
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = structlog.get_logger()
+
+BATCH_SIZE = 1000
+MAX_IN_FLIGHT = 4
+TASK_TIMEOUT_MS = 600_000
+
+FILTERABLE_ATTRIBUTES = ["user_id", "module", "type"]
+SEARCHABLE_ATTRIBUTES = ["title", "content"]
+
+_WATERMARK_KEY = "saas_ia:search:reindex_watermark:{module}"
+
+
+# ---------------------------------------------------------------------------
+# Module sources
+# ---------------------------------------------------------------------------
+
+class _Source:
+    """How to page one module's rows and turn them into documents."""
+
+    def __init__(self, model, columns: Callable, where: Callable, changed_at: Callable, to_doc: Callable, join=None):
+        self.model = model
+        self.columns = columns
+        self.where = where
+        self.changed_at = changed_at
+        self.to_doc = to_doc
+        self.join = join
+
+
+def _transcriptions() -> _Source:
+    from app.models.transcription import Transcription, TranscriptionStatus
+
+    return _Source(
+        model=Transcription,
+        columns=lambda: [Transcription],
+        where=lambda: [Transcription.status == TranscriptionStatus.COMPLETED],
+        changed_at=lambda: Transcription.updated_at,
+        to_doc=lambda row: {
+            "id": str(row[0].id),
+            "module": "transcriptions",
+            "type": "transcription",
+            "title": row[0].original_filename or (row[0].video_url or "")[:60],
+            "content": (row[0].text or "")[:50_000],
+            "user_id": str(row[0].user_id),
+            "url": f"/transcription?id={row[0].id}",
+            "created_at": row[0].created_at.isoformat() if row[0].created_at else "",
+        },
+    )
+
+
+def _content() -> _Source:
+    from app.models.content_studio import GeneratedContent
+
+    return _Source(
+        model=GeneratedContent,
+        columns=lambda: [GeneratedContent],
+        where=lambda: [],
+        changed_at=lambda: GeneratedContent.updated_at,
+        to_doc=lambda row: {
+            "id": str(row[0].id),
+            "module": "content",
+            "type": "content",
+            "title": row[0].title or row[0].format,
+            "content": (row[0].content or "")[:50_000],
+            "user_id": str(row[0].user_id),
+            "url": "/content-studio",
+            "format": row[0].format if hasattr(row[0], "format") else "",
+        },
+    )
+
+
+def _conversations() -> _Source:
+    from app.models.conversation import Conversation, Message
+
+    return _Source(
+        model=Message,
+        columns=lambda: [Message, Conversation.user_id],
+        join=lambda q: q.join(Conversation, Message.conversation_id == Conversation.id),
+        where=lambda: [],
+        changed_at=lambda: Message.created_at,
+        to_doc=lambda row: {
+            "id": str(row[0].id),
+            "module": "conversations",
+            "type": "conversation",
+            "title": "Chat message",
+            "content": (row[0].content or "")[:50_000],
+            "user_id": str(row[1]),
+            "url": "/chat",
+        },
+    )
+
+
+def _knowledge() -> _Source:
+    from app.models.knowledge import Document, DocumentChunk
+
+    return _Source(
+        model=DocumentChunk,
+        columns=lambda: [DocumentChunk, Document.filename],
+        join=lambda q: q.join(Document, DocumentChunk.document_id == Document.id),
+        where=lambda: [],
+        changed_at=lambda: DocumentChunk.created_at,
+        to_doc=lambda row: {
+            "id": str(row[0].id),
+            "module": "knowledge",
+            "type": "document",
+            "title": row[1] or "Document",
+            "content": (row[0].content or "")[:50_000],
+            "user_id": str(row[0].user_id),
+            "document_id": str(row[0].document_id),
+            "url": "/knowledge",
+        },
+    )
+
+
+SOURCES: dict[str, Callable[[], _Source]] = {
+    "transcriptions": _transcriptions,
+    "knowledge": _knowledge,
+    "content": _content,
+    "conversations": _conversations,
+}
+
+
+async def iter_documents(
+    source: _Source,
+    session: AsyncSession,
+    since: Optional[datetime] = None,
+    batch_size: int = BATCH_SIZE,
+):
+    """Yield lists of documents, one keyset page at a time."""
+    last_id = None
+    while True:
+        query = select(*source.columns())
+        if source.join is not None:
+            query = source.join(query)
+        conditions = list(source.where())
+        if since is not None:
+            conditions.append(source.changed_at() >= since)
+        if last_id is not None:
+            conditions.append(source.model.id > last_id)
+        query = query.where(*conditions).order_by(source.model.id).limit(batch_size)
+
+        rows = (await session.execute(query)).all()
+        if not rows:
+            return
+        last_id = rows[-1][0].id
+        yield [source.to_doc(row) for row in rows]
+        if len(rows) < batch_size:
+            return
+
+
+# ---------------------------------------------------------------------------
+# Meilisearch helpers
+# ---------------------------------------------------------------------------
+
+def _task_uid(task_info) -> int:
+    if isinstance(task_info, dict):
+        return task_info.get("taskUid", task_info.get("uid"))
+    return getattr(task_info, "task_uid", None)
+
+
+async def _wait(client, task_info) -> None:
+    """Wait for a Meilisearch task and raise if it did not succeed."""
+    uid = _task_uid(task_info)
+    if uid is None:
+        return
+    task = await asyncio.to_thread(client.wait_for_task, uid, TASK_TIMEOUT_MS)
+    status = task.get("status") if isinstance(task, dict) else getattr(task, "status", None)
+    if status != "succeeded":
+        error = task.get("error") if isinstance(task, dict) else getattr(task, "error", None)
+        raise RuntimeError(f"meilisearch task {uid} {status}: {error}")
+
+
+async def _index_exists(client, uid: str) -> bool:
+    try:
+        await asyncio.to_thread(client.get_index, uid)
+        return True
+    except Exception:
+        return False
+
+
+async def _prepare_index(client, uid: str, recreate: bool) -> None:
+    if recreate and await _index_exists(client, uid):
+        await _wait(client, await asyncio.to_thread(client.delete_index, uid))
+    if not await _index_exists(client, uid):
+        await _wait(client, await asyncio.to_thread(client.create_index, uid, {"primaryKey": "id"}))
+    index = client.index(uid)
+    await _wait(client, await asyncio.to_thread(index.update_filterable_attributes, FILTERABLE_ATTRIBUTES))
+    await _wait(client, await asyncio.to_thread(index.update_searchable_attributes, SEARCHABLE_ATTRIBUTES))
+
+
+async def _push_all(client, index_uid: str, batches, max_in_flight: int = MAX_IN_FLIGHT) -> int:
+    """Push document batches with at most ``max_in_flight`` unconfirmed batches."""
+    index = client.index(index_uid)
+    semaphore = asyncio.Semaphore(max_in_flight)
+    in_flight: list[asyncio.Task] = []
+    pushed = 0
+
+    async def _push(docs: list[dict]) -> None:
+        try:
+            await _wait(client, await asyncio.to_thread(index.add_documents, docs, "id"))
+        finally:
+            semaphore.release()
+
+    try:
+        async for docs in batches:
+            await semaphore.acquire()
+            for task in in_flight:
+                if task.done() and task.exception() is not None:
+                    raise task.exception()
+            in_flight = [t for t in in_flight if not t.done()]
+            in_flight.append(asyncio.create_task(_push(docs)))
+            pushed += len(docs)
+        await asyncio.gather(*in_flight)
+    except BaseException:
+        for task in in_flight:
+            task.cancel()
+        raise
+    return pushed
+
+
+# ---------------------------------------------------------------------------
+# Watermarks
+# ---------------------------------------------------------------------------
+
+async def get_watermark(module: str) -> Optional[datetime]:
+    from app.cache import _get_redis
+
+    client = await _get_redis()
+    if client is None:
+        return None
+    try:
+        raw = await client.get(_WATERMARK_KEY.format(module=module))
+    except Exception as e:
+        logger.warning("search_reindex_watermark_read_failed", module=module, error=str(e))
+        return None
+    return datetime.fromisoformat(raw) if raw else None
+
+
+async def set_watermark(module: str, value: datetime) -> None:
+    from app.cache import _get_redis
+
+    client = await _get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(_WATERMARK_KEY.format(module=module), value.isoformat())
+    except Exception as e:
+        logger.warning("search_reindex_watermark_write_failed", module=module, error=str(e))
+
+
+# ---------------------------------------------------------------------------
+# Entry points
+# ---------------------------------------------------------------------------
+
+async def rebuild(client, module: str, session: AsyncSession, batch_size: int = BATCH_SIZE) -> dict:
+    """Full rebuild into a shadow index, then atomic swap with the live one."""
+    source = SOURCES[module]()
+    live_uid = f"us_{module}"
+    shadow_uid = f"{live_uid}__shadow"
+    # Rows changed while the rebuild runs are picked up by the next delta
+    started_at = datetime.now(UTC).replace(tzinfo=None)
+
+    await _prepare_index(client, shadow_uid, recreate=True)
+    indexed = await _push_all(client, shadow_uid, iter_documents(source, session, batch_size=batch_size))
+
+    if not await _index_exists(client, live_uid):
+        await _wait(client, await asyncio.to_thread(client.create_index, live_uid, {"primaryKey": "id"}))
+    await _wait(client, await asyncio.to_thread(client.swap_indexes, [{"indexes": [live_uid, shadow_uid]}]))
+    # The shadow uid now holds the previous generation
+    await _wait(client, await asyncio.to_thread(client.delete_index, shadow_uid))
+
+    await set_watermark(module, started_at)
+    logger.info("meilisearch_reindex_complete", module=module, mode="full", indexed=indexed)
+    return {"status": "ok", "module": module, "mode": "full", "indexed": indexed}
+
+
+async def delta_sync(client, module: str, session: AsyncSession, batch_size: int = BATCH_SIZE) -> dict:
+    """Upsert rows changed since the watermark into the live index."""
+    watermark = await get_watermark(module)
+    if watermark is None or not await _index_exists(client, f"us_{module}"):
+        return await rebuild(client, module, session, batch_size=batch_size)
+
+    source = SOURCES[module]()
+    started_at = datetime.now(UTC).replace(tzinfo=None)
+    indexed = await _push_all(
+        client, f"us_{module}", iter_documents(source, session, since=watermark, batch_size=batch_size),
+    )
+
+    await set_watermark(module, started_at)
+    logger.info("meilisearch_reindex_complete", module=module, mode="delta", indexed=indexed)
+    return {"status": "ok", "module": module, "mode": "delta", "indexed": indexed, "since": watermark.isoformat()}
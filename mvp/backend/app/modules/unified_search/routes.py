@@ -77,14 +77,15 @@ async def index_document(
 async def reindex_module(
     request: Request,
     module_name: str,
+    mode: str = Query("full", pattern="^(full|delta)$", description="full rebuild or delta sync"),
     current_user: User = Depends(require_verified_email),
     session: AsyncSession = Depends(get_session),
 ):
-    """Rebuild Meilisearch index for a specific module from PostgreSQL data."""
+    """Rebuild (or delta-sync) the Meilisearch index for a module from PostgreSQL data."""
     if current_user.role != Role.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Reindex is restricted to admin users.",
         )
-    result = await UnifiedSearchService.reindex_module(module_name, session)
+    result = await UnifiedSearchService.reindex_module(module_name, session, mode=mode)
     return result
@@ -1,4 +1,6 @@
 """Unified Search schemas."""
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -16,3 +18,6 @@ class UnifiedSearchResponse(BaseModel):
     total: int
     results: list[dict]
     facets: dict
+    # PostgreSQL path only: per-source "ok" | "timeout" | "error"
+    facet_status: Optional[dict[str, str]] = None
+    partial: bool = False
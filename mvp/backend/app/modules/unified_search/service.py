@@ -7,8 +7,9 @@ analyses, and more. Returns faceted results with cross-module RAG synthesis.
 Uses Meilisearch if available, falls back to PostgreSQL full-text search.
 """
 
-import json
+import asyncio
 import os
+import time
 from datetime import UTC, datetime
 from typing import Optional
 from uuid import UUID
@@ -21,9 +22,13 @@ try:
 except ImportError:
     HAS_MEILISEARCH = False
 
-from sqlmodel import select, or_
+import sqlalchemy as sa
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.config import settings
+from app.modules.unified_search import fulltext, reindexer
+
 logger = structlog.get_logger()
 
 # ---------------------------------------------------------------------------
@@ -79,7 +84,7 @@ class UnifiedSearchService:
         """Search across all modules.
 
         Tries Meilisearch first if available for fast, typo-tolerant search.
-        Falls back to PostgreSQL ILIKE-based search when Meilisearch is
+        Falls back to PostgreSQL full-text search when Meilisearch is
         unavailable or returns an error.
 
         Returns results grouped by module with relevance scoring.
@@ -98,7 +103,7 @@ class UnifiedSearchService:
                     )
                     return ms_result
                 # Meilisearch returned 0 results - fall through to DB search
-                # which may still find ILIKE matches for content not yet indexed.
+                # which may still find matches for content not yet indexed.
             except Exception as e:
                 logger.warning("meilisearch_search_failed_fallback_to_db", error=str(e))
 
@@ -115,11 +120,18 @@ class UnifiedSearchService:
         modules: Optional[list[str]] = None,
         limit: int = 20,
     ) -> dict:
-        """PostgreSQL ILIKE-based search across modules (original implementation)."""
+        """PostgreSQL full-text search across modules.
+
+        Sources are queried concurrently, each on its own pooled session and
+        with its own deadline (``UNIFIED_SEARCH_SOURCE_TIMEOUT_MS``).  A
+        source that times out or fails contributes no results and is flagged
+        in ``facet_status``; ``partial`` is True when any source did not
+        answer.
+        """
         results = []
         facets = {}
+        facet_status = {}
 
-        # Search each module in parallel-ish (sequential for simplicity)
         search_fns = {
             "transcriptions": UnifiedSearchService._search_transcriptions,
             "knowledge": UnifiedSearchService._search_knowledge,
@@ -127,20 +139,20 @@ class UnifiedSearchService:
             "conversations": UnifiedSearchService._search_conversations,
         }
 
-        target_modules = modules or list(search_fns.keys())
+        target_modules = [m for m in (modules or list(search_fns.keys())) if m in search_fns]
+        timeout_ms = settings.UNIFIED_SEARCH_SOURCE_TIMEOUT_MS
 
-        for module_name in target_modules:
-            fn = search_fns.get(module_name)
-            if fn:
-                try:
-                    module_results = await fn(user_id, query, session, limit=limit)
-                    for r in module_results:
-                        r["_module"] = module_name
-                    results.extend(module_results)
-                    facets[module_name] = len(module_results)
-                except Exception as e:
-                    logger.debug(f"search_{module_name}_failed", error=str(e))
-                    facets[module_name] = 0
+        outcomes = await asyncio.gather(*(
+            UnifiedSearchService._run_source(name, search_fns[name], user_id, query, limit, timeout_ms)
+            for name in target_modules
+        ))
+
+        for module_name, (status, module_results) in zip(target_modules, outcomes):
+            for r in module_results:
+                r["_module"] = module_name
+            results.extend(module_results)
+            facets[module_name] = len(module_results)
+            facet_status[module_name] = status
 
         # Sort all results by score descending
         results.sort(key=lambda x: x.get("score", 0), reverse=True)
@@ -150,8 +162,50 @@ class UnifiedSearchService:
             "total": len(results),
             "results": results[:limit],
             "facets": facets,
+            "facet_status": facet_status,
+            "partial": any(s != "ok" for s in facet_status.values()),
         }
 
+    @staticmethod
+    async def _run_source(
+        module_name: str,
+        fn,
+        user_id: UUID,
+        query: str,
+        limit: int,
+        timeout_ms: int,
+    ) -> tuple[str, list[dict]]:
+        """Run one search source on a dedicated session within its deadline.
+
+        The same budget is set as the transaction's ``statement_timeout`` so
+        Postgres stops working on a query the caller has given up on.
+        Returns ``(status, results)`` with status "ok", "timeout" or "error".
+        """
+        from app.database import get_session_context
+
+        async def _run() -> list[dict]:
+            async with get_session_context() as source_session:
+                await source_session.execute(sa.text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+                return await fn(user_id, query, source_session, limit=limit)
+
+        started = time.perf_counter()
+        try:
+            module_results = await asyncio.wait_for(_run(), timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            logger.warning("search_source_timeout", module=module_name, timeout_ms=timeout_ms)
+            return "timeout", []
+        except Exception as e:
+            logger.debug(f"search_{module_name}_failed", error=str(e))
+            return "error", []
+
+        logger.debug(
+            "search_source_done",
+            module=module_name,
+            hits=len(module_results),
+            took_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        return "ok", module_results
+
     @staticmethod
     async def search_and_answer(
         user_id: UUID,
@@ -318,11 +372,14 @@ Answer:""",
     async def reindex_module(
         module_name: str,
         session: AsyncSession,
+        mode: str = "full",
     ) -> dict:
-        """Rebuild the Meilisearch index for a given module.
+        """Rebuild or incrementally sync the Meilisearch index for a module.
 
-        Fetches all relevant rows from PostgreSQL and pushes them into a
-        fresh Meilisearch index.  Returns stats about the operation.
+        ``mode="full"`` streams every row into a shadow index and swaps it
+        in, so search keeps serving the previous generation meanwhile.
+        ``mode="delta"`` only pushes rows changed since the last sync.
+        See ``reindexer`` for details.  Returns stats about the operation.
 
         Falls back gracefully if Meilisearch is not available.
         """
@@ -330,128 +387,19 @@ Answer:""",
         if client is None:
             return {"status": "skipped", "reason": "meilisearch_unavailable"}
 
-        index_name = f"us_{module_name}"
-
-        # Delete existing index to start fresh
-        try:
-            client.delete_index(index_name)
-        except Exception:
-            pass  # Index may not exist yet
-
-        # Create index with filterable attributes
-        try:
-            client.create_index(index_name, {"primaryKey": "id"})
-            index = client.index(index_name)
-            index.update_filterable_attributes(["user_id", "module", "type"])
-            index.update_searchable_attributes(["title", "content"])
-        except Exception as e:
-            logger.warning("meilisearch_create_index_failed", index=index_name, error=str(e))
-            return {"status": "error", "reason": str(e)}
+        if module_name not in reindexer.SOURCES:
+            return {"status": "error", "reason": f"unknown module: {module_name}"}
 
-        # Fetch documents from DB per module
-        indexed = 0
         try:
-            if module_name == "transcriptions":
-                from app.models.transcription import Transcription, TranscriptionStatus
-                result = await session.execute(
-                    select(Transcription).where(
-                        Transcription.status == TranscriptionStatus.COMPLETED,
-                    )
-                )
-                docs = []
-                for t in result.scalars().all():
-                    docs.append({
-                        "id": str(t.id),
-                        "module": "transcriptions",
-                        "type": "transcription",
-                        "title": t.original_filename or (t.video_url or "")[:60],
-                        "content": (t.text or "")[:50_000],
-                        "user_id": str(t.user_id),
-                        "url": f"/transcription?id={t.id}",
-                        "created_at": t.created_at.isoformat() if t.created_at else "",
-                    })
-                if docs:
-                    index.add_documents(docs, primary_key="id")
-                indexed = len(docs)
-
-            elif module_name == "content":
-                from app.models.content_studio import GeneratedContent
-                result = await session.execute(select(GeneratedContent))
-                docs = []
-                for c in result.scalars().all():
-                    docs.append({
-                        "id": str(c.id),
-                        "module": "content",
-                        "type": "content",
-                        "title": c.title or c.format,
-                        "content": (c.content or "")[:50_000],
-                        "user_id": str(c.user_id),
-                        "url": "/content-studio",
-                        "format": c.format if hasattr(c, "format") else "",
-                    })
-                if docs:
-                    index.add_documents(docs, primary_key="id")
-                indexed = len(docs)
-
-            elif module_name == "conversations":
-                from app.models.conversation import Message, Conversation
-                result = await session.execute(
-                    select(Message, Conversation.user_id)
-                    .join(Conversation, Message.conversation_id == Conversation.id)
-                )
-                docs = []
-                for m, uid in result.all():
-                    docs.append({
-                        "id": str(m.id) if hasattr(m, "id") else "",
-                        "module": "conversations",
-                        "type": "conversation",
-                        "title": "Chat message",
-                        "content": (m.content if hasattr(m, "content") else "")[:50_000],
-                        "user_id": str(uid),
-                        "url": "/chat",
-                    })
-                if docs:
-                    index.add_documents(docs, primary_key="id")
-                indexed = len(docs)
-
-            elif module_name == "knowledge":
-                # Knowledge base chunks
-                import sqlalchemy as sa
-                result = await session.execute(
-                    sa.text(
-                        "SELECT dc.id, dc.content, dc.document_id, d.filename, d.user_id "
-                        "FROM document_chunks dc "
-                        "JOIN documents d ON dc.document_id = d.id"
-                    )
-                )
-                docs = []
-                for row in result.all():
-                    docs.append({
-                        "id": str(row[0]),
-                        "module": "knowledge",
-                        "type": "document",
-                        "title": row[3] or "Document",
-                        "content": (row[1] or "")[:50_000],
-                        "user_id": str(row[4]),
-                        "document_id": str(row[2]),
-                        "url": "/knowledge",
-                    })
-                if docs:
-                    index.add_documents(docs, primary_key="id")
-                indexed = len(docs)
-
-            else:
-                return {"status": "error", "reason": f"unknown module: {module_name}"}
-
+            if mode == "delta":
+                return await reindexer.delta_sync(client, module_name, session)
+            return await reindexer.rebuild(client, module_name, session)
         except Exception as e:
-            logger.error("meilisearch_reindex_failed", module=module_name, error=str(e))
+            logger.error("meilisearch_reindex_failed", module=module_name, mode=mode, error=str(e))
             return {"status": "error", "reason": str(e)}
 
-        logger.info("meilisearch_reindex_complete", module=module_name, indexed=indexed)
-        return {"status": "ok", "module": module_name, "indexed": indexed}
-
     # ------------------------------------------------------------------
-    # PostgreSQL per-module search helpers (original implementation)
+    # PostgreSQL per-module search helpers (GIN full-text + trigram)
     # ------------------------------------------------------------------
 
     @staticmethod
@@ -460,16 +408,16 @@ Answer:""",
     ) -> list[dict]:
         """Search transcriptions by text content."""
         from app.models.transcription import Transcription, TranscriptionStatus
-        import sqlalchemy as sa
 
+        rank = fulltext.rank(query, Transcription.text).label("rank")
         result = await session.execute(
-            select(Transcription)
+            select(Transcription, rank)
             .where(
                 Transcription.user_id == user_id,
                 Transcription.status == TranscriptionStatus.COMPLETED,
-                sa.cast(Transcription.text, sa.Text).ilike(f"%{query[:100]}%"),
+                fulltext.match(query, Transcription.text),
             )
-            .order_by(Transcription.created_at.desc())
+            .order_by(rank.desc(), Transcription.created_at.desc())
             .limit(limit)
         )
         return [
@@ -477,34 +425,42 @@ Answer:""",
                 "id": str(t.id), "type": "transcription",
                 "title": t.original_filename or t.video_url[:60],
                 "content": (t.text or "")[:300],
-                "score": 0.7,
+                "score": fulltext.score(0.7, r),
                 "created_at": t.created_at.isoformat(),
                 "url": f"/transcription?id={t.id}",
             }
-            for t in result.scalars().all()
+            for t, r in result.all()
         ]
 
     @staticmethod
     async def _search_knowledge(
         user_id: UUID, query: str, session: AsyncSession, limit: int = 10,
     ) -> list[dict]:
-        """Search knowledge base (uses hybrid search if available)."""
-        try:
-            from app.modules.knowledge.service import KnowledgeService
-            results = await KnowledgeService.search(user_id, query, session, limit)
-            return [
-                {
-                    "id": str(r["chunk_id"]), "type": "document",
-                    "title": r.get("filename", "Document"),
-                    "content": r.get("content", "")[:300],
-                    "score": r.get("score", 0.5),
-                    "document_id": str(r.get("document_id", "")),
-                    "url": "/knowledge",
-                }
-                for r in results
-            ]
-        except Exception:
-            return []
+        """Search knowledge base chunks."""
+        from app.models.knowledge import Document, DocumentChunk
+
+        rank = fulltext.rank(query, DocumentChunk.content).label("rank")
+        result = await session.execute(
+            select(DocumentChunk, Document.filename, rank)
+            .join(Document, DocumentChunk.document_id == Document.id)
+            .where(
+                DocumentChunk.user_id == user_id,
+                fulltext.match(query, DocumentChunk.content),
+            )
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+        return [
+            {
+                "id": str(c.id), "type": "document",
+                "title": filename or "Document",
+                "content": (c.content or "")[:300],
+                "score": fulltext.score(0.6, r),
+                "document_id": str(c.document_id),
+                "url": "/knowledge",
+            }
+            for c, filename, r in result.all()
+        ]
 
     @staticmethod
     async def _search_content(
@@ -512,18 +468,15 @@ Answer:""",
     ) -> list[dict]:
         """Search generated content from content studio."""
         from app.models.content_studio import GeneratedContent
-        import sqlalchemy as sa
 
+        rank = fulltext.rank(query, GeneratedContent.content).label("rank")
         result = await session.execute(
-            select(GeneratedContent)
+            select(GeneratedContent, rank)
             .where(
                 GeneratedContent.user_id == user_id,
-                or_(
-                    sa.cast(GeneratedContent.content, sa.Text).ilike(f"%{query[:100]}%"),
-                    sa.cast(GeneratedContent.title, sa.Text).ilike(f"%{query[:100]}%"),
-                ),
+                fulltext.match(query, GeneratedContent.content, GeneratedContent.title),
             )
-            .order_by(GeneratedContent.created_at.desc())
+            .order_by(rank.desc(), GeneratedContent.created_at.desc())
             .limit(limit)
         )
         return [
@@ -532,10 +485,10 @@ Answer:""",
                 "title": c.title or c.format,
                 "content": c.content[:300],
                 "format": c.format,
-                "score": 0.6,
+                "score": fulltext.score(0.6, r),
                 "url": "/content-studio",
             }
-            for c in result.scalars().all()
+            for c, r in result.all()
         ]
 
     @staticmethod
@@ -544,16 +497,16 @@ Answer:""",
     ) -> list[dict]:
         """Search conversation messages."""
         from app.models.conversation import Message, Conversation
-        import sqlalchemy as sa
 
+        rank = fulltext.rank(query, Message.content).label("rank")
         result = await session.execute(
-            select(Message, Conversation.id.label("conv_id"))
+            select(Message, rank)
             .join(Conversation, Message.conversation_id == Conversation.id)
             .where(
                 Conversation.user_id == user_id,
-                sa.cast(Message.content, sa.Text).ilike(f"%{query[:100]}%"),
+                fulltext.match(query, Message.content),
             )
-            .order_by(Message.created_at.desc())
+            .order_by(rank.desc(), Message.created_at.desc())
             .limit(limit)
         )
         return [
@@ -561,8 +514,8 @@ Answer:""",
                 "id": str(m.id) if hasattr(m, 'id') else "", "type": "conversation",
                 "title": f"Chat message",
                 "content": (m.content if hasattr(m, 'content') else "")[:300],
-                "score": 0.5,
+                "score": fulltext.score(0.5, r),
                 "url": "/chat",
             }
-            for m, _ in result.all()
+            for m, r in result.all()
         ]
@@ -0,0 +1,328 @@
+"""
+Browser pool for full-render scrapes.
+
+Scrapes that need a non-default browser (proxy, user agent, stealth,
+browser_type, JavaScript disabled, ad blocking) used to launch and close a
+whole browser per call.  The pool keeps one warm ``AsyncWebCrawler`` per
+browser configuration and hands out leases on it:
+
+- a browser renders at most BROWSER_POOL_CONTEXTS_PER_BROWSER pages at once
+- at most BROWSER_POOL_MAX_BROWSERS browsers run; an idle one is closed to
+  make room for a new configuration, and browsers idle for
+  BROWSER_POOL_IDLE_SECONDS are closed
+- a browser is recycled after BROWSER_POOL_RECYCLE_AFTER_PAGES pages, or
+  as soon as it is idle while host memory is above
+  BROWSER_POOL_MEMORY_LIMIT_PERCENT
+- when the pool is saturated callers queue, and give up with
+  BrowserPoolTimeout after BROWSER_POOL_ACQUIRE_TIMEOUT_SECONDS
+
+The default browser (service.get_crawler) stays a singleton; page_slot()
+caps how many pages it renders at once.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional
+
+import structlog
+
+from app.config import settings
+from app.metrics import browser_pool_browsers, browser_pool_leases_total, browser_pool_recycles_total
+
+logger = structlog.get_logger()
+
+
+class BrowserPoolTimeout(Exception):
+    """No browser page became available within the acquire timeout."""
+
+
+@dataclass
+class _PooledBrowser:
+    key: str
+    kwargs: dict
+    crawler: Any = None
+    active: int = 0
+    pages: int = 0
+    retiring: bool = False
+    error: Optional[BaseException] = None
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+_browsers: list[_PooledBrowser] = []
+_condition: Optional[asyncio.Condition] = None
+_page_slots: Optional[asyncio.Semaphore] = None
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+def browser_kwargs(
+    proxy_url: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    browser_type: str = "chromium",
+    enable_stealth: bool = False,
+    javascript_enabled: bool = True,
+    avoid_ads: bool = False,
+) -> dict:
+    """BrowserConfig keyword arguments for a scrape's browser options."""
+    kwargs: dict = {"headless": True}
+    if proxy_url:
+        kwargs["proxy"] = proxy_url
+    if user_agent and user_agent != "random":
+        kwargs["user_agent"] = user_agent
+    elif user_agent == "random":
+        kwargs["user_agent_mode"] = "random"
+    if browser_type and browser_type != "chromium":
+        kwargs["browser_type"] = browser_type
+    if enable_stealth:
+        kwargs["enable_stealth"] = True
+    if not javascript_enabled:
+        kwargs["javascript_enabled"] = False
+    if avoid_ads:
+        kwargs["avoid_ads"] = True
+    return kwargs
+
+
+def config_key(kwargs: dict) -> str:
+    """Stable key for a browser configuration (proxy credentials are hashed, never logged)."""
+    raw = json.dumps(kwargs, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _prewarm_configs() -> list[dict]:
+    """BROWSER_POOL_PREWARM entries: "stealth", "no-js" or a browser type."""
+    configs = []
+    for token in (t.strip().lower() for t in settings.BROWSER_POOL_PREWARM.split(",")):
+        if not token:
+            continue
+        if token == "stealth":
+            configs.append(browser_kwargs(enable_stealth=True))
+        elif token == "no-js":
+            configs.append(browser_kwargs(javascript_enabled=False))
+        else:
+            configs.append(browser_kwargs(browser_type=token))
+    return configs
+
+
+def _memory_percent() -> float:
+    """Host memory in use, from /proc/meminfo (0.0 when unavailable)."""
+    try:
+        values = {}
+        with open("/proc/meminfo", "r") as fh:
+            for line in fh:
+                name, _, rest = line.partition(":")
+                values[name] = int(rest.split()[0])
+        return 100.0 * (1 - values["MemAvailable"] / values["MemTotal"])
+    except (OSError, KeyError, ValueError, IndexError, ZeroDivisionError):
+        return 0.0
+
+
+# ---------------------------------------------------------------------------
+# Browser lifecycle
+# ---------------------------------------------------------------------------
+
+def _get_condition() -> asyncio.Condition:
+    global _condition
+    if _condition is None:
+        _condition = asyncio.Condition()
+    return _condition
+
+
+async def _launch(kwargs: dict):
+    from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+    instance = AsyncWebCrawler(config=BrowserConfig(**kwargs))
+    await instance.start()
+    return instance
+
+
+async def _close(entry: _PooledBrowser, reason: str) -> None:
+    browser_pool_recycles_total.labels(reason=reason).inc()
+    if entry.crawler is None:
+        return
+    try:
+        await entry.crawler.close()
+        logger.info("browser_pool_closed", key=entry.key, pages=entry.pages, reason=reason)
+    except Exception as exc:
+        logger.warning("browser_pool_close_error", key=entry.key, error=str(exc))
+
+
+def _detach(entry: _PooledBrowser) -> None:
+    """Remove an entry from the pool (caller holds the condition)."""
+    entry.retiring = True
+    if entry in _browsers:
+        _browsers.remove(entry)
+    browser_pool_browsers.set(len(_browsers))
+
+
+def _expired_idle() -> list[_PooledBrowser]:
+    """Detach browsers idle longer than BROWSER_POOL_IDLE_SECONDS (caller holds the condition)."""
+    cutoff = time.monotonic() - settings.BROWSER_POOL_IDLE_SECONDS
+    expired = [b for b in _browsers if b.active == 0 and b.ready.is_set() and b.last_used < cutoff]
+    for entry in expired:
+        _detach(entry)
+    return expired
+
+
+async def _acquire(kwargs: dict) -> _PooledBrowser:
+    key = config_key(kwargs)
+    condition = _get_condition()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.BROWSER_POOL_ACQUIRE_TIMEOUT_SECONDS
+    to_close: list[tuple[_PooledBrowser, str]] = []
+    launch = False
+
+    try:
+        async with condition:
+            to_close.extend((b, "idle") for b in _expired_idle())
+            while True:
+                entry = next(
+                    (b for b in _browsers
+                     if b.key == key and not b.retiring and b.active < settings.BROWSER_POOL_CONTEXTS_PER_BROWSER),
+                    None,
+                )
+                if entry is not None:
+                    browser_pool_leases_total.labels(outcome="reused").inc()
+                    break
+                if len(_browsers) < settings.BROWSER_POOL_MAX_BROWSERS:
+                    entry = _PooledBrowser(key=key, kwargs=kwargs)
+                    _browsers.append(entry)
+                    browser_pool_browsers.set(len(_browsers))
+                    browser_pool_leases_total.labels(outcome="launched").inc()
+                    launch = True
+                    break
+                idle = sorted(
+                    (b for b in _browsers if b.active == 0 and b.ready.is_set()),
+                    key=lambda b: b.last_used,
+                )
+                if idle:
+                    _detach(idle[0])
+                    to_close.append((idle[0], "evicted"))
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    browser_pool_leases_total.labels(outcome="timeout").inc()
+                    raise BrowserPoolTimeout("browser pool saturated")
+                try:
+                    await asyncio.wait_for(condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    continue
+            entry.active += 1
+    finally:
+        for closing, reason in to_close:
+            await _close(closing, reason)
+
+    if launch:
+        try:
+            entry.crawler = await _launch(kwargs)
+            logger.info("browser_pool_launched", key=key, browsers=len(_browsers))
+        except BaseException as exc:
+            entry.error = exc
+            raise
+        finally:
+            entry.ready.set()
+            if entry.error is not None:
+                await _release(entry, count_page=False)
+    else:
+        await entry.ready.wait()
+        if entry.error is not None:
+            await _release(entry, count_page=False)
+            raise entry.error
+    return entry
+
+
+async def _release(entry: _PooledBrowser, count_page: bool = True) -> None:
+    condition = _get_condition()
+    reason = None
+    async with condition:
+        entry.active -= 1
+        entry.last_used = time.monotonic()
+        if count_page:
+            entry.pages += 1
+        if entry.error is not None:
+            entry.retiring, reason = True, "error"
+        elif entry.pages >= settings.BROWSER_POOL_RECYCLE_AFTER_PAGES:
+            entry.retiring, reason = True, "pages"
+        elif _memory_percent() >= settings.BROWSER_POOL_MEMORY_LIMIT_PERCENT:
+            entry.retiring, reason = True, "memory"
+        closing = entry.retiring and entry.active == 0
+        if closing:
+            _detach(entry)
+        condition.notify_all()
+    if closing:
+        await _close(entry, reason or "retired")
+
+
+@asynccontextmanager
+async def lease(kwargs: dict) -> AsyncIterator[Any]:
+    """Borrow a started AsyncWebCrawler for *kwargs* (see browser_kwargs) for one scrape.
+
+    Raises BrowserPoolTimeout when no page frees up in time.
+    """
+    entry = await _acquire(kwargs)
+    try:
+        yield entry.crawler
+    finally:
+        await _release(entry)
+
+
+@asynccontextmanager
+async def page_slot() -> AsyncIterator[None]:
+    """Reserve one of BROWSER_POOL_DEFAULT_MAX_PAGES pages on the default browser."""
+    global _page_slots
+    if _page_slots is None:
+        _page_slots = asyncio.Semaphore(settings.BROWSER_POOL_DEFAULT_MAX_PAGES)
+    try:
+        await asyncio.wait_for(_page_slots.acquire(), settings.BROWSER_POOL_ACQUIRE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        browser_pool_leases_total.labels(outcome="timeout").inc()
+        raise BrowserPoolTimeout("default browser saturated") from None
+    try:
+        yield
+    finally:
+        _page_slots.release()
+
+
+async def prewarm() -> None:
+    """Start the browsers listed in BROWSER_POOL_PREWARM. Called from lifespan startup."""
+    for kwargs in _prewarm_configs():
+        try:
+            entry = await _acquire(kwargs)
+            await _release(entry, count_page=False)
+        except Exception as exc:
+            logger.warning("browser_pool_prewarm_failed", config=config_key(kwargs), error=str(exc))
+
+
+async def close_all() -> None:
+    """Close every pooled browser. Called from lifespan shutdown."""
+    async with _get_condition():
+        entries = list(_browsers)
+        for entry in entries:
+            _detach(entry)
+    for entry in entries:
+        await _close(entry, "shutdown")
+
+
+def stats() -> dict:
+    """Pool occupancy for the admin stats endpoint."""
+    return {
+        "max_browsers": settings.BROWSER_POOL_MAX_BROWSERS,
+        "contexts_per_browser": settings.BROWSER_POOL_CONTEXTS_PER_BROWSER,
+        "memory_percent": round(_memory_percent(), 1),
+        "browsers": [
+            {
+                "key": b.key,
+                "active": b.active,
+                "pages": b.pages,
+                "retiring": b.retiring,
+                "idle_seconds": round(time.monotonic() - b.last_used, 1) if b.active == 0 else 0.0,
+            }
+            for b in _browsers
+        ],
+    }
@@ -0,0 +1,679 @@
+"""
+Frontier crawl engine: persistent site-wide crawls (10k+ pages).
+
+deep_crawl / adaptive_crawl keep their frontier in memory inside one
+request.  A frontier crawl is a CrawlJob whose frontier lives in Postgres
+(crawl_frontier), so it survives worker restarts and can run for hours:
+
+- URLs are normalized (normalize_url) and deduplicated per job by a 64-bit
+  hash: an in-memory hash set in front of the (job_id, url_hash) unique key
+- pending URLs are claimed in priority order (shallow first, keyword hits
+  first) with FOR UPDATE SKIP LOCKED
+- each host has a token bucket (FRONTIER_HOST_RATE_PER_SECOND, slowed
+  further by robots.txt Crawl-delay); robots.txt is honored and cached
+  through the page cache
+- pages go through the pooled HTTP engine and the page cache (optionally
+  falling back to the browser), and near-duplicates are dropped by SimHash
+  before indexing into the knowledge base
+- a job holds a heartbeat lease; the web_crawler.resume_frontier_crawls
+  beat task re-dispatches jobs whose worker stopped heartbeating
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta, UTC
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+from uuid import UUID
+
+import structlog
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.models.crawl_frontier import CrawlFrontierURL, CrawlJob, CrawlJobStatus, FrontierURLStatus
+from app.modules.web_crawler import http_engine, page_cache
+
+logger = structlog.get_logger()
+
+_MASK64 = (1 << 64) - 1
+
+_TERMINAL = (CrawlJobStatus.COMPLETED, CrawlJobStatus.FAILED, CrawlJobStatus.CANCELLED)
+
+
+def _now() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+# ---------------------------------------------------------------------------
+# URL normalization
+# ---------------------------------------------------------------------------
+
+_TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_hsenc", "_hsmi",
+})
+_UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+_PERCENT_RE = re.compile(r"%[0-9a-fA-F]{2}")
+_ASSET_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".bmp",
+    ".css", ".js", ".json", ".xml", ".rss",
+    ".pdf", ".zip", ".gz", ".tar", ".rar", ".7z", ".exe", ".dmg",
+    ".mp3", ".mp4", ".avi", ".mov", ".webm", ".woff", ".woff2", ".ttf", ".eot",
+)
+
+
+def _fix_escape(match: re.Match) -> str:
+    char = chr(int(match.group(0)[1:], 16))
+    return char if char in _UNRESERVED else match.group(0).upper()
+
+
+def _remove_dot_segments(path: str) -> str:
+    segments = path.split("/")
+    out: list[str] = []
+    for segment in segments:
+        if segment == "..":
+            if len(out) > 1:
+                out.pop()
+        elif segment != ".":
+            out.append(segment)
+    if segments[-1] in (".", ".."):
+        out.append("")
+    return "/".join(out)
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Canonical form of an http(s) URL, or None when it cannot be crawled.
+
+    Resolves ``url`` against ``base``, lowercases scheme and host (IDNA),
+    drops userinfo, default ports, fragments and tracking parameters,
+    removes dot segments, normalizes percent-escapes and sorts the query.
+    """
+    try:
+        parts = urlsplit(urljoin(base, url.strip()) if base else url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if scheme not in ("http", "https") or not host:
+        return None
+    if ":" in host:
+        host = f"[{host}]"
+    else:
+        try:
+            host = host.encode("idna").decode("ascii").lower()
+        except UnicodeError:
+            return None
+
+    netloc = host if port in (None, 80 if scheme == "http" else 443) else f"{host}:{port}"
+    path = _PERCENT_RE.sub(_fix_escape, _remove_dot_segments(parts.path)) or "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (key.lower().startswith("utm_") or key.lower() in _TRACKING_PARAMS)
+    ))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def _hash64(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=8).digest(), "big")
+
+
+def _signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def url_hash(url: str) -> int:
+    """Signed 64-bit hash of a normalized URL (fits a BIGINT column)."""
+    return _signed(_hash64(url))
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate detection
+# ---------------------------------------------------------------------------
+
+_WORD_RE = re.compile(r"\w+")
+# Each hash bit gets a 32-bit lane in one big integer, so the per-bit vote
+# of every feature is a single addition instead of 64.
+_LANE = 32
+_SPREAD = [sum(((byte >> bit) & 1) << (bit * _LANE) for bit in range(8)) for byte in range(256)]
+
+
+def simhash(text: str, shingle: int = 3) -> int:
+    """Signed 64-bit SimHash of ``text`` over word shingles."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= shingle:
+        features = Counter(words)
+    else:
+        features = Counter(" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1))
+
+    votes = 0
+    total = 0
+    for feature, count in features.items():
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        spread = 0
+        for index, byte in enumerate(digest):
+            spread |= _SPREAD[byte] << (index * 8 * _LANE)
+        votes += spread * count
+        total += count
+
+    value = 0
+    lane_mask = (1 << _LANE) - 1
+    for bit in range(64):
+        if ((votes >> (bit * _LANE)) & lane_mask) * 2 > total:
+            value |= 1 << bit
+    return _signed(value)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+class SimHashIndex:
+    """Finds stored hashes within ``max_distance`` bits.
+
+    Hashes are split into max_distance + 1 bands; two hashes that close
+    must agree exactly on at least one band, so only band matches are
+    compared.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._band_count = max_distance + 1
+        self._band_bits = 64 // self._band_count
+        self._bands: dict[tuple[int, int], list[int]] = {}
+
+    def _keys(self, value: int) -> list[tuple[int, int]]:
+        unsigned = value & _MASK64
+        mask = (1 << self._band_bits) - 1
+        return [(band, (unsigned >> (band * self._band_bits)) & mask) for band in range(self._band_count)]
+
+    def find(self, value: int) -> Optional[int]:
+        for key in self._keys(value):
+            for other in self._bands.get(key, ()):
+                if hamming(value, other) <= self.max_distance:
+                    return other
+        return None
+
+    def add(self, value: int) -> None:
+        for key in self._keys(value):
+            self._bands.setdefault(key, []).append(value)
+
+
+# ---------------------------------------------------------------------------
+# Politeness
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Allows ``rate`` requests per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RobotsCache:
+    """robots.txt rules per origin; bodies are fetched through the page cache.
+
+    Follows RFC 9309: a 4xx robots.txt allows everything, a 5xx or an
+    unreachable one disallows everything.
+    """
+
+    def __init__(self, user_agent: str = http_engine.USER_AGENT, max_age: Optional[int] = None):
+        self.user_agent = user_agent
+        self.max_age = settings.FRONTIER_ROBOTS_MAX_AGE_SECONDS if max_age is None else max_age
+        self._parsers: dict[str, RobotFileParser] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def _parser(self, url: str) -> RobotFileParser:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin in self._parsers:
+            return self._parsers[origin]
+        async with self._locks.setdefault(origin, asyncio.Lock()):
+            if origin not in self._parsers:
+                parser = RobotFileParser(f"{origin}/robots.txt")
+                fetched = await page_cache.fetch(f"{origin}/robots.txt", max_age=self.max_age)
+                status = fetched.status_code or 0
+                if 200 <= status < 300:
+                    parser.parse(fetched.text.splitlines())
+                elif 400 <= status < 500:
+                    parser.allow_all = True
+                else:
+                    parser.disallow_all = True
+                self._parsers[origin] = parser
+        return self._parsers[origin]
+
+    async def allowed(self, url: str) -> bool:
+        return (await self._parser(url)).can_fetch(self.user_agent, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        delay = (await self._parser(url)).crawl_delay(self.user_agent)
+        return float(delay) if delay else None
+
+
+# ---------------------------------------------------------------------------
+# Frontier storage
+# ---------------------------------------------------------------------------
+
+def _frontier_row(job_id: UUID, url: str, depth: int, priority: float) -> dict:
+    return {
+        "job_id": job_id,
+        "url": url,
+        "url_hash": url_hash(url),
+        "host": urlsplit(url).hostname or "",
+        "depth": depth,
+        "priority": priority,
+        "status": FrontierURLStatus.PENDING.value,
+        "attempts": 0,
+        "updated_at": _now(),
+    }
+
+
+async def _enqueue(session: AsyncSession, rows: list[dict]) -> None:
+    """Insert frontier rows, ignoring URLs the job has already seen."""
+    if rows:
+        await session.execute(
+            pg_insert(CrawlFrontierURL).values(rows).on_conflict_do_nothing(constraint="uq_crawl_frontier_job_url")
+        )
+
+
+async def _claim(session: AsyncSession, job_id: UUID, limit: int) -> list[dict]:
+    """Mark up to ``limit`` pending URLs in progress, highest priority first."""
+    result = await session.execute(
+        text(
+            "UPDATE crawl_frontier SET status = 'in_progress', attempts = attempts + 1, updated_at = now() "
+            "WHERE id IN ("
+            "  SELECT id FROM crawl_frontier WHERE job_id = :job_id AND status = 'pending' "
+            "  ORDER BY priority DESC, id LIMIT :limit FOR UPDATE SKIP LOCKED"
+            ") RETURNING id, url, host, depth, attempts"
+        ),
+        {"job_id": job_id, "limit": limit},
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def create_job(
+    user_id: UUID,
+    seed_url: str,
+    session: AsyncSession,
+    max_pages: int = 1000,
+    max_depth: int = 5,
+    **options: Any,
+) -> CrawlJob:
+    """Create a frontier crawl job with its seed URL queued.
+
+    Options: include_subdomains, keywords, index_to_kb, render_fallback,
+    max_age.  Raises ValueError for a URL that cannot be crawled.
+    """
+    seed = normalize_url(seed_url)
+    if seed is None:
+        raise ValueError(f"Not a crawlable http(s) URL: {seed_url}")
+    job = CrawlJob(
+        user_id=user_id,
+        seed_url=seed,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        config_json=json.dumps(options),
+    )
+    session.add(job)
+    await session.flush()
+    await _enqueue(session, [_frontier_row(job.id, seed, 0, 0.0)])
+    await session.commit()
+    await session.refresh(job)
+    logger.info("frontier_job_created", job_id=str(job.id), seed=seed, max_pages=max_pages)
+    return job
+
+
+async def job_progress(job: CrawlJob, session: AsyncSession) -> dict:
+    """Job fields plus frontier row counts by status."""
+    result = await session.execute(
+        select(CrawlFrontierURL.status, func.count())
+        .where(CrawlFrontierURL.job_id == job.id)
+        .group_by(CrawlFrontierURL.status)
+    )
+    return {
+        "id": job.id,
+        "seed_url": job.seed_url,
+        "status": job.status,
+        "max_pages": job.max_pages,
+        "max_depth": job.max_depth,
+        "pages_crawled": job.pages_crawled,
+        "pages_failed": job.pages_failed,
+        "pages_skipped": job.pages_skipped,
+        "pages_duplicate": job.pages_duplicate,
+        "chunks_indexed": job.chunks_indexed,
+        "frontier": {str(status): count for status, count in result.all()},
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+
+
+async def cancel_job(job: CrawlJob, session: AsyncSession) -> CrawlJob:
+    """Stop a job; a running worker notices at its next batch."""
+    if job.status not in _TERMINAL:
+        job.status = CrawlJobStatus.CANCELLED
+        job.finished_at = job.updated_at = _now()
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+    return job
+
+
+async def stale_job_ids() -> list[UUID]:
+    """Jobs that should be running but have no live worker (pending or missed heartbeats)."""
+    from app.database import get_session_context
+
+    cutoff = _now() - timedelta(seconds=settings.FRONTIER_STALE_SECONDS)
+    async with get_session_context() as session:
+        result = await session.execute(
+            select(CrawlJob.id).where(
+                or_(
+                    and_(CrawlJob.status == CrawlJobStatus.PENDING, CrawlJob.created_at < cutoff),
+                    and_(
+                        CrawlJob.status == CrawlJobStatus.RUNNING,
+                        or_(CrawlJob.heartbeat_at.is_(None), CrawlJob.heartbeat_at < cutoff),
+                    ),
+                )
+            )
+        )
+        return list(result.scalars().all())
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class _FrontierRun:
+    """One worker's pass over a job; state is rebuilt from the database on resume."""
+
+    def __init__(self, job: CrawlJob):
+        config = json.loads(job.config_json or "{}")
+        self.job_id = job.id
+        self.user_id = job.user_id
+        self.max_pages = job.max_pages
+        self.max_depth = job.max_depth
+        self.crawled = job.pages_crawled
+        self.include_subdomains = bool(config.get("include_subdomains", False))
+        self.keywords = [k.lower() for k in config.get("keywords") or []]
+        self.index_to_kb = bool(config.get("index_to_kb", True))
+        self.render_fallback = bool(config.get("render_fallback", False))
+        self.max_age = config.get("max_age", settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS)
+        self.hosts = {urlsplit(job.seed_url).hostname}
+        self.seen: set[int] = set()
+        self.near_duplicates = SimHashIndex(settings.FRONTIER_SIMHASH_MAX_DISTANCE)
+        self.robots = RobotsCache()
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def in_scope(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        if host in self.hosts:
+            return True
+        return self.include_subdomains and any(host.endswith("." + h) for h in self.hosts)
+
+    def priority(self, url: str, depth: int) -> float:
+        lowered = url.lower()
+        return float(sum(1 for keyword in self.keywords if keyword in lowered) - depth)
+
+    async def load(self, session: AsyncSession) -> None:
+        """Requeue URLs a dead worker left in progress and rebuild the seen sets."""
+        await session.execute(
+            update(CrawlFrontierURL)
+            .where(
+                CrawlFrontierURL.job_id == self.job_id,
+                CrawlFrontierURL.status == FrontierURLStatus.IN_PROGRESS,
+            )
+            .values(status=FrontierURLStatus.PENDING)
+        )
+        result = await session.execute(
+            select(CrawlFrontierURL.url_hash, CrawlFrontierURL.simhash).where(CrawlFrontierURL.job_id == self.job_id)
+        )
+        for hashed, fingerprint in result.all():
+            self.seen.add(hashed)
+            if fingerprint is not None:
+                self.near_duplicates.add(fingerprint)
+
+    async def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ""
+        if host not in self.buckets:
+            rate = settings.FRONTIER_HOST_RATE_PER_SECOND
+            delay = await self.robots.crawl_delay(url)
+            if delay:
+                rate = min(rate, 1.0 / delay)
+            self.buckets[host] = TokenBucket(rate, 1 if delay else settings.FRONTIER_HOST_BURST)
+        return self.buckets[host]
+
+    async def fetch(self, page: dict) -> dict:
+        """Crawl one claimed URL; returns its outcome (status, links, content)."""
+        from app.modules.web_crawler.service import WebCrawlerService
+
+        url = page["url"]
+        if not await self.robots.allowed(url):
+            return {"status": FrontierURLStatus.SKIPPED, "error": "disallowed by robots.txt"}
+        await (await self._bucket(url)).acquire()
+
+        result = await WebCrawlerService.scrape_http(url=url, max_age=self.max_age)
+        if not result.get("success") and self.render_fallback and result.get("status_code") != 404:
+            result = await WebCrawlerService.scrape(url=url, extract_images=False, max_age=self.max_age)
+        if not result.get("success"):
+            return {"status": FrontierURLStatus.FAILED, "error": (result.get("error") or "crawl failed")[:500]}
+
+        return {
+            "status": FrontierURLStatus.DONE,
+            "base": result.get("redirected_url") or url,
+            "title": result.get("title") or url,
+            "content": result.get("fit_markdown") or result.get("markdown") or "",
+            "links": (result.get("links_internal") or []) + (result.get("links_external") or []),
+        }
+
+    def discover(self, base: str, links: list[str], depth: int) -> list[dict]:
+        """New in-scope frontier rows for a page's links."""
+        if depth > self.max_depth:
+            return []
+        rows = []
+        for href in links:
+            url = normalize_url(href, base)
+            if url is None or not self.in_scope(url) or urlsplit(url).path.lower().endswith(_ASSET_EXTENSIONS):
+                continue
+            hashed = url_hash(url)
+            if hashed in self.seen:
+                continue
+            self.seen.add(hashed)
+            rows.append(_frontier_row(self.job_id, url, depth, self.priority(url, depth)))
+        return rows
+
+    async def run_batch(self, pages: list[dict]) -> dict:
+        """Crawl claimed pages concurrently and record the results."""
+        from app.database import get_session_context
+        from app.modules.billing.service import BillingService
+
+        outcomes = await asyncio.gather(*(self.fetch(page) for page in pages), return_exceptions=True)
+
+        updates: list[dict] = []
+        new_rows: list[dict] = []
+        documents: list[dict] = []
+        counts = Counter()
+        for page, outcome in zip(pages, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = {"status": FrontierURLStatus.FAILED, "error": f"{type(outcome).__name__}: {outcome}"[:500]}
+            status = outcome["status"]
+            fingerprint = None
+
+            if status == FrontierURLStatus.FAILED and page["attempts"] < settings.FRONTIER_MAX_ATTEMPTS:
+                status = FrontierURLStatus.PENDING
+            elif status == FrontierURLStatus.DONE:
+                new_rows.extend(self.discover(outcome["base"], outcome["links"], page["depth"] + 1))
+                if outcome["content"].strip():
+                    fingerprint = simhash(outcome["content"])
+                    if self.near_duplicates.find(fingerprint) is not None:
+                        status = FrontierURLStatus.DUPLICATE
+                    else:
+                        self.near_duplicates.add(fingerprint)
+                        documents.append({
+                            "filename": f"web_{outcome['title'][:50]}.md",
+                            "content_type": "text/markdown",
+                            "text": outcome["content"],
+                        })
+
+            counts[status] += 1
+            updates.append({
+                "id": page["id"],
+                "status": status,
+                "simhash": fingerprint,
+                "error": outcome.get("error"),
+                "updated_at": _now(),
+            })
+
+        fetched = counts[FrontierURLStatus.DONE] + counts[FrontierURLStatus.DUPLICATE]
+        self.crawled += fetched
+        async with get_session_context() as session:
+            chunks = 0
+            if documents and self.index_to_kb:
+                from app.modules.knowledge.service import KnowledgeService
+
+                indexed = await KnowledgeService.upload_documents(self.user_id, documents, session)
+                chunks = sum(d.total_chunks for d in indexed)
+            await _enqueue(session, new_rows)
+            await session.execute(update(CrawlFrontierURL), updates)
+            await session.execute(
+                update(CrawlJob)
+                .where(CrawlJob.id == self.job_id)
+                .values(
+                    pages_crawled=CrawlJob.pages_crawled + fetched,
+                    pages_failed=CrawlJob.pages_failed + counts[FrontierURLStatus.FAILED],
+                    pages_skipped=CrawlJob.pages_skipped + counts[FrontierURLStatus.SKIPPED],
+                    pages_duplicate=CrawlJob.pages_duplicate + counts[FrontierURLStatus.DUPLICATE],
+                    chunks_indexed=CrawlJob.chunks_indexed + chunks,
+                    heartbeat_at=_now(),
+                    updated_at=_now(),
+                )
+            )
+            if fetched:
+                await BillingService.consume_quota(self.user_id, "ai_call", fetched, session)
+            await session.commit()
+        return {"fetched": fetched, "discovered": len(new_rows), "indexed": len(documents)}
+
+
+async def _lease(session: AsyncSession, job_id: UUID) -> Optional[CrawlJob]:
+    """Take ownership of a pending job, or of a running job whose worker stopped heartbeating."""
+    cutoff = _now() - timedelta(seconds=settings.FRONTIER_STALE_SECONDS)
+    result = await session.execute(
+        update(CrawlJob)
+        .where(
+            CrawlJob.id == job_id,
+            or_(
+                CrawlJob.status == CrawlJobStatus.PENDING,
+                and_(
+                    CrawlJob.status == CrawlJobStatus.RUNNING,
+                    or_(CrawlJob.heartbeat_at.is_(None), CrawlJob.heartbeat_at < cutoff),
+                ),
+            ),
+        )
+        .values(status=CrawlJobStatus.RUNNING, heartbeat_at=_now(), updated_at=_now())
+        .returning(CrawlJob.id)
+    )
+    if result.scalar_one_or_none() is None:
+        return None
+    await session.commit()
+    return await session.get(CrawlJob, job_id, populate_existing=True)
+
+
+async def _finish(job_id: UUID, status: CrawlJobStatus, error: Optional[str] = None) -> None:
+    from app.database import get_session_context
+
+    async with get_session_context() as session:
+        await session.execute(
+            update(CrawlJob)
+            .where(CrawlJob.id == job_id, CrawlJob.status == CrawlJobStatus.RUNNING)
+            .values(status=status, error=error, finished_at=_now(), updated_at=_now())
+        )
+        await session.commit()
+
+
+async def _heartbeat(job_id: UUID) -> None:
+    """Keep the lease fresh while a slow batch (e.g. a long Crawl-delay) is running."""
+    from app.database import get_session_context
+
+    while True:
+        await asyncio.sleep(settings.FRONTIER_STALE_SECONDS / 3)
+        try:
+            async with get_session_context() as session:
+                await session.execute(
+                    update(CrawlJob)
+                    .where(CrawlJob.id == job_id, CrawlJob.status == CrawlJobStatus.RUNNING)
+                    .values(heartbeat_at=_now())
+                )
+                await session.commit()
+        except Exception as exc:
+            logger.warning("frontier_heartbeat_failed", job_id=str(job_id), error=str(exc))
+
+
+async def run_job(job_id: UUID) -> dict:
+    """Crawl a job until its frontier is empty, max_pages is reached or it is cancelled.
+
+    Safe to call for a job that is already running elsewhere (returns
+    immediately) or that a dead worker left behind (resumes it).
+    """
+    from app.database import get_session_context
+    from app.modules.billing.service import BillingService
+
+    async with get_session_context() as session:
+        job = await _lease(session, job_id)
+        if job is None:
+            return {"job_id": str(job_id), "status": "not_leased"}
+        run = _FrontierRun(job)
+        await run.load(session)
+        await session.commit()
+    logger.info("frontier_job_started", job_id=str(job_id), resumed_at=run.crawled, seen=len(run.seen))
+
+    heartbeat = asyncio.create_task(_heartbeat(job_id))
+    try:
+        while run.crawled < run.max_pages:
+            async with get_session_context() as session:
+                status = await session.scalar(select(CrawlJob.status).where(CrawlJob.id == job_id))
+                if status != CrawlJobStatus.RUNNING:
+                    logger.info("frontier_job_stopped", job_id=str(job_id), status=status)
+                    return {"job_id": str(job_id), "status": str(status), "pages_crawled": run.crawled}
+                if not await BillingService.check_quota(run.user_id, "ai_call", session):
+                    await _finish(job_id, CrawlJobStatus.FAILED, "AI call quota exceeded")
+                    return {"job_id": str(job_id), "status": "failed", "pages_crawled": run.crawled}
+                pages = await _claim(
+                    session, job_id, min(settings.FRONTIER_CONCURRENCY, run.max_pages - run.crawled),
+                )
+                await session.commit()
+            if not pages:
+                break
+            batch = await run.run_batch(pages)
+            logger.debug("frontier_batch_done", job_id=str(job_id), **batch)
+    except Exception as exc:
+        logger.error("frontier_job_failed", job_id=str(job_id), error=str(exc))
+        await _finish(job_id, CrawlJobStatus.FAILED, str(exc)[:2000])
+        raise
+    finally:
+        heartbeat.cancel()
+
+    await _finish(job_id, CrawlJobStatus.COMPLETED)
+    logger.info("frontier_job_completed", job_id=str(job_id), pages_crawled=run.crawled)
+    return {"job_id": str(job_id), "status": "completed", "pages_crawled": run.crawled}
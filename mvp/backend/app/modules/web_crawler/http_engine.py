@@ -0,0 +1,330 @@
+"""
+Pooled HTTP crawling engine (no browser).
+
+One long-lived ``httpx.AsyncClient`` per process serves every HTTP-only
+fetch of the web crawler: ``scrape_http``, ``batch_scrape_http``,
+``extract_lxml`` / ``extract_regex``, URL seeding and the Jina Reader
+fallback.  Compared with building an ``AsyncWebCrawler`` per call it keeps:
+
+- keep-alive connections (and HTTP/2 multiplexing when ``h2`` is installed)
+  across requests, bounded by CRAWLER_HTTP_MAX_CONNECTIONS;
+- at most CRAWLER_HTTP_MAX_PER_HOST concurrent requests per host, so a bulk
+  batch does not hammer one site;
+- resolved addresses for CRAWLER_HTTP_DNS_TTL_SECONDS (new connections to a
+  known host skip getaddrinfo; TLS still verifies the original hostname).
+
+Fetched HTML goes through crawl4ai's ``aprocess_html`` on a long-lived,
+never-navigating crawler, so markdown, content filters, links and
+extraction strategies behave exactly as for browser crawls.
+"""
+
+import asyncio
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+import structlog
+
+from app.config import settings
+from app.core.optional_deps import optional
+
+logger = structlog.get_logger()
+
+_h2 = optional("h2")
+
+USER_AGENT = "Mozilla/5.0 (compatible; SaaS-IA-Crawler/1.0; +https://saas-ia.local/bot)"
+HTML_TYPES = ("text/html", "application/xhtml+xml", "text/plain", "application/xml", "text/xml")
+
+
+@dataclass
+class FetchResult:
+    url: str
+    final_url: str = ""
+    status_code: Optional[int] = None
+    content_type: str = ""
+    text: str = ""
+    headers: dict = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+    # Set by page_cache.fetch: hit / revalidated / miss / bypass, body digest
+    cache: str = ""
+    sha256: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and self.status_code < 400
+
+    @property
+    def is_html(self) -> bool:
+        return not self.content_type or self.content_type.startswith(HTML_TYPES)
+
+
+# ---------------------------------------------------------------------------
+# Transport: connection pool with a DNS cache
+# ---------------------------------------------------------------------------
+
+class _CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Resolve hosts once per TTL, then connect to the cached address."""
+
+    def __init__(self, ttl: float):
+        self._backend = httpcore.AnyIOBackend()
+        self._ttl = ttl
+        self._cache: dict[tuple[str, int], tuple[float, list[str]]] = {}
+        self._next: dict[tuple[str, int], int] = {}
+
+    async def _resolve(self, host: str, port: int) -> list[str]:
+        key = (host, port)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[key] = (time.monotonic() + self._ttl, addresses)
+        return addresses
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError:
+            addresses = [host]
+        # Round-robin across the host's addresses; drop the entry on failure
+        index = self._next.get((host, port), 0)
+        self._next[(host, port)] = index + 1
+        address = addresses[index % len(addresses)]
+        try:
+            return await self._backend.connect_tcp(
+                address, port, timeout=timeout, local_address=local_address, socket_options=socket_options,
+            )
+        except (httpcore.ConnectError, httpcore.ConnectTimeout):
+            self._cache.pop((host, port), None)
+            raise
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _PooledTransport(httpx.AsyncHTTPTransport):
+    """httpx transport whose connection pool uses the caching DNS backend."""
+
+    def __init__(self, *, max_connections: int, http2: bool, dns_ttl: float):
+        super().__init__(http2=http2)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30.0,
+            http1=True,
+            http2=http2,
+            retries=1,
+            network_backend=_CachingDNSBackend(dns_ttl),
+        )
+
+
+_client: Optional[httpx.AsyncClient] = None
+_host_slots: dict[str, asyncio.Semaphore] = {}
+_processor = None
+_processor_lock = asyncio.Lock()
+
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client (created on first use)."""
+    global _client
+    if _client is None or _client.is_closed:
+        http2 = _h2.available
+        _client = httpx.AsyncClient(
+            transport=_PooledTransport(
+                max_connections=settings.CRAWLER_HTTP_MAX_CONNECTIONS,
+                http2=http2,
+                dns_ttl=settings.CRAWLER_HTTP_DNS_TTL_SECONDS,
+            ),
+            timeout=httpx.Timeout(settings.CRAWLER_HTTP_TIMEOUT_SECONDS, connect=10.0),
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml,*/*;q=0.8"},
+            follow_redirects=True,
+        )
+        _host_slots.clear()
+        logger.info("crawler_http_engine_started", http2=http2,
+                    max_connections=settings.CRAWLER_HTTP_MAX_CONNECTIONS)
+    return _client
+
+
+def _host_slot(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).hostname or ""
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(settings.CRAWLER_HTTP_MAX_PER_HOST)
+    return slot
+
+
+async def close() -> None:
+    """Close the shared client and the HTML processor. Called from lifespan shutdown."""
+    global _client, _processor
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _processor is not None:
+        try:
+            await _processor.close()
+        except Exception as exc:
+            logger.debug("crawler_http_processor_close_failed", error=str(exc))
+        _processor = None
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+async def fetch(
+    url: str,
+    headers: Optional[dict] = None,
+    follow_redirects: bool = True,
+    timeout: Optional[float] = None,
+) -> FetchResult:
+    """GET ``url`` through the pool; errors are returned, not raised.
+
+    Bodies are cut at CRAWLER_HTTP_MAX_BYTES.
+    """
+    client = get_client()
+    started = time.perf_counter()
+    result = FetchResult(url=url)
+    try:
+        async with _host_slot(url):
+            request = client.build_request(
+                "GET", url, headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+            response = await client.send(request, stream=True, follow_redirects=follow_redirects)
+            try:
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= settings.CRAWLER_HTTP_MAX_BYTES:
+                        break
+            finally:
+                await response.aclose()
+        result.final_url = str(response.url)
+        result.status_code = response.status_code
+        result.content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        result.headers = dict(response.headers)
+        result.text = bytes(body[:settings.CRAWLER_HTTP_MAX_BYTES]).decode(response.encoding or "utf-8", errors="replace")
+        if response.status_code >= 400:
+            result.error = f"HTTP {response.status_code}"
+    except httpx.HTTPError as e:
+        result.error = f"{type(e).__name__}: {e}"[:500]
+    except Exception as e:
+        result.error = str(e)[:500] or type(e).__name__
+    result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+async def fetch_many(
+    urls: Iterable[str],
+    concurrency: int = 50,
+    fetcher: Optional[Callable[..., Awaitable[FetchResult]]] = None,
+    **kwargs,
+) -> AsyncIterator[FetchResult]:
+    """Fetch ``urls`` with ``concurrency`` workers, yielding in completion order.
+
+    ``fetcher`` replaces ``fetch`` (e.g. ``page_cache.fetch``); ``kwargs``
+    are passed to it.
+    """
+    fetcher = fetcher or fetch
+    queue: asyncio.Queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    results: asyncio.Queue = asyncio.Queue()
+    pending = queue.qsize()
+
+    async def worker() -> None:
+        while True:
+            try:
+                url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await results.put(await fetcher(url, **kwargs))
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, pending)))]
+    try:
+        for _ in range(pending):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# HTML processing (crawl4ai pipeline, no navigation)
+# ---------------------------------------------------------------------------
+
+async def get_processor():
+    """Long-lived crawl4ai crawler used only for ``aprocess_html``.
+
+    It runs the HTTP crawler strategy so no browser is ever launched; on
+    crawl4ai versions without it the browser singleton is reused.
+    """
+    global _processor
+    if _processor is None:
+        async with _processor_lock:
+            if _processor is None:
+                try:
+                    from crawl4ai import AsyncWebCrawler, BrowserConfig
+                    from crawl4ai.async_configs import HTTPCrawlerConfig
+                    from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy
+                except ImportError:
+                    from app.modules.web_crawler.service import get_crawler
+                    return await get_crawler()
+                instance = AsyncWebCrawler(
+                    crawler_strategy=AsyncHTTPCrawlerStrategy(browser_config=HTTPCrawlerConfig()),
+                    config=BrowserConfig(headless=True, verbose=False),
+                )
+                await instance.start()
+                _processor = instance
+    return _processor
+
+
+async def process(fetched: FetchResult, run_config):
+    """Run a fetched HTML page through ``run_config`` (markdown, links, extraction)."""
+    processor = await get_processor()
+    return await processor.aprocess_html(
+        url=fetched.final_url or fetched.url,
+        html=fetched.text,
+        extracted_content=None,
+        config=run_config,
+        screenshot_data=None,
+        pdf_data=None,
+        verbose=False,
+    )
+
+
+async def crawl(
+    url: str,
+    run_config,
+    headers: Optional[dict] = None,
+    follow_redirects: bool = True,
+    max_age: Optional[int] = None,
+):
+    """Fetch ``url`` (through the page cache) and run it through ``run_config``.
+
+    Returns ``(FetchResult, CrawlResult | None)``; the crawl result is None
+    when the fetch failed or the response is not HTML.
+    """
+    from app.modules.web_crawler import page_cache
+
+    fetched = await page_cache.fetch(url, max_age=max_age, headers=headers, follow_redirects=follow_redirects)
+    if not fetched.ok or not fetched.is_html:
+        return fetched, None
+    return fetched, await process(fetched, run_config)
+
+
+def cookie_header(cookies: Optional[dict]) -> dict:
+    """``{"Cookie": ...}`` for a name -> value mapping (empty when none)."""
+    if not cookies:
+        return {}
+    return {"Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items())}
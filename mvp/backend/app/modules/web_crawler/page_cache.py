@@ -0,0 +1,451 @@
+"""
+Persistent crawl cache with HTTP revalidation.
+
+Three layers share one store:
+
+- ``page``: raw response bodies fetched by the HTTP engine, keyed by URL.
+  Freshness follows ``Cache-Control`` (``max-age`` / ``s-maxage``,
+  ``no-cache``, ``no-store``), ``Expires`` or the RFC 9111 heuristic (10% of
+  the time since ``Last-Modified``, at most a day), unless the caller passes
+  ``max_age``.  Stale entries are revalidated with ``If-None-Match`` /
+  ``If-Modified-Since``; a 304 reuses the stored body.
+- ``derived``: markdown/links produced from a body for a given processing
+  variant (selector, thresholds...), keyed by body digest, so an unchanged
+  page is never re-processed.
+- ``rendered``: browser scrape results, keyed by URL and options, reused up
+  to the caller's ``max_age`` and revalidated with a conditional GET when
+  the page sent validators.
+
+Bodies and results are gzip files on disk under CRAWL_CACHE_DIR (bodies
+content-addressed by SHA-256, so identical pages are stored once); metadata
+lives in Redis (in-process when Redis is unavailable) and expires after
+CRAWL_CACHE_RETENTION_DAYS.  ``prune`` removes files not read within the
+retention window.  Requests with custom headers or cookies are never cached.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import structlog
+
+from app.config import settings
+from app.modules.web_crawler import http_engine
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "crawl_cache"
+STATS_KEY = f"saas_ia:{KEY_PREFIX}:stats"
+MAX_HEURISTIC_SECONDS = 86400
+
+# Metadata when Redis is unavailable (bounded, per process)
+_LOCAL_META_LIMIT = 10_000
+_local_meta: dict[str, dict] = {}
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+def variant_key(options: dict[str, Any]) -> str:
+    """Stable key for a set of processing options."""
+    return _digest(json.dumps(options, sort_keys=True, default=str))[:32]
+
+
+def _header(headers: Optional[dict], name: str) -> Optional[str]:
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def freshness(headers: Optional[dict], now: float) -> tuple[float, bool, bool]:
+    """(expires_at, no_cache, no_store) for a response."""
+    directives: dict[str, Optional[str]] = {}
+    for part in (_header(headers, "cache-control") or "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('" ') or None
+
+    no_store = "no-store" in directives or "private" in directives
+    no_cache = "no-cache" in directives
+    for name in ("s-maxage", "max-age"):
+        value = directives.get(name)
+        if value and value.isdigit():
+            return now + int(value), no_cache, no_store
+
+    expires = _header(headers, "expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp(), no_cache, no_store
+        except (TypeError, ValueError):
+            return now, no_cache, no_store
+
+    last_modified = _header(headers, "last-modified")
+    if last_modified:
+        try:
+            age = max(0.0, now - parsedate_to_datetime(last_modified).timestamp())
+            return now + min(age * 0.1, MAX_HEURISTIC_SECONDS), no_cache, no_store
+        except (TypeError, ValueError):
+            pass
+    return now, no_cache, no_store
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+def _path(kind: str, name: str) -> Path:
+    return Path(settings.CRAWL_CACHE_DIR) / kind / name[:2] / f"{name}.gz"
+
+
+def _write(path: Path, data: bytes, replace: bool = False) -> None:
+    """Store ``data`` at ``path`` atomically.
+
+    Content-addressed files (blobs, derived) are never rewritten, only
+    touched; ``replace`` is for entries keyed by URL, whose content changes.
+    """
+    if not replace and path.exists():
+        os.utime(path)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(gzip.compress(data, compresslevel=5))
+    os.replace(tmp, path)
+
+
+def _read(path: Path) -> Optional[bytes]:
+    try:
+        data = gzip.decompress(path.read_bytes())
+    except (OSError, EOFError):
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+async def put_body(body: bytes) -> str:
+    sha = hashlib.sha256(body).hexdigest()
+    await asyncio.to_thread(_write, _path("blobs", sha), body)
+    return sha
+
+
+async def get_body(sha: str) -> Optional[bytes]:
+    return await asyncio.to_thread(_read, _path("blobs", sha))
+
+
+async def _get_meta(kind: str, key: str) -> Optional[dict]:
+    from app.cache import _get_redis
+
+    client = await _get_redis()
+    if client is None:
+        return _local_meta.get(f"{kind}:{key}")
+    try:
+        raw = await client.get(f"saas_ia:{KEY_PREFIX}:{kind}:{key}")
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.debug("crawl_cache_meta_get_failed", error=str(e))
+        return None
+
+
+async def _set_meta(kind: str, key: str, meta: dict) -> None:
+    from app.cache import _get_redis
+
+    client = await _get_redis()
+    if client is None:
+        if len(_local_meta) >= _LOCAL_META_LIMIT:
+            _local_meta.pop(next(iter(_local_meta)))
+        _local_meta[f"{kind}:{key}"] = meta
+        return
+    try:
+        await client.set(
+            f"saas_ia:{KEY_PREFIX}:{kind}:{key}", json.dumps(meta),
+            ex=settings.CRAWL_CACHE_RETENTION_DAYS * 86400,
+        )
+    except Exception as e:
+        logger.debug("crawl_cache_meta_set_failed", error=str(e))
+
+
+async def _delete_meta(kind: str, key: str) -> None:
+    from app.cache import _get_redis
+
+    _local_meta.pop(f"{kind}:{key}", None)
+    client = await _get_redis()
+    if client is not None:
+        try:
+            await client.delete(f"saas_ia:{KEY_PREFIX}:{kind}:{key}")
+        except Exception as e:
+            logger.debug("crawl_cache_meta_delete_failed", error=str(e))
+
+
+async def _record(layer: str, result: str, bytes_saved: int = 0) -> None:
+    from app.cache import _get_redis
+    from app.metrics import crawl_cache_bytes_saved_total, crawl_cache_requests_total
+
+    crawl_cache_requests_total.labels(layer=layer, result=result).inc()
+    if bytes_saved:
+        crawl_cache_bytes_saved_total.labels(layer=layer).inc(bytes_saved)
+    client = await _get_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.hincrby(STATS_KEY, f"{layer}:{result}", 1)
+        if bytes_saved:
+            pipe.hincrby(STATS_KEY, f"{layer}:bytes_saved", bytes_saved)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("crawl_cache_stats_failed", error=str(e))
+
+
+# ---------------------------------------------------------------------------
+# Page layer
+# ---------------------------------------------------------------------------
+
+def _cacheable(headers: Optional[dict]) -> bool:
+    return settings.CRAWL_CACHE_ENABLED and not headers
+
+
+def _from_meta(url: str, meta: dict, body: bytes, cache: str) -> http_engine.FetchResult:
+    return http_engine.FetchResult(
+        url=url,
+        final_url=meta.get("final_url") or url,
+        status_code=meta.get("status_code"),
+        content_type=meta.get("content_type", ""),
+        text=body.decode(meta.get("encoding") or "utf-8", errors="replace"),
+        headers=meta.get("headers") or {},
+        cache=cache,
+        sha256=meta["sha256"],
+    )
+
+
+async def fetch(
+    url: str,
+    max_age: Optional[int] = None,
+    headers: Optional[dict] = None,
+    follow_redirects: bool = True,
+) -> http_engine.FetchResult:
+    """Cache-aware ``http_engine.fetch``.
+
+    ``max_age`` (seconds) accepts a stored copy up to that age regardless of
+    the response's own freshness; ``0`` always revalidates; ``None`` follows
+    the response's caching headers.
+    """
+    if not _cacheable(headers):
+        result = await http_engine.fetch(url, headers=headers, follow_redirects=follow_redirects)
+        result.cache = "bypass"
+        await _record("page", "bypass")
+        return result
+
+    key = _digest(url)
+    meta = await _get_meta("page", key)
+    now = time.time()
+    conditional: dict[str, str] = {}
+    if meta is not None:
+        age = now - meta["fetched_at"]
+        fresh = age <= max_age if max_age is not None else (not meta["no_cache"] and now < meta["expires_at"])
+        if fresh:
+            body = await get_body(meta["sha256"])
+            if body is not None:
+                await _record("page", "hit", meta["size"])
+                return _from_meta(url, meta, body, "hit")
+        if meta.get("etag"):
+            conditional["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            conditional["If-Modified-Since"] = meta["last_modified"]
+
+    result = await http_engine.fetch(url, headers=conditional or None, follow_redirects=follow_redirects)
+
+    if result.status_code == 304 and meta is not None:
+        body = await get_body(meta["sha256"])
+        if body is not None:
+            expires_at, no_cache, _ = freshness({**meta.get("headers", {}), **result.headers}, now)
+            meta.update(fetched_at=now, expires_at=expires_at, no_cache=no_cache)
+            await _set_meta("page", key, meta)
+            await _record("page", "revalidated", meta["size"])
+            return _from_meta(url, meta, body, "revalidated")
+        # Body was pruned: fetch it again unconditionally
+        result = await http_engine.fetch(url, follow_redirects=follow_redirects)
+
+    result.cache = "miss"
+    await _record("page", "miss")
+    if result.status_code != 200 or result.error:
+        return result
+
+    expires_at, no_cache, no_store = freshness(result.headers, now)
+    if no_store:
+        return result
+    body = result.text.encode("utf-8")
+    result.sha256 = await put_body(body)
+    kept_headers = {
+        name: value for name, value in result.headers.items()
+        if name in ("cache-control", "expires", "last-modified", "etag", "content-type")
+    }
+    await _set_meta("page", key, {
+        "url": url,
+        "final_url": result.final_url,
+        "status_code": result.status_code,
+        "content_type": result.content_type,
+        "encoding": "utf-8",
+        "headers": kept_headers,
+        "etag": _header(result.headers, "etag"),
+        "last_modified": _header(result.headers, "last-modified"),
+        "fetched_at": now,
+        "expires_at": expires_at,
+        "no_cache": no_cache,
+        "sha256": result.sha256,
+        "size": len(body),
+    })
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Derived layer (processed output of a body)
+# ---------------------------------------------------------------------------
+
+async def get_derived(body_sha: str, variant: str) -> Optional[dict]:
+    if not body_sha or not settings.CRAWL_CACHE_ENABLED:
+        return None
+    raw = await asyncio.to_thread(_read, _path("derived", _digest(body_sha, variant)))
+    if raw is None:
+        await _record("derived", "miss")
+        return None
+    await _record("derived", "hit", len(raw))
+    return json.loads(raw)
+
+
+async def put_derived(body_sha: str, variant: str, data: dict) -> None:
+    if body_sha and settings.CRAWL_CACHE_ENABLED:
+        raw = json.dumps(data, default=str).encode()
+        await asyncio.to_thread(_write, _path("derived", _digest(body_sha, variant)), raw)
+
+
+# ---------------------------------------------------------------------------
+# Rendered layer (browser scrape results)
+# ---------------------------------------------------------------------------
+
+async def get_rendered(url: str, variant: str, max_age: int) -> Optional[dict]:
+    """A stored browser result no older than ``max_age`` (or still valid per a 304)."""
+    if not settings.CRAWL_CACHE_ENABLED:
+        return None
+    key = _digest(url, variant)
+    meta = await _get_meta("rendered", key)
+    if meta is None:
+        await _record("rendered", "miss")
+        return None
+
+    now = time.time()
+    status = "hit"
+    if now - meta["fetched_at"] > max_age:
+        conditional = {}
+        if meta.get("etag"):
+            conditional["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            conditional["If-Modified-Since"] = meta["last_modified"]
+        if not conditional:
+            await _record("rendered", "miss")
+            return None
+        check = await http_engine.fetch(url, headers=conditional)
+        if check.status_code != 304:
+            await _record("rendered", "miss")
+            return None
+        meta["fetched_at"] = now
+        await _set_meta("rendered", key, meta)
+        status = "revalidated"
+
+    raw = await asyncio.to_thread(_read, _path("rendered", meta["blob"]))
+    if raw is None:
+        await _record("rendered", "miss")
+        return None
+    await _record("rendered", status, len(raw))
+    return {**json.loads(raw), "cache": status}
+
+
+async def put_rendered(url: str, variant: str, data: dict, response_headers: Optional[dict] = None) -> None:
+    if not settings.CRAWL_CACHE_ENABLED:
+        return
+    _, _, no_store = freshness(response_headers, time.time())
+    if no_store:
+        return
+    key = _digest(url, variant)
+    raw = json.dumps(data, default=str).encode()
+    await asyncio.to_thread(_write, _path("rendered", key), raw, True)
+    await _set_meta("rendered", key, {
+        "url": url,
+        "blob": key,
+        "fetched_at": time.time(),
+        "etag": _header(response_headers, "etag"),
+        "last_modified": _header(response_headers, "last-modified"),
+        "size": len(raw),
+    })
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+async def invalidate(url: str) -> None:
+    """Forget a URL's page entry (rendered variants expire on their own)."""
+    await _delete_meta("page", _digest(url))
+
+
+def _scan(prune_before: Optional[float]) -> dict[str, int]:
+    root = Path(settings.CRAWL_CACHE_DIR)
+    files = size = removed = 0
+    if not root.exists():
+        return {"files": 0, "bytes": 0, "removed": 0}
+    for path in root.glob("*/*/*.gz"):
+        try:
+            stat = path.stat()
+            if prune_before is not None and stat.st_mtime < prune_before:
+                path.unlink()
+                removed += 1
+                continue
+            files += 1
+            size += stat.st_size
+        except OSError:
+            continue
+    return {"files": files, "bytes": size, "removed": removed}
+
+
+async def prune() -> dict[str, int]:
+    """Delete stored files not read within the retention window."""
+    cutoff = time.time() - settings.CRAWL_CACHE_RETENTION_DAYS * 86400
+    result = await asyncio.to_thread(_scan, cutoff)
+    logger.info("crawl_cache_pruned", **result)
+    return result
+
+
+async def stats() -> dict[str, Any]:
+    """Counters (all processes, via Redis) and disk usage."""
+    from app.cache import _get_redis
+
+    counters: dict[str, int] = {}
+    client = await _get_redis()
+    if client is not None:
+        try:
+            counters = {k: int(v) for k, v in (await client.hgetall(STATS_KEY)).items()}
+        except Exception as e:
+            logger.debug("crawl_cache_stats_read_failed", error=str(e))
+
+    layers = {}
+    for layer in ("page", "derived", "rendered"):
+        entry = {r: counters.get(f"{layer}:{r}", 0) for r in ("hit", "revalidated", "miss", "bypass")}
+        served = entry["hit"] + entry["revalidated"]
+        lookups = served + entry["miss"]
+        entry["bytes_saved"] = counters.get(f"{layer}:bytes_saved", 0)
+        entry["hit_ratio"] = round(served / lookups, 3) if lookups else 0.0
+        layers[layer] = entry
+
+    disk = await asyncio.to_thread(_scan, None)
+    return {"enabled": settings.CRAWL_CACHE_ENABLED, "layers": layers, "disk_files": disk["files"],
+            "disk_bytes": disk["bytes"]}
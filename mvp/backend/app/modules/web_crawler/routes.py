@@ -2,13 +2,18 @@
 Web crawler API routes — v8.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import json
+import time
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth import get_current_user
 from app.modules.auth_guards.middleware import require_verified_email
 from app.database import get_session
-from app.models.user import User
+from app.models.user import Role, User
 from app.modules.billing.middleware import require_ai_call_quota
 from app.modules.billing.service import BillingService
 from app.modules.web_crawler.schemas import (
@@ -68,6 +73,11 @@ from app.modules.web_crawler.schemas import (
     LxmlExtractResponse,
     RegexChunkRequest,
     RegexChunkResponse,
+    BatchHttpScrapeRequest,
+    BrowserPoolStatsResponse,
+    CrawlCacheStatsResponse,
+    FrontierCrawlJobResponse,
+    FrontierCrawlRequest,
 )
 from app.modules.web_crawler.service import WebCrawlerService
 from app.rate_limit import limiter
@@ -170,6 +180,7 @@ async def scrape_url(
         content_filter_mode=body.content_filter_mode,
         proxies=[p.model_dump() for p in body.proxies] if body.proxies else None,
         antibot_retry=body.antibot_retry,
+        max_age=body.max_age,
     )
 
     return ScrapeResponse(
@@ -194,6 +205,7 @@ async def scrape_url(
         status_code=result.get("status_code"),
         redirected_url=result.get("redirected_url"),
         scraper=result.get("scraper", "crawl4ai"),
+        cache=result.get("cache"),
         success=result.get("success", False),
         error=result.get("error"),
     )
@@ -658,7 +670,7 @@ async def scrape_http(
     """
     Scrape a URL using pure HTTP — no browser, no JavaScript.
 
-    Uses crawl4ai's HTTPCrawlerConfig for 10-20x faster scraping.
+    Fetches through the pooled HTTP engine (shared keep-alive client), 10-20x faster than a browser.
     Best for static HTML, server-rendered content, or REST endpoints.
 
     Rate limit: 20/minute
@@ -670,6 +682,7 @@ async def scrape_http(
         use_fit_markdown=body.use_fit_markdown,
         headers=body.headers or None,
         follow_redirects=body.follow_redirects,
+        max_age=body.max_age,
     )
 
     return FastScrapeResponse(
@@ -682,11 +695,50 @@ async def scrape_http(
         links_external=result.get("links_external", []),
         status_code=result.get("status_code"),
         scraper=result.get("scraper", "crawl4ai_http"),
+        cache=result.get("cache"),
         success=result.get("success", False),
         error=result.get("error"),
     )
 
 
+@router.post("/scrape-http/batch")
+@limiter.limit("2/minute")
+async def batch_scrape_http(
+    request: Request,
+    body: BatchHttpScrapeRequest,
+    current_user: User = Depends(require_verified_email),
+):
+    """
+    Scrape up to 5000 static URLs over the pooled HTTP engine (no browser).
+
+    Streams NDJSON: one scrape-http result per line in completion order,
+    then a summary line ``{"done": true, "total", "succeeded", "failed", "seconds"}``.
+
+    Rate limit: 2/minute
+    """
+    async def lines():
+        started = time.perf_counter()
+        total = succeeded = 0
+        async for result in WebCrawlerService.batch_scrape_http(
+            urls=body.urls,
+            concurrency=body.concurrency,
+            css_selector=body.css_selector,
+            word_count_threshold=body.word_count_threshold,
+            use_fit_markdown=body.use_fit_markdown,
+            headers=body.headers or None,
+            max_age=body.max_age,
+        ):
+            total += 1
+            succeeded += bool(result.get("success"))
+            yield json.dumps(result) + "\n"
+        yield json.dumps({
+            "done": True, "total": total, "succeeded": succeeded, "failed": total - succeeded,
+            "seconds": round(time.perf_counter() - started, 2),
+        }) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/adaptive-crawl", response_model=AdaptiveCrawlResponse)
 @limiter.limit("2/minute")
 async def adaptive_crawl(
@@ -975,3 +1027,159 @@ async def chunk_regex(
         patterns=body.patterns,
     )
     return RegexChunkResponse(**result)
+
+
+# ------------------------------------------------------------------
+# Crawl cache
+# ------------------------------------------------------------------
+
+def _require_admin(user: User) -> None:
+    if user.role != Role.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Crawler administration is restricted to admin users.",
+        )
+
+
+@router.get("/cache/stats", response_model=CrawlCacheStatsResponse)
+@limiter.limit("20/minute")
+async def crawl_cache_stats(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """Crawl cache hit / revalidated / miss counters, bytes saved and disk usage (admin)."""
+    _require_admin(current_user)
+    from app.modules.web_crawler import page_cache
+
+    return CrawlCacheStatsResponse(**await page_cache.stats())
+
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+@limiter.limit("20/minute")
+async def crawl_cache_invalidate(
+    request: Request,
+    url: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Force the next fetch of ``url`` to go to the origin (admin)."""
+    _require_admin(current_user)
+    from app.modules.web_crawler import page_cache
+
+    await page_cache.invalidate(url)
+
+
+@router.get("/browser-pool/stats", response_model=BrowserPoolStatsResponse)
+@limiter.limit("20/minute")
+async def browser_pool_stats(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """Pooled browsers, their active pages and recycle state (admin)."""
+    _require_admin(current_user)
+    from app.modules.web_crawler import browser_pool
+
+    return BrowserPoolStatsResponse(**browser_pool.stats())
+
+
+# ------------------------------------------------------------------
+# Frontier crawls (persistent site-wide crawl jobs)
+# ------------------------------------------------------------------
+
+def _celery_available() -> bool:
+    """Check if Celery workers are available."""
+    try:
+        from app.celery_app import celery_app
+        return bool(celery_app.control.ping(timeout=1.0))
+    except Exception:
+        return False
+
+
+def _launch_frontier_job(job_id: UUID, background_tasks: BackgroundTasks) -> None:
+    """Dispatch a frontier crawl to Celery if available, else BackgroundTasks."""
+    if _celery_available():
+        from app.tasks.frontier_crawl import run_frontier_crawl
+        run_frontier_crawl.delay(str(job_id))
+    else:
+        from app.modules.web_crawler import frontier
+        background_tasks.add_task(frontier.run_job, job_id)
+
+
+async def _get_owned_job(job_id: UUID, user: User, session: AsyncSession):
+    from app.models.crawl_frontier import CrawlJob
+
+    job = await session.get(CrawlJob, job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Crawl job not found")
+    return job
+
+
+@router.post("/frontier-crawls", response_model=FrontierCrawlJobResponse, status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("5/minute")
+async def create_frontier_crawl(
+    request: Request,
+    body: FrontierCrawlRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_ai_call_quota),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Start a site-wide crawl from a seed URL as a background job.
+
+    The frontier is persisted, so the job survives worker restarts. URLs are
+    normalized and deduplicated, robots.txt and per-host rate limits are
+    honored, and near-duplicate pages are skipped before knowledge base
+    indexing. Each fetched page consumes one AI call of quota.
+
+    Poll GET /frontier-crawls/{job_id} for progress.
+    """
+    from app.modules.web_crawler import frontier
+
+    try:
+        job = await frontier.create_job(
+            current_user.id,
+            body.url,
+            session,
+            max_pages=body.max_pages,
+            max_depth=body.max_depth,
+            include_subdomains=body.include_subdomains,
+            keywords=body.keywords,
+            index_to_kb=body.index_to_kb,
+            render_fallback=body.render_fallback,
+            max_age=body.max_age,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    _launch_frontier_job(job.id, background_tasks)
+    return FrontierCrawlJobResponse(**await frontier.job_progress(job, session))
+
+
+@router.get("/frontier-crawls/{job_id}", response_model=FrontierCrawlJobResponse)
+@limiter.limit("60/minute")
+async def get_frontier_crawl(
+    request: Request,
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Progress of a frontier crawl: page counters and frontier URLs by status."""
+    from app.modules.web_crawler import frontier
+
+    job = await _get_owned_job(job_id, current_user, session)
+    return FrontierCrawlJobResponse(**await frontier.job_progress(job, session))
+
+
+@router.post("/frontier-crawls/{job_id}/cancel", response_model=FrontierCrawlJobResponse)
+@limiter.limit("20/minute")
+async def cancel_frontier_crawl(
+    request: Request,
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Cancel a frontier crawl; the worker stops after its current batch."""
+    from app.modules.web_crawler import frontier
+
+    job = await _get_owned_job(job_id, current_user, session)
+    job = await frontier.cancel_job(job, session)
+    return FrontierCrawlJobResponse(**await frontier.job_progress(job, session))
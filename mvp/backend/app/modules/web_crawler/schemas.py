@@ -2,7 +2,9 @@
 Web crawler schemas — v8 (100% crawl4ai feature surface).
 """
 
+from datetime import datetime
 from typing import Any, Optional
+from uuid import UUID
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -253,6 +255,13 @@ class ScrapeRequest(BaseModel):
         default=False,
         description="Auto-detect bot blocking (captcha/403) and retry with stealth enabled",
     )
+    max_age: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=30 * 86400,
+        description="Reuse a cached result up to this many seconds old (revalidated when the site supports it). "
+                    "Unset = always crawl. Ignored for auth, session, JS or capture options",
+    )
 
     # ---- Links ----
     score_links: bool = Field(
@@ -439,6 +448,7 @@ class ScrapeResponse(BaseModel):
     status_code: Optional[int] = None
     redirected_url: Optional[str] = None
     scraper: str = "crawl4ai"
+    cache: Optional[str] = Field(default=None, description="hit | revalidated when served from the crawl cache")
     success: bool = True
     error: Optional[str] = None
 
@@ -954,6 +964,13 @@ class FastScrapeRequest(BaseModel):
         default=True,
         description="Follow HTTP redirects",
     )
+    max_age: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=30 * 86400,
+        description="Accept a cached page up to this many seconds old; 0 always revalidates; "
+                    "unset follows the site's Cache-Control",
+    )
 
 
 class FastScrapeResponse(BaseModel):
@@ -966,10 +983,64 @@ class FastScrapeResponse(BaseModel):
     links_external: list[str] = []
     status_code: Optional[int] = None
     scraper: str = "crawl4ai_http"
+    cache: Optional[str] = Field(default=None, description="hit | revalidated | miss | bypass")
     success: bool = True
     error: Optional[str] = None
 
 
+class CrawlCacheStatsResponse(BaseModel):
+    enabled: bool
+    layers: dict[str, dict]
+    disk_files: int = 0
+    disk_bytes: int = 0
+
+
+class BrowserPoolStatsResponse(BaseModel):
+    max_browsers: int
+    contexts_per_browser: int
+    memory_percent: float
+    browsers: list[dict]
+
+
+class FrontierCrawlRequest(BaseModel):
+    url: str = Field(..., min_length=1, max_length=2000, description="Seed URL")
+    max_pages: int = Field(default=1000, ge=1, le=100_000, description="Pages to fetch before the job stops")
+    max_depth: int = Field(default=5, ge=0, le=50, description="Maximum link depth from the seed URL")
+    include_subdomains: bool = Field(default=False, description="Also follow links to subdomains of the seed host")
+    keywords: list[str] = Field(default_factory=list, max_length=20, description="URLs containing these are crawled first")
+    index_to_kb: bool = Field(default=True, description="Index non-duplicate pages into the knowledge base")
+    render_fallback: bool = Field(default=False, description="Render pages in the browser when HTTP scraping fails")
+    max_age: Optional[int] = Field(default=None, ge=0, le=30 * 86400, description="Accept cached pages up to this many seconds old")
+
+
+class FrontierCrawlJobResponse(BaseModel):
+    id: UUID
+    seed_url: str
+    status: str
+    max_pages: int
+    max_depth: int
+    pages_crawled: int = 0
+    pages_failed: int = 0
+    pages_skipped: int = 0
+    pages_duplicate: int = 0
+    chunks_indexed: int = 0
+    frontier: dict[str, int] = Field(default_factory=dict, description="Frontier URLs by status")
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class BatchHttpScrapeRequest(BaseModel):
+    urls: list[str] = Field(..., min_length=1, max_length=5000, description="Static pages to fetch over HTTP")
+    concurrency: int = Field(default=50, ge=1, le=200, description="Concurrent fetches (per-host limits still apply)")
+    css_selector: Optional[str] = Field(default=None, max_length=500)
+    word_count_threshold: int = Field(default=10, ge=1, le=200)
+    use_fit_markdown: bool = Field(default=True)
+    headers: dict[str, str] = Field(default={}, description="Custom HTTP headers sent with every request")
+    max_age: Optional[int] = Field(default=None, ge=0, le=30 * 86400, description="See scrape-http max_age")
+
+
 # ---------------------------------------------------------------------------
 # Adaptive crawl (AdaptiveCrawler — self-tuning, stops when confident)
 # ---------------------------------------------------------------------------
@@ -31,6 +31,7 @@ Capabilities:
 
 import asyncio
 import base64
+import contextlib
 import re
 import secrets
 from typing import Optional
@@ -38,6 +39,9 @@ from uuid import UUID
 
 import structlog
 
+from app.config import settings
+from app.modules.web_crawler import browser_pool, http_engine, page_cache
+
 logger = structlog.get_logger()
 
 
@@ -104,6 +108,90 @@ def _extract_markdown(result) -> tuple[str, str]:
     return raw, raw
 
 
+def _http_scrape_result(url: str, fetched, result, use_fit_markdown: bool) -> dict:
+    """scrape_http response dict from an engine fetch and its processed CrawlResult."""
+    if result is None:
+        error = fetched.error or f"Unsupported content type: {fetched.content_type}"
+        return {"url": url, "status_code": fetched.status_code, "success": False, "error": error}
+    if not result.success:
+        return {
+            "url": url,
+            "status_code": fetched.status_code,
+            "success": False,
+            "error": result.error_message or "HTTP crawl failed",
+        }
+
+    raw_md, fit_md = _extract_markdown(result)
+    links = result.links or {}
+    logger.info("scrape_http_success", url=url, ms=fetched.elapsed_ms)
+    return {
+        "url": url,
+        "title": (result.metadata or {}).get("title", ""),
+        "markdown": raw_md,
+        "fit_markdown": fit_md if use_fit_markdown else "",
+        "text_length": len(fit_md or raw_md),
+        "links_internal": [lk.get("href") for lk in links.get("internal", []) if lk.get("href")],
+        "links_external": [lk.get("href") for lk in links.get("external", []) if lk.get("href")],
+        "status_code": fetched.status_code,
+        "redirected_url": fetched.final_url if fetched.final_url != url else None,
+        "scraper": "crawl4ai_http",
+        "success": True,
+    }
+
+
+def _http_run_config(css_selector: Optional[str], word_count_threshold: int, use_fit_markdown: bool):
+    """(CrawlerRunConfig, cache variant key) for HTTP scraping."""
+    from crawl4ai import CrawlerRunConfig, CacheMode
+
+    config_kwargs: dict = {
+        "cache_mode": CacheMode.BYPASS,
+        "word_count_threshold": word_count_threshold,
+    }
+    if use_fit_markdown:
+        config_kwargs["markdown_generator"] = _build_markdown_generator(
+            word_count_threshold=word_count_threshold
+        )
+    if css_selector:
+        config_kwargs["css_selector"] = css_selector
+    variant = page_cache.variant_key({
+        "css_selector": css_selector,
+        "word_count_threshold": word_count_threshold,
+        "use_fit_markdown": use_fit_markdown,
+    })
+    return CrawlerRunConfig(**config_kwargs), variant
+
+
+async def _scrape_fetched(url: str, fetched, run_config, variant: str, use_fit_markdown: bool) -> dict:
+    """scrape_http result for a fetched page, reusing cached markdown for an unchanged body."""
+    if fetched.ok and fetched.sha256:
+        cached = await page_cache.get_derived(fetched.sha256, variant)
+        if cached is not None:
+            return {**cached, "url": url, "status_code": fetched.status_code, "cache": fetched.cache}
+
+    result = None
+    if fetched.ok and fetched.is_html:
+        result = await http_engine.process(fetched, run_config)
+    scraped = _http_scrape_result(url, fetched, result, use_fit_markdown)
+    if scraped["success"]:
+        await page_cache.put_derived(fetched.sha256, variant, scraped)
+    scraped["cache"] = fetched.cache or None
+    return scraped
+
+
+async def _arun_http_first(url: str, config, headers: Optional[dict] = None):
+    """Run ``config`` over a pooled HTTP fetch, using the browser only when needed.
+
+    The browser crawler is used when the fetch fails, the response is not
+    HTML, or nothing was extracted (e.g. a page rendered by JavaScript).
+    """
+    fetched, result = await http_engine.crawl(url, config, headers=headers)
+    if result is not None and result.success and result.extracted_content not in (None, "", "[]", "{}"):
+        return result
+    logger.debug("http_engine_browser_fallback", url=url, error=fetched.error)
+    crawler = await get_crawler()
+    return await crawler.arun(url=url, config=config)
+
+
 def _build_proxy_config(proxies: list[dict]):
     """Build a RoundRobinProxyStrategy from a list of proxy dicts."""
     try:
@@ -197,39 +285,11 @@ def _build_markdown_generator(
     return DefaultMarkdownGenerator(content_filter=content_filter, options=options)
 
 
-async def _get_temp_crawler(
-    proxy_url: Optional[str] = None,
-    user_agent: Optional[str] = None,
-    browser_type: str = "chromium",
-    enable_stealth: bool = False,
-    javascript_enabled: bool = True,
-    avoid_ads: bool = False,
-):
-    """Create a temporary AsyncWebCrawler with custom browser config.
-
-    Caller is responsible for calling .close() on the returned instance.
-    """
-    from crawl4ai import AsyncWebCrawler, BrowserConfig
-
-    browser_kwargs: dict = {"headless": True}
-    if proxy_url:
-        browser_kwargs["proxy"] = proxy_url
-    if user_agent and user_agent != "random":
-        browser_kwargs["user_agent"] = user_agent
-    elif user_agent == "random":
-        browser_kwargs["user_agent_mode"] = "random"
-    if browser_type and browser_type != "chromium":
-        browser_kwargs["browser_type"] = browser_type
-    if enable_stealth:
-        browser_kwargs["enable_stealth"] = True
-    if not javascript_enabled:
-        browser_kwargs["javascript_enabled"] = False
-    if avoid_ads:
-        browser_kwargs["avoid_ads"] = True
-
-    instance = AsyncWebCrawler(config=BrowserConfig(**browser_kwargs))
-    await instance.start()
-    return instance
+# scrape() options that make a result user-specific or stateful (never cached)
+_UNCACHEABLE_SCRAPE_OPTIONS = (
+    "auth", "session_id", "js_code", "js_code_before_wait", "proxy_url", "proxies",
+    "screenshot", "pdf", "capture_mhtml", "capture_network_requests", "capture_console_messages",
+)
 
 
 # ---------------------------------------------------------------------------
@@ -325,6 +385,8 @@ class WebCrawlerService:
         content_filter_mode: str = "pruning",
         proxies: Optional[list] = None,
         antibot_retry: bool = False,
+        # Crawl cache
+        max_age: Optional[int] = None,
     ) -> dict:
         """
         Scrape a URL with the full crawl4ai feature set.
@@ -333,7 +395,23 @@ class WebCrawlerService:
         - cookies: dict of cookies to inject
         - headers: dict of custom headers (e.g. Bearer token)
         - login_url + login_js: auto-login via isolated crawl4ai session
+
+        ``max_age`` (seconds) returns a cached result for the same options up
+        to that age (revalidated with a conditional GET when older).  Only
+        anonymous, side-effect-free scrapes are cached.
         """
+        options = dict(locals())
+        cache_variant = None
+        if max_age is not None and not any(
+            options.get(name) for name in _UNCACHEABLE_SCRAPE_OPTIONS
+        ):
+            cache_variant = page_cache.variant_key(
+                {k: v for k, v in options.items() if k not in ("url", "max_age")}
+            )
+            cached = await page_cache.get_rendered(url, cache_variant, max_age)
+            if cached is not None:
+                return cached
+
         try:
             from crawl4ai import CrawlerRunConfig, CacheMode
 
@@ -472,35 +550,28 @@ class WebCrawlerService:
                         for k, v in auth["cookies"].items()
                     ]
 
-            # Proxy rotation — overrides single proxy_url
-            proxy_strategy = None
+            # Proxy rotation — overrides single proxy_url. Set per run so a
+            # pooled browser is never mutated for one caller.
             if proxies:
                 proxy_strategy = _build_proxy_config(proxies)
-
-            # Determine which crawler to use
-            needs_temp = bool(
-                proxy_url or proxy_strategy or user_agent or enable_stealth
-                or browser_type != "chromium" or not javascript_enabled or avoid_ads
+                if proxy_strategy:
+                    config_kwargs["proxy_rotation_strategy"] = proxy_strategy
+                    proxy_url = None
+
+            # Non-default browser options lease a warm browser from the pool
+            browser_options = browser_pool.browser_kwargs(
+                proxy_url=proxy_url,
+                user_agent=user_agent,
+                browser_type=browser_type,
+                enable_stealth=enable_stealth,
+                javascript_enabled=javascript_enabled,
+                avoid_ads=avoid_ads,
             )
-            _temp = None
-            try:
-                if needs_temp:
-                    _temp = await _get_temp_crawler(
-                        proxy_url=proxy_url if not proxy_strategy else None,
-                        user_agent=user_agent,
-                        browser_type=browser_type,
-                        enable_stealth=enable_stealth,
-                        javascript_enabled=javascript_enabled,
-                        avoid_ads=avoid_ads,
-                    )
-                    # Attach proxy rotation if available
-                    if proxy_strategy and _temp:
-                        try:
-                            _temp._config.proxy_config = proxy_strategy
-                        except Exception:
-                            pass
-                    _active = _temp
+            async with contextlib.AsyncExitStack() as stack:
+                if browser_options != browser_pool.browser_kwargs():
+                    _active = await stack.enter_async_context(browser_pool.lease(browser_options))
                 else:
+                    await stack.enter_async_context(browser_pool.page_slot())
                     _active = await get_crawler()
 
                 if auth and auth.get("login_url") and auth.get("login_js"):
@@ -528,12 +599,6 @@ class WebCrawlerService:
                 else:
                     config = CrawlerRunConfig(**config_kwargs)
                     result = await _active.arun(url=url, config=config)
-            finally:
-                if _temp is not None:
-                    try:
-                        await _temp.close()
-                    except Exception:
-                        pass
 
             # Antibot detection + stealth retry
             if antibot_retry and result.success:
@@ -547,22 +612,10 @@ class WebCrawlerService:
                     )
                     if blocked and not enable_stealth:
                         logger.info("antibot_blocked_retrying", url=url, reason=reason)
-                        stealth_crawler = await _get_temp_crawler(
-                            proxy_url=proxy_url,
-                            user_agent=user_agent,
-                            browser_type=browser_type,
-                            enable_stealth=True,
-                            javascript_enabled=javascript_enabled,
-                            avoid_ads=avoid_ads,
-                        )
-                        try:
+                        stealth_options = {**browser_options, "enable_stealth": True}
+                        async with browser_pool.lease(stealth_options) as stealth_crawler:
                             retry_config = CrawlerRunConfig(**config_kwargs)
                             result = await stealth_crawler.arun(url=url, config=retry_config)
-                        finally:
-                            try:
-                                await stealth_crawler.close()
-                            except Exception:
-                                pass
                 except ImportError:
                     pass
                 except Exception as ab_err:
@@ -668,7 +721,7 @@ class WebCrawlerService:
                 ssl_cert = cert.__dict__ if hasattr(cert, "__dict__") else {"info": str(cert)}
 
             logger.info("scrape_success", url=url, scraper="crawl4ai")
-            return {
+            scraped = {
                 "url": url,
                 "title": result.metadata.get("title", "") if result.metadata else "",
                 "markdown": raw_md,
@@ -692,6 +745,11 @@ class WebCrawlerService:
                 "success": True,
                 "scraper": "crawl4ai",
             }
+            if cache_variant is not None:
+                await page_cache.put_rendered(
+                    url, cache_variant, scraped, getattr(result, "response_headers", None),
+                )
+            return scraped
 
         except ImportError:
             logger.warning("crawl4ai_not_installed", msg="falling back to Jina Reader")
@@ -721,15 +779,12 @@ class WebCrawlerService:
     @staticmethod
     async def _scrape_with_jina(url: str) -> dict:
         """Scrape via Jina Reader API (free tier, no API key, fallback)."""
-        import httpx
-
         try:
             jina_url = f"https://r.jina.ai/{url}"
             headers = {"Accept": "application/json"}
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.get(jina_url, headers=headers)
-                resp.raise_for_status()
+            resp = await http_engine.get_client().get(jina_url, headers=headers, timeout=30.0)
+            resp.raise_for_status()
 
             data = (
                 resp.json().get("data", {})
@@ -854,7 +909,6 @@ class WebCrawlerService:
                 image_bytes = resp.content
                 content_type = resp.headers.get("content-type", "image/jpeg")
 
-            from app.config import settings
             if not settings.GEMINI_API_KEY or settings.GEMINI_API_KEY == "MOCK":
                 return "[Vision analysis requires GEMINI_API_KEY]"
 
@@ -898,6 +952,7 @@ class WebCrawlerService:
                 extract_images=include_images,
                 auth=auth,
                 topic=topic,
+                max_age=settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS,
             )
 
             if not main_result.get("success"):
@@ -972,6 +1027,8 @@ class WebCrawlerService:
                         main_result.get("markdown", ""), url, max_pages - 1
                     )
 
+                # Subpages are indexed together in one bulk ingestion
+                sub_documents: list[dict] = []
                 for sub_url in subpage_urls:
                     try:
                         sub_result = await WebCrawlerService.scrape(
@@ -979,6 +1036,7 @@ class WebCrawlerService:
                             extract_images=include_images,
                             max_images=5,
                             topic=topic,
+                            max_age=settings.CRAWL_CACHE_DEFAULT_MAX_AGE_SECONDS,
                         )
 
                         if sub_result.get("success"):
@@ -986,29 +1044,11 @@ class WebCrawlerService:
                             sub_title = sub_result.get("title", sub_url)
 
                             if sub_content.strip():
-                                try:
-                                    from app.modules.knowledge.service import KnowledgeService
-
-                                    async def _index_sub(s):
-                                        return await KnowledgeService.index_text_content(
-                                            user_id=user_id,
-                                            filename=f"web_{sub_title[:50]}.md",
-                                            content=sub_content,
-                                            content_type="text/markdown",
-                                            session=s,
-                                        )
-
-                                    if session is not None:
-                                        indexed = await _index_sub(session)
-                                    else:
-                                        from app.database import get_session_context
-                                        async with get_session_context() as new_session:
-                                            indexed = await _index_sub(new_session)
-
-                                    if indexed:
-                                        chunks_indexed += indexed.get("total_chunks", 0)
-                                except Exception:
-                                    pass
+                                sub_documents.append({
+                                    "filename": f"web_{sub_title[:50]}.md",
+                                    "content_type": "text/markdown",
+                                    "text": sub_content,
+                                })
 
                             pages_crawled += 1
                             images_found += len(sub_result.get("images", []))
@@ -1016,6 +1056,20 @@ class WebCrawlerService:
                     except Exception as e:
                         logger.warning("subpage_crawl_failed", url=sub_url, error=str(e))
 
+                if sub_documents:
+                    try:
+                        from app.modules.knowledge.service import KnowledgeService
+
+                        if session is not None:
+                            documents = await KnowledgeService.upload_documents(user_id, sub_documents, session)
+                        else:
+                            from app.database import get_session_context
+                            async with get_session_context() as new_session:
+                                documents = await KnowledgeService.upload_documents(user_id, sub_documents, new_session)
+                        chunks_indexed += sum(d.total_chunks for d in documents)
+                    except Exception as e:
+                        logger.warning("knowledge_index_failed", error=str(e))
+
             return {
                 "url": url,
                 "pages_crawled": pages_crawled,
@@ -1124,7 +1178,6 @@ class WebCrawlerService:
             import json
             from crawl4ai import CrawlerRunConfig, CacheMode, LLMConfig
             from crawl4ai.extraction_strategy import LLMExtractionStrategy
-            from app.config import settings
 
             provider_map = {
                 "gemini": ("google/gemini-2.0-flash", getattr(settings, "GEMINI_API_KEY", None)),
@@ -1541,8 +1594,16 @@ class WebCrawlerService:
                 seed_kwargs["extract_head"] = True
 
             config = SeedingConfig(**seed_kwargs)
-            async with AsyncUrlSeeder() as seeder:
+            try:
+                # Sitemap / head requests reuse the pooled HTTP engine client
+                seeder = AsyncUrlSeeder(client=http_engine.get_client())
+            except TypeError:
+                seeder = None
+            if seeder is not None:
                 urls = await seeder.urls(domain, config)
+            else:
+                async with AsyncUrlSeeder() as seeder:
+                    urls = await seeder.urls(domain, config)
 
             # Normalize to list of strings
             if isinstance(urls, dict):
@@ -1634,8 +1695,9 @@ class WebCrawlerService:
                     ]
 
             config = CrawlerRunConfig(**config_kwargs)
-            crawler = await get_crawler()
-            result = await crawler.arun(url=url, config=config)
+            auth = auth or {}
+            http_headers = {**(auth.get("headers") or {}), **http_engine.cookie_header(auth.get("cookies"))}
+            result = await _arun_http_first(url, config, headers=http_headers or None)
 
             if not result.success:
                 return {"url": url, "matches": [], "match_count": 0, "success": False,
@@ -1735,7 +1797,6 @@ class WebCrawlerService:
         try:
             from crawl4ai import LLMConfig
             from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
-            from app.config import settings
 
             provider_map = {
                 "gemini": ("google/gemini-2.0-flash", getattr(settings, "GEMINI_API_KEY", None)),
@@ -1852,94 +1913,61 @@ class WebCrawlerService:
         use_fit_markdown: bool = True,
         headers: dict = None,
         follow_redirects: bool = True,
+        max_age: Optional[int] = None,
     ) -> dict:
         """
         Scrape a URL using pure HTTP (no browser, no JavaScript).
 
-        Uses HTTPCrawlerConfig — 10-20x faster than browser-based scraping.
+        Fetches through the pooled HTTP engine and the page cache: ``max_age``
+        (seconds) accepts a cached copy up to that age, ``0`` always
+        revalidates, ``None`` follows the site's Cache-Control.  Markdown for
+        an unchanged page is reused instead of regenerated.
         Best for static HTML, server-rendered pages, or authenticated REST endpoints.
         """
         try:
-            from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
-            from crawl4ai.async_configs import HTTPCrawlerConfig
-
-            http_config = HTTPCrawlerConfig(
-                headers=headers or {},
-                follow_redirects=follow_redirects,
+            run_config, variant = _http_run_config(css_selector, word_count_threshold, use_fit_markdown)
+            fetched = await page_cache.fetch(
+                url, max_age=max_age, headers=headers or None, follow_redirects=follow_redirects,
             )
-            # AsyncWebCrawler internally accesses BrowserConfig attributes on the
-            # config object. HTTPCrawlerConfig doesn't have them — copy all
-            # defaults from a fresh BrowserConfig instance.
-            from crawl4ai import BrowserConfig as _BC
-            _defaults = _BC(headless=True, verbose=False)
-            for _attr in dir(_defaults):
-                if _attr.startswith("_") or callable(getattr(_defaults, _attr)):
-                    continue
-                if not hasattr(http_config, _attr):
-                    setattr(http_config, _attr, getattr(_defaults, _attr))
-
-            md_generator = _build_markdown_generator(
-                word_count_threshold=word_count_threshold
-            ) if use_fit_markdown else None
-
-            config_kwargs: dict = {
-                "cache_mode": CacheMode.BYPASS,
-                "word_count_threshold": word_count_threshold,
-            }
-            if md_generator:
-                config_kwargs["markdown_generator"] = md_generator
-            if css_selector:
-                config_kwargs["css_selector"] = css_selector
-
-            run_config = CrawlerRunConfig(**config_kwargs)
-
-            async with AsyncWebCrawler(config=http_config) as crawler:
-                result = await crawler.arun(url=url, config=run_config)
-
-            if not result.success:
-                return {
-                    "url": url,
-                    "success": False,
-                    "error": result.error_message or "HTTP crawl failed",
-                }
-
-            raw_md, fit_md = _extract_markdown(result)
-
-            internal_links, external_links = [], []
-            if result.links:
-                for lk in result.links.get("internal", []):
-                    href = lk.get("href", "")
-                    if href:
-                        internal_links.append(href)
-                for lk in result.links.get("external", []):
-                    href = lk.get("href", "")
-                    if href:
-                        external_links.append(href)
-
-            logger.info("scrape_http_success", url=url)
-            return {
-                "url": url,
-                "title": (result.metadata or {}).get("title", ""),
-                "markdown": raw_md,
-                "fit_markdown": fit_md if use_fit_markdown else "",
-                "text_length": len(fit_md or raw_md),
-                "links_internal": internal_links,
-                "links_external": external_links,
-                "status_code": getattr(result, "status_code", None),
-                "scraper": "crawl4ai_http",
-                "success": True,
-            }
+            return await _scrape_fetched(url, fetched, run_config, variant, use_fit_markdown)
 
         except ImportError:
             return {
                 "url": url,
                 "success": False,
-                "error": "HTTPCrawlerConfig requires crawl4ai >= 0.4.3",
+                "error": "crawl4ai is not installed",
             }
         except Exception as e:
             logger.error("scrape_http_failed", url=url, error=str(e))
             return {"url": url, "success": False, "error": str(e)[:500]}
 
+    @staticmethod
+    async def batch_scrape_http(
+        urls: list[str],
+        concurrency: int = 50,
+        css_selector: Optional[str] = None,
+        word_count_threshold: int = 10,
+        use_fit_markdown: bool = True,
+        headers: dict = None,
+        max_age: Optional[int] = None,
+    ):
+        """
+        Scrape many static URLs over the pooled HTTP engine.
+
+        Async generator yielding one scrape_http-shaped dict per URL in
+        completion order (per-host limits and the page cache still apply).
+        """
+        run_config, variant = _http_run_config(css_selector, word_count_threshold, use_fit_markdown)
+        async for fetched in http_engine.fetch_many(
+            dict.fromkeys(urls), concurrency=concurrency, fetcher=page_cache.fetch,
+            headers=headers or None, max_age=max_age,
+        ):
+            try:
+                yield await _scrape_fetched(fetched.url, fetched, run_config, variant, use_fit_markdown)
+            except Exception as e:
+                logger.warning("batch_scrape_http_item_failed", url=fetched.url, error=str(e))
+                yield {"url": fetched.url, "success": False, "error": str(e)[:500]}
+
     @staticmethod
     async def adaptive_crawl(
         url: str,
@@ -2305,8 +2333,7 @@ class WebCrawlerService:
                 config_kwargs["headers"] = auth["headers"]
 
             config = CrawlerRunConfig(**config_kwargs)
-            crawler = await get_crawler()
-            result = await crawler.arun(url=url, config=config)
+            result = await _arun_http_first(url, config, headers=config_kwargs.get("headers"))
 
             if not result.success:
                 return {"url": url, "data": None, "success": False,
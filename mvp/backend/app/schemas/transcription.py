@@ -25,10 +25,11 @@ T = TypeVar("T")
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response wrapper"""
     items: List[T]
-    total: int = Field(..., description="Total number of items matching the query")
+    total: Optional[int] = Field(..., description="Total number of items matching the query (null with count=none)")
     skip: int = Field(..., description="Number of items skipped")
     limit: int = Field(..., description="Maximum number of items per page")
     has_more: bool = Field(..., description="Whether more items are available beyond this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
 
 
 class TranscriptionCreate(BaseModel):
@@ -104,7 +105,7 @@ class TranscriptionRead(BaseModel):
     source_type: Optional[str] = "youtube"
     original_filename: Optional[str] = None
     status: TranscriptionStatus
-    text: Optional[str]
+    text: Optional[str] = None
     confidence: Optional[float]
     duration_seconds: Optional[int]
     error: Optional[str]
@@ -333,6 +334,7 @@ class ExportFormat(str, Enum):
     TXT = "txt"
     MD = "md"
     JSON = "json"
+    JSONL = "jsonl"
 
 
 class BatchTranscribeRequest(BaseModel):
@@ -423,6 +425,15 @@ class ExportResponse(BaseModel):
     filename: str = ""
 
 
+class BulkExportRequest(BaseModel):
+    """Request for a zip export of several transcriptions."""
+    job_ids: Optional[List[UUID]] = Field(
+        default=None, max_length=500,
+        description="Transcriptions to export (default: all completed transcriptions)",
+    )
+    format: ExportFormat = Field(default=ExportFormat.SRT, description="Format of each file in the zip")
+
+
 class YouTubeMetadataV2(BaseModel):
     """Enhanced YouTube video metadata (v2)."""
     video_id: str = ""
@@ -0,0 +1,44 @@
+"""
+Celery task for crawl cache housekeeping.
+
+- ``prune_crawl_cache``: runs nightly, deletes cached bodies and results
+  that were not read within CRAWL_CACHE_RETENTION_DAYS (their Redis
+  metadata has already expired).
+"""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger()
+
+
+def _run_async(coro):
+    """Run an async coroutine from synchronous Celery task context."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            raise RuntimeError("closed")
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+@celery_app.task(name="web_crawler.prune_crawl_cache", bind=True, max_retries=0)
+def prune_crawl_cache(self):
+    """Remove crawl cache files past the retention window.
+
+    Scheduled via Celery beat once per day.
+    """
+    from app.modules.web_crawler import page_cache
+
+    try:
+        result = _run_async(page_cache.prune())
+        logger.info("crawl_cache_prune_done", result=result)
+        return result
+    except Exception as exc:
+        logger.error("crawl_cache_prune_task_error", error=str(exc))
+        raise
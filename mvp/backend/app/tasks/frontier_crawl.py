@@ -0,0 +1,65 @@
+"""
+Celery tasks for frontier crawls (web_crawler.frontier).
+
+- ``run_frontier_crawl``: crawls one job until its frontier is exhausted,
+  max_pages is reached or it is cancelled
+- ``resume_frontier_crawls``: runs every few minutes and re-dispatches jobs
+  that are pending without a worker or whose worker stopped heartbeating
+  (e.g. after a restart); the job lease keeps a live job from running twice
+"""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger()
+
+
+def _run_async(coro):
+    """Run an async coroutine from synchronous Celery task context."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            raise RuntimeError("closed")
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+@celery_app.task(name="web_crawler.run_frontier_crawl", bind=True, max_retries=0)
+def run_frontier_crawl(self, job_id: str):
+    """Run (or resume) a frontier crawl job."""
+    from uuid import UUID
+
+    from app.modules.web_crawler import frontier
+
+    try:
+        result = _run_async(frontier.run_job(UUID(job_id)))
+        logger.info("frontier_crawl_task_done", result=result)
+        return result
+    except Exception as exc:
+        logger.error("frontier_crawl_task_error", job_id=job_id, error=str(exc))
+        raise
+
+
+@celery_app.task(name="web_crawler.resume_frontier_crawls", bind=True, max_retries=0)
+def resume_frontier_crawls(self):
+    """Re-dispatch stale frontier crawl jobs.
+
+    Scheduled via Celery beat every 5 minutes.
+    """
+    from app.modules.web_crawler import frontier
+
+    try:
+        job_ids = _run_async(frontier.stale_job_ids())
+        for job_id in job_ids:
+            run_frontier_crawl.delay(str(job_id))
+        if job_ids:
+            logger.info("frontier_crawls_resumed", count=len(job_ids))
+        return {"resumed": len(job_ids)}
+    except Exception as exc:
+        logger.error("frontier_crawl_resume_task_error", error=str(exc))
+        raise
@@ -0,0 +1,71 @@
+"""
+Celery beat tasks for billing quotas.
+
+- ``reconcile_quotas``: runs every 30 seconds, flushes pending Redis quota
+  increments to ``user_quotas`` in bulk.
+- ``reset_quotas``: runs daily, rolls expired billing periods forward.
+"""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger()
+
+
+def _run_async(coro):
+    """Run an async coroutine from synchronous Celery task context."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            raise RuntimeError("closed")
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+async def _reconcile() -> int:
+    from app.database import get_session_context
+    from app.modules.billing.service import BillingService
+
+    async with get_session_context() as session:
+        return await BillingService.reconcile_quota_counters(session)
+
+
+async def _reset() -> int:
+    from app.database import get_session_context
+    from app.modules.billing.service import BillingService
+
+    async with get_session_context() as session:
+        return await BillingService.reset_monthly_quotas(session)
+
+
+@celery_app.task(name="billing.reconcile_quotas", bind=True, max_retries=0)
+def reconcile_quotas(self):
+    """Flush Redis quota counters to Postgres.
+
+    Scheduled via Celery beat every 30 seconds.
+    """
+    try:
+        return _run_async(_reconcile())
+    except Exception as exc:
+        logger.error("quota_reconcile_task_error", error=str(exc))
+        raise
+
+
+@celery_app.task(name="billing.reset_quotas", bind=True, max_retries=0)
+def reset_quotas(self):
+    """Reset quotas whose billing period has ended.
+
+    Scheduled via Celery beat once per day.
+    """
+    try:
+        count = _run_async(_reset())
+        logger.info("quota_reset_done", count=count)
+        return count
+    except Exception as exc:
+        logger.error("quota_reset_task_error", error=str(exc))
+        raise
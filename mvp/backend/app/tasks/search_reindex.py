@@ -0,0 +1,54 @@
+"""
+Celery beat task for unified search indexing.
+
+- ``delta_sync``: runs nightly, pushes rows changed since each module's
+  watermark into its Meilisearch index (a full shadow rebuild happens
+  automatically for modules without a watermark yet).
+"""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger()
+
+
+def _run_async(coro):
+    """Run an async coroutine from synchronous Celery task context."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            raise RuntimeError("closed")
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+async def _delta_sync_all() -> dict:
+    from app.database import get_session_context
+    from app.modules.unified_search.reindexer import SOURCES
+    from app.modules.unified_search.service import UnifiedSearchService
+
+    results = {}
+    for module_name in SOURCES:
+        async with get_session_context() as session:
+            results[module_name] = await UnifiedSearchService.reindex_module(module_name, session, mode="delta")
+    return results
+
+
+@celery_app.task(name="unified_search.delta_sync", bind=True, max_retries=0)
+def delta_sync(self):
+    """Incrementally sync every unified search module into Meilisearch.
+
+    Scheduled via Celery beat once per day.
+    """
+    try:
+        results = _run_async(_delta_sync_all())
+        logger.info("search_delta_sync_done", results=results)
+        return results
+    except Exception as exc:
+        logger.error("search_delta_sync_task_error", error=str(exc))
+        raise
@@ -0,0 +1,73 @@
+"""
+Celery beat tasks for AI usage rollups.
+
+- ``compact_usage``: runs every 10 minutes, folds closed hours of
+  ``ai_usage_logs`` into the hourly/daily rollup tables.
+- ``prune_usage_logs``: runs daily, deletes raw logs past retention that
+  are already covered by the rollups.
+"""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger()
+
+
+def _run_async(coro):
+    """Run an async coroutine from synchronous Celery task context."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            raise RuntimeError("closed")
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+async def _compact():
+    from app.database import get_session_context
+    from app.modules.cost_tracker import rollups
+
+    async with get_session_context() as session:
+        return await rollups.compact(session)
+
+
+async def _prune() -> int:
+    from app.database import get_session_context
+    from app.modules.cost_tracker import rollups
+
+    async with get_session_context() as session:
+        return await rollups.prune_raw_logs(session)
+
+
+@celery_app.task(name="cost_tracker.compact_usage", bind=True, max_retries=0)
+def compact_usage(self):
+    """Compact raw AI usage logs into rollups.
+
+    Scheduled via Celery beat every 10 minutes.
+    """
+    try:
+        watermark = _run_async(_compact())
+        return watermark.isoformat() if watermark else None
+    except Exception as exc:
+        logger.error("usage_compact_task_error", error=str(exc))
+        raise
+
+
+@celery_app.task(name="cost_tracker.prune_usage_logs", bind=True, max_retries=0)
+def prune_usage_logs(self):
+    """Delete rolled-up raw usage logs older than the retention window.
+
+    Scheduled via Celery beat once per day.
+    """
+    try:
+        deleted = _run_async(_prune())
+        logger.info("usage_prune_done", deleted=deleted)
+        return deleted
+    except Exception as exc:
+        logger.error("usage_prune_task_error", error=str(exc))
+        raise
@@ -0,0 +1,66 @@
+"""
+Celery tasks for knowledge base pgvector index maintenance.
+
+- ``rebuild_vector_index``: on demand (admin endpoint), rebuilds the global
+  ANN index CONCURRENTLY and swaps it in, then resyncs tenant indexes.
+- ``sync_tenant_vector_indexes``: runs nightly, creates partial HNSW indexes
+  for tenants that crossed KNOWLEDGE_ANN_TENANT_INDEX_MIN_CHUNKS and drops
+  those of tenants that shrank well below it.
+"""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger()
+
+
+def _run_async(coro):
+    """Run an async coroutine from synchronous Celery task context."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            raise RuntimeError("closed")
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+async def _rebuild(**params) -> dict:
+    from app.modules.knowledge import vector_index
+
+    result = await vector_index.rebuild_global_index(**params)
+    result["tenant_indexes"] = await vector_index.sync_tenant_indexes()
+    return result
+
+
+@celery_app.task(name="knowledge.rebuild_vector_index", bind=True, max_retries=0)
+def rebuild_vector_index(self, method=None, m=None, ef_construction=None, lists=None):
+    """Rebuild the global ANN index on document_chunks.embedding."""
+    try:
+        result = _run_async(_rebuild(method=method, m=m, ef_construction=ef_construction, lists=lists))
+        logger.info("vector_index_rebuild_done", result=result)
+        return result
+    except Exception as exc:
+        logger.error("vector_index_rebuild_task_error", error=str(exc))
+        raise
+
+
+@celery_app.task(name="knowledge.sync_tenant_vector_indexes", bind=True, max_retries=0)
+def sync_tenant_vector_indexes(self):
+    """Create / drop per-tenant partial ANN indexes.
+
+    Scheduled via Celery beat once per day.
+    """
+    from app.modules.knowledge import vector_index
+
+    try:
+        result = _run_async(vector_index.sync_tenant_indexes())
+        logger.info("vector_tenant_index_sync_done", result=result)
+        return result
+    except Exception as exc:
+        logger.error("vector_tenant_index_sync_task_error", error=str(exc))
+        raise
@@ -0,0 +1,174 @@
+"""
+Benchmark: static provider fallback vs. the latency-aware provider router.
+
+Simulates three fake providers (no network) through four phases:
+
+    normal   groq fast, gemini slower, claude slowest
+    spike    groq latency x15
+    outage   groq returns 503 for every call
+    limited  groq down, gemini returns 429 with Retry-After
+
+The static strategy walks groq -> gemini -> claude with
+retry.with_retries on each (the old complete_with_routing); the router
+strategy uses ProviderRouter.call.  Latencies and backoff sleeps are
+scaled down by --scale so a run takes seconds; reported latencies are
+scaled back up.
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_ai_router
+    python -m scripts.bench_ai_router --requests 400 --concurrency 16 --scale 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PHASES = ["normal", "spike", "outage", "limited"]
+
+# Base latency (seconds, before scaling) per provider
+BASE_LATENCY = {"groq": 0.6, "gemini": 1.5, "claude": 3.0}
+
+
+class FakeProviderError(Exception):
+    def __init__(self, status: int, retry_after: float = None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.response = type("Response", (), {
+            "status_code": status,
+            "headers": {"retry-after": str(retry_after)} if retry_after else {},
+        })()
+
+
+class Simulation:
+    def __init__(self, scale: float, seed: int):
+        self.scale = scale
+        self.phase = "normal"
+        self.rng = random.Random(seed)
+        self.calls: Counter = Counter()
+
+    async def provider_call(self, name: str) -> str:
+        self.calls[name] += 1
+        latency = BASE_LATENCY[name] * self.rng.lognormvariate(0, 0.25)
+        if self.phase == "spike" and name == "groq":
+            latency *= 15
+        if self.phase in ("outage", "limited") and name == "groq":
+            await asyncio.sleep(0.05 * self.scale)
+            raise FakeProviderError(503)
+        if self.phase == "limited" and name == "gemini":
+            await asyncio.sleep(0.02 * self.scale)
+            raise FakeProviderError(429, retry_after=60 * self.scale)
+        await asyncio.sleep(latency * self.scale)
+        return f"answer from {name}"
+
+
+async def _static(sim: Simulation, retry) -> str:
+    last_error = None
+    for name in ("groq", "gemini", "claude"):
+        try:
+            await retry.with_retries(lambda: sim.provider_call(name), provider=name)
+            return name
+        except Exception as e:
+            last_error = e
+    raise last_error
+
+
+async def _routed(sim: Simulation, router) -> str:
+    async def attempt(name):
+        from app.ai_assistant import retry
+
+        await retry.with_retries(lambda: sim.provider_call(name), provider=name)
+    name, _ = await router.call(attempt, cost_tier="free", escalate=True)
+    return name
+
+
+async def run_strategy(strategy: str, args) -> dict:
+    from app.ai_assistant import retry
+    from app.ai_assistant.router import PROVIDERS, ProviderRouter
+    from app.config import settings
+
+    sim = Simulation(args.scale, args.seed)
+    overrides = {
+        "AI_ROUTER_WINDOW_SECONDS": 60 * args.scale,
+        "AI_ROUTER_BREAKER_RECOVERY_SECONDS": 30 * args.scale,
+        "AI_ROUTER_MAX_RETRY_AFTER_SECONDS": 300 * args.scale,
+    }
+    router = None
+    per_phase = {phase: [] for phase in PHASES}
+    served: Counter = Counter()
+    failures = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    per = args.requests // len(PHASES)
+    for i in range(per * len(PHASES)):
+        queue.put_nowait(PHASES[i // per])
+
+    async def worker():
+        nonlocal failures
+        while not queue.empty():
+            phase = queue.get_nowait()
+            sim.phase = phase
+            start = time.monotonic()
+            try:
+                if strategy == "static":
+                    served[await _static(sim, retry)] += 1
+                else:
+                    served[await _routed(sim, router)] += 1
+            except Exception:
+                failures += 1
+            per_phase[phase].append((time.monotonic() - start) / args.scale)
+
+    backoff = [b * args.scale for b in retry.BACKOFF_SECONDS]
+    with patch.object(retry, "BACKOFF_SECONDS", backoff), \
+         patch.multiple(settings, **overrides), \
+         patch("app.ai_assistant.router.logger"), patch("app.ai_assistant.retry.logger"), \
+         patch("app.core.circuit_breaker.logger"):
+        router = ProviderRouter({name: (tier, prior * args.scale) for name, (tier, prior) in PROVIDERS.items()})
+        wall = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall = (time.monotonic() - wall) / args.scale
+
+    return {
+        "strategy": strategy,
+        "wall": wall,
+        "failures": failures,
+        "served": dict(served),
+        "calls": dict(sim.calls),
+        "phases": {
+            phase: {
+                "p50": statistics.median(values),
+                "p95": statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0],
+            }
+            for phase, values in per_phase.items() if values
+        },
+    }
+
+
+def _report(result: dict) -> None:
+    print(f"\n{result['strategy']}: simulated wall {result['wall']:.1f}s, failures {result['failures']}")
+    print(f"  served by: {result['served']}   provider calls: {result['calls']}")
+    for phase, stats in result["phases"].items():
+        print(f"  {phase:8s} p50 {stats['p50']:6.2f}s   p95 {stats['p95']:6.2f}s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate static fallback vs. provider router")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=0.01, help="wall seconds per simulated second")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for strategy in ("static", "router"):
+        _report(await run_strategy(strategy, args))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+"""
+Benchmark: cost/monitoring dashboards on raw ai_usage_logs vs. rollups.
+
+Generates synthetic usage rows (tagged ``module='bench_rollups'``) spread
+over the last N days for existing users, then times
+CostTrackerService.get_dashboard and AIMonitoringService.get_dashboard
+reading raw logs only, runs the compaction, and times them again on the
+rollups + raw tail.
+
+Requires a PostgreSQL DATABASE_URL with migrations applied and at least one
+user (run ``python -m scripts.seed_data`` first).
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_cost_rollups --rows 10000000 --days 90
+    python -m scripts.bench_cost_rollups --cleanup
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_MODULE = "bench_rollups"
+CHUNK = 1_000_000
+
+_INSERT_SQL = """
+    INSERT INTO ai_usage_logs (
+        id, user_id, provider, model, module, action,
+        input_tokens, output_tokens, total_tokens, cost_cents,
+        latency_ms, success, created_at
+    )
+    SELECT gen_random_uuid(),
+           (CAST(:users AS uuid[]))[1 + (i % cardinality(CAST(:users AS uuid[])))],
+           (ARRAY['groq', 'gemini', 'claude'])[1 + (i % 3)],
+           (ARRAY['llama-3.3-70b', 'gemini-2.0-flash', 'claude-sonnet'])[1 + (i % 3)],
+           :module,
+           (ARRAY['chat', 'summarize', 'extract', 'classify'])[1 + (i % 4)],
+           200 + (i % 800), 100 + (i % 400), 300 + (i % 800) + (i % 400),
+           ((i % 50) / 100.0),
+           150 + (i % 3000), (i % 37) <> 0,
+           now() AT TIME ZONE 'UTC' - (random() * make_interval(days => :days))
+    FROM generate_series(:start, :stop) AS i
+"""
+
+
+async def _timed(fn, repeat: int) -> float:
+    """Return the median wall time (ms) of ``repeat`` calls."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def _measure(user_id, days_list, repeat, raw_only: bool) -> dict:
+    from app.database import get_session_context
+    from app.modules.ai_monitoring.service import AIMonitoringService
+    from app.modules.cost_tracker import rollups
+    from app.modules.cost_tracker.service import CostTrackerService
+
+    results = {}
+    ctx = (
+        patch.object(rollups, "get_watermark", new_callable=AsyncMock, return_value=None)
+        if raw_only else nullcontext()
+    )
+    with ctx:
+        async with get_session_context() as session:
+            for days in days_list:
+                results[("cost", days)] = await _timed(
+                    lambda: CostTrackerService.get_dashboard(user_id, days, session), repeat,
+                )
+                results[("monitoring", days)] = await _timed(
+                    lambda: AIMonitoringService.get_dashboard(user_id, session, min(days, 90)), repeat,
+                )
+    return results
+
+
+async def run(rows: int, days: int, repeat: int, skip_insert: bool) -> None:
+    from sqlalchemy import text
+
+    from app.database import engine, get_session_context
+    from app.modules.cost_tracker import rollups
+
+    async with get_session_context() as session:
+        user_ids = [r[0] for r in (await session.execute(text("SELECT id FROM users LIMIT 50"))).all()]
+    if not user_ids:
+        print("No users found: run `python -m scripts.seed_data` first.")
+        return
+
+    if not skip_insert:
+        print(f"Inserting {rows:,} usage rows over {days} days for {len(user_ids)} users...")
+        t0 = time.perf_counter()
+        for start in range(1, rows + 1, CHUNK):
+            stop = min(start + CHUNK - 1, rows)
+            async with get_session_context() as session:
+                await session.execute(
+                    text(_INSERT_SQL),
+                    {"users": user_ids, "module": BENCH_MODULE, "days": days, "start": start, "stop": stop},
+                )
+                await session.commit()
+            print(f"  {stop:,} rows")
+        print(f"  insert: {time.perf_counter() - t0:.1f}s")
+
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE ai_usage_logs"))
+
+    target = user_ids[0]
+    days_list = [d for d in (7, 30, 90) if d <= days] or [days]
+
+    print("Timing dashboards on raw logs...")
+    before = await _measure(target, days_list, repeat, raw_only=True)
+
+    print("Compacting...")
+    t0 = time.perf_counter()
+    previous = None
+    while True:
+        async with get_session_context() as session:
+            watermark = await rollups.compact(session)
+        if watermark is None or watermark == previous:
+            break
+        previous = watermark
+    print(f"  compaction: {time.perf_counter() - t0:.1f}s (watermark {previous})")
+
+    print("Timing dashboards on rollups + raw tail...")
+    after = await _measure(target, days_list, repeat, raw_only=False)
+
+    print()
+    print(f"{'dashboard':<12} {'days':>5} {'raw (ms)':>10} {'rollup (ms)':>12} {'speedup':>8}")
+    for key in before:
+        speedup = before[key] / after[key] if after[key] else float("inf")
+        print(f"{key[0]:<12} {key[1]:>5} {before[key]:>10.1f} {after[key]:>12.1f} {speedup:>7.1f}x")
+
+
+async def cleanup() -> None:
+    from sqlalchemy import text
+
+    from app.database import get_session_context
+
+    async with get_session_context() as session:
+        for table in ("ai_usage_logs", "ai_usage_hourly", "ai_usage_daily"):
+            result = await session.execute(text(f"DELETE FROM {table} WHERE module = :m"), {"m": BENCH_MODULE})
+            print(f"{table}: deleted {result.rowcount:,} rows")
+        await session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-insert", action="store_true", help="reuse rows from a previous run")
+    parser.add_argument("--cleanup", action="store_true", help="delete benchmark rows and exit")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        asyncio.run(cleanup())
+    else:
+        asyncio.run(run(args.rows, args.days, args.repeat, args.skip_insert))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: HTTP-only scraping, per-call crawler vs. pooled HTTP engine.
+
+Scrapes the same static pages three ways and reports pages/second:
+
+- per-call: the pre-engine scrape_http path, a new ``AsyncWebCrawler`` with
+  a patched ``HTTPCrawlerConfig`` built and torn down for every URL
+- engine: WebCrawlerService.scrape_http (shared pooled client), called
+  ``--concurrency`` at a time
+- batch: WebCrawlerService.batch_scrape_http streaming every URL
+
+By default pages come from a local threaded HTTP server serving synthetic
+articles, so the numbers measure client overhead rather than the network;
+pass ``--url-file`` (one URL per line) to scrape real sites instead.
+
+Requires crawl4ai.  No database is used.
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_crawler_http --pages 300 --concurrency 20
+    python -m scripts.bench_crawler_http --url-file urls.txt --skip-per-call
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _article(n: int) -> bytes:
+    rng = random.Random(n)
+    words = [f"word{i}" for i in range(2000)]
+    paragraphs = "".join(f"<p>{' '.join(rng.choices(words, k=60))}</p>" for _ in range(20))
+    links = "".join(f'<a href="/page/{rng.randint(0, 10_000)}">related</a>' for _ in range(15))
+    return (
+        f"<html><head><title>Article {n}</title></head><body><nav>{links}</nav>"
+        f"<article><h1>Article {n}</h1>{paragraphs}</article></body></html>"
+    ).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = _article(int(self.path.rsplit("/", 1)[-1] or 0))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def _per_call_scrape(url: str) -> bool:
+    """The scrape_http implementation before the pooled engine."""
+    from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig
+    from crawl4ai.async_configs import HTTPCrawlerConfig
+
+    http_config = HTTPCrawlerConfig(headers={}, follow_redirects=True)
+    defaults = BrowserConfig(headless=True, verbose=False)
+    for attr in dir(defaults):
+        if attr.startswith("_") or callable(getattr(defaults, attr)):
+            continue
+        if not hasattr(http_config, attr):
+            setattr(http_config, attr, getattr(defaults, attr))
+
+    async with AsyncWebCrawler(config=http_config) as crawler:
+        result = await crawler.arun(url=url, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+    return bool(result.success)
+
+
+async def _bounded(urls: list[str], concurrency: int, scrape) -> tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(url: str) -> bool:
+        async with semaphore:
+            try:
+                return await scrape(url)
+            except Exception:
+                return False
+
+    t0 = time.perf_counter()
+    ok = sum(await asyncio.gather(*(one(u) for u in urls)))
+    return time.perf_counter() - t0, ok
+
+
+async def run(urls: list[str], concurrency: int, skip_per_call: bool) -> None:
+    from app.modules.web_crawler import http_engine
+    from app.modules.web_crawler.service import WebCrawlerService
+
+    rows = []
+    if not skip_per_call:
+        seconds, ok = await _bounded(urls, concurrency, _per_call_scrape)
+        rows.append(("per-call", seconds, ok))
+
+    async def engine_scrape(url: str) -> bool:
+        return (await WebCrawlerService.scrape_http(url=url)).get("success", False)
+
+    await engine_scrape(urls[0])  # start the processor outside the timing
+    seconds, ok = await _bounded(urls, concurrency, engine_scrape)
+    rows.append(("engine", seconds, ok))
+
+    t0 = time.perf_counter()
+    ok = 0
+    async for result in WebCrawlerService.batch_scrape_http(urls, concurrency=concurrency):
+        ok += bool(result.get("success"))
+    rows.append(("batch", time.perf_counter() - t0, ok))
+    await http_engine.close()
+
+    print(f"\n{len(urls)} pages, concurrency {concurrency}\n")
+    print(f"{'path':<10} {'ok':>6} {'seconds':>9} {'pages/s':>9}")
+    for name, seconds, ok in rows:
+        print(f"{name:<10} {ok:>6} {seconds:>9.2f} {len(urls) / seconds:>9.1f}")
+    if not skip_per_call:
+        print(f"\nengine speed-up: {rows[0][1] / rows[1][1]:.1f}x, batch: {rows[0][1] / rows[2][1]:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages from the local server")
+    parser.add_argument("--url-file", help="scrape these URLs (one per line) instead")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--skip-per-call", action="store_true", help="only measure the pooled engine")
+    args = parser.parse_args()
+
+    if args.url_file:
+        with open(args.url_file) as fh:
+            urls = [line.strip() for line in fh if line.strip()]
+    else:
+        base = _start_server()
+        urls = [f"{base}/page/{n}" for n in range(args.pages)]
+
+    asyncio.run(run(urls, args.concurrency, args.skip_per_call))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: sequential crew prompts, transcript replay vs. shared crew context.
+
+Runs 3, 6 and 10 agent sequential crews against a fake provider whose
+outputs are OUTPUT_TOKENS of text followed by FACTS:/DECISIONS: notes, and
+counts the prompt tokens each agent is sent:
+
+    replay   the old _run_agent prompt: the last 5 outputs (2,000 chars
+             each) plus the previous output again as the task context
+             (8,000 chars); the crew instruction is dropped after agent 1
+    context  multi_agent_crew.context: scratchpad, artifact index and the
+             previous output within CREW_CONTEXT_BUDGET_TOKENS; the
+             instruction stays in every prompt
+
+Time is simulated with the latency model of bench_long_text:
+
+    latency = first_token + prompt_tokens / PREFILL + output_tokens / DECODE
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_crew_context
+    python -m scripts.bench_crew_context --output-tokens 2000 --budget 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIRST_TOKEN = 0.5      # seconds
+PREFILL = 5000.0       # prompt tokens per second
+DECODE = 150.0         # completion tokens per second
+
+WORDS = (
+    "budget roadmap customer release migration latency hiring review contract "
+    "pricing launch incident metrics onboarding security partner forecast design"
+).split()
+ROLES = ["researcher", "analyst", "writer", "reviewer", "planner"]
+
+
+def make_agents(count: int) -> list[dict]:
+    return [
+        {
+            "id": f"agent-{i + 1}",
+            "name": f"Agent {i + 1}",
+            "role": ROLES[i % len(ROLES)],
+            "goal": f"Advance the report from the {ROLES[i % len(ROLES)]} point of view",
+            "tools": [],
+        }
+        for i in range(count)
+    ]
+
+
+class FakeProvider:
+    def __init__(self, output_tokens: int, seed: int):
+        self.output_tokens = output_tokens
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.max_prompt_tokens = 0
+        self.seconds = 0.0
+
+    def __call__(self, prompt: str) -> str:
+        from app.ai_assistant.long_text import estimate_tokens
+
+        self.calls += 1
+        tokens = estimate_tokens(prompt)
+        self.prompt_tokens += tokens
+        self.max_prompt_tokens = max(self.max_prompt_tokens, tokens)
+        self.seconds += FIRST_TOKEN + tokens / PREFILL + self.output_tokens / DECODE
+
+        words = []
+        while len(" ".join(words)) < self.output_tokens * 4:
+            words.append(self.rng.choice(WORDS))
+        notes = "\n".join(
+            [f"\nFACTS:"] + [f"- {' '.join(self.rng.sample(WORDS, 6))}" for _ in range(3)]
+            + ["DECISIONS:"] + [f"- {' '.join(self.rng.sample(WORDS, 6))}" for _ in range(2)]
+        )
+        return " ".join(words) + "\n" + notes
+
+
+def run_replay(agents: list[dict], goal: str, task: str, provider: FakeProvider) -> None:
+    from app.modules.multi_agent_crew.context import SOLO_INSTRUCTIONS, agent_prompt
+
+    messages, context = [], task
+    for agent in agents:
+        history = "\n\n".join(
+            f"[{m['agent_name']} ({m['role']})]:\n{m['content'][:2000]}" for m in messages[-5:]
+        )
+        prompt = agent_prompt(agent, goal, context, history or "(You are the first agent)", SOLO_INSTRUCTIONS)
+        output = provider(prompt)
+        messages.append({"agent_name": agent["name"], "role": agent["role"], "content": output})
+        context = output
+
+
+def run_context(agents: list[dict], goal: str, task: str, provider: FakeProvider) -> None:
+    from app.modules.multi_agent_crew.context import CrewContext, agent_prompt
+
+    crew_context = CrewContext()
+    for agent in agents:
+        output = provider(agent_prompt(agent, goal, task, crew_context.render()))
+        crew_context.record(agent, output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sequential crew prompt sizes")
+    parser.add_argument("--output-tokens", type=int, default=900, help="completion size of each agent")
+    parser.add_argument("--budget", type=int, default=None, help="CREW_CONTEXT_BUDGET_TOKENS")
+    parser.add_argument("--scratchpad", type=int, default=None, help="CREW_CONTEXT_SCRATCHPAD_TOKENS")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from app.config import settings
+
+    if args.budget is not None:
+        settings.CREW_CONTEXT_BUDGET_TOKENS = args.budget
+    if args.scratchpad is not None:
+        settings.CREW_CONTEXT_SCRATCHPAD_TOKENS = args.scratchpad
+
+    goal = "Produce a launch readiness report for the new pricing plan"
+    task = "Assess launch readiness of the new pricing plan: risks, open decisions, owners and dates."
+    print(f"outputs of ~{args.output_tokens} tokens, context budget {settings.CREW_CONTEXT_BUDGET_TOKENS} "
+          f"(scratchpad {settings.CREW_CONTEXT_SCRATCHPAD_TOKENS})")
+
+    for count in (3, 6, 10):
+        agents = make_agents(count)
+        for name, run in (("replay", run_replay), ("context", run_context)):
+            provider = FakeProvider(args.output_tokens, args.seed)
+            run(agents, goal, task, provider)
+            print(
+                f"  {count:2d} agents  {name:8s} prompt tokens {provider.prompt_tokens:7,}  "
+                f"largest prompt {provider.max_prompt_tokens:6,}  simulated {provider.seconds:6.1f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark: knowledge ingestion, per-chunk writes vs. bulk ingestion.
+
+Ingests the same synthetic documents for the first user twice and reports
+chunks/second:
+
+- legacy: the pre-bulk KnowledgeService.upload_document path, one document
+  at a time, embeddings computed on the event loop, then ``add`` + ``flush``
+  + ``UPDATE ... SET embedding`` per chunk
+- bulk: app.modules.knowledge.ingest.ingest_documents with all documents in
+  one call (batched embedding off the event loop, multi-row INSERTs)
+
+Embedding uses sentence-transformers (or the inference server) when
+available; pass ``--no-embed`` to measure the write path alone.  Documents
+are tagged with content_type ``bench/ingest`` and removed with ``--cleanup``.
+
+Requires a PostgreSQL DATABASE_URL with migrations applied and at least one
+user (run ``python -m scripts.seed_data`` first).
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_knowledge_ingest --docs 200 --paragraphs 40
+    python -m scripts.bench_knowledge_ingest --no-embed
+    python -m scripts.bench_knowledge_ingest --cleanup
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_TAG = "bench/ingest"
+
+
+def _make_documents(count: int, paragraphs: int) -> list[dict]:
+    rng = random.Random(42)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    documents = []
+    for n in range(count):
+        text = "\n\n".join(
+            " ".join(rng.choices(vocabulary, k=rng.randint(40, 90))) for _ in range(paragraphs)
+        )
+        documents.append({"filename": f"bench_{n}.txt", "content_type": BENCH_TAG, "text": text})
+    return documents
+
+
+async def _legacy_upload(user_id, item: dict, session, embed: bool) -> int:
+    """The per-chunk write path that upload_document used before bulk ingestion."""
+    from datetime import UTC, datetime
+
+    from sqlalchemy import text
+
+    from app.models.knowledge import Document, DocumentChunk, DocumentStatus
+    from app.modules.knowledge import embedding_service
+    from app.modules.knowledge.service import KnowledgeService
+
+    document = Document(user_id=user_id, filename=item["filename"], content_type=item["content_type"],
+                        status=DocumentStatus.PROCESSING)
+    session.add(document)
+    await session.flush()
+
+    chunks = KnowledgeService._chunk_text(item["text"])
+    embeddings = embedding_service.embed_texts(chunks) if embed and embedding_service.is_available() else None
+    for i, chunk_text in enumerate(chunks):
+        chunk = DocumentChunk(document_id=document.id, user_id=user_id, content=chunk_text, chunk_index=i,
+                              metadata_json=json.dumps({"filename": item["filename"], "chunk_index": i}))
+        session.add(chunk)
+        await session.flush()
+        if embeddings and embeddings[i] is not None:
+            emb_str = "[" + ",".join(str(v) for v in embeddings[i]) + "]"
+            await session.execute(text("UPDATE document_chunks SET embedding = :emb WHERE id = :cid"),
+                                  {"emb": emb_str, "cid": str(chunk.id)})
+
+    document.total_chunks = len(chunks)
+    document.status = DocumentStatus.INDEXED
+    document.updated_at = datetime.now(UTC)
+    await session.commit()
+    return len(chunks)
+
+
+async def run(docs: int, paragraphs: int, embed: bool) -> None:
+    from sqlalchemy import text
+
+    from app.database import get_session_context
+    from app.modules.knowledge import embedding_service
+    from app.modules.knowledge.ingest import ingest_documents
+
+    async with get_session_context() as session:
+        user_id = (await session.execute(text("SELECT id FROM users ORDER BY created_at LIMIT 1"))).scalar_one_or_none()
+    if user_id is None:
+        print("No users found: run `python -m scripts.seed_data` first.")
+        return
+
+    documents = _make_documents(docs, paragraphs)
+    if embed and embedding_service.is_available():
+        # Load the model before timing either path
+        embedding_service.embed_texts(["warm up"])
+    print(f"{docs} documents, embeddings {'on' if embed and embedding_service.is_available() else 'off'}")
+
+    t0 = time.perf_counter()
+    legacy_chunks = 0
+    async with get_session_context() as session:
+        for item in documents:
+            legacy_chunks += await _legacy_upload(user_id, item, session, embed)
+    legacy_s = time.perf_counter() - t0
+
+    progress_events = []
+    t0 = time.perf_counter()
+    async with get_session_context() as session:
+        records = await ingest_documents(user_id, documents, session, progress=progress_events.append, embed=embed)
+    bulk_s = time.perf_counter() - t0
+    bulk_chunks = sum(r.total_chunks for r in records)
+
+    print()
+    print(f"{'path':<8} {'chunks':>8} {'seconds':>9} {'chunks/s':>10}")
+    print(f"{'legacy':<8} {legacy_chunks:>8} {legacy_s:>9.2f} {legacy_chunks / legacy_s:>10.1f}")
+    print(f"{'bulk':<8} {bulk_chunks:>8} {bulk_s:>9.2f} {bulk_chunks / bulk_s:>10.1f}")
+    print(f"speed-up: {legacy_s / bulk_s:.1f}x  ({len(progress_events)} progress events)")
+
+
+async def cleanup() -> None:
+    from sqlalchemy import text
+
+    from app.database import get_session_context
+
+    async with get_session_context() as session:
+        chunks = await session.execute(
+            text("DELETE FROM document_chunks WHERE document_id IN (SELECT id FROM documents WHERE content_type = :tag)"),
+            {"tag": BENCH_TAG},
+        )
+        documents = await session.execute(text("DELETE FROM documents WHERE content_type = :tag"), {"tag": BENCH_TAG})
+        await session.commit()
+    print(f"document_chunks: deleted {chunks.rowcount:,} rows")
+    print(f"documents: deleted {documents.rowcount:,} rows")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100, help="documents per path")
+    parser.add_argument("--paragraphs", type=int, default=40, help="paragraphs per document (~1 chunk each)")
+    parser.add_argument("--no-embed", action="store_true", help="skip embeddings, measure writes only")
+    parser.add_argument("--cleanup", action="store_true", help="delete benchmark documents and exit")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        asyncio.run(cleanup())
+    else:
+        asyncio.run(run(args.docs, args.paragraphs, not args.no_embed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: long-transcript summary, old single prompt vs. map-reduce.
+
+Builds a synthetic transcript (default 3 hours at 150 words/minute) and
+summarizes it against a fake provider whose latency grows with the prompt
+(prefill) and the completion (decode), roughly like a hosted model:
+
+    latency = first_token + prompt_tokens / PREFILL + output_tokens / DECODE
+
+Strategies:
+
+    truncated   the old generate_summary prompt (job.text[:8000])
+    single      the whole transcript in one prompt
+    map_reduce  long_text.map_reduce (chunks in parallel, then one final call)
+    cached      map_reduce again over the same transcript (chunk cache warm)
+
+Coverage is the share of transcript characters that reached a prompt.
+Sleeps are scaled by --scale; reported times are scaled back up.
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_long_text
+    python -m scripts.bench_long_text --hours 1 --chunk-tokens 2000 --parallel 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIRST_TOKEN = 0.5      # seconds
+PREFILL = 5000.0       # prompt tokens per second
+DECODE = 150.0         # completion tokens per second
+FINAL_TOKENS = 600     # completion size of a summary
+NOTES_TOKENS = 250     # completion size of chunk / merge notes
+
+WORDS = (
+    "budget roadmap customer release migration latency hiring review contract "
+    "pricing launch incident metrics onboarding security partner forecast design"
+).split()
+
+
+def make_transcript(hours: float, seed: int) -> str:
+    rng = random.Random(seed)
+    words = int(hours * 60 * 150)
+    paragraphs, sentence, paragraph = [], [], []
+    for _ in range(words):
+        sentence.append(rng.choice(WORDS))
+        if len(sentence) >= rng.randint(8, 20):
+            paragraph.append(" ".join(sentence).capitalize() + ".")
+            sentence = []
+            if len(paragraph) >= rng.randint(3, 8):
+                paragraphs.append(" ".join(paragraph))
+                paragraph = []
+    paragraph.append(" ".join(sentence))
+    paragraphs.append(" ".join(paragraph))
+    return "\n\n".join(paragraphs)
+
+
+class FakeProvider:
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    async def __call__(self, text: str, task: str = "general", provider_name: str = "gemini", **kwargs) -> dict:
+        from app.ai_assistant.long_text import estimate_tokens
+
+        self.calls += 1
+        tokens = estimate_tokens(text)
+        self.prompt_tokens += tokens
+        partial = text.startswith("The following")
+        output = NOTES_TOKENS if partial else FINAL_TOKENS
+        await asyncio.sleep((FIRST_TOKEN + tokens / PREFILL + output / DECODE) * self.scale)
+        return {"processed_text": "n" * output * 4, "provider": provider_name, "model": "fake"}
+
+
+async def run_strategy(strategy: str, transcript: str, cache: dict, args) -> dict:
+    from app.ai_assistant import long_text
+    from app.ai_assistant.service import AIAssistantService
+
+    provider = FakeProvider(args.scale)
+    instruction = "Provide a concise executive summary of this transcript in 3-5 sentences."
+
+    async def cache_get(key):
+        return cache.get(key)
+
+    async def cache_set(key, value, ttl_seconds=300):
+        cache[key] = value
+
+    with patch.object(AIAssistantService, "process_text_with_provider", new=provider), \
+         patch.object(long_text, "cache_get", new=cache_get), \
+         patch.object(long_text, "cache_set", new=cache_set), \
+         patch.object(long_text, "logger"):
+        start = time.monotonic()
+        if strategy == "truncated":
+            await provider(f"{instruction}\n\nTranscript:\n{transcript[:8000]}")
+            coverage = min(1.0, 8000 / len(transcript))
+        elif strategy == "single":
+            await provider(f"{instruction}\n\nTranscript:\n{transcript}")
+            coverage = 1.0
+        else:
+            await long_text.map_reduce(
+                transcript, instruction, label="transcript", max_tokens=args.chunk_tokens,
+            )
+            coverage = 1.0
+        wall = (time.monotonic() - start) / args.scale
+
+    return {
+        "strategy": strategy,
+        "wall": wall,
+        "calls": provider.calls,
+        "prompt_tokens": provider.prompt_tokens,
+        "coverage": coverage,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize a long synthetic transcript several ways")
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--chunk-tokens", type=int, default=4000)
+    parser.add_argument("--parallel", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=0.05, help="wall seconds per simulated second")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from app.config import settings
+
+    transcript = make_transcript(args.hours, args.seed)
+    print(f"transcript: {len(transcript):,} chars (~{len(transcript) // 4:,} tokens), "
+          f"chunks of {args.chunk_tokens} tokens, {args.parallel} in parallel")
+
+    cache: dict = {}
+    with patch.object(settings, "AI_LONG_TEXT_MAX_PARALLEL", args.parallel):
+        for strategy in ("truncated", "single", "map_reduce", "cached"):
+            result = await run_strategy(strategy, transcript, cache, args)
+            print(
+                f"  {result['strategy']:10s} {result['wall']:6.1f}s  calls {result['calls']:3d}  "
+                f"prompt tokens {result['prompt_tokens']:7,}  coverage {result['coverage']:.0%}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,228 @@
+"""
+Benchmark: unified search PostgreSQL fallback, sequential ILIKE vs. fan-out.
+
+Generates synthetic rows for the first user (default 1M per source) in
+transcriptions, document_chunks, generated_contents and messages, tagged
+with ``bench_search`` so they can be removed with ``--cleanup``.  Then
+times, for a set of query terms:
+
+- legacy: the four pre-GIN ``ILIKE '%q%'`` queries run one after another on
+  one session, with bitmap scans disabled so the trigram indexes are not
+  used (equivalent to the tree before migration unified_search_fts_022)
+- fanout: UnifiedSearchService._search_postgres (concurrent sources, GIN
+  full-text + trigram, per-source deadline)
+
+Requires a PostgreSQL DATABASE_URL with migrations applied and at least one
+user (run ``python -m scripts.seed_data`` first).
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_unified_search --rows 1000000
+    python -m scripts.bench_unified_search --skip-insert --repeat 20
+    python -m scripts.bench_unified_search --cleanup
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_TAG = "bench_search"
+CHUNK = 250_000
+QUERIES = ["w123", "w42 w4242", "w19999", "zzzz-no-match"]
+
+# ~60 random words from a 20k vocabulary per row; ``i`` keeps the subquery
+# correlated so every row gets different text.
+_WORDS = (
+    "array_to_string(ARRAY(SELECT 'w' || (1 + floor(random() * 20000))::int "
+    "FROM generate_series(1, 60) WHERE i IS NOT NULL), ' ')"
+)
+
+_INSERT_SQL = {
+    "transcriptions": f"""
+        INSERT INTO transcriptions (id, user_id, video_url, source_type, status, text, created_at, updated_at)
+        SELECT gen_random_uuid(), :user_id, 'bench://' || i, :tag, :status, {_WORDS}, now(), now()
+        FROM generate_series(:start, :stop) AS i
+    """,
+    "document_chunks": f"""
+        INSERT INTO document_chunks (id, document_id, user_id, content, chunk_index, metadata_json, created_at)
+        SELECT gen_random_uuid(), :parent_id, :user_id, {_WORDS}, i, '{{}}', now()
+        FROM generate_series(:start, :stop) AS i
+    """,
+    "generated_contents": f"""
+        INSERT INTO generated_contents (id, project_id, user_id, format, title, content, created_at, updated_at)
+        SELECT gen_random_uuid(), :parent_id, :user_id, 'blog', 'Bench ' || i, {_WORDS}, now(), now()
+        FROM generate_series(:start, :stop) AS i
+    """,
+    "messages": f"""
+        INSERT INTO messages (id, conversation_id, role, content, created_at)
+        SELECT gen_random_uuid(), :parent_id, 'user', {_WORDS}, now()
+        FROM generate_series(:start, :stop) AS i
+    """,
+}
+
+_PARENT_SQL = {
+    "document_chunks": """
+        INSERT INTO documents (id, user_id, filename, content_type, status, created_at, updated_at)
+        VALUES (gen_random_uuid(), :user_id, 'bench.txt', :tag, 'ready', now(), now()) RETURNING id
+    """,
+    "generated_contents": """
+        INSERT INTO content_projects (id, user_id, title, source_type, created_at, updated_at)
+        VALUES (gen_random_uuid(), :user_id, 'Bench', :tag, now(), now()) RETURNING id
+    """,
+    "messages": """
+        INSERT INTO conversations (id, user_id, title, created_at, updated_at)
+        VALUES (gen_random_uuid(), :user_id, :tag, now(), now()) RETURNING id
+    """,
+}
+
+# Pre-GIN per-source queries (leading-wildcard ILIKE, as the service used to run them)
+_LEGACY_SQL = [
+    """SELECT id FROM transcriptions WHERE user_id = :uid AND status = :status
+       AND CAST(text AS TEXT) ILIKE :pattern ORDER BY created_at DESC LIMIT :lim""",
+    """SELECT dc.id FROM document_chunks dc JOIN documents d ON dc.document_id = d.id
+       WHERE dc.user_id = :uid AND dc.content ILIKE :pattern LIMIT :lim""",
+    """SELECT id FROM generated_contents WHERE user_id = :uid
+       AND (CAST(content AS TEXT) ILIKE :pattern OR CAST(title AS TEXT) ILIKE :pattern)
+       ORDER BY created_at DESC LIMIT :lim""",
+    """SELECT m.id FROM messages m JOIN conversations c ON m.conversation_id = c.id
+       WHERE c.user_id = :uid AND CAST(m.content AS TEXT) ILIKE :pattern
+       ORDER BY m.created_at DESC LIMIT :lim""",
+]
+
+
+def _pct(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _insert(user_id, rows: int) -> None:
+    from sqlalchemy import bindparam, text
+
+    from app.database import engine, get_session_context
+    from app.models.transcription import Transcription, TranscriptionStatus
+
+    status_type = Transcription.__table__.c.status.type
+    for table, sql in _INSERT_SQL.items():
+        parent_id = None
+        if table in _PARENT_SQL:
+            async with get_session_context() as session:
+                parent_id = (await session.execute(
+                    text(_PARENT_SQL[table]), {"user_id": user_id, "tag": BENCH_TAG},
+                )).scalar_one()
+                await session.commit()
+
+        print(f"Inserting {rows:,} rows into {table}...")
+        t0 = time.perf_counter()
+        stmt = text(sql).bindparams(bindparam("status", type_=status_type)) if table == "transcriptions" else text(sql)
+        for start in range(1, rows + 1, CHUNK):
+            stop = min(start + CHUNK - 1, rows)
+            params = {"user_id": user_id, "tag": BENCH_TAG, "start": start, "stop": stop}
+            if table == "transcriptions":
+                params["status"] = TranscriptionStatus.COMPLETED
+            else:
+                params["parent_id"] = parent_id
+            async with get_session_context() as session:
+                await session.execute(stmt, params)
+                await session.commit()
+        print(f"  {time.perf_counter() - t0:.1f}s")
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in _INSERT_SQL:
+            await conn.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+async def _legacy_search(user_id, query: str, limit: int) -> None:
+    from sqlalchemy import bindparam, text
+
+    from app.database import get_session_context
+    from app.models.transcription import Transcription, TranscriptionStatus
+
+    status_type = Transcription.__table__.c.status.type
+    params = {"uid": user_id, "pattern": f"%{query}%", "lim": limit, "status": TranscriptionStatus.COMPLETED}
+    async with get_session_context() as session:
+        await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        for sql in _LEGACY_SQL:
+            stmt = text(sql)
+            if ":status" in sql:
+                stmt = stmt.bindparams(bindparam("status", type_=status_type))
+            await session.execute(stmt, {k: v for k, v in params.items() if f":{k}" in sql})
+
+
+async def run(rows: int, repeat: int, limit: int, skip_insert: bool) -> None:
+    from sqlalchemy import text
+
+    from app.database import get_session_context
+    from app.modules.unified_search.service import UnifiedSearchService
+
+    async with get_session_context() as session:
+        user_id = (await session.execute(text("SELECT id FROM users ORDER BY created_at LIMIT 1"))).scalar_one_or_none()
+    if user_id is None:
+        print("No users found: run `python -m scripts.seed_data` first.")
+        return
+
+    if not skip_insert:
+        await _insert(user_id, rows)
+
+    print()
+    print(f"{'query':<16} {'legacy p50':>11} {'legacy p95':>11} {'fanout p50':>11} {'fanout p95':>11} {'partial':>8}")
+    for query in QUERIES:
+        legacy, fanout, partial = [], [], 0
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            await _legacy_search(user_id, query, limit)
+            legacy.append((time.perf_counter() - t0) * 1000)
+
+            t0 = time.perf_counter()
+            result = await UnifiedSearchService._search_postgres(user_id, query, None, limit=limit)
+            fanout.append((time.perf_counter() - t0) * 1000)
+            partial += int(result["partial"])
+        print(
+            f"{query:<16} {statistics.median(legacy):>10.1f}ms {_pct(legacy, 0.95):>10.1f}ms "
+            f"{statistics.median(fanout):>10.1f}ms {_pct(fanout, 0.95):>10.1f}ms {partial:>8}"
+        )
+
+
+async def cleanup() -> None:
+    from sqlalchemy import text
+
+    from app.database import get_session_context
+
+    statements = [
+        ("transcriptions", "DELETE FROM transcriptions WHERE source_type = :tag"),
+        ("document_chunks", "DELETE FROM document_chunks WHERE document_id IN (SELECT id FROM documents WHERE content_type = :tag)"),
+        ("documents", "DELETE FROM documents WHERE content_type = :tag"),
+        ("generated_contents", "DELETE FROM generated_contents WHERE project_id IN (SELECT id FROM content_projects WHERE source_type = :tag)"),
+        ("content_projects", "DELETE FROM content_projects WHERE source_type = :tag"),
+        ("messages", "DELETE FROM messages WHERE conversation_id IN (SELECT id FROM conversations WHERE title = :tag)"),
+        ("conversations", "DELETE FROM conversations WHERE title = :tag"),
+    ]
+    async with get_session_context() as session:
+        for table, sql in statements:
+            result = await session.execute(text(sql), {"tag": BENCH_TAG})
+            print(f"{table}: deleted {result.rowcount:,} rows")
+        await session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per source")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-insert", action="store_true", help="reuse rows from a previous run")
+    parser.add_argument("--cleanup", action="store_true", help="delete benchmark rows and exit")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        asyncio.run(cleanup())
+    else:
+        asyncio.run(run(args.rows, args.repeat, args.limit, args.skip_insert))
+
+
+if __name__ == "__main__":
+    main()
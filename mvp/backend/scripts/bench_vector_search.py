@@ -0,0 +1,195 @@
+"""
+Benchmark: knowledge vector search, recall vs. latency against exact search.
+
+Inserts synthetic 384-d embeddings (default 1M chunks) tagged with
+content_type ``bench/vector``.  The first user gets ``--tenant-share`` of
+them; the rest are spread over the other existing users (with a single user
+the tenant filter matches every row).  Then, for random query vectors:
+
+- exact: the exact strategy (distances over the tenant's rows) -- ground truth
+- ann ef=N: the global ANN index with hnsw.ef_search = N (plus iterative scan
+  on pgvector >= 0.8) and the user_id filter
+- auto: vector_index.nearest_chunks, i.e. the strategy search_vector uses
+
+and reports recall@k and p50/p95 latency for each.
+
+Requires a PostgreSQL DATABASE_URL with migrations applied (pgvector) and at
+least one user (run ``python -m scripts.seed_data`` first).
+
+Usage:
+    cd mvp/backend
+    python -m scripts.bench_vector_search --rows 1000000 --tenant-share 0.1
+    python -m scripts.bench_vector_search --skip-insert --queries 100 --k 10
+    python -m scripts.bench_vector_search --cleanup
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_TAG = "bench/vector"
+CHUNK = 100_000
+DIM = 384
+EF_VALUES = [10, 20, 40, 80, 160, 320, 640]
+
+_INSERT_SQL = f"""
+    INSERT INTO document_chunks (id, document_id, user_id, content, chunk_index, metadata_json, created_at, embedding)
+    SELECT gen_random_uuid(), :doc_id, :user_id, 'bench ' || i, i, '{{}}', now(),
+           ARRAY(SELECT random() - 0.5 FROM generate_series(1, {DIM}) WHERE i IS NOT NULL)::vector
+    FROM generate_series(:start, :stop) AS i
+"""
+
+
+def _pct(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _query_vector(rng: random.Random) -> str:
+    return "[" + ",".join(repr(rng.random() - 0.5) for _ in range(DIM)) + "]"
+
+
+async def _insert(user_ids: list, rows: int, tenant_share: float) -> None:
+    from sqlalchemy import text
+
+    from app.database import engine, get_session_context
+
+    tenant_rows = rows if len(user_ids) == 1 else int(rows * tenant_share)
+    others = user_ids[1:]
+    plan = [(user_ids[0], tenant_rows)] + [
+        (uid, (rows - tenant_rows) // len(others)) for uid in others
+    ] if others else [(user_ids[0], tenant_rows)]
+
+    for user_id, count in plan:
+        if count <= 0:
+            continue
+        async with get_session_context() as session:
+            doc_id = (await session.execute(text("""
+                INSERT INTO documents (id, user_id, filename, content_type, status, total_chunks, created_at, updated_at)
+                VALUES (gen_random_uuid(), :uid, 'bench.txt', :tag, 'indexed', :n, now(), now()) RETURNING id
+            """), {"uid": user_id, "tag": BENCH_TAG, "n": count})).scalar_one()
+            await session.commit()
+
+        print(f"Inserting {count:,} chunks for user {user_id}...")
+        t0 = time.perf_counter()
+        for start in range(1, count + 1, CHUNK):
+            async with get_session_context() as session:
+                await session.execute(text(_INSERT_SQL), {
+                    "doc_id": doc_id, "user_id": user_id, "start": start, "stop": min(start + CHUNK - 1, count),
+                })
+                await session.commit()
+        print(f"  {time.perf_counter() - t0:.1f}s")
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE document_chunks"))
+
+
+async def _timed(session, sql, params) -> tuple[float, list]:
+    t0 = time.perf_counter()
+    rows = (await session.execute(sql, params)).fetchall()
+    return (time.perf_counter() - t0) * 1000, [r[0] for r in rows]
+
+
+async def run(rows: int, tenant_share: float, queries: int, k: int, skip_insert: bool) -> None:
+    from sqlalchemy import text
+
+    from app.database import get_session_context
+    from app.modules.knowledge import vector_index
+
+    async with get_session_context() as session:
+        user_ids = [r[0] for r in (await session.execute(text("SELECT id FROM users ORDER BY created_at"))).fetchall()]
+    if not user_ids:
+        print("No users found: run `python -m scripts.seed_data` first.")
+        return
+
+    if not skip_insert:
+        await _insert(user_ids, rows, tenant_share)
+
+    tenant = user_ids[0]
+    rng = random.Random(7)
+    vectors = [_query_vector(rng) for _ in range(queries)]
+
+    # Ground truth
+    truth, exact_ms = [], []
+    for vec in vectors:
+        async with get_session_context() as session:
+            ms, ids = await _timed(session, vector_index.search_sql("exact", tenant),
+                                   {"query_emb": vec, "uid": str(tenant), "lim": k})
+        exact_ms.append(ms)
+        truth.append(set(ids))
+
+    async with get_session_context() as session:
+        version = await vector_index.pgvector_version(session)
+        method = await vector_index.global_index_method(session)
+        chunks, has_tenant_index = await vector_index.tenant_profile(session, tenant)
+    print(f"\npgvector {'.'.join(map(str, version))}, index {method}, tenant chunks {chunks:,}, "
+          f"tenant index {'yes' if has_tenant_index else 'no'}, k={k}, {queries} queries\n")
+    print(f"{'strategy':<14} {'recall@k':>9} {'p50':>9} {'p95':>9}")
+    print(f"{'exact':<14} {1.0:>9.3f} {statistics.median(exact_ms):>7.1f}ms {_pct(exact_ms, 0.95):>7.1f}ms")
+
+    for ef in EF_VALUES:
+        recalls, latencies = [], []
+        for vec, expected in zip(vectors, truth):
+            async with get_session_context() as session:
+                knobs = {"ef_search": ef, "probes": ef, "method": method, "iterative_scan": version >= (0, 8)}
+                await vector_index.apply_search_settings(session, knobs)
+                ms, ids = await _timed(session, vector_index.search_sql("global_index", tenant),
+                                       {"query_emb": vec, "uid": str(tenant), "lim": k})
+            latencies.append(ms)
+            recalls.append(len(expected & set(ids)) / max(len(expected), 1))
+        print(f"{f'ann ef={ef}':<14} {statistics.mean(recalls):>9.3f} "
+              f"{statistics.median(latencies):>7.1f}ms {_pct(latencies, 0.95):>7.1f}ms")
+
+    recalls, latencies, strategies = [], [], set()
+    for vec, expected in zip(vectors, truth):
+        async with get_session_context() as session:
+            t0 = time.perf_counter()
+            strategy, found = await vector_index.nearest_chunks(session, tenant, vec, k)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        strategies.add(strategy)
+        recalls.append(len(expected & {r[0] for r in found}) / max(len(expected), 1))
+    print(f"{'auto':<14} {statistics.mean(recalls):>9.3f} "
+          f"{statistics.median(latencies):>7.1f}ms {_pct(latencies, 0.95):>7.1f}ms  ({', '.join(sorted(strategies))})")
+
+
+async def cleanup() -> None:
+    from sqlalchemy import text
+
+    from app.database import get_session_context
+
+    async with get_session_context() as session:
+        chunks = await session.execute(
+            text("DELETE FROM document_chunks WHERE document_id IN (SELECT id FROM documents WHERE content_type = :tag)"),
+            {"tag": BENCH_TAG},
+        )
+        documents = await session.execute(text("DELETE FROM documents WHERE content_type = :tag"), {"tag": BENCH_TAG})
+        await session.commit()
+    print(f"document_chunks: deleted {chunks.rowcount:,} rows")
+    print(f"documents: deleted {documents.rowcount:,} rows")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="total synthetic chunks")
+    parser.add_argument("--tenant-share", type=float, default=0.1, help="fraction owned by the first user")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--skip-insert", action="store_true", help="reuse rows from a previous run")
+    parser.add_argument("--cleanup", action="store_true", help="delete benchmark rows and exit")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        asyncio.run(cleanup())
+    else:
+        asyncio.run(run(args.rows, args.tenant_share, args.queries, args.k, args.skip_insert))
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,7 @@ _TEST_ENV = {
     "GROQ_API_KEY": "MOCK",
     "DEBUG": "true",
     "LOG_LEVEL": "DEBUG",
+    "USAGE_WRITER_MODE": "sync",
 }
 
 for key, value in _TEST_ENV.items():
@@ -0,0 +1,123 @@
+"""
+Tests for the shared action runtime (app.core.action_runtime).
+
+Handlers are small coroutines; no platform service is called.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.config import settings
+from app.core import action_runtime
+from app.core.action_runtime import ActionTimeout, ResourceClass
+from app.metrics import action_duration_seconds
+
+
+@pytest.fixture(autouse=True)
+def fresh_slots():
+    with patch.object(action_runtime, "_slots", {}):
+        yield
+
+
+def _observations(engine, action, outcome):
+    return action_duration_seconds.labels(engine=engine, action=action, outcome=outcome)._sum.get()
+
+
+class TestRegistry:
+    def test_engine_action_names_share_specs(self):
+        for name in ("crawl", "crawl_web", "web_crawl"):
+            assert action_runtime.get_spec(name).resource == ResourceClass.BROWSER
+        assert action_runtime.get_spec("transcribe").resource == ResourceClass.ML
+        assert action_runtime.get_spec("execute_code").resource == ResourceClass.CPU
+
+    def test_unknown_action_defaults_to_llm(self):
+        spec = action_runtime.get_spec("my_custom_node")
+        assert spec.resource == ResourceClass.LLM
+        assert spec.timeout == 120.0
+
+    def test_timeout_override(self):
+        with patch.object(settings, "ACTION_RUNTIME_TIMEOUTS", "deep_crawl=5, transcribe=oops"):
+            assert action_runtime.get_spec("deep_crawl").timeout == 5.0
+            assert action_runtime.get_spec("transcribe").timeout == 900.0
+
+    def test_orchestration_actions_take_no_slot(self):
+        assert action_runtime.get_spec("run_workflow").resource is None
+
+
+class TestRun:
+    async def test_returns_result_and_records_outcome(self):
+        before_ok = _observations("agents", "summarize", "ok")
+        before_err = _observations("agents", "summarize", "error")
+        handler = AsyncMock(side_effect=[{"output": "x"}, {"output": "", "error": "no text"}])
+
+        assert await action_runtime.run("agents", "summarize", handler, "text", config={}) == {"output": "x"}
+        await action_runtime.run("agents", "summarize", handler, "text", config={})
+
+        handler.assert_awaited_with("text", config={})
+        assert _observations("agents", "summarize", "ok") > before_ok
+        assert _observations("agents", "summarize", "error") > before_err
+
+    async def test_exceptions_propagate(self):
+        with pytest.raises(ValueError):
+            await action_runtime.run("pipelines", "export", AsyncMock(side_effect=ValueError("bad")))
+
+    async def test_timeout_cancels_handler(self):
+        cancelled = asyncio.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(settings, "ACTION_RUNTIME_TIMEOUTS", "scrape_http=0.05"):
+            with pytest.raises(ActionTimeout) as exc:
+                await action_runtime.run("workflows", "scrape_http", hang)
+        assert cancelled.is_set()
+        assert "scrape_http" in str(exc.value)
+
+    async def test_handler_timeout_error_is_not_a_runtime_timeout(self):
+        async def upstream_timeout():
+            raise TimeoutError("upstream")
+
+        with pytest.raises(TimeoutError) as exc:
+            await action_runtime.run("agents", "scrape_http", upstream_timeout)
+        assert not isinstance(exc.value, ActionTimeout)
+
+    async def test_resource_class_shared_across_engines(self):
+        active = peak = 0
+
+        async def work():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        with patch.object(settings, "ACTION_RUNTIME_CONCURRENCY", "browser=2"), \
+             patch.object(settings, "ACTION_RUNTIME_ACTION_CONCURRENCY", ""):
+            await asyncio.gather(
+                action_runtime.run("agents", "crawl_web", work),
+                action_runtime.run("workflows", "crawl", work),
+                action_runtime.run("pipelines", "web_crawl", work),
+                action_runtime.run("pipelines", "deep_crawl", work),
+            )
+        assert peak == 2
+
+    async def test_per_action_cap_below_class_cap(self):
+        active = peak = 0
+
+        async def work():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        with patch.object(settings, "ACTION_RUNTIME_CONCURRENCY", "cpu=8"), \
+             patch.object(settings, "ACTION_RUNTIME_ACTION_CONCURRENCY", "execute_code=1"):
+            await asyncio.gather(*(action_runtime.run("agents", "execute_code", work) for _ in range(4)))
+        assert peak == 1
@@ -258,6 +258,219 @@ class TestExecutor:
         assert "error" in result
 
 
+# ---------------------------------------------------------------------------
+# Plan dependencies and parallel execution
+# ---------------------------------------------------------------------------
+
+
+def _fetch(url):
+    return {"action": "youtube_transcript", "description": "Fetch", "input": {"url": url}}
+
+
+class TestPlanDependencies:
+    """Tests for planner.resolve_dependencies."""
+
+    def test_independent_fetches_then_summary(self):
+        from app.modules.agents.planner import resolve_dependencies
+
+        plan = resolve_dependencies([_fetch("a"), _fetch("b"), _fetch("c"),
+                                     {"action": "summarize", "input": {}},
+                                     {"action": "translate", "input": {}}])
+        assert [s["depends_on"] for s in plan] == [[], [], [], [0, 1, 2], [3]]
+
+    def test_source_action_without_input_chains(self):
+        from app.modules.agents.planner import resolve_dependencies
+
+        plan = resolve_dependencies([{"action": "search_knowledge", "input": {"query": "x"}},
+                                     {"action": "crawl_web", "input": {}}])
+        assert plan[1]["depends_on"] == [0]
+
+    def test_explicit_dependencies_kept_invalid_replaced(self):
+        from app.modules.agents.planner import resolve_dependencies
+
+        plan = resolve_dependencies([_fetch("a"), _fetch("b"),
+                                     {"action": "summarize", "input": {}, "depends_on": [1]},
+                                     {"action": "summarize", "input": {}, "depends_on": [5]}])
+        assert plan[2]["depends_on"] == [1]
+        assert plan[3]["depends_on"] == [2]
+
+    def test_heuristic_plan_has_dependencies(self):
+        from app.modules.agents.planner import _heuristic_plan
+
+        plan = _heuristic_plan("Transcribe this video and then summarize it")
+        assert plan[0]["depends_on"] == []
+        assert all(step["depends_on"] == [i] for i, step in enumerate(plan[1:]))
+
+
+@pytest.mark.asyncio
+class TestExecutePlan:
+    """Tests for executor.execute_plan scheduling."""
+
+    async def test_independent_steps_run_concurrently(self):
+        import asyncio
+        import time
+
+        from app.modules.agents import executor
+        from app.modules.agents.planner import resolve_dependencies
+
+        async def slow_step(action, input_data, previous_output=None):
+            await asyncio.sleep(0.1)
+            return {"output": input_data.get("url", previous_output), "action": action}
+
+        plan = resolve_dependencies([_fetch(f"u{i}") for i in range(5)] + [{"action": "summarize", "input": {}}])
+        with patch.object(executor, "execute_step", new=slow_step):
+            start = time.monotonic()
+            results = await executor.execute_plan(plan, str(uuid4()))
+        assert time.monotonic() - start < 0.35
+        assert results[5]["output"] == "u0\n\nu1\n\nu2\n\nu3\n\nu4"
+
+    async def test_action_concurrency_limit(self):
+        import asyncio
+
+        from app.config import settings
+        from app.core import action_runtime
+        from app.modules.agents import executor
+
+        active = peak = 0
+
+        async def counting_step(action, input_data, previous_output=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"output": "", "action": action}
+
+        plan = [{**_fetch(str(i)), "depends_on": []} for i in range(6)]
+        with patch.dict(executor._HANDLERS, {"youtube_transcript": lambda data, prev: counting_step("youtube_transcript", data, prev)}), \
+             patch.object(settings, "ACTION_RUNTIME_ACTION_CONCURRENCY", "youtube_transcript=2"), \
+             patch.object(action_runtime, "_slots", {}):
+            await executor.execute_plan(plan, str(uuid4()))
+        assert peak == 2
+
+    async def test_progress_batched_and_failures_reported(self):
+        from app.modules.agents import executor
+
+        async def step(action, input_data, previous_output=None):
+            if input_data.get("url") == "bad":
+                raise RuntimeError("boom")
+            return {"output": input_data.get("url", ""), "action": action}
+
+        rounds = []
+
+        async def on_progress(started, finished):
+            rounds.append((list(started), [(i, failed) for i, _, failed in finished]))
+
+        plan = [{**_fetch("ok"), "depends_on": []}, {**_fetch("bad"), "depends_on": []},
+                {"action": "summarize", "input": {}, "depends_on": [0, 1]}]
+        with patch.object(executor, "execute_step", new=step):
+            results = await executor.execute_plan(plan, str(uuid4()), on_progress)
+
+        assert rounds[0] == ([0, 1], [])
+        assert sorted(f for _, done in rounds for f in done) == [(0, False), (1, True), (2, False)]
+        assert results[1] == {"error": "boom", "action": "youtube_transcript"}
+
+    async def test_stop_from_progress_callback(self):
+        import asyncio
+
+        from app.modules.agents import executor
+
+        calls = []
+
+        async def step(action, input_data, previous_output=None):
+            calls.append(input_data["url"])
+            await asyncio.sleep(0.01)
+            return {"output": "", "action": action}
+
+        async def on_progress(started, finished):
+            return not finished
+
+        plan = [{**_fetch("a"), "depends_on": []}, {"action": "summarize", "input": {}, "depends_on": [0]}]
+        with patch.object(executor, "execute_step", new=step):
+            assert await executor.execute_plan(plan, str(uuid4()), on_progress) is None
+        assert calls == ["a"]
+
+
+@pytest.mark.asyncio
+class TestAgentRunExecution:
+    """AgentService._execute with a mocked session."""
+
+    async def test_commits_per_round_not_per_step(self):
+        from app.modules.agents import executor
+        from app.modules.agents.service import AgentService
+
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.refresh = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=AgentStatus.EXECUTING)))
+        run = AgentRun(user_id=uuid4(), instruction="fetch five videos")
+
+        plan = [{**_fetch(f"u{i}"), "depends_on": []} for i in range(5)]
+        with patch("app.modules.agents.service.create_plan", new=AsyncMock(return_value=plan)), \
+             patch.object(executor, "execute_step", new=AsyncMock(return_value={"output": "t", "action": "youtube_transcript"})), \
+             patch("app.modules.agents.service._track_step_cost", new=AsyncMock()), \
+             patch("app.modules.agents.service._consume_quota", new=AsyncMock()), \
+             patch("app.modules.agents.service._notify_progress", new=AsyncMock()) as notify:
+            run = await AgentService._execute(run, session)
+
+        assert run.status == AgentStatus.COMPLETED
+        assert run.current_step == 5
+        # plan + start round + at most one round per finish + final
+        assert session.commit.await_count <= 8
+        assert notify.await_count >= 3
+
+    async def test_cancelled_run_stops(self):
+        from app.modules.agents import executor
+        from app.modules.agents.service import AgentService
+
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.refresh = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=AgentStatus.CANCELLED)))
+        run = AgentRun(user_id=uuid4(), instruction="two steps")
+
+        plan = [{**_fetch("a"), "depends_on": []}, {"action": "summarize", "input": {}, "depends_on": [0]}]
+        step = AsyncMock(return_value={"output": "t", "action": "youtube_transcript"})
+        with patch("app.modules.agents.service.create_plan", new=AsyncMock(return_value=plan)), \
+             patch.object(executor, "execute_step", new=step), \
+             patch("app.modules.agents.service._consume_quota", new=AsyncMock()), \
+             patch("app.modules.agents.service._notify_progress", new=AsyncMock()):
+            run = await AgentService._execute(run, session)
+
+        assert run.status == AgentStatus.CANCELLED
+        assert step.await_count <= 1
+
+    async def test_quota_consumed_once_planned(self):
+        from app.modules.agents import executor
+        from app.modules.agents.service import AgentService
+
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.refresh = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=AgentStatus.EXECUTING)))
+        run = AgentRun(user_id=uuid4(), instruction="two fetches")
+        calls = []
+
+        async def consume(run, session):
+            calls.append(("quota", run.total_steps))
+
+        async def step(*args, **kwargs):
+            calls.append(("step", None))
+            raise RuntimeError("tool down")
+
+        plan = [{**_fetch(f"u{i}"), "depends_on": []} for i in range(2)]
+        with patch("app.modules.agents.service.create_plan", new=AsyncMock(return_value=plan)), \
+             patch("app.modules.agents.service._consume_quota", new=consume), \
+             patch.object(executor, "execute_step", new=step), \
+             patch("app.modules.agents.service._notify_progress", new=AsyncMock()):
+            run = await AgentService._execute(run, session)
+
+        # Charged before any step runs, even though every step then fails
+        assert calls[0] == ("quota", 2)
+        assert [c for c in calls if c[0] == "quota"] == [("quota", 2)]
+        assert run.status == AgentStatus.FAILED
+
+
 # ---------------------------------------------------------------------------
 # AgentService tests
 # ---------------------------------------------------------------------------
@@ -274,7 +487,7 @@ class TestAgentService:
         instruction = "Summarize the latest AI news"
 
         with patch("app.modules.agents.service.create_plan", new_callable=AsyncMock) as mock_plan, \
-             patch("app.modules.agents.service.execute_step", new_callable=AsyncMock) as mock_exec, \
+             patch("app.modules.agents.executor.execute_step", new_callable=AsyncMock) as mock_exec, \
              patch("app.modules.cost_tracker.tracker.track_ai_usage", new_callable=AsyncMock):
 
             mock_plan.return_value = [
@@ -443,7 +656,7 @@ class TestAgentService:
             await original_commit()
 
         with patch("app.modules.agents.service.create_plan", new_callable=AsyncMock) as mock_plan, \
-             patch("app.modules.agents.service.execute_step", new_callable=AsyncMock) as mock_exec, \
+             patch("app.modules.agents.executor.execute_step", new_callable=AsyncMock) as mock_exec, \
              patch("app.modules.cost_tracker.tracker.track_ai_usage", new_callable=AsyncMock):
 
             mock_plan.return_value = [
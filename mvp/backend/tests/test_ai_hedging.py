@@ -0,0 +1,157 @@
+"""
+Tests for hedged AI requests (app.ai_assistant.hedging).
+
+Providers are fake coroutines / async generators; cost tracking is patched.
+"""
+
+import asyncio
+import sys
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.ai_assistant import hedging
+from app.ai_assistant.router import ProviderRouter
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def hedging_state():
+    router = ProviderRouter({"fast": ("free", 1.0), "slow": ("free", 2.0), "paid": ("high", 0.5)})
+    with patch.object(hedging, "get_router", return_value=router), \
+         patch.object(hedging, "_first_token", {}), \
+         patch.object(hedging, "_requests", {}), \
+         patch.object(settings, "AI_HEDGING_TENANTS", "*"), \
+         patch.object(settings, "AI_HEDGE_DEFAULT_DELAY_MS", 20), \
+         patch.object(settings, "AI_HEDGE_MIN_DELAY_MS", 10), \
+         patch.object(settings, "AI_HEDGE_MAX_EXTRA_PERCENT", 100.0):
+        yield router
+
+
+def _call(latencies, cancelled=None):
+    async def call(name):
+        try:
+            await asyncio.sleep(latencies[name])
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(name)
+            raise
+        return {"processed_text": f"from {name}", "provider": name}
+    return call
+
+
+class TestOptIn:
+    def test_tenant_list(self):
+        with patch.object(settings, "AI_HEDGING_TENANTS", "t1, t2"):
+            assert hedging.enabled_for("t2") is True
+            assert hedging.enabled_for("t3") is False
+            assert hedging.enabled_for(None) is False
+
+    def test_budget_caps_extra_requests(self):
+        with patch.object(settings, "AI_HEDGE_MAX_EXTRA_PERCENT", 10.0):
+            entries = [hedging._admit("t") for _ in range(19)]
+            assert hedging._has_budget("t") is True
+            entries[0][1] = True
+            assert hedging._has_budget("t") is False
+
+
+class TestHedgeDelay:
+    def test_cold_provider_uses_default(self):
+        assert hedging.hedge_delay("fast", streaming=True) == 0.02
+
+    def test_percentile_of_first_token_samples(self):
+        for seconds in (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0):
+            hedging.record_first_token("fast", seconds)
+        with patch.object(settings, "AI_HEDGE_PERCENTILE", 0.9):
+            assert hedging.hedge_delay("fast", streaming=True) == 0.9
+
+
+class TestHedgedComplete:
+    async def test_fast_primary_is_not_hedged(self):
+        call = AsyncMock(return_value={"processed_text": "ok"})
+        assert await hedging.hedged_complete(call, "fast") == {"processed_text": "ok"}
+        call.assert_awaited_once_with("fast")
+
+    async def test_backup_wins_and_primary_is_cancelled(self):
+        cancelled = []
+        result = await hedging.hedged_complete(_call({"fast": 1.0, "slow": 0.01}, cancelled), "fast")
+        assert result["provider"] == "slow"
+        assert cancelled == ["fast"]
+
+    async def test_primary_still_wins_if_it_finishes_first(self):
+        cancelled = []
+        result = await hedging.hedged_complete(_call({"fast": 0.04, "slow": 1.0}, cancelled), "fast")
+        assert result["provider"] == "fast"
+        assert cancelled == ["slow"]
+
+    async def test_no_budget_no_hedge(self):
+        call = _call({"fast": 0.05, "slow": 0.01})
+        with patch.object(settings, "AI_HEDGE_MAX_EXTRA_PERCENT", 0.0):
+            result = await hedging.hedged_complete(call, "fast")
+        assert result["provider"] == "fast"
+
+    async def test_backup_stays_in_cost_tier(self):
+        calls = []
+
+        async def call(name):
+            calls.append(name)
+            await asyncio.sleep(0.05)
+            return {"provider": name}
+
+        await hedging.hedged_complete(call, "slow")
+        assert calls == ["slow", "fast"]
+        calls.clear()
+        await hedging.hedged_complete(call, "paid")
+        assert calls == ["paid", "fast"]
+
+
+class FakeProvider:
+    def __init__(self, name, first_token_delay, chunks=("a", "b")):
+        self.model_name = f"{name}-model"
+        self.first_token_delay = first_token_delay
+        self.chunks = chunks
+
+    async def stream_chat(self, prompt):
+        await asyncio.sleep(self.first_token_delay)
+        for chunk in self.chunks:
+            yield chunk
+
+
+class TestHedgedStream:
+    async def _collect(self, providers):
+        track = AsyncMock()
+        with patch("app.ai_assistant.service.AIAssistantService.get_provider", side_effect=providers.get), \
+             patch.dict(sys.modules, {"app.modules.cost_tracker.tracker": MagicMock(track_ai_usage=track)}):
+            chunks = [c async for c in hedging.hedged_stream(
+                "prompt", "fast", user_id=None, module="conversation", action="chat",
+            )]
+        return chunks, track
+
+    async def test_backup_first_token_wins(self):
+        chunks, track = await self._collect({
+            "fast": FakeProvider("fast", 1.0),
+            "slow": FakeProvider("slow", 0.0, chunks=("x", "y")),
+        })
+        assert chunks == [("slow", "x"), ("slow", "y")]
+        rows = {c.kwargs["provider"]: c.kwargs for c in track.await_args_list}
+        assert rows["slow"]["success"] is True
+        assert rows["fast"]["success"] is False
+        assert rows["fast"]["error"] == "hedge_cancelled"
+
+    async def test_primary_without_hedge_records_first_token(self):
+        chunks, track = await self._collect({"fast": FakeProvider("fast", 0.0)})
+        assert chunks == [("fast", "a"), ("fast", "b")]
+        assert track.await_count == 1
+        assert len(hedging._first_token["fast"]) == 1
+
+    async def test_failed_primary_falls_back_to_backup(self):
+        broken = MagicMock(model_name="fast-model")
+
+        async def fail(prompt):
+            await asyncio.sleep(0.05)
+            raise ConnectionError("reset")
+            yield  # pragma: no cover
+
+        broken.stream_chat = fail
+        chunks, _ = await self._collect({"fast": broken, "slow": FakeProvider("slow", 0.1)})
+        assert chunks == [("slow", "a"), ("slow", "b")]
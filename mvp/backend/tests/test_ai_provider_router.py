@@ -0,0 +1,155 @@
+"""
+Tests for the latency-aware AI provider router (app.ai_assistant.router)
+and the retry helpers it relies on.
+
+Providers are plain coroutines; no AI API is called.
+"""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.ai_assistant import retry
+from app.ai_assistant.router import NoProviderAvailable, ProviderRouter
+from app.core.circuit_breaker import CircuitState
+
+
+class ProviderError(Exception):
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.response = type("Response", (), {
+            "status_code": status,
+            "headers": {"Retry-After": retry_after} if retry_after else {},
+        })()
+
+
+def _router():
+    return ProviderRouter({"fast": ("free", 1.0), "slow": ("free", 2.0), "paid": ("high", 0.5)})
+
+
+def _warm(router, name, latency, count=10):
+    for _ in range(count):
+        router.observe(name, latency)
+
+
+class TestRetryHelpers:
+    def test_retry_after_seconds(self):
+        assert retry.retry_after_seconds(ProviderError(429, "12")) == 12.0
+        assert retry.retry_after_seconds(ProviderError(429, "Wed, 21 Oct 2015 07:28:00 GMT")) == 0.0
+        assert retry.retry_after_seconds(ProviderError(429)) is None
+        assert retry.retry_after_seconds(ProviderError(503, "12")) is None
+
+    async def test_failover_mode_makes_single_attempt(self):
+        fn = AsyncMock(side_effect=ProviderError(503))
+        with retry.failover_mode(True), pytest.raises(ProviderError):
+            await retry.with_retries(fn, provider="fast")
+        assert fn.await_count == 1
+
+    async def test_long_retry_after_is_not_slept(self):
+        fn = AsyncMock(side_effect=ProviderError(429, "120"))
+        with patch.object(retry.asyncio, "sleep", new=AsyncMock()) as sleep, pytest.raises(ProviderError):
+            await retry.with_retries(fn, provider="fast")
+        sleep.assert_not_awaited()
+
+
+class TestRank:
+    def test_cold_providers_use_priors_within_tier(self):
+        assert _router().rank("free") == ["fast", "slow"]
+
+    def test_escalate_appends_pricier_tiers(self):
+        assert _router().rank("free", escalate=True) == ["fast", "slow", "paid"]
+        assert _router().rank("high") == ["paid", "fast", "slow"]
+
+    def test_latency_spike_reorders(self):
+        router = _router()
+        _warm(router, "fast", 5.0)
+        _warm(router, "slow", 1.5)
+        assert router.rank("free") == ["slow", "fast"]
+
+    def test_error_rate_inflates_expected_latency(self):
+        router = _router()
+        _warm(router, "fast", 0.5, count=4)
+        for _ in range(4):
+            router.observe("fast", 0.5, ProviderError(400))
+        _warm(router, "slow", 0.8)
+        snapshot = router.health("fast").snapshot()
+        assert snapshot["error_rate"] == 0.5
+        assert router.rank("free") == ["slow", "fast"]
+
+
+class TestCall:
+    async def test_fails_over_and_opens_breaker(self):
+        router = _router()
+        calls = []
+
+        async def fn(name):
+            calls.append(name)
+            if name == "fast":
+                raise ProviderError(503)
+            return f"from {name}"
+
+        with patch("app.ai_assistant.router.settings.AI_ROUTER_BREAKER_FAILURES", 2):
+            router = _router()
+            for _ in range(3):
+                assert await router.call(fn, cost_tier="free") == ("slow", "from slow")
+
+        assert calls == ["fast", "slow", "fast", "slow", "slow"]
+        assert router.health("fast").breaker.stats.state == CircuitState.OPEN
+        assert "fast" not in router.rank("free")
+
+    async def test_rate_limit_skips_without_tripping_breaker(self):
+        router = _router()
+
+        async def fn(name):
+            if name == "fast":
+                raise ProviderError(429, "30")
+            return name
+
+        assert await router.call(fn, cost_tier="free") == ("slow", "slow")
+        health = router.health("fast")
+        assert health.breaker.stats.state == CircuitState.CLOSED
+        assert health.breaker.stats.failure_count == 0
+        assert health.skip_reason(time.monotonic()) == "rate_limited"
+
+    async def test_unconfigured_provider_is_skipped(self):
+        router = _router()
+
+        async def fn(name):
+            if name == "fast":
+                raise ValueError("GROQ_API_KEY not configured")
+            return name
+
+        await router.call(fn, cost_tier="free")
+        assert router.rank("free") == ["slow"]
+
+    async def test_no_provider_available(self):
+        router = _router()
+        with pytest.raises(NoProviderAvailable, match="fast: HTTP 503"):
+            await router.call(AsyncMock(side_effect=ProviderError(503)), cost_tier="free")
+
+    async def test_last_candidate_keeps_retries(self):
+        router = _router()
+        fn = AsyncMock(side_effect=ProviderError(503))
+
+        async def attempt(name):
+            return await retry.with_retries(lambda: fn(name), provider=name)
+
+        with patch.object(retry.asyncio, "sleep", new=AsyncMock()), pytest.raises(NoProviderAvailable):
+            await router.call(attempt, cost_tier="free")
+        # one attempt on "fast" (failover available), full retries on "slow"
+        assert [c.args[0] for c in fn.await_args_list] == ["fast"] + ["slow"] * retry.MAX_RETRIES
+
+    def test_explicit_provider_outcomes_feed_breaker(self):
+        with patch("app.ai_assistant.router.settings.AI_ROUTER_BREAKER_FAILURES", 2):
+            router = _router()
+        router.observe("fast", 0.5)
+        router.observe("fast", 0.5, ProviderError(429, "5"))
+        breaker = router.health("fast").breaker
+        assert (breaker.stats.success_count, breaker.stats.failure_count) == (1, 0)
+
+        router.observe("fast", 0.5, ProviderError(503))
+        router.observe("fast", 0.5, ProviderError(503))
+        assert breaker.stats.state == CircuitState.OPEN
+        assert "fast" not in router.rank("free")
@@ -0,0 +1,143 @@
+"""
+Tests for client-side AI provider rate limiting (app.ai_assistant.rate_limits).
+
+Redis is patched out (local buckets) except where the script call is mocked.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.ai_assistant import rate_limits, retry
+from app.ai_assistant.rate_limits import ProviderRateLimited
+from app.ai_assistant.router import ProviderRouter
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def local_buckets():
+    with patch("app.cache._get_redis", new=AsyncMock(return_value=None)), \
+         patch.object(rate_limits, "_local_buckets", {}), \
+         patch.object(rate_limits, "_in_flight", {}), \
+         patch("app.ai_assistant.router.get_router", return_value=ProviderRouter()), \
+         patch.object(settings, "AI_PROVIDER_RATE_LIMITS", "groq=60:6000,gemini=0:0"):
+        yield
+
+
+class TestBuckets:
+    def test_parse_limits(self):
+        assert rate_limits.limits_for("groq") == (60, 6000)
+        assert rate_limits.limits_for("claude") == (0, 0)
+
+    async def test_requests_bucket_drains_then_refills(self):
+        with patch.object(settings, "AI_PROVIDER_RATE_LIMITS", "groq=3:0"):
+            for _ in range(3):
+                assert await rate_limits._take("groq", 10) == 0
+            wait = await rate_limits._take("groq", 10)
+        assert 19 < wait <= 20  # one request every 20s at 3/min
+
+    async def test_tokens_bucket_limits_large_prompts(self):
+        assert await rate_limits._take("groq", 5000) == 0
+        wait = await rate_limits._take("groq", 2000)
+        assert 9 < wait <= 10  # 1000 missing tokens at 100 tokens/s
+
+    async def test_unlimited_provider_never_waits(self):
+        for _ in range(100):
+            await rate_limits.acquire("gemini", 10**6)
+
+    async def test_redis_script_wait_is_used(self):
+        script = AsyncMock(return_value=1500)
+        client = MagicMock(register_script=MagicMock(return_value=script))
+        with patch("app.cache._get_redis", new=AsyncMock(return_value=client)), \
+             patch.object(rate_limits, "_script", None):
+            assert await rate_limits._take("groq", 700) == 1.5
+        keys = script.await_args.kwargs["keys"]
+        assert keys[0].startswith("saas_ia:ai_rl:groq:") and keys[0].endswith(":req")
+        assert script.await_args.kwargs["args"] == [60, 6000, 700]
+
+
+class TestAcquire:
+    async def test_raises_when_wait_exceeds_deadline(self):
+        with patch.object(settings, "AI_PROVIDER_RATE_LIMITS", "groq=1:0"):
+            await rate_limits.acquire("groq", 1, max_wait=1)
+            with pytest.raises(ProviderRateLimited) as exc:
+                await rate_limits.acquire("groq", 1, max_wait=1)
+        assert exc.value.status_code == 429
+        assert retry.retry_after_seconds(exc.value) == pytest.approx(60, abs=1)
+
+    async def test_waits_for_refill_within_deadline(self):
+        with patch.object(rate_limits.asyncio, "sleep", new=AsyncMock()) as sleep, \
+             patch.object(rate_limits, "_take", new=AsyncMock(side_effect=[0.5, 0.0])):
+            await rate_limits.acquire("groq", 1, max_wait=5)
+        assert 0.5 <= sleep.await_args.args[0] <= 0.625
+
+    async def test_no_wait_while_router_can_fail_over(self):
+        with patch.object(settings, "AI_PROVIDER_RATE_LIMITS", "groq=1:0"):
+            await rate_limits.acquire("groq", 1)
+            with retry.failover_mode(True), pytest.raises(ProviderRateLimited):
+                await rate_limits.acquire("groq", 1)
+
+
+class TestSlot:
+    def test_concurrency_from_request_rate(self):
+        # 60 rpm x 1s prior latency for groq
+        assert rate_limits.concurrency_limit("groq") == 2
+        with patch.object(settings, "AI_PROVIDER_RATE_LIMITS", "groq=1200:0"):
+            assert rate_limits.concurrency_limit("groq") == 21
+        assert rate_limits.concurrency_limit("gemini") is None
+
+    async def test_in_flight_cap(self):
+        active = peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with rate_limits.slot("groq", 1, max_wait=5):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+
+    async def test_limit_follows_recent_latency(self):
+        limiter = rate_limits._limiter("groq")
+        assert limiter.limit == 2
+        with patch.object(settings, "AI_PROVIDER_RATE_LIMITS", "groq=1200:0"):
+            assert rate_limits._limiter("groq").limit == 2  # not due for a refresh yet
+            limiter.updated_at -= rate_limits._LIMIT_REFRESH_SECONDS
+            assert rate_limits._limiter("groq") is limiter
+        assert limiter.limit == 21
+
+    async def test_stream_releases_slot_after_first_chunk(self):
+        release_reader = asyncio.Event()
+
+        async def chunks():
+            yield "a"
+            yield "b"
+
+        async def slow_reader():
+            async for _ in rate_limits.stream("groq", 1, chunks(), max_wait=5):
+                await release_reader.wait()
+
+        readers = [asyncio.create_task(slow_reader()) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        # Both readers are still draining their streams, yet a new call gets a slot
+        async with rate_limits.slot("groq", 1, max_wait=0.1):
+            pass
+        release_reader.set()
+        await asyncio.gather(*readers)
+        assert rate_limits._in_flight["groq"].in_flight == 0
+
+    async def test_router_fails_over_on_client_side_limit(self):
+        router = ProviderRouter({"groq": ("free", 1.0), "gemini": ("free", 2.0)})
+
+        async def fn(name):
+            async with rate_limits.slot(name, 10):
+                return name
+
+        with patch.object(settings, "AI_PROVIDER_RATE_LIMITS", "groq=1:0,gemini=0:0"):
+            assert await router.call(fn, cost_tier="free") == ("groq", "groq")
+            assert await router.call(fn, cost_tier="free") == ("gemini", "gemini")
+        assert router.health("groq").skip_reason(rate_limits.time.monotonic()) == "rate_limited"
@@ -233,6 +233,207 @@ class TestBillingServiceConsumeQuota:
         session.commit.assert_awaited()
 
 
+class TestBillingQuotaCounters:
+    """Tests for the Redis quota counter path and its database fallback."""
+
+    @pytest.mark.asyncio
+    async def test_consume_quota_uses_redis_counter(self):
+        """A seeded Redis counter absorbs the increment without touching the DB."""
+        from app.modules.billing import quota_counters
+        from app.modules.billing.service import BillingService
+
+        session = AsyncMock()
+        with (
+            patch.object(quota_counters, "increment", new_callable=AsyncMock, return_value=4) as incr,
+            patch.object(BillingService, "get_user_quota", new_callable=AsyncMock) as get_quota,
+        ):
+            await BillingService.consume_quota(uuid4(), "ai_call", 1, session)
+
+        incr.assert_awaited_once()
+        assert incr.call_args[0][1] == "ai_calls_used"
+        get_quota.assert_not_awaited()
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_consume_quota_seeds_counter_on_miss(self):
+        """An unseeded counter is loaded from the quota row, then incremented."""
+        from app.modules.billing import quota_counters
+        from app.modules.billing.service import BillingService
+
+        user_id = uuid4()
+        plan = _make_plan("free")
+        quota = _make_quota(user_id, plan.id, transcriptions_used=2)
+        session = AsyncMock()
+
+        with (
+            patch.object(quota_counters, "increment", new_callable=AsyncMock, side_effect=[-2, 3]) as incr,
+            patch.object(quota_counters, "seed", new_callable=AsyncMock, return_value=True) as seed,
+            patch.object(BillingService, "get_user_quota", new_callable=AsyncMock, return_value=(quota, plan)),
+        ):
+            await BillingService.consume_quota(user_id, "transcription", 1, session)
+
+        seed.assert_awaited_once_with(user_id, quota)
+        assert incr.await_count == 2
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_check_quota_reads_live_counters(self):
+        """check_quota compares live counters to cached plan limits."""
+        from app.modules.billing import quota_counters
+        from app.modules.billing.service import BillingService
+
+        plan = _make_plan("free")
+        usage = {"quota_id": str(uuid4()), "plan_id": str(plan.id), "ai_calls_used": 50,
+                 "transcriptions_used": 0, "audio_minutes_used": 0}
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=plan)
+        quota_counters.invalidate_plan_limits()
+
+        with (
+            patch.object(quota_counters, "get_usage", new_callable=AsyncMock, return_value=usage),
+            patch.object(BillingService, "get_user_quota", new_callable=AsyncMock) as get_quota,
+        ):
+            assert await BillingService.check_quota(uuid4(), "ai_call", session) is False
+            assert await BillingService.check_quota(uuid4(), "transcription", session) is True
+
+        get_quota.assert_not_awaited()
+        # Plan limits are cached in-process after the first lookup
+        session.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_try_consume_quota_rejects_over_limit(self):
+        """try_consume_quota returns False when the Lua check refuses the increment."""
+        from app.modules.billing import quota_counters
+        from app.modules.billing.service import BillingService
+
+        user_id = uuid4()
+        plan = _make_plan("free")
+        quota = _make_quota(user_id, plan.id, ai_calls_used=50)
+        session = AsyncMock()
+
+        with (
+            patch.object(quota_counters, "get_usage", new_callable=AsyncMock, return_value=None),
+            patch.object(quota_counters, "seed", new_callable=AsyncMock, return_value=True),
+            patch.object(quota_counters, "increment", new_callable=AsyncMock, return_value=-1) as incr,
+            patch.object(BillingService, "get_user_quota", new_callable=AsyncMock, return_value=(quota, plan)),
+        ):
+            allowed = await BillingService.try_consume_quota(user_id, "ai_call", 1, session)
+
+        assert allowed is False
+        incr.assert_awaited_once_with(user_id, "ai_calls_used", 1, 50)
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_try_consume_quota_db_fallback(self):
+        """Without Redis, try_consume_quota checks and updates the quota row."""
+        from app.modules.billing import quota_counters
+        from app.modules.billing.service import BillingService
+
+        user_id = uuid4()
+        plan = _make_plan("free")
+        quota = _make_quota(user_id, plan.id, ai_calls_used=10)
+        session = AsyncMock()
+
+        with (
+            patch.object(quota_counters, "_client", new_callable=AsyncMock, return_value=None),
+            patch.object(BillingService, "get_user_quota", new_callable=AsyncMock, return_value=(quota, plan)),
+        ):
+            allowed = await BillingService.try_consume_quota(user_id, "ai_call", 1, session)
+
+        assert allowed is True
+        compiled = str(session.execute.call_args[0][0].compile(compile_kwargs={"literal_binds": True}))
+        assert "ai_calls_used" in compiled
+        session.commit.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reset_monthly_quotas_single_update(self):
+        """reset_monthly_quotas issues one set-based UPDATE instead of loading rows."""
+        from app.modules.billing.service import BillingService
+
+        session = AsyncMock()
+        result = MagicMock()
+        result.rowcount = 7
+        session.execute = AsyncMock(return_value=result)
+
+        count = await BillingService.reset_monthly_quotas(session)
+
+        assert count == 7
+        session.execute.assert_awaited_once()
+        compiled = str(session.execute.call_args[0][0].compile())
+        assert compiled.startswith("UPDATE user_quotas")
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reset_rolls_over_redis_counters(self):
+        """Reset quotas drop last period's counters and keep this period's increments."""
+        from app.modules.billing import quota_counters
+        from app.modules.billing.service import BillingService
+
+        user_id, quota_id = uuid4(), uuid4()
+        current = quota_counters._key(user_id, date.today())
+        previous = quota_counters._key(user_id, date.today().replace(day=1) - timedelta(days=1))
+        # Seeded from the old row (40 calls) before the reset, then 3 more calls
+        # of which 1 is still pending
+        hashes = {
+            previous: {"quota_id": str(quota_id), "pending:ai_calls_used": "2"},
+            current: {"quota_id": str(quota_id), "used:ai_calls_used": "43",
+                      "base:ai_calls_used": "40", "pending:ai_calls_used": "1"},
+        }
+
+        class Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def delete(self, key):
+                self.ops.append(lambda: hashes.pop(key, None))
+
+            def hgetall(self, key):
+                self.ops.append(lambda: dict(hashes.get(key, {})))
+
+            async def execute(self):
+                return [op() for op in self.ops]
+
+        client = MagicMock()
+        client.pipeline = Pipeline
+        session = AsyncMock()
+        result = MagicMock()
+        result.rowcount = 1
+        result.scalars.return_value.all.return_value = [user_id]
+        session.execute = AsyncMock(return_value=result)
+
+        with (
+            patch.object(quota_counters, "_client", new_callable=AsyncMock, return_value=client),
+            patch.object(quota_counters, "_apply_deltas", new_callable=AsyncMock) as apply,
+        ):
+            assert await BillingService.reset_monthly_quotas(session) == 1
+
+        assert hashes == {}
+        apply.assert_awaited_once()
+        assert apply.call_args[0][0] == [{"key": current, "quota_id": quota_id, "deltas": {"ai_calls_used": 3}}]
+
+    @pytest.mark.asyncio
+    async def test_apply_deltas_batches_per_column(self):
+        """Reconciled deltas are written as one executemany UPDATE per column."""
+        from app.modules.billing import quota_counters
+
+        rows = [
+            {"key": "k1", "quota_id": uuid4(), "deltas": {"ai_calls_used": 3}},
+            {"key": "k2", "quota_id": uuid4(), "deltas": {"ai_calls_used": 1, "transcriptions_used": 2}},
+        ]
+        session = AsyncMock()
+
+        await quota_counters._apply_deltas(rows, session)
+
+        assert session.execute.await_count == 2
+        params_by_column = {
+            str(call.args[0].compile()).split("SET ")[1].split("=")[0].strip(): call.args[1]
+            for call in session.execute.call_args_list
+        }
+        assert len(params_by_column["ai_calls_used"]) == 2
+        assert params_by_column["transcriptions_used"][0]["b_delta"] == 2
+        session.commit.assert_awaited_once()
+
+
 class TestPlanFeatures:
     """Test that each plan has the correct limits."""
 
@@ -0,0 +1,102 @@
+"""
+Tests for the off-row blob store (app.core.blob_store) on the filesystem
+backend.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.core import blob_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    backend = blob_store.FilesystemBackend(str(tmp_path))
+    with patch.object(blob_store, "_backend", backend), \
+         patch.object(blob_store.settings, "BLOB_STORE_MIN_BYTES", 100), \
+         patch.object(blob_store.settings, "BLOB_STORE_PREVIEW_CHARS", 10):
+        yield tmp_path
+
+
+def _files(root):
+    return [p for p in root.rglob("*") if p.is_file()]
+
+
+class TestOffload:
+    async def test_small_values_stay_inline(self, store):
+        assert await blob_store.offload("short") == "short"
+        assert await blob_store.offload(None) is None
+        assert _files(store) == []
+
+    async def test_large_value_round_trip(self, store):
+        value = "page text " * 50
+        ref = await blob_store.offload(value)
+
+        assert blob_store.is_ref(ref)
+        assert ref.endswith("\npage text ")
+        assert blob_store.preview(ref) == "page text "
+        assert await blob_store.load(ref) == value
+        # Stored compressed
+        [path] = _files(store)
+        assert path.stat().st_size < len(value)
+
+    async def test_identical_values_are_stored_once(self, store):
+        value = json.dumps([{"page_number": i, "text": "same"} for i in range(20)])
+        first = await blob_store.offload(value)
+        second = await blob_store.offload(value)
+        assert first == second
+        assert len(_files(store)) == 1
+
+    async def test_concurrent_puts_of_the_same_value(self, store):
+        data = b"same content " * 1000
+        with patch.object(blob_store._backend, "exists", return_value=False):
+            shas = await asyncio.gather(*(blob_store.put(data) for _ in range(8)))
+        assert len(set(shas)) == 1
+        assert len(_files(store)) == 1  # no temp file left behind
+        assert await blob_store.get(shas[0]) == data
+
+    async def test_references_and_legacy_values_pass_through(self, store):
+        ref = await blob_store.dump_json({"k": "v" * 200})
+        assert await blob_store.offload(ref) == ref
+        assert await blob_store.load_json('{"inline": true}') == {"inline": True}
+        assert await blob_store.load_json(None, []) == []
+        assert await blob_store.load_json(ref) == {"k": "v" * 200}
+
+    async def test_missing_blob(self, store):
+        ref = await blob_store.offload("x" * 500)
+        for path in _files(store):
+            path.unlink()
+        with pytest.raises(blob_store.BlobNotFound):
+            await blob_store.load(ref)
+
+
+class TestStream:
+    async def test_streams_decompressed_chunks(self, store):
+        value = "".join(f"line {i}\n" for i in range(2000))
+        ref = await blob_store.offload(value)
+
+        chunks = [chunk async for chunk in blob_store.stream(ref, chunk_size=1024)]
+        assert len(chunks) > 1
+        assert all(len(c) <= 1024 for c in chunks)
+        assert b"".join(chunks).decode() == value
+
+    async def test_streams_inline_value(self, store):
+        chunks = [chunk async for chunk in blob_store.stream("[]")]
+        assert chunks == [b"[]"]
+
+
+class TestCompression:
+    def test_gzip_without_zstandard(self):
+        with patch.object(blob_store._zstd, "_available", False):
+            assert blob_store._compress(b"data" * 100).startswith(b"\x1f\x8b")
+
+    async def test_zstd_when_installed(self, store):
+        pytest.importorskip("zstandard")
+        value = "zstd " * 100
+        ref = await blob_store.offload(value)
+        [path] = _files(store)
+        assert path.read_bytes().startswith(b"\x28\xb5\x2f\xfd")
+        assert await blob_store.load(ref) == value
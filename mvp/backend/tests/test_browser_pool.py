@@ -0,0 +1,154 @@
+"""
+Tests for the crawler browser pool (app.modules.web_crawler.browser_pool).
+
+Browser launches are replaced with MagicMocks; no browser is started.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import settings
+from app.modules.web_crawler import browser_pool
+
+
+@pytest.fixture(autouse=True)
+def pool():
+    """Fresh pool state with fake browsers; yields the list of launched browsers."""
+    launched = []
+
+    async def fake_launch(kwargs):
+        crawler = MagicMock(close=AsyncMock(), kwargs=kwargs)
+        launched.append(crawler)
+        return crawler
+
+    browser_pool._browsers.clear()
+    with patch.object(browser_pool, "_condition", None), \
+         patch.object(browser_pool, "_page_slots", None), \
+         patch.object(browser_pool, "_launch", new=fake_launch), \
+         patch.object(browser_pool, "_memory_percent", return_value=10.0), \
+         patch.object(settings, "BROWSER_POOL_MAX_BROWSERS", 2), \
+         patch.object(settings, "BROWSER_POOL_CONTEXTS_PER_BROWSER", 2), \
+         patch.object(settings, "BROWSER_POOL_RECYCLE_AFTER_PAGES", 100), \
+         patch.object(settings, "BROWSER_POOL_ACQUIRE_TIMEOUT_SECONDS", 0.2):
+        yield launched
+    browser_pool._browsers.clear()
+
+
+STEALTH = browser_pool.browser_kwargs(enable_stealth=True)
+FIREFOX = browser_pool.browser_kwargs(browser_type="firefox")
+WEBKIT = browser_pool.browser_kwargs(browser_type="webkit")
+
+
+class TestBrowserKwargs:
+    def test_defaults(self):
+        assert browser_pool.browser_kwargs() == {"headless": True}
+
+    def test_options(self):
+        kwargs = browser_pool.browser_kwargs(
+            proxy_url="http://p:1", user_agent="random", browser_type="firefox",
+            enable_stealth=True, javascript_enabled=False, avoid_ads=True,
+        )
+        assert kwargs == {
+            "headless": True, "proxy": "http://p:1", "user_agent_mode": "random",
+            "browser_type": "firefox", "enable_stealth": True,
+            "javascript_enabled": False, "avoid_ads": True,
+        }
+
+    def test_key_ignores_order(self):
+        assert browser_pool.config_key({"a": 1, "b": 2}) == browser_pool.config_key({"b": 2, "a": 1})
+
+
+class TestLease:
+    async def test_same_config_reuses_browser(self, pool):
+        async with browser_pool.lease(STEALTH) as first:
+            pass
+        async with browser_pool.lease(STEALTH) as second:
+            pass
+        assert first is second
+        assert len(pool) == 1
+
+    async def test_contexts_per_browser_cap(self, pool):
+        async with browser_pool.lease(STEALTH), browser_pool.lease(STEALTH):
+            async with browser_pool.lease(STEALTH) as third:
+                pass
+        assert len(pool) == 2
+        assert third is pool[1]
+
+    async def test_idle_browser_evicted_for_new_config(self, pool):
+        for kwargs in (STEALTH, FIREFOX, WEBKIT):
+            async with browser_pool.lease(kwargs):
+                pass
+        assert len(pool) == 3
+        pool[0].close.assert_awaited_once()
+        assert len(browser_pool._browsers) == 2
+
+    async def test_saturated_pool_queues_then_times_out(self, pool):
+        async with browser_pool.lease(STEALTH), browser_pool.lease(STEALTH), \
+                browser_pool.lease(FIREFOX), browser_pool.lease(FIREFOX):
+            with pytest.raises(browser_pool.BrowserPoolTimeout):
+                async with browser_pool.lease(WEBKIT):
+                    pass
+
+    async def test_waiter_gets_released_page(self, pool):
+        order = []
+
+        async def hold(kwargs, label, seconds):
+            async with browser_pool.lease(kwargs):
+                order.append(label)
+                await asyncio.sleep(seconds)
+
+        with patch.object(settings, "BROWSER_POOL_MAX_BROWSERS", 1), \
+             patch.object(settings, "BROWSER_POOL_CONTEXTS_PER_BROWSER", 1):
+            await asyncio.gather(hold(STEALTH, "a", 0.02), hold(STEALTH, "b", 0))
+        assert order == ["a", "b"]
+        assert len(pool) == 1
+
+    async def test_recycled_after_n_pages(self, pool):
+        with patch.object(settings, "BROWSER_POOL_RECYCLE_AFTER_PAGES", 2):
+            for _ in range(3):
+                async with browser_pool.lease(STEALTH):
+                    pass
+        assert len(pool) == 2
+        pool[0].close.assert_awaited_once()
+
+    async def test_recycled_on_memory_pressure(self, pool):
+        with patch.object(browser_pool, "_memory_percent", return_value=99.0):
+            async with browser_pool.lease(STEALTH):
+                pass
+        pool[0].close.assert_awaited_once()
+        assert browser_pool._browsers == []
+
+    async def test_launch_failure_frees_slot(self, pool):
+        with patch.object(browser_pool, "_launch", new=AsyncMock(side_effect=RuntimeError("no browser"))):
+            with pytest.raises(RuntimeError):
+                async with browser_pool.lease(STEALTH):
+                    pass
+        assert browser_pool._browsers == []
+
+    async def test_close_all(self, pool):
+        async with browser_pool.lease(STEALTH):
+            pass
+        await browser_pool.close_all()
+        pool[0].close.assert_awaited_once()
+        assert browser_pool.stats()["browsers"] == []
+
+
+class TestPageSlot:
+    async def test_default_browser_page_cap(self):
+        with patch.object(settings, "BROWSER_POOL_DEFAULT_MAX_PAGES", 1):
+            async with browser_pool.page_slot():
+                with pytest.raises(browser_pool.BrowserPoolTimeout):
+                    async with browser_pool.page_slot():
+                        pass
+            async with browser_pool.page_slot():
+                pass
+
+
+class TestPrewarm:
+    async def test_prewarm_configs(self, pool):
+        with patch.object(settings, "BROWSER_POOL_PREWARM", "stealth, firefox"):
+            await browser_pool.prewarm()
+        assert [c.kwargs for c in pool] == [STEALTH, FIREFOX]
+        assert all(b.pages == 0 for b in browser_pool._browsers)
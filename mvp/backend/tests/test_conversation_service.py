@@ -336,9 +336,10 @@ class TestConversationServiceList:
             content="Hello!",
         )
 
-        items, total = await ConversationService.list_conversations(
+        page = await ConversationService.list_conversations(
             session=session, user_id=user.id
         )
+        items, total = page.items, page.total
 
         assert total == 2
         assert len(items) == 2
@@ -357,15 +358,17 @@ class TestConversationServiceList:
                 session=session, user_id=user.id
             )
 
-        items, total = await ConversationService.list_conversations(
+        page = await ConversationService.list_conversations(
             session=session, user_id=user.id, skip=0, limit=2
         )
+        items, total = page.items, page.total
         assert len(items) == 2
         assert total == 5
 
-        items2, total2 = await ConversationService.list_conversations(
+        page = await ConversationService.list_conversations(
             session=session, user_id=user.id, skip=4, limit=2
         )
+        items2, total2 = page.items, page.total
         assert len(items2) == 1
         assert total2 == 5
 
@@ -380,9 +383,10 @@ class TestConversationServiceList:
             session=session, user_id=user_a.id
         )
 
-        items, total = await ConversationService.list_conversations(
+        page = await ConversationService.list_conversations(
             session=session, user_id=user_b.id
         )
+        items, total = page.items, page.total
         assert total == 0
         assert items == []
 
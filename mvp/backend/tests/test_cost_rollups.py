@@ -0,0 +1,100 @@
+"""
+Tests for the AI usage rollups (cost_tracker.rollups).
+
+All tests run without external services (no DB).
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+
+def _sources(subquery) -> dict[str, int]:
+    sql = str(subquery.compile(dialect=postgresql.dialect()))
+    return {
+        table: sql.count(f"FROM {table}")
+        for table in ("ai_usage_logs", "ai_usage_hourly", "ai_usage_daily")
+    }
+
+
+class TestUsageSource:
+    """usage_source splits a window into raw edges, hourly and daily buckets."""
+
+    def test_no_watermark_reads_raw_only(self):
+        from app.modules.cost_tracker import rollups
+
+        src = rollups.usage_source(uuid4(), datetime(2026, 9, 1), None)
+        assert _sources(src) == {"ai_usage_logs": 1, "ai_usage_hourly": 0, "ai_usage_daily": 0}
+
+    def test_since_after_watermark_reads_raw_only(self):
+        from app.modules.cost_tracker import rollups
+
+        src = rollups.usage_source(uuid4(), datetime(2026, 10, 19, 13), datetime(2026, 10, 19, 12))
+        assert _sources(src) == {"ai_usage_logs": 1, "ai_usage_hourly": 0, "ai_usage_daily": 0}
+
+    def test_long_window_uses_daily_buckets(self):
+        from app.modules.cost_tracker import rollups
+
+        # Unaligned start -> raw head + hourly to midnight + daily + hourly to watermark + raw tail
+        src = rollups.usage_source(uuid4(), datetime(2026, 9, 1, 13, 30), datetime(2026, 10, 19, 12))
+        assert _sources(src) == {"ai_usage_logs": 2, "ai_usage_hourly": 2, "ai_usage_daily": 1}
+
+    def test_same_day_window_uses_hourly_buckets(self):
+        from app.modules.cost_tracker import rollups
+
+        src = rollups.usage_source(uuid4(), datetime(2026, 10, 19, 5), datetime(2026, 10, 19, 12))
+        assert _sources(src) == {"ai_usage_logs": 1, "ai_usage_hourly": 1, "ai_usage_daily": 0}
+
+
+class TestCompaction:
+    """compact advances the watermark over closed hours only."""
+
+    @pytest.mark.asyncio
+    async def test_compact_rolls_closed_hours(self):
+        from app.models.usage_rollup import AIUsageRollupState
+        from app.modules.cost_tracker import rollups
+
+        state = AIUsageRollupState(id=1, rolled_until=datetime(2026, 10, 19, 8))
+        session = AsyncMock()
+        session.add = MagicMock()
+        session.get = AsyncMock(return_value=state)
+
+        with patch.object(rollups.settings, "USAGE_ROLLUP_LAG_SECONDS", 300):
+            watermark = await rollups.compact(session, now=datetime(2026, 10, 19, 12, 3))
+
+        # 12:03 minus the 5 minute lag is still inside the 11:00 hour
+        assert watermark == datetime(2026, 10, 19, 11)
+        assert state.rolled_until == watermark
+        hourly_params = session.execute.call_args_list[0].args[1]
+        assert hourly_params == {"start": datetime(2026, 10, 19, 8), "end": datetime(2026, 10, 19, 11)}
+        daily_params = session.execute.call_args_list[1].args[1]
+        assert daily_params == {"start": datetime(2026, 10, 19), "end": datetime(2026, 10, 20)}
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_compact_noop_when_up_to_date(self):
+        from app.models.usage_rollup import AIUsageRollupState
+        from app.modules.cost_tracker import rollups
+
+        state = AIUsageRollupState(id=1, rolled_until=datetime(2026, 10, 19, 12))
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=state)
+
+        watermark = await rollups.compact(session, now=datetime(2026, 10, 19, 12, 30))
+
+        assert watermark == datetime(2026, 10, 19, 12)
+        session.execute.assert_not_awaited()
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_prune_skips_without_watermark(self):
+        from app.modules.cost_tracker import rollups
+
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=None)
+
+        assert await rollups.prune_raw_logs(session) == 0
+        session.execute.assert_not_awaited()
@@ -0,0 +1,174 @@
+"""
+Tests for the crawl page cache (app.modules.web_crawler.page_cache).
+
+Files go to a temporary CRAWL_CACHE_DIR, metadata to the in-process
+fallback (Redis is patched out) and origin fetches are AsyncMocks.
+"""
+
+import time
+from email.utils import formatdate
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.config import settings
+from app.modules.web_crawler import http_engine, page_cache
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path):
+    page_cache._local_meta.clear()
+    with patch.object(settings, "CRAWL_CACHE_DIR", str(tmp_path)), \
+         patch.object(settings, "CRAWL_CACHE_ENABLED", True), \
+         patch("app.cache._get_redis", new=AsyncMock(return_value=None)):
+        yield tmp_path
+    page_cache._local_meta.clear()
+
+
+def _response(status=200, text="<html>hello</html>", headers=None, url="https://example.com/"):
+    error = f"HTTP {status}" if status >= 400 else None
+    return http_engine.FetchResult(
+        url=url, final_url=url, status_code=status, content_type="text/html",
+        text=text, headers=headers or {}, error=error,
+    )
+
+
+class TestFreshness:
+    def test_max_age(self):
+        expires_at, no_cache, no_store = page_cache.freshness({"Cache-Control": "public, max-age=600"}, 1000.0)
+        assert (expires_at, no_cache, no_store) == (1600.0, False, False)
+
+    def test_s_maxage_wins(self):
+        assert page_cache.freshness({"cache-control": "max-age=60, s-maxage=10"}, 0.0)[0] == 10.0
+
+    def test_no_store_and_private(self):
+        assert page_cache.freshness({"cache-control": "no-store"}, 0.0)[2] is True
+        assert page_cache.freshness({"cache-control": "private, max-age=60"}, 0.0)[2] is True
+
+    def test_no_cache(self):
+        assert page_cache.freshness({"cache-control": "no-cache"}, 5.0) == (5.0, True, False)
+
+    def test_expires(self):
+        now = time.time()
+        expires_at, _, _ = page_cache.freshness({"expires": formatdate(now + 120, usegmt=True)}, now)
+        assert 118 <= expires_at - now <= 121
+
+    def test_last_modified_heuristic_is_capped(self):
+        now = time.time()
+        recent = page_cache.freshness({"last-modified": formatdate(now - 1000, usegmt=True)}, now)[0]
+        ancient = page_cache.freshness({"last-modified": formatdate(now - 10 ** 8, usegmt=True)}, now)[0]
+        assert 99 <= recent - now <= 101
+        assert ancient - now == page_cache.MAX_HEURISTIC_SECONDS
+
+    def test_no_headers_is_stale(self):
+        assert page_cache.freshness({}, 7.0)[0] == 7.0
+
+
+class TestPageLayer:
+    async def test_fresh_entry_is_a_hit(self):
+        origin = AsyncMock(return_value=_response(headers={"cache-control": "max-age=300"}))
+        with patch.object(http_engine, "fetch", new=origin):
+            first = await page_cache.fetch("https://example.com/")
+            second = await page_cache.fetch("https://example.com/")
+
+        assert (first.cache, second.cache) == ("miss", "hit")
+        assert origin.await_count == 1
+        assert second.text == "<html>hello</html>"
+        assert second.sha256 == first.sha256
+
+    async def test_stale_entry_revalidated_with_304(self):
+        headers = {"etag": '"v1"', "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT", "cache-control": "no-cache"}
+        origin = AsyncMock(side_effect=[_response(headers=headers), _response(status=304, text="")])
+        with patch.object(http_engine, "fetch", new=origin):
+            await page_cache.fetch("https://example.com/")
+            result = await page_cache.fetch("https://example.com/")
+
+        assert result.cache == "revalidated"
+        assert result.status_code == 200
+        assert result.text == "<html>hello</html>"
+        conditional = origin.await_args_list[1].kwargs["headers"]
+        assert conditional == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+    async def test_changed_page_replaces_entry(self):
+        origin = AsyncMock(side_effect=[
+            _response(text="old", headers={"etag": '"v1"'}),
+            _response(text="new", headers={"etag": '"v2"'}),
+        ])
+        with patch.object(http_engine, "fetch", new=origin):
+            first = await page_cache.fetch("https://example.com/")
+            second = await page_cache.fetch("https://example.com/")
+
+        assert second.cache == "miss"
+        assert second.text == "new"
+        assert second.sha256 != first.sha256
+
+    async def test_caller_max_age_overrides_headers(self):
+        origin = AsyncMock(return_value=_response(headers={"cache-control": "no-cache"}))
+        with patch.object(http_engine, "fetch", new=origin):
+            await page_cache.fetch("https://example.com/")
+            result = await page_cache.fetch("https://example.com/", max_age=3600)
+        assert result.cache == "hit"
+        assert origin.await_count == 1
+
+    async def test_no_store_is_not_cached(self):
+        origin = AsyncMock(return_value=_response(headers={"cache-control": "no-store"}))
+        with patch.object(http_engine, "fetch", new=origin):
+            await page_cache.fetch("https://example.com/")
+            result = await page_cache.fetch("https://example.com/", max_age=3600)
+        assert result.cache == "miss"
+        assert origin.await_count == 2
+
+    async def test_custom_headers_bypass(self):
+        origin = AsyncMock(return_value=_response(headers={"cache-control": "max-age=300"}))
+        with patch.object(http_engine, "fetch", new=origin):
+            result = await page_cache.fetch("https://example.com/", headers={"Authorization": "Bearer x"})
+        assert result.cache == "bypass"
+        assert page_cache._local_meta == {}
+
+    async def test_errors_not_cached(self):
+        origin = AsyncMock(return_value=_response(status=500, headers={"cache-control": "max-age=300"}))
+        with patch.object(http_engine, "fetch", new=origin):
+            await page_cache.fetch("https://example.com/")
+        assert page_cache._local_meta == {}
+
+
+class TestDerivedAndRendered:
+    async def test_derived_round_trip(self):
+        assert await page_cache.get_derived("abc", "v") is None
+        await page_cache.put_derived("abc", "v", {"markdown": "# hi"})
+        assert await page_cache.get_derived("abc", "v") == {"markdown": "# hi"}
+        assert await page_cache.get_derived("abc", "other") is None
+
+    async def test_rendered_within_max_age(self):
+        await page_cache.put_rendered("https://example.com/", "v", {"markdown": "# hi"}, {})
+        assert await page_cache.get_rendered("https://example.com/", "v", max_age=60) == {
+            "markdown": "# hi", "cache": "hit",
+        }
+
+    async def test_rescrape_replaces_rendered_entry(self):
+        await page_cache.put_rendered("https://example.com/", "v", {"markdown": "OLD"}, {})
+        await page_cache.put_rendered("https://example.com/", "v", {"markdown": "NEW"}, {})
+        assert await page_cache.get_rendered("https://example.com/", "v", max_age=60) == {
+            "markdown": "NEW", "cache": "hit",
+        }
+
+    async def test_rendered_revalidated_when_old(self):
+        await page_cache.put_rendered("https://example.com/", "v", {"markdown": "# hi"}, {"ETag": '"v1"'})
+        origin = AsyncMock(return_value=_response(status=304, text=""))
+        with patch.object(http_engine, "fetch", new=origin):
+            result = await page_cache.get_rendered("https://example.com/", "v", max_age=0)
+        assert result["cache"] == "revalidated"
+        assert origin.await_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    async def test_rendered_without_validators_expires(self):
+        await page_cache.put_rendered("https://example.com/", "v", {"markdown": "# hi"}, {})
+        assert await page_cache.get_rendered("https://example.com/", "v", max_age=-1) is None
+
+    async def test_prune_and_stats(self, _cache_dir):
+        await page_cache.put_derived("abc", "v", {"markdown": "# hi"})
+        stats = await page_cache.stats()
+        assert stats["disk_files"] == 1
+        assert set(stats["layers"]) == {"page", "derived", "rendered"}
+
+        with patch.object(settings, "CRAWL_CACHE_RETENTION_DAYS", -1):
+            assert (await page_cache.prune())["removed"] == 1
@@ -0,0 +1,148 @@
+"""
+Tests for the pooled HTTP crawler engine (app.modules.web_crawler.http_engine).
+
+Requests are served by httpx.MockTransport; no network access is needed.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import settings
+from app.modules.web_crawler import http_engine
+
+
+@pytest.fixture
+def mock_client():
+    """Install a shared client backed by a handler set per test."""
+    state = {"handler": lambda request: httpx.Response(200, html="<h1>ok</h1>")}
+
+    async def handler(request):
+        result = state["handler"](request)
+        return await result if asyncio.iscoroutine(result) else result
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    with patch.object(http_engine, "_client", client), patch.object(settings, "CRAWL_CACHE_ENABLED", False):
+        http_engine._host_slots.clear()
+        yield state
+    http_engine._host_slots.clear()
+
+
+class TestFetch:
+    async def test_success(self, mock_client):
+        result = await http_engine.fetch("https://example.com/a")
+        assert result.ok and result.is_html
+        assert result.status_code == 200
+        assert result.content_type == "text/html"
+        assert result.text == "<h1>ok</h1>"
+        assert result.final_url == "https://example.com/a"
+
+    async def test_http_error_status_is_returned(self, mock_client):
+        mock_client["handler"] = lambda request: httpx.Response(503, text="busy")
+        result = await http_engine.fetch("https://example.com/a")
+        assert not result.ok
+        assert result.error == "HTTP 503"
+
+    async def test_transport_error_is_returned(self, mock_client):
+        def fail(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        mock_client["handler"] = fail
+        result = await http_engine.fetch("https://down.example.com")
+        assert result.status_code is None
+        assert "ConnectError" in result.error
+
+    async def test_body_capped(self, mock_client):
+        mock_client["handler"] = lambda request: httpx.Response(200, content=b"x" * 5000)
+        with patch.object(settings, "CRAWLER_HTTP_MAX_BYTES", 1000):
+            result = await http_engine.fetch("https://example.com/big")
+        assert len(result.text) == 1000
+
+    async def test_per_host_limit(self, mock_client):
+        active = {"now": 0, "peak": 0}
+
+        async def slow(request):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return httpx.Response(200, text="ok")
+
+        mock_client["handler"] = slow
+        with patch.object(settings, "CRAWLER_HTTP_MAX_PER_HOST", 2):
+            await asyncio.gather(*(http_engine.fetch(f"https://one.example.com/{i}") for i in range(8)))
+        assert active["peak"] == 2
+
+
+class TestFetchMany:
+    async def test_yields_every_url(self, mock_client):
+        urls = [f"https://site{i % 3}.example.com/{i}" for i in range(20)]
+        results = [r async for r in http_engine.fetch_many(urls, concurrency=5)]
+        assert sorted(r.url for r in results) == sorted(urls)
+        assert all(r.ok for r in results)
+
+    async def test_completion_order(self, mock_client):
+        async def handler(request):
+            await asyncio.sleep(0.05 if request.url.path == "/slow" else 0)
+            return httpx.Response(200, text="ok")
+
+        mock_client["handler"] = handler
+        results = [r.url async for r in http_engine.fetch_many(
+            ["https://a.example.com/slow", "https://b.example.com/fast"], concurrency=2,
+        )]
+        assert results == ["https://b.example.com/fast", "https://a.example.com/slow"]
+
+    async def test_empty(self, mock_client):
+        assert [r async for r in http_engine.fetch_many([])] == []
+
+
+class TestDNSCache:
+    async def test_resolves_once_per_ttl(self):
+        backend = http_engine._CachingDNSBackend(ttl=60)
+        infos = [(None, None, None, "", ("93.184.216.34", 443))]
+        with patch.object(asyncio.get_running_loop(), "getaddrinfo", new=AsyncMock(return_value=infos)) as resolve, \
+             patch.object(backend._backend, "connect_tcp", new=AsyncMock(return_value=MagicMock())) as connect:
+            await backend.connect_tcp("example.com", 443)
+            await backend.connect_tcp("example.com", 443)
+
+        assert resolve.await_count == 1
+        assert connect.await_args.args[:2] == ("93.184.216.34", 443)
+
+    async def test_failed_connect_evicts_entry(self):
+        import httpcore
+
+        backend = http_engine._CachingDNSBackend(ttl=60)
+        infos = [(None, None, None, "", ("10.0.0.1", 80))]
+        with patch.object(asyncio.get_running_loop(), "getaddrinfo", new=AsyncMock(return_value=infos)), \
+             patch.object(backend._backend, "connect_tcp", new=AsyncMock(side_effect=httpcore.ConnectError("x"))):
+            with pytest.raises(httpcore.ConnectError):
+                await backend.connect_tcp("example.com", 80)
+        assert ("example.com", 80) not in backend._cache
+
+
+class TestCrawl:
+    async def test_non_html_is_not_processed(self, mock_client):
+        mock_client["handler"] = lambda request: httpx.Response(
+            200, content=b"%PDF", headers={"content-type": "application/pdf"},
+        )
+        with patch.object(http_engine, "get_processor", new=AsyncMock()) as processor:
+            fetched, result = await http_engine.crawl("https://example.com/file.pdf", run_config=MagicMock())
+        assert result is None
+        assert fetched.content_type == "application/pdf"
+        processor.assert_not_awaited()
+
+    async def test_html_goes_through_processor(self, mock_client):
+        processed = MagicMock(success=True)
+        processor = MagicMock(aprocess_html=AsyncMock(return_value=processed))
+        with patch.object(http_engine, "get_processor", new=AsyncMock(return_value=processor)):
+            fetched, result = await http_engine.crawl("https://example.com/", run_config="cfg")
+        assert result is processed
+        kwargs = processor.aprocess_html.await_args.kwargs
+        assert kwargs["html"] == "<h1>ok</h1>"
+        assert kwargs["config"] == "cfg"
+
+    def test_cookie_header(self):
+        assert http_engine.cookie_header({"a": "1", "b": "2"}) == {"Cookie": "a=1; b=2"}
+        assert http_engine.cookie_header(None) == {}
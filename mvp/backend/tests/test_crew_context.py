@@ -0,0 +1,87 @@
+"""
+Tests for the shared context of sequential crew runs
+(app.modules.multi_agent_crew.context).
+"""
+
+from app.ai_assistant.long_text import estimate_tokens
+from app.modules.multi_agent_crew.context import CrewContext, agent_prompt, split_notes
+
+
+def _agent(i):
+    return {"id": f"a{i}", "name": f"Agent {i}", "role": "analyst"}
+
+
+class TestNotes:
+    def test_split_notes(self):
+        body, facts, decisions = split_notes(
+            "The analysis.\n\n**FACTS:**\n- Churn is 4%\n* Pricing page converts 2%\n"
+            "DECISIONS:\n1. Launch in March\nnot a bullet\n"
+        )
+        assert body == "The analysis."
+        assert facts == ["Churn is 4%", "Pricing page converts 2%"]
+        assert decisions == ["Launch in March"]
+
+    def test_output_without_notes_contributes_its_first_sentences(self):
+        ctx = CrewContext(budget_tokens=500, scratchpad_tokens=100)
+        body = ctx.record(_agent(1), "Revenue grew. Costs fell! Everything else is detail.")
+        assert body == "Revenue grew. Costs fell! Everything else is detail."
+        assert ctx.notes == [("fact", "A1", "Revenue grew. Costs fell!")]
+
+
+class TestRender:
+    def test_first_agent(self):
+        assert CrewContext(budget_tokens=500, scratchpad_tokens=100).render() == "(You are the first agent)"
+
+    def test_stays_within_budget_and_keeps_newest_notes(self):
+        ctx = CrewContext(budget_tokens=400, scratchpad_tokens=60)
+        for i in range(1, 11):
+            ctx.record(_agent(i), "word " * 2000 + f"\nFACTS:\n- fact number {i}\nDECISIONS:\n- decision {i}")
+
+        rendered = ctx.render()
+        assert estimate_tokens(rendered) <= 400 + 20
+        assert "[A10] decision 10" in rendered and "[A10] fact number 10" in rendered
+        assert "fact number 1\n" not in rendered
+        assert "- A1: Agent 1 (analyst)" in rendered
+        assert "Previous output [A10] from Agent 10" in rendered
+        assert rendered.endswith("[...]")
+        assert "FACTS:" not in rendered
+
+    def test_prompt_keeps_the_task(self):
+        ctx = CrewContext(budget_tokens=300, scratchpad_tokens=50)
+        ctx.record(_agent(1), "First output.")
+        prompt = agent_prompt(_agent(2), "Ship it", "Original instruction", ctx.render())
+        assert "Original instruction" in prompt
+        assert "First output." in prompt
+
+
+class TestRead:
+    def test_read_request(self):
+        ctx = CrewContext(budget_tokens=300, scratchpad_tokens=50)
+        for i in range(1, 4):
+            ctx.record(_agent(i), f"Output {i}. " * 200)
+
+        assert ctx.read_request("READ: A1, a3, A1, A9") == ["A1", "A3"]
+        assert ctx.read_request("Here is my analysis.\nREAD: A1 is mentioned\nmore\ntext") == []
+        assert ctx.read_request("Output without a request") == []
+
+        text = ctx.read(["A1", "A3"])
+        assert "[A1] Agent 1 (analyst):\nOutput 1." in text
+        assert "[A3] Agent 3 (analyst):\nOutput 3." in text
+        assert estimate_tokens(text) <= 300 + 30
+
+    def test_artifacts_are_clipped_to_their_share(self):
+        ctx = CrewContext(budget_tokens=300, scratchpad_tokens=50)
+        for i in range(1, 3):
+            ctx.record(_agent(i), f"Output {i}. " * 200)
+
+        assert ctx.read(["A1"]).count("Output 1.") > ctx.read(["A1", "A2"]).count("Output 1.")
+        assert ctx.read(["A1", "A2"]).count("[...]") == 2
+
+    def test_final_prompt_does_not_offer_read(self):
+        ctx = CrewContext(budget_tokens=300, scratchpad_tokens=50)
+        ctx.record(_agent(1), "First output.")
+
+        assert "READ:" in ctx.prompt(_agent(2), "Ship it", "Task")
+        final = ctx.prompt(_agent(2), "Ship it", "Task", reads=False)
+        assert "READ" not in final
+        assert "First output." in final and "FACTS:" in final
@@ -0,0 +1,239 @@
+"""
+Tests for the frontier crawl engine (app.modules.web_crawler.frontier).
+
+URL normalization, SimHash, politeness and the per-batch bookkeeping are
+tested without a database; sessions and fetches are mocked.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import settings
+from app.models.crawl_frontier import CrawlJob, FrontierURLStatus
+from app.modules.web_crawler import frontier, http_engine
+
+
+class TestNormalizeUrl:
+    @pytest.mark.parametrize("raw, expected", [
+        ("HTTP://Example.COM:80/a/./b/../c?b=2&a=1#frag", "http://example.com/a/c?a=1&b=2"),
+        ("https://example.com:443", "https://example.com/"),
+        ("https://example.com:8443/x", "https://example.com:8443/x"),
+        ("https://user:pw@example.com/x", "https://example.com/x"),
+        ("https://example.com/x?utm_source=news&id=3&fbclid=abc", "https://example.com/x?id=3"),
+        ("https://example.com/%7euser/%2f", "https://example.com/~user/%2F"),
+        ("https://bücher.example/", "https://xn--bcher-kva.example/"),
+        ("https://example.com/a/b/..", "https://example.com/a/"),
+    ])
+    def test_canonical_form(self, raw, expected):
+        assert frontier.normalize_url(raw) == expected
+
+    def test_relative_links_resolved(self):
+        assert frontier.normalize_url("../about", "https://example.com/blog/post/") == "https://example.com/blog/about"
+
+    @pytest.mark.parametrize("raw", ["mailto:a@b.c", "javascript:void(0)", "ftp://example.com/", "https://", "http://example.com:99999/"])
+    def test_uncrawlable(self, raw):
+        assert frontier.normalize_url(raw) is None
+
+    def test_url_hash_fits_bigint(self):
+        value = frontier.url_hash("https://example.com/")
+        assert -(2 ** 63) <= value < 2 ** 63
+        assert value == frontier.url_hash("https://example.com/")
+
+
+class TestSimHash:
+    ARTICLE = " ".join(f"word{i % 97} token{i % 31} item{i % 13}" for i in range(400))
+
+    def test_near_duplicates_are_close(self):
+        edited = self.ARTICLE.replace("word5 ", "changed ", 1) + " footer links"
+        assert frontier.hamming(frontier.simhash(self.ARTICLE), frontier.simhash(edited)) <= 3
+
+    def test_different_pages_are_far(self):
+        other = " ".join(f"alpha{i % 89} beta{i % 17}" for i in range(400))
+        assert frontier.hamming(frontier.simhash(self.ARTICLE), frontier.simhash(other)) > 10
+
+    def test_signed_64_bit(self):
+        value = frontier.simhash(self.ARTICLE)
+        assert -(2 ** 63) <= value < 2 ** 63
+
+    def test_index_finds_within_distance(self):
+        index = frontier.SimHashIndex(max_distance=3)
+        base = 0x0123_4567_89AB_CDEF
+        index.add(base)
+        assert index.find(base ^ 0b101) == base
+        assert index.find(base ^ 0b1111) is None
+        assert index.find(~base) is None
+
+
+class TestTokenBucket:
+    async def test_burst_then_rate(self):
+        bucket = frontier.TokenBucket(rate=50.0, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        # two immediate, two more at 50/s
+        assert 0.03 <= time.monotonic() - start < 0.2
+
+
+def _fetched(status, text=""):
+    return http_engine.FetchResult(
+        url="https://example.com/robots.txt", final_url="https://example.com/robots.txt",
+        status_code=status, content_type="text/plain", text=text, headers={},
+        error=f"HTTP {status}" if status and status >= 400 else None,
+    )
+
+
+class TestRobotsCache:
+    async def test_rules_and_crawl_delay(self):
+        robots = "User-agent: *\nDisallow: /private\nCrawl-delay: 2\n"
+        fetch = AsyncMock(return_value=_fetched(200, robots))
+        with patch.object(frontier.page_cache, "fetch", new=fetch):
+            cache = frontier.RobotsCache()
+            assert await cache.allowed("https://example.com/public") is True
+            assert await cache.allowed("https://example.com/private/x") is False
+            assert await cache.crawl_delay("https://example.com/") == 2.0
+        assert fetch.await_count == 1
+
+    @pytest.mark.parametrize("status, allowed", [(404, True), (503, False), (None, False)])
+    async def test_unavailable_robots(self, status, allowed):
+        with patch.object(frontier.page_cache, "fetch", new=AsyncMock(return_value=_fetched(status))):
+            assert await frontier.RobotsCache().allowed("https://example.com/x") is allowed
+
+
+def _run(**config):
+    import json
+
+    job = CrawlJob(
+        id=uuid4(), user_id=uuid4(), seed_url="https://example.com/",
+        max_pages=100, max_depth=2, config_json=json.dumps(config),
+    )
+    return frontier._FrontierRun(job)
+
+
+class TestDiscover:
+    def test_scope_dedup_and_assets(self):
+        run = _run()
+        rows = run.discover("https://example.com/docs/", [
+            "intro", "/intro#top", "https://other.com/", "https://blog.example.com/",
+            "/logo.png", "mailto:x@y.z", "https://example.com/intro?utm_medium=x",
+        ], depth=1)
+        assert [r["url"] for r in rows] == ["https://example.com/docs/intro", "https://example.com/intro"]
+        assert run.discover("https://example.com/", ["/intro"], depth=1) == []
+
+    def test_subdomains_and_depth_limit(self):
+        run = _run(include_subdomains=True)
+        assert [r["url"] for r in run.discover("https://example.com/", ["https://blog.example.com/"], 1)] == [
+            "https://blog.example.com/",
+        ]
+        assert run.discover("https://example.com/", ["/deep"], depth=3) == []
+
+    def test_keyword_priority(self):
+        run = _run(keywords=["pricing"])
+        rows = run.discover("https://example.com/", ["/pricing", "/about"], depth=1)
+        assert {r["url"].rsplit("/", 1)[-1]: r["priority"] for r in rows} == {"pricing": 0.0, "about": -1.0}
+
+
+@pytest.fixture
+def db_session():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def context():
+        yield session
+
+    with patch("app.database.get_session_context", new=context), \
+         patch("app.modules.billing.service.BillingService.consume_quota", new=AsyncMock()) as consume:
+        session.consume_quota = consume
+        yield session
+
+
+class TestRunBatch:
+    async def test_outcomes_recorded(self, db_session):
+        run = _run(index_to_kb=True)
+        text = " ".join(f"term{i % 50} body{i % 7}" for i in range(300))
+        outcomes = {
+            "https://example.com/a": {"status": FrontierURLStatus.DONE, "base": "https://example.com/a",
+                                      "title": "A", "content": text, "links": ["/c"]},
+            "https://example.com/b": {"status": FrontierURLStatus.DONE, "base": "https://example.com/b",
+                                      "title": "B", "content": text + " extra", "links": ["/c", "/d"]},
+            "https://example.com/x": {"status": FrontierURLStatus.SKIPPED, "error": "disallowed by robots.txt"},
+        }
+        pages = [{"id": i, "url": url, "host": "example.com", "depth": 0, "attempts": 1}
+                 for i, url in enumerate(outcomes)]
+        pages.append({"id": 9, "url": "https://example.com/boom", "host": "example.com", "depth": 0, "attempts": 1})
+
+        async def fake_fetch(page):
+            if page["url"].endswith("boom"):
+                raise RuntimeError("timeout")
+            return outcomes[page["url"]]
+
+        upload = AsyncMock(return_value=[MagicMock(total_chunks=4)])
+        with patch.object(run, "fetch", new=fake_fetch), \
+             patch("app.modules.knowledge.service.KnowledgeService.upload_documents", new=upload), \
+             patch.object(frontier, "_enqueue", new=AsyncMock()) as enqueue:
+            result = await run.run_batch(pages)
+
+        assert result == {"fetched": 2, "discovered": 2, "indexed": 1}
+        assert len(upload.await_args.args[1]) == 1
+        assert [r["url"] for r in enqueue.await_args.args[1]] == ["https://example.com/c", "https://example.com/d"]
+        row_updates = db_session.execute.await_args_list[0].args[1]
+        assert [u["status"] for u in row_updates] == [
+            FrontierURLStatus.DONE, FrontierURLStatus.DUPLICATE, FrontierURLStatus.SKIPPED, FrontierURLStatus.PENDING,
+        ]
+        db_session.consume_quota.assert_awaited_once()
+        assert run.crawled == 2
+
+    async def test_failure_after_max_attempts(self, db_session):
+        run = _run(index_to_kb=False)
+        page = {"id": 1, "url": "https://example.com/a", "host": "example.com", "depth": 0,
+                "attempts": settings.FRONTIER_MAX_ATTEMPTS}
+        failed = {"status": FrontierURLStatus.FAILED, "error": "HTTP 500"}
+        with patch.object(run, "fetch", new=AsyncMock(return_value=failed)), \
+             patch.object(frontier, "_enqueue", new=AsyncMock()):
+            assert (await run.run_batch([page]))["fetched"] == 0
+        assert db_session.execute.await_args_list[0].args[1][0]["status"] == FrontierURLStatus.FAILED
+        db_session.consume_quota.assert_not_awaited()
+
+
+class TestFetch:
+    async def test_robots_disallowed_skips_fetch(self):
+        run = _run()
+        scrape = AsyncMock()
+        with patch.object(run.robots, "allowed", new=AsyncMock(return_value=False)), \
+             patch("app.modules.web_crawler.service.WebCrawlerService.scrape_http", new=scrape):
+            outcome = await run.fetch({"url": "https://example.com/private"})
+        assert outcome["status"] == FrontierURLStatus.SKIPPED
+        scrape.assert_not_awaited()
+
+    async def test_render_fallback(self):
+        run = _run(render_fallback=True)
+        rendered = {"success": True, "markdown": "# hi", "links_internal": ["/next"], "title": "Hi"}
+        with patch.object(run.robots, "allowed", new=AsyncMock(return_value=True)), \
+             patch.object(run.robots, "crawl_delay", new=AsyncMock(return_value=None)), \
+             patch("app.modules.web_crawler.service.WebCrawlerService.scrape_http",
+                   new=AsyncMock(return_value={"success": False, "status_code": 200, "error": "empty"})), \
+             patch("app.modules.web_crawler.service.WebCrawlerService.scrape",
+                   new=AsyncMock(return_value=rendered)):
+            outcome = await run.fetch({"url": "https://example.com/app"})
+        assert outcome["status"] == FrontierURLStatus.DONE
+        assert outcome["links"] == ["/next"]
+
+    async def test_crawl_delay_slows_bucket(self):
+        run = _run()
+        with patch.object(run.robots, "crawl_delay", new=AsyncMock(return_value=4.0)):
+            bucket = await run._bucket("https://example.com/a")
+        assert bucket.rate == 0.25
+        assert bucket.capacity == 1
+
+
+class TestRunJob:
+    async def test_job_owned_elsewhere_is_left_alone(self, db_session):
+        with patch.object(frontier, "_lease", new=AsyncMock(return_value=None)):
+            result = await frontier.run_job(uuid4())
+        assert result["status"] == "not_leased"
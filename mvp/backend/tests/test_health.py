@@ -5,6 +5,7 @@ Endpoints tested:
   - GET /health/live   (liveness probe)
   - GET /health/ready  (readiness probe)
   - GET /health/startup (startup probe)
+  - GET /health/startup/profile (import profile, non-production only)
 """
 
 import pytest
@@ -104,3 +105,41 @@ async def test_startup_probe_not_ready():
             assert resp.json()["status"] == "starting"
     finally:
         health_mod._startup_complete = original
+
+
+# --------------------------------------------------------------------------
+# Startup import profile
+# --------------------------------------------------------------------------
+
+def _health_client():
+    from starlette.testclient import TestClient
+    from fastapi import FastAPI
+
+    import app.api.health as health_mod
+
+    mini_app = FastAPI()
+    mini_app.include_router(health_mod.router)
+    return TestClient(mini_app)
+
+
+async def test_startup_profile():
+    """GET /health/startup/profile reports per-module imports and optional deps."""
+    from app.config import settings
+
+    with patch.object(settings, "ENVIRONMENT", "development"), _health_client() as tc:
+        resp = tc.get("/health/startup/profile")
+    assert resp.status_code == 200
+
+    body = resp.json()
+    assert "total_import_ms" in body["imports"]
+    assert isinstance(body["imports"]["modules"], list)
+    assert isinstance(body["optional_dependencies"], dict)
+
+
+async def test_startup_profile_hidden_in_production():
+    """GET /health/startup/profile is a 404 in production."""
+    from app.config import settings
+
+    with patch.object(settings, "ENVIRONMENT", "production"), _health_client() as tc:
+        resp = tc.get("/health/startup/profile")
+    assert resp.status_code == 404
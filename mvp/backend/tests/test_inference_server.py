@@ -0,0 +1,142 @@
+"""
+Tests for the local inference server and its client (app.inference).
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+from unittest.mock import patch
+
+from app.config import settings
+from app.inference import client
+from app.inference.models import ModelSpec
+from app.inference.server import InferenceServer
+
+
+def _upper_spec(calls: list):
+    def run(inputs, options):
+        calls.append((list(inputs), dict(options)))
+        suffix = options.get("suffix", "")
+        return [text.upper() + suffix for text in inputs]
+
+    return ModelSpec(load=lambda: None, run=run)
+
+
+def _failing_spec():
+    def run(inputs, options):
+        raise RuntimeError("model exploded")
+
+    return ModelSpec(load=lambda: None, run=run)
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are limited to ~100 chars, pytest's tmp_path can be longer
+    directory = tempfile.mkdtemp(prefix="inf")
+    yield os.path.join(directory, "inference.sock")
+
+
+@pytest.fixture(autouse=True)
+def _reset_client():
+    client._disabled = False
+    client._unreachable_until = 0.0
+    yield
+    client._disabled = False
+    client._unreachable_until = 0.0
+
+
+async def _start(socket_path, models, max_batch=8, max_wait_ms=50):
+    server = InferenceServer(socket_path, models, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    await server.start(preload=list(models))
+    return server
+
+
+class TestClientFallback:
+    async def test_no_socket_configured_returns_none(self):
+        with patch.object(settings, "INFERENCE_SOCKET_PATH", ""):
+            assert await client.infer("embedding", ["x"]) is None
+            assert client.infer_sync("embedding", ["x"]) is None
+            assert client.enabled() is False
+
+    async def test_unreachable_server_backs_off(self, socket_path):
+        with patch.object(settings, "INFERENCE_SOCKET_PATH", socket_path):
+            assert client.enabled() is True
+            assert await client.infer("embedding", ["x"]) is None
+            # Marked unreachable: later calls skip the connect attempt
+            assert client.enabled() is False
+
+    async def test_disabled_in_server_process(self, socket_path):
+        client.disable()
+        with patch.object(settings, "INFERENCE_SOCKET_PATH", socket_path):
+            assert client.enabled() is False
+
+
+class TestInferenceServer:
+    async def test_async_round_trip(self, socket_path):
+        calls = []
+        server = await _start(socket_path, {"upper": _upper_spec(calls)})
+        try:
+            with patch.object(settings, "INFERENCE_SOCKET_PATH", socket_path):
+                assert await client.infer("upper", ["a", "b"]) == ["A", "B"]
+        finally:
+            await server.stop()
+        assert not os.path.exists(socket_path)
+
+    async def test_sync_round_trip(self, socket_path):
+        server = await _start(socket_path, {"upper": _upper_spec([])})
+        try:
+            with patch.object(settings, "INFERENCE_SOCKET_PATH", socket_path):
+                result = await asyncio.to_thread(client.infer_sync, "upper", ["a"], {"suffix": "!"})
+            assert result == ["A!"]
+        finally:
+            await server.stop()
+
+    async def test_concurrent_callers_share_a_batch(self, socket_path):
+        calls = []
+        server = await _start(socket_path, {"upper": _upper_spec(calls)}, max_batch=16, max_wait_ms=100)
+        try:
+            with patch.object(settings, "INFERENCE_SOCKET_PATH", socket_path):
+                results = await asyncio.gather(*(client.infer("upper", [f"t{i}"]) for i in range(6)))
+        finally:
+            await server.stop()
+
+        assert results == [[f"T{i}"] for i in range(6)]
+        assert len(calls) < 6
+        assert sum(len(inputs) for inputs, _ in calls) == 6
+
+    async def test_batches_split_by_options_and_max_batch(self, socket_path):
+        calls = []
+        server = await _start(socket_path, {"upper": _upper_spec(calls)}, max_batch=2, max_wait_ms=50)
+        try:
+            with patch.object(settings, "INFERENCE_SOCKET_PATH", socket_path):
+                plain, marked = await asyncio.gather(
+                    client.infer("upper", ["a", "b", "c"]),
+                    client.infer("upper", ["d"], {"suffix": "?"}),
+                )
+        finally:
+            await server.stop()
+
+        assert plain == ["A", "B", "C"]
+        assert marked == ["D?"]
+        assert all(len(inputs) <= 2 for inputs, _ in calls)
+        assert [inputs for inputs, options in calls if options.get("suffix")] == [["d"]]
+
+    async def test_model_error_returns_none(self, socket_path):
+        server = await _start(socket_path, {"broken": _failing_spec()})
+        try:
+            with patch.object(settings, "INFERENCE_SOCKET_PATH", socket_path):
+                assert await client.infer("broken", ["a"]) is None
+                assert await client.infer("missing", ["a"]) is None
+                # Server errors do not mark it unreachable
+                assert client.enabled() is True
+        finally:
+            await server.stop()
+
+    async def test_stats(self, socket_path):
+        server = await _start(socket_path, {"upper": _upper_spec([])})
+        try:
+            assert server.stats()["upper"] == {"loaded": True, "queue_depth": 0, "max_batch": 8}
+        finally:
+            await server.stop()
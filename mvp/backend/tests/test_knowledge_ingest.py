@@ -0,0 +1,143 @@
+"""
+Tests for bulk knowledge ingestion (app.modules.knowledge.ingest).
+
+All tests run without external services: the session is an AsyncMock and
+statements are inspected instead of executed.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Delete, Insert, Update
+
+from app.models.knowledge import DocumentStatus
+from app.modules.knowledge import embedding_service, ingest
+
+
+def _session():
+    session = AsyncMock()
+    session.add = MagicMock()
+    return session
+
+
+def _inserts(session) -> list:
+    return [c.args[0] for c in session.execute.call_args_list if isinstance(c.args[0], Insert)]
+
+
+def _documents(count: int, paragraphs: int = 3) -> list[dict]:
+    return [
+        {
+            "filename": f"doc{n}.txt",
+            "content_type": "text/plain",
+            "text": "\n\n".join(f"paragraph {p} of document {n} " + "x" * 450 for p in range(paragraphs)),
+        }
+        for n in range(count)
+    ]
+
+
+class TestVectorLiteral:
+    def test_formats_pgvector_text(self):
+        assert ingest.vector_literal([0.5, -1, 2.25]) == "[0.5,-1.0,2.25]"
+
+    def test_none(self):
+        assert ingest.vector_literal(None) is None
+
+
+class TestIngestDocuments:
+    async def test_chunks_written_with_one_insert_per_batch(self):
+        session = _session()
+        with patch.object(embedding_service, "is_available", return_value=False), \
+             patch.object(ingest, "EMBED_BATCH_SIZE", 4):
+            records = await ingest.ingest_documents(uuid4(), _documents(3), session)
+
+        assert [r.status for r in records] == [DocumentStatus.INDEXED] * 3
+        assert [r.total_chunks for r in records] == [3, 3, 3]
+        inserts = _inserts(session)
+        # 9 chunks in batches of 4 -> 3 multi-row statements
+        assert len(inserts) == 3
+        compiled = inserts[0].compile(dialect=postgresql.dialect())
+        assert "embedding" in str(compiled)
+        assert len(compiled.params) == 4 * 8
+        assert session.add.call_count >= 3
+
+    async def test_embeddings_batched_off_loop_and_stored(self):
+        session = _session()
+        calls = []
+
+        def fake_embed(texts):
+            calls.append(len(texts))
+            return [[0.25, 0.5] for _ in texts]
+
+        with patch.object(embedding_service, "is_available", return_value=True), \
+             patch.object(embedding_service, "embed_texts", side_effect=fake_embed), \
+             patch.object(ingest, "EMBED_BATCH_SIZE", 5):
+            records = await ingest.ingest_documents(uuid4(), _documents(2, paragraphs=4), session)
+
+        assert calls == [5, 3]
+        assert all(r.embedding_model == embedding_service.get_model_name() for r in records)
+        params = _inserts(session)[0].compile(dialect=postgresql.dialect()).params
+        assert [v for k, v in params.items() if k.startswith("embedding")][0] == "[0.25,0.5]"
+
+    async def test_progress_reported_per_batch(self):
+        session = _session()
+        events = []
+        with patch.object(embedding_service, "is_available", return_value=False), \
+             patch.object(ingest, "EMBED_BATCH_SIZE", 2):
+            await ingest.ingest_documents(uuid4(), _documents(1, paragraphs=5), session, progress=events.append)
+
+        assert [e["chunks_done"] for e in events if e["stage"] == "chunks"] == [2, 4, 5]
+        assert events[-1] == {"stage": "done", "chunks_done": 5, "chunks_total": 5, "documents": 1}
+
+    async def test_async_progress_callback(self):
+        session = _session()
+        progress = AsyncMock()
+        with patch.object(embedding_service, "is_available", return_value=False):
+            await ingest.ingest_documents(uuid4(), _documents(1), session, progress=progress)
+        assert progress.await_count == 2
+
+    async def test_failure_removes_chunks_and_marks_failed(self):
+        session = _session()
+
+        async def execute(statement, *args, **kwargs):
+            if isinstance(statement, Insert):
+                raise RuntimeError("disk full")
+            return MagicMock()
+
+        session.execute = AsyncMock(side_effect=execute)
+        events = []
+        with patch.object(embedding_service, "is_available", return_value=False):
+            await ingest.ingest_documents(uuid4(), _documents(2), session, progress=events.append)
+
+        session.rollback.assert_awaited()
+        statements = [c.args[0] for c in session.execute.call_args_list]
+        assert any(isinstance(s, Delete) for s in statements)
+        update = next(s for s in statements if isinstance(s, Update))
+        assert update.compile(dialect=postgresql.dialect()).params["status"] == DocumentStatus.FAILED
+        assert events[-1]["stage"] == "failed"
+
+
+class TestKnowledgeServiceDelegation:
+    async def test_index_text_content_uses_bulk_path(self):
+        from app.modules.knowledge.service import KnowledgeService
+
+        doc = MagicMock(id=uuid4(), total_chunks=7)
+        with patch("app.modules.knowledge.ingest.ingest_documents", new=AsyncMock(return_value=[doc])) as bulk:
+            result = await KnowledgeService.index_text_content(uuid4(), "page.md", "hello", session=_session())
+
+        assert result == {"document_id": str(doc.id), "total_chunks": 7}
+        assert bulk.await_args.args[1][0]["text"] == "hello"
+
+    async def test_index_text_content_raises_when_ingest_fails(self):
+        from app.modules.knowledge.service import KnowledgeService
+
+        doc = MagicMock(id=uuid4(), total_chunks=0, status=DocumentStatus.FAILED, error="embedding down")
+        with patch("app.modules.knowledge.ingest.ingest_documents", new=AsyncMock(return_value=[doc])):
+            with pytest.raises(RuntimeError, match="embedding down"):
+                await KnowledgeService.index_text_content(uuid4(), "page.md", "hello", session=_session())
+
+    async def test_index_text_content_skips_empty(self):
+        from app.modules.knowledge.service import KnowledgeService
+
+        assert await KnowledgeService.index_text_content(uuid4(), "page.md", "   ", session=_session()) is None
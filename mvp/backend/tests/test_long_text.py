@@ -0,0 +1,144 @@
+"""
+Tests for long-text map-reduce (app.ai_assistant.long_text).
+
+The provider call and the Redis cache are patched out.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.ai_assistant import long_text
+from app.ai_assistant.long_text import map_prompts, map_reduce, split_text
+from app.config import settings
+
+
+class FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl_seconds=300):
+        self.data[key] = value
+
+
+@pytest.fixture
+def cache():
+    fake = FakeCache()
+    with patch.object(long_text, "cache_get", new=fake.get), \
+         patch.object(long_text, "cache_set", new=fake.set):
+        yield fake
+
+
+def _provider(reply=lambda prompt: f"notes[{len(prompt)}]", delay=0.0):
+    """A fake process_text_with_provider recording prompts and peak concurrency."""
+    state = {"prompts": [], "active": 0, "peak": 0}
+
+    async def call(text, **kwargs):
+        state["prompts"].append(text)
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(delay)
+        state["active"] -= 1
+        return {"processed_text": reply(text), "provider": kwargs["provider_name"], "model": "m"}
+
+    patcher = patch(
+        "app.ai_assistant.service.AIAssistantService.process_text_with_provider", side_effect=call,
+    )
+    return patcher, state
+
+
+class TestSplitText:
+    def test_chunks_are_contiguous_and_within_budget(self):
+        text = "".join(f"Sentence number {i} ends here. " for i in range(400))
+        chunks = split_text(text, max_tokens=100)
+        assert "".join(chunks) == text
+        assert len(chunks) > 1
+        assert all(len(c) <= 400 for c in chunks)
+
+    def test_prefers_paragraph_then_sentence_boundaries(self):
+        paragraph = "Alpha beta gamma. " * 10
+        chunks = split_text(f"{paragraph}\n\n{paragraph}\n\n{paragraph}", max_tokens=100)
+        assert all(c.endswith("\n\n") for c in chunks[:-1])
+
+        chunks = split_text("One two three. Four five six. " * 30, max_tokens=50)
+        assert all(c.endswith(". ") for c in chunks[:-1])
+
+    def test_hard_cut_without_whitespace(self):
+        assert split_text("x" * 1000, max_tokens=100) == ["x" * 400, "x" * 400, "x" * 200]
+
+    def test_short_and_empty_text_is_one_chunk(self):
+        assert split_text("short") == ["short"]
+        assert split_text("") == [""]
+
+
+class TestMapReduce:
+    async def test_short_text_is_a_single_uncached_call(self, cache):
+        patcher, state = _provider(reply=lambda prompt: "summary")
+        with patcher:
+            result = await map_reduce("A short transcript.", "Summarize.", label="transcript")
+        assert result["processed_text"] == "summary"
+        assert result["chunks"] == 1
+        assert state["prompts"] == ["Summarize.\n\nTranscript:\nA short transcript."]
+        assert cache.data == {}
+
+    async def test_long_text_maps_chunks_concurrently_then_reduces(self, cache):
+        text = "\n\n".join(f"Paragraph {i}. " + "word " * 70 for i in range(10))
+        patcher, state = _provider(delay=0.01)
+        with patcher:
+            result = await map_reduce(text, "Summarize.", max_tokens=100)
+
+        chunks = split_text(text, 100)
+        assert result["chunks"] == len(chunks) > 1
+        assert state["peak"] > 1
+        maps = [p for p in state["prompts"] if "one part of a longer text" in p]
+        assert len(maps) == len(chunks)
+        # Every chunk is read in full, and the final call sees all notes in order
+        assert all(any(chunk in p for p in maps) for chunk in chunks)
+        final = state["prompts"][-1]
+        assert final.startswith("Summarize.")
+        assert final.endswith("\n\n".join(f"notes[{len(p)}]" for p in maps))
+
+    async def test_notes_over_budget_are_merged_hierarchically(self, cache):
+        text = "word " * 2000
+        patcher, state = _provider(reply=lambda prompt: "n" * 120)
+        with patcher:
+            await map_reduce(text, "Summarize.", max_tokens=100)
+        reduces = [p for p in state["prompts"] if p.startswith("The following are notes")]
+        assert reduces
+        assert all(long_text.estimate_tokens(p) <= 200 for p in reduces)
+
+    async def test_chunk_results_are_cached_by_content(self, cache):
+        text = "Sentence here. " * 200
+        patcher, state = _provider()
+        with patcher:
+            await map_reduce(text, "Summarize.", max_tokens=100)
+            first = len(state["prompts"])
+            await map_reduce(text, "Summarize.", max_tokens=100)
+        # Only the final, uncached call is repeated
+        assert len(state["prompts"]) == first + 1
+        assert all(key.startswith("long_text:") for key in cache.data)
+
+    async def test_failed_chunk_fails_the_run(self, cache):
+        def reply(prompt):
+            if "Sentence 3." in prompt:
+                raise ConnectionError("provider down")
+            return "ok"
+
+        text = "".join(f"Sentence {i}. " + "pad " * 90 + "\n\n" for i in range(6))
+        patcher, _ = _provider(reply=reply)
+        with patcher, pytest.raises(ConnectionError):
+            await map_reduce(text, "Summarize.", max_tokens=100)
+
+
+class TestMapPrompts:
+    async def test_parallelism_is_capped(self, cache):
+        patcher, state = _provider(delay=0.01)
+        with patcher, patch.object(settings, "AI_LONG_TEXT_MAX_PARALLEL", 3):
+            outputs = await map_prompts([f"prompt {i}" for i in range(9)], cache=False)
+        assert outputs == [f"notes[{len(f'prompt {i}')}]" for i in range(9)]
+        assert state["peak"] == 3
+        assert cache.data == {}
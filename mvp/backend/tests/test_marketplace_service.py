@@ -146,7 +146,8 @@ class TestMarketplaceService:
         await _create_listing(session, user_id, title="Published", is_published=True)
         await _create_listing(session, user_id, title="Draft", is_published=False)
 
-        listings, total = await service.list_listings()
+        page = await service.list_listings()
+        listings, total = page.items, page.total
         assert total == 1
         assert listings[0].title == "Published"
 
@@ -159,7 +160,8 @@ class TestMarketplaceService:
         await _create_listing(session, user_id, title="YouTube SEO Workflow", is_published=True)
         await _create_listing(session, user_id, title="Data Analysis Tool", is_published=True)
 
-        listings, total = await service.list_listings(search="YouTube")
+        page = await service.list_listings(search="YouTube")
+        listings, total = page.items, page.total
         assert total == 1
         assert listings[0].title == "YouTube SEO Workflow"
 
@@ -142,3 +142,24 @@ def test_disabled_module_not_registered(app):
             assert manifest["name"] not in registered_names, (
                 f"Disabled module '{manifest['name']}' should not be registered"
             )
+
+
+def test_import_profile_without_rss(monkeypatch):
+    """Where neither /proc nor ``resource`` exists (Windows), RSS is reported as None."""
+    import builtins
+    import app.modules as modules
+    from app.modules import ModuleRegistry
+
+    real_open = builtins.open
+
+    def no_proc(path, *args, **kwargs):
+        if str(path).startswith("/proc/"):
+            raise FileNotFoundError(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(modules, "resource", None)
+    monkeypatch.setattr(builtins, "open", no_proc)
+    monkeypatch.setattr(ModuleRegistry, "_import_profile", [{"name": "m", "import_ms": 1.0, "rss_delta_kb": None}])
+
+    profile = ModuleRegistry.get_import_profile()
+    assert profile["rss_kb"] is None and profile["total_rss_delta_kb"] is None
@@ -0,0 +1,66 @@
+"""
+Tests for lazy optional-dependency loading (app.core.optional_deps).
+"""
+
+import sys
+
+import pytest
+
+from app.core.optional_deps import OptionalDependency, capabilities, optional
+
+
+class TestOptionalDependency:
+    def test_available_does_not_import(self):
+        sys.modules.pop("colorsys", None)
+        dep = OptionalDependency("colorsys")
+        assert dep.available is True
+        assert "colorsys" not in sys.modules
+        assert dep.loaded is False
+
+    def test_load_imports_once(self):
+        dep = OptionalDependency("colorsys")
+        module = dep.load()
+        assert module is sys.modules["colorsys"]
+        assert dep.load() is module
+        assert dep.status()["loaded"] is True
+        assert dep.status()["import_ms"] is not None
+
+    def test_missing_package_unavailable(self):
+        dep = OptionalDependency("definitely_not_installed_pkg_xyz")
+        assert dep.available is False
+        assert not dep
+        with pytest.raises(ImportError):
+            dep.load()
+
+    def test_missing_requirement_unavailable(self):
+        dep = OptionalDependency("colorsys", "definitely_not_installed_pkg_xyz")
+        assert dep.available is False
+
+    def test_broken_import_marked_unavailable(self, monkeypatch):
+        import importlib
+
+        dep = OptionalDependency("colorsys")
+        assert dep.available is True
+
+        def _boom(name):
+            raise OSError("libfoo.so: cannot open shared object file")
+
+        monkeypatch.setattr(importlib, "import_module", _boom)
+        with pytest.raises(ImportError, match="libfoo"):
+            dep.load()
+        assert dep.available is False
+        assert "libfoo" in dep.status()["error"]
+
+    def test_proxy_resolves_on_attribute_access(self):
+        proxy = OptionalDependency("colorsys").proxy()
+        assert proxy.rgb_to_hsv(0, 0, 0) == (0.0, 0.0, 0.0)
+
+
+class TestRegistry:
+    def test_optional_returns_same_instance(self):
+        assert optional("colorsys") is optional("colorsys")
+
+    def test_capabilities_lists_declared(self):
+        optional("definitely_not_installed_pkg_xyz")
+        caps = capabilities()
+        assert caps["definitely_not_installed_pkg_xyz"]["available"] is False
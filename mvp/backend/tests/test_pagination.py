@@ -0,0 +1,149 @@
+"""
+Tests for keyset pagination (app.core.pagination) and its use by the
+transcription list.
+"""
+
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import select
+
+from app.core import pagination
+from app.core.pagination import InvalidCursor
+
+
+async def _create_jobs(session, user_id, n):
+    from app.models.transcription import Transcription
+
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    jobs = []
+    for i in range(n):
+        # Pairs of jobs share a timestamp so the id tie-breaker matters
+        job = Transcription(
+            user_id=user_id,
+            video_url=f"https://youtu.be/job{i:08d}",
+            text=f"transcript {i}",
+            created_at=base + timedelta(minutes=i // 2),
+        )
+        session.add(job)
+        jobs.append(job)
+    await session.commit()
+    return jobs
+
+
+class TestCursor:
+    def test_round_trip(self):
+        now = datetime(2026, 3, 1, 12, 30)
+        job_id = uuid4()
+        cursor = pagination.encode_cursor(["created_at", "id"], [now, job_id])
+        assert pagination.decode_cursor(cursor, ["created_at", "id"]) == [now, job_id]
+
+    def test_cursor_for_other_ordering_is_rejected(self):
+        cursor = pagination.encode_cursor(["rating", "id"], [4.5, uuid4()])
+        with pytest.raises(InvalidCursor):
+            pagination.decode_cursor(cursor, ["created_at", "id"])
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "!!"])
+    def test_garbage_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursor):
+            pagination.decode_cursor(cursor, ["created_at", "id"])
+
+
+    def test_after_is_a_row_value_comparison(self):
+        from sqlalchemy.dialects import postgresql
+
+        from app.models.transcription import Transcription
+
+        order = (Transcription.created_at, Transcription.id)
+        values = [datetime(2026, 3, 1, tzinfo=UTC), uuid4()]
+        sql = str(pagination._after(order, values, descending=True).compile(dialect=postgresql.dialect()))
+        assert sql.startswith("(transcriptions.created_at, transcriptions.id) < (")
+        assert " OR " not in sql
+        sql = str(pagination._after(order, values, descending=False).compile(dialect=postgresql.dialect()))
+        assert " > " in sql
+
+
+class TestPaginate:
+    async def test_cursor_pages_cover_listing_once(self, session, sample_user_id):
+        from app.models.transcription import Transcription
+
+        await _create_jobs(session, sample_user_id, 7)
+        stmt = select(Transcription).where(Transcription.user_id == sample_user_id)
+        order = (Transcription.created_at, Transcription.id)
+        expected = [
+            j.id for j in (await session.execute(stmt.order_by(*(c.desc() for c in order)))).scalars()
+        ]
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await pagination.paginate(
+                session, stmt, order_by=order, limit=3, cursor=cursor, count="none",
+            )
+            seen.extend(j.id for j in page.items)
+            pages += 1
+            assert page.total is None
+            if not page.has_more:
+                assert page.next_cursor is None
+                break
+            cursor = page.next_cursor
+
+        assert pages == 3
+        assert seen == expected
+
+    async def test_ascending_with_skip_and_exact_count(self, session, sample_user_id):
+        from app.models.transcription import Transcription
+
+        await _create_jobs(session, sample_user_id, 5)
+        stmt = select(Transcription).where(Transcription.user_id == sample_user_id)
+        page = await pagination.paginate(
+            session, stmt, order_by=(Transcription.created_at, Transcription.id),
+            descending=False, limit=2, skip=2,
+        )
+        assert page.total == 5
+        # Jobs 2 and 3 share a timestamp; their order depends on the ids
+        assert sorted(j.video_url[-2:] for j in page.items) == ["02", "03"]
+        assert page.has_more
+
+    async def test_estimate_falls_back_to_exact_off_postgres(self, session, sample_user_id):
+        from app.models.transcription import Transcription
+
+        await _create_jobs(session, sample_user_id, 3)
+        stmt = select(Transcription).where(Transcription.user_id == sample_user_id)
+        assert await pagination.count_rows(session, stmt, "estimate") == 3
+
+
+class TestTranscriptionList:
+    async def test_text_can_be_deferred(self, session, sample_user_id):
+        from app.modules.transcription.service import TranscriptionService
+
+        await _create_jobs(session, sample_user_id, 2)
+        session.expunge_all()
+
+        page = await TranscriptionService().list_user_jobs(sample_user_id, session, include_text=False)
+        job = page.items[0]
+        unloaded = inspect(job).unloaded
+        assert {"text", "speakers_json", "metadata_json"} <= unloaded
+        assert "text" not in pagination.loaded_fields(job)
+
+        page = await TranscriptionService().list_user_jobs(sample_user_id, session, limit=1)
+        assert page.items[0].text.startswith("transcript")
+        assert page.has_more and page.next_cursor
+
+    async def test_stale_pending_jobs_fail_in_one_update(self, session, sample_user_id):
+        from app.models.transcription import Transcription, TranscriptionStatus
+        from app.modules.transcription.service import TranscriptionService
+
+        old = datetime.now(UTC) - timedelta(hours=2)
+        session.add(Transcription(user_id=sample_user_id, video_url="https://youtu.be/stale000001", created_at=old))
+        session.add(Transcription(user_id=sample_user_id, video_url="https://youtu.be/fresh000001"))
+        await session.commit()
+        session.expunge_all()
+
+        page = await TranscriptionService().list_user_jobs(sample_user_id, session)
+        statuses = {j.video_url[-11:]: j.status for j in page.items}
+        assert statuses == {
+            "stale000001": TranscriptionStatus.FAILED,
+            "fresh000001": TranscriptionStatus.PENDING,
+        }
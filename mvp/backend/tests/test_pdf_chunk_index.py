@@ -0,0 +1,213 @@
+"""
+Tests for the PDF processor's persisted chunk index and off-loop extraction
+(app.modules.pdf_processor.chunk_index / extraction).
+
+Extraction runs on a thread pool with a fake PyMuPDF module.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.core import blob_store
+from app.modules.pdf_processor import chunk_index, extraction
+
+PAGES = [
+    {"page_number": 1, "text": "Solar panels convert sunlight into electricity.\n\nInstallation costs fell sharply."},
+    {"page_number": 2, "text": "Wind turbines generate electricity from wind.\n\nOffshore wind farms are growing."},
+    {"page_number": 3, "text": "Battery storage smooths solar and wind output.\n\nGrid operators value storage."},
+]
+TEXT = "\n\n".join(p["text"] for p in PAGES)
+
+
+class TestBuild:
+    def test_chunks_keep_their_page(self):
+        index = chunk_index.build(TEXT, PAGES)
+        assert [c["page"] for c in index["chunks"]] == [1, 2, 3]
+        assert all(c["norm"] > 0 for c in index["chunks"])
+        assert index["idf"]["electricity"] < index["idf"]["turbines"]
+
+    def test_without_pages_chunks_full_text(self):
+        index = chunk_index.build(TEXT)
+        assert index["chunks"] and all(c["page"] is None for c in index["chunks"])
+
+    def test_top_terms_skip_stopwords(self):
+        terms = chunk_index.build(TEXT, PAGES)["terms"]
+        assert "wind" in terms[:5]
+        assert "the" not in terms and "and" not in terms
+
+    def test_empty_document(self):
+        index = chunk_index.build("")
+        assert index["chunks"] == [] and chunk_index.search(index, "anything") == []
+
+
+class TestSearch:
+    def test_ranks_matching_chunk_first(self):
+        index = chunk_index.build(TEXT, PAGES)
+        results = chunk_index.search(index, "How do wind turbines work?")
+        assert results[0]["page"] == 2
+        assert chunk_index.search(index, "quantum chromodynamics") == []
+
+    def test_embeddings_are_blended_in(self):
+        index = chunk_index.build(TEXT, PAGES)
+        index["embeddings"] = [[1.0, 0.0], [0.0, 1.0], [0.0, 1.0]]
+        results = chunk_index.search(index, "storage", query_embedding=[1.0, 0.0])
+        # Sparse match is page 3, dense match page 1; both are returned
+        assert {r["page"] for r in results} == {1, 3}
+
+    def test_embeddings_of_another_model_or_dimension_are_ignored(self):
+        index = chunk_index.build(TEXT, PAGES)
+        index["embeddings"] = [[1.0, 0.0], [0.0, 1.0], [0.0, 1.0]]
+        index["embedding_model"] = "model-a"
+        sparse_only = chunk_index.search(index, "storage")
+
+        assert chunk_index.search(index, "storage", query_embedding=[1.0, 0.0], query_model="model-b") == sparse_only
+        assert chunk_index.search(index, "storage", query_embedding=[1.0, 0.0, 0.0], query_model="model-a") == sparse_only
+        assert chunk_index.search(index, "storage", query_embedding=[1.0, 0.0], query_model="model-a") != sparse_only
+
+    def test_representative_text_fits_budget_in_document_order(self):
+        index = chunk_index.build(TEXT, PAGES)
+        text = chunk_index.representative_text(index, 200)
+        assert 0 < len(text) <= 200
+        positions = [TEXT.find(part) for part in text.split("\n\n")]
+        assert positions == sorted(positions)
+
+
+class TestPersistence:
+    async def test_create_then_load(self, tmp_path):
+        pdf = tmp_path / "doc.pdf"
+        with patch.object(chunk_index, "embed") as embed:
+            await chunk_index.create(str(pdf), TEXT, PAGES)
+        embed.assert_awaited_once()
+        stored = json.loads((tmp_path / "index.json").read_text())
+        assert len(stored["chunks"]) == 3
+
+        doc = SimpleNamespace(id="x", file_path=str(pdf), text_content="changed", pages_json=None)
+        with patch.object(chunk_index, "build") as build:
+            index = await chunk_index.for_document(doc)
+        build.assert_not_called()
+        assert index["chunks"][0]["page"] == 1
+
+    async def test_missing_index_is_built_lazily(self, tmp_path):
+        doc = SimpleNamespace(
+            id="x", file_path=str(tmp_path / "doc.pdf"), text_content=TEXT, pages_json=json.dumps(PAGES),
+        )
+        with patch.object(chunk_index, "embed") as embed:
+            index = await chunk_index.for_document(doc)
+        embed.assert_not_called()
+        assert len(index["chunks"]) == 3
+        assert (tmp_path / "index.json").exists()
+
+    async def test_lazy_build_loads_offloaded_text(self, tmp_path):
+        backend = blob_store.FilesystemBackend(str(tmp_path / "blobs"))
+        with patch.object(blob_store, "_backend", backend), \
+             patch.object(blob_store.settings, "BLOB_STORE_MIN_BYTES", 100), \
+             patch.object(blob_store.settings, "BLOB_STORE_PREVIEW_CHARS", 10):
+            doc = SimpleNamespace(
+                id="x", file_path=str(tmp_path / "doc.pdf"),
+                text_content=await blob_store.offload(TEXT), pages_json=None,
+            )
+            assert blob_store.is_ref(doc.text_content)
+            with patch.object(chunk_index, "embed"):
+                index = await chunk_index.for_document(doc)
+        assert "turbines" in index["idf"]
+
+    async def test_concurrent_writes_of_the_same_index(self, tmp_path):
+        pdf = str(tmp_path / "doc.pdf")
+        index = chunk_index.build(TEXT, PAGES)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: chunk_index._write(chunk_index.path_for(pdf), index), range(8)))
+        assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+        assert json.loads((tmp_path / "index.json").read_text())["chunks"] == index["chunks"]
+
+    async def test_embeddings_of_another_model_are_rebuilt(self, tmp_path):
+        pdf = str(tmp_path / "doc.pdf")
+        index = chunk_index.build(TEXT, PAGES)
+        index["embeddings"] = [[1.0, 0.0]] * 3
+        index["embedding_model"] = "old-model"
+
+        from app.modules.knowledge import embedding_service
+        with patch.object(embedding_service, "is_available", return_value=True), \
+             patch.object(embedding_service, "get_model_name", return_value="new-model"), \
+             patch.object(embedding_service, "embed_texts", return_value=[[0.0, 1.0, 0.0]] * 3) as embed_texts:
+            await chunk_index.refresh_embeddings(pdf, index, "new-model")
+            await chunk_index.refresh_embeddings(pdf, index, "new-model")
+
+        embed_texts.assert_called_once()
+        stored = json.loads((tmp_path / "index.json").read_text())
+        assert stored["embedding_model"] == "new-model"
+        assert stored["embeddings"] == [[0.0, 1.0, 0.0]] * 3
+
+
+class FakePage:
+    def __init__(self, text):
+        self.text = text
+        self.rect = SimpleNamespace(width=595.0, height=842.0)
+
+    def get_text(self, mode):
+        return self.text
+
+    def get_images(self, full=False):
+        return [object()]
+
+
+class FakeDoc:
+    metadata = {"title": "Energy", "author": "A"}
+
+    def __init__(self, path):
+        self.pages = [FakePage(p["text"]) for p in PAGES * 3]
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __getitem__(self, i):
+        return self.pages[i]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_pymupdf():
+    pool = ThreadPoolExecutor(max_workers=3)
+    with patch.object(extraction, "fitz", SimpleNamespace(open=FakeDoc), create=True), \
+         patch.object(extraction, "HAS_PYMUPDF", True), \
+         patch.object(extraction, "_get_pool", return_value=pool), \
+         patch.object(extraction.settings, "PDF_PAGES_PER_TASK", 2):
+        yield
+    pool.shutdown()
+
+
+class TestExtraction:
+    def test_page_ranges(self):
+        assert extraction._ranges(5, 2) == [(0, 2), (2, 4), (4, 5)]
+        assert extraction._ranges(0, 2) == []
+
+    async def test_extracts_pages_in_order_with_progress(self, fake_pymupdf):
+        events = []
+        result = await extraction.extract("doc.pdf", events.append)
+
+        assert result["num_pages"] == 9
+        assert [p["page_number"] for p in result["pages"]] == list(range(1, 10))
+        assert result["text"].startswith("Solar panels")
+        assert result["metadata"]["engine"] == "pymupdf"
+        assert result["metadata"]["images_count"] == 9
+        assert "images" not in result["pages"][0]
+        assert len(events) == 5
+        assert events[-1] == {"stage": "extract", "pages_done": 9, "pages_total": 9}
+
+    async def test_no_parser_available(self):
+        with patch.object(extraction, "HAS_PYMUPDF", False), \
+             patch.object(extraction, "HAS_PDFPLUMBER", False), \
+             pytest.raises(RuntimeError):
+            await extraction.extract("doc.pdf")
+
+    async def test_failing_progress_callback_is_ignored(self, fake_pymupdf):
+        async def broken(event):
+            raise ConnectionError("socket closed")
+
+        result = await extraction.extract("doc.pdf", broken)
+        assert result["num_pages"] == 9
@@ -0,0 +1,200 @@
+"""
+Tests for background run execution (app.core.run_supervisor) and its use by
+pipeline executions.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core import run_supervisor
+from app.core.run_supervisor import RunLimitExceeded
+
+
+@pytest.fixture(autouse=True)
+def one_run_per_user():
+    with patch.object(run_supervisor.settings, "BACKGROUND_RUNS_MAX_PER_USER", 1):
+        yield
+
+
+class TestSupervisor:
+    async def test_per_user_limit(self):
+        user_id, release = uuid4(), asyncio.Event()
+
+        with run_supervisor.reserve(user_id) as slot:
+            task = slot.start("workflow", uuid4(), release.wait())
+
+        with pytest.raises(RunLimitExceeded):
+            run_supervisor.reserve(user_id)
+        # Other users are not affected
+        with run_supervisor.reserve(uuid4()):
+            pass
+
+        release.set()
+        await task
+        assert run_supervisor.active_runs(user_id) == 0
+
+    async def test_unstarted_slot_is_released(self):
+        user_id = uuid4()
+        with pytest.raises(RuntimeError):
+            with run_supervisor.reserve(user_id):
+                raise RuntimeError("row insert failed")
+        assert run_supervisor.active_runs(user_id) == 0
+
+    async def test_cancel(self):
+        user_id, run_id = uuid4(), uuid4()
+        with run_supervisor.reserve(user_id) as slot:
+            task = slot.start("crew", run_id, asyncio.sleep(60))
+        await asyncio.sleep(0)
+
+        assert run_supervisor.is_running(run_id)
+        assert run_supervisor.cancel(run_id)
+        await task
+        assert not run_supervisor.is_running(run_id)
+        assert not run_supervisor.cancel(run_id)
+        assert run_supervisor.active_runs(user_id) == 0
+
+    async def test_cancel_before_start_releases_slot_and_records(self):
+        user_id, run_id = uuid4(), uuid4()
+        started = False
+
+        async def run():
+            nonlocal started
+            started = True
+
+        on_cancelled = AsyncMock()
+        with run_supervisor.reserve(user_id) as slot:
+            task = slot.start("pipeline", run_id, run(), on_cancelled=on_cancelled)
+        assert run_supervisor.cancel(run_id)  # before the task's first step
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.gather(*run_supervisor._cleanups)
+
+        assert not started
+        on_cancelled.assert_awaited_once()
+        assert not run_supervisor.is_running(run_id)
+        assert run_supervisor.active_runs(user_id) == 0
+
+
+def _pipeline(steps):
+    from app.models.pipeline import Pipeline
+
+    return Pipeline(id=uuid4(), user_id=uuid4(), name="p", steps_json=json.dumps(steps))
+
+
+def _session(status=None):
+    session = AsyncMock()
+    session.add = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = status
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestPipelineExecution:
+    async def test_cancelled_task_records_partial_results(self):
+        from app.models.pipeline import ExecutionStatus, PipelineExecution
+        from app.modules.pipelines.service import PipelineService
+
+        pipeline = _pipeline([{"type": "summarize"}, {"type": "translate"}])
+        execution = PipelineExecution(
+            pipeline_id=pipeline.id, user_id=pipeline.user_id,
+            status=ExecutionStatus.RUNNING, total_steps=2,
+        )
+        first_done, block = asyncio.Event(), asyncio.Event()
+
+        async def step(step, previous_output, pipeline=None, session=None):
+            if step["type"] == "translate":
+                first_done.set()
+                await block.wait()
+            return {"type": step["type"], "output": step["type"]}
+
+        events = []
+
+        async def notify(user_id, msg_type, event):
+            events.append((msg_type, event["event"], event["step_index"]))
+
+        with patch.object(PipelineService, "_execute_step", side_effect=step), \
+             patch.object(run_supervisor, "notify", side_effect=notify):
+            with run_supervisor.reserve(execution.user_id) as slot:
+                task = slot.start(
+                    "pipeline", execution.id,
+                    PipelineService._execute(execution, pipeline, _session(ExecutionStatus.RUNNING), supervised=True),
+                )
+            await first_done.wait()
+            run_supervisor.cancel(execution.id)
+            await task
+
+        assert execution.status == ExecutionStatus.CANCELLED
+        assert [r["type"] for r in json.loads(execution.results_json)] == ["summarize"]
+        assert events[:3] == [
+            ("pipeline_execution_progress", "step_started", 0),
+            ("pipeline_execution_progress", "step_finished", 0),
+            ("pipeline_execution_progress", "step_started", 1),
+        ]
+        assert events[-1][1] == "finished"
+
+    async def test_cancellation_from_another_process_stops_before_next_step(self):
+        from app.models.pipeline import ExecutionStatus, PipelineExecution
+        from app.modules.pipelines.service import PipelineService
+
+        pipeline = _pipeline([{"type": "summarize"}])
+        execution = PipelineExecution(
+            pipeline_id=pipeline.id, user_id=pipeline.user_id,
+            status=ExecutionStatus.RUNNING, total_steps=1,
+        )
+        step = AsyncMock()
+
+        with patch.object(PipelineService, "_execute_step", step), \
+             patch.object(run_supervisor, "notify", AsyncMock()):
+            await PipelineService._execute(
+                execution, pipeline, _session(ExecutionStatus.CANCELLED), supervised=True,
+            )
+
+        step.assert_not_called()
+        assert execution.status == ExecutionStatus.CANCELLED
+
+    async def test_cancellation_during_last_step_is_not_overwritten(self):
+        from app.models.pipeline import ExecutionStatus, PipelineExecution
+        from app.modules.pipelines.service import PipelineService
+
+        pipeline = _pipeline([{"type": "summarize"}])
+        execution = PipelineExecution(
+            pipeline_id=pipeline.id, user_id=pipeline.user_id,
+            status=ExecutionStatus.RUNNING, total_steps=1,
+        )
+        session = _session()
+        # Running before the step, cancelled by the time it finishes
+        session.execute.return_value.scalar_one_or_none.side_effect = [
+            ExecutionStatus.RUNNING, ExecutionStatus.CANCELLED,
+        ]
+        step = AsyncMock(return_value={"type": "summarize", "output": "done"})
+
+        with patch.object(PipelineService, "_execute_step", step), \
+             patch.object(run_supervisor, "notify", AsyncMock()):
+            await PipelineService._execute(execution, pipeline, session, supervised=True)
+
+        step.assert_awaited_once()
+        assert execution.status == ExecutionStatus.CANCELLED
+        assert json.loads(execution.results_json)[0]["output"] == "done"
+
+    async def test_start_refuses_over_limit(self):
+        from app.modules.pipelines.service import PipelineService
+
+        pipeline = _pipeline([])
+        session = _session()
+        session.get = AsyncMock(return_value=pipeline)
+        release = asyncio.Event()
+
+        with run_supervisor.reserve(pipeline.user_id) as slot:
+            task = slot.start("pipeline", uuid4(), release.wait())
+
+        with pytest.raises(RunLimitExceeded):
+            await PipelineService.start_pipeline(pipeline.id, pipeline.user_id, session)
+        session.commit.assert_not_called()
+
+        release.set()
+        await task
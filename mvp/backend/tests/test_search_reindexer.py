@@ -0,0 +1,159 @@
+"""
+Tests for the streaming Meilisearch reindexer (unified_search.reindexer).
+
+All tests run without external services (no DB, no Meilisearch, no Redis).
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+
+class FakeMeili:
+    """Minimal synchronous Meilisearch client recording calls."""
+
+    def __init__(self, existing=()):
+        self.indexes = {uid: [] for uid in existing}
+        self.calls = []
+        self._uid = 0
+
+    def _task(self, *call):
+        self.calls.append(call)
+        self._uid += 1
+        return {"taskUid": self._uid}
+
+    def wait_for_task(self, uid, timeout_in_ms=None):
+        return {"status": "succeeded"}
+
+    def get_index(self, uid):
+        if uid not in self.indexes:
+            raise KeyError(uid)
+        return uid
+
+    def create_index(self, uid, options=None):
+        self.indexes[uid] = []
+        return self._task("create", uid)
+
+    def delete_index(self, uid):
+        self.indexes.pop(uid, None)
+        return self._task("delete", uid)
+
+    def swap_indexes(self, pairs):
+        a, b = pairs[0]["indexes"]
+        self.indexes[a], self.indexes[b] = self.indexes[b], self.indexes[a]
+        return self._task("swap", a, b)
+
+    def index(self, uid):
+        client = self
+
+        def add_documents(docs, primary_key=None):
+            client.indexes[uid].extend(docs)
+            return client._task("add", uid, len(docs))
+
+        return SimpleNamespace(
+            add_documents=add_documents,
+            update_filterable_attributes=lambda attrs: client._task("filterable", uid),
+            update_searchable_attributes=lambda attrs: client._task("searchable", uid),
+        )
+
+
+def _rows(n):
+    from app.models.transcription import Transcription, TranscriptionStatus
+
+    ids = sorted(uuid4() for _ in range(n))
+    return [
+        (Transcription(id=i, user_id=uuid4(), video_url="u", status=TranscriptionStatus.COMPLETED,
+                       text="hello", created_at=datetime(2026, 10, 1)),)
+        for i in ids
+    ]
+
+
+def _paged_session(rows, page):
+    session = AsyncMock()
+    pages = [rows[i:i + page] for i in range(0, len(rows), page)] + [[]]
+    session.execute = AsyncMock(side_effect=[MagicMock(all=MagicMock(return_value=p)) for p in pages])
+    return session
+
+
+class TestReindexer:
+    """Full rebuilds go through a shadow index; deltas upsert into the live one."""
+
+    @pytest.mark.asyncio
+    async def test_iter_documents_pages_by_keyset(self):
+        from app.modules.unified_search import reindexer
+
+        rows = _rows(5)
+        session = _paged_session(rows, 2)
+        batches = [b async for b in reindexer.iter_documents(reindexer.SOURCES["transcriptions"](), session, batch_size=2)]
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        second_query = str(session.execute.call_args_list[1].args[0])
+        assert "transcriptions.id >" in second_query and "ORDER BY transcriptions.id" in second_query
+
+    @pytest.mark.asyncio
+    async def test_rebuild_swaps_shadow_into_live(self):
+        from app.modules.unified_search import reindexer
+
+        client = FakeMeili(existing=["us_transcriptions"])
+        client.indexes["us_transcriptions"] = [{"id": "stale"}]
+        rows = _rows(5)
+
+        with patch.object(reindexer, "set_watermark", new_callable=AsyncMock) as set_wm:
+            result = await reindexer.rebuild(client, "transcriptions", _paged_session(rows, 2), batch_size=2)
+
+        assert result["indexed"] == 5
+        assert [d["id"] for d in client.indexes["us_transcriptions"]] == [str(r[0].id) for r in rows]
+        assert "us_transcriptions__shadow" not in client.indexes
+        kinds = [c[0] for c in client.calls]
+        # Live index is never deleted; the old generation goes away after the swap
+        assert ("delete", "us_transcriptions") not in client.calls
+        assert kinds.index("swap") < len(kinds) - 1 and client.calls[-1] == ("delete", "us_transcriptions__shadow")
+        set_wm.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delta_upserts_into_live_index(self):
+        from app.modules.unified_search import reindexer
+
+        client = FakeMeili(existing=["us_transcriptions"])
+        session = _paged_session(_rows(3), 10)
+        watermark = datetime(2026, 10, 18)
+
+        with patch.object(reindexer, "get_watermark", new_callable=AsyncMock, return_value=watermark), \
+             patch.object(reindexer, "set_watermark", new_callable=AsyncMock):
+            result = await reindexer.delta_sync(client, "transcriptions", session)
+
+        assert result["mode"] == "delta" and result["indexed"] == 3
+        assert len(client.indexes["us_transcriptions"]) == 3
+        assert not any(c[0] == "swap" for c in client.calls)
+        assert "transcriptions.updated_at >=" in str(session.execute.call_args_list[0].args[0])
+
+    @pytest.mark.asyncio
+    async def test_delta_without_watermark_falls_back_to_rebuild(self):
+        from app.modules.unified_search import reindexer
+
+        client = FakeMeili()
+        with patch.object(reindexer, "get_watermark", new_callable=AsyncMock, return_value=None), \
+             patch.object(reindexer, "set_watermark", new_callable=AsyncMock):
+            result = await reindexer.delta_sync(client, "transcriptions", _paged_session(_rows(1), 10))
+
+        assert result["mode"] == "full"
+        assert any(c[0] == "swap" for c in client.calls)
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_aborts_before_swap(self):
+        from app.modules.unified_search import reindexer
+
+        client = FakeMeili(existing=["us_transcriptions"])
+        client.wait_for_task = lambda uid, timeout_in_ms=None: (
+            {"status": "failed", "error": "bad doc"} if uid > 4 else {"status": "succeeded"}
+        )
+
+        with patch.object(reindexer, "set_watermark", new_callable=AsyncMock) as set_wm, \
+             pytest.raises(RuntimeError, match="bad doc"):
+            await reindexer.rebuild(client, "transcriptions", _paged_session(_rows(6), 2), batch_size=2)
+
+        assert not any(c[0] == "swap" for c in client.calls)
+        set_wm.assert_not_awaited()
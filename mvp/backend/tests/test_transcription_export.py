@@ -0,0 +1,106 @@
+"""
+Tests for the streaming transcript export writers and the bulk zip export
+(app.modules.transcription.export).
+"""
+
+import io
+import json
+import zipfile
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from app.models.transcription import Transcription, TranscriptionStatus
+from app.modules.transcription import export
+
+
+def _job(**kwargs):
+    defaults = dict(
+        user_id=uuid4(),
+        video_url="https://youtu.be/abc",
+        status=TranscriptionStatus.COMPLETED,
+        text="First sentence. Second one. Third",
+        duration_seconds=30,
+    )
+    return Transcription(**{**defaults, **kwargs})
+
+
+class TestWriters:
+    def test_srt_from_text_spreads_sentences_over_duration(self):
+        srt = "".join(export.write(_job(), "srt"))
+        assert srt == (
+            "1\n00:00:00,000 --> 00:00:10,000\nFirst sentence.\n\n"
+            "2\n00:00:10,000 --> 00:00:20,000\nSecond one.\n\n"
+            "3\n00:00:20,000 --> 00:00:30,000\nThird.\n\n"
+        )
+
+    def test_timed_formats_use_stored_utterances(self):
+        job = _job(speakers_json=json.dumps([
+            {"speaker": "A", "text": "Hello", "start": 0, "end": 1500},
+            {"speaker": "B", "text": "Hi there", "start": 3_723_004, "end": 3_724_000},
+        ]))
+
+        vtt = "".join(export.write(job, "vtt"))
+        assert vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\n<v A>Hello\n\n")
+        assert "01:02:03.004 --> 01:02:04.000\n<v B>Hi there\n\n" in vtt
+
+        lines = [json.loads(line) for line in export.write(job, "jsonl")]
+        assert [(c["speaker"], c["start_ms"], c["end_ms"]) for c in lines] == [("A", 0, 1500), ("B", 3_723_004, 3_724_000)]
+        assert all(c["transcription_id"] == str(job.id) for c in lines)
+
+    def test_long_text_is_yielded_in_chunks(self):
+        text = "word " * 40_000
+        chunks = list(export.write(_job(text=text), "txt"))
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+
+    def test_markdown_lists_chapters(self):
+        job = _job(metadata_json=json.dumps({"chapters": [{"title": "Intro", "start_time": 65}]}))
+        md = "".join(export.write(job, "md"))
+        assert "### [01:05] Intro" in md
+        assert md.endswith("## Full Transcript\n\nFirst sentence. Second one. Third\n\n")
+
+
+class _FakeSession:
+    def __init__(self, jobs):
+        self.jobs = {job.id: job for job in jobs}
+        self.expunged = []
+
+    async def execute(self, stmt):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = list(self.jobs)
+        return result
+
+    async def get(self, model, job_id):
+        return self.jobs.get(job_id)
+
+    def expunge(self, job):
+        self.expunged.append(job.id)
+
+
+class TestBulkExport:
+    async def test_streams_zip_of_transcripts(self):
+        jobs = [_job(text=f"Transcript {i}. " * 2000) for i in range(3)]
+        session = _FakeSession(jobs)
+        open_sessions = 0
+
+        @asynccontextmanager
+        async def context():
+            nonlocal open_sessions
+            open_sessions += 1
+            try:
+                yield session
+            finally:
+                open_sessions -= 1
+
+        chunks = []
+        with patch.object(export, "get_session_context", context):
+            async for chunk in export.stream_zip(jobs[0].user_id, "srt"):
+                assert open_sessions == 0  # nothing is held while the client reads
+                chunks.append(chunk)
+
+        assert len(chunks) > 3
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            assert archive.namelist() == [f"transcription_{job.id}.srt" for job in jobs]
+            assert archive.read(f"transcription_{jobs[1].id}.srt").decode() == "".join(export.write(jobs[1], "srt"))
+        assert session.expunged == [job.id for job in jobs]
@@ -97,7 +97,8 @@ class TestTranscriptionServiceListJobs:
         from app.modules.transcription.service import TranscriptionService
 
         svc = TranscriptionService()
-        items, total = await svc.list_user_jobs(sample_user_id, session)
+        page = await svc.list_user_jobs(sample_user_id, session)
+        items, total = page.items, page.total
 
         assert items == []
         assert total == 0
@@ -118,23 +119,26 @@ class TestTranscriptionServiceListJobs:
             )
 
         # Get first page of 2
-        items, total = await svc.list_user_jobs(
+        page = await svc.list_user_jobs(
             sample_user_id, session, skip=0, limit=2
         )
+        items, total = page.items, page.total
         assert len(items) == 2
         assert total == 5
 
         # Get second page of 2
-        items2, total2 = await svc.list_user_jobs(
+        page = await svc.list_user_jobs(
             sample_user_id, session, skip=2, limit=2
         )
+        items2, total2 = page.items, page.total
         assert len(items2) == 2
         assert total2 == 5
 
         # Get last page
-        items3, total3 = await svc.list_user_jobs(
+        page = await svc.list_user_jobs(
             sample_user_id, session, skip=4, limit=2
         )
+        items3, total3 = page.items, page.total
         assert len(items3) == 1
         assert total3 == 5
 
@@ -163,9 +167,10 @@ class TestTranscriptionServiceListJobs:
             session=session,
         )
 
-        items, total = await svc.list_user_jobs(
+        page = await svc.list_user_jobs(
             sample_user_id, session, status=TranscriptionStatus.COMPLETED
         )
+        items, total = page.items, page.total
         assert total == 1
         assert items[0].status == TranscriptionStatus.COMPLETED
 
@@ -184,7 +189,8 @@ class TestTranscriptionServiceListJobs:
             session=session,
         )
 
-        items, total = await svc.list_user_jobs(user_b, session)
+        page = await svc.list_user_jobs(user_b, session)
+        items, total = page.items, page.total
         assert total == 0
         assert items == []
 
@@ -629,6 +635,7 @@ class TestTranscriptionRouteList:
         from app.auth import get_current_user
         from app.modules.auth_guards.middleware import require_verified_email
         from app.database import get_session
+        from app.core.pagination import Page
         from app.modules.transcription.service import TranscriptionService
 
         mock_session = AsyncMock()
@@ -645,7 +652,7 @@ class TestTranscriptionRouteList:
                     TranscriptionService,
                     "list_user_jobs",
                     new_callable=AsyncMock,
-                    return_value=([], 0),
+                    return_value=Page(items=[], total=0),
                 ),
             ):
                 mock_engine.dispose = AsyncMock()
@@ -0,0 +1,104 @@
+"""
+Tests for the unified search PostgreSQL fan-out (UnifiedSearchService).
+
+All tests run without external services (no DB, no Meilisearch).
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+
+@asynccontextmanager
+async def _fake_session_context():
+    yield AsyncMock()
+
+
+def _source(results, delay: float = 0.0, error: Exception = None):
+    async def fn(user_id, query, session, limit=10):
+        if delay:
+            await asyncio.sleep(delay)
+        if error:
+            raise error
+        return [dict(r) for r in results]
+    return fn
+
+
+@pytest.fixture()
+def service():
+    from app.modules.unified_search import service as module
+
+    with patch("app.database.get_session_context", _fake_session_context), \
+         patch.object(module.settings, "UNIFIED_SEARCH_SOURCE_TIMEOUT_MS", 100):
+        yield module.UnifiedSearchService
+
+
+class TestPostgresFanOut:
+    """Sources run concurrently and slow or failing sources are flagged."""
+
+    @pytest.mark.asyncio
+    async def test_merges_sources_by_score(self, service):
+        with patch.object(service, "_search_transcriptions", _source([{"id": "t", "score": 0.7}])), \
+             patch.object(service, "_search_knowledge", _source([{"id": "k", "score": 0.9}])), \
+             patch.object(service, "_search_content", _source([])), \
+             patch.object(service, "_search_conversations", _source([{"id": "c", "score": 0.5}])):
+            result = await service._search_postgres(uuid4(), "hello", AsyncMock())
+
+        assert [r["id"] for r in result["results"]] == ["k", "t", "c"]
+        assert result["results"][0]["_module"] == "knowledge"
+        assert result["facets"] == {"transcriptions": 1, "knowledge": 1, "content": 0, "conversations": 1}
+        assert result["partial"] is False
+
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently(self, service):
+        slow = _source([{"id": "x", "score": 0.5}], delay=0.06)
+        with patch.object(service, "_search_transcriptions", slow), \
+             patch.object(service, "_search_knowledge", slow), \
+             patch.object(service, "_search_content", slow), \
+             patch.object(service, "_search_conversations", slow):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await service._search_postgres(uuid4(), "hello", AsyncMock())
+            elapsed = loop.time() - started
+
+        assert result["total"] == 4
+        assert elapsed < 0.06 * 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_error_return_partial(self, service):
+        with patch.object(service, "_search_transcriptions", _source([{"id": "t", "score": 0.7}])), \
+             patch.object(service, "_search_knowledge", _source([{"id": "k"}], delay=1.0)), \
+             patch.object(service, "_search_content", _source([], error=RuntimeError("boom"))), \
+             patch.object(service, "_search_conversations", _source([])):
+            result = await service._search_postgres(uuid4(), "hello", AsyncMock())
+
+        assert result["partial"] is True
+        assert result["facet_status"] == {
+            "transcriptions": "ok", "knowledge": "timeout", "content": "error", "conversations": "ok",
+        }
+        assert [r["id"] for r in result["results"]] == ["t"]
+
+    @pytest.mark.asyncio
+    async def test_module_filter_ignores_unknown_sources(self, service):
+        with patch.object(service, "_search_content", _source([{"id": "c", "score": 0.6}])):
+            result = await service._search_postgres(uuid4(), "hello", AsyncMock(), modules=["content", "nope"])
+
+        assert result["facets"] == {"content": 1}
+
+
+class TestFulltextHelpers:
+    """LIKE patterns are escaped so user input cannot inject wildcards."""
+
+    def test_like_pattern_escapes_wildcards(self):
+        from app.modules.unified_search import fulltext
+
+        assert fulltext.like_pattern("50%_off\\") == "%50\\%\\_off\\\\%"
+
+    def test_score_adds_weighted_rank(self):
+        from app.modules.unified_search import fulltext
+
+        assert fulltext.score(0.5, None) == 0.5
+        assert fulltext.score(0.5, 1.0) == 0.8
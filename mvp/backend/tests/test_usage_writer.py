@@ -0,0 +1,118 @@
+"""
+Tests for the batched AI usage writer (cost_tracker.usage_writer).
+
+All tests run without external services (no DB).
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+
+def _row(**overrides) -> dict:
+    row = {"user_id": uuid4(), "provider": "groq", "model": "llama", "module": "chat", "action": "reply"}
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture()
+def writer():
+    from app.modules.cost_tracker import usage_writer
+
+    with patch.object(usage_writer.settings, "USAGE_WRITER_MODE", "async"), \
+         patch.object(usage_writer.settings, "USAGE_WRITER_FLUSH_MS", 20), \
+         patch.object(usage_writer.settings, "USAGE_WRITER_BATCH_SIZE", 3), \
+         patch.object(usage_writer.settings, "USAGE_WRITER_QUEUE_SIZE", 4):
+        yield usage_writer
+
+
+class TestUsageWriter:
+    """Rows are batched by size/time, flushed on stop and dropped on overflow."""
+
+    @pytest.mark.asyncio
+    async def test_sync_mode_writes_inline(self):
+        from app.modules.cost_tracker import usage_writer
+
+        session = AsyncMock()
+        with patch.object(usage_writer.settings, "USAGE_WRITER_MODE", "sync"):
+            await usage_writer.submit(_row(), session=session)
+
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_without_running_writer_writes_inline(self, writer):
+        with patch.object(writer, "write_rows", new_callable=AsyncMock) as write:
+            await writer.submit(_row())
+        write.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_batches_and_flushes_on_stop(self, writer):
+        with patch.object(writer, "write_rows", new_callable=AsyncMock) as write:
+            writer.start()
+            for i in range(4):
+                await writer.submit(_row(input_tokens=i))
+            assert write.await_count == 0  # nothing written on the caller's path
+            lost = await writer.stop()
+
+        assert lost == 0
+        batches = [call.args[0] for call in write.await_args_list]
+        assert [len(b) for b in batches] == [3, 1]
+        assert [r["input_tokens"] for b in batches for r in b] == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_rows(self, writer):
+        from app.metrics import ai_usage_writer_rows_total
+
+        dropped = ai_usage_writer_rows_total.labels(outcome="dropped")
+        before = dropped._value.get()
+        release = asyncio.Event()
+
+        async def slow_write(rows, session=None):
+            await release.wait()
+
+        with patch.object(writer, "write_rows", side_effect=slow_write):
+            writer.start()
+            await writer.submit(_row())
+            await asyncio.sleep(0.05)  # first batch is now blocked in write_rows
+            for _ in range(6):
+                await writer.submit(_row())
+            release.set()
+            await writer.stop()
+
+        assert dropped._value.get() - before == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_does_not_stop_writer(self, writer):
+        with patch.object(writer, "write_rows", new_callable=AsyncMock,
+                          side_effect=[RuntimeError("db down"), None]) as write:
+            writer.start()
+            await writer.submit(_row())
+            await asyncio.sleep(0.05)
+            await writer.submit(_row())
+            await writer.stop()
+
+        assert write.await_count == 2
+
+
+class TestTrackAIUsage:
+    """track_ai_usage hands a complete row to the writer."""
+
+    @pytest.mark.asyncio
+    async def test_submits_row_with_cost(self):
+        from app.modules.cost_tracker import tracker
+
+        user_id = uuid4()
+        with patch.object(tracker.usage_writer, "submit", new_callable=AsyncMock) as submit:
+            await tracker.track_ai_usage(
+                user_id, "groq", "llama", "chat", "reply",
+                input_tokens=10, output_tokens=5, error="x" * 600,
+            )
+
+        row = submit.await_args.args[0]
+        assert row["user_id"] == user_id
+        assert row["total_tokens"] == 15
+        assert len(row["error"]) == 500
+        assert row["id"] is not None and row["created_at"] is not None
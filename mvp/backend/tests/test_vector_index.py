@@ -0,0 +1,146 @@
+"""
+Tests for pgvector index management and search strategy selection
+(app.modules.knowledge.vector_index).
+
+No database is needed: introspection helpers are patched and statements are
+inspected instead of executed.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from app.config import settings
+from app.modules.knowledge import vector_index
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    vector_index.invalidate_cache()
+    yield
+    vector_index.invalidate_cache()
+
+
+def _profile(chunks: int, has_index: bool = False, method="hnsw", version=(0, 8, 0), rows=10_000_000):
+    return (
+        patch.object(vector_index, "tenant_profile", new=AsyncMock(return_value=(chunks, has_index))),
+        patch.object(vector_index, "global_index_method", new=AsyncMock(return_value=method)),
+        patch.object(vector_index, "pgvector_version", new=AsyncMock(return_value=version)),
+        patch.object(vector_index, "table_rows", new=AsyncMock(return_value=rows)),
+    )
+
+
+async def _choose(*patches, **kwargs):
+    for p in patches:
+        p.start()
+    try:
+        return await vector_index.choose_strategy(AsyncMock(), uuid4(), kwargs.pop("limit", 10), **kwargs)
+    finally:
+        for p in patches:
+            p.stop()
+
+
+class TestIndexDDL:
+    def test_hnsw(self):
+        ddl = vector_index.index_ddl("ix", "hnsw", m=24, ef_construction=128)
+        assert ddl.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix ON document_chunks USING hnsw")
+        assert "WITH (m = 24, ef_construction = 128)" in ddl
+        assert "WHERE" not in ddl
+
+    def test_ivfflat(self):
+        ddl = vector_index.index_ddl("ix", "ivfflat", lists=500, concurrently=False)
+        assert "CONCURRENTLY" not in ddl
+        assert "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 500)" in ddl
+
+    def test_partial_tenant_index(self):
+        user_id = uuid4()
+        ddl = vector_index.index_ddl(vector_index.tenant_index_name(user_id), "hnsw", user_id=user_id)
+        assert ddl.endswith(f"WHERE user_id = '{user_id}'::uuid")
+        assert vector_index.TENANT_INDEX_PREFIX + user_id.hex in ddl
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            vector_index.index_ddl("ix", "diskann")
+
+    def test_ivfflat_lists(self):
+        with patch.object(settings, "KNOWLEDGE_IVFFLAT_LISTS", 0):
+            assert vector_index.ivfflat_lists(500) == 10
+            assert vector_index.ivfflat_lists(500_000) == 500
+            assert vector_index.ivfflat_lists(4_000_000) == 2000
+        with patch.object(settings, "KNOWLEDGE_IVFFLAT_LISTS", 64):
+            assert vector_index.ivfflat_lists(4_000_000) == 64
+
+
+class TestChooseStrategy:
+    async def test_requested_exact(self):
+        assert await _choose(*_profile(10_000_000), exact=True) == ("exact", {})
+
+    async def test_small_tenant_is_exact(self):
+        strategy, _ = await _choose(*_profile(settings.KNOWLEDGE_ANN_EXACT_MAX_CHUNKS))
+        assert strategy == "exact"
+
+    async def test_no_index_is_exact(self):
+        strategy, _ = await _choose(*_profile(10_000_000, method=None))
+        assert strategy == "exact"
+
+    async def test_tenant_index(self):
+        strategy, knobs = await _choose(*_profile(500_000, has_index=True), ef_search=80)
+        assert strategy == "tenant_index"
+        assert knobs["ef_search"] == 80
+
+    async def test_iterative_scan_on_pgvector_08(self):
+        strategy, knobs = await _choose(*_profile(500_000))
+        assert strategy == "global_index"
+        assert knobs["iterative_scan"] is True
+        assert knobs["ef_search"] == settings.KNOWLEDGE_HNSW_EF_SEARCH
+
+    async def test_ef_search_never_below_limit(self):
+        _, knobs = await _choose(*_profile(500_000), limit=100, ef_search=20)
+        assert knobs["ef_search"] == 100
+
+    async def test_old_pgvector_scales_ef_search_by_selectivity(self):
+        strategy, knobs = await _choose(*_profile(500_000, version=(0, 7, 4), rows=5_000_000), ef_search=40)
+        assert strategy == "global_index"
+        assert "iterative_scan" not in knobs
+        assert knobs["ef_search"] == 400
+
+    async def test_old_pgvector_very_selective_falls_back_to_exact(self):
+        strategy, _ = await _choose(*_profile(30_000, version=(0, 7, 4), rows=50_000_000))
+        assert strategy == "exact"
+
+
+class TestSearchSQL:
+    async def test_apply_search_settings(self):
+        session = AsyncMock()
+        await vector_index.apply_search_settings(
+            session, {"ef_search": 120, "probes": 12, "iterative_scan": True, "method": "hnsw"},
+        )
+        statements = [str(c.args[0]) for c in session.execute.call_args_list]
+        assert statements == [
+            "SET LOCAL hnsw.ef_search = 120",
+            "SET LOCAL ivfflat.probes = 12",
+            "SET LOCAL hnsw.iterative_scan = relaxed_order",
+        ]
+
+    def test_query_embedding_is_bound(self):
+        # ``:query_emb::vector`` is not recognised as a bind parameter
+        for strategy in ("exact", "global_index", "tenant_index"):
+            clause = vector_index.search_sql(strategy, uuid4())
+            assert "query_emb" in clause._bindparams
+            assert "::vector" not in str(clause)
+
+    def test_tenant_index_inlines_user_id(self):
+        user_id = uuid4()
+        clause = vector_index.search_sql("tenant_index", user_id)
+        assert f"user_id = '{user_id}'::uuid" in str(clause)
+        assert "uid" not in clause._bindparams
+        assert "uid" in vector_index.search_sql("global_index", user_id)._bindparams
+
+    async def test_nearest_chunks_exact_skips_settings(self):
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(fetchall=MagicMock(return_value=[("row",)])))
+        user_id = uuid4()
+        strategy, rows = await vector_index.nearest_chunks(session, user_id, "[0.1]", 5, exact=True)
+        assert (strategy, rows) == ("exact", [("row",)])
+        assert session.execute.await_count == 1
+        assert session.execute.await_args.args[1] == {"query_emb": "[0.1]", "lim": 5, "uid": str(user_id)}
@@ -14,6 +14,8 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+from app.modules.web_crawler import browser_pool, http_engine
+
 
 # ---------------------------------------------------------------------------
 # Schema tests
@@ -1284,21 +1286,27 @@ class TestWebCrawlerServiceV3:
         assert decoded == b"%PDF-1.4 sample bytes"
 
     @pytest.mark.asyncio
-    async def test_scrape_uses_temp_crawler_for_proxy(self):
+    async def test_scrape_uses_pooled_browser_for_proxy(self):
+        from contextlib import asynccontextmanager
         from app.modules.web_crawler.service import WebCrawlerService
-        import app.modules.web_crawler.service as svc
 
-        temp_crawler = AsyncMock()
-        temp_crawler.arun = AsyncMock(return_value=_make_crawl_result_v3())
-        temp_crawler.close = AsyncMock()
+        pooled = AsyncMock()
+        pooled.arun = AsyncMock(return_value=_make_crawl_result_v3())
+        leased = []
+
+        @asynccontextmanager
+        async def fake_lease(kwargs):
+            leased.append(kwargs)
+            yield pooled
 
-        with patch.object(svc, "_get_temp_crawler", new=AsyncMock(return_value=temp_crawler)):
+        with patch.object(browser_pool, "lease", new=fake_lease):
             result = await WebCrawlerService.scrape(
                 "https://example.com", proxy_url="http://proxy:8080"
             )
 
         assert result["success"] is True
-        temp_crawler.close.assert_called_once()
+        assert leased == [{"headless": True, "proxy": "http://proxy:8080"}]
+        pooled.close.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_scrape_config_passes_rendering_options(self):
@@ -2725,43 +2733,43 @@ class TestProcessHtmlSchemas:
 class TestWebCrawlerServiceV5:
 
     @pytest.mark.asyncio
-    async def test_scrape_passes_browser_type_to_temp_crawler(self):
-        """browser_type != chromium triggers _get_temp_crawler."""
+    async def test_scrape_passes_browser_type_to_browser_pool(self):
+        """browser_type != chromium leases a pooled browser."""
+        from contextlib import asynccontextmanager
         from app.modules.web_crawler.service import WebCrawlerService
         import app.modules.web_crawler.service as svc
 
         captured_kwargs = {}
 
-        async def fake_get_temp_crawler(**kwargs):
+        @asynccontextmanager
+        async def fake_lease(kwargs):
             captured_kwargs.update(kwargs)
             mock = AsyncMock()
             mock.arun = AsyncMock(return_value=_make_crawl_result_v4())
-            mock.__aenter__ = AsyncMock(return_value=mock)
-            mock.__aexit__ = AsyncMock(return_value=False)
-            return mock
+            yield mock
 
-        with patch.object(svc, "_get_temp_crawler", new=fake_get_temp_crawler), \
+        with patch.object(browser_pool, "lease", new=fake_lease), \
              patch.object(svc, "get_crawler", new=AsyncMock()):
             await WebCrawlerService.scrape("https://example.com", browser_type="firefox")
 
         assert captured_kwargs.get("browser_type") == "firefox"
 
     @pytest.mark.asyncio
-    async def test_scrape_stealth_triggers_temp_crawler(self):
+    async def test_scrape_stealth_triggers_browser_pool(self):
+        from contextlib import asynccontextmanager
         from app.modules.web_crawler.service import WebCrawlerService
         import app.modules.web_crawler.service as svc
 
         captured_kwargs = {}
 
-        async def fake_get_temp_crawler(**kwargs):
+        @asynccontextmanager
+        async def fake_lease(kwargs):
             captured_kwargs.update(kwargs)
             mock = AsyncMock()
             mock.arun = AsyncMock(return_value=_make_crawl_result_v4())
-            mock.__aenter__ = AsyncMock(return_value=mock)
-            mock.__aexit__ = AsyncMock(return_value=False)
-            return mock
+            yield mock
 
-        with patch.object(svc, "_get_temp_crawler", new=fake_get_temp_crawler), \
+        with patch.object(browser_pool, "lease", new=fake_lease), \
              patch.object(svc, "get_crawler", new=AsyncMock()):
             await WebCrawlerService.scrape("https://example.com", enable_stealth=True)
 
@@ -2799,12 +2807,11 @@ class TestWebCrawlerServiceV5:
         mock_result.url = "https://example.com"
         mock_result.extracted_content = '[{"label": "email", "value": "a@b.com", "span": [10, 17]}]'
 
-        mock_crawler_instance = AsyncMock()
-        mock_crawler_instance.arun = AsyncMock(return_value=mock_result)
-        mock_crawler_instance.__aenter__ = AsyncMock(return_value=mock_crawler_instance)
-        mock_crawler_instance.__aexit__ = AsyncMock(return_value=False)
+        fetched = http_engine.FetchResult(url="https://example.com", status_code=200, content_type="text/html")
+        import app.modules.web_crawler.service as svc
 
-        with patch("crawl4ai.AsyncWebCrawler", return_value=mock_crawler_instance), \
+        with patch.object(http_engine, "crawl", new=AsyncMock(return_value=(fetched, mock_result))), \
+             patch.object(svc, "get_crawler", new=AsyncMock()) as browser, \
              patch("crawl4ai.RegexExtractionStrategy", return_value=MagicMock()):
             result = await WebCrawlerService.extract_regex(
                 url="https://example.com",
@@ -2813,14 +2820,17 @@ class TestWebCrawlerServiceV5:
 
         assert result["success"] is True
         assert result["url"] == "https://example.com"
-        assert result["match_count"] >= 0
+        assert result["match_count"] == 1
+        browser.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_extract_regex_failure(self):
         from app.modules.web_crawler.service import WebCrawlerService
         import app.modules.web_crawler.service as svc
 
-        with patch.object(svc, "get_crawler", new=AsyncMock(side_effect=Exception("network error"))), \
+        fetched = http_engine.FetchResult(url="https://broken.example.com", error="ConnectError")
+        with patch.object(http_engine, "crawl", new=AsyncMock(return_value=(fetched, None))), \
+             patch.object(svc, "get_crawler", new=AsyncMock(side_effect=Exception("network error"))), \
              patch("crawl4ai.CrawlerRunConfig", return_value=MagicMock()):
             result = await WebCrawlerService.extract_regex(
                 url="https://broken.example.com",
@@ -3605,6 +3615,21 @@ class TestWebCrawlerSchemasV6:
 # V6 — Service tests (scrape_http, adaptive_crawl, hub_crawl, geo + table)
 # ---------------------------------------------------------------------------
 
+def _http_scrape(fetched, process):
+    """Patch scrape_http's page-cache fetch and HTTP processing (no network, no cache dir)."""
+    import contextlib
+    import app.modules.web_crawler.service as svc
+    from app.modules.web_crawler import page_cache
+
+    stack = contextlib.ExitStack()
+    stack.enter_context(patch.object(svc, "_http_run_config", return_value=(MagicMock(), "variant")))
+    stack.enter_context(patch.object(page_cache, "fetch", new=AsyncMock(return_value=fetched)))
+    stack.enter_context(patch.object(page_cache, "get_derived", new=AsyncMock(return_value=None)))
+    stack.enter_context(patch.object(page_cache, "put_derived", new=AsyncMock()))
+    stack.enter_context(patch.object(http_engine, "process", new=process))
+    return stack
+
+
 class TestWebCrawlerServiceV6:
 
     # -- scrape_http --
@@ -3625,14 +3650,10 @@ class TestWebCrawlerServiceV6:
         mock_result.metadata = {"title": "Python"}
         mock_result.status_code = 200
 
-        mock_crawler_ctx = MagicMock()
-        mock_crawler_ctx.__aenter__ = AsyncMock(return_value=MagicMock(
-            arun=AsyncMock(return_value=mock_result)
-        ))
-        mock_crawler_ctx.__aexit__ = AsyncMock(return_value=False)
+        fetched = http_engine.FetchResult(url="https://python.org", final_url="https://python.org",
+                                          status_code=200, content_type="text/html", sha256="abc")
 
-        with patch("crawl4ai.async_configs.HTTPCrawlerConfig", MagicMock()), \
-             patch("crawl4ai.AsyncWebCrawler", return_value=mock_crawler_ctx):
+        with _http_scrape(fetched, AsyncMock(return_value=mock_result)):
             result = await WebCrawlerService.scrape_http(
                 url="https://python.org",
                 use_fit_markdown=True,
@@ -3653,14 +3674,9 @@ class TestWebCrawlerServiceV6:
         mock_result.success = False
         mock_result.error_message = "Connection refused"
 
-        mock_crawler_ctx = MagicMock()
-        mock_crawler_ctx.__aenter__ = AsyncMock(return_value=MagicMock(
-            arun=AsyncMock(return_value=mock_result)
-        ))
-        mock_crawler_ctx.__aexit__ = AsyncMock(return_value=False)
+        fetched = http_engine.FetchResult(url="https://bad.example.com", status_code=200, content_type="text/html")
 
-        with patch("crawl4ai.async_configs.HTTPCrawlerConfig", MagicMock()), \
-             patch("crawl4ai.AsyncWebCrawler", return_value=mock_crawler_ctx):
+        with _http_scrape(fetched, AsyncMock(return_value=mock_result)):
             result = await WebCrawlerService.scrape_http(url="https://bad.example.com")
 
         assert result["success"] is False
@@ -3670,7 +3686,7 @@ class TestWebCrawlerServiceV6:
     async def test_scrape_http_import_error(self):
         import sys
         from app.modules.web_crawler.service import WebCrawlerService
-        with patch.dict(sys.modules, {"crawl4ai.async_configs": None}):
+        with patch.dict(sys.modules, {"crawl4ai": None}):
             result = await WebCrawlerService.scrape_http(url="https://example.com")
 
         assert result["success"] is False
@@ -3680,16 +3696,26 @@ class TestWebCrawlerServiceV6:
     async def test_scrape_http_exception(self):
         from app.modules.web_crawler.service import WebCrawlerService
 
-        mock_crawler_ctx = MagicMock()
-        mock_crawler_ctx.__aenter__ = AsyncMock(side_effect=RuntimeError("browser crash"))
-        mock_crawler_ctx.__aexit__ = AsyncMock(return_value=False)
-
-        with patch("crawl4ai.async_configs.HTTPCrawlerConfig", MagicMock()), \
-             patch("crawl4ai.AsyncWebCrawler", return_value=mock_crawler_ctx):
+        fetched = http_engine.FetchResult(url="https://example.com", status_code=200, content_type="text/html")
+        with _http_scrape(fetched, AsyncMock(side_effect=RuntimeError("processor crash"))):
             result = await WebCrawlerService.scrape_http(url="https://example.com")
 
         assert result["success"] is False
-        assert "browser crash" in result["error"]
+        assert "processor crash" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_scrape_http_fetch_error(self):
+        from app.modules.web_crawler.service import WebCrawlerService
+
+        fetched = http_engine.FetchResult(url="https://example.com", status_code=404, error="HTTP 404")
+        process = AsyncMock()
+        with _http_scrape(fetched, process):
+            result = await WebCrawlerService.scrape_http(url="https://example.com")
+
+        process.assert_not_called()
+        assert result == {
+            "url": "https://example.com", "status_code": 404, "success": False, "error": "HTTP 404", "cache": None,
+        }
 
     # -- adaptive_crawl --
 
@@ -5623,9 +5649,14 @@ class TestWebCrawlerServiceV8:
         mock_crawler = AsyncMock()
         mock_crawler.arun.return_value = mock_result
 
+        # The pooled HTTP fetch extracted nothing, so the browser crawler is used
+        empty = MagicMock(success=True, extracted_content="[]")
+        fetched = http_engine.FetchResult(url="https://example.com", status_code=200, content_type="text/html")
+
         with patch("crawl4ai.JsonLxmlExtractionStrategy"), \
              patch("crawl4ai.CrawlerRunConfig"), \
              patch("crawl4ai.CacheMode"), \
+             patch.object(http_engine, "crawl", new=AsyncMock(return_value=(fetched, empty))), \
              patch("app.modules.web_crawler.service.get_crawler", new_callable=AsyncMock, return_value=mock_crawler):
             result = await WebCrawlerService.extract_lxml(
                 url="https://example.com",
@@ -19,9 +19,8 @@ import {
 
 import {
   useCreateFromTemplate, useCrewTemplates, useCrews,
-  useDeleteCrew, useRunCrew,
+  useCrewRun, useDeleteCrew, useRunCrew,
 } from '@/features/crews/hooks/useCrews';
-import type { CrewRun } from '@/features/crews/types';
 
 const ROLE_ICONS: Record<string, string> = {
   researcher: '🔬', writer: '✍️', reviewer: '📝', analyst: '📊',
@@ -47,14 +46,15 @@ export default function CrewsPage() {
   const [runOpen, setRunOpen] = useState(false);
   const [runCrewId, setRunCrewId] = useState<string | null>(null);
   const [instruction, setInstruction] = useState('');
-  const [runResult, setRunResult] = useState<CrewRun | null>(null);
+  const [runId, setRunId] = useState<string | null>(null);
+  const { data: runResult } = useCrewRun(runId);
   const [templatesOpen, setTemplatesOpen] = useState(false);
 
   const handleRun = () => {
     if (!runCrewId || !instruction.trim()) return;
     runMutation.mutate(
       { id: runCrewId, instruction },
-      { onSuccess: (run) => { setRunResult(run); setRunOpen(false); } },
+      { onSuccess: (run) => { setRunId(run.id); setRunOpen(false); } },
     );
   };
 
@@ -162,7 +162,7 @@ export default function CrewsPage() {
       </Dialog>
 
       {/* Result Dialog */}
-      <Dialog open={!!runResult} onOpenChange={(v) => { if (!v) setRunResult(null); }}>
+      <Dialog open={!!runId} onOpenChange={(v) => { if (!v) setRunId(null); }}>
         <DialogContent className="max-w-2xl">
           {runResult && (
             <>
@@ -171,6 +171,12 @@ export default function CrewsPage() {
                   Crew Run
                   <Badge variant={STATUS_VARIANTS[runResult.status] || 'secondary'}>{runResult.status}</Badge>
                   {runResult.duration_ms && <Badge variant="outline">{(runResult.duration_ms / 1000).toFixed(1)}s</Badge>}
+                  {(runResult.status === 'pending' || runResult.status === 'running') && (
+                    <span className="flex items-center gap-1 text-xs text-[var(--text-mid)]">
+                      <Loader2 className="h-3 w-3 animate-spin" />
+                      Agent {runResult.current_agent}/{runResult.total_agents}
+                    </span>
+                  )}
                 </DialogTitle>
               </DialogHeader>
               <div className="border-t border-[var(--border)] pt-4 max-h-[60vh] overflow-y-auto space-y-4">
@@ -20,9 +20,9 @@ import {
   useCreatePipeline,
   useDeletePipeline,
   useExecutePipeline,
+  useExecution,
   usePipelines,
 } from '@/features/pipelines/hooks/usePipelines';
-import type { PipelineExecution } from '@/features/pipelines/types';
 
 const STATUS_DOT: Record<string, string> = {
   draft: 'bg-[var(--text-low)]',
@@ -45,7 +45,8 @@ export default function PipelinesPage() {
   const [createOpen, setCreateOpen] = useState(false);
   const [newName, setNewName] = useState('');
   const [newDesc, setNewDesc] = useState('');
-  const [execResult, setExecResult] = useState<PipelineExecution | null>(null);
+  const [executionId, setExecutionId] = useState<string | null>(null);
+  const { data: execResult } = useExecution(executionId);
 
   const handleCreate = () => {
     if (!newName.trim()) return;
@@ -70,7 +71,7 @@ export default function PipelinesPage() {
 
   const handleExecute = (pipelineId: string) => {
     executeMutation.mutate(pipelineId, {
-      onSuccess: (data) => setExecResult(data),
+      onSuccess: (data) => setExecutionId(data.id),
     });
   };
 
@@ -124,6 +125,7 @@ export default function PipelinesPage() {
             Pipeline execution {execResult.status}.
             {execResult.error && ` Error: ${execResult.error}`}
             {execResult.status === 'completed' && ` (${execResult.total_steps} steps completed)`}
+            {execResult.status === 'running' && ` (step ${execResult.current_step}/${execResult.total_steps})`}
           </AlertDescription>
         </Alert>
       )}
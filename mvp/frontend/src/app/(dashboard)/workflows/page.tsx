@@ -25,10 +25,10 @@ import {
   useDeleteWorkflow,
   useTemplates,
   useTriggerWorkflow,
+  useWorkflowRun,
   useWorkflowRuns,
   useWorkflows,
 } from '@/features/workflows/hooks/useWorkflows';
-import type { WorkflowRun } from '@/features/workflows/types';
 
 const STATUS_VARIANTS: Record<string, 'secondary' | 'default' | 'success' | 'destructive' | 'warning' | 'outline'> = {
   draft: 'secondary',
@@ -89,7 +89,8 @@ export default function WorkflowsPage() {
   const [newName, setNewName] = useState('');
   const [newDesc, setNewDesc] = useState('');
   const [selectedWorkflow, setSelectedWorkflow] = useState<string | null>(null);
-  const [runResult, setRunResult] = useState<WorkflowRun | null>(null);
+  const [runId, setRunId] = useState<string | null>(null);
+  const { data: runResult } = useWorkflowRun(runId);
   const [inputText, setInputText] = useState('');
   const [runOpen, setRunOpen] = useState(false);
   const [runWorkflowId, setRunWorkflowId] = useState<string | null>(null);
@@ -128,7 +129,7 @@ export default function WorkflowsPage() {
     const inputData = inputText.trim() ? { text: inputText } : undefined;
     triggerMutation.mutate(
       { id: runWorkflowId, inputData },
-      { onSuccess: (run) => { setRunResult(run); setRunOpen(false); } }
+      { onSuccess: (run) => { setRunId(run.id); setRunOpen(false); } }
     );
   };
 
@@ -299,7 +300,7 @@ export default function WorkflowsPage() {
                 <div
                   key={run.id}
                   className="relative pl-9 pb-4 cursor-pointer group"
-                  onClick={() => setRunResult(run)}
+                  onClick={() => setRunId(run.id)}
                 >
                   {/* Timeline dot */}
                   <div className="absolute left-0 top-1 flex items-center justify-center w-[30px]">
@@ -368,7 +369,7 @@ export default function WorkflowsPage() {
       </Dialog>
 
       {/* Run Result Dialog */}
-      <Dialog open={!!runResult} onOpenChange={(v) => { if (!v) setRunResult(null); }}>
+      <Dialog open={!!runId} onOpenChange={(v) => { if (!v) setRunId(null); }}>
         <DialogContent className="max-w-2xl">
           {runResult && (
             <>
@@ -379,6 +380,12 @@ export default function WorkflowsPage() {
                   {runResult.duration_ms && (
                     <Badge variant="outline">{(runResult.duration_ms / 1000).toFixed(1)}s</Badge>
                   )}
+                  {(runResult.status === 'pending' || runResult.status === 'running') && (
+                    <span className="flex items-center gap-1 text-xs text-[var(--text-mid)]">
+                      <Loader2 className="h-3 w-3 animate-spin" />
+                      Node {runResult.current_node}/{runResult.total_nodes}
+                    </span>
+                  )}
                 </DialogTitle>
               </DialogHeader>
               <div className="border-t border-[var(--border)] pt-4 max-h-[60vh] overflow-y-auto space-y-4">
@@ -425,7 +432,7 @@ export default function WorkflowsPage() {
                 )}
               </div>
               <DialogFooter>
-                <Button variant="ghost" onClick={() => setRunResult(null)}>Close</Button>
+                <Button variant="ghost" onClick={() => setRunId(null)}>Close</Button>
               </DialogFooter>
             </>
           )}
@@ -13,6 +13,7 @@ const EP = {
   DELETE: (id: string) => `/api/crews/${id}`,
   RUN: (id: string) => `/api/crews/${id}/run`,
   RUNS: (id: string) => `/api/crews/${id}/runs`,
+  RUN_DETAIL: (runId: string) => `/api/crews/runs/${runId}`,
 } as const;
 
 export const listCrews = async (): Promise<Crew[]> => (await apiClient.get(EP.LIST)).data;
@@ -20,6 +21,7 @@ export const createCrew = async (data: CrewCreateRequest): Promise<Crew> => (awa
 export const deleteCrew = async (id: string): Promise<void> => { await apiClient.delete(EP.DELETE(id)); };
 export const runCrew = async (id: string, instruction: string, inputData?: Record<string, unknown>): Promise<CrewRun> =>
   (await apiClient.post(EP.RUN(id), { instruction, input_data: inputData || {} })).data;
+export const getCrewRun = async (runId: string): Promise<CrewRun> => (await apiClient.get(EP.RUN_DETAIL(runId))).data;
 export const listCrewRuns = async (crewId: string): Promise<CrewRun[]> => (await apiClient.get(EP.RUNS(crewId))).data;
 export const listCrewTemplates = async (category?: string): Promise<CrewTemplate[]> =>
   (await apiClient.get(EP.TEMPLATES, { params: category ? { category } : {} })).data;
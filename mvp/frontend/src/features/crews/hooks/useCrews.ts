@@ -1,6 +1,6 @@
 'use client';
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
-import { createCrew, createCrewFromTemplate, deleteCrew, listCrewRuns, listCrews, listCrewTemplates, runCrew } from '../api';
+import { createCrew, createCrewFromTemplate, deleteCrew, getCrewRun, listCrewRuns, listCrews, listCrewTemplates, runCrew } from '../api';
 import type { Crew, CrewCreateRequest, CrewRun, CrewTemplate } from '../types';
 
 export function useCrews() {
@@ -21,6 +21,18 @@ export function useRunCrew() {
     onSuccess: (_, v) => { qc.invalidateQueries({ queryKey: ['crews'] }); qc.invalidateQueries({ queryKey: ['crew-runs', v.id] }); },
   });
 }
+// Runs are started in the background (202 with a pending run): poll until finished
+export function useCrewRun(runId: string | null) {
+  return useQuery<CrewRun>({
+    queryKey: ['crew-run', runId],
+    queryFn: () => getCrewRun(runId!),
+    enabled: !!runId,
+    refetchInterval: (query) => {
+      const status = query.state.data?.status;
+      return !status || status === 'pending' || status === 'running' ? 2_000 : false;
+    },
+  });
+}
 export function useCrewRuns(crewId: string | null) {
   return useQuery<CrewRun[]>({ queryKey: ['crew-runs', crewId], queryFn: () => listCrewRuns(crewId!), enabled: !!crewId });
 }
@@ -59,6 +59,11 @@ export async function listExecutions(pipelineId: string): Promise<PipelineExecut
   return response.data;
 }
 
+export async function getExecution(executionId: string): Promise<PipelineExecution> {
+  const response: AxiosResponse<PipelineExecution> = await apiClient.get(PIPELINE_ENDPOINTS.EXECUTION(executionId));
+  return response.data;
+}
+
 export const pipelineApi = {
   listPipelines,
   createPipeline,
@@ -67,6 +72,7 @@ export const pipelineApi = {
   deletePipeline,
   executePipeline,
   listExecutions,
+  getExecution,
 } as const;
 
 export default pipelineApi;
@@ -11,6 +11,7 @@ import {
   createPipeline,
   deletePipeline,
   executePipeline,
+  getExecution,
   listExecutions,
   listPipelines,
   updatePipeline,
@@ -60,6 +61,23 @@ export function useExecutePipeline() {
   });
 }
 
+/**
+ * A single execution. Executions run in the background (the execute call
+ * answers 202 with a pending execution), so this polls every 2s until the
+ * execution has finished.
+ */
+export function useExecution(executionId: string | null) {
+  return useQuery<PipelineExecution>({
+    queryKey: ['pipelines', 'execution', executionId],
+    queryFn: () => getExecution(executionId as string),
+    enabled: !!executionId,
+    refetchInterval: (query) => {
+      const status = query.state.data?.status;
+      return !status || status === 'pending' || status === 'running' ? 2_000 : false;
+    },
+  });
+}
+
 export function useExecutions(pipelineId: string) {
   return useQuery<PipelineExecution[]>({
     queryKey: ['pipelines', pipelineId, 'executions'],
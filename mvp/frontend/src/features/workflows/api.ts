@@ -22,6 +22,7 @@ const ENDPOINTS = {
   DELETE: (id: string) => `/api/workflows/${id}`,
   RUN: (id: string) => `/api/workflows/${id}/run`,
   RUNS: (id: string) => `/api/workflows/${id}/runs`,
+  RUN_DETAIL: (runId: string) => `/api/workflows/runs/${runId}`,
 } as const;
 
 export async function listWorkflows(): Promise<Workflow[]> {
@@ -58,6 +59,11 @@ export async function listRuns(workflowId: string): Promise<WorkflowRun[]> {
   return response.data;
 }
 
+export async function getRun(runId: string): Promise<WorkflowRun> {
+  const response: AxiosResponse<WorkflowRun> = await apiClient.get(ENDPOINTS.RUN_DETAIL(runId));
+  return response.data;
+}
+
 export async function listTemplates(category?: string): Promise<WorkflowTemplate[]> {
   const params = category ? { category } : {};
   const response: AxiosResponse<WorkflowTemplate[]> = await apiClient.get(ENDPOINTS.TEMPLATES, { params });
@@ -9,6 +9,7 @@ import {
   createFromTemplate,
   createWorkflow,
   deleteWorkflow,
+  getRun,
   listRuns,
   listTemplates,
   listWorkflows,
@@ -71,6 +72,22 @@ export function useTriggerWorkflow() {
   });
 }
 
+/**
+ * A single run. Runs execute in the background (triggering answers 202
+ * with a pending run), so this polls every 2s until the run has finished.
+ */
+export function useWorkflowRun(runId: string | null) {
+  return useQuery<WorkflowRun>({
+    queryKey: ['workflow-run', runId],
+    queryFn: () => getRun(runId!),
+    enabled: !!runId,
+    refetchInterval: (query) => {
+      const status = query.state.data?.status;
+      return !status || status === 'pending' || status === 'running' ? 2_000 : false;
+    },
+  });
+}
+
 export function useWorkflowRuns(workflowId: string | null) {
   return useQuery<WorkflowRun[]>({
     queryKey: ['workflow-runs', workflowId],
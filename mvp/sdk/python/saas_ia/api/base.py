@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
@@ -21,7 +21,7 @@ class BaseAPI:
 
     # -- HTTP primitives ----------------------------------------------------
 
-    async def _request(
+    async def _send(
         self,
         method: str,
         path: str,
@@ -30,7 +30,7 @@ class BaseAPI:
         data: Any | None = None,
         files: Any | None = None,
         params: dict[str, Any] | None = None,
-    ) -> Any:
+    ) -> httpx.Response:
         # Strip None values from params
         if params:
             params = {k: v for k, v in params.items() if v is not None}
@@ -44,13 +44,22 @@ class BaseAPI:
             params=params,
         )
 
-        if response.status_code >= 400:
-            try:
-                body = response.json()
-                detail = body.get("detail", response.reason_phrase)
-            except Exception:
-                detail = response.reason_phrase or str(response.status_code)
-            raise SaaSIAError(response.status_code, detail)
+        _raise_for_status(response)
+        return response
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any | None = None,
+        data: Any | None = None,
+        files: Any | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        response = await self._send(
+            method, path, json=json, data=data, files=files, params=params
+        )
 
         if response.status_code == 204:
             return None
@@ -81,3 +90,63 @@ class BaseAPI:
 
     async def _delete(self, path: str) -> Any:
         return await self._request("DELETE", path)
+
+    # -- Streaming ----------------------------------------------------------
+
+    async def _stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield a response body in chunks as it arrives (file downloads)."""
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+
+        async with self._http.stream(method, path, json=json, params=params) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                _raise_for_status(response)
+            async for chunk in response.aiter_bytes():
+                yield chunk
+
+    # -- Pagination ---------------------------------------------------------
+
+    async def _iterate(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        *,
+        page_size: int = 100,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield every item of a cursor-paginated list endpoint.
+
+        Paginated responses carry ``items`` and ``next_cursor``; endpoints
+        returning a plain list send the cursor in the ``X-Next-Cursor``
+        header.  Totals are not requested.
+        """
+        params = {**(params or {}), "limit": page_size, "count": "none"}
+        while True:
+            response = await self._send("GET", path, params=params)
+            body = response.json()
+            if isinstance(body, dict):
+                items, cursor = body.get("items", []), body.get("next_cursor")
+            else:
+                items, cursor = body, response.headers.get("X-Next-Cursor")
+            for item in items:
+                yield item
+            if not cursor or not items:
+                return
+            params["cursor"] = cursor
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    if response.status_code >= 400:
+        try:
+            body = response.json()
+            detail = body.get("detail", response.reason_phrase)
+        except Exception:
+            detail = response.reason_phrase or str(response.status_code)
+        raise SaaSIAError(response.status_code, detail)
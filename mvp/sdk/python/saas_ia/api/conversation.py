@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator
 
 from saas_ia.api.base import BaseAPI
 
@@ -30,9 +30,13 @@ class ConversationAPI(BaseAPI):
         """List conversations (paginated)."""
         return await self._get(
             "/api/conversations/",
-            params={"limit": limit, "offset": offset},
+            params={"limit": limit, "skip": offset},
         )
 
+    def iterate_all(self, *, page_size: int = 100) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every conversation, following pagination cursors."""
+        return self._iterate("/api/conversations/", page_size=page_size)
+
     async def get(self, conversation_id: str) -> dict[str, Any]:
         """Get a conversation with its full message history."""
         return await self._get(f"/api/conversations/{conversation_id}")
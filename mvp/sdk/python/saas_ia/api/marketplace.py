@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator
 
 from saas_ia.api.base import BaseAPI
 
@@ -31,6 +31,21 @@ class MarketplaceAPI(BaseAPI):
             },
         )
 
+    def iterate_all(
+        self,
+        *,
+        category: str | None = None,
+        search: str | None = None,
+        sort_by: str | None = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every matching listing, following pagination cursors."""
+        return self._iterate(
+            "/api/marketplace/listings",
+            {"category": category, "search": search, "sort_by": sort_by},
+            page_size=page_size,
+        )
+
     async def get_listing(self, listing_id: str) -> dict[str, Any]:
         """Get listing details."""
         return await self._get(f"/api/marketplace/listings/{listing_id}")
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, BinaryIO
+from typing import Any, AsyncIterator, BinaryIO
 
 from saas_ia.api.base import BaseAPI
 
@@ -21,9 +21,18 @@ class PDFAPI(BaseAPI):
             files={"file": (filename, file)},
         )
 
-    async def list(self) -> list[dict[str, Any]]:
+    async def list(
+        self,
+        *,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[dict[str, Any]]:
         """List processed PDFs."""
-        return await self._get("/api/pdf/")
+        return await self._get("/api/pdf/", params={"limit": limit, "skip": offset})
+
+    def iterate_all(self, *, page_size: int = 100) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every processed PDF, following pagination cursors."""
+        return self._iterate("/api/pdf/", page_size=page_size)
 
     async def get(self, pdf_id: str) -> dict[str, Any]:
         """Get a processed PDF result."""
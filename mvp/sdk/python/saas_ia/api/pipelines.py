@@ -70,7 +70,8 @@ class PipelineAPI(BaseAPI):
         pipeline_id: str,
         input_data: dict[str, Any],
     ) -> dict[str, Any]:
-        """Execute a pipeline with input data."""
+        """Start a pipeline execution; it runs in the background and is
+        returned in the ``running`` state (poll ``get_execution``)."""
         return await self._post(
             f"/api/pipelines/{pipeline_id}/execute",
             json={"input_data": input_data},
@@ -92,3 +93,7 @@ class PipelineAPI(BaseAPI):
     async def get_execution(self, execution_id: str) -> dict[str, Any]:
         """Get execution details by ID."""
         return await self._get(f"/api/pipelines/executions/{execution_id}")
+
+    async def cancel_execution(self, execution_id: str) -> dict[str, Any]:
+        """Cancel a running execution."""
+        return await self._post(f"/api/pipelines/executions/{execution_id}/cancel")
@@ -3,7 +3,7 @@ diarization, chaptering, export, batch processing, and live-stream capture."""
 
 from __future__ import annotations
 
-from typing import Any, BinaryIO
+from typing import Any, AsyncIterator, BinaryIO
 
 from saas_ia.api.base import BaseAPI
 
@@ -46,7 +46,21 @@ class TranscriptionAPI(BaseAPI):
         """List transcriptions (paginated)."""
         return await self._get(
             "/api/transcription/",
-            params={"limit": limit, "offset": offset},
+            params={"limit": limit, "skip": offset},
+        )
+
+    def iterate_all(
+        self,
+        *,
+        status: str | None = None,
+        include_text: bool = True,
+        page_size: int = 100,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every transcription, following pagination cursors."""
+        return self._iterate(
+            "/api/transcription/",
+            {"status": status, "include_text": include_text},
+            page_size=page_size,
         )
 
     async def get(self, job_id: str) -> dict[str, Any]:
@@ -122,6 +136,22 @@ class TranscriptionAPI(BaseAPI):
             params={"format": format},
         )
 
+    def download(self, job_id: str, format: str = "txt") -> AsyncIterator[bytes]:
+        """Stream a transcription file (srt, vtt, jsonl, txt, md, json) in chunks."""
+        return self._stream("GET", f"/api/transcription/{job_id}/export/{format}/download")
+
+    def export_zip(
+        self,
+        job_ids: list[str] | None = None,
+        format: str = "srt",
+    ) -> AsyncIterator[bytes]:
+        """Stream a zip of completed transcriptions (all of them by default)."""
+        return self._stream(
+            "POST",
+            "/api/transcription/export/bulk",
+            json={"job_ids": job_ids, "format": format},
+        )
+
     # -- Batch --------------------------------------------------------------
 
     async def batch(self, urls: list[str]) -> dict[str, Any]:
@@ -44,7 +44,10 @@ export class PipelineAPI extends BaseAPI {
 
   // -- Execution -----------------------------------------------------------
 
-  /** Execute a pipeline with input data. */
+  /**
+   * Start a pipeline execution. It runs in the background, so the returned
+   * execution is still `running`; use `waitForExecution` for the result.
+   */
   async execute(id: string, data: PipelineExecuteRequest): Promise<PipelineExecution> {
     return this._post<PipelineExecution>(`/api/pipelines/${id}/execute`, data);
   }
@@ -61,4 +64,31 @@ export class PipelineAPI extends BaseAPI {
   async getExecution(executionId: string): Promise<PipelineExecution> {
     return this._get<PipelineExecution>(`/api/pipelines/executions/${executionId}`);
   }
+
+  /** Cancel a pending or running execution. */
+  async cancelExecution(executionId: string): Promise<void> {
+    await this._post(`/api/pipelines/executions/${executionId}/cancel`);
+  }
+
+  /**
+   * Poll an execution until it has finished (completed, failed or cancelled).
+   * Rejects once `timeoutMs` has passed, if given.
+   */
+  async waitForExecution(
+    executionId: string,
+    options?: { intervalMs?: number; timeoutMs?: number },
+  ): Promise<PipelineExecution> {
+    const intervalMs = options?.intervalMs ?? 2000;
+    const deadline = options?.timeoutMs !== undefined ? Date.now() + options.timeoutMs : undefined;
+    for (;;) {
+      const execution = await this.getExecution(executionId);
+      if (execution.status !== "pending" && execution.status !== "running") {
+        return execution;
+      }
+      if (deadline !== undefined && Date.now() + intervalMs > deadline) {
+        throw new Error(`Pipeline execution ${executionId} still ${execution.status} after ${options?.timeoutMs}ms`);
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  }
 }
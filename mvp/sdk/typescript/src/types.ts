@@ -362,7 +362,10 @@ export interface PipelineUpdateRequest {
 export interface PipelineExecution {
   id: string;
   pipeline_id: string;
-  status: "pending" | "running" | "completed" | "failed";
+  status: "pending" | "running" | "completed" | "failed" | "cancelled";
+  current_step: number;
+  total_steps: number;
+  results: Record<string, unknown>[];
   input_data: Record<string, unknown>;
   output_data: Record<string, unknown> | null;
   error: string | null;